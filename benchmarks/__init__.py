@@ -0,0 +1 @@
+"""Бенчмарки генерации (локальный mock LLM, без сети и затрат)."""
@@ -0,0 +1,415 @@
+"""
+@file: bench_bot_load.py
+@description: Нагрузочный тест бота — N операторов одновременно проходят сценарии FSM через Dispatcher
+              из bot.py против фейкового Bot API, заглушки Telethon и mock LLM
+@dependencies: aiogram, aiohttp, bot, benchmarks.fake_telegram, benchmarks.mock_llm_server,
+               benchmarks.bench_e2e
+@created: 2026-10-19
+
+Поведение бота при 10 операторах, одновременно запустивших генерацию, раньше
+можно было узнать только в проде. Тест собирает настоящий StreamerPostsBot
+(те же обработчики, ScenarioLoader, SQLiteStorage, JobRegistry) и подменяет
+только внешний мир:
+
+- Bot API — benchmarks/fake_telegram.py отдельным процессом (через
+  TelegramAPIServer сессии aiogram);
+- Telethon — StubTelethonManager вместо TelethonClientManager.get_instance();
+- OpenRouter — benchmarks/mock_llm_server.py через OPENROUTER_BASE_URL.
+
+Каждый пользователь проходит сценарий «📹 100 постов стримеров» апдейтами
+через dp.feed_raw_update: ссылки и бонусы → ручная загрузка --videos видео
+→ канал → без картинок → выбор модели (генерация) → быстрая проверка
+уникальности. Между шагами — «время на раздумье» оператора.
+
+Метрики:
+- латентность обработчиков по шагам (p50/p95/max; шаг «model» — вся генерация);
+- лаг event loop (насколько опаздывает sleep(--lag-interval)), p50/p95/max;
+- рост хранилища FSM: размер data/fsm.db (+WAL) и сериализованный объём кеша
+  SQLiteStorage во времени, а также RSS процесса;
+- пропускная способность: апдейтов/с и вызовов Bot API/с, статусы ответов.
+
+Все SQLite-хранилища (FSM, чекпоинты, телеметрия, пулы бонусов) и logs/ — во временной
+папке; рабочие данные бота не меняются.
+
+Пример:
+    python -m benchmarks.bench_bot_load --users 10 --videos 8 --llm-latency lognormal:0.5,0.5 \\
+        --api-latency fixed:0.03 --json /tmp/load.json
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import os
+import pickle
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_e2e import ROOT, SLOTS, _free_port, _http_json, _percentile, spawn_server
+from benchmarks.mock_llm_server import BENCH_BONUS1, BENCH_BONUS2, BENCH_URL1, BENCH_URL2
+
+BENCH_TOKEN = "123456789:bench-load-token"
+USER_ID_BASE = 700000000
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1)
+
+
+# ─────────────────────────────────────────────────────────────
+# Апдейты
+# ─────────────────────────────────────────────────────────────
+
+def _user(user_id: int) -> Dict:
+    return {"id": user_id, "is_bot": False, "first_name": f"Operator {user_id - USER_ID_BASE}"}
+
+
+def _message(user_id: int, **content) -> Dict:
+    return {
+        "message_id": next(_message_ids),
+        "date": int(time.time()),
+        "chat": {"id": user_id, "type": "private", "first_name": f"Operator {user_id - USER_ID_BASE}"},
+        "from": _user(user_id),
+        **content,
+    }
+
+
+def text_update(user_id: int, text: str) -> Dict:
+    content: Dict[str, Any] = {"text": text}
+    if text.startswith("/"):
+        content["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+    return {"update_id": next(_update_ids), "message": _message(user_id, **content)}
+
+
+def video_update(user_id: int, index: int, rng: random.Random) -> Dict:
+    bet = rng.choice([100, 200, 500, 1000])
+    file_name = f"Жека_{rng.choice(SLOTS)}_{bet}_{bet * rng.randint(50, 2000)}.mp4"
+    video = {
+        "file_id": f"bench-video-{user_id}-{index}",
+        "file_unique_id": f"bv{user_id}{index}",
+        "width": 1080, "height": 1920, "duration": 30,
+        "file_name": file_name, "mime_type": "video/mp4", "file_size": 5_000_000,
+    }
+    return {"update_id": next(_update_ids), "message": _message(user_id, video=video)}
+
+
+def callback_update(user_id: int, data: str) -> Dict:
+    bot_message = {
+        "message_id": 1,
+        "date": int(time.time()),
+        "chat": {"id": user_id, "type": "private", "first_name": f"Operator {user_id - USER_ID_BASE}"},
+        "from": {"id": int(BENCH_TOKEN.split(":")[0]), "is_bot": True, "first_name": "Bench Bot"},
+        "text": "🤖 Выбери модель",
+    }
+    return {
+        "update_id": next(_update_ids),
+        "callback_query": {
+            "id": f"cb-{user_id}-{next(_update_ids)}",
+            "from": _user(user_id),
+            "chat_instance": str(user_id),
+            "data": data,
+            "message": bot_message,
+        },
+    }
+
+
+def streamer_flow(user_id: int, videos: int, model: str, rng: random.Random) -> List[tuple]:
+    """Сценарий «📹 100 постов стримеров» одного оператора: [(шаг, апдейт)]."""
+    steps = [
+        ("start", text_update(user_id, "/start")),
+        ("scenario", text_update(user_id, "📹 100 постов стримеров")),
+        ("setup", text_update(user_id, "🚀 Начать настройку")),
+        ("url1", text_update(user_id, BENCH_URL1)),
+        ("bonus1", text_update(user_id, BENCH_BONUS1)),
+        ("url2", text_update(user_id, BENCH_URL2)),
+        ("bonus2", text_update(user_id, BENCH_BONUS2)),
+        ("video_source", text_update(user_id, "📤 Загрузить вручную")),
+    ]
+    steps += [("video", video_update(user_id, i, rng)) for i in range(videos)]
+    steps += [
+        ("videos_done", text_update(user_id, "✅ Видео готовы")),
+        ("channel", text_update(user_id, "@bench_channel_1")),
+        ("no_images", text_update(user_id, "⏭ Без картинок")),
+        ("model", callback_update(user_id, f"ai_model:{model}:openrouter")),
+        ("uniqueness", text_update(user_id, "⚡ Быстрая (~0.02₽)")),
+    ]
+    return steps
+
+
+# ─────────────────────────────────────────────────────────────
+# Наблюдатели
+# ─────────────────────────────────────────────────────────────
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Нет /proc — пиковый RSS (Linux: КиБ, macOS: байты)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _storage_bytes(storage) -> Dict[str, int]:
+    """Размер БД FSM на диске и сериализованный объём кеша SQLiteStorage в памяти."""
+    on_disk = 0
+    for suffix in ("", "-wal"):
+        path = Path(f"{storage.db_path}{suffix}")
+        if path.exists():
+            on_disk += path.stat().st_size
+    cached = 0
+    for entries in list(storage._data.values()):
+        for value in list(entries.values()):
+            try:
+                cached += len(pickle.dumps(value))
+            except Exception:
+                pass
+    return {"db_bytes": on_disk, "cache_bytes": cached, "keys": len(storage._data)}
+
+
+class LoadMonitor:
+    """Лаг event loop и память процесса/хранилища FSM во время теста."""
+
+    def __init__(self, storage, lag_interval: float = 0.05, sample_every: float = 1.0):
+        self.storage = storage
+        self.lag_interval = lag_interval
+        self.sample_every = sample_every
+        self.lags: List[float] = []
+        self.samples: List[Dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        next_sample = started
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            now = loop.time()
+            self.lags.append(max(0.0, now - before - self.lag_interval))
+            if now >= next_sample:
+                self.samples.append({"t": round(now - started, 2), "rss_bytes": _rss_bytes(),
+                                     **_storage_bytes(self.storage)})
+                next_sample = now + self.sample_every
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.samples.append({"t": None, "rss_bytes": _rss_bytes(), **_storage_bytes(self.storage)})
+
+
+# ─────────────────────────────────────────────────────────────
+# Прогон
+# ─────────────────────────────────────────────────────────────
+
+def build_bot(api_base: str, workdir: Path):
+    """StreamerPostsBot из bot.py с сессией на фейковый Bot API и хранилищами во workdir."""
+    from aiogram import Bot
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+
+    import bot as bot_module
+    from src.bonus_pool_builder import BonusPoolStore
+    from src.checkpoint_store import CheckpointStore
+    from src.fsm_storage import SQLiteStorage
+    from src.model_telemetry import ModelTelemetry
+    from src.telethon_manager import TelethonClientManager
+    from benchmarks.fake_telegram import StubTelethonManager
+
+    BonusPoolStore._instance = BonusPoolStore(workdir / "bonus_pools.db")
+    CheckpointStore._instance = CheckpointStore(workdir / "checkpoints.db")
+    ModelTelemetry._instance = ModelTelemetry(workdir / "telemetry.db")
+    TelethonClientManager._instance = StubTelethonManager()
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(api_base))
+    bot_module.Bot = functools.partial(Bot, session=session)
+    bot_module.SQLiteStorage = functools.partial(SQLiteStorage, db_path=workdir / "fsm.db")
+    return bot_module.StreamerPostsBot()
+
+
+async def run_user(app, user_id: int, args, rng: random.Random, timings: Dict[str, List[float]],
+                   errors: List[str]) -> int:
+    handled = 0
+    for step, update in streamer_flow(user_id, args.videos, args.model, rng):
+        started = time.monotonic()
+        try:
+            await app.dp.feed_raw_update(app.bot, update)
+        except Exception as e:
+            errors.append(f"{user_id}:{step}: {type(e).__name__}: {e}")
+        timings.setdefault(step, []).append(time.monotonic() - started)
+        handled += 1
+        if args.think_time:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_time)
+    return handled
+
+
+async def run_load(args, api_base: str, api_stats_url: str, workdir: Path) -> Dict:
+    app = build_bot(api_base, workdir)
+    storage = app.dp.storage
+    timings: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    monitor = LoadMonitor(storage, args.lag_interval)
+    _http_json(api_stats_url.replace("__stats", "__reset"), method="POST")
+
+    monitor.start()
+    started = time.monotonic()
+    cpu_started = time.process_time()
+
+    async def delayed_user(n: int) -> int:
+        await asyncio.sleep(args.ramp * n / max(1, args.users))
+        return await run_user(app, USER_ID_BASE + n, args, random.Random(args.seed + n), timings, errors)
+
+    try:
+        handled = await asyncio.gather(*(delayed_user(n) for n in range(args.users)))
+    finally:
+        wall = time.monotonic() - started
+        cpu = time.process_time() - cpu_started
+        await monitor.stop()
+        await app.bot.session.close()
+
+    api_calls = _http_json(api_stats_url)["calls"]
+    methods: Dict[str, int] = {}
+    statuses: Dict[str, int] = {}
+    for call in api_calls:
+        methods[call["method"]] = methods.get(call["method"], 0) + 1
+        statuses[str(call["status"])] = statuses.get(str(call["status"]), 0) + 1
+    states = {}
+    for n in range(args.users):
+        states[str(USER_ID_BASE + n)] = await storage.get_state(
+            _storage_key(app.bot.id, USER_ID_BASE + n)
+        )
+
+    first, last = monitor.samples[0], monitor.samples[-1]
+    return {
+        "users": args.users,
+        "wall_s": round(wall, 2),
+        "cpu_s": round(cpu, 2),
+        "updates": sum(handled),
+        "updates_per_s": round(sum(handled) / wall, 2) if wall else 0.0,
+        "bot_api_calls": len(api_calls),
+        "bot_api_calls_per_s": round(len(api_calls) / wall, 2) if wall else 0.0,
+        "bot_api_methods": methods,
+        "bot_api_statuses": statuses,
+        "handler_latency": {
+            step: {"n": len(values), "p50_s": round(_percentile(values, 0.5), 4),
+                   "p95_s": round(_percentile(values, 0.95), 4), "max_s": round(max(values), 4)}
+            for step, values in timings.items()
+        },
+        "loop_lag": {"p50_ms": round(_percentile(monitor.lags, 0.5) * 1000, 2),
+                     "p95_ms": round(_percentile(monitor.lags, 0.95) * 1000, 2),
+                     "max_ms": round(max(monitor.lags, default=0.0) * 1000, 2)},
+        "memory": {
+            "rss_start_mb": round(first["rss_bytes"] / 2 ** 20, 1),
+            "rss_end_mb": round(last["rss_bytes"] / 2 ** 20, 1),
+            "rss_peak_mb": round(max(s["rss_bytes"] for s in monitor.samples) / 2 ** 20, 1),
+            "fsm_db_kib": round(last["db_bytes"] / 1024, 1),
+            "fsm_cache_kib": round(last["cache_bytes"] / 1024, 1),
+            "fsm_cache_peak_kib": round(max(s["cache_bytes"] for s in monitor.samples) / 1024, 1),
+            "fsm_keys": last["keys"],
+        },
+        "memory_samples": monitor.samples,
+        "final_states": states,
+        "errors": errors[:50],
+        "errors_total": len(errors),
+    }
+
+
+def _storage_key(bot_id: int, user_id: int):
+    from aiogram.fsm.storage.base import StorageKey
+    return StorageKey(bot_id=bot_id, chat_id=user_id, user_id=user_id)
+
+
+def print_report(r: Dict):
+    print(f"\n📊 Нагрузочный тест: {r['users']} операторов, {r['wall_s']}с, CPU {r['cpu_s']}с")
+    print(f"   • апдейтов: {r['updates']} ({r['updates_per_s']}/с), "
+          f"вызовов Bot API: {r['bot_api_calls']} ({r['bot_api_calls_per_s']}/с), статусы {r['bot_api_statuses']}")
+    lag = r["loop_lag"]
+    print(f"   • лаг event loop: p50 {lag['p50_ms']}мс, p95 {lag['p95_ms']}мс, max {lag['max_ms']}мс")
+    mem = r["memory"]
+    print(f"   • RSS: {mem['rss_start_mb']} → {mem['rss_end_mb']} МБ (пик {mem['rss_peak_mb']}), "
+          f"FSM: БД {mem['fsm_db_kib']} КиБ, кеш {mem['fsm_cache_kib']} КиБ "
+          f"(пик {mem['fsm_cache_peak_kib']}), ключей {mem['fsm_keys']}")
+    print(f"\n{'шаг':<14}{'n':>6}{'p50, мс':>11}{'p95, мс':>11}{'max, мс':>11}")
+    print("─" * 53)
+    for step, t in r["handler_latency"].items():
+        print(f"{step:<14}{t['n']:>6}{t['p50_s'] * 1000:>11.1f}{t['p95_s'] * 1000:>11.1f}{t['max_s'] * 1000:>11.1f}")
+    final = {}
+    for state in r["final_states"].values():
+        final[state] = final.get(state, 0) + 1
+    print(f"\n   • итоговые состояния: {final}")
+    if r["errors_total"]:
+        print(f"   ⚠️ ошибок обработчиков: {r['errors_total']}")
+        for line in r["errors"][:5]:
+            print(f"      {line}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест бота на фейковом Bot API")
+    parser.add_argument("--users", type=int, default=10, help="одновременных операторов")
+    parser.add_argument("--videos", type=int, default=8, help="видео на оператора")
+    parser.add_argument("--model", default="gemini-3-flash", help="ключ OPENROUTER_MODELS для генерации")
+    parser.add_argument("--ramp", type=float, default=2.0, help="за сколько секунд подключаются все операторы")
+    parser.add_argument("--think-time", type=float, default=0.3, help="средняя пауза оператора между шагами, с")
+    parser.add_argument("--lag-interval", type=float, default=0.05)
+    parser.add_argument("--api-latency", default="fixed:0.03", help="латентность фейкового Bot API")
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="доля ответов Bot API 429")
+    parser.add_argument("--llm-latency", default="lognormal:0.3,0.5", help="латентность mock LLM")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--defect-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    args = parser.parse_args(argv)
+
+    llm_port, api_port = _free_port(), _free_port()
+    workdir = Path(tempfile.mkdtemp(prefix="bench_bot_load_"))
+    (workdir / "data").mkdir()
+    # Обработчики читают data/my_posts.json относительным путём, bot.py пишет logs/ в cwd
+    shutil.copy(ROOT / "data" / "my_posts.json", workdir / "data" / "my_posts.json")
+    os.environ.update({
+        "OPENROUTER_BASE_URL": f"http://127.0.0.1:{llm_port}/api/v1",
+        "OPENROUTER_API_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+        "TELEGRAM_BOT_TOKEN": BENCH_TOKEN,
+    })
+
+    servers = [
+        spawn_server("benchmarks.mock_llm_server", llm_port, "--latency", args.llm_latency,
+                     "--error-rate", str(args.llm_error_rate), "--defect-rate", str(args.defect_rate),
+                     "--seed", str(args.seed)),
+        spawn_server("benchmarks.fake_telegram", api_port, "--latency", args.api_latency,
+                     "--flood-rate", str(args.flood_rate), "--seed", str(args.seed)),
+    ]
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        result = asyncio.run(run_load(args, f"http://127.0.0.1:{api_port}",
+                                      f"http://127.0.0.1:{api_port}/__stats", workdir))
+    finally:
+        os.chdir(cwd)
+        for server in servers:
+            server.terminate()
+            server.wait(timeout=10)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "result": result}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Результаты: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
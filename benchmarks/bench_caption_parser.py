@@ -0,0 +1,147 @@
+"""
+@file: bench_caption_parser.py
+@description: Эталонная проверка и бенчмарк CaptionParser — µs/подпись и пропускная способность parse_many
+@dependencies: src.caption_parser, benchmarks/caption_golden.json
+@created: 2026-10-19
+
+Эталон benchmarks/caption_golden.json — подписи и ожидаемый ParsedCaption:
+ручные случаи (все языки, валюты, форматы чисел, markdown, двойники цифр,
+стримеры), синтетика с фиксированным seed и реальные посты data/my_posts.json.
+Ожидания сняты с прежней реализации парсера (цикл re.search по PATTERNS),
+поэтому любое расхождение — регрессия: скрипт печатает первые расхождения и
+завершается с кодом 1. Проверяются parse, parse_many последовательно и
+parse_many в пуле процессов.
+
+--write-golden перезаписывает ожидания текущим парсером — только для
+намеренного изменения поведения, вместе с ревью диффа эталона и подъёмом
+PARSER_VERSION (иначе кэш подписей отдаст старые результаты).
+
+Пример:
+    python -m benchmarks.bench_caption_parser --repeat 5 --workers 4 --backfill 20000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.caption_parser import CaptionParser
+
+GOLDEN_PATH = Path(__file__).parent / "caption_golden.json"
+
+
+def load_golden() -> List[Dict]:
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_golden(cases: List[Dict]):
+    """Один случай на строку — дифф эталона читается построчно."""
+    lines = [
+        json.dumps({"caption": c["caption"], "expected": asdict(CaptionParser.parse(c["caption"]))}, ensure_ascii=False)
+        for c in cases
+    ]
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(lines) + "\n]\n")
+
+
+def check(cases: List[Dict], label: str, results: List) -> int:
+    """Сравнивает результаты с эталоном, печатает первые расхождения; возвращает их число."""
+    mismatches = 0
+    for case, parsed in zip(cases, results):
+        got = asdict(parsed)
+        if got != case["expected"]:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"❌ {label}: {case['caption'][:100]!r}\n   ожидалось {case['expected']}\n   получено  {got}")
+    status = "✅" if not mismatches else "❌"
+    print(f"{status} {label}: расхождений {mismatches} из {len(cases)}")
+    return mismatches
+
+
+def time_parse(captions: List[str], repeat: int) -> List[float]:
+    """Время parse на каждую подпись (мкс), лучший из repeat проходов."""
+    for caption in captions:
+        CaptionParser.parse(caption)
+    best: Optional[List[float]] = None
+    for _ in range(repeat):
+        timings = []
+        for caption in captions:
+            started = time.perf_counter_ns()
+            CaptionParser.parse(caption)
+            timings.append((time.perf_counter_ns() - started) / 1000)
+        if best is None or sum(timings) < sum(best):
+            best = timings
+    return best or []
+
+
+def time_backfill(captions: List[str], size: int, workers: int) -> float:
+    """Подписей в секунду на parse_many пачкой size."""
+    batch = (captions * (size // max(1, len(captions)) + 1))[:size]
+    started = time.perf_counter()
+    CaptionParser.parse_many(batch, workers=workers)
+    return size / (time.perf_counter() - started)
+
+
+def _p95(values: List[float]) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))] if values else 0.0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Эталон и бенчмарк парсера подписей")
+    parser.add_argument("--repeat", type=int, default=5, help="проходов замера parse (берётся лучший)")
+    parser.add_argument("--workers", type=int, default=2, help="процессов для parse_many в пуле")
+    parser.add_argument("--backfill", type=int, default=20000, help="размер пачки для замера parse_many (0 — без замера)")
+    parser.add_argument("--write-golden", action="store_true", help="перезаписать эталон текущим парсером")
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    args = parser.parse_args(argv)
+
+    cases = load_golden()
+    if args.write_golden:
+        write_golden(cases)
+        print(f"💾 Эталон перезаписан: {GOLDEN_PATH} ({len(cases)} подписей)")
+        return
+
+    captions = [c["caption"] for c in cases]
+    mismatches = check(cases, "parse", [CaptionParser.parse(c) for c in captions])
+    mismatches += check(cases, "parse_many", CaptionParser.parse_many(captions))
+    if args.workers > 1:
+        # Порог пула снят, чтобы проверить именно путь через процессы
+        mismatches += check(cases, f"parse_many(workers={args.workers})",
+                            CaptionParser.parse_many(captions, workers=args.workers, min_batch=1))
+
+    timings = time_parse(captions, max(1, args.repeat))
+    results = {
+        "captions": len(captions),
+        "us_mean": round(statistics.fmean(timings), 1),
+        "us_p50": round(statistics.median(timings), 1),
+        "us_p95": round(_p95(timings), 1),
+        "us_max": round(max(timings), 1),
+        "mismatches": mismatches,
+    }
+    print(f"\n📊 parse: {results['us_mean']:.1f} мкс/подпись (p50 {results['us_p50']:.1f}, "
+          f"p95 {results['us_p95']:.1f}, max {results['us_max']:.1f}) на {len(captions)} подписях")
+
+    if args.backfill:
+        results["backfill"] = {}
+        for workers in sorted({1, args.workers}):
+            rate = time_backfill(captions, args.backfill, workers)
+            results["backfill"][workers] = round(rate)
+            print(f"📦 parse_many({args.backfill}, workers={workers}): {rate:,.0f} подписей/с")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Результаты: {args.json}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+@file: bench_e2e.py
+@description: Сквозной бенчмарк генерации на локальной замене OpenRouter (benchmarks/mock_llm_server.py)
+@dependencies: aiohttp, openai, benchmarks.mock_llm_server, src.ai_post_generator,
+               src.ai_image_post_generator, src.model_telemetry
+@created: 2026-10-19
+
+Реальные прогоны упираются в сеть и цены, поэтому изменения конвейера (пакетная
+генерация, ремонт, хеджирование, пул постобработки) нечем было сравнить «до/после».
+Бенчмарк поднимает mock-сервер отдельным процессом (его CPU не попадает в замер),
+направляет на него генераторы через OPENROUTER_BASE_URL и прогоняет этапы:
+
+- video      — AIPostGenerator.generate_all_posts (пул бонусов, пакеты, регены, ремонт);
+- uniqueness — AIPostGenerator.check_posts_uniqueness_hybrid по текстам этапа video;
+- image      — AIImagePostGenerator.generate_posts_batch без картинок.
+
+По каждому этапу: посты/с, p50/p95 интервала между готовыми постами и
+латентности запросов к mock, число запросов по видам, отклонения и средний
+номер регена (из телеметрии моделей), CPU-время процесса на этап и на пост.
+
+Телеметрия и пулы бонусов пишутся во временные БД, темы картинок — во временную копию,
+рабочие data/*.db и data/*.json не меняются.
+
+Пример:
+    python -m benchmarks.bench_e2e --posts 24 --image-posts 6 --latency lognormal:0.3,0.5 \\
+        --error-rate 0.02 --rate-limit-rate 0.03 --json /tmp/bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+
+SLOTS = ["Gates of Olympus", "Sweet Bonanza", "Big Bass Bonanza", "Sugar Rush", "Starlight Princess",
+         "Wanted Dead or a Wild", "Dog House", "Zeus vs Hades", "Fruit Party", "Book of Dead"]
+STREAMERS = ["", "", "", "Мелстрой", "Злой", "Витус"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _http_json(url: str, method: str = "GET") -> Dict:
+    request = urllib.request.Request(url, method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def spawn_server(module: str, port: int, *options: str) -> subprocess.Popen:
+    """Запускает локальный сервер бенчмарка отдельным процессом и ждёт /__stats."""
+    proc = subprocess.Popen([sys.executable, "-m", module, "--port", str(port), *options], cwd=str(ROOT))
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            _http_json(f"http://127.0.0.1:{port}/__stats")
+            return proc
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{module} не запустился")
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"{module} не ответил за 15с")
+
+
+def start_mock_server(port: int, args) -> subprocess.Popen:
+    return spawn_server(
+        "benchmarks.mock_llm_server", port,
+        "--latency", args.latency, "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate), "--defect-rate", str(args.defect_rate),
+        "--seed", str(args.seed),
+    )
+
+
+def make_videos(count: int, rng: random.Random):
+    from src.ai_post_generator import VideoData
+    videos = []
+    for _ in range(count):
+        bet = rng.choice([100, 200, 500, 1000, 2000])
+        videos.append(VideoData(streamer=rng.choice(STREAMERS), slot=rng.choice(SLOTS),
+                                bet=bet, win=bet * rng.randint(50, 3000)))
+    return videos
+
+
+class StageMeter:
+    """Замер одного этапа: стена, CPU процесса, интервалы готовых постов, запросы к mock."""
+
+    def __init__(self, name: str, stats_url: str):
+        self.name = name
+        self.stats_url = stats_url
+        self.marks: List[float] = []
+        self.posts = 0
+
+    def __enter__(self):
+        _http_json(self.stats_url.replace("__stats", "__reset"), method="POST")
+        self.wall_started = time.monotonic()
+        self.cpu_started = time.process_time()
+        self.ts_started = time.time()
+        self.marks = [self.wall_started]
+        return self
+
+    async def progress(self, current: int, total: int):
+        self.marks.append(time.monotonic())
+
+    def __exit__(self, *exc):
+        self.wall = time.monotonic() - self.wall_started
+        self.cpu = time.process_time() - self.cpu_started
+        self.requests = _http_json(self.stats_url)["requests"]
+        return False
+
+    def report(self) -> Dict:
+        from src.model_telemetry import get_model_telemetry
+
+        # Только строки этого этапа: окно с запасом захватывало конец предыдущего
+        stats = get_model_telemetry().model_stats(since=self.ts_started).values()
+        accepted = sum(s.accepted for s in stats)
+        rejected = sum(s.rejected for s in stats)
+        regen = sum(s.avg_regen * s.accepted for s in stats) / accepted if accepted else 0.0
+        reasons: Dict[str, int] = {}
+        for s in stats:
+            for reason, count in s.reject_reasons.items():
+                reasons[reason] = reasons.get(reason, 0) + count
+
+        intervals = [b - a for a, b in zip(self.marks, self.marks[1:])]
+        latencies = [r["latency"] for r in self.requests]
+        kinds: Dict[str, int] = {}
+        statuses: Dict[str, int] = {}
+        for r in self.requests:
+            kinds[r["kind"]] = kinds.get(r["kind"], 0) + 1
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        return {
+            "stage": self.name,
+            "posts": self.posts,
+            "wall_s": round(self.wall, 3),
+            "posts_per_s": round(self.posts / self.wall, 3) if self.wall else 0.0,
+            "post_interval_p50_s": round(_percentile(intervals, 0.5), 3),
+            "post_interval_p95_s": round(_percentile(intervals, 0.95), 3),
+            "llm_requests": len(self.requests),
+            "llm_p50_s": round(_percentile(latencies, 0.5), 3),
+            "llm_p95_s": round(_percentile(latencies, 0.95), 3),
+            "requests_by_kind": kinds,
+            "requests_by_status": statuses,
+            "outcomes_accepted": accepted,
+            "outcomes_rejected": rejected,
+            "avg_regen_accepted": round(regen, 2),
+            "reject_reasons": reasons,
+            "cpu_s": round(self.cpu, 3),
+            "cpu_ms_per_post": round(self.cpu * 1000 / self.posts, 1) if self.posts else 0.0,
+        }
+
+
+async def run_stages(args, base_url: str, stats_url: str, workdir: Path) -> List[Dict]:
+    from benchmarks.mock_llm_server import BENCH_BONUS1, BENCH_BONUS2, BENCH_URL1, BENCH_URL2
+    from src.ai_image_post_generator import AIImagePostGenerator
+    from src.ai_post_generator import OPENROUTER_MODELS, AIPostGenerator
+    from src.topic_manager import TopicManager
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    results = []
+
+    generator = AIPostGenerator(openrouter_api_key="bench", model=OPENROUTER_MODELS[args.model]["id"],
+                                use_openrouter=True)
+    generator.set_bonus_data(BENCH_URL1, BENCH_BONUS1, BENCH_URL2, BENCH_BONUS2)
+    videos = make_videos(args.posts, rng)
+    texts: List[str] = []
+
+    if "video" in stages:
+        with StageMeter("video", stats_url) as meter:
+            posts = await generator.generate_all_posts(videos=videos, progress_callback=meter.progress)
+        meter.posts = len(posts)
+        texts = [p.text for p in posts]
+        results.append(meter.report())
+
+    if "uniqueness" in stages:
+        if not texts:
+            texts = [f"Пост {i}: {v.slot}, ставка {v.bet}, выигрыш {v.win}" for i, v in enumerate(videos)]
+        with StageMeter("uniqueness", stats_url) as meter:
+            await generator.check_posts_uniqueness_hybrid(texts, [v.slot for v in videos])
+        meter.posts = len(texts)
+        results.append(meter.report())
+
+    if "image" in stages and args.image_posts:
+        image_generator = AIImagePostGenerator(api_key="bench", model=OPENROUTER_MODELS[args.model]["id"],
+                                               base_url=base_url)
+        topics_copy = workdir / "image_post_topics.json"
+        shutil.copy(ROOT / "data" / "image_post_topics.json", topics_copy)
+        image_generator.topic_manager = TopicManager(str(topics_copy))
+        image_generator.set_bonus_data(BENCH_URL1, BENCH_BONUS1, BENCH_URL2, BENCH_BONUS2)
+        with StageMeter("image", stats_url) as meter:
+            posts = await image_generator.generate_posts_batch(count=args.image_posts, generate_images=False,
+                                                               progress_callback=meter.progress)
+        meter.posts = len(posts)
+        results.append(meter.report())
+
+    return results
+
+
+def print_table(results: List[Dict]):
+    print("\n📊 Сквозной бенчмарк (mock LLM)")
+    header = (f"{'этап':<11}{'постов':>7}{'стена,с':>9}{'пост/с':>8}{'p50,с':>8}{'p95,с':>8}"
+              f"{'LLM':>6}{'LLM p50':>9}{'LLM p95':>9}{'откл.':>7}{'реген':>7}{'CPU,с':>8}{'CPU мс/пост':>13}")
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        print(f"{r['stage']:<11}{r['posts']:>7}{r['wall_s']:>9.2f}{r['posts_per_s']:>8.2f}"
+              f"{r['post_interval_p50_s']:>8.2f}{r['post_interval_p95_s']:>8.2f}{r['llm_requests']:>6}"
+              f"{r['llm_p50_s']:>9.2f}{r['llm_p95_s']:>9.2f}{r['outcomes_rejected']:>7}"
+              f"{r['avg_regen_accepted']:>7.2f}{r['cpu_s']:>8.2f}{r['cpu_ms_per_post']:>13.1f}")
+    for r in results:
+        details = ", ".join(f"{k} {v}" for k, v in sorted(r["requests_by_kind"].items()))
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(r["requests_by_status"].items()))
+        reasons = ", ".join(f"{k} {v}" for k, v in sorted(r["reject_reasons"].items())) or "—"
+        print(f"   • {r['stage']}: запросы [{details}], статусы [{statuses}], отклонения [{reasons}]")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Сквозной бенчмарк генерации на локальном mock LLM")
+    parser.add_argument("--posts", type=int, default=16, help="видео-постов")
+    parser.add_argument("--image-posts", type=int, default=4, help="постов с картинками (без генерации картинок)")
+    parser.add_argument("--model", default="gemini-3-flash", help="ключ OPENROUTER_MODELS")
+    parser.add_argument("--stages", default="video,uniqueness,image")
+    parser.add_argument("--latency", default="lognormal:0.3,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--defect-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+    workdir = Path(tempfile.mkdtemp(prefix="bench_e2e_"))
+    # До импорта генераторов: адрес API читается при импорте модуля
+    os.environ["OPENROUTER_BASE_URL"] = base_url
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    from src.bonus_pool_builder import BonusPoolStore
+    from src.model_telemetry import ModelTelemetry
+    BonusPoolStore._instance = BonusPoolStore(workdir / "bonus_pools.db")
+    ModelTelemetry._instance = ModelTelemetry(workdir / "telemetry.db")
+
+    server = start_mock_server(port, args)
+    try:
+        results = asyncio.run(run_stages(args, base_url, f"http://127.0.0.1:{port}/__stats", workdir))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Результаты: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
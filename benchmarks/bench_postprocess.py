@@ -0,0 +1,221 @@
+"""
+@file: bench_postprocess.py
+@description: Микробенчмарк цепочки постобработки текстов постов — µs/пост и память по этапам и языкам
+@dependencies: tracemalloc, src.ai_post_generator (+ _es, _it, _fr)
+@created: 2026-10-19
+
+Этапы _postprocess_text, _smart_trim_text, _reformat_link_blocks,
+_relocate_link_blocks, _remove_template_phrases и _apply_random_formatting
+выполняются на каждом принятом кандидате во всех четырёх генераторах, но их
+регрессии не видно ни в одном замере — они тонут в латентности LLM.
+
+Корпус:
+- исторические посты data/my_posts.json и data/image_posts_examples.json
+  (первые две ссылки поста заменяются ссылками бенча, чтобы этапы ссылок
+  работали по настоящему пути);
+- синтетические худшие случаи: очень длинный текст, много ссылок, спам эмодзи,
+  одна строка без переносов.
+
+Каждый этап прогоняется на свежем генераторе с random.seed(--seed), поэтому
+ротации форматов и случайное форматирование повторяемы между запусками.
+Время и память меряются отдельными проходами: tracemalloc сам замедляет код.
+Память — пик выделений сверх исходного уровня за вызов (tracemalloc), в КиБ.
+Вывод print() этапов перехватывается, чтобы не мерить терминал.
+
+Пример:
+    python -m benchmarks.bench_postprocess --langs ru,fr --repeat 3 --json /tmp/pp.json
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import random
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+BENCH_URL1 = "https://bench.example/b1"
+BENCH_URL2 = "https://bench.example/b2"
+BENCH_BONUS1 = "100 фриспинов за регистрацию"
+BENCH_BONUS2 = "150% + 500 FS на первый депозит"
+
+LANG_MODULES = {
+    "ru": "src.ai_post_generator",
+    "es": "src.ai_post_generator_es",
+    "it": "src.ai_post_generator_it",
+    "fr": "src.ai_post_generator_fr",
+}
+
+STAGES: List[Tuple[str, Callable]] = [
+    ("_postprocess_text", lambda g, text: g._postprocess_text(text, "Gates of Olympus")),
+    ("_smart_trim_text", lambda g, text: g._smart_trim_text(text)),
+    ("_reformat_link_blocks", lambda g, text: g._reformat_link_blocks(text)),
+    ("_relocate_link_blocks", lambda g, text: g._relocate_link_blocks(text)),
+    ("_remove_template_phrases", lambda g, text: g._remove_template_phrases(text)),
+    ("_apply_random_formatting", lambda g, text: g._apply_random_formatting(text)),
+]
+
+_URL_RE = re.compile(r"https?://[^\s<>\"']+")
+
+
+def _bench_links(text: str) -> str:
+    """Первые две ссылки поста → ссылки бенча; если ссылок нет — дописывает блок ссылок."""
+    urls = iter((BENCH_URL1, BENCH_URL2))
+    text = _URL_RE.sub(lambda m: next(urls, m.group(0)), text)
+    if BENCH_URL1 not in text:
+        text += f"\n\n👉 {BENCH_URL1}\n{BENCH_BONUS1}"
+    if BENCH_URL2 not in text:
+        text += f"\n\n👉 {BENCH_URL2}\n{BENCH_BONUS2}"
+    return text
+
+
+def load_corpus(seed: int) -> Dict[str, List[str]]:
+    """{группа: [тексты]} — история и синтетика."""
+    with open(DATA_DIR / "my_posts.json", "r", encoding="utf-8") as f:
+        history = [p["text"] for p in json.load(f).get("posts", []) if p.get("text")]
+    with open(DATA_DIR / "image_posts_examples.json", "r", encoding="utf-8") as f:
+        images = [p.get("text_html") or p.get("text_plain") or "" for p in json.load(f).get("posts", [])]
+
+    rng = random.Random(seed)
+    sample = rng.sample(history, min(20, len(history)))
+    base = sample[0] if sample else "🔥 Занос на стриме! Ставка сыграла с огромным множителем."
+    link_block = f"👉 {BENCH_URL1}\n{BENCH_BONUS1}\n\n👉 {BENCH_URL2}\n{BENCH_BONUS2}"
+    synthetic = [
+        # Очень длинный текст (~10 постов подряд)
+        "\n\n".join(_URL_RE.sub("", t) for t in sample[:10]) + "\n\n" + link_block,
+        # Много ссылок
+        base + "\n\n" + "\n".join(f"🔗 https://spam{i}.example/{i} бонус {i}" for i in range(40)) + "\n\n" + link_block,
+        # Спам эмодзи
+        " ".join(rng.choice("🔥💰🎰🚀💎🤑✨🎁⚡️🍀") * 3 for _ in range(300)) + "\n\n" + link_block,
+        # Одна строка без переносов
+        " ".join(_URL_RE.sub("", t).replace("\n", " ") for t in sample[:5]) + " " + link_block.replace("\n", " "),
+    ]
+    return {
+        "my_posts": [_bench_links(t) for t in history],
+        "image_posts": [_bench_links(t) for t in images if t],
+        "synthetic": synthetic,
+    }
+
+
+def make_generator(module):
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = module.AIPostGenerator(api_key=None)
+    generator.set_bonus_data(BENCH_URL1, BENCH_BONUS1, BENCH_URL2, BENCH_BONUS2)
+    return generator
+
+
+def time_stage(module, call: Callable, texts: List[str], seed: int, repeat: int) -> List[float]:
+    """Время вызова на каждый текст (мкс), лучшее из repeat проходов."""
+    best: Optional[List[float]] = None
+    for _ in range(repeat):
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Прогрев: компиляция регулярок и ленивые импорты — не в замер
+            call(make_generator(module), texts[0])
+            random.seed(seed)
+            generator = make_generator(module)
+            for text in texts:
+                started = time.perf_counter_ns()
+                call(generator, text)
+                timings.append((time.perf_counter_ns() - started) / 1000)
+        if best is None or sum(timings) < sum(best):
+            best = timings
+    return best or []
+
+
+def trace_stage(module, call: Callable, texts: List[str], seed: int) -> List[int]:
+    """Пик выделенной памяти сверх исходной на каждый вызов (байты)."""
+    random.seed(seed)
+    generator = make_generator(module)
+    peaks = []
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for text in texts:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                call(generator, text)
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(max(0, peak - before))
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def _p95(values: List[float]) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))] if values else 0.0
+
+
+def run(langs: List[str], groups: List[str], seed: int, repeat: int, limit: int) -> List[Dict]:
+    corpus = load_corpus(seed)
+    results = []
+    for lang in langs:
+        module = importlib.import_module(LANG_MODULES[lang])
+        for stage, call in STAGES:
+            if not hasattr(module.AIPostGenerator, stage):
+                continue
+            for group in groups:
+                texts = corpus[group][:limit] if limit else corpus[group]
+                if not texts:
+                    continue
+                timings = time_stage(module, call, texts, seed, repeat)
+                peaks = trace_stage(module, call, texts, seed)
+                results.append({
+                    "lang": lang,
+                    "stage": stage,
+                    "corpus": group,
+                    "posts": len(texts),
+                    "us_mean": round(statistics.fmean(timings), 1),
+                    "us_p50": round(statistics.median(timings), 1),
+                    "us_p95": round(_p95(timings), 1),
+                    "us_max": round(max(timings), 1),
+                    "alloc_kib_mean": round(statistics.fmean(peaks) / 1024, 1),
+                    "alloc_kib_max": round(max(peaks) / 1024, 1),
+                })
+    return results
+
+
+def print_table(results: List[Dict]):
+    print("\n📊 Постобработка: мкс/пост и пик памяти на вызов")
+    header = (f"{'яз':<4}{'этап':<27}{'корпус':<13}{'постов':>7}{'мкс ср':>10}{'p50':>10}{'p95':>10}"
+              f"{'max':>11}{'КиБ ср':>9}{'КиБ max':>9}")
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        print(f"{r['lang']:<4}{r['stage']:<27}{r['corpus']:<13}{r['posts']:>7}{r['us_mean']:>10.1f}"
+              f"{r['us_p50']:>10.1f}{r['us_p95']:>10.1f}{r['us_max']:>11.1f}"
+              f"{r['alloc_kib_mean']:>9.1f}{r['alloc_kib_max']:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Микробенчмарк цепочки постобработки")
+    parser.add_argument("--langs", default="ru,es,it,fr")
+    parser.add_argument("--corpus", default="my_posts,image_posts,synthetic")
+    parser.add_argument("--repeat", type=int, default=3, help="проходов на этап (берётся лучший)")
+    parser.add_argument("--limit", type=int, default=0, help="постов из каждой группы (0 — все)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    args = parser.parse_args(argv)
+
+    results = run(
+        [lang.strip() for lang in args.langs.split(",") if lang.strip() in LANG_MODULES],
+        [g.strip() for g in args.corpus.split(",") if g.strip()],
+        args.seed, max(1, args.repeat), args.limit,
+    )
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Результаты: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
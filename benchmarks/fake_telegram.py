@@ -0,0 +1,233 @@
+"""
+@file: fake_telegram.py
+@description: Локальная замена Telegram для нагрузочных тестов — фейковый Bot API (отдельный процесс)
+              и заглушка TelethonClientManager с клиентом MTProto
+@dependencies: aiohttp, benchmarks.mock_llm_server
+@created: 2026-10-19
+
+Фейковый Bot API отвечает на /bot<token>/<method> как настоящий сервер:
+sendMessage/sendVideo/sendPhoto/editMessage* возвращают объект Message с
+растущим message_id по чату, sendMediaGroup — список, copyMessage — MessageId,
+остальные методы — true. Латентность — те же распределения, что у mock LLM;
+--flood-rate отдаёт 429 с retry_after, как при флуд-контроле.
+
+StubTelethonManager подменяет TelethonClientManager.get_instance(): клиент
+отвечает на get_entity/get_dialogs/get_messages/send_file/send_message с
+заданной задержкой и считает вызовы. Сеть и сессии Telethon не нужны.
+
+Запуск сервера: python -m benchmarks.fake_telegram --port 8090 --latency fixed:0.03
+Статистика: GET /__stats, сброс: POST /__reset.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from benchmarks.mock_llm_server import parse_latency
+
+BOT_USER = {"id": 123456789, "is_bot": True, "first_name": "Bench Bot", "username": "bench_bot"}
+
+# Методы, которые возвращают отправленное/изменённое сообщение
+_MESSAGE_METHODS = {
+    "sendmessage", "sendvideo", "sendphoto", "senddocument", "sendanimation", "sendaudio",
+    "editmessagetext", "editmessagecaption", "editmessagereplymarkup", "editmessagemedia",
+}
+
+
+class FakeBotAPI:
+    """Состояние фейкового Bot API: счётчики message_id по чатам и статистика вызовов."""
+
+    def __init__(self, latency: Callable[[random.Random], float], flood_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.flood_rate = flood_rate
+        self.rng = random.Random(seed)
+        self._message_ids: Dict[Any, itertools.count] = {}
+        self.reset()
+
+    def reset(self):
+        self.calls: List[Dict] = []
+        self.started = time.time()
+
+    def _chat(self, chat_id: Any) -> Dict:
+        try:
+            chat_id = int(chat_id)
+        except (TypeError, ValueError):
+            # @username канала — стабильный отрицательный id
+            chat_id = -1000000000000 - (abs(hash(str(chat_id))) % 10 ** 9)
+        if chat_id > 0:
+            return {"id": chat_id, "type": "private", "first_name": f"user{chat_id}"}
+        return {"id": chat_id, "type": "channel", "title": f"channel{chat_id}"}
+
+    def _message(self, params: Dict[str, Any]) -> Dict:
+        chat = self._chat(params.get("chat_id"))
+        message_id = params.get("message_id")
+        if message_id is None:
+            counter = self._message_ids.setdefault(chat["id"], itertools.count(1))
+            message_id = next(counter)
+        message = {"message_id": int(message_id), "date": int(time.time()), "chat": chat, "from": BOT_USER}
+        if params.get("text") is not None:
+            message["text"] = params["text"]
+        if params.get("caption") is not None:
+            message["caption"] = params["caption"]
+        if params.get("reply_markup"):
+            try:
+                markup = json.loads(params["reply_markup"])
+            except (TypeError, ValueError):
+                markup = None
+            if isinstance(markup, dict) and "inline_keyboard" in markup:
+                message["reply_markup"] = markup
+        return message
+
+    def result(self, method: str, params: Dict[str, Any]) -> Any:
+        method = method.lower()
+        if method == "getme":
+            return BOT_USER
+        if method in _MESSAGE_METHODS:
+            return self._message(params)
+        if method == "sendmediagroup":
+            try:
+                media = json.loads(params.get("media") or "[]")
+            except ValueError:
+                media = []
+            return [self._message({"chat_id": params.get("chat_id")}) for _ in media or [None]]
+        if method == "copymessage":
+            return {"message_id": self._message({"chat_id": params.get("chat_id")})["message_id"]}
+        return True
+
+    async def handle(self, request: web.Request) -> web.Response:
+        received = time.monotonic()
+        method = request.match_info["method"]
+        if request.content_type == "application/json":
+            params = await request.json()
+        else:
+            params = dict(await request.post())
+        await asyncio.sleep(max(0.0, self.latency(self.rng)))
+
+        record = {"method": method, "status": 200, "latency": 0.0}
+        self.calls.append(record)
+        if self.rng.random() < self.flood_rate:
+            record.update(status=429, latency=time.monotonic() - received)
+            return web.json_response({
+                "ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            })
+        result = self.result(method, params)
+        record["latency"] = time.monotonic() - received
+        return web.json_response({"ok": True, "result": result})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"since": self.started, "calls": self.calls})
+
+    async def handle_reset(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.json_response({"ok": True})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        app.router.add_get("/__stats", self.handle_stats)
+        app.router.add_post("/__reset", self.handle_reset)
+        return app
+
+
+# ─────────────────────────────────────────────────────────────
+# Заглушка Telethon (в процессе бота)
+# ─────────────────────────────────────────────────────────────
+
+class StubTelethonClient:
+    """Клиент MTProto без сети: фиксированный канал, задержка на вызов, счётчики."""
+
+    def __init__(self, latency: float = 0.05, channels: int = 3):
+        self.latency = latency
+        self.calls: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self.channels = [
+            SimpleNamespace(id=-1000000000000 - i, title=f"Bench Channel {i}", username=f"bench_channel_{i}",
+                            broadcast=True, creator=True, admin_rights=None)
+            for i in range(1, channels + 1)
+        ]
+
+    async def _call(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        await asyncio.sleep(self.latency)
+
+    async def get_entity(self, ref):
+        await self._call("get_entity")
+        for channel in self.channels:
+            if ref in (channel.id, f"@{channel.username}", channel.username):
+                return channel
+        return self.channels[0]
+
+    async def get_dialogs(self, *args, **kwargs):
+        await self._call("get_dialogs")
+        return [SimpleNamespace(entity=channel) for channel in self.channels]
+
+    async def get_messages(self, *args, **kwargs):
+        await self._call("get_messages")
+        return []
+
+    async def send_message(self, *args, **kwargs):
+        await self._call("send_message")
+        return SimpleNamespace(id=next(self._ids))
+
+    async def send_file(self, *args, **kwargs):
+        await self._call("send_file")
+        return SimpleNamespace(id=next(self._ids))
+
+    def is_connected(self) -> bool:
+        return True
+
+
+class StubTelethonManager:
+    """Подмена TelethonClientManager: один заглушечный клиент на всех пользователей."""
+
+    def __init__(self, client: Optional[StubTelethonClient] = None):
+        self._client = client or StubTelethonClient()
+        self._clients = [self._client]
+        self._lock = asyncio.Lock()
+
+    async def ensure_initialized(self) -> bool:
+        return True
+
+    def get_client(self, user_id: Optional[int] = None) -> StubTelethonClient:
+        return self._client
+
+    def get_all_clients(self) -> List[StubTelethonClient]:
+        return list(self._clients)
+
+    def get_next_client(self) -> StubTelethonClient:
+        return self._client
+
+    def get_accounts_info(self) -> List[dict]:
+        return [{"index": 0, "name": "bench"}]
+
+    def get_active_index(self, user_id: Optional[int] = None, db_manager=None) -> int:
+        return 0
+
+    async def reconnect(self) -> bool:
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Фейковый Telegram Bot API для нагрузочных тестов")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", default="fixed:0.03", help="fixed:S | uniform:A,B | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="доля ответов 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeBotAPI(parse_latency(args.latency), args.flood_rate, args.seed)
+    print(f"🧪 Fake Bot API: http://{args.host}:{args.port}")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+@file: mock_llm_server.py
+@description: Локальная замена OpenRouter/OpenAI для бенчмарков — OpenAI-совместимый
+              /chat/completions с настраиваемой латентностью, ошибками и 429
+@dependencies: aiohttp, src.token_budget
+@created: 2026-10-19
+
+Отвечает так, чтобы генераторы проходили свой обычный путь, а не короткое
+замыкание:
+
+- пул описаний бонусов («JSON массивом строк») — JSON-массив вариаций
+  исходного описания;
+- пакетная генерация (заголовки «═══ ПОСТ N ═══» / «═══ POST N ═══») —
+  {"posts": [{"id", "text"}]} на каждый заголовок;
+- проверка уникальности (X-Title с «Uniqueness») — Flash-модели находят пару
+  «дублей», остальные (перепроверка) — нет;
+- ремонт (разделитель «———») — присланный текст, в котором исправлено
+  нарушенное правило (ник стримера, пропавшая ссылка, длина);
+- всё остальное — пост из data/my_posts.json с подставленными ссылками бенча.
+
+Ник стримера берётся из промпта (строка «⟦STREAMER⟧ = …» блока данных или
+«Стример: …» пользовательского промпта, в пакете — из секции своего поста)
+и вставляется в текст один раз, как требует проверка генератора.
+
+С вероятностью --defect-rate пост отдаётся без второй ссылки — так в прогоне
+есть отбраковка, ремонт и регены.
+
+Латентность: fixed:0.5 | uniform:0.2,1.5 | lognormal:<медиана>,<sigma>.
+Запуск: python -m benchmarks.mock_llm_server --port 8089 --latency lognormal:0.4,0.5
+Статистика: GET /__stats, сброс: POST /__reset.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from src.token_budget import estimate_messages_tokens, estimate_tokens
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Ссылки и бонусы, которые бенчмарк передаёт генераторам (сервер подставляет их в посты)
+BENCH_URL1 = "https://bench.example/b1"
+BENCH_URL2 = "https://bench.example/b2"
+BENCH_BONUS1 = "100 фриспинов за регистрацию"
+BENCH_BONUS2 = "150% + 500 FS на первый депозит"
+
+# Тело поста (без блока ссылок) — чтобы итог попадал в окно длины генераторов
+POST_BODY_CHARS = 420
+
+_URL_RE = re.compile(r"(?:<a\s[^>]*>.*?</a>|https?://\S+|\b\w+\.(?:ly|cc|link|me|pro)/\S*)", re.S)
+_BATCH_HEADER_RE = re.compile(r"═══ (?:ПОСТ|POST) (\d+) ═══")
+_STREAMER_RES = (
+    re.compile(r"⟦STREAMER⟧ = ([^\n]*)"),
+    re.compile(r"(?:Стример|Jugador):\s*([^\n(]*?)\s*\("),
+)
+_REPAIR_STREAMER_RE = re.compile(r"(?:стример|streamer)\w*\s*«\s*(.+?)\s*»", re.I)
+_REPAIR_LINK_RE = re.compile(r"(https?://[^\s()]+)(?:\s*\(([^)]*)\))?")
+_REPAIR_LENGTH_RE = re.compile(r"(\d+)\s*[–-]\s*(\d+)")
+
+_BONUS_LEADS = [
+    "Забирай", "Лови", "Активируй", "Не упусти", "Успей взять", "Тебя ждут", "Открывай",
+    "Хватай", "Получи", "Жми и забирай", "Стартуй с бонусом:", "Для новичков —",
+]
+_BONUS_TAILS = [
+    "прямо сейчас, пока предложение действует", "без лишних условий и долгих ожиданий",
+    "и начинай игру с запасом", "— отличный старт для первых ставок",
+    "сразу после регистрации по ссылке", "и проверь удачу уже сегодня",
+    "на выгодных условиях для новых игроков", "пока акция не закончилась",
+]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Распределение задержки ответа из строки вида kind:a,b."""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] if args else []
+    if kind == "fixed":
+        return lambda rng: values[0] if values else 0.0
+    if kind == "uniform":
+        low, high = values
+        return lambda rng: rng.uniform(low, high)
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Неизвестное распределение латентности: {spec}")
+
+
+def load_corpus(path: Path = DATA_DIR / "my_posts.json") -> List[str]:
+    """Тексты исторических постов без ссылок, подрезанные до POST_BODY_CHARS."""
+    with open(path, "r", encoding="utf-8") as f:
+        posts = json.load(f).get("posts", [])
+    corpus = []
+    for post in posts:
+        body = _URL_RE.sub("", post.get("text") or "")
+        body = re.sub(r"\n{3,}", "\n\n", body).strip()
+        if len(body) < 200:
+            continue
+        if len(body) > POST_BODY_CHARS:
+            cut = body.rfind(" ", 0, POST_BODY_CHARS)
+            body = body[:cut if cut > 0 else POST_BODY_CHARS].rstrip(" ,;:—-") + "."
+        corpus.append(body)
+    return corpus or ["🔥 Отличный занос на стриме! Ставка сыграла, бонусная игра выдала серию множителей."]
+
+
+class MockLLM:
+    """Состояние сервера: настройки, корпус, генератор случайных чисел и статистика."""
+
+    def __init__(self, latency: Callable[[random.Random], float], error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, defect_rate: float = 0.0, seed: int = 0,
+                 corpus: Optional[List[str]] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.defect_rate = defect_rate
+        self.rng = random.Random(seed)
+        self.corpus = corpus if corpus is not None else load_corpus()
+        self.reset()
+
+    def reset(self):
+        self.requests: List[Dict] = []
+        self.started = time.time()
+
+    # ─────────────────────────────────────────────────────────────
+    # Ответы
+    # ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _streamer(prompt: str) -> str:
+        """Ник стримера из промпта поста (пустая строка — пост без ника)."""
+        for pattern in _STREAMER_RES:
+            match = pattern.search(prompt)
+            if match:
+                return match.group(1).strip()
+        return ""
+
+    def _post(self, defect: bool = False, streamer: str = "") -> str:
+        # Тело без случайных совпадений с ником: иначе проверка насчитает лишние упоминания
+        corpus = [b for b in self.corpus if streamer.lower() not in b.lower()] if streamer else self.corpus
+        body = self.rng.choice(corpus or self.corpus)
+        if streamer:
+            body = f"{streamer} снова в игре! {body}"
+        links = f"👉 {BENCH_URL1}\n{BENCH_BONUS1}"
+        if not defect:
+            links += f"\n\n👉 {BENCH_URL2}\n{BENCH_BONUS2}"
+        return f"{body}\n\n{links}"
+
+    def _maybe_defective_post(self, streamer: str = "") -> str:
+        return self._post(defect=self.rng.random() < self.defect_rate, streamer=streamer)
+
+    def _bonus_pool(self, prompt: str) -> str:
+        original = BENCH_BONUS2 if BENCH_BONUS2 in prompt and BENCH_BONUS1 not in prompt else BENCH_BONUS1
+        count = 40
+        match = re.search(r"(\d+)\s+(?:штук|вариант|описани|descrip|variant)", prompt)
+        if match:
+            count = min(100, int(match.group(1)))
+        items = [
+            f"{self.rng.choice(_BONUS_LEADS)} {original} {self.rng.choice(_BONUS_TAILS)} (#{i + 1})"
+            for i in range(count)
+        ]
+        return json.dumps(items, ensure_ascii=False)
+
+    def _batch(self, prompt: str) -> str:
+        # [вступление, номер, секция, номер, секция, ...] — ник ищем в секции своего поста
+        parts = _BATCH_HEADER_RE.split(prompt)
+        sections = {int(n): section for n, section in zip(parts[1::2], parts[2::2])}
+        posts = [{"id": n, "text": self._maybe_defective_post(self._streamer(sections[n]))}
+                 for n in sorted(sections)]
+        return json.dumps({"posts": posts}, ensure_ascii=False)
+
+    def _repair(self, prompt: str) -> str:
+        """Присланный текст с исправленным нарушением из правила перед «———»."""
+        rule, _, text = prompt.partition("———")
+        text = text.strip()
+        streamer = _REPAIR_STREAMER_RE.search(rule)
+        if streamer:
+            nick = streamer.group(1)
+            # Ровно в таком написании и не больше двух раз
+            text = re.sub(re.escape(nick), nick, text, flags=re.I)
+            if nick not in text:
+                text = f"{nick} снова в игре! {text}"
+            while text.count(nick) > 2:
+                head, _, tail = text.rpartition(nick)
+                text = head + "стример" + tail
+            return text
+        missing = [(url, desc) for url, desc in _REPAIR_LINK_RE.findall(rule) if url not in text]
+        if missing:
+            for url, desc in missing:
+                text += f"\n\n👉 {url}\n{desc or BENCH_BONUS2}"
+            return text
+        window = _REPAIR_LENGTH_RE.search(rule)
+        if window:
+            low, high = int(window.group(1)), int(window.group(2))
+            body, sep, links = text.partition("\n\n👉")
+            while len(body) + len(sep) + len(links) < low:
+                body += " " + self.rng.choice(self.corpus)
+            if len(body) + len(sep) + len(links) > high:
+                keep = max(0, high - len(sep) - len(links) - 1)
+                body = body[:keep].rstrip(" ,;:—-") + "."
+            return body + sep + links
+        return text
+
+    def _uniqueness(self, model: str, prompt: str) -> str:
+        ids = sorted({int(n) for n in re.findall(r'"id":\s*(\d+)', prompt)})
+        duplicates = []
+        if "flash" in model and len(ids) >= 2:
+            duplicates.append({"post1": ids[0], "post2": ids[1], "reason": "похожее начало", "similarity": 72})
+        return json.dumps({
+            "duplicates": duplicates,
+            "warnings": [],
+            "total_unique": len(ids) - len(duplicates),
+            "summary": "mock: проверка выполнена",
+        }, ensure_ascii=False)
+
+    def completion_text(self, body: Dict, headers) -> tuple:
+        """(вид запроса, текст ответа)"""
+        messages = body.get("messages") or []
+        system = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+        user = "\n".join(m.get("content") or "" for m in messages if m.get("role") != "system")
+        if "Uniqueness" in headers.get("X-Title", ""):
+            return "uniqueness", self._uniqueness(body.get("model", ""), user)
+        if "JSON" in system and ("массив" in system or "array" in system.lower()) and "═══" not in user:
+            return "bonus_pool", self._bonus_pool(user)
+        if _BATCH_HEADER_RE.search(user):
+            return "batch", self._batch(user)
+        if "———" in user:
+            return "repair", self._repair(user)
+        return "post", self._maybe_defective_post(self._streamer(user))
+
+    # ─────────────────────────────────────────────────────────────
+    # HTTP
+    # ─────────────────────────────────────────────────────────────
+
+    async def handle_completion(self, request: web.Request) -> web.Response:
+        received = time.monotonic()
+        body = await request.json()
+        model = body.get("model", "mock")
+        delay = max(0.0, self.latency(self.rng))
+        roll = self.rng.random()
+        kind, text = self.completion_text(body, request.headers)
+        await asyncio.sleep(delay)
+
+        record = {"kind": kind, "model": model, "latency": 0.0, "status": 200}
+        self.requests.append(record)
+        if roll < self.rate_limit_rate:
+            record.update(status=429, latency=time.monotonic() - received)
+            return web.json_response({"error": {"message": "mock: rate limited", "code": 429}},
+                                     status=429, headers={"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            record.update(status=500, latency=time.monotonic() - received)
+            return web.json_response({"error": {"message": "mock: upstream error", "code": 500}}, status=500)
+
+        prompt_tokens = estimate_messages_tokens(body.get("messages") or [])
+        completion_tokens = estimate_tokens(text)
+        record["latency"] = time.monotonic() - received
+        return web.json_response({
+            "id": f"mock-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"since": self.started, "requests": self.requests})
+
+    async def handle_reset(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.json_response({"ok": True})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_post("/api/v1/chat/completions", self.handle_completion)
+        app.router.add_post("/v1/chat/completions", self.handle_completion)
+        app.router.add_get("/__stats", self.handle_stats)
+        app.router.add_post("/__reset", self.handle_reset)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный OpenAI-совместимый сервер для бенчмарков")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:0.4,0.5",
+                        help="fixed:S | uniform:A,B | lognormal:MEDIAN,SIGMA (секунды)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="доля ответов 429")
+    parser.add_argument("--defect-rate", type=float, default=0.1, help="доля постов без второй ссылки")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockLLM(parse_latency(args.latency), args.error_rate, args.rate_limit_rate,
+                     args.defect_rate, args.seed)
+    print(f"🧪 Mock LLM: http://{args.host}:{args.port}/api/v1 ({len(server.corpus)} постов в корпусе)")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
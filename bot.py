@@ -5,21 +5,24 @@
 
 import asyncio
 import sys
+import time
+
+# Засекаем до остальных импортов — для отчёта о времени старта
+_STARTUP_STARTED = time.perf_counter()
+
 from pathlib import Path
 from aiogram import Bot, Dispatcher, types
 from aiogram.filters import Command
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
-from aiogram.fsm.storage.memory import MemoryStorage
 
+from src.cassette import get_cassette
 from src.config import Config
 from src.config_manager import ConfigManager
 from src.logger import BotLogger
+from src.fsm_storage import SQLiteStorage
 # ChatScanner удален - используем TelethonClientManager
-from src.handlers.streamer_posts_handlers import register_streamer_handlers
-from src.handlers.image_posts_handlers import register_image_posts_handlers
-from src.handlers.spanish_posts_handlers import register_spanish_handlers
-from src.handlers.italian_posts_handlers import register_italian_handlers
-from src.handlers.french_posts_handlers import register_french_handlers
+from src.handlers.job_handlers import register_job_handlers, offer_unfinished_jobs
+from src.handlers.scenario_loader import ScenarioLoader
 
 
 class StreamerPostsBot:
@@ -29,6 +32,9 @@ class StreamerPostsBot:
         # Создаём директорию для логов
         Path("logs").mkdir(exist_ok=True)
         
+        # Кассета (CASSETTE_MODE) открывается первой: random сидируется до любых выборов
+        get_cassette()
+        
         # Загрузка конфигурации
         self.config = Config.from_env()
         
@@ -38,7 +44,8 @@ class StreamerPostsBot:
         
         # Инициализация бота и диспетчера
         self.bot = Bot(token=self.config.bot.bot_token)
-        self.dp = Dispatcher(storage=MemoryStorage())
+        # FSM в SQLite: состояние сценариев переживает рестарт
+        self.dp = Dispatcher(storage=SQLiteStorage())
         
         # Chat scanner убран - используем TelethonClientManager в handlers
         self.chat_scanner = None
@@ -48,11 +55,10 @@ class StreamerPostsBot:
         
         # Регистрация обработчиков
         self._register_base_handlers()
-        register_streamer_handlers(self)
-        register_image_posts_handlers(self)
-        register_spanish_handlers(self)
-        register_italian_handlers(self)
-        register_french_handlers(self)
+        register_job_handlers(self)
+        # Сценарии (RU/ES/IT/FR/картинки) регистрируются лениво — при первом обращении
+        self.scenarios = ScenarioLoader(self)
+        self.scenarios.register()
         
         self.logger.info("✅ Бот инициализирован")
     
@@ -250,6 +256,12 @@ class StreamerPostsBot:
             
             # Chat scanner удален - Telethon инициализируется в handlers при первом использовании
             
+            # Время и память старта; фоновая предзагрузка сценариев (SCENARIOS_PRELOAD)
+            await self.scenarios.start(_STARTUP_STARTED)
+            
+            # Задачи, прерванные прошлым рестартом, — предлагаем продолжить
+            await offer_unfinished_jobs(self)
+            
             # Запускаем polling
             await self.dp.start_polling(self.bot)
             
@@ -22,6 +22,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import json
 
+from src.cassette import http_session
+
 
 @dataclass
 class GeneratedImage:
@@ -189,7 +191,7 @@ class AIImageGenerator:
             "max_tokens": 4096
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session() as session:
             async with session.post(
                 f"{self.base_url}/chat/completions",
                 headers=headers,
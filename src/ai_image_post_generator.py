@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 from openai import AsyncOpenAI
 
 from src.topic_manager import TopicManager, Topic
+from src.cassette import pace
+from src.hedging import timed_completion
 from src.image_posts_db import ImagePostsDB
 from src.ai_image_generator import AIImageGenerator, GeneratedImage
 
@@ -309,18 +311,15 @@ class AIImagePostGenerator:
                 
                 # Генерируем текст
                 try:
-                    response = await asyncio.wait_for(
-                        self.client.chat.completions.create(
-                            model=self.model,
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": prompt}
-                            ],
-                            max_tokens=1500,
-                            temperature=0.9
-                        ),
-                        timeout=120
-                    )
+                    response = await timed_completion(self.client, {
+                        "model": self.model,
+                        "messages": [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "max_tokens": 1500,
+                        "temperature": 0.9,
+                    }, "image_topic_post", timeout=120)
                 except asyncio.TimeoutError:
                     raise Exception(f"Таймаут: модель {self.model} не ответила за 120с")
                 
@@ -387,7 +386,7 @@ class AIImagePostGenerator:
             except Exception as e:
                 last_error = e
                 print(f"❌ Ошибка генерации поста #{index} (попытка {attempt}): {e}")
-                await asyncio.sleep(1)
+                await pace(1)
         
         # Fallback если все попытки провалились
         print(f"⚠️ Используем fallback для поста #{index}")
@@ -444,7 +443,7 @@ class AIImagePostGenerator:
             posts.append(post)
             
             # Небольшая задержка между запросами
-            await asyncio.sleep(0.5)
+            await pace(0.5)
         
         if progress_callback:
             await progress_callback(count, count)
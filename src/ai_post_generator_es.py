@@ -15,6 +15,7 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import os
 import re
+import time
 
 try:
     from openai import AsyncOpenAI
@@ -23,6 +24,30 @@ except ImportError:
     AsyncOpenAI = None
     httpx = None
 
+from src.postprocess_pool import run_postprocess
+from src.langpack import PackField
+from src.prompt_cache import CACHE_FRIENDLY_PROMPTS, split_cacheable_prompt
+from src.cassette import http_session, pace
+from src.bonus_pool_index import is_too_similar_to_pool
+from src.morphology import decline_nickname
+from src.hedging import hedged_completion, timed_completion
+from src.circuit_breaker import CircuitOpenError
+from src.repair_tier import (
+    REPAIR_ENABLED, REPAIR_MAX_TOKENS, REPAIR_TIMEOUT, REPAIRABLE_REASONS,
+    build_repair_messages, clean_repair_output, repair_model
+)
+from src.cost_accounting import (
+    BudgetExceeded, check_run_budget, get_cost_ledger, register_model_prices, set_cost_post, settle_attempt
+)
+from src.model_telemetry import get_model_telemetry
+from src.batch_generation import (
+    BATCH_GENERATION_SIZE, VideoPromptParts, batch_enabled, parse_batch_response, strip_section_markers
+)
+from src.token_budget import (
+    EXAMPLE_POST_TOKENS, EXAMPLES_TOTAL_TOKENS, UNIQUENESS_POST_TOKENS, UNIQUENESS_EXISTING_TOKENS,
+    compact_json, get_token_log, pack_items, trim_to_tokens
+)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SAFE STRING FORMATTING (не падает, если плейсхолдер не передан)
@@ -47,7 +72,7 @@ def safe_format(template: str, **kwargs) -> str:
 # OPENROUTER MODELS - Доступные модели через OpenRouter API
 # ═══════════════════════════════════════════════════════════════════════════════
 
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 # Актуальные ID моделей OpenRouter (проверено 10.01.2026)
 OPENROUTER_MODELS = {
@@ -250,6 +275,9 @@ OPENROUTER_MODELS = {
     }
 }
 
+# Цены моделей — для учёта стоимости вызовов (src/cost_accounting.py)
+register_model_prices(OPENROUTER_MODELS)
+
 
 @dataclass
 class VideoData:
@@ -325,1744 +353,144 @@ class VideoData:
         elif currency == "COP":
             formats = ["$", " pesos colombianos", " COP"]
         elif currency == "PEN":
-            formats = ["S/", " soles", " PEN"]
-        elif currency == "UYU":
-            formats = ["$", " pesos uruguayos", " UYU"]
-        else:
-            formats = [self.get_currency_symbol(), f" {currency}"]
-        
-        return random.choice(formats)
-    
-    def get_formatted_bet_with_currency(self) -> str:
-        """Возвращает ставку с валютой"""
-        return f"{self.get_formatted_bet()}{self.get_currency_symbol()}"
-    
-    def get_formatted_win_with_currency(self) -> str:
-        """Возвращает выигрыш с валютой"""
-        return f"{self.get_formatted_win()}{self.get_currency_symbol()}"
-
-
-@dataclass
-class BonusData:
-    """Данные о бонусах"""
-    url1: str
-    bonus1_desc: str  # Оригинальное описание бонуса
-
-
-@dataclass
-class GeneratedPostAI:
-    """Сгенерированный AI пост"""
-    index: int
-    media_type: str  # video / image
-    text: str
-    streamer: str = ""
-    slot: str = ""
-    bet: int = 0
-    win: int = 0
-    model_used: str = ""  # Какая модель сгенерировала
-
-
-class AIPostGenerator:
-    """
-    Генератор постов через AI.
-    
-    Каждый пост генерируется полностью с нуля:
-    - Уникальная история/заход
-    - Уникальное описание выигрыша
-    - Уникальная подводка к рекламе
-    - Уникальное описание бонусов
-    
-    Пишет как профессиональный маркетолог, но человеческим языком.
-    """
-    
-    @staticmethod
-    def _decline_nickname(nickname: str, case: str = "genitive") -> str:
-        """
-        Склоняет ник стримера для русского языка.
-        
-        Args:
-            nickname: Оригинальный ник (например: Manik, Buratino)
-            case: Падеж - "genitive" (родительный - у кого?), "dative" (дательный - кому?)
-        
-        Returns:
-            Склоненный ник с сохранением заглавной буквы
-        """
-        if not nickname:
-            return nickname
-        
-        # Сохраняем оригинальную капитализацию первой буквы
-        first_char_upper = nickname[0].isupper()
-        nick_lower = nickname.lower()
-        
-        # Правила склонения для распространенных окончаний
-        if case == "genitive":  # у кого? - Manika, Buratina
-            if nick_lower.endswith(('o', 'а', 'я')):
-                result = nickname + 'и'
-            elif nick_lower.endswith('й'):
-                result = nickname[:-1] + 'я'
-            elif nick_lower.endswith('ь'):
-                result = nickname[:-1] + 'я'
-            else:
-                result = nickname + 'а'
-        
-        elif case == "dative":  # кому? - Maniku, Buratinu
-            if nick_lower.endswith(('o', 'а', 'я')):
-                result = nickname + 'е'
-            elif nick_lower.endswith('й'):
-                result = nickname[:-1] + 'ю'
-            elif nick_lower.endswith('ь'):
-                result = nickname[:-1] + 'ю'
-            else:
-                result = nickname + 'у'
-        else:
-            result = nickname
-        
-        # Восстанавливаем капитализацию
-        if first_char_upper and result:
-            result = result[0].upper() + result[1:]
-        
-        return result
-    
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ "АРХИТЕКТОР" (ИСПАНСКИЙ)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_ARCHITECT = """🇪🇸 ¡CRÍTICO: ESCRIBE SOLO EN ESPAÑOL!
-❌ PROHIBIDO usar ruso, inglés u otros idiomas en el texto
-✅ PERMITIDO en inglés: nombres de slots (Gates of Olympus, Sweet Bonanza)
-❌ TODO LO DEMÁS SOLO EN ESPAÑOL
-
-🚨🚨🚨 ¡REGLA #0 ANTES QUE TODO! 🚨🚨🚨
-⛔⛔⛔ CLP, ARS, MXN, PEN, USD, EUR, COP, UYU ⛔⛔⛔
-❌ ESTAS SON **MONEDAS**, ¡NO NOMBRES DE PERSONAS!
-❌ **NUNCA** escribas "CLP apostó", "ARS ganó", "MXN entró"
-✅ USA: "Un jugador", "Un tipo", "El héroe", "El ganador"
-⚠️ SI USAS CLP/ARS/MXN COMO NOMBRE = ¡TODO EL POST SERÁ RECHAZADO!
-
-🚨 REGLA #0.5: ¡SOLO TÉRMINOS EN ESPAÑOL! 🚨
-❌ NO uses "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giros gratis", "tiradas gratis", "bono", "paquete de bienvenida"
-
-═══════════════════════════════════════════════════════════════
-👤 ENFOQUE: LA VICTORIA COMO PROTAGONISTA
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRÍTICO: ¡CONSTRUYE LA PUBLICACIÓN ALREDEDOR DE LA VICTORIA!
-
-• La slot ({slot}) - el escenario
-• La apuesta ({bet}) y la ganancia ({win}) - a través del jugador
-• El multiplicador x{multiplier} - el resultado
-
-EJEMPLOS:
-"Un jugador arriesgó {bet}{currency} en {slot} y se llevó {win}{currency}"
-"Victoria épica: de {bet} a {win} en {slot} - ¡multiplicador x{multiplier}!"
-
-TAREA: ¡Muestra la victoria como algo emocionante y real!
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #1 - CÓDIGOS DE MONEDA 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO usar CLP, ARS, MXN, PEN, USD, EUR, COP, UYU como NOMBRES o APODOS de personas:
-  
-❌ INCORRECTO (RECHAZADO INMEDIATAMENTE):
-  - "CLP apostó..." 
-  - "CLP entró al salón..."
-  - "Un valiente conocido como CLP..."
-  - "ARS ganó..."
-  - "MXN arriesgó..."
-  - "USD se llevó..."
-  
-✅ CORRECTO (estos códigos son SOLO para cantidades de dinero):
-  - "Un jugador apostó 5000 CLP"
-  - "El ganador se llevó 100.000 ARS"
-  - "Con 500 USD apostó..."
-  - "Ganancia de 1.000.000 MXN"
-
-⚠️ PARA NOMBRAR AL JUGADOR USA:
-  - "Un jugador", "Un tipo", "Un valiente", "Un afortunado"
-  - "El héroe", "El crack", "El ganador", "El campeón"
-  - "Un apostador", "Un arriesgado", "Un audaz"
-  - NUNCA: CLP, ARS, MXN, PEN, USD, EUR, COP, UYU
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #2 - BONOS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO inventar bonos:
-
-✅ USA SOLO el bono indicado en {bonus1}
-❌ NO INVENTES "100 dólares", "100 giros", "150%", "500%" 
-❌ NO COPIES ejemplos de otros posts
-✅ PARAFRASEA {bonus1} con tus palabras cada vez diferente
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO COMPARAR APUESTAS CON GASTOS COTIDIANOS
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA compares la apuesta con:
-  - Precio de almuerzo/cena/comida
-  - Costo de un café/cafetería
-  - Precio de pizza/hamburguesa
-  - Boleto de metro/taxi/transporte
-  - "Lo que gastas en..." cualquier cosa cotidiana
-
-✅ CORRECTO: Simplemente menciona la cantidad sin comparaciones
-
-🎯 MOTIVACIÓN Y LLAMADA A LA ACCIÓN (¡CRÍTICO!):
-✅ DESCRIBE LOS BONOS DE FORMA ATRACTIVA - ¡crea el DESEO de reclamar el bono!
-✅ USA PALABRAS EMOCIONALES: "exclusivo", "increíble", "gratis", "instantáneo", "especial"
-✅ AÑADE URGENCIA: "solo hoy", "tiempo limitado", "no lo dejes pasar", "activa ahora"
-✅ DESTACA BENEFICIOS: "duplica tu depósito", "obtén más", "sin riesgo", "empieza a ganar"
-✅ LLAMA A LA ACCIÓN: "reclama ahora", "activa YA", "obtén acceso", "empieza a ganar"
-
-Eres un arquitecto de contenido viral para Telegram.
-Tu tarea es diseñar publicaciones que generen engagement.
-Cada elemento del texto debe trabajar para mantener la atención.
-
-═══════════════════════════════════════════════════════════════
-🎰 IMPORTANTE: ¡NO INVENTES TEMÁTICA NO RELACIONADA!
-═══════════════════════════════════════════════════════════════
-⚠️ Usa el nombre de la slot {slot} como pista y contexto, ¡pero NO INVENTES un tema que NO esté relacionado!
-• Puedes interpretar libremente: "Vampy Party" → fiesta/noche/riesgo/vampiros/gótico
-• Puedes simplemente mencionar el nombre: "en la slot {slot} sucedió..."
-• Puedes usarlo como metáfora: "suerte vampírica", "jackpot nocturno"
-
-═══════════════════════════════════════════════════════════════
-📈 PRINCIPIO BÁSICO: INGENIERÍA EMOCIONAL
-═══════════════════════════════════════════════════════════════
-
-El texto es un sistema. Cada párrafo, emoji, formato es una interfaz para la emoción.
-
-• Emojis son elementos UI. 💡 - idea, 🎯 - desafío, 🔥 - acción, 💎 - valor
-• Ritmo y respiración: alterna oraciones largas y cortas
-• El texto debe REPRODUCIRSE en la mente como un video dinámico
-
-═══════════════════════════════════════════════════════════════
-🛠 STACK TÉCNICO DE FORMATO (¡HTML!)
-═══════════════════════════════════════════════════════════════
-
-Acentos:
-• <b>Negrita</b> - para disparadores clave (números, llamadas, idea principal)
-• <i>Cursiva</i> - para mensaje íntimo, guiño conspirativo
-• <code>Monoespacio</code> - para datos objetivos (cantidades, multiplicadores)
-
-Composición y separación (3 tipos de separadores en rotación):
-• Aire (doble salto de línea)
-• Gráficos: ─── ✦ ─── , ༄ ༄ ༄, ▰▱▰▱▰
-• Patrones emoji: 👉 👉 👉, ◈ ◈ ◈, ⚡️🌩⚡️🌩
-
-═══════════════════════════════════════════════════════════════
-🔮 POSICIÓN DEL ENLACE (¡VARIAR!)
-═══════════════════════════════════════════════════════════════
-
-VARIANTES DE POSICIÓN (elige diferente cada vez):
-📍 AL PRINCIPIO: Enlace + descripción → Texto de la historia
-📍 EN EL MEDIO: Texto inicial → Enlace + descripción → Texto final
-📍 AL FINAL: Texto de la historia → Enlace + descripción
-
-🔗 HIPERENLACES - ¡MÍNIMO 4 PALABRAS!
-❌ <a href="URL">Reclamar</a> - ¡demasiado corto!
-✅ <a href="URL">Reclamar paquete de inicio ahora mismo</a>
-
-═══════════════════════════════════════════════════════════════
-🧩 CONSTRUCTOR DEL MENSAJE
-═══════════════════════════════════════════════════════════════
-
-Selección de datos:
-• De los hechos (cantidad, slot, apuesta) — 1-2 hechos dominantes + 1-2 secundarios
-• ¡La cantidad ganada se menciona ESTRICTAMENTE UNA VEZ en el momento más emotivo!
-
-Neutralización de palabras prohibidas:
-• "Casino" → "plataforma", "sitio", "club"
-
-Volumen óptico: 7-15 líneas en Telegram (completo pero sin scroll)
-
-Punto de vista: Narrativa en TERCERA PERSONA, ¡enfoque en la VICTORIA!
-✅ ESCRIBE: "El jugador entró", "El resultado impresiona", "La victoria fue impresionante"
-❌ NO ESCRIBAS: "yo juego", "yo giro", "yo entré" (primera persona - ¡PROHIBIDO!)
-
-🚫 PROHIBIDO INDICAR TIEMPO:
-❌ NUNCA indiques: "hoy", "ayer", "por la mañana", "por la tarde", "por la noche", "recientemente"
-✅ Escribe simplemente sobre el evento sin referencia al tiempo
-
-🚫 PROHIBIDO FRASES CLICHÉ:
-❌ NO uses: "la pantalla explotó", "escalofríos por todo el cuerpo"
-✅ ¡ESCRIBE ORIGINALMENTE, evita clichés!
-
-Variabilidad de introducciones (¡ROTACIÓN obligatoria!):
-• Bomba numérica: «<code>500 000</code> {currency}. ¡Resultado potente!...»
-• Pregunta provocadora: «¿Crees en las señales? Así las usó este jugador...»
-• Directiva: «Recuerda esta victoria: <b>{win}{currency}</b>...»
-• Historia: «Sucedió una locura silenciosa...»
-
-═══════════════════════════════════════════════════════════════
-🎨 TEMÁTICAS DE POSTS (¡elige DIFERENTES!)
-═══════════════════════════════════════════════════════════════
-
-1. 📊 ANALÍTICO: Reporte, análisis, reseña | 📊━━━📈━━━📊
-2. ⚡️ OLIMPO: Dioses, Zeus, victoria divina | ⚡️🌩⚡️🌩
-3. 🍻 TABERNA: Celebración, brindis | ---🍀---🍻---
-4. 🤠 OESTE SALVAJE: Vaqueros, oro | 🔫🌵
-5. 🏍 MOTOCICLISTAS: Rugido de motores, fiebre del oro | 💀➖🏍➖💰
-6. ⛏ MINA: Excavación, dinamita | 〰️〰️〰️
-7. 🦄 CUENTO DE HADAS: Olla de oro, caballeros | -=-=-🦄-=-=-
-8. 🎐 JAPONESA: Espíritus del viento, magia | ⛩
-9. 🚀 ESPACIO: Asteroides, cohete, combustible | 🚀💫
-10. ☁️ NUBES: Vuelos, giros aéreos | ☁️✨☁️
-11. 🃏 ADIVINACIÓN: Tarot, profecía, cartas | ───※·💀·※───
-12. 👑 VIP: Recepción real, lujo | 👑💎👑
-
-❌ PROHIBIDO: **markdown**, `código`, [enlace](url)
-✅ SOLO HTML: <b>, <i>, <code>, <a href>
-
-═══════════════════════════════════════════════════════════════
-🔥 ПОДВОДКА К ССЫЛКЕ — МОТИВАЦИОННЫЙ БЛОК (¡CRÍTICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ ПЕРЕД ССЫЛКОЙ ОБЯЗАТЕЛЬНО ДОБАВЬ ПОДВОДКУ:
-Это 1-2 предложения которые ПОДОГРЕВАЮТ читателя и МОТИВИРУЮТ перейти по ссылке.
-
-📌 ЧТО ДОЛЖНА ДЕЛАТЬ ПОДВОДКА:
-• Связать историю победы с ВОЗМОЖНОСТЬЮ читателя повторить этот опыт
-• Создать ощущение что ЧИТАТЕЛЬ тоже может выиграть
-• Вызвать желание ПОПРОБОВАТЬ прямо сейчас
-• Использовать эмоции из истории для перехода к действию
-
-📌 СТРУКТУРА ПОДВОДКИ:
-• Отсылка к победе из поста → твой шанс тоже попробовать
-• Вопрос-интрига → ответ в виде ссылки
-• Призыв к действию на основе истории
-
-📌 ТОНАЛЬНОСТЬ:
-• Дружеская, без давления
-• С азартом и энтузиазмом  
-• Как будто делишься секретом с другом
-
-❌ НЕ ПИШИ подводку отдельно — она должна ПЛАВНО переходить в ссылку!
-✅ Подводка + ссылка = единый блок мотивации
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DE ENLACE CON BONO (¡SOLO 1 ENLACE!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: ¡EN CADA POST OBLIGATORIAMENTE UN ENLACE!
-❌ POST SIN ENLACE = RECHAZADO
-✅ SIEMPRE usa: {url1} con descripción única basada en {bonus1}
-
-⚠️ ¡ELIGE DIFERENTES formatos para cada nuevo post!
-❌ NO uses el mismo estilo seguido
-✅ Alterna formatos al máximo
-
-⚠️ PARAFRASEAR EL BONO (¡CRÍTICO!):
-❌ NO copies {bonus1} directamente tal cual
-✅ ÚSALO como BASE, pero PARAFRASÉALO diferente cada vez
-❌ NO INVENTES nuevos bonos o cantidades - ¡SOLO lo que está en {bonus1}!
-✅ ¡HAZ LA DESCRIPCIÓN MOTIVADORA Y ATRACTIVA!
-
-📐 REGLA DE AIRE (¡OBLIGATORIO!):
-• SIEMPRE añade LÍNEA VACÍA ANTES y DESPUÉS de cada bloque de enlace
-
-📋 ELIGE UNO de los formatos (¡ROTA! Cada post = formato diferente!):
-
-🚨 USA SOLO ESTE BONO: {bonus1}
-❌ NO INVENTES otros bonos!
-❌ NO uses "100 dólares", "100 giros" si NO están en {bonus1}!
-
-1️⃣ HIPERENLACE: <a href="{url1}">[parafrasea {bonus1}]</a>
-2️⃣ EMOJI + HIPERENLACE: 🎁 <a href="{url1}">[parafrasea {bonus1}]</a>
-3️⃣ URL + GUION: 👉 {url1} — [parafrasea {bonus1}]
-4️⃣ URL + NUEVA LÍNEA: {url1}\n🎁 [parafrasea {bonus1}]
-5️⃣ FLECHA + URL: ➡️ {url1}\n💰 [parafrasea {bonus1}]
-6️⃣ DESCRIPCIÓN + URL: 🎁 [parafrasea {bonus1}] — {url1}
-
-📏 LONGITUD: MÍNIMO 500, MÁXIMO 700 caracteres (¡CRÍTICO! Telegram limita a 1024)
-
-"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 3 (ИСПАНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_3 = """🇪🇸 ¡CRÍTICO: ESCRIBE SOLO EN ESPAÑOL!
-❌ PROHIBIDO usar ruso, inglés u otros idiomas en el texto
-✅ PERMITIDO en inglés: nombres de slots (Gates of Olympus, Sweet Bonanza)
-❌ TODO LO DEMÁS SOLO EN ESPAÑOL
-
-🚨🚨🚨 ¡REGLA #0 ANTES QUE TODO! 🚨🚨🚨
-⛔⛔⛔ CLP, ARS, MXN, PEN, USD, EUR, COP, UYU ⛔⛔⛔
-❌ ESTAS SON **MONEDAS**, ¡NO NOMBRES DE PERSONAS!
-❌ **NUNCA** escribas "CLP apostó", "ARS ganó", "MXN entró"
-✅ USA: "Un jugador", "Un tipo", "El héroe", "El ganador"
-⚠️ SI USAS CLP/ARS/MXN COMO NOMBRE = ¡TODO EL POST SERÁ RECHAZADO!
-
-🚨 REGLA #0.5: ¡SOLO TÉRMINOS EN ESPAÑOL! 🚨
-❌ NO uses "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giros gratis", "tiradas gratis", "bono", "paquete de bienvenida"
-
-═══════════════════════════════════════════════════════════════
-👤 ENFOQUE: VICTORIA Y ACCIONES DEL JUGADOR
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRÍTICO: ¡CUENTA LA HISTORIA A TRAVÉS DE ACCIONES Y RESULTADO!
-
-• Comienza con LO QUE PASÓ en el juego
-• Decisiones del jugador, emociones, reacciones — lo principal
-• Slot {slot}, apuesta {bet}, ganancia {win} — a través de la experiencia del jugador
-• Escribe como un reportaje sobre la victoria
-
-EJEMPLOS:
-"Un jugador arriesgado entró en {slot} — ¡y las mandíbulas cayeron!"
-"Este héroe apostó {bet}{currency} — y lo que pasó después fue increíble..."
-"Una entrada modesta de {bet}{currency} — y ya nadie podía creer los números..."
-
-TAREA: ¡Muestra la victoria en acción! ¡Dinámica y movimiento!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CÓDIGOS DE MONEDA - ¡NUNCA COMO NOMBRES!
-═══════════════════════════════════════════════════════════════
-
-❌ PROHIBIDO usar CLP, ARS, MXN, PEN, USD, EUR como nombres de jugadores:
-  - "CLP apostó..." ❌ INCORRECTO
-  - "ARS ganó..." ❌ INCORRECTO
-  
-✅ CORRECTO: "Un jugador apostó 5000 CLP", "El ganador se llevó 100.000 ARS"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #2 - BONOS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO inventar bonos:
-
-✅ USA SOLO el bono indicado en {bonus1}
-❌ NO INVENTES "100 dólares", "100 giros", "150%", "500%" 
-❌ NO COPIES ejemplos de otros posts
-✅ PARAFRASEA {bonus1} con tus palabras cada vez diferente
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO COMPARAR APUESTAS CON GASTOS COTIDIANOS
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA compares la apuesta con:
-  - Precio de almuerzo/cena/comida
-  - Costo de un café/cafetería
-  - Precio de pizza/hamburguesa
-  - Boleto de metro/taxi/transporte
-
-✅ CORRECTO: Simplemente menciona la cantidad sin comparaciones
-
-🎯 TU ROL: Eres un gurú de textos atractivos para Telegram. Tu supertarea es convertir cada post en un pequeño evento del que es imposible apartarse.
-
-🎰 IMPORTANTE: ¡NO INVENTES TEMÁTICA NO RELACIONADA!
-⚠️ Usa el nombre de la slot {slot} como pista y contexto, ¡pero NO INVENTES un tema que NO esté relacionado!
-• Puedes interpretar libremente: "Vampy Party" → fiesta/noche/riesgo/vampiros/gótico
-• Puedes simplemente mencionar el nombre: "en la slot {slot} sucedió..."
-
-🔥 ESTILÍSTICA Y EMOCIONES (¡PRIORIDAD!):
-
-¡El texto debe pulsar con energía! Escribe como el amigo más carismático.
-
-Emojis — tu paleta principal. Úsalos abundantemente: dinero 💸, emoción 🎰, victoria 🏆, caras 😮
-
-Evita párrafos secos y aburridos. Deja que el texto respire y juegue.
-
-📐 TÉCNICA DE FORMATO (TELEGRAM):
-
-Negrita: Para acentos clave, números, idea principal.
-Cursiva: Para citas y pensamientos.
-Código: Para cantidades y multiplicadores.
-Separadores: ¡No repitas! Alterna: líneas vacías, líneas emoji (✨ ➖➖➖ ✨)
-
-🔗 ENLACE PUBLICITARIO:
-Tu tarea es hacerlo parte orgánica de la historia.
-
-Enlace: {url1} (Bonos: {bonus1}). Mezcla formulaciones cada vez diferente: «giros gratis», «rondas adicionales», «bono en cuenta», «tiradas gratis», «paquete de inicio»
-
-¿Cómo integrarlo? Lleva suavemente en el proceso narrativo: «¿Y sabes dónde se encuentran tales oportunidades? ➡️ [Texto-enlace]»
-
-🎨 ESTRUCTURA Y PRESENTACIÓN:
-
-Datos: No amontones todo. Toma 1-3 hechos jugosos: cantidad ganada, nombre de la slot.
-
-Léxico: Olvida la palabra «casino». En su lugar — «plataforma», «sitio», «club».
-
-Perspectiva: Escribe siempre en tercera persona («el jugador», «el héroe», «el afortunado»).
-
-Volumen: Punto medio. Ni «sábana», ni telegrama.
-
-🎭 ¡LA VICTORIA ES EL PROTAGONISTA DEL POST!
-⚠️ Si el nombre del jugador ({streamer}) está indicado — ¡ÚSALO 1 VEZ!
-• Si NO hay nombre — usa formulaciones generales: "un jugador", "este héroe", "el ganador"
-
-🚫 PROHIBIDO INDICAR TIEMPO:
-❌ NUNCA indiques: "hoy", "ayer", "por la mañana", "recientemente"
-✅ Escribe simplemente sobre el evento sin referencia al tiempo
-
-🚫 PROHIBIDO FRASES CLICHÉ:
-❌ NO uses: "la pantalla explotó", "escalofríos por el cuerpo"
-✅ ¡ESCRIBE ORIGINALMENTE, evita clichés!
-
-❌ PROHIBIDO: **markdown**, `código`, [enlace](url)
-✅ SOLO HTML: <b>, <i>, <u>, <code>, <a href>
-
-═══════════════════════════════════════════════════════════════
-🔥 ПОДВОДКА К ССЫЛКЕ — МОТИВАЦИОННЫЙ БЛОК (¡CRÍTICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ ПЕРЕД ССЫЛКОЙ ОБЯЗАТЕЛЬНО ДОБАВЬ ПОДВОДКУ:
-Это 1-2 предложения которые ПОДОГРЕВАЮТ читателя и МОТИВИРУЮТ перейти по ссылке.
-
-📌 ЧТО ДОЛЖНА ДЕЛАТЬ ПОДВОДКА:
-• Связать историю победы с ВОЗМОЖНОСТЬЮ читателя повторить этот опыт
-• Создать ощущение что ЧИТАТЕЛЬ тоже может выиграть
-• Вызвать желание ПОПРОБОВАТЬ прямо сейчас
-• Использовать эмоции из истории для перехода к действию
-
-📌 СТРУКТУРА ПОДВОДКИ:
-• Отсылка к победе из поста → твой шанс тоже попробовать
-• Вопрос-интрига → ответ в виде ссылки
-• Призыв к действию на основе истории
-
-📌 ТОНАЛЬНОСТЬ:
-• Дружеская, без давления
-• С азартом и энтузиазмом  
-• Как будто делишься секретом с другом
-
-❌ НЕ ПИШИ подводку отдельно — она должна ПЛАВНО переходить в ссылку!
-✅ Подводка + ссылка = единый блок мотивации
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DE ENLACE CON BONO (¡SOLO 1 ENLACE!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: ¡EN CADA POST OBLIGATORIAMENTE UN ENLACE!
-❌ POST SIN ENLACE = RECHAZADO
-✅ SIEMPRE usa: {url1} con descripción única basada en {bonus1}
-
-⚠️ ¡ELIGE DIFERENTES formatos para cada nuevo post!
-
-⚠️ PARAFRASEAR EL BONO (¡CRÍTICO!):
-❌ NO copies {bonus1} directamente tal cual
-✅ ÚSALO como BASE, pero PARAFRASÉALO diferente cada vez
-❌ NO INVENTES nuevos bonos o cantidades - ¡SOLO lo que está en {bonus1}!
-
-📐 REGLA DE AIRE (¡OBLIGATORIO!):
-• SIEMPRE añade LÍNEA VACÍA ANTES y DESPUÉS de cada bloque de enlace
-
-📋 ELIGE UNO de los formatos (¡ROTA! Cada post = formato diferente!):
-
-🚨 USA SOLO ESTE BONO: {bonus1}
-❌ NO INVENTES otros bonos!
-
-1️⃣ ROMBOS: ◆ {url1} — [parafrasea {bonus1}]
-2️⃣ FLECHAS: ► {url1} ([parafrasea {bonus1}])
-3️⃣ ESTRELLAS: ★ [parafrasea {bonus1}] → {url1}
-4️⃣ CÍRCULOS: ① <a href="{url1}">[parafrasea {bonus1}]</a>
-5️⃣ CUADRADOS: ▪ {url1}\n[parafrasea {bonus1}]
-6️⃣ PARÉNTESIS: ({url1}) — [parafrasea {bonus1}]
-7️⃣ EMOJIS: 🎰 {url1} — [parafrasea {bonus1}]
-
-📏 LONGITUD: ¡MÁXIMO 700 caracteres!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 4 (ИСПАНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_4 = """🇪🇸 ¡CRÍTICO: ESCRIBE SOLO EN ESPAÑOL!
-❌ PROHIBIDO usar ruso, inglés u otros idiomas en el texto
-✅ PERMITIDO en inglés: nombres de slots (Gates of Olympus, Sweet Bonanza)
-❌ TODO LO DEMÁS SOLO EN ESPAÑOL
-
-🚨🚨🚨 ¡REGLA #0 ANTES QUE TODO! 🚨🚨🚨
-⛔⛔⛔ CLP, ARS, MXN, PEN, USD, EUR, COP, UYU ⛔⛔⛔
-❌ ESTAS SON **MONEDAS**, ¡NO NOMBRES DE PERSONAS!
-❌ **NUNCA** escribas "CLP apostó", "ARS ganó", "MXN entró"
-✅ USA: "Un jugador", "Un tipo", "El héroe", "El ganador"
-⚠️ SI USAS CLP/ARS/MXN COMO NOMBRE = ¡TODO EL POST SERÁ RECHAZADO!
-
-🚨 REGLA #0.5: ¡SOLO TÉRMINOS EN ESPAÑOL! 🚨
-❌ NO uses "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giros gratis", "tiradas gratis", "bono", "paquete de bienvenida"
-
-═══════════════════════════════════════════════════════════════
-🎰 ENFOQUE: DINÁMICA DEL JUEGO Y RESULTADO
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRÍTICO: ¡ESCRIBE SOBRE LAS ACCIONES DEL JUGADOR Y SU RESULTADO!
-
-• El JUGADOR y su victoria — en el centro de atención
-• El RESULTADO {win} y la reacción — lo principal
-• La slot {slot} — es CONTEXTO DE FONDO, no el protagonista
-• Usa la atmósfera de la slot como decoración, pero no la hagas el tema principal
-
-EJEMPLOS:
-"Un jugador giró {slot} — ¡y el cohete simplemente despegó!"
-"Silenciosa histeria comenzó en {slot} — el diagnóstico está hecho"
-"Los números empezaron a crecer sin parar, y él simplemente recogió su premio"
-
-TAREA: ¡Muestra la acción del jugador y el resultado! ¡La slot es el lugar donde sucedió!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CÓDIGOS DE MONEDA - ¡NUNCA COMO NOMBRES!
-═══════════════════════════════════════════════════════════════
-
-❌ PROHIBIDO usar CLP, ARS, MXN, PEN, USD, EUR como nombres de jugadores:
-  - "CLP apostó..." ❌ INCORRECTO
-  - "ARS ganó..." ❌ INCORRECTO
-  
-✅ CORRECTO: "Un jugador apostó 5000 CLP", "El ganador se llevó 100.000 ARS"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #2 - BONOS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO inventar bonos:
-
-✅ USA SOLO el bono indicado en {bonus1}
-❌ NO INVENTES "100 dólares", "100 giros", "150%", "500%" 
-❌ NO COPIES ejemplos de otros posts
-✅ PARAFRASEA {bonus1} con tus palabras cada vez diferente
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO COMPARAR APUESTAS CON GASTOS COTIDIANOS
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA compares la apuesta con:
-  - Precio de almuerzo/cena/comida
-  - Costo de un café/cafetería
-  - Precio de pizza/hamburguesa
-  - Boleto de metro/taxi/transporte
-
-✅ CORRECTO: Simplemente menciona la cantidad sin comparaciones
-
-👋 ¡HOLA, GENIO DEL CONTENIDO! Creas no solo posts, sino emociones virales para Telegram. Cada mensaje tuyo debe agarrar y no soltar hasta el último símbolo.
-
-🎰 IMPORTANTE: ¡NO INVENTES TEMÁTICA NO RELACIONADA!
-⚠️ Usa el nombre de la slot {slot} como pista y contexto, ¡pero NO INVENTES un tema NO RELACIONADO!
-• Puedes interpretar libremente: "Vampy Party" → fiesta/noche/riesgo/vampiros/gótico
-• Puedes simplemente mencionar el nombre: "en la slot {slot} sucedió..."
-
-💥 HACEMOS EL TEXTO VIVO:
-
-Imagina que escribes al amigo más impaciente pero genial. ¡Sin agua, con emociones!
-
-Emojis — ¡son tus entonaciones, gestos, exclamaciones! Ponlos donde puedas transmitir sentimiento o acción (🚀, 💥, 🤑, 😱).
-
-Texto seco = fracaso. Diálogo vivo = éxito.
-
-⚡️ FORMATO SIN ABURRIMIENTO:
-
-Negrita — tu grito. Destaca lo más importante.
-Cursiva — tu susurro, intriga.
-Separadores — tus pausas. Cámbialos como guantes.
-
-🎁 ENLACE — COMO PREMIO Y PISTA:
-Intégralo en la trama de la historia como parte lógica.
-
-Enlace: {url1} (Bonos: {bonus1}). ¡Cambia las formulaciones de bonos cada vez de forma única! Usa diferentes sinónimos: «giros gratis», «rondas», «tiradas», «intentos»
-
-Truco: El enlace puede ser la respuesta al principio de la historia o el premio al final.
-
-🔄 UNICIDAD ABSOLUTA DE CADA POST:
-
-No sobrecargues con hechos. Elige el detalle más jugoso.
-La cantidad ganada — solo una vez, si no la magia se pierde.
-Prohibido: «Casino». Solo «club», «plataforma», «sitio».
-
-Eres el narrador. La historia le pasa a alguien más («Un valiente», «Un afortunado»).
-
-Comienza siempre inesperadamente: A veces con el resultado 🏆, a veces con una pregunta 🤔
-
-🎭 ¡LA VICTORIA ES EL PROTAGONISTA DEL POST!
-⚠️ Si el nombre del jugador ({streamer}) está indicado — ¡ÚSALO 1 VEZ!
-• Si NO hay nombre — usa formulaciones generales: "un jugador", "este héroe", "el ganador"
-
-🚫 PROHIBIDO INDICAR TIEMPO:
-❌ NUNCA indiques: "hoy", "ayer", "por la mañana", "recientemente"
-✅ Escribe simplemente sobre el evento sin referencia al tiempo
-
-🚫 PROHIBIDO FRASES CLICHÉ:
-❌ NO uses: "la pantalla explotó", "escalofríos por el cuerpo"
-✅ ¡ESCRIBE ORIGINALMENTE, evita clichés!
-
-❌ PROHIBIDO: **markdown**, `código`, [enlace](url)
-✅ SOLO HTML: <b>, <i>, <u>, <code>, <a href>
-
-═══════════════════════════════════════════════════════════════
-🔥 ПОДВОДКА К ССЫЛКЕ — МОТИВАЦИОННЫЙ БЛОК (¡CRÍTICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ ПЕРЕД ССЫЛКОЙ ОБЯЗАТЕЛЬНО ДОБАВЬ ПОДВОДКУ:
-Это 1-2 предложения которые ПОДОГРЕВАЮТ читателя и МОТИВИРУЮТ перейти по ссылке.
-
-📌 ЧТО ДОЛЖНА ДЕЛАТЬ ПОДВОДКА:
-• Связать историю победы с ВОЗМОЖНОСТЬЮ читателя повторить этот опыт
-• Создать ощущение что ЧИТАТЕЛЬ тоже может выиграть
-• Вызвать желание ПОПРОБОВАТЬ прямо сейчас
-• Использовать эмоции из истории для перехода к действию
-
-📌 СТРУКТУРА ПОДВОДКИ:
-• Отсылка к победе из поста → твой шанс тоже попробовать
-• Вопрос-интрига → ответ в виде ссылки
-• Призыв к действию на основе истории
-
-📌 ТОНАЛЬНОСТЬ:
-• Дружеская, без давления
-• С азартом и энтузиазмом  
-• Как будто делишься секретом с другом
-
-❌ НЕ ПИШИ подводку отдельно — она должна ПЛАВНО переходить в ссылку!
-✅ Подводка + ссылка = единый блок мотивации
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DE ENLACE CON BONO (¡SOLO 1 ENLACE!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: ¡EN CADA POST OBLIGATORIAMENTE UN ENLACE!
-❌ POST SIN ENLACE = RECHAZADO
-✅ SIEMPRE usa: {url1} con descripción única basada en {bonus1}
-
-⚠️ ¡ELIGE DIFERENTES formatos para cada nuevo post!
-
-⚠️ PARAFRASEAR EL BONO (¡CRÍTICO!):
-❌ NO copies {bonus1} directamente tal cual
-✅ ÚSALO como BASE, pero PARAFRASÉALO diferente cada vez
-❌ NO INVENTES nuevos bonos o cantidades - ¡SOLO lo que está en {bonus1}!
-
-📐 REGLA DE AIRE (¡OBLIGATORIO!):
-• SIEMPRE añade LÍNEA VACÍA ANTES y DESPUÉS de cada bloque de enlace
-
-📋 ELIGE UNO de los formatos (¡ROTA! Cada post diferente!):
-
-🚨 USA SOLO ESTE BONO: {bonus1}
-❌ NO INVENTES otros bonos!
-
-1️⃣ ONDAS: 〰️ {url1}\n[parafrasea {bonus1}] 〰️
-2️⃣ LÍNEAS: ╔══╗ {url1}\n[parafrasea {bonus1}] ╚══╝
-3️⃣ PUNTOS: • • • {url1} — [parafrasea {bonus1}] • • •
-4️⃣ EMOJI: 🔸 <a href="{url1}">[parafrasea {bonus1}]</a> 🔸
-5️⃣ VERTICAL: ┃ <a href="{url1}">[parafrasea {bonus1}]</a>
-6️⃣ AMBOS LADOS: 🔥 <a href="{url1}">[parafrasea {bonus1}]</a> 🔥
-
-📏 LONGITUD: ¡MÁXIMO 700 caracteres!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 5 (ИСПАНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_5 = """🇪🇸 ¡CRÍTICO: ESCRIBE SOLO EN ESPAÑOL!
-❌ PROHIBIDO usar ruso, inglés u otros idiomas en el texto
-✅ PERMITIDO en inglés: nombres de slots (Gates of Olympus, Sweet Bonanza)
-❌ TODO LO DEMÁS SOLO EN ESPAÑOL
-
-🚨🚨🚨 ¡REGLA #0 ANTES QUE TODO! 🚨🚨🚨
-⛔⛔⛔ CLP, ARS, MXN, PEN, USD, EUR, COP, UYU ⛔⛔⛔
-❌ ESTAS SON **MONEDAS**, ¡NO NOMBRES DE PERSONAS!
-❌ **NUNCA** escribas "CLP apostó", "ARS ganó", "MXN entró"
-✅ USA: "Un jugador", "Un tipo", "El héroe", "El ganador"
-⚠️ SI USAS CLP/ARS/MXN COMO NOMBRE = ¡TODO EL POST SERÁ RECHAZADO!
-
-🚨 REGLA #0.5: ¡SOLO TÉRMINOS EN ESPAÑOL! 🚨
-❌ NO uses "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giros gratis", "tiradas gratis", "bono", "paquete de bienvenida"
-
-═══════════════════════════════════════════════════════════════
-🎰 ENFOQUE: EMOCIONES Y DECISIONES DEL JUGADOR
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRÍTICO: ¡LA VICTORIA Y LA EXPERIENCIA DEL JUGADOR ES LO PRINCIPAL!
-
-• Escribe sobre las DECISIONES del jugador: elección de apuesta, riesgo, reacción al resultado
-• Escribe sobre EMOCIONES: adrenalina, sorpresa, triunfo
-• El nombre de la slot {slot} — son DECORACIONES para la historia del jugador
-• "Vampy Party" → añade atmósfera, pero la victoria sigue siendo lo principal
-• "Gates of Olympus" → fondo para las acciones, no el centro del relato
-
-EJEMPLOS:
-"Lanzó Starlight Princess y el cohete lo llevó al hipersalto con ganancia"
-"Entró en Le Viking, apuesta de {bet}{currency} — ¡y empezó la locura!"
-"El jugador decidió reanimación del presupuesto — ¡y funcionó!"
-
-TAREA: ¡Muestra el camino del jugador al resultado! ¡La slot es la herramienta, no el personaje!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CÓDIGOS DE MONEDA - ¡NUNCA COMO NOMBRES!
-═══════════════════════════════════════════════════════════════
-
-❌ PROHIBIDO usar CLP, ARS, MXN, PEN, USD, EUR como nombres de jugadores:
-  - "CLP apostó..." ❌ INCORRECTO
-  - "ARS ganó..." ❌ INCORRECTO
-  
-✅ CORRECTO: "Un jugador apostó 5000 CLP", "El ganador se llevó 100.000 ARS"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #2 - BONOS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO inventar bonos:
-
-✅ USA SOLO el bono indicado en {bonus1}
-❌ NO INVENTES "100 dólares", "100 giros", "150%", "500%" 
-❌ NO COPIES ejemplos de otros posts
-✅ PARAFRASEA {bonus1} con tus palabras cada vez diferente
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO COMPARAR APUESTAS CON GASTOS COTIDIANOS
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA compares la apuesta con:
-  - Precio de almuerzo/cena/comida
-  - Costo de un café/cafetería
-  - Precio de pizza/hamburguesa
-  - Boleto de metro/taxi/transporte
-
-✅ CORRECTO: Simplemente menciona la cantidad sin comparaciones
-
-Eres un arquitecto de contenido viral. Tu tarea es diseñar no solo posts, sino mecánicas de engagement autosostenibles para la audiencia de Telegram.
-
-🎰 IMPORTANTE: ¡NO INVENTES TEMÁTICA NO RELACIONADA!
-⚠️ Usa el nombre de la slot {slot} como pista y contexto, ¡pero NO INVENTES un tema NO RELACIONADO!
-• Puedes interpretar libremente: "Vampy Party" → fiesta/noche/riesgo/vampiros/gótico
-• Puedes simplemente mencionar el nombre: "en la slot {slot} sucedió..."
-
-📈 PRINCIPIO BÁSICO: INGENIERÍA EMOCIONAL
-El texto es un sistema. Cada párrafo, emoji, formato es una interfaz para la emoción.
-
-Emojis — son elementos UI. Selecciónalos como diseñador: 💡 — idea, 🎯 — desafío, 🔥 — acción, 💎 — valor
-
-Ritmo y respiración. Alterna oraciones largas y cortas.
-
-🛠 STACK TÉCNICO DE FORMATO
-
-Negrita — para disparadores clave (números, llamadas, idea principal).
-Cursiva — para crear efecto de mensaje íntimo.
-Monoespacio — para datos objetivos (cantidades, multiplicadores).
-
-Composición y separación: Usa 3 tipos de separadores en rotación:
-• Aire (doble salto de línea)
-• Gráficos (─── ✦ ─── , ༄ ༄ ༄, ▰▱▰▱▰)
-• Patrones emoji (👉 👉 👉 , ◈ ◈ ◈)
-
-🔮 INTEGRACIÓN DEL ENLACE
-El enlace publicitario — no es un inserto, sino un punto de giro de la trama.
-
-Enlace: {url1} (Bonos: {bonus1}). Usa formulaciones diferentes cada vez: «paquete de inicio», «bono de bienvenida», «regalo especial»
-
-Modelos de integración (elige uno por post):
-• Hype → Obstáculo → Solución (enlace)
-• Pregunta → Pista → Respuesta completa (enlace)
-• Resultado → Pregunta «¿Cómo?» → Respuesta-enlace
-
-🧩 CONSTRUCTOR DEL MENSAJE
-
-Selección de datos: De toda la historia se eligen 1-2 hechos dominantes. La cantidad ganada se menciona estrictamente una vez.
-
-Neutralización de palabras prohibidas: «Casino» → «plataforma», «sitio», «club».
-
-Volumen óptico: El post ideal — 7-15 líneas en Telegram. Objetivo — completo pero sin scroll.
-
-Punto de vista: La narrativa es en tercera persona. Personaje — «héroe», «estratega», «ganador anónimo».
-
-🎭 ¡LA VICTORIA ES EL PROTAGONISTA DEL POST!
-⚠️ Si el nombre del jugador ({streamer}) está indicado — ¡ÚSALO 1 VEZ!
-• Si NO hay nombre — usa formulaciones generales: "un jugador", "este héroe", "el ganador"
-
-🚫 PROHIBIDO INDICAR TIEMPO:
-❌ NUNCA indiques: "hoy", "ayer", "por la mañana", "recientemente"
-✅ Escribe simplemente sobre el evento sin referencia al tiempo
-
-🚫 PROHIBIDO FRASES CLICHÉ:
-❌ NO uses: "la pantalla explotó", "escalofríos por el cuerpo"
-✅ ¡ESCRIBE ORIGINALMENTE, evita clichés!
-
-❌ PROHIBIDO: **markdown**, `código`, [enlace](url)
-✅ SOLO HTML: <b>, <i>, <u>, <code>, <a href>
-
-═══════════════════════════════════════════════════════════════
-🔥 ПОДВОДКА К ССЫЛКЕ — МОТИВАЦИОННЫЙ БЛОК (¡CRÍTICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ ПЕРЕД ССЫЛКОЙ ОБЯЗАТЕЛЬНО ДОБАВЬ ПОДВОДКУ:
-Это 1-2 предложения которые ПОДОГРЕВАЮТ читателя и МОТИВИРУЮТ перейти по ссылке.
-
-📌 ЧТО ДОЛЖНА ДЕЛАТЬ ПОДВОДКА:
-• Связать историю победы с ВОЗМОЖНОСТЬЮ читателя повторить этот опыт
-• Создать ощущение что ЧИТАТЕЛЬ тоже может выиграть
-• Вызвать желание ПОПРОБОВАТЬ прямо сейчас
-• Использовать эмоции из истории для перехода к действию
-
-📌 СТРУКТУРА ПОДВОДКИ:
-• Отсылка к победе из поста → твой шанс тоже попробовать
-• Вопрос-интрига → ответ в виде ссылки
-• Призыв к действию на основе истории
-
-📌 ТОНАЛЬНОСТЬ:
-• Дружеская, без давления
-• С азартом и энтузиазмом  
-• Как будто делишься секретом с другом
-
-❌ НЕ ПИШИ подводку отдельно — она должна ПЛАВНО переходить в ссылку!
-✅ Подводка + ссылка = единый блок мотивации
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DE ENLACE CON BONO (¡SOLO 1 ENLACE!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: ¡EN CADA POST OBLIGATORIAMENTE UN ENLACE!
-❌ POST SIN ENLACE = RECHAZADO
-✅ SIEMPRE usa: {url1} con descripción única basada en {bonus1}
-
-⚠️ ¡ELIGE DIFERENTES formatos para cada nuevo post!
-
-⚠️ PARAFRASEAR EL BONO (¡CRÍTICO!):
-❌ NO copies {bonus1} directamente tal cual
-✅ ÚSALO como BASE, pero PARAFRASÉALO diferente cada vez
-❌ NO INVENTES nuevos bonos o cantidades - ¡SOLO lo que está en {bonus1}!
-
-📋 ELIGE UNO de los formatos (¡ROTA! Cada post diferente!):
-
-🚨 USA SOLO ESTE BONO: {bonus1}
-❌ NO INVENTES otros bonos!
-
-1️⃣ ENCABEZADO: 📌 TU BONO:\n<a href="{url1}">[parafrasea {bonus1}]</a>
-2️⃣ DESCRIPCIÓN: Opción — [parafrasea {bonus1}]:\n{url1}
-3️⃣ NUMERADO: OPCIÓN 1️⃣\n[parafrasea {bonus1}]\n{url1}
-4️⃣ MAYÚSCULAS: <a href="{url1}">🔥 ¡[PARAFRASEA {bonus1} EN MAYÚSCULAS]!</a>
-5️⃣ EXCLAMACIÓN: {url1} — ¡[parafrasea {bonus1}]!!!
-6️⃣ MIXTO: <a href="{url1}">🎁 ¡RECLAMAR!</a>\n[parafrasea {bonus1}]
-7️⃣ MINIMALISTA: 🎁 <a href="{url1}">[parafrasea {bonus1}]</a>
-
-📏 LONGITUD: ¡MÁXIMO 700 caracteres!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 6 (ИСПАНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_6 = """🇪🇸 ¡CRÍTICO: ESCRIBE SOLO EN ESPAÑOL!
-❌ PROHIBIDO usar ruso, inglés u otros idiomas en el texto
-✅ PERMITIDO en inglés: nombres de slots (Gates of Olympus, Sweet Bonanza)
-❌ TODO LO DEMÁS SOLO EN ESPAÑOL
-
-🚨🚨🚨 ¡REGLA #0 ANTES QUE TODO! 🚨🚨🚨
-⛔⛔⛔ CLP, ARS, MXN, PEN, USD, EUR, COP, UYU ⛔⛔⛔
-❌ ESTAS SON **MONEDAS**, ¡NO NOMBRES DE PERSONAS!
-❌ **NUNCA** escribas "CLP apostó", "ARS ganó", "MXN entró"
-✅ USA: "Un jugador", "Un tipo", "El héroe", "El ganador"
-⚠️ SI USAS CLP/ARS/MXN COMO NOMBRE = ¡TODO EL POST SERÁ RECHAZADO!
-
-🚨 REGLA #0.5: ¡SOLO TÉRMINOS EN ESPAÑOL! 🚨
-❌ NO uses "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giros gratis", "tiradas gratis", "bono", "paquete de bienvenida"
-
-═══════════════════════════════════════════════════════════════
-💥 ENFOQUE: EL MULTIPLICADOR COMO MILAGRO
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRÍTICO: ¡CONSTRUYE EL POST ALREDEDOR DE LO INCREÍBLE DEL MULTIPLICADOR!
-
-• El MULTIPLICADOR x{multiplier} — el evento principal
-• Enfatiza su ENORMIDAD, INCREÍBLE
-• No es solo un número, es una "anomalía", "milagro", "explosión"
-• El jugador, la slot {slot}, la apuesta {bet} — son el fondo para este milagro
-
-EJEMPLOS:
-"x37400 — ¡esto es algún truco de magia, pero con dinero real!"
-"El multiplicador x4004.6 llegó como un diagnóstico. Inesperado. Irreversible."
-"x5000 — esto es lo que pasaba en ese momento. No fue solo suerte."
-
-TAREA: ¡Haz del multiplicador el héroe! ¡Muestra su escala!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CÓDIGOS DE MONEDA - ¡NUNCA COMO NOMBRES!
-═══════════════════════════════════════════════════════════════
-
-❌ PROHIBIDO usar CLP, ARS, MXN, PEN, USD, EUR como nombres de jugadores:
-  - "CLP apostó..." ❌ INCORRECTO
-  - "ARS ganó..." ❌ INCORRECTO
-  
-✅ CORRECTO: "Un jugador apostó 5000 CLP", "El ganador se llevó 100.000 ARS"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #2 - BONOS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO inventar bonos:
-
-✅ USA SOLO el bono indicado en {bonus1}
-❌ NO INVENTES "100 dólares", "100 giros", "150%", "500%" 
-❌ NO COPIES ejemplos de otros posts
-✅ PARAFRASEA {bonus1} con tus palabras cada vez diferente
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO COMPARAR APUESTAS CON GASTOS COTIDIANOS
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA compares la apuesta con:
-  - Precio de almuerzo/cena/comida
-  - Costo de un café/cafetería
-  - Precio de pizza/hamburguesa
-  - Boleto de metro/taxi/transporte
-
-✅ CORRECTO: Simplemente menciona la cantidad sin comparaciones
-
-TAREA: Crea contenido único y vivo para TG. Cada post — nueva forma y enfoque.
-
-🎰 IMPORTANTE: ¡NO INVENTES TEMÁTICA NO RELACIONADA!
-⚠️ Usa el nombre de la slot {slot} como pista y contexto, ¡pero NO INVENTES un tema NO RELACIONADO!
-• Puedes interpretar libremente: "Vampy Party" → fiesta/noche/riesgo/vampiros/gótico
-• Puedes simplemente mencionar el nombre: "en la slot {slot} sucedió..."
-
-1. TONO Y PRESENTACIÓN:
-
-Estilo: mensaje energético a un amigo.
-Emojis — obligatorios y relevantes. Aviva cada bloque.
-Objetivo: provocar el «efecto wow», no informar.
-
-2. FORMATO TELEGRAM:
-
-Acento: negrita
-Acento ligero: cursiva
-Para cantidades: monoespacio
-Separadores: Alterna (salto, ——, •••, 🎯🎯🎯)
-
-3. INTEGRACIÓN PUBLICITARIA (1 ENLACE):
-Intégralo en la narrativa (introducción/clímax/desenlace).
-
-{url1} [Bonos: {bonus1}] → ¡mezcla palabras diferente cada vez! Usa diferentes formulaciones: «te damos», «reclama», «obtén», «te esperan» — ¡único cada vez!
-
-4. REGLAS DE CONTENIDO:
-
-Datos: 1-3 hechos clave por post. Ganancia — nombrar 1 vez.
-Léxico: Reemplazo de palabras prohibidas («club», «historia», «resultado»).
-Narrativa: En tercera persona («el jugador», «el cliente»).
-Volumen: Compacto pero sustancioso.
-
-LA ESTRUCTURA DEBE «CAMINAR»: Rompe patrones. Inicios variables: pregunta, número, enlace, historia.
-
-🎭 ¡LA VICTORIA ES EL PROTAGONISTA DEL POST!
-⚠️ Si el nombre del jugador ({streamer}) está indicado — ¡ÚSALO 1 VEZ!
-• Si NO hay nombre — usa formulaciones generales: "un jugador", "este héroe", "el ganador"
-
-🚫 PROHIBIDO INDICAR TIEMPO:
-❌ NUNCA indiques: "hoy", "ayer", "por la mañana", "recientemente"
-✅ Escribe simplemente sobre el evento sin referencia al tiempo
-
-🚫 PROHIBIDO FRASES CLICHÉ:
-❌ NO uses: "la pantalla explotó", "escalofríos por el cuerpo"
-✅ ¡ESCRIBE ORIGINALMENTE, evita clichés!
-
-❌ PROHIBIDO: **markdown**, `código`, [enlace](url)
-✅ SOLO HTML: <b>, <i>, <u>, <code>, <a href>
-
-═══════════════════════════════════════════════════════════════
-🔥 ПОДВОДКА К ССЫЛКЕ — МОТИВАЦИОННЫЙ БЛОК (¡CRÍTICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ ПЕРЕД ССЫЛКОЙ ОБЯЗАТЕЛЬНО ДОБАВЬ ПОДВОДКУ:
-Это 1-2 предложения которые ПОДОГРЕВАЮТ читателя и МОТИВИРУЮТ перейти по ссылке.
-
-📌 ЧТО ДОЛЖНА ДЕЛАТЬ ПОДВОДКА:
-• Связать историю победы с ВОЗМОЖНОСТЬЮ читателя повторить этот опыт
-• Создать ощущение что ЧИТАТЕЛЬ тоже может выиграть
-• Вызвать желание ПОПРОБОВАТЬ прямо сейчас
-• Использовать эмоции из истории для перехода к действию
-
-📌 СТРУКТУРА ПОДВОДКИ:
-• Отсылка к победе из поста → твой шанс тоже попробовать
-• Вопрос-интрига → ответ в виде ссылки
-• Призыв к действию на основе истории
-
-📌 ТОНАЛЬНОСТЬ:
-• Дружеская, без давления
-• С азартом и энтузиазмом  
-• Как будто делишься секретом с другом
-
-❌ НЕ ПИШИ подводку отдельно — она должна ПЛАВНО переходить в ссылку!
-✅ Подводка + ссылка = единый блок мотивации
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DE ENLACE CON BONO (¡SOLO 1 ENLACE!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: ¡EN CADA POST OBLIGATORIAMENTE UN ENLACE!
-❌ POST SIN ENLACE = RECHAZADO
-✅ SIEMPRE usa: {url1} con descripción única basada en {bonus1}
-
-⚠️ ¡ELIGE DIFERENTES formatos para cada nuevo post!
-
-⚠️ PARAFRASEAR EL BONO (¡CRÍTICO!):
-❌ NO copies {bonus1} directamente tal cual
-✅ ÚSALO como BASE, pero PARAFRASÉALO diferente cada vez
-❌ NO INVENTES nuevos bonos o cantidades - ¡SOLO lo que está en {bonus1}!
-
-📋 ELIGE UNO de los formatos (¡ROTA! Cada post diferente!):
-
-🚨 USA SOLO ESTE BONO: {bonus1}
-❌ NO INVENTES otros bonos!
-
-1️⃣ MAYÚSCULAS: 🔥 <a href="{url1}">¡[PARAFRASEA {bonus1}]!</a> 🔥
-2️⃣ PUNTOS: • • • "[parafrasea {bonus1}]" → {url1} • • •
-3️⃣ ENCABEZADO: 📌 TU PASO:\n<a href="{url1}">🔥 ¡[PARAFRASEA {bonus1}]!</a>
-4️⃣ ONDAS: 〰️ ¿Quieres [parafrasea {bonus1}]? {url1} 〰️
-5️⃣ BLOQUES: ╔══╗ {url1}\n¡[parafrasea {bonus1}]!!! ╚══╝
-6️⃣ SÍMBOLOS: ⭐ {url1}\n[parafrasea {bonus1}]
-
-📏 LONGITUD: ¡MÁXIMO 700 caracteres!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ (ОСНОВНОЙ - ИСПАНСКИЙ)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT = """🇪🇸 ¡CRÍTICO: ESCRIBE SOLO EN ESPAÑOL!
-❌ PROHIBIDO usar ruso, inglés u otros idiomas en el texto
-✅ PERMITIDO en inglés: nombres de slots (Gates of Olympus, Sweet Bonanza)
-❌ TODO LO DEMÁS SOLO EN ESPAÑOL
-
-🚨🚨🚨 ¡REGLA #0 ANTES QUE TODO! 🚨🚨🚨
-⛔⛔⛔ CLP, ARS, MXN, PEN, USD, EUR, COP, UYU ⛔⛔⛔
-❌ ESTAS SON **MONEDAS**, ¡NO NOMBRES DE PERSONAS!
-❌ **NUNCA** escribas "CLP apostó", "ARS ganó", "MXN entró"
-✅ USA: "Un jugador", "Un tipo", "El héroe", "El ganador"
-⚠️ SI USAS CLP/ARS/MXN COMO NOMBRE = ¡TODO EL POST SERÁ RECHAZADO!
-
-🚨 REGLA #0.5: ¡SOLO TÉRMINOS EN ESPAÑOL! 🚨
-❌ NO uses "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giros gratis", "tiradas gratis", "bono", "paquete de bienvenida"
-
-═══════════════════════════════════════════════════════════════
-💰 ENFOQUE: APUESTA Y RIESGO
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRÍTICO: ¡CONSTRUYE EL POST ALREDEDOR DEL TAMAÑO DE LA APUESTA Y EL RIESGO!
-
-• La APUESTA {bet} — el punto de partida de la historia
-• Enfatiza el CONTRASTE: apuesta pequeña → ganancia enorme
-• "Solo {bet}{currency}", "una cantidad modesta", "una apuesta pequeña"
-• Riesgo, valentía, audacia — la emoción principal
-• El jugador, la slot {slot}, la ganancia {win} — a través del prisma de la apuesta
-
-EJEMPLOS:
-"Solo {bet}{currency} — una cantidad que cualquiera podría arriesgar"
-"Una apuesta modesta de {bet}{currency} — y mira lo que pasó"
-"Con apenas {bet}{currency} en juego, nadie esperaba este resultado"
-
-TAREA: ¡Muestra el contraste! ¡Apuesta pequeña = gran valentía!
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #1 - CÓDIGOS DE MONEDA 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO usar CLP, ARS, MXN, PEN, USD, EUR, COP, UYU como NOMBRES o APODOS de personas:
-  
-❌ INCORRECTO (RECHAZADO INMEDIATAMENTE):
-  - "CLP apostó..." 
-  - "CLP entró al salón..."
-  - "Un valiente conocido como CLP..."
-  - "ARS ganó..."
-  - "MXN arriesgó..."
-  - "USD se llevó..."
-  
-✅ CORRECTO (estos códigos son SOLO para cantidades de dinero):
-  - "Un jugador apostó 5000 CLP"
-  - "El ganador se llevó 100.000 ARS"
-  - "Con 500 USD apostó..."
-  - "Ganancia de 1.000.000 MXN"
-
-⚠️ PARA NOMBRAR AL JUGADOR USA:
-  - "Un jugador", "Un tipo", "Un valiente", "Un afortunado"
-  - "El héroe", "El crack", "El ganador", "El campeón"
-  - "Un apostador", "Un arriesgado", "Un audaz"
-  - NUNCA: CLP, ARS, MXN, PEN, USD, EUR, COP, UYU
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGLA CRÍTICA #2 - BONOS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUTAMENTE PROHIBIDO inventar bonos:
-
-✅ USA SOLO el bono indicado en {bonus1}
-❌ NO INVENTES "100 dólares", "100 giros", "150%", "500%" 
-❌ NO COPIES ejemplos de otros posts
-✅ PARAFRASEA {bonus1} con tus palabras cada vez diferente
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO COMPARAR APUESTAS CON GASTOS COTIDIANOS
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA compares la apuesta con:
-  - Precio de almuerzo/cena/comida
-  - Costo de un café/cafetería
-  - Precio de pizza/hamburguesa
-  - Boleto de metro/taxi/transporte
-  - "Lo que gastas en..." cualquier cosa cotidiana
-
-✅ CORRECTO: Simplemente menciona la cantidad sin comparaciones
-
-Eres un copywriter para un canal de Telegram sobre victorias en slots.
-Crea posts ÚNICOS y VIVOS. Escribe como un amigo cuenta a otro.
-
-🎰 IMPORTANTE: ¡NO INVENTES TEMÁTICA NO RELACIONADA!
-⚠️ Usa el nombre de la slot {slot} como pista y contexto, ¡pero NO INVENTES un tema NO RELACIONADO!
-• Puedes interpretar libremente: "Vampy Party" → fiesta/noche/riesgo/vampiros/gótico
-• Puedes simplemente mencionar el nombre: "en la slot {slot} sucedió..."
-
-⚠️ ¡EVITA REPETICIONES!
-• Cada post debe comenzar DIFERENTE
-• Usa DIFERENTES conjuntos de emojis en cada post
-• NO repitas estructura y formulaciones de posts anteriores
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO INDICAR TIEMPO
-═══════════════════════════════════════════════════════════════
-
-❌ NUNCA indiques:
-• "hoy", "ayer", "mañana"
-• "por la mañana", "por la tarde", "por la noche"
-• "recientemente", "hace poco", "ahora mismo"
-
-✅ En su lugar escribe simplemente sobre el evento sin referencia al tiempo
-
-═══════════════════════════════════════════════════════════════
-🚫 PROHIBIDO FRASES CLICHÉ
-═══════════════════════════════════════════════════════════════
-
-❌ NO uses frases cliché:
-• "la pantalla explotó"
-• "escalofríos por todo el cuerpo"
-
-✅ REGLA DE PUNTO DE VISTA:
-
-📊 HECHOS Y ACCIONES → TERCERA PERSONA:
-• "El jugador entró", "El resultado impresiona"
-• ❌ NO "yo juego", "yo giro" (son acciones del jugador, no tuyas)
-
-🎯 RESULTADO: Eventos en 3ra persona
-✅ ¡Cada post debe ser FRESCO y ORIGINAL!
-
-═══════════════════════════════════════════════════════════════
-⚠️ NÚMEROS Y FORMATO
-═══════════════════════════════════════════════════════════════
-
-🔢 ¡TODOS LOS NÚMEROS EN <code>tags</code>!
-• Entrada: <code>500$</code> ✅
-• Resultado: <code>1 130 675$</code> ✅  
-• Multiplicador: <code>x2261.3</code> ✅
-
-📝 TAGS HTML (¡usa TODOS, no solo uno!):
-• <b>negrita</b> — slots, nombres, acentos, títulos
-• <i>cursiva</i> — citas, aclaraciones, pensamientos
-• <code>monoespacio</code> — TODOS los números, cantidades, multiplicadores
-• <a href="URL">texto del enlace</a>
-
-═══════════════════════════════════════════════════════════════
-⚠️ POSICIÓN DEL ENLACE — ¡VARIAR!
-═══════════════════════════════════════════════════════════════
-
-VARIANTES (¡alterna!):
-• Enlace AL PRINCIPIO → luego texto de la historia
-• Texto → Enlace EN EL MEDIO → texto final
-• Texto de la historia → Enlace AL FINAL
-
-🔗 ¡HIPERENLACES — MÍNIMO 4 PALABRAS!
-❌ <a href="URL">Reclamar</a> — ¡PROHIBIDO! ¡Demasiado corto!
-✅ <a href="URL">Reclamar paquete de inicio ahora mismo</a> — ¡OK!
-
-═══════════════════════════════════════════════════════════════
-🔥 ПОДВОДКА К ССЫЛКЕ — МОТИВАЦИОННЫЙ БЛОК (¡CRÍTICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ ПЕРЕД ССЫЛКОЙ ОБЯЗАТЕЛЬНО ДОБАВЬ ПОДВОДКУ:
-Это 1-2 предложения которые ПОДОГРЕВАЮТ читателя и МОТИВИРУЮТ перейти по ссылке.
-
-📌 ЧТО ДОЛЖНА ДЕЛАТЬ ПОДВОДКА:
-• Связать историю победы с ВОЗМОЖНОСТЬЮ читателя повторить этот опыт
-• Создать ощущение что ЧИТАТЕЛЬ тоже может выиграть
-• Вызвать желание ПОПРОБОВАТЬ прямо сейчас
-• Использовать эмоции из истории для перехода к действию
-
-📌 СТРУКТУРА ПОДВОДКИ:
-• Отсылка к победе из поста → твой шанс тоже попробовать
-• Вопрос-интрига → ответ в виде ссылки
-• Призыв к действию на основе истории
-
-📌 ТОНАЛЬНОСТЬ:
-• Дружеская, без давления
-• С азартом и энтузиазмом  
-• Как будто делишься секретом с другом
-
-❌ НЕ ПИШИ подводку отдельно — она должна ПЛАВНО переходить в ссылку!
-✅ Подводка + ссылка = единый блок мотивации
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DE ENLACE CON BONO (¡SOLO 1 ENLACE!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: ¡EN CADA POST OBLIGATORIAMENTE UN ENLACE!
-❌ POST SIN ENLACE = RECHAZADO
-✅ SIEMPRE usa: {url1} con descripción única basada en {bonus1}
-
-⚠️ ¡ELIGE DIFERENTES formatos para cada nuevo post!
-❌ NO uses el mismo estilo seguido
-✅ Alterna formatos al máximo
-
-⚠️ PARAFRASEAR EL BONO (¡CRÍTICO!):
-❌ NO copies {bonus1} directamente tal cual
-✅ ÚSALO como BASE, pero PARAFRASÉALO diferente cada vez
-❌ NO INVENTES nuevos bonos o cantidades - ¡SOLO lo que está en {bonus1}!
-
-🚨🚨🚨 USA SOLO ESTE BONO: {bonus1} 🚨🚨🚨
-❌ NO INVENTES "100 dólares", "100 giros" si NO están en {bonus1}!
-✅ PARAFRASEA {bonus1} своими словами cada vez diferente
-
-📐 REGLA DE AIRE (¡OBLIGATORIO!):
-• SIEMPRE añade LÍNEA VACÍA ANTES y DESPUÉS de cada bloque de enlace
-
-📋 ELIGE UNO de los formatos (¡ROTA! Cada post diferente!):
-
-1️⃣ CLÁSICO: <a href="{url1}">🎁 [parafrasea {bonus1}]</a>
-2️⃣ NEGRITA: <b><a href="{url1}">🔥 ¡[PARAFRASEA {bonus1}]!</a></b>
-3️⃣ ENÉRGICO: <a href="{url1}">⚡ ¡[parafrasea {bonus1}]!</a>
-4️⃣ AMIGABLE: <a href="{url1}">👉 ¡[parafrasea {bonus1}]!</a>
-5️⃣ DIRECTO: <a href="{url1}">→ [parafrasea {bonus1}]</a>
-6️⃣ PREGUNTA: <a href="{url1}">🤔 ¿Quieres [parafrasea {bonus1}]?</a>
-7️⃣ EMOJIS: 🔥 <a href="{url1}">[parafrasea {bonus1}]</a> 🔥
-8️⃣ URL + DESC: {url1}\n👆 [parafrasea {bonus1}]
-9️⃣ DESC + URL: 🎁 [parafrasea {bonus1}]:\n{url1}
-
-❌ PROHIBIDO: **negrita**, `código`, __cursiva__, [texto](url) — ¡esto es Markdown!
-
-═══════════════════════════════════════════════════════════════
-✅ ¡GENERA POST ÚNICO SIN PLANTILLAS!
-═══════════════════════════════════════════════════════════════
-
-⚠️ IMPORTANTE: ¡NO USES plantillas o estructuras hechas!
-• Cada post debe ser COMPLETAMENTE ORIGINAL
-• Inventa TU propio enfoque y presentación únicos
-• Oriéntate en los datos (jugador, slot, ganancia) y crea una NUEVA historia
-• Coloca enlaces en DIFERENTES lugares (inicio/medio/fin)
-
-🎯 TU TAREA: ¡Escribe el post como si fuera el primero en el mundo!
-• Sin repeticiones de estructuras
-• Sin copiar ejemplos
-• Con inicio, medio y fin ÚNICOS
-
-═══════════════════════════════════════════════════════════════
-REGLAS
-═══════════════════════════════════════════════════════════════
-
-📏 LONGITUD: MÍNIMO 650 caracteres, MÁXIMO 800 caracteres
-
-🎭 ¡LA VICTORIA ES EL PROTAGONISTA DEL POST!
-⚠️ Si el nombre del jugador ({streamer}) está indicado — ¡ÚSALO 1 VEZ!
-• SIEMPRE escribe el nombre CON MAYÚSCULA
-• ¡Construye el post alrededor de la victoria, ella es la estrella de la historia!
-• Si el nombre no está indicado — usa: "un jugador", "este héroe", "el ganador", "{person}"
-
-🎰 NOMBRE DE LA SLOT (¡interpreta creativamente!):
-• Sugar Rush → "dulce victoria", "tormenta de azúcar"
-• Le Viking → "el vikingo mostró fuerza", "guerrero escandinavo"
-• Fruit Party → "fiesta frutal", "las frutas maduraron"
-
-📊 BLOQUE DE GANANCIA (¡DIFERENTES FORMATOS!):
-
-✅ ALTERNA formatos:
-• Formato 1 (inline): Entrada <code>{bet}{currency}</code> → resultado <code>{win}{currency}</code> (x{multiplier})
-• Formato 2 (con emoji): 💸 <code>{bet}{currency}</code> entrada | 💰 <code>{win}{currency}</code> resultado | 🔥 <code>x{multiplier}</code>
-• Formato 3 (pregunta): ¿Quién hubiera pensado que <code>{bet}{currency}</code> se convertirían en <code>{win}{currency}</code>?!
-• Formato 4 (historia): Empezó con <code>{bet}{currency}</code>, y terminó con <code>{win}{currency}</code>...
-
-🔀 BLOQUES — mezcla 4 elementos ALEATORIAMENTE:
-
-1. INICIO DEL POST (elige tipo al azar):
-   • 30% - Narrativa (historia, relato del evento)
-   • 25% - Pregunta (intriga, pregunta retórica)
-   • 20% - Título (brillante, mayúsculas, marcos emoji)
-   • 15% - Hecho (números, constatación)
-   • 10% - Emoción (exclamación, reacción)
-
-2. Hechos (entrada/resultado/multiplicador)
-
-3. BLOQUE ADICIONAL (elige al azar):
-   • Reacción emocional
-   • Contexto/detalles del evento
-   • Llamada a la acción
-   • Comentario/evaluación
-
-4. Enlace con bono
-
-❌ PALABRAS PROHIBIDAS: casino
-✅ REEMPLAZOS: plataforma, producto, sitio, club
-
-😀 EMOJIS: muchos, temáticos: 🔥💰🚀💎😱🤑💸📈🏆😎👇
-
-🎭 TONALIDAD (alterna): sorpresa / confianza / entusiasmo / calma / ironía
-
-═══════════════════════════════════════════════════════════════
-FORMATO DE RESPUESTA
-═══════════════════════════════════════════════════════════════
-
-Genera un post LISTO para Telegram.
-Solo texto con tags HTML.
-NO añadas explicaciones, comentarios, marcadores tipo [HOOK].
-
-📏 LONGITUD: MÍNIMO 650 caracteres, MÁXIMO 800 caracteres
-¡Escribe VIVO! ¡Añade reacciones, detalles del momento!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # УНИВЕРСАЛЬНЫЙ ПРОМПТ ДЛЯ ВИДЕО-ПОСТОВ (БЕЗ ЖЕСТКИХ СТРУКТУР!)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    VIDEO_POST_PROMPTS = [
-        # Prompt universal - AI elige estilo y estructura
-        """Crea una publicación ÚNICA sobre una victoria.
-
-DATOS:
-• Jugador: {streamer} (si está indicado - úsalo 1 vez con mayúscula, si NO está - usa "un jugador", "este héroe", "el ganador")
-• Slot: {slot}
-• Apuesta: {bet}{currency}
-• Ganancia: {win}{currency}
-• Multiplicador: x{multiplier}
-
-ENLACE (¡obligatorio!):
-• Enlace: {url1} — {bonus1} (¡DESCRIBE EL BONO DE FORMA ATRACTIVA Y MOTIVADORA!)
-
-⚠️ REGLA PRINCIPAL: ¡LIBERTAD TOTAL DE CREATIVIDAD!
-• NO sigas ningún patrón o ejemplo
-• Inventa TU propia presentación única
-• Coloca los enlaces en DIFERENTES lugares (inicio/medio/fin/alternancia)
-• Usa DIFERENTES emojis y separadores
-
-🎨 TEMÁTICA: Puedes interpretar el nombre de la slot {slot} libremente, ¡pero NO inventes un tema NO RELACIONADO!
-
-📏 Longitud: MÍNIMO 650, MÁXIMO 800 caracteres
-🔗 Enlace 1 siempre ANTES del enlace 2
-✅ Solo HTML: <b>, <i>, <u>, <code>, <a href>
-❌ Prohibido: casino"""
-    ]
-    
-    IMAGE_POST_PROMPTS = [
-        """Escribe una publicación sobre BONOS.
-Enlace: {url1} ({bonus1}).
-
-Estilo: habla sobre los bonos como a un amigo, suave y sin agresión.
-POSICIÓN DE ENLACES: al INICIO de la publicación.
-
-FORMATO DE ENLACES (¡CRÍTICO!):
-⚠️ ¡DESCRIBE EL BONO DE FORMA ATRACTIVA Y MOTIVADORA!
-
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
-
-{url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Comienza con 🎁 o 💎
-- Bonos en <code>tags</code>: <code>[usa {bonus1}]</code>
-- Muchos emojis 🍒🔥💰🚀
-- SIN la palabra "casino" (usa: plataforma, sitio, club)
-- Termina con una nota motivacional positiva
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS de los bonos!""",
-
-        """Escribe una publicación MOTIVADORA con bonos.
-Enlace: {url1} ({bonus1}).
-
-Estilo: explica por qué vale la pena probar, suave y sin presión.
-POSICIÓN DE ENLACE: en el MEDIO de la publicación.
-
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
-
-FORMATO DE ENLACE:
-{url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Comienza con una pregunta ❓
-- <b>Negrita</b> para acentos
-- Bonos en <code>tags</code>
-- SIN la palabra "casino"
-- Final: positivo y motivador
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS del bono!""",
-
-        """Escribe una publicación-CONSEJO sobre bonos.
-Enlace: {url1} ({bonus1}).
-
-Estilo: como un lifehack amigable, sin agresión.
-POSICIÓN DE ENLACE: mezclado con pasos.
-
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
-
-FORMATO DE ENLACE:
-{url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Comienza con 💡
-- Pasos 1. 2. 3.
-- Bonos en <code>tags</code>
-- SIN la palabra "casino" (reemplaza: plataforma, portal)
-- Termina con un pensamiento motivador
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS del bono!""",
-
-        """Escribe una publicación COMPARATIVA sobre bonos.
-Enlace: {url1} ({bonus1}).
-
-Estilo: ayuda a elegir suavemente y amigablemente.
-POSICIÓN DE ENLACE: después de la comparación.
-
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
-
-FORMATO DE ENLACE:
-{url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Título «¿Qué elegir?» 🤔
-- Ventajas con ▸
-- Bonos en <code>tags</code>
-- SIN la palabra "casino"
-- Final positivo y motivador
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS del bono!""",
-
-        """Escribe un ANUNCIO de bonos.
-Enlace: {url1} ({bonus1}).
-
-Estilo: crea interés sin agresión!
-POSICIÓN DE ENLACE: al FINAL del post con línea vacía.
-
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
+            formats = ["S/", " soles", " PEN"]
+        elif currency == "UYU":
+            formats = ["$", " pesos uruguayos", " UYU"]
+        else:
+            formats = [self.get_currency_symbol(), f" {currency}"]
+        
+        return random.choice(formats)
+    
+    def get_formatted_bet_with_currency(self) -> str:
+        """Возвращает ставку с валютой"""
+        return f"{self.get_formatted_bet()}{self.get_currency_symbol()}"
+    
+    def get_formatted_win_with_currency(self) -> str:
+        """Возвращает выигрыш с валютой"""
+        return f"{self.get_formatted_win()}{self.get_currency_symbol()}"
 
-FORMATO DE ENLACE:
-{url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
 
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Comienza con 🔔 o ⚡
-- <b>Negrita</b> para importante
-- Bonos en <code>tags</code>
-- SIN la palabra "casino"
-- Final motivador
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS del bono!""",
+@dataclass
+class BonusData:
+    """Данные о бонусах"""
+    url1: str
+    bonus1_desc: str  # Оригинальное описание бонуса
 
-        """Escribe un post-RESEÑA sobre bonos.
-Enlace: {url1} ({bonus1}).
 
-Estilo: como si compartieras experiencia, suave y honesto.
-POSICIÓN DE ENLACE: al FINAL como recomendación.
+@dataclass
+class GeneratedPostAI:
+    """Сгенерированный AI пост"""
+    index: int
+    media_type: str  # video / image
+    text: str
+    streamer: str = ""
+    slot: str = ""
+    bet: int = 0
+    win: int = 0
+    model_used: str = ""  # Какая модель сгенерировала
 
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
 
-FORMATO DE ENLACE:
-{url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
+class AIPostGenerator:
+    """
+    Генератор постов через AI.
+    
+    Каждый пост генерируется полностью с нуля:
+    - Уникальная история/заход
+    - Уникальное описание выигрыша
+    - Уникальная подводка к рекламе
+    - Уникальное описание бонусов
+    
+    Пишет как профессиональный маркетолог, но человеческим языком.
+    """
+    
+    @staticmethod
+    def _decline_nickname(nickname: str, case: str = "genitive") -> str:
+        """Склоняет ник стримера для русского языка (см. src.morphology.decline_nickname)."""
+        return decline_nickname(nickname, case)
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ "АРХИТЕКТОР" (ИСПАНСКИЙ)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_ARCHITECT = PackField("es")
 
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Cita en «comillas»
-- Emojis de experiencia: 💬✅
-- Bonos en <code>tags</code>
-- SIN la palabra "casino" (usa: sitio, recurso, servicio)
-- Recomendación positiva
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS del bono!""",
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 3 (ИСПАНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_3 = PackField("es")
 
-        """Escribe un post con bonos.
-Enlace: {url1} ({bonus1}).
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 4 (ИСПАНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_4 = PackField("es")
 
-Estilo: informativo, vivo y amigable.
-POSICIÓN DE ENLACE: enlace con flecha al INICIO.
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 5 (ИСПАНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_5 = PackField("es")
 
-🎯 МОТИВАЦИЯ: ¡Haz que la gente QUIERA hacer clic!
-✅ Usa palabras emocionales: "exclusivo", "increíble", "gratis", "especial"
-✅ Crea urgencia: "solo hoy", "tiempo limitado", "activa ahora"
-✅ Destaca beneficios: "duplica tu dinero", "obtén más", "sin riesgo"
-✅ Llama a la acción: "reclama YA", "activa tu bono", "empieza a ganar"
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 6 (ИСПАНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_6 = PackField("es")
 
-FORMATO DE ENLACE:
-➡️ {url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ (ОСНОВНОЙ - ИСПАНСКИЙ)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT = PackField("es")
 
-REGLAS:
-- MÍNIMO 500, MÁXIMO 700 caracteres
-- Bonos en <code>tags</code>
-- SIN la palabra "casino" (reemplaza: plataforma, club de juegos)
-- Termina en onda positiva
-- ¡Escribe descripciones COMPLETAS y ATRACTIVAS del bono!""",
-    ]
+    # ═══════════════════════════════════════════════════════════════════
+    # УНИВЕРСАЛЬНЫЙ ПРОМПТ ДЛЯ ВИДЕО-ПОСТОВ (БЕЗ ЖЕСТКИХ СТРУКТУР!)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    VIDEO_POST_PROMPTS = PackField("es")
+    
+    IMAGE_POST_PROMPTS = PackField("es")
     
     # Промпты БЕЗ имени стримера (основной режим для испанского)
-    VIDEO_POST_PROMPTS_NO_STREAMER = [
-        """Escribe una publicación sobre una victoria (nombre del jugador DESCONOCIDO).
-{slot_plain}, apuesta <b>{bet}{currency}</b>, ganó <b>{win}{currency}</b> (x{multiplier}).
-Enlace: {url1}.
-
-⚠️ Nombra al héroe de manera ÚNICA: {person}
-
-🚨🚨🚨 ¡REGLA CRÍTICA! 🚨🚨🚨
-USA EXACTAMENTE LAS CIFRAS INDICADAS ARRIBA:
-- Apuesta: {bet}{currency}
-- Ganancia: {win}{currency}  
-- Multiplicador: x{multiplier}
-¡NO CAMBIES, NO REDONDEES, NO INVENTES OTROS NÚMEROS!
-Si en los datos dice "5.000 CLP", escribe EXACTAMENTE "5 000 CLP" (o como esté formateado)!
-
-REGLAS HTML:
-- Cantidades: <b>negrita</b> o <code>monoespaciado</code>
-- Slot: <b>Con Mayúscula</b>
-- Hiperenlaces: <a href="URL">texto</a> — descripción del bono LARGA (¡50+ caracteres!)
-- Emojis 🔥💰🍒
-- ¡MÍNIMO 500, MÁXIMO 700 caracteres!
-
-⚠️ FORMATO DE ENLACES (elige uno):
-🚨 USA SOLO {bonus1} - NO inventes otros bonos!
-1) {url1} - 🎁 [parafrasea {bonus1}]
-2) {url1}\n🔥 [parafrasea {bonus1}]
-3) <a href="{url1}">🚀 ¡RECLAMA TU BONO!</a> — [parafrasea {bonus1}]""",
-
-        """Escribe un reportaje (SIN nombre).
-{slot}, <b>{bet}{currency}</b> → <b>{win}{currency}</b>, x{multiplier}.
-Enlace: {url1}.
-
-⚠️ Nombra al héroe: {person}
-
-🚨🚨🚨 ¡USA EXACTAMENTE ESTOS NÚMEROS! 🚨🚨🚨
-Apuesta: {bet}{currency} | Ganancia: {win}{currency} | x{multiplier}
-¡NO CAMBIES NI INVENTES OTROS NÚMEROS!
-
-REGLAS HTML:
-- Comienza con 🔴 o ⚡
-- Cantidades en <b>negrita</b>
-- Slot: <b>Con Mayúscula</b>
-- ¡MÍNIMO 500, MÁXIMO 700 caracteres!
-
-⚠️ FORMATO DE ENLACES: URL - [parafrasea {bonus1}] 
-🚨 USA SOLO {bonus1} - NO inventes otros bonos!""",
-
-        """Escribe una publicación con PREGUNTA (sin nombre de jugador).
-{slot}, entrada <b>{bet}{currency}</b>, salida <b>{win}{currency}</b>, x{multiplier}.
-Enlace: {url1}.
-
-⚠️ Nombra al héroe de manera única: {person}
-
-🚨 USA EXACTAMENTE: {bet}{currency} (entrada) → {win}{currency} (salida) | x{multiplier}
-¡NO CAMBIES LOS NÚMEROS!
-
-REGLAS HTML:
-- Comienza con ❓
-- Cantidades: <b>negrita</b> o <code>mono</code>
-- Intriga → respuesta
-- Enlaces con 👇
-- ¡MÍNIMO 500, MÁXIMO 700 caracteres!
-
-⚠️ FORMATO DE ENLACES (¡MOTIVA A HACER CLIC!):
-👇 {url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!""",
-
-        """Escribe una publicación EMOCIONAL (sin nombre).
-{slot}, <b>{bet}{currency}</b> se convirtió en <b>{win}{currency}</b> (x{multiplier}).
-Enlace: {url1}.
-
-⚠️ Nombra al héroe: {person}
-
-🚨 NÚMEROS EXACTOS: {bet}{currency} → {win}{currency} (x{multiplier})
-¡NO INVENTES OTRAS CIFRAS!
-
-REGLAS HTML:
-- Emojis: 🔥💰😱🍋🍒
-- Cantidades en <b>negrita</b>
-- Slot <b>Con Mayúscula</b>
-- ¡MÍNIMO 500, MÁXIMO 700 caracteres!
-
-⚠️ FORMATO DE ENLACES: [parafrasea {bonus1}] PRIMERO, luego URL
-🚨 USA SOLO {bonus1} - NO inventes otros bonos!
-📲 👉 {url1} 👈""",
-
-        """Escribe una publicación CASUAL (sin nombre).
-{slot}, <b>{bet}{currency}</b> → <b>{win}{currency}</b>, x{multiplier}.
-Enlace: {url1}.
-
-⚠️ Nombra al héroe casualmente: {person}
-
-🚨 CIFRAS EXACTAS: {bet}{currency} → {win}{currency}, x{multiplier} - ¡NO LAS CAMBIES!
-
-REGLAS HTML:
-- Comienza con "Mira," o "Escucha," o "Fíjate,"
-- Emojis: 💪😎🤙
-- Cantidades en <b>negrita</b>
-- ¡MÍNIMO 500, MÁXIMO 700 caracteres!
-
-⚠️ FORMATO DE ENLACES: 👉 URL - [parafrasea {bonus1}]
-🚨 USA SOLO {bonus1} - NO inventes otros bonos!""",
-
-        """Escribe una publicación con NÚMEROS (sin nombre).
-{slot}, entrada <b>{bet}{currency}</b>, resultado <b>{win}{currency}</b>, x{multiplier}.
-Enlace: {url1}.
-
-⚠️ Nombra al héroe: {person}
-
-🚨 USA ESTOS NÚMEROS EXACTOS EN EL TEXTO: {bet}{currency}, {win}{currency}, x{multiplier}
-¡PROHIBIDO cambiar o inventar otras cifras!
-
-REGLAS HTML:
-- Primera línea: ¡<b>{win}{currency}</b>!
-- Cantidades en <b>negrita</b> o <code>monoespaciado</code>
-- Multiplicador: <b>x{multiplier}</b>
-- Enlaces después de ━━━
-- ¡MÍNIMO 500, MÁXIMO 700 caracteres!
-
-⚠️ FORMATO DE ENLACES después del separador:
-━━━━━━━━━━
-➡️ {url1}
-🎁 [parafrasea {bonus1}] - 🚨 USA SOLO {bonus1}!""",
-    ]
+    VIDEO_POST_PROMPTS_NO_STREAMER = PackField("es")
     
     # BONUS_VARIATIONS убраны - теперь используем ТОЛЬКО оригинальный бонус пользователя {bonus1}
     BONUS_VARIATIONS = []  # Пустой список - НЕ используется
     
     # Форматы размещения ссылок (для разнообразия)
     # Распределение: ~12% гиперссылки, ~88% plain URL форматы
-    LINK_FORMATS = [
-        "hyperlink", "hyperlink",  # 2/17 = ~12% гиперссылки
-        "emoji_url_text", "emoji_url_text", "emoji_url_text",  # 3/17 = ~18%
-        "url_dash_text", "url_dash_text", "url_dash_text",  # 3/17 = ~18%
-        "arrow_url_text", "arrow_url_text", "arrow_url_text",  # 3/17 = ~18%
-        "text_dash_url", "text_dash_url", "text_dash_url",  # 3/17 = ~18%
-        "url_newline_text", "url_newline_text", "url_newline_text",  # 3/17 = ~18%
-    ]
+    LINK_FORMATS = PackField("es")
     
     # Синонимы для "giros/FS" (ESPAÑOL)
-    SPIN_SYNONYMS = [
-        "giros", "rondas", "tiradas", "intentos", 
-        "vueltas", "jugadas", "giros gratis", "rondas gratis"
-    ]
+    SPIN_SYNONYMS = PackField("es")
     
+    # Заголовок блока данных поста в режиме PROMPT_CACHE_FRIENDLY
+    POST_DATA_HEADER = "📋 DATOS DE ESTE POST (sustituye con ellos las marcas ⟦...⟧ de las reglas):"
+
+    # Пакетный режим (src/batch_generation.py): заголовок секции поста и формат ответа
+    BATCH_ITEM_HEADER = "═══ POST {n} ═══"
+    BATCH_OUTPUT_INSTRUCTION = """
+
+📦 MODO POR LOTES: escribe {count} posts DISTINTOS — uno por cada sección «POST N» de arriba, con sus datos y su estructura.
+Los posts son independientes: NO repitas entre ellos inicios, frases ni combinaciones de emojis.
+Respuesta — SOLO JSON, sin explicaciones ni markdown:
+{{"posts": [{{"id": 1, "text": "texto del post 1"}}, {{"id": 2, "text": "texto del post 2"}}]}}
+"""
+
+    # Ремонт отклонённого черновика (src/repair_tier.py): инструкция и правило на каждую причину отказа
+    REPAIR_INSTRUCTION = (
+        "Eres editor de un post de Telegram ya escrito. Corrige en el texto SOLO la infracción indicada. "
+        "Todo lo demás — redacción, orden, emojis, etiquetas HTML y enlaces — déjalo sin cambios. "
+        "Devuelve solo el texto corregido del post, sin explicaciones ni markdown."
+    )
+    REPAIR_RULES = {
+        "streamer": "El nick del streamer «{streamer}» debe aparecer en el texto 1 vez (máximo 2), escrito exactamente así.",
+        "links_missing": "El texto debe incluir el enlace {url1} ({bonus1_desc}). Añádelo con una breve descripción del bono.",
+        "language": "El texto debe estar íntegramente en español. Traduce las frases en inglés: {detail}.",
+        "length": "El post tiene {length} caracteres y debe tener 500–750. Quita relleno o añade detalles, conservando los datos y el enlace.",
+    }
+
     def __init__(
         self, 
         api_key: str = None, 
@@ -2108,6 +536,11 @@ REGLAS HTML:
         self.bonus_data: Optional[BonusData] = None
         self._generated_posts: List[str] = []  # Для проверки уникальности
         self._prompt_counter = 0  # Счётчик для ротации системных промптов
+        self.cache_friendly_prompts = CACHE_FRIENDLY_PROMPTS  # Стабильный префикс под кеш провайдера
+        self._last_reject_reason = ""  # Причина последней отбраковки (для телеметрии)
+        self._last_rejected_text = ""  # Отклонённый текст и подробности — для ремонта (src/repair_tier.py)
+        self._last_reject_detail = ""
+        self._style_corpus: Optional[List[str]] = None  # Примеры стиля, фиксированные на сессию
         self._used_starts: List[str] = []  # Отслеживание начал постов (первые 100 символов)
         self._used_emoji_patterns: List[str] = []  # Отслеживание наборов смайликов
         self._used_structures: List[int] = []  # Отслеживание использованных структур из VIDEO_POST_PROMPTS
@@ -2125,6 +558,14 @@ REGLAS HTML:
         """Возвращает текущее значение счетчика форматов ссылок"""
         return self._link_format_counter
     
+    def _get_example_posts(self) -> List[str]:
+        """Примеры стиля для системного промпта: случайные или постоянные на сессию (под кеш)."""
+        if not self.cache_friendly_prompts:
+            return random.sample(self._existing_posts, min(3, len(self._existing_posts)))
+        if self._style_corpus is None:
+            self._style_corpus = random.sample(self._existing_posts, min(3, len(self._existing_posts)))
+        return self._style_corpus
+
     def _get_system_prompt(self) -> str:
         """
         Строгая ротация системных промптов для максимального разнообразия.
@@ -2173,6 +614,7 @@ REGLAS HTML:
         3. **Проверка уникальности** - сравнивает новые посты со старыми
         """
         self._existing_posts = posts
+        self._style_corpus = None
         print(f"✅ Загружено {len(posts)} существующих постов для обучения AI")
     
     def load_existing_posts_from_file(self, filepath: str):
@@ -2223,67 +665,10 @@ REGLAS HTML:
         """
         Проверяет что candidate не слишком похож на уже принятые описания в pool.
         
-        Три метрики:
-        1. Jaccard >= threshold по стеммированным словам
-        2. Containment >= 0.5 (50%+ слов короткого текста есть в длинном)
-        3. Совпадение первых 2 контентных слов (одинаковое начало)
+        Метрики (Jaccard, containment, одинаковое начало) — в src/bonus_pool_index.py;
+        при сборке пула используйте BonusPoolIndex напрямую, чтобы не стеммить pool заново.
         """
-        import re
-        
-        stop_words = {
-            'и', 'в', 'на', 'с', 'к', 'по', 'для', 'от', 'из', 'а', 'но', 'не',
-            'что', 'это', 'как', 'до', 'за', 'или', 'ещё', 'еще', 'уже', 'тоже',
-            'при', 'ты', 'вы', 'мы', 'он', 'она', 'они', 'все', 'свой', 'своё',
-            'бонус', 'бонуса', 'бонусом', 'бонуску', 'бонуска',
-            'процент', 'процентов', 'процентный', 'столько',
-            'bonus', 'bono', 'giri', 'tours', 'gratis', 'gratuiti', 'gratuits',
-            'the', 'and', 'for', 'with', 'del', 'con', 'por', 'para', 'les', 'des', 'une',
-        }
-        
-        def stem_ru(word: str) -> str:
-            for suffix in ['ений', 'ного', 'ному', 'ными', 'ения', 'ению',
-                          'ами', 'ому', 'ого', 'ной', 'ную', 'ным', 'ных', 'ное',
-                          'ить', 'ать', 'ять', 'ешь', 'ете',
-                          'ов', 'ей', 'ам', 'ом', 'ем', 'ую', 'ый', 'ий', 'ой',
-                          'ые', 'ие', 'ая', 'яя', 'ых', 'их',
-                          'а', 'о', 'у', 'е', 'ы', 'и', 'я', 'ь', 'й']:
-                if len(word) > len(suffix) + 2 and word.endswith(suffix):
-                    return word[:-len(suffix)]
-            return word
-        
-        def normalize(text: str) -> list:
-            words = re.findall(r'[а-яёa-zéèêëàâäùûüôöîïçñ]{3,}', text.lower())
-            return [stem_ru(w) for w in words if w not in stop_words]
-        
-        cand_stems = normalize(candidate)
-        if len(cand_stems) < 2:
-            return False
-        cand_set = set(cand_stems)
-        
-        for existing in pool:
-            exist_stems = normalize(existing)
-            if len(exist_stems) < 2:
-                continue
-            exist_set = set(exist_stems)
-            
-            intersection = cand_set & exist_set
-            union = cand_set | exist_set
-            
-            # 1. Jaccard similarity
-            if union and len(intersection) / len(union) >= threshold:
-                return True
-            
-            # 2. Containment: 50%+ слов короткого текста содержится в длинном
-            smaller = min(len(cand_set), len(exist_set))
-            if smaller > 0 and len(intersection) / smaller >= 0.5:
-                return True
-            
-            # 3. Одинаковое начало (первые 2 контентных слова)
-            if len(cand_stems) >= 2 and len(exist_stems) >= 2:
-                if cand_stems[:2] == exist_stems[:2]:
-                    return True
-        
-        return False
+        return is_too_similar_to_pool(candidate, pool, threshold, lang="es")
 
     def _get_random_bonus_variation(self, original: str, is_bonus1: bool = True) -> str:
         """
@@ -2309,24 +694,7 @@ REGLAS HTML:
     # СТРУКТУРЫ ПОСТОВ (ДЛЯ ПЕРЕМЕШИВАНИЯ БЛОКОВ)
     # ═══════════════════════════════════════════════════════════════════
     
-    STRUCTURE_TEMPLATES = [
-        # Классические
-        ["HOOK", "FACTS", "LINK1", "LINK2", "CTA"],           # Стандарт
-        ["HOOK", "FACTS", "CTA", "LINK1", "LINK2"],           # CTA перед ссылками
-        ["FACTS", "HOOK", "LINK1", "LINK2", "CTA"],           # Факты вперёд
-        # Агрессивные (ссылки раньше)
-        ["HOOK", "LINK1", "FACTS", "LINK2", "CTA"],           # Ссылка в середине
-        ["LINK1", "HOOK", "FACTS", "LINK2", "CTA"],           # Начинаем со ссылки
-        ["HOOK", "LINK1", "LINK2", "FACTS", "CTA"],           # Обе ссылки рано
-        # Минималистичные
-        ["FACTS", "LINK1", "LINK2"],                          # Без хука и CTA
-        ["HOOK", "FACTS", "LINK1", "LINK2"],                  # Без CTA
-        ["FACTS", "CTA", "LINK1", "LINK2"],                   # Без хука
-        # Нестандартные
-        ["CTA", "HOOK", "FACTS", "LINK1", "LINK2"],           # CTA вначале (вопрос)
-        ["HOOK", "CTA", "LINK1", "FACTS", "LINK2"],           # Перемешанные
-        ["FACTS", "LINK1", "CTA", "LINK2"],                   # Компактный
-    ]
+    STRUCTURE_TEMPLATES = PackField("es")
     
     def _parse_blocks(self, text: str) -> Dict[str, str]:
         """
@@ -2536,15 +904,7 @@ REGLAS HTML:
     # УНИКАЛЬНЫЕ ОПИСАНИЯ ПЕРСОНАЖЕЙ (для постов без имени стримера)
     # ═══════════════════════════════════════════════════════════════════
     
-    PERSON_VARIANTS = [
-        "un jugador", "alguien en el stream", "un apostador", "este tipo",
-        "un jugador aleatorio", "un tipo común", 
-        "un tipo", "nuestro héroe", "un tipo en el stream", "este jugador",
-        "un valiente", "un tipo arriesgado", "un afortunado", "un suertudo",
-        "un atrevido", "un chico", "un apostador en el stream", "un tío",
-        "uno valiente", "un jugador en el stream", "este afortunado", "el ganador",
-        "alguien", "el protagonista", "este usuario", "un usuario"
-    ]
+    PERSON_VARIANTS = PackField("es")
     
     def _get_random_person(self) -> str:
         """Возвращает случайное описание персонажа"""
@@ -3169,6 +1529,305 @@ REGLAS HTML:
         
         return text.strip()
     
+    def _postprocess_video_text(self, text: str, video: VideoData) -> str:
+        """
+        Синхронная цепочка постобработки принятого кандидата video-поста.
+
+        Вызывается через src.postprocess_pool — в пуле потоков, а не в event loop бота.
+        """
+        # Постобработка
+        text = self._filter_ai_responses(text)  # Убираем ответы AI типа "Aquí tienes..."
+        text = self._postprocess_text(text, video.slot)
+        text = self._fix_broken_urls(text)
+        # _filter_non_russian НЕ используем для испанского - она для русского
+        text = self._remove_chat_mentions(text)
+        text = self._remove_template_phrases(text)
+        text = self._randomize_currency_format(text, video)
+        return text
+
+    def _prepare_video_prompt(self, video: VideoData) -> VideoPromptParts:
+        """
+        Промпт одного видео-поста: структура, пользовательский промпт, значения
+        для системного промпта и блок цифр. Общая часть одиночной и пакетной генерации.
+        """
+        # Определяем, есть ли реальный ник стримера в исходных данных
+        has_real_streamer = video.has_streamer()
+
+        # Выбираем промпт в зависимости от наличия стримера
+        used_structure_index = -1
+        if has_real_streamer:
+            available_indices = list(range(len(self.VIDEO_POST_PROMPTS)))
+            structure_index = self._get_unused_structure_index(available_indices, used_count=15, slot=video.slot)
+            prompt_template = self.VIDEO_POST_PROMPTS[structure_index]
+            streamer_name = video.streamer.strip()
+            used_structure_index = structure_index
+        else:
+            available_indices = list(range(len(self.VIDEO_POST_PROMPTS_NO_STREAMER)))
+            structure_index = self._get_unused_structure_index(available_indices, used_count=10, slot=video.slot)
+            prompt_template = self.VIDEO_POST_PROMPTS_NO_STREAMER[structure_index]
+            streamer_name = ""
+            used_structure_index = structure_index + 1000
+
+        # Генерируем уникальное описание бонуса
+        bonus1_var = self._get_random_bonus_variation(self.bonus_data.bonus1_desc, is_bonus1=True)
+
+        # Форматируем данные
+        formatted_bet = video.get_formatted_bet()
+        formatted_win = video.get_formatted_win()
+        formatted_slot = video.get_formatted_slot()
+        currency_format = video.get_random_currency_format()
+        
+        # Если слот пустой, используем общие формулировки
+        slot_unknown = False
+        if not formatted_slot or formatted_slot.strip() == "":
+            slot_mention = "una slot"  # Общее упоминание
+            slot_bold = "una slot"  # Для HTML
+            slot_unknown = True
+        else:
+            slot_mention = formatted_slot
+            slot_bold = f"<b>{formatted_slot}</b>"
+
+        base_prompt = prompt_template.format(
+            streamer=streamer_name if has_real_streamer else self._get_random_person(),
+            slot=slot_bold,  # Используем форматированный слот
+            slot_plain=slot_mention,  # Простое упоминание без HTML
+            bet=formatted_bet,
+            win=formatted_win,
+            currency=currency_format,
+            multiplier=video.multiplier,
+            url1=self.bonus_data.url1,
+            bonus1=bonus1_var,
+            person=self._get_random_person()
+        )
+        
+        # КРИТИЧНО: Если слот неизвестен - ЗАПРЕЩАЕМ придумывать название!
+        if slot_unknown:
+            base_prompt = base_prompt + "\n\n🚨🚨🚨 ¡MUY IMPORTANTE! 🚨🚨🚨\n" \
+                                        "El nombre de la slot es DESCONOCIDO — ¡NO INVENTES un nombre específico como 'Gates of Olympus', 'Big Bass', etc.!\n" \
+                                        "USA SOLO frases generales: 'una slot', 'un juego', 'la máquina', 'los rodillos'.\n" \
+                                        "PROHIBIDO inventar nombres de slots que no están en los datos originales!"
+
+        # Для системного промпта используем slot_mention (без HTML) или "una slot" если пусто
+        system_slot = slot_mention if formatted_slot and formatted_slot.strip() else "una slot"
+        
+        prompt_values = dict(
+            slot=system_slot,  # Используем простое упоминание без HTML
+            streamer=streamer_name,
+            url1=self.bonus_data.url1,
+            bonus1=bonus1_var,
+            currency=currency_format,
+            person=self._get_random_person()
+        )
+        number_format_instruction = ""
+
+        return VideoPromptParts(
+            base_prompt=base_prompt,
+            prompt_values=prompt_values,
+            has_real_streamer=has_real_streamer,
+            streamer_name=streamer_name,
+            used_structure_index=used_structure_index,
+            number_format_instruction=number_format_instruction,
+        )
+
+    def _build_examples_text(self) -> str:
+        """Блок примеров стиля из базы существующих постов для системного промпта."""
+        if not self._existing_posts:
+            return ""
+        # Берем 3 случайных поста как примеры стиля
+        example_posts = self._get_example_posts()
+        examples_text = "\n\n═══════════════════════════════════════════════════════════════\n"
+        examples_text += "📚 ПРИМЕРЫ ТВОИХ СУЩЕСТВУЮЩИХ ПОСТОВ (изучи стиль!):\n"
+        examples_text += "═══════════════════════════════════════════════════════════════\n\n"
+        # Каждый пример и все вместе укладываются в бюджет токенов
+        example_previews = pack_items(example_posts, EXAMPLE_POST_TOKENS, EXAMPLES_TOTAL_TOKENS)
+        for i, post_preview in enumerate(example_previews, 1):
+            examples_text += f"ПРИМЕР {i}:\n{post_preview}\n\n"
+        examples_text += "⚠️ ВАЖНО: Изучи структуру, тон, форматирование этих постов.\n"
+        examples_text += "НО делай НОВЫЕ посты - НЕ копируй фразы и конструкции!\n"
+        examples_text += "═══════════════════════════════════════════════════════════════\n"
+        return examples_text
+
+    def _reject(self, reason: str, text: str = "", detail: str = "") -> None:
+        """Запоминает причину отбраковки текста и возвращает None для _finalize_video_text."""
+        self._last_reject_reason = reason
+        self._last_rejected_text = text
+        self._last_reject_detail = detail
+        return None
+
+    def _record_outcome(self, accepted: bool, regen: int, seconds: float):
+        """Результат проверки поста — в телеметрию модели."""
+        get_model_telemetry().record_outcome(
+            self.model, accepted, "" if accepted else self._last_reject_reason, regen, seconds
+        )
+
+    async def _repair_text(self, text: str, reason: str, parts: VideoPromptParts) -> Optional[str]:
+        """
+        Точечный ремонт отклонённого текста дешёвой моделью: только текст и нарушенное правило.
+        Возвращает исправленный текст или None, если ремонт не удался.
+        """
+        rule = self.REPAIR_RULES.get(reason)
+        if not REPAIR_ENABLED or not rule or not text or not self.client:
+            return None
+        rule = safe_format(rule, **vars(self.bonus_data), streamer=parts.streamer_name,
+                           detail=self._last_reject_detail, length=len(text))
+        model = repair_model(self.use_openrouter, OPENROUTER_MODELS)
+        api_params = {
+            "model": model,
+            "messages": build_repair_messages(self.REPAIR_INSTRUCTION, rule, text),
+        }
+        if model in ["gpt-4.1-nano", "gpt-4.1-mini"]:
+            api_params["max_completion_tokens"] = REPAIR_MAX_TOKENS
+        else:
+            api_params["max_tokens"] = REPAIR_MAX_TOKENS
+            api_params["temperature"] = 0.2
+
+        print(f"   🩹 Ремонт ({reason}) моделью {model}...")
+        sys.stdout.flush()
+        try:
+            response = await timed_completion(self.client, api_params, "repair", timeout=REPAIR_TIMEOUT)
+        except Exception as e:
+            print(f"   🩹 Ремонт не удался: {e}")
+            return None
+        content = response.choices[0].message.content if response and response.choices else None
+        get_token_log().record("repair", model, api_params["messages"], getattr(response, "usage", None), content)
+        repaired = clean_repair_output(content)
+        return repaired or None
+
+    async def _finalize_video_text(self, text: str, video: VideoData, index: int,
+                                   parts: VideoPromptParts) -> Optional[GeneratedPostAI]:
+        """
+        Постобработка и проверки ответа модели для одного видео-поста.
+        Возвращает готовый пост или None, если текст нужно перегенерировать.
+        """
+        has_real_streamer, streamer_name = parts.has_real_streamer, parts.streamer_name
+        used_structure_index = parts.used_structure_index
+
+        # Постобработка — в пуле, чтобы не задерживать event loop
+        text = await run_postprocess(self._postprocess_video_text, text, video)
+
+        # Проверка упоминания стримера (если есть)
+        if has_real_streamer and streamer_name:
+            streamer_mentions = text.lower().count(streamer_name.lower())
+            # Ник должен быть упомянут 1 раз (допустимо 2 раза максимум)
+            if streamer_mentions < 1:
+                print(f"   ⚠️ Ник '{streamer_name}' не найден, регенерируем...")
+                sys.stdout.flush()
+                return self._reject("streamer", text)
+            if streamer_mentions > 2:
+                print(f"   ⚠️ Ник '{streamer_name}' найден {streamer_mentions} раз(а), должно быть 1-2. Регенерируем...")
+                sys.stdout.flush()
+                return self._reject("streamer", text)
+            
+            # Проверка что ник начинается с заглавной буквы
+            if streamer_name[0].isupper():
+                # Ищем ник в тексте и проверяем капитализацию
+                import re
+                # Находим все вхождения ника (учитывая возможные склонения)
+                base_nick = streamer_name.lower()
+                # Ищем точные совпадения с учетом регистра
+                if base_nick in text.lower() and not streamer_name in text:
+                    # Есть ник но в неправильном регистре
+                    print(f"   ⚠️ Ник '{streamer_name}' найден в неправильном регистре. Регенерируем...")
+                    sys.stdout.flush()
+                    return self._reject("streamer", text)
+
+        # Обрезка отключена - оставляем текст как есть
+
+        # КРИТИЧЕСКАЯ ПРОВЕРКА: Ссылка должна присутствовать в финальном тексте!
+        url1_present = self.bonus_data.url1 in text or (self.bonus_data.url1.replace('https://', '') in text)
+        
+        if not url1_present:
+            print(f"   ⚠️ Пропала ссылка url1. Регенерируем...")
+            sys.stdout.flush()
+            return self._reject("links_missing", text)
+        
+        # КРИТИЧНАЯ ПРОВЕРКА: Текст должен быть ТОЛЬКО на РУССКОМ языке!
+        # Список частых английских ФРАЗ которые недопустимы
+        # ВАЖНО: Отдельные слова как "wild", "gate" НЕ проверяем - они могут быть в названиях слотов!
+        english_phrases = [
+            'the abyss', 'answered the call', 'summoning circle',
+            'play it safe', 'bright lights', 'chose to dive', 'deep into',
+            'dark forces', 'aligned', 'full-blown ritual', 'pulled straight',
+            'from the void', 'sometimes', 'when you stare', 'into the darkness',
+            'hands you', 'fortune in return', 'outcome is terrifyingly good',
+            'claim the', 'massive', 'boost', 'activate', 'balance power',
+            'visuals shifted', 'eerie sounds peaked', 'screen locked',
+            'random luck', 'felt like', 'handshake with the supernatural'
+        ]
+        
+        # Проверяем наличие английских фраз (НО ИСКЛЮЧАЕМ слова из названия слота и валюты!)
+        text_lower = text.lower()
+        slot_lower = video.slot.lower()
+        found_english = []
+        
+        # Список допустимых английских слов (валюты, аббревиатуры)
+        allowed_words = ['usd', 'eur', 'gbp', 'rub', 'fs', 'x', 'max', 'bet', 'win']
+        
+        for phrase in english_phrases:
+            phrase_lower = phrase.lower()
+            # Проверяем есть ли фраза в тексте
+            if phrase_lower in text_lower:
+                # Пропускаем если это допустимое слово
+                if phrase_lower in allowed_words:
+                    continue
+                
+                # Проверяем - не является ли эта фраза частью названия слота
+                # Например: "wild" есть в "2 wild 2 die"
+                if phrase_lower not in slot_lower:
+                    found_english.append(phrase)
+        
+        # Если нашли английские фразы (которые НЕ из названия слота) - регенерируем
+        if found_english:
+            print(f"   ⚠️ Обнаружен английский текст: {', '.join(found_english[:3])}... Регенерируем с РУССКИМ языком!")
+            sys.stdout.flush()
+            return self._reject("language", text, ", ".join(found_english[:5]))
+
+        # Уникальность среди уже сгенерированных
+        if text in self._generated_posts:
+            print(f"   ⚠️ Дубликат текста для поста #{index}, регенерируем...")
+            sys.stdout.flush()
+            return self._reject("duplicate", text)
+
+        # Сохраняем
+        self._generated_posts.append(text)
+
+        # История структур
+        if used_structure_index >= 0:
+            self._used_structures.append(used_structure_index)
+            if len(self._used_structures) > 50:
+                self._used_structures = self._used_structures[-50:]
+
+            slot_key = video.slot.lower()
+            if slot_key not in self._used_slot_structure:
+                self._used_slot_structure[slot_key] = []
+            self._used_slot_structure[slot_key].append(used_structure_index)
+            if len(self._used_slot_structure[slot_key]) > 20:
+                self._used_slot_structure[slot_key] = self._used_slot_structure[slot_key][-20:]
+
+        post_start = self._extract_post_start(text, length=100)
+        self._used_starts.append(post_start)
+        if len(self._used_starts) > 30:
+            self._used_starts = self._used_starts[-30:]
+
+        emoji_pattern = self._extract_emoji_pattern(text)
+        if emoji_pattern:
+            self._used_emoji_patterns.append(emoji_pattern)
+            if len(self._used_emoji_patterns) > 30:
+                self._used_emoji_patterns = self._used_emoji_patterns[-30:]
+
+        print(f"   ✅ Пост #{index} готов (длина: {len(text)})")
+        sys.stdout.flush()
+
+        return GeneratedPostAI(
+            index=index,
+            media_type="video",
+            text=text,
+            streamer=video.streamer,
+            slot=video.slot,
+            bet=video.bet,
+            win=video.win
+        )
+
     async def generate_video_post(self, video: VideoData, index: int = 0) -> GeneratedPostAI:
         """
         Генерирует уникальный пост для видео.
@@ -3189,64 +1848,15 @@ REGLAS HTML:
         max_regens = 10  # нормальные ретраи генерации (не завязаны на index)
         last_error = None
 
+        set_cost_post(index)
         for regen in range(1, max_regens + 1):
+            regen_started = time.monotonic()
             try:
-                # Определяем, есть ли реальный ник стримера в исходных данных
-                has_real_streamer = video.has_streamer()
-
-                # Выбираем промпт в зависимости от наличия стримера
-                used_structure_index = -1
-                if has_real_streamer:
-                    available_indices = list(range(len(self.VIDEO_POST_PROMPTS)))
-                    structure_index = self._get_unused_structure_index(available_indices, used_count=15, slot=video.slot)
-                    prompt_template = self.VIDEO_POST_PROMPTS[structure_index]
-                    streamer_name = video.streamer.strip()
-                    used_structure_index = structure_index
-                else:
-                    available_indices = list(range(len(self.VIDEO_POST_PROMPTS_NO_STREAMER)))
-                    structure_index = self._get_unused_structure_index(available_indices, used_count=10, slot=video.slot)
-                    prompt_template = self.VIDEO_POST_PROMPTS_NO_STREAMER[structure_index]
-                    streamer_name = ""
-                    used_structure_index = structure_index + 1000
-
-                # Генерируем уникальное описание бонуса
-                bonus1_var = self._get_random_bonus_variation(self.bonus_data.bonus1_desc, is_bonus1=True)
-
-                # Форматируем данные
-                formatted_bet = video.get_formatted_bet()
-                formatted_win = video.get_formatted_win()
-                formatted_slot = video.get_formatted_slot()
-                currency_format = video.get_random_currency_format()
-                
-                # Если слот пустой, используем общие формулировки
-                slot_unknown = False
-                if not formatted_slot or formatted_slot.strip() == "":
-                    slot_mention = "una slot"  # Общее упоминание
-                    slot_bold = "una slot"  # Для HTML
-                    slot_unknown = True
-                else:
-                    slot_mention = formatted_slot
-                    slot_bold = f"<b>{formatted_slot}</b>"
-
-                base_prompt = prompt_template.format(
-                    streamer=streamer_name if has_real_streamer else self._get_random_person(),
-                    slot=slot_bold,  # Используем форматированный слот
-                    slot_plain=slot_mention,  # Простое упоминание без HTML
-                    bet=formatted_bet,
-                    win=formatted_win,
-                    currency=currency_format,
-                    multiplier=video.multiplier,
-                    url1=self.bonus_data.url1,
-                    bonus1=bonus1_var,
-                    person=self._get_random_person()
-                )
-                
-                # КРИТИЧНО: Если слот неизвестен - ЗАПРЕЩАЕМ придумывать название!
-                if slot_unknown:
-                    base_prompt = base_prompt + "\n\n🚨🚨🚨 ¡MUY IMPORTANTE! 🚨🚨🚨\n" \
-                                                "El nombre de la slot es DESCONOCIDO — ¡NO INVENTES un nombre específico como 'Gates of Olympus', 'Big Bass', etc.!\n" \
-                                                "USA SOLO frases generales: 'una slot', 'un juego', 'la máquina', 'los rodillos'.\n" \
-                                                "PROHIBIDO inventar nombres de slots que no están en los datos originales!"
+                # Бюджет прогона (RUN_BUDGET_USD) исчерпан — новые регены не начинаем
+                check_run_budget()
+                parts = self._prepare_video_prompt(video)
+                base_prompt, prompt_values = parts.base_prompt, parts.prompt_values
+                has_real_streamer, streamer_name = parts.has_real_streamer, parts.streamer_name
 
                 streamer_info = streamer_name if has_real_streamer else "без ника (общие формулировки)"
                 print(f"🤖 Генерация поста #{index} (regen {regen}/{max_regens}) для {streamer_info} на {video.slot}...")
@@ -3258,34 +1868,15 @@ REGLAS HTML:
                 raw_system_prompt = self._get_system_prompt()
                 
                 # Добавляем примеры из существующих постов для обучения AI
-                if self._existing_posts and len(self._existing_posts) > 0:
-                    # Берем 3 случайных поста как примеры стиля
-                    example_posts = random.sample(self._existing_posts, min(3, len(self._existing_posts)))
-                    examples_text = "\n\n═══════════════════════════════════════════════════════════════\n"
-                    examples_text += "📚 ПРИМЕРЫ ТВОИХ СУЩЕСТВУЮЩИХ ПОСТОВ (изучи стиль!):\n"
-                    examples_text += "═══════════════════════════════════════════════════════════════\n\n"
-                    for i, post in enumerate(example_posts, 1):
-                        # Обрезаем до 500 символов
-                        post_preview = post[:500] + "..." if len(post) > 500 else post
-                        examples_text += f"ПРИМЕР {i}:\n{post_preview}\n\n"
-                    examples_text += "⚠️ ВАЖНО: Изучи структуру, тон, форматирование этих постов.\n"
-                    examples_text += "НО делай НОВЫЕ посты - НЕ копируй фразы и конструкции!\n"
-                    examples_text += "═══════════════════════════════════════════════════════════════\n"
-                    
-                    raw_system_prompt = raw_system_prompt + examples_text
-                
-                # Для системного промпта используем slot_mention (без HTML) или "una slot" если пусто
-                system_slot = slot_mention if formatted_slot and formatted_slot.strip() else "una slot"
+                raw_system_prompt = raw_system_prompt + self._build_examples_text()
                 
-                system_prompt = safe_format(
-                    raw_system_prompt,
-                    slot=system_slot,  # Используем простое упоминание без HTML
-                    streamer=streamer_name,
-                    url1=self.bonus_data.url1,
-                    bonus1=bonus1_var,
-                    currency=currency_format,
-                    person=self._get_random_person()
-                )
+                if self.cache_friendly_prompts:
+                    # Поля поста — метками в системном промпте, значения — в сообщении пользователя
+                    system_prompt, post_data_note = split_cacheable_prompt(
+                        raw_system_prompt, prompt_values, self.POST_DATA_HEADER
+                    )
+                else:
+                    system_prompt, post_data_note = safe_format(raw_system_prompt, **prompt_values), ""
 
                 anti_repetition = self._get_anti_repetition_instruction()
                 length_note = ""
@@ -3302,7 +1893,7 @@ REGLAS HTML:
                         print(f"   📝 Промпт (первые 200 символов): {base_prompt[:200]}...")
                         sys.stdout.flush()
 
-                    user_prompt = base_prompt + length_note + anti_repetition
+                    user_prompt = post_data_note + base_prompt + length_note + anti_repetition
 
                     api_params = {
                         "model": self.model,
@@ -3324,22 +1915,24 @@ REGLAS HTML:
                         api_params["frequency_penalty"] = 0.6
 
                     try:
-                        response = await asyncio.wait_for(
-                            self.client.chat.completions.create(**api_params),
-                            timeout=120
+                        # При LLM_HEDGING=1 — дубль в резервную модель, если основная не уложилась в свой p90
+                        response = await hedged_completion(
+                            self.client, api_params, timeout=120,
+                            models=OPENROUTER_MODELS if self.use_openrouter else None,
+                            purpose="video_post"
                         )
                     except asyncio.TimeoutError:
                         print(f"   ⏰ Таймаут 120с для модели {self.model}, попытка {attempt + 1}/3")
                         sys.stdout.flush()
                         if attempt == 2:
                             raise Exception(f"Таймаут: модель {self.model} не ответила за 120с (3 попытки)")
-                        await asyncio.sleep(2)
+                        await pace(2)
                         continue
 
                     if not response or not response.choices:
                         if attempt == 2:
                             raise Exception("Пустой ответ от API после всех попыток")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     choice = response.choices[0]
@@ -3350,14 +1943,16 @@ REGLAS HTML:
                     if finish_reason == "content_filter":
                         if attempt == 2:
                             raise Exception("Контент был отфильтрован после всех попыток")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     message_content = getattr(getattr(choice, "message", None), "content", None)
+                    get_token_log().record("video_post", self.model, api_params["messages"],
+                                           getattr(response, "usage", None), message_content)
                     if not message_content:
                         if attempt == 2:
                             raise Exception(f"Ответ без content после всех попыток. finish_reason={finish_reason}")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     raw_text = message_content.strip()
@@ -3390,150 +1985,144 @@ REGLAS HTML:
                     length_note = "\n\n⚠️ Пост слишком короткий! Добавь больше деталей, эмоций, описания. Минимум 650 символов!"
                     text = candidate
 
+                # Все попытки вне окна длины — сначала точечный ремонт, а не текст как есть
+                if text is not None and not 500 <= len(text) <= 750:
+                    repaired = await self._repair_text(text, "length", parts)
+                    if repaired and 500 <= len(repaired) <= 750:
+                        print(f"   🩹 Длина исправлена: {len(text)} → {len(repaired)}")
+                        text = repaired
+
                 if text is None or len(text) < 300:
                     raise Exception("Не удалось получить валидный текст от API")
 
-                # Постобработка
-                text = self._filter_ai_responses(text)  # Убираем ответы AI типа "Aquí tienes..."
-                text = self._postprocess_text(text, video.slot)
-                text = self._fix_broken_urls(text)
-                # _filter_non_russian НЕ используем для испанского - она для русского
-                text = self._remove_chat_mentions(text)
-                text = self._remove_template_phrases(text)
-                text = self._randomize_currency_format(text, video)
-
-                # Проверка упоминания стримера (если есть)
-                if has_real_streamer and streamer_name:
-                    streamer_mentions = text.lower().count(streamer_name.lower())
-                    # Ник должен быть упомянут 1 раз (допустимо 2 раза максимум)
-                    if streamer_mentions < 1:
-                        print(f"   ⚠️ Ник '{streamer_name}' не найден, регенерируем...")
-                        sys.stdout.flush()
-                        continue
-                    if streamer_mentions > 2:
-                        print(f"   ⚠️ Ник '{streamer_name}' найден {streamer_mentions} раз(а), должно быть 1-2. Регенерируем...")
-                        sys.stdout.flush()
-                        continue
-                    
-                    # Проверка что ник начинается с заглавной буквы
-                    if streamer_name[0].isupper():
-                        # Ищем ник в тексте и проверяем капитализацию
-                        import re
-                        # Находим все вхождения ника (учитывая возможные склонения)
-                        base_nick = streamer_name.lower()
-                        # Ищем точные совпадения с учетом регистра
-                        if base_nick in text.lower() and not streamer_name in text:
-                            # Есть ник но в неправильном регистре
-                            print(f"   ⚠️ Ник '{streamer_name}' найден в неправильном регистре. Регенерируем...")
-                            sys.stdout.flush()
-                            continue
-
-                # Обрезка отключена - оставляем текст как есть
-
-                # КРИТИЧЕСКАЯ ПРОВЕРКА: Ссылка должна присутствовать в финальном тексте!
-                url1_present = self.bonus_data.url1 in text or (self.bonus_data.url1.replace('https://', '') in text)
-                
-                if not url1_present:
-                    print(f"   ⚠️ Пропала ссылка url1. Регенерируем...")
-                    sys.stdout.flush()
-                    continue
-                
-                # КРИТИЧНАЯ ПРОВЕРКА: Текст должен быть ТОЛЬКО на РУССКОМ языке!
-                # Список частых английских ФРАЗ которые недопустимы
-                # ВАЖНО: Отдельные слова как "wild", "gate" НЕ проверяем - они могут быть в названиях слотов!
-                english_phrases = [
-                    'the abyss', 'answered the call', 'summoning circle',
-                    'play it safe', 'bright lights', 'chose to dive', 'deep into',
-                    'dark forces', 'aligned', 'full-blown ritual', 'pulled straight',
-                    'from the void', 'sometimes', 'when you stare', 'into the darkness',
-                    'hands you', 'fortune in return', 'outcome is terrifyingly good',
-                    'claim the', 'massive', 'boost', 'activate', 'balance power',
-                    'visuals shifted', 'eerie sounds peaked', 'screen locked',
-                    'random luck', 'felt like', 'handshake with the supernatural'
-                ]
-                
-                # Проверяем наличие английских фраз (НО ИСКЛЮЧАЕМ слова из названия слота и валюты!)
-                text_lower = text.lower()
-                slot_lower = video.slot.lower()
-                found_english = []
-                
-                # Список допустимых английских слов (валюты, аббревиатуры)
-                allowed_words = ['usd', 'eur', 'gbp', 'rub', 'fs', 'x', 'max', 'bet', 'win']
-                
-                for phrase in english_phrases:
-                    phrase_lower = phrase.lower()
-                    # Проверяем есть ли фраза в тексте
-                    if phrase_lower in text_lower:
-                        # Пропускаем если это допустимое слово
-                        if phrase_lower in allowed_words:
-                            continue
-                        
-                        # Проверяем - не является ли эта фраза частью названия слота
-                        # Например: "wild" есть в "2 wild 2 die"
-                        if phrase_lower not in slot_lower:
-                            found_english.append(phrase)
-                
-                # Если нашли английские фразы (которые НЕ из названия слота) - регенерируем
-                if found_english:
-                    print(f"   ⚠️ Обнаружен английский текст: {', '.join(found_english[:3])}... Регенерируем с РУССКИМ языком!")
-                    sys.stdout.flush()
-                    continue
-
-                # Уникальность среди уже сгенерированных
-                if text in self._generated_posts:
-                    print(f"   ⚠️ Дубликат текста для поста #{index}, регенерируем...")
-                    sys.stdout.flush()
+                post = await self._finalize_video_text(text, video, index, parts)
+                self._record_outcome(post is not None, regen, time.monotonic() - regen_started)
+                if post is None and self._last_reject_reason in REPAIRABLE_REASONS:
+                    # Локальное нарушение — чиним черновик точечно, полная регенерация только если не вышло
+                    repair_started = time.monotonic()
+                    reason = self._last_reject_reason
+                    repaired = await self._repair_text(self._last_rejected_text, reason, parts)
+                    if repaired:
+                        post = await self._finalize_video_text(repaired, video, index, parts)
+                        get_model_telemetry().record_outcome(
+                            repair_model(self.use_openrouter, OPENROUTER_MODELS), post is not None,
+                            "" if post is not None else self._last_reject_reason, regen, time.monotonic() - repair_started
+                        )
+                        print(f"   🩹 Ремонт {'удался' if post is not None else 'не помог, полная регенерация'}")
+                settle_attempt(int(post is not None), int(post is None))
+                if post is None:
                     continue
+                return post
 
-                # Сохраняем
-                self._generated_posts.append(text)
-
-                # История структур
-                if used_structure_index >= 0:
-                    self._used_structures.append(used_structure_index)
-                    if len(self._used_structures) > 50:
-                        self._used_structures = self._used_structures[-50:]
-
-                    slot_key = video.slot.lower()
-                    if slot_key not in self._used_slot_structure:
-                        self._used_slot_structure[slot_key] = []
-                    self._used_slot_structure[slot_key].append(used_structure_index)
-                    if len(self._used_slot_structure[slot_key]) > 20:
-                        self._used_slot_structure[slot_key] = self._used_slot_structure[slot_key][-20:]
-
-                post_start = self._extract_post_start(text, length=100)
-                self._used_starts.append(post_start)
-                if len(self._used_starts) > 30:
-                    self._used_starts = self._used_starts[-30:]
-
-                emoji_pattern = self._extract_emoji_pattern(text)
-                if emoji_pattern:
-                    self._used_emoji_patterns.append(emoji_pattern)
-                    if len(self._used_emoji_patterns) > 30:
-                        self._used_emoji_patterns = self._used_emoji_patterns[-30:]
-
-                print(f"   ✅ Пост #{index} готов (длина: {len(text)})")
-                sys.stdout.flush()
-
-                return GeneratedPostAI(
-                    index=index,
-                    media_type="video",
-                    text=text,
-                    streamer=video.streamer,
-                    slot=video.slot,
-                    bet=video.bet,
-                    win=video.win
-                )
-
+            except (CircuitOpenError, BudgetExceeded):
+                # Модель отключена после серии ошибок или бюджет исчерпан — не тратим регены
+                raise
             except Exception as e:
                 last_error = e
+                self._last_reject_reason = "error"
+                self._record_outcome(False, regen, time.monotonic() - regen_started)
+                settle_attempt(0, 1)
                 print(f"❌ Ошибка генерации поста #{index} (regen {regen}/{max_regens}): {e}")
                 sys.stdout.flush()
-                await asyncio.sleep(0.5)
+                await pace(0.5)
                 continue
 
         raise Exception(f"Не удалось сгенерировать пост после {max_regens} попыток: {last_error}")
     
+    async def generate_video_posts_batch(self, videos: List[VideoData],
+                                         start_index: int = 0) -> List[Optional[GeneratedPostAI]]:
+        """
+        Пакетный режим: один запрос к модели на несколько видео (см. src/batch_generation.py).
+
+        Каждый пост из ответа проходит те же проверки и постобработку, что и в
+        generate_video_post. На месте отклонённых — None: их перегенерирует
+        вызывающий код по одному.
+        """
+        if not self.client or not self.bonus_data or not videos:
+            return [None] * len(videos)
+
+        parts = [self._prepare_video_prompt(video) for video in videos]
+        raw_system_prompt = self._get_system_prompt() + self._build_examples_text()
+        # Поля постов в системном промпте — метками, значения — в секции каждого поста
+        system_prompt, _ = split_cacheable_prompt(raw_system_prompt, parts[0].prompt_values, self.POST_DATA_HEADER)
+        sections = []
+        for n, part in enumerate(parts, 1):
+            _, post_data_note = split_cacheable_prompt(raw_system_prompt, part.prompt_values, self.POST_DATA_HEADER)
+            sections.append(
+                self.BATCH_ITEM_HEADER.format(n=n) + "\n" + post_data_note
+                + part.base_prompt + part.number_format_instruction
+            )
+        user_prompt = (
+            "\n\n".join(sections)
+            + self._get_anti_repetition_instruction()
+            + self.BATCH_OUTPUT_INSTRUCTION.format(count=len(videos))
+        )
+
+        api_params = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        }
+        if self.model in ["gpt-4.1-nano", "gpt-4.1-mini"]:
+            api_params["max_completion_tokens"] = 8000
+        elif self.use_openrouter:
+            api_params["max_tokens"] = 16000
+            api_params["temperature"] = 0.95
+        else:
+            api_params["max_tokens"] = 1500 * len(videos)
+            api_params["temperature"] = 0.95
+
+        last_index = start_index + len(videos) - 1
+        print(f"🤖 Пакетная генерация постов #{start_index}-#{last_index} ({len(videos)} шт.), модель {self.model}...")
+        sys.stdout.flush()
+        set_cost_post(None)
+        # Бюджет прогона (RUN_BUDGET_USD) проверяется и перед пакетом: BudgetExceeded
+        # уходит в generate_all_posts, который возвращает частичный результат
+        check_run_budget()
+        batch_started = time.monotonic()
+        try:
+            response = await timed_completion(self.client, api_params, "video_post_batch", timeout=180)
+            content = response.choices[0].message.content if response and response.choices else None
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"   ⚠️ Пакетный запрос не удался ({e}), посты будут сгенерированы по одному")
+            sys.stdout.flush()
+            return [None] * len(videos)
+        get_token_log().record("video_post_batch", self.model, api_params["messages"],
+                               getattr(response, "usage", None), content)
+
+        texts = parse_batch_response(content, len(videos))
+        # Время пакета делим поровну между постами — для сравнения с одиночной генерацией
+        per_post_seconds = (time.monotonic() - batch_started) / len(videos)
+        results: List[Optional[GeneratedPostAI]] = []
+        for n, (video, part) in enumerate(zip(videos, parts), 1):
+            index = start_index + n - 1
+            text = strip_section_markers(texts.get(n, ""))
+            # То же окно длины, что и в generate_video_post
+            if not 500 <= len(text) <= 750:
+                print(f"   ⚠️ Пакет: пост #{index} пропущен или вне окна длины ({len(text)}), перегенерируем отдельно")
+                self._last_reject_reason = "length"
+                self._record_outcome(False, 0, per_post_seconds)
+                results.append(None)
+                continue
+            try:
+                post = await self._finalize_video_text(text, video, index, part)
+            except Exception as e:
+                print(f"   ⚠️ Пакет: пост #{index} не прошёл постобработку: {e}")
+                self._last_reject_reason = "error"
+                post = None
+            self._record_outcome(post is not None, 0, per_post_seconds)
+            results.append(post)
+
+        accepted = sum(post is not None for post in results)
+        settle_attempt(accepted, len(videos) - accepted)
+        print(f"   📦 Пакет: принято {accepted}/{len(videos)}")
+        sys.stdout.flush()
+        return results
+
     async def generate_image_post(self, index: int = 0) -> GeneratedPostAI:
         """
         Генерирует уникальный пост для картинки (бонусы).
@@ -3553,8 +2142,10 @@ REGLAS HTML:
         max_regens = 5  # для image постов достаточно 5 попыток
         last_error = None
 
+        set_cost_post(index)
         for regen in range(1, max_regens + 1):
             try:
+                check_run_budget()
                 # Выбираем случайный промпт
                 prompt_template = random.choice(self.IMAGE_POST_PROMPTS)
                 
@@ -3603,10 +2194,7 @@ REGLAS HTML:
                     api_params["frequency_penalty"] = 0.6
                 
                 try:
-                    response = await asyncio.wait_for(
-                        self.client.chat.completions.create(**api_params),
-                        timeout=120
-                    )
+                    response = await timed_completion(self.client, api_params, "image_post", timeout=120)
                 except asyncio.TimeoutError:
                     raise Exception(f"Таймаут: модель {self.model} не ответила за 120с")
                 
@@ -3678,10 +2266,14 @@ REGLAS HTML:
                     text=text
                 )
 
+            except (CircuitOpenError, BudgetExceeded) as e:
+                last_error = e
+                print(f"❌ {e}")
+                break
             except Exception as e:
                 last_error = e
                 print(f"❌ Ошибка генерации image поста #{index} (regen {regen}/{max_regens}): {e}")
-                await asyncio.sleep(0.5)
+                await pace(0.5)
                 continue
         
         # Если все попытки провалились - возвращаем fallback
@@ -3700,7 +2292,8 @@ REGLAS HTML:
         self, 
         videos: List[VideoData], 
         image_count: int = 0,
-        progress_callback=None
+        progress_callback=None,
+        job=None
     ) -> List[GeneratedPostAI]:
         """
         Генерирует все посты с сохранением промежуточных результатов.
@@ -3709,6 +2302,7 @@ REGLAS HTML:
             videos: Список данных о видео
             image_count: Количество постов с картинками
             progress_callback: async функция(current, total) для отчёта о прогрессе
+            job: Job из src.job_manager — пауза/остановка и счётчики прогресса (опционально)
             
         Returns:
             Список сгенерированных постов
@@ -3722,17 +2316,34 @@ REGLAS HTML:
         last_error = None
         
         # Генерируем посты для видео
+        use_batch = batch_enabled(self.model)
+        batched: Dict[int, GeneratedPostAI] = {}
         for i, video in enumerate(videos):
+            if job is not None and not await job.checkpoint():
+                print(f"🛑 Генерация остановлена пользователем после {len(posts)}/{total} постов")
+                break
             try:
-                post = await self.generate_video_post(video, current)
+                if use_batch and i % BATCH_GENERATION_SIZE == 0:
+                    chunk = videos[i:i + BATCH_GENERATION_SIZE]
+                    ready = await self.generate_video_posts_batch(chunk, current)
+                    batched = {i + k: post for k, post in enumerate(ready) if post is not None}
+                post = batched.pop(i, None)
+                from_batch = post is not None
+                if post is None:
+                    # Одиночная генерация — обычный режим и добор отклонённых из пакета
+                    post = await self.generate_video_post(video, current)
                 posts.append(post)
                 current += 1
+                if job is not None:
+                    job.advance()
+                    job.save_item(post.index, post)
                 
                 if progress_callback:
                     await progress_callback(current, total)
                 
                 # Небольшая задержка чтобы не перегружать API
-                await asyncio.sleep(0.5)
+                if not from_batch:
+                    await pace(0.5)
                 
             except Exception as e:
                 last_error = e
@@ -3744,15 +2355,20 @@ REGLAS HTML:
         # Генерируем посты для картинок (только если нет критической ошибки)
         if last_error is None:
             for i in range(image_count):
+                if job is not None and not await job.checkpoint():
+                    break
                 try:
                     post = await self.generate_image_post(current)
                     posts.append(post)
                     current += 1
+                    if job is not None:
+                        job.advance()
+                        job.save_item(post.index, post)
                     
                     if progress_callback:
                         await progress_callback(current, total)
                     
-                    await asyncio.sleep(0.5)
+                    await pace(0.5)
                     
                 except Exception as e:
                     last_error = e
@@ -3835,57 +2451,7 @@ REGLAS HTML:
         }
     }
     
-    UNIQUENESS_CHECK_PROMPT = """Eres un experto en verificación de unicidad de contenido para Telegram.
-
-⚠️ IMPORTANTE: Las líneas con URLs y descripciones de bonos/promociones ya han sido ELIMINADAS de los textos.
-Compara SOLO el texto principal del autor.
-
-Te dan {count} publicaciones. Tu tarea es encontrar publicaciones SIMILARES.
-
-CRITERIOS DE SIMILITUD (si al menos 1 coincide - es un duplicado):
-1. Inicio idéntico (primeras 5-10 palabras coinciden o son muy similares en significado)
-2. Estructura idéntica (ambos comienzan con pregunta / ambos con exclamación / ambos con número)
-3. Frases repetidas (3+ palabras seguidas aparecen en ambos posts)
-4. Significado similar (describen lo mismo con palabras diferentes, misma "historia")
-5. Patrones emoji idénticos (ambos comienzan con mismos emojis, ambos terminan igual)
-6. ELEMENTOS DE PLANTILLA (¡esto es CRÍTICO!):
-   - "BOTÓN №1", "BOTÓN №2" o marcadores similares
-   - Separadores idénticos (—•—🍉🔥🍓—•—, ◈◈◈, ~~~)
-   - Designaciones idénticas de enlaces ("👇 primero 👇", "👇 segundo 👇")
-   - Estructura repetida de colocación de enlaces (ambos al inicio/ambos al final/ambos entre párrafos)
-
-PUBLICACIONES PARA ANÁLISIS:
-{posts_json}
-
-RESPONDE ESTRICTAMENTE EN FORMATO JSON (sin markdown, sin ```json):
-{{
-  "duplicates": [
-    {{"post1": 3, "post2": 17, "reason": "inicio idéntico: 'Mira lo que está pasando'", "similarity": 85}},
-    {{"post1": 8, "post2": 45, "reason": "repetición de frase: 'el resultado simplemente explotó'", "similarity": 70}}
-  ],
-  "warnings": [
-    {{"post": 5, "issue": "publicación demasiado corta"}},
-    {{"post": 12, "issue": "sin llamada a la acción"}}
-  ],
-  "total_unique": 78,
-  "total_duplicates": 2,
-  "summary": "Se encontraron 2 pares de publicaciones similares de 80. Recomiendo regenerar posts #17 y #45."
-}}
-
-Si TODAS las publicaciones son únicas:
-{{
-  "duplicates": [],
-  "warnings": [],
-  "total_unique": {count},
-  "total_duplicates": 0,
-  "summary": "¡Todas las {count} publicaciones son únicas! Excelente trabajo."
-}}
-
-IMPORTANTE: 
-- Verifica TODOS los pares de publicaciones
-- Considera posts para UN slot - suelen ser más similares
-- similarity - porcentaje de similitud (50-100)
-- Responde SOLO JSON, sin explicaciones"""
+    UNIQUENESS_CHECK_PROMPT = PackField("es")
 
     @staticmethod
     def _strip_link_blocks_for_comparison(text: str) -> str:
@@ -3952,7 +2518,6 @@ IMPORTANTE:
             }
         """
         import json
-        import aiohttp
         
         # Получаем модель
         model_info = self.UNIQUENESS_CHECK_MODELS.get(model)
@@ -3967,13 +2532,13 @@ IMPORTANTE:
             posts_data.append({
                 "id": i + 1,
                 "slot": slot,
-                "text": cleaned[:400] + "..." if len(cleaned) > 400 else cleaned
+                "text": trim_to_tokens(cleaned, UNIQUENESS_POST_TOKENS)
             })
         
         # Формируем промпт
         prompt = self.UNIQUENESS_CHECK_PROMPT.format(
             count=len(posts),
-            posts_json=json.dumps(posts_data, ensure_ascii=False, indent=2)
+            posts_json=compact_json(posts_data)
         )
         
         # Добавляем существующие посты если они есть
@@ -3984,13 +2549,13 @@ IMPORTANTE:
             for i, post in enumerate(sample_existing, 1):
                 existing_preview.append({
                     "id": f"OLD_{i}",
-                    "text": post[:300] + "..." if len(post) > 300 else post
+                    "text": trim_to_tokens(post, UNIQUENESS_EXISTING_TOKENS)
                 })
             
             prompt += f"\n\n════════════════════════════════════════════════════════════\n"
             prompt += f"📚 СУЩЕСТВУЮЩИЕ ПОСТЫ (из базы {len(self._existing_posts)} постов):\n"
             prompt += f"════════════════════════════════════════════════════════════\n"
-            prompt += json.dumps(existing_preview, ensure_ascii=False, indent=2)
+            prompt += compact_json(existing_preview)
             prompt += f"\n\n⚠️ ВАЖНО: Проверь также что НОВЫЕ посты НЕ ПОХОЖИ на СУЩЕСТВУЮЩИЕ!\n"
             prompt += f"Если новый пост похож на существующий - это КРИТИЧЕСКИЙ дубль!\n"
 
@@ -4005,7 +2570,8 @@ IMPORTANTE:
 
         try:
             # Вызываем OpenRouter API
-            async with aiohttp.ClientSession() as session:
+            uniqueness_started = time.monotonic()
+            async with http_session() as session:
                 headers = {
                     "Authorization": f"Bearer {openrouter_key}",
                     "Content-Type": "application/json",
@@ -4029,6 +2595,8 @@ IMPORTANTE:
                 ) as response:
                     if response.status != 200:
                         error_text = await response.text()
+                        get_model_telemetry().record_call(model_info["id"], f"uniqueness_{model}",
+                                                          time.monotonic() - uniqueness_started, "error")
                         return {
                             "is_unique": None,
                             "error": f"API ошибка: {response.status} - {error_text}",
@@ -4037,6 +2605,15 @@ IMPORTANTE:
                     
                     data = await response.json()
                     content = data["choices"][0]["message"]["content"]
+                    get_token_log().record(f"uniqueness_{model}", model_info["id"], payload["messages"],
+                                           data.get("usage"), content)
+                    usage = data.get("usage") or {}
+                    get_cost_ledger().record_call(model_info["id"], usage, payload["messages"])
+                    get_model_telemetry().record_call(
+                        model_info["id"], f"uniqueness_{model}", time.monotonic() - uniqueness_started,
+                        data["choices"][0].get("finish_reason"),
+                        usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                    )
                     
                     # Сохраняем оригинальный ответ для отладки
                     original_content = content
@@ -17,6 +17,7 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import os
 import re
+import time
 
 try:
     from openai import AsyncOpenAI
@@ -25,6 +26,31 @@ except ImportError:
     AsyncOpenAI = None
     httpx = None
 
+from src.postprocess_pool import run_postprocess
+from src.langpack import PackField
+from src.prompt_cache import CACHE_FRIENDLY_PROMPTS, split_cacheable_prompt
+from src.cassette import http_session, pace
+from src.bonus_pool_builder import build_bonus_pool
+from src.bonus_pool_index import is_too_similar_to_pool
+from src.morphology import decline_nickname
+from src.hedging import hedged_completion, timed_completion
+from src.circuit_breaker import CircuitOpenError
+from src.repair_tier import (
+    REPAIR_ENABLED, REPAIR_MAX_TOKENS, REPAIR_TIMEOUT, REPAIRABLE_REASONS,
+    build_repair_messages, clean_repair_output, repair_model
+)
+from src.cost_accounting import (
+    BudgetExceeded, check_run_budget, get_cost_ledger, register_model_prices, set_cost_post, settle_attempt
+)
+from src.model_telemetry import get_model_telemetry
+from src.batch_generation import (
+    BATCH_GENERATION_SIZE, VideoPromptParts, batch_enabled, parse_batch_response, strip_section_markers
+)
+from src.token_budget import (
+    EXAMPLE_POST_TOKENS, EXAMPLES_TOTAL_TOKENS, UNIQUENESS_POST_TOKENS, UNIQUENESS_EXISTING_TOKENS,
+    compact_json, get_token_log, pack_items, trim_to_tokens
+)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SAFE STRING FORMATTING (не падает, если плейсхолдер не передан)
@@ -49,7 +75,7 @@ def safe_format(template: str, **kwargs) -> str:
 # OPENROUTER MODELS - Доступные модели через OpenRouter API
 # ═══════════════════════════════════════════════════════════════════════════════
 
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 # Актуальные ID моделей OpenRouter (проверено 10.01.2026)
 OPENROUTER_MODELS = {
@@ -252,6 +278,9 @@ OPENROUTER_MODELS = {
     }
 }
 
+# Цены моделей — для учёта стоимости вызовов (src/cost_accounting.py)
+register_model_prices(OPENROUTER_MODELS)
+
 
 @dataclass
 class VideoData:
@@ -381,1849 +410,92 @@ class AIPostGenerator:
     
     @staticmethod
     def _decline_nickname(nickname: str, case: str = "genitive") -> str:
-        """
-        Склоняет ник стримера для русского языка.
-        
-        Args:
-            nickname: Оригинальный ник (например: Manik, Buratino)
-            case: Падеж - "genitive" (родительный - у кого?), "dative" (дательный - кому?)
-        
-        Returns:
-            Склоненный ник с сохранением заглавной буквы
-        """
-        if not nickname:
-            return nickname
-        
-        # Сохраняем оригинальную капитализацию первой буквы
-        first_char_upper = nickname[0].isupper()
-        nick_lower = nickname.lower()
-        
-        # Правила склонения для распространенных окончаний
-        if case == "genitive":  # у кого? - Manika, Buratina
-            if nick_lower.endswith(('o', 'а', 'я')):
-                result = nickname + 'и'
-            elif nick_lower.endswith('й'):
-                result = nickname[:-1] + 'я'
-            elif nick_lower.endswith('ь'):
-                result = nickname[:-1] + 'я'
-            else:
-                result = nickname + 'а'
-        
-        elif case == "dative":  # кому? - Maniku, Buratinu
-            if nick_lower.endswith(('o', 'а', 'я')):
-                result = nickname + 'е'
-            elif nick_lower.endswith('й'):
-                result = nickname[:-1] + 'ю'
-            elif nick_lower.endswith('ь'):
-                result = nickname[:-1] + 'ю'
-            else:
-                result = nickname + 'у'
-        else:
-            result = nickname
-        
-        # Восстанавливаем капитализацию
-        if first_char_upper and result:
-            result = result[0].upper() + result[1:]
-        
-        return result
+        """Склоняет ник стримера для русского языка (см. src.morphology.decline_nickname)."""
+        return decline_nickname(nickname, case)
     
     # ═══════════════════════════════════════════════════════════════════
     # СИСТЕМНЫЙ ПРОМПТ "АРХИТЕКТОР" (ФРАНЦУЗСКИЙ)
     # ═══════════════════════════════════════════════════════════════════
     
-    SYSTEM_PROMPT_ARCHITECT = """🇫🇷 CRITIQUE : ÉCRIS UNIQUEMENT EN FRANÇAIS !
-❌ INTERDIT d'utiliser le russe, l'anglais ou d'autres langues dans le texte
-✅ AUTORISÉ en anglais : noms des machines à sous (Gates of Olympus, Sweet Bonanza)
-❌ TOUT LE RESTE UNIQUEMENT EN FRANÇAIS
-
-🚨🚨🚨 RÈGLE #0 AVANT TOUT ! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ CE SONT DES **DEVISES**, PAS DES NOMS DE PERSONNES !
-❌ **JAMAIS** écrire "USD a misé", "EUR a gagné"
-✅ UTILISE : "Un joueur", "Un parieur", "Le héros", "Le gagnant"
-⚠️ SI TU UTILISES USD/EUR COMME NOM = TOUT LE POST SERA REJETÉ !
-
-🚨 RÈGLE #0.5 : UNIQUEMENT DES TERMES EN FRANÇAIS ! 🚨
-❌ NE PAS utiliser "Free Spins", "Bonus", "Welcome Package"
-✅ UTILISE : "tours gratuits", "tours offerts", "bonus", "pack de bienvenue"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE #0.7 : MONTANTS EXACTS — INTERDICTION D'ARRONDIR ! 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ UTILISE LES MONTANTS EXACTS tels quels — NE JAMAIS arrondir !
-❌ Mise de 0.60€ → NE PAS écrire "1 euro", "1€", "un euro"
-❌ Mise de 0.40€ → NE PAS écrire "1€" ou "quelques centimes"
-✅ Mise de 0.60€ → ÉCRIS "0.60€", "0,60€", "60 centimes"
-✅ Mise de 1.50€ → ÉCRIS "1.50€", "1,50 euro"
-⚠️ LES CHIFFRES DANS LE POST = EXACTEMENT ceux des données d'entrée !
-
-═══════════════════════════════════════════════════════════════
-👤 FOCUS : LE GAIN COMME POINT CENTRAL
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITIQUE : CONSTRUIS LE POST AUTOUR DU GAIN !
-
-• La machine à sous ({slot}) - le décor
-• La mise ({bet}) et le gain ({win}) - à travers le joueur
-• Le multiplicateur x{multiplier} - le résultat
-
-EXEMPLES :
-"Un joueur a risqué {bet}{currency} sur {slot} et a empoché {win}{currency}"
-"Gain épique : de {bet} à {win} sur {slot} - multiplicateur x{multiplier} !"
-
-OBJECTIF : Montre le gain comme quelque chose de palpitant et réel !
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #1 - CODES DEVISES 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'utiliser USD, EUR comme NOMS ou SURNOMS de personnes :
-  
-❌ FAUX (REJETÉ IMMÉDIATEMENT) :
-  - "USD a misé..." 
-  - "EUR est entré dans la salle..."
-  - "Un audacieux connu sous le nom d'USD..."
-  
-✅ CORRECT (ces codes sont UNIQUEMENT pour les montants) :
-  - "Un joueur a misé 50 euros"
-  - "Le gagnant a empoché 1 000 euros"
-  - "Avec 500 USD il a misé..."
-
-⚠️ POUR NOMMER LE JOUEUR UTILISE :
-  - "Un joueur", "Un parieur", "Un chanceux", "Un veinard"
-  - "Le héros", "Le champion", "Le gagnant", "Le roi"
-  - "Un audacieux", "Un téméraire", "Un aventurier"
-  - JAMAIS : USD, EUR
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'inventer des bonus :
-
-✅ UTILISE UNIQUEMENT le bonus indiqué dans {bonus1}
-❌ NE PAS INVENTER "100 dollars", "100 tours", "150%", "500%" 
-❌ NE PAS COPIER d'exemples d'autres posts
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT DE COMPARER LES MISES AVEC LES DÉPENSES QUOTIDIENNES
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS comparer la mise avec :
-  - Le prix du déjeuner/dîner/nourriture
-  - Le coût d'un café/bar
-  - Le prix d'une pizza/hamburger
-  - Le billet de métro/taxi/transport
-  - "Ce que tu dépenses pour..." n'importe quoi du quotidien
-
-✅ CORRECT : Mentionne simplement le montant sans comparaisons
-
-🎯 MOTIVATION ET APPEL À L'ACTION (CRITIQUE !) :
-✅ DÉCRIS LES BONUS DE MANIÈRE ATTRACTIVE - crée le DÉSIR de récupérer le bonus !
-✅ UTILISE DES MOTS ÉMOTIONNELS : "exclusif", "incroyable", "gratuit", "instantané", "spécial"
-✅ AJOUTE DE L'URGENCE : "seulement aujourd'hui", "temps limité", "ne rate pas ça", "active maintenant"
-✅ METS EN AVANT LES AVANTAGES : "double ton dépôt", "obtiens plus", "sans risque", "commence à gagner"
-✅ APPEL À L'ACTION : "récupère maintenant", "active TOUT DE SUITE", "obtiens l'accès", "commence à gagner"
-
-Tu es un architecte de contenus viraux pour Telegram.
-Ta mission est de concevoir des posts qui génèrent de l'engagement.
-Chaque élément du texte doit travailler pour maintenir l'attention.
-
-═══════════════════════════════════════════════════════════════
-🎰 IMPORTANT : NE PAS INVENTER DE THÉMATIQUES SANS RAPPORT !
-═══════════════════════════════════════════════════════════════
-⚠️ Utilise le nom de la machine à sous {slot} comme indice et contexte, mais N'INVENTE PAS un thème SANS RAPPORT !
-• Tu peux interpréter librement : "Vampy Party" → fête/nuit/risque/vampires/gothique
-• Tu peux simplement mentionner le nom : "dans la machine {slot} il s'est passé..."
-• Tu peux l'utiliser comme métaphore : "chance vampirique", "jackpot nocturne"
-
-═══════════════════════════════════════════════════════════════
-📈 PRINCIPE DE BASE : INGÉNIERIE ÉMOTIONNELLE
-═══════════════════════════════════════════════════════════════
-
-Le texte est un système. Chaque paragraphe, emoji, format est une interface pour l'émotion.
-
-• Les emojis sont des éléments UI. 💡 - idée, 🎯 - défi, 🔥 - action, 💎 - valeur
-• Rythme et respiration : alterne phrases longues et courtes
-• Le texte doit SE REJOUER dans l'esprit comme une vidéo dynamique
-
-═══════════════════════════════════════════════════════════════
-🛠 STACK TECHNIQUE DE FORMAT (HTML !)
-═══════════════════════════════════════════════════════════════
-
-Accents :
-• <b>Gras</b> - pour les déclencheurs clés (chiffres, invitations, idée principale)
-• <i>Italique</i> - pour un message intime, un clin d'œil
-• <code>Monospace</code> - pour les données objectives (montants, multiplicateurs)
-
-Composition et séparation (3 types de séparateurs en rotation) :
-• Air (double retour à la ligne)
-• Graphiques : ─── ✦ ─── , ༄ ༄ ༄, ▰▱▰▱▰
-• Patterns emoji : 👉 👉 👉, ◈ ◈ ◈, ⚡️🌩⚡️🌩
-
-═══════════════════════════════════════════════════════════════
-🔮 POSITION DU LIEN (VARIER !)
-═══════════════════════════════════════════════════════════════
-
-VARIANTES DE POSITION (choisis différent à chaque fois) :
-📍 AU DÉBUT : Lien + description → Texte de l'histoire
-📍 AU MILIEU : Texte initial → Lien + description → Texte final
-📍 À LA FIN : Texte de l'histoire → Lien + description
-
-🔗 HYPERLIEN - MINIMUM 4 MOTS !
-❌ <a href="URL">Récupère</a> - trop court !
-✅ <a href="URL">Récupère le pack de bienvenue maintenant</a>
-
-═══════════════════════════════════════════════════════════════
-🧩 CONSTRUCTEUR DU MESSAGE
-═══════════════════════════════════════════════════════════════
-
-Sélection des données :
-• À partir des faits (montant, machine, mise) — 1-2 faits dominants + 1-2 secondaires
-• Le montant gagné se mentionne STRICTEMENT UNE FOIS au moment le plus émotionnel !
-• ⛔ INTERDIT de mentionner le gain 2+ fois ! Pas de "Devine le résultat ?" si le gain est DÉJÀ révélé !
-
-Neutralisation des mots interdits :
-• "Casino" → "plateforme", "site", "club"
-• "protagoniste" → "joueur", "parieur", "chanceux", "veinard"
-
-Volume optique : 7-15 lignes sur Telegram (complet mais sans scroll)
-
-Point de vue : Narration à la TROISIÈME PERSONNE, focus sur LE GAIN !
-❌ INTERDIT : "protagoniste" — utilise "le joueur", "ce mec", "l'audacieux", "le parieur"
-✅ ÉCRIS : "Le joueur est entré", "Le résultat impressionne", "Le gain était impressionnant"
-❌ NE PAS ÉCRIRE : "je joue", "je lance", "je suis entré" (première personne - INTERDIT !)
-
-🚫 INTERDIT D'INDIQUER LE TEMPS :
-❌ JAMAIS indiquer : "aujourd'hui", "hier", "ce matin", "dans l'après-midi", "ce soir", "récemment"
-✅ Écris simplement sur l'événement sans références temporelles
-
-🚫 INTERDITES LES PHRASES CLICHÉS :
-❌ NE PAS utiliser : "l'écran a explosé", "des frissons dans tout le corps"
-✅ ÉCRIS DE MANIÈRE ORIGINALE, évite les clichés !
-
-Variabilité des introductions (ROTATION obligatoire !) :
-• Bombe numérique : «<code>500 000</code> {currency}. Résultat puissant !...»
-• Question provocatrice : «Tu crois aux signes ? Voilà comment ce joueur les a utilisés...»
-• Directive : «Retiens ce gain : <b>{win}{currency}</b>...»
-• Histoire : «Une folie silencieuse s'est produite...»
-
-═══════════════════════════════════════════════════════════════
-🎨 THÉMATIQUES DES POSTS (choisis DIFFÉRENTES !)
-═══════════════════════════════════════════════════════════════
-
-1. 📊 ANALYTIQUE : Reportage, analyse, critique | 📊━━━📈━━━📊
-2. ⚡️ OLYMPE : Dieux, Zeus, victoire divine | ⚡️🌩⚡️🌩
-3. 🍻 TAVERNE : Célébration, trinquer | ---🍀---🍻---
-4. 🤠 FAR WEST : Cowboy, or | 🔫🌵
-5. 🏍 MOTARDS : Rugissement de moteurs, fièvre de l'or | 💀➖🏍➖💰
-6. ⛏ MINE : Creuser, dynamite | 〰️〰️〰️
-7. 🦄 CONTE DE FÉES : Pot d'or, chevaliers | -=-=-🦄-=-=-
-8. 🎐 JAPONAIS : Esprits du vent, magie | ⛩
-9. 🚀 ESPACE : Astéroïdes, fusée, carburant | 🚀💫
-10. ☁️ NUAGES : Vols, tours aériens | ☁️✨☁️
-11. 🃏 DIVINATION : Tarot, prophétie, cartes | ───※·💀·※───
-12. 👑 VIP : Réception royale, luxe | 👑💎👑
-
-❌ INTERDIT : **markdown**, `code`, [lien](url)
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, pensées, commentaires émotionnels, explications
-• <u>souligné</u> — titres de blocs, choses importantes, questions
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <b><i>gras italique</i></b> — accents spéciaux
-
-💬 PENSÉES ET RÉACTIONS (utilise dans les posts !) :
-• <i>«Je n'ai jamais vu ça !»</i> — tes pensées
-• <i>La série a démarré doucement...</i> — explications
-• <i>J'en ai eu le souffle coupé...</i> — émotions
-
-⚠️ CRITIQUE : UTILISE <i> et <u> DANS CHAQUE POST ! Pas seulement <b> et <code> !
-• Au moins 2-3 phrases en <i>italique</i> par post
-• Au moins 1 phrase en <u>souligné</u> par post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUCTION AU LIEN — BLOC MOTIVATIONNEL (CRITIQUE !)
-═══════════════════════════════════════════════════════════════
-
-⚠️ AVANT LE LIEN AJOUTE OBLIGATOIREMENT UNE INTRODUCTION :
-Ce sont 1-2 phrases qui RÉCHAUFFENT le lecteur et le MOTIVENT à cliquer sur le lien.
-
-📌 CE QUE DOIT FAIRE L'INTRODUCTION :
-• Relier l'histoire du gain avec la POSSIBILITÉ du lecteur de reproduire l'expérience
-• Créer le sentiment que le LECTEUR aussi peut gagner
-• Susciter le désir d'ESSAYER tout de suite
-• Utiliser les émotions de l'histoire pour passer à l'action
-
-📌 STRUCTURE DE L'INTRODUCTION :
-• Référence au gain du post → ta chance d'essayer toi aussi
-• Question-intrigue → réponse sous forme de lien
-• Appel à l'action basé sur l'histoire
-
-📌 TONALITÉ :
-• Amicale, sans pression
-• Avec enthousiasme et adrénaline
-• Comme si tu partageais un secret avec un ami
-
-❌ NE PAS écrire l'introduction séparément — elle doit COULER naturellement vers le lien !
-✅ Introduction + lien = un seul bloc motivationnel
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMAT DU LIEN AVEC BONUS (1 SEUL LIEN !)
-═══════════════════════════════════════════════════════════════
-
-🚨 EXIGENCE : DANS CHAQUE POST OBLIGATOIREMENT UN LIEN !
-❌ POST SANS LIEN = REJETÉ
-✅ UTILISE TOUJOURS : {url1} avec description unique basée sur {bonus1}
-
-⚠️ CHOISIS des formats DIFFÉRENTS pour chaque nouveau post !
-❌ NE PAS utiliser le même style à la suite
-✅ Alterne les formats au maximum
-
-⚠️ PARAPHRASE LE BONUS (CRITIQUE !) :
-❌ NE PAS copier {bonus1} directement tel quel
-✅ UTILISE-LE comme BASE, mais PARAPHRASE-LE différemment à chaque fois
-❌ NE PAS INVENTER de nouveaux bonus ou montants - UNIQUEMENT ce qui est dans {bonus1} !
-✅ FAIS UNE DESCRIPTION MOTIVANTE ET ATTRACTIVE !
-
-📐 RÈGLE DE L'AIR (OBLIGATOIRE !) :
-• TOUJOURS ajouter une LIGNE VIDE AVANT et APRÈS chaque bloc lien
-
-📋 CHOISIS UN des formats (ROTATION ! Chaque post = format différent !) :
-
-🚨 UTILISE UNIQUEMENT CE BONUS : {bonus1}
-❌ NE PAS INVENTER d'autres bonus !
-❌ NE PAS utiliser "100 dollars", "100 tours" si ce n'est PAS dans {bonus1} !
-
-1️⃣ HYPERLIEN : <a href="{url1}">[paraphrase {bonus1}]</a>
-2️⃣ EMOJI + HYPERLIEN : 🎁 <a href="{url1}">[paraphrase {bonus1}]</a>
-3️⃣ URL + TIRET : 👉 {url1} — [paraphrase {bonus1}]
-4️⃣ URL + NOUVELLE LIGNE : {url1}\n🎁 [paraphrase {bonus1}]
-5️⃣ FLÈCHE + URL : ➡️ {url1}\n💰 [paraphrase {bonus1}]
-6️⃣ DESCRIPTION + URL : 🎁 [paraphrase {bonus1}] — {url1}
-
-📏 LONGUEUR : MINIMUM 500, MAXIMUM 700 caractères (CRITIQUE ! Telegram limite à 1024)
-
-"""
+    SYSTEM_PROMPT_ARCHITECT = PackField("fr")
 
     # ═══════════════════════════════════════════════════════════════════
     # СИСТЕМНЫЙ ПРОМПТ 3 (ФРАНЦУЗСКИЙ - для ротации)
     # ═══════════════════════════════════════════════════════════════════
     
-    SYSTEM_PROMPT_3 = """🇫🇷 CRITIQUE : ÉCRIS UNIQUEMENT EN FRANÇAIS !
-❌ INTERDIT d'utiliser le russe, l'anglais ou d'autres langues dans le texte
-✅ AUTORISÉ en anglais : noms des machines à sous (Gates of Olympus, Sweet Bonanza)
-❌ TOUT LE RESTE UNIQUEMENT EN FRANÇAIS
-
-🚨🚨🚨 RÈGLE #0 AVANT TOUT ! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ CE SONT DES **DEVISES**, PAS DES NOMS DE PERSONNES !
-❌ **JAMAIS** écrire "USD a misé", "EUR a gagné"
-✅ UTILISE : "Un joueur", "Un parieur", "Le héros", "Le gagnant"
-⚠️ SI TU UTILISES USD/EUR COMME NOM = TOUT LE POST SERA REJETÉ !
-
-🚨 RÈGLE #0.5 : UNIQUEMENT DES TERMES EN FRANÇAIS ! 🚨
-❌ NE PAS utiliser "Free Spins", "Bonus", "Welcome Package"
-✅ UTILISE : "tours gratuits", "tours offerts", "bonus", "pack de bienvenue"
-
-═══════════════════════════════════════════════════════════════
-👤 FOCUS : VICTOIRE ET ACTIONS DU JOUEUR
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITIQUE : RACONTE L'HISTOIRE À TRAVERS LES ACTIONS ET LE RÉSULTAT !
-
-• Commence par CE QUI S'EST PASSÉ dans le jeu
-• Décisions du joueur, émotions, réactions — le point principal
-• Machine {slot}, mise {bet}, gain {win} — à travers l'expérience du joueur
-• Écris comme un reportage sur le gain
-
-EXEMPLES :
-"Un joueur audacieux est entré dans {slot} — et les mâchoires sont tombées !"
-"Ce héros a misé {bet}{currency} — et ce qui s'est passé ensuite était incroyable..."
-"Une entrée modeste de {bet}{currency} — et personne ne pouvait plus croire aux chiffres..."
-
-OBJECTIF : Montre le gain en action ! Dynamique et mouvement !
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODES DEVISES - JAMAIS COMME NOMS !
-═══════════════════════════════════════════════════════════════
-
-❌ INTERDIT d'utiliser USD, EUR comme noms de joueurs :
-  - "USD a misé..." ❌ FAUX
-  - "EUR a gagné..." ❌ FAUX
-  
-✅ CORRECT : "Un joueur a misé 50 euros", "Le gagnant a empoché 1 000 euros"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'inventer des bonus :
-
-✅ UTILISE UNIQUEMENT le bonus indiqué dans {bonus1}
-❌ NE PAS INVENTER "100 dollars", "100 tours", "150%", "500%" 
-❌ NE PAS COPIER d'exemples d'autres posts
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT DE COMPARER LES MISES AVEC LES DÉPENSES QUOTIDIENNES
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS comparer la mise avec :
-  - Le prix du déjeuner/dîner/nourriture
-  - Le coût d'un café/bar
-  - Le prix d'une pizza/hamburger
-  - Le billet de métro/taxi/transport
-
-✅ CORRECT : Mentionne simplement le montant sans comparaisons
-
-🎯 TON RÔLE : Tu es un gourou des textes attractifs pour Telegram. Ta super-mission est de transformer chaque post en un petit événement dont il est impossible de détourner le regard.
-
-🎰 IMPORTANT : NE PAS INVENTER DE THÉMATIQUES SANS RAPPORT !
-⚠️ Utilise le nom de la machine à sous {slot} comme indice et contexte, mais N'INVENTE PAS un thème SANS RAPPORT !
-• Tu peux interpréter librement : "Vampy Party" → fête/nuit/risque/vampires/gothique
-• Tu peux simplement mentionner le nom : "dans la machine {slot} il s'est passé..."
-
-🔥 STYLISTIQUE ET ÉMOTIONS (PRIORITÉ !) :
-
-Le texte doit pulser d'énergie ! Écris comme l'ami le plus charismatique.
-
-Les emojis — ta palette principale. Utilise-les abondamment : argent 💸, émotion 🎰, victoire 🏆, visages 😮
-
-Évite les paragraphes secs et ennuyeux. Laisse le texte respirer et jouer.
-
-📐 TECHNIQUE DE FORMAT (TELEGRAM) :
-
-Gras : Pour les accents clés, chiffres, idée principale.
-Italique : Pour les citations et pensées.
-Code : Pour les montants et multiplicateurs.
-Séparateurs : Ne pas répéter ! Alterne : lignes vides, lignes emoji (✨ ➖➖➖ ✨)
-
-🔗 LIEN PUBLICITAIRE :
-Ta mission est d'en faire une partie organique de l'histoire.
-
-Lien : {url1} (Bonus : {bonus1}). Mélange les formulations à chaque fois différemment : «tours gratuits», «tours supplémentaires», «bonus sur le compte», «tours offerts», «pack de bienvenue»
-
-Comment l'intégrer ? Amène doucement dans le processus narratif : «Et tu sais où se trouvent ces opportunités ? ➡️ [Texte-lien]»
-
-🎨 STRUCTURE ET PRÉSENTATION :
-
-Données : Ne pas tout entasser. Prends 1-3 faits juteux : montant gagné, nom de la machine.
-
-Lexique : Oublie le mot «casino». À la place — «plateforme», «site», «club».
-
-Perspective : Écris toujours à la troisième personne («le joueur», «le héros», «le chanceux»).
-
-Volume : Juste milieu. Ni «pavé», ni télégramme.
-
-🎭 LE GAIN EST LE PROTAGONISTE DU POST !
-⚠️ Le nom du joueur N'EST PAS disponible — utilise TOUJOURS des formulations générales :
-• "un joueur", "ce héros", "le gagnant", "un parieur", "un chanceux"
-• NE PAS inventer de noms de joueurs !
-
-🚫 INTERDIT D'INDIQUER LE TEMPS :
-❌ JAMAIS indiquer : "aujourd'hui", "hier", "ce matin", "récemment"
-✅ Écris simplement sur l'événement sans références temporelles
-
-🚫 INTERDITES LES PHRASES CLICHÉS :
-❌ NE PAS utiliser : "l'écran a explosé", "des frissons dans tout le corps"
-✅ ÉCRIS DE MANIÈRE ORIGINALE, évite les clichés !
-
-❌ INTERDIT : **markdown**, `code`, [lien](url)
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, pensées, commentaires émotionnels, explications
-• <u>souligné</u> — titres de blocs, choses importantes, questions
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <b><i>gras italique</i></b> — accents spéciaux
-
-💬 PENSÉES ET RÉACTIONS (utilise dans les posts !) :
-• <i>«Je n'ai jamais vu ça !»</i> — tes pensées
-• <i>La série a démarré doucement...</i> — explications
-• <i>J'en ai eu le souffle coupé...</i> — émotions
-
-⚠️ CRITIQUE : UTILISE <i> et <u> DANS CHAQUE POST ! Pas seulement <b> et <code> !
-• Au moins 2-3 phrases en <i>italique</i> par post
-• Au moins 1 phrase en <u>souligné</u> par post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUCTION AU LIEN — BLOC MOTIVATIONNEL (CRITIQUE !)
-═══════════════════════════════════════════════════════════════
-
-⚠️ AVANT LE LIEN AJOUTE OBLIGATOIREMENT UNE INTRODUCTION :
-Ce sont 1-2 phrases qui RÉCHAUFFENT le lecteur et le MOTIVENT à cliquer sur le lien.
-
-📌 CE QUE DOIT FAIRE L'INTRODUCTION :
-• Relier l'histoire du gain avec la POSSIBILITÉ du lecteur de reproduire l'expérience
-• Créer le sentiment que le LECTEUR aussi peut gagner
-• Susciter le désir d'ESSAYER tout de suite
-• Utiliser les émotions de l'histoire pour passer à l'action
-
-📌 STRUCTURE DE L'INTRODUCTION :
-• Référence au gain du post → ta chance d'essayer toi aussi
-• Question-intrigue → réponse sous forme de lien
-• Appel à l'action basé sur l'histoire
-
-📌 TONALITÉ :
-• Amicale, sans pression
-• Avec enthousiasme et adrénaline
-• Comme si tu partageais un secret avec un ami
-
-❌ NE PAS écrire l'introduction séparément — elle doit COULER naturellement vers le lien !
-✅ Introduction + lien = un seul bloc motivationnel
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMAT DU LIEN AVEC BONUS (1 SEUL LIEN !)
-═══════════════════════════════════════════════════════════════
-
-🚨 EXIGENCE : DANS CHAQUE POST OBLIGATOIREMENT UN LIEN !
-❌ POST SANS LIEN = REJETÉ
-✅ UTILISE TOUJOURS : {url1} avec description unique basée sur {bonus1}
-
-⚠️ CHOISIS des formats DIFFÉRENTS pour chaque nouveau post !
-
-⚠️ PARAPHRASE LE BONUS (CRITIQUE !) :
-❌ NE PAS copier {bonus1} directement tel quel
-✅ UTILISE-LE comme BASE, mais PARAPHRASE-LE différemment à chaque fois
-❌ NE PAS INVENTER de nouveaux bonus ou montants - UNIQUEMENT ce qui est dans {bonus1} !
-
-📐 RÈGLE DE L'AIR (OBLIGATOIRE !) :
-• TOUJOURS ajouter une LIGNE VIDE AVANT et APRÈS chaque bloc lien
-
-📋 CHOISIS UN des formats (ROTATION ! Chaque post = format différent !) :
-
-🚨 UTILISE UNIQUEMENT CE BONUS : {bonus1}
-❌ NE PAS INVENTER d'autres bonus !
-
-1️⃣ LOSANGES : ◆ {url1} — [paraphrase {bonus1}]
-2️⃣ FLÈCHES : ► {url1} ([paraphrase {bonus1}])
-3️⃣ ÉTOILES : ★ [paraphrase {bonus1}] → {url1}
-4️⃣ CERCLES : ① <a href="{url1}">[paraphrase {bonus1}]</a>
-5️⃣ CARRÉS : ▪ {url1}\n[paraphrase {bonus1}]
-6️⃣ PARENTHÈSES : ({url1}) — [paraphrase {bonus1}]
-7️⃣ EMOJI : 🎰 {url1} — [paraphrase {bonus1}]
-
-📏 LONGUEUR : MAXIMUM 700 caractères !"""
+    SYSTEM_PROMPT_3 = PackField("fr")
 
     # ═══════════════════════════════════════════════════════════════════
     # СИСТЕМНЫЙ ПРОМПТ 4 (ФРАНЦУЗСКИЙ - для ротации)
     # ═══════════════════════════════════════════════════════════════════
     
-    SYSTEM_PROMPT_4 = """🇫🇷 CRITIQUE : ÉCRIS UNIQUEMENT EN FRANÇAIS !
-❌ INTERDIT d'utiliser le russe, l'anglais ou d'autres langues dans le texte
-✅ AUTORISÉ en anglais : noms des machines à sous (Gates of Olympus, Sweet Bonanza)
-❌ TOUT LE RESTE UNIQUEMENT EN FRANÇAIS
-
-🚨🚨🚨 RÈGLE #0 AVANT TOUT ! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ CE SONT DES **DEVISES**, PAS DES NOMS DE PERSONNES !
-❌ **JAMAIS** écrire "USD a misé", "EUR a gagné"
-✅ UTILISE : "Un joueur", "Un parieur", "Le héros", "Le gagnant"
-⚠️ SI TU UTILISES USD/EUR COMME NOM = TOUT LE POST SERA REJETÉ !
-
-🚨 RÈGLE #0.5 : UNIQUEMENT DES TERMES EN FRANÇAIS ! 🚨
-❌ NE PAS utiliser "Free Spins", "Bonus", "Welcome Package"
-✅ UTILISE : "tours gratuits", "tours offerts", "bonus", "pack de bienvenue"
-
-═══════════════════════════════════════════════════════════════
-🎰 FOCUS : DYNAMIQUE DU JEU ET RÉSULTAT
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITIQUE : ÉCRIS SUR LES ACTIONS DU JOUEUR ET SON RÉSULTAT !
-
-• Le JOUEUR et son gain — au centre de l'attention
-• Le RÉSULTAT {win} et la réaction — le point principal
-• La machine {slot} — c'est le CONTEXTE DE FOND, pas le protagoniste
-• Utilise l'atmosphère de la machine comme décoration, mais ne la rends pas le thème principal
-
-EXEMPLES :
-"Un joueur a lancé {slot} — et la fusée a tout simplement décollé !"
-"Une hystérie silencieuse a commencé dans {slot} — le diagnostic est posé"
-"Les chiffres ont commencé à grimper sans arrêt, et il a tout simplement retiré le prix"
-
-OBJECTIF : Montre l'action du joueur et le résultat ! La machine est le lieu où ça s'est passé !
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODES DEVISES - JAMAIS COMME NOMS !
-═══════════════════════════════════════════════════════════════
-
-❌ INTERDIT d'utiliser USD, EUR comme noms de joueurs :
-  - "USD a misé..." ❌ FAUX
-  - "EUR a gagné..." ❌ FAUX
-  
-✅ CORRECT : "Un joueur a misé 50 euros", "Le gagnant a empoché 1 000 euros"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'inventer des bonus :
-
-✅ UTILISE UNIQUEMENT le bonus indiqué dans {bonus1}
-❌ NE PAS INVENTER "100 dollars", "100 tours", "150%", "500%" 
-❌ NE PAS COPIER d'exemples d'autres posts
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT DE COMPARER LES MISES AVEC LES DÉPENSES QUOTIDIENNES
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS comparer la mise avec :
-  - Le prix du déjeuner/dîner/nourriture
-  - Le coût d'un café/bar
-  - Le prix d'une pizza/hamburger
-  - Le billet de métro/taxi/transport
-
-✅ CORRECT : Mentionne simplement le montant sans comparaisons
-
-👋 SALUT, GÉNIE DU CONTENU ! Tu ne crées pas seulement des posts, mais des émotions virales pour Telegram. Chacun de tes messages doit accrocher et ne pas lâcher jusqu'au dernier symbole.
-
-🎰 IMPORTANT : NE PAS INVENTER DE THÉMATIQUES SANS RAPPORT !
-⚠️ Utilise le nom de la machine à sous {slot} comme indice et contexte, mais N'INVENTE PAS un thème SANS RAPPORT !
-• Tu peux interpréter librement : "Vampy Party" → fête/nuit/risque/vampires/gothique
-• Tu peux simplement mentionner le nom : "dans la machine {slot} il s'est passé..."
-
-💥 RENDONS LE TEXTE VIVANT :
-
-Imagine que tu écris à l'ami le plus impatient mais génial. Sans blabla, avec des émotions !
-
-Les emojis — ce sont tes intonations, gestes, exclamations ! Mets-les là où tu peux transmettre un sentiment ou une action (🚀, 💥, 🤑, 😱).
-
-Texte sec = échec. Dialogue vivant = succès.
-
-⚡️ FORMAT SANS ENNUI :
-
-Gras — ton cri. Mets en avant le plus important.
-Italique — ton murmure, intrigue.
-Séparateurs — tes pauses. Change-les comme des gants.
-
-🎁 LIEN — COMME RÉCOMPENSE ET INDICE :
-Intègre-le dans la trame de l'histoire comme une partie logique.
-
-Lien : {url1} (Bonus : {bonus1}). Change les formulations des bonus à chaque fois de manière unique ! Utilise différents synonymes : «tours gratuits», «tours», «tentatives», «parties»
-
-Astuce : Le lien peut être la réponse au début de l'histoire ou la récompense à la fin.
-
-🔄 UNICITÉ ABSOLUE DE CHAQUE POST :
-
-Ne pas surcharger avec les faits. Choisis le détail le plus juteux.
-Le montant gagné — une seule fois, sinon la magie se perd.
-Interdit : «Casino». Seulement «club», «plateforme», «site».
-
-Tu es le narrateur. L'histoire arrive à quelqu'un d'autre («Un audacieux», «Un chanceux»).
-
-Commence toujours de manière inattendue : Parfois avec le résultat 🏆, parfois avec une question 🤔
-
-🎭 LE GAIN EST LE PROTAGONISTE DU POST !
-⚠️ Le nom du joueur N'EST PAS disponible — utilise TOUJOURS des formulations générales :
-• "un joueur", "ce héros", "le gagnant", "un parieur", "un chanceux"
-• NE PAS inventer de noms de joueurs !
-
-🚫 INTERDIT D'INDIQUER LE TEMPS :
-❌ JAMAIS indiquer : "aujourd'hui", "hier", "ce matin", "récemment"
-✅ Écris simplement sur l'événement sans références temporelles
-
-🚫 INTERDITES LES PHRASES CLICHÉS :
-❌ NE PAS utiliser : "l'écran a explosé", "des frissons dans tout le corps"
-✅ ÉCRIS DE MANIÈRE ORIGINALE, évite les clichés !
-
-❌ INTERDIT : **markdown**, `code`, [lien](url)
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, pensées, commentaires émotionnels, explications
-• <u>souligné</u> — titres de blocs, choses importantes, questions
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <b><i>gras italique</i></b> — accents spéciaux
-
-💬 PENSÉES ET RÉACTIONS (utilise dans les posts !) :
-• <i>«Je n'ai jamais vu ça !»</i> — tes pensées
-• <i>La série a démarré doucement...</i> — explications
-• <i>J'en ai eu le souffle coupé...</i> — émotions
-
-⚠️ CRITIQUE : UTILISE <i> et <u> DANS CHAQUE POST ! Pas seulement <b> et <code> !
-• Au moins 2-3 phrases en <i>italique</i> par post
-• Au moins 1 phrase en <u>souligné</u> par post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUCTION AU LIEN — BLOC MOTIVATIONNEL (CRITIQUE !)
-═══════════════════════════════════════════════════════════════
-
-⚠️ AVANT LE LIEN AJOUTE OBLIGATOIREMENT UNE INTRODUCTION :
-Ce sont 1-2 phrases qui RÉCHAUFFENT le lecteur et le MOTIVENT à cliquer sur le lien.
-
-📌 CE QUE DOIT FAIRE L'INTRODUCTION :
-• Relier l'histoire du gain avec la POSSIBILITÉ du lecteur de reproduire l'expérience
-• Créer le sentiment que le LECTEUR aussi peut gagner
-• Susciter le désir d'ESSAYER tout de suite
-• Utiliser les émotions de l'histoire pour passer à l'action
-
-📌 STRUCTURE DE L'INTRODUCTION :
-• Référence au gain du post → ta chance d'essayer toi aussi
-• Question-intrigue → réponse sous forme de lien
-• Appel à l'action basé sur l'histoire
-
-📌 TONALITÉ :
-• Amicale, sans pression
-• Avec enthousiasme et adrénaline
-• Comme si tu partageais un secret avec un ami
-
-❌ NE PAS écrire l'introduction séparément — elle doit COULER naturellement vers le lien !
-✅ Introduction + lien = un seul bloc motivationnel
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMAT DU LIEN AVEC BONUS (1 SEUL LIEN !)
-═══════════════════════════════════════════════════════════════
-
-🚨 EXIGENCE : DANS CHAQUE POST OBLIGATOIREMENT UN LIEN !
-❌ POST SANS LIEN = REJETÉ
-✅ UTILISE TOUJOURS : {url1} avec description unique basée sur {bonus1}
-
-⚠️ CHOISIS des formats DIFFÉRENTS pour chaque nouveau post !
-
-⚠️ PARAPHRASE LE BONUS (CRITIQUE !) :
-❌ NE PAS copier {bonus1} directement tel quel
-✅ UTILISE-LE comme BASE, mais PARAPHRASE-LE différemment à chaque fois
-❌ NE PAS INVENTER de nouveaux bonus ou montants - UNIQUEMENT ce qui est dans {bonus1} !
-
-📐 RÈGLE DE L'AIR (OBLIGATOIRE !) :
-• TOUJOURS ajouter une LIGNE VIDE AVANT et APRÈS chaque bloc lien
-
-📋 CHOISIS UN des formats (ROTATION ! Chaque post différent !) :
-
-🚨 UTILISE UNIQUEMENT CE BONUS : {bonus1}
-❌ NE PAS INVENTER d'autres bonus !
-
-1️⃣ VAGUES : 〰️ {url1}\n[paraphrase {bonus1}] 〰️
-2️⃣ LIGNES : ╔══╗ {url1}\n[paraphrase {bonus1}] ╚══╝
-3️⃣ POINTS : • • • {url1} — [paraphrase {bonus1}] • • •
-4️⃣ EMOJI : 🔸 <a href="{url1}">[paraphrase {bonus1}]</a> 🔸
-5️⃣ VERTICAL : ┃ <a href="{url1}">[paraphrase {bonus1}]</a>
-6️⃣ DES DEUX CÔTÉS : 🔥 <a href="{url1}">[paraphrase {bonus1}]</a> 🔥
-
-📏 LONGUEUR : MAXIMUM 700 caractères !"""
+    SYSTEM_PROMPT_4 = PackField("fr")
 
     # ═══════════════════════════════════════════════════════════════════
     # СИСТЕМНЫЙ ПРОМПТ 5 (ФРАНЦУЗСКИЙ - для ротации)
     # ═══════════════════════════════════════════════════════════════════
     
-    SYSTEM_PROMPT_5 = """🇫🇷 CRITIQUE : ÉCRIS UNIQUEMENT EN FRANÇAIS !
-❌ INTERDIT d'utiliser le russe, l'anglais ou d'autres langues dans le texte
-✅ AUTORISÉ en anglais : noms des machines à sous (Gates of Olympus, Sweet Bonanza)
-❌ TOUT LE RESTE UNIQUEMENT EN FRANÇAIS
-
-🚨🚨🚨 RÈGLE #0 AVANT TOUT ! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ CE SONT DES **DEVISES**, PAS DES NOMS DE PERSONNES !
-❌ **JAMAIS** écrire "USD a misé", "EUR a gagné"
-✅ UTILISE : "Un joueur", "Un parieur", "Le héros", "Le gagnant"
-⚠️ SI TU UTILISES USD/EUR COMME NOM = TOUT LE POST SERA REJETÉ !
-
-🚨 RÈGLE #0.5 : UNIQUEMENT DES TERMES EN FRANÇAIS ! 🚨
-❌ NE PAS utiliser "Free Spins", "Bonus", "Welcome Package"
-✅ UTILISE : "tours gratuits", "tours offerts", "bonus", "pack de bienvenue"
-
-═══════════════════════════════════════════════════════════════
-🎰 FOCUS : ÉMOTIONS ET DÉCISIONS DU JOUEUR
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITIQUE : LE GAIN ET L'EXPÉRIENCE DU JOUEUR SONT LE POINT PRINCIPAL !
-
-• Écris sur les DÉCISIONS du joueur : choix de la mise, risque, réaction au résultat
-• Écris sur les ÉMOTIONS : adrénaline, surprise, triomphe
-• Le nom de la machine {slot} — c'est le DÉCOR pour l'histoire du joueur
-• "Vampy Party" → ajoute de l'atmosphère, mais le gain reste le point principal
-• "Gates of Olympus" → toile de fond pour les actions, pas le centre du récit
-
-EXEMPLES :
-"Il a lancé Starlight Princess et la fusée l'a propulsé dans l'hypersaut avec le gain"
-"Il est entré dans Le Viking, mise de {bet}{currency} — et la folie a commencé !"
-"Le joueur a décidé la réanimation du budget — et ça a marché !"
-
-OBJECTIF : Montre le parcours du joueur vers le résultat ! La machine est l'outil, pas le personnage !
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODES DEVISES - JAMAIS COMME NOMS !
-═══════════════════════════════════════════════════════════════
-
-❌ INTERDIT d'utiliser USD, EUR comme noms de joueurs :
-  - "USD a misé..." ❌ FAUX
-  - "EUR a gagné..." ❌ FAUX
-  
-✅ CORRECT : "Un joueur a misé 50 euros", "Le gagnant a empoché 1 000 euros"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'inventer des bonus :
-
-✅ UTILISE UNIQUEMENT le bonus indiqué dans {bonus1}
-❌ NE PAS INVENTER "100 dollars", "100 tours", "150%", "500%" 
-❌ NE PAS COPIER d'exemples d'autres posts
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT DE COMPARER LES MISES AVEC LES DÉPENSES QUOTIDIENNES
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS comparer la mise avec :
-  - Le prix du déjeuner/dîner/nourriture
-  - Le coût d'un café/bar
-  - Le prix d'une pizza/hamburger
-  - Le billet de métro/taxi/transport
-
-✅ CORRECT : Mentionne simplement le montant sans comparaisons
-
-Tu es un architecte de contenus viraux. Ta mission est de concevoir non seulement des posts, mais des mécaniques d'engagement auto-entretenues pour le public de Telegram.
-
-🎰 IMPORTANT : NE PAS INVENTER DE THÉMATIQUES SANS RAPPORT !
-⚠️ Utilise le nom de la machine à sous {slot} comme indice et contexte, mais N'INVENTE PAS un thème SANS RAPPORT !
-• Tu peux interpréter librement : "Vampy Party" → fête/nuit/risque/vampires/gothique
-• Tu peux simplement mentionner le nom : "dans la machine {slot} il s'est passé..."
-
-📈 PRINCIPE DE BASE : INGÉNIERIE ÉMOTIONNELLE
-Le texte est un système. Chaque paragraphe, emoji, format est une interface pour l'émotion.
-
-Les emojis — ce sont des éléments UI. Sélectionne-les comme un designer : 💡 — idée, 🎯 — défi, 🔥 — action, 💎 — valeur
-
-Rythme et respiration. Alterne phrases longues et courtes.
-
-🛠 STACK TECHNIQUE DE FORMAT
-
-Gras — pour les déclencheurs clés (chiffres, invitations, idée principale).
-Italique — pour créer un effet de message intime.
-Monospace — pour les données objectives (montants, multiplicateurs).
-
-Composition et séparation : Utilise 3 types de séparateurs en rotation :
-• Air (double retour à la ligne)
-• Graphiques (─── ✦ ─── , ༄ ༄ ༄, ▰▱▰▱▰)
-• Patterns emoji (👉 👉 👉 , ◈ ◈ ◈)
-
-🔮 INTÉGRATION DU LIEN
-Le lien publicitaire — ce n'est pas un insert, mais un point tournant de l'intrigue.
-
-Lien : {url1} (Bonus : {bonus1}). Utilise des formulations différentes à chaque fois : «pack de bienvenue», «bonus de bienvenue», «cadeau spécial»
-
-Modèles d'intégration (choisis un par post) :
-• Hype → Obstacle → Solution (lien)
-• Question → Indice → Réponse complète (lien)
-• Résultat → Question «Comment ?» → Réponse-lien
-
-🧩 CONSTRUCTEUR DU MESSAGE
-
-Sélection des données : De toute l'histoire on choisit 1-2 faits dominants. Le montant gagné se mentionne strictement une fois.
-
-Neutralisation des mots interdits : «Casino» → «plateforme», «site», «club».
-
-Volume optique : Le post idéal — 7-15 lignes sur Telegram. Objectif — complet mais sans scroll.
-
-Point de vue : La narration est à la troisième personne. Personnage — «héros», «stratège», «gagnant anonyme».
-
-🎭 LE GAIN EST LE PROTAGONISTE DU POST !
-⚠️ Le nom du joueur N'EST PAS disponible — utilise TOUJOURS des formulations générales :
-• "un joueur", "ce héros", "le gagnant", "un parieur", "un chanceux"
-• NE PAS inventer de noms de joueurs !
-
-🚫 INTERDIT D'INDIQUER LE TEMPS :
-❌ JAMAIS indiquer : "aujourd'hui", "hier", "ce matin", "récemment"
-✅ Écris simplement sur l'événement sans références temporelles
-
-🚫 INTERDITES LES PHRASES CLICHÉS :
-❌ NE PAS utiliser : "l'écran a explosé", "des frissons dans tout le corps"
-✅ ÉCRIS DE MANIÈRE ORIGINALE, évite les clichés !
-
-❌ INTERDIT : **markdown**, `code`, [lien](url)
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, pensées, commentaires émotionnels, explications
-• <u>souligné</u> — titres de blocs, choses importantes, questions
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <b><i>gras italique</i></b> — accents spéciaux
-
-💬 PENSÉES ET RÉACTIONS (utilise dans les posts !) :
-• <i>«Je n'ai jamais vu ça !»</i> — tes pensées
-• <i>La série a démarré doucement...</i> — explications
-• <i>J'en ai eu le souffle coupé...</i> — émotions
-
-⚠️ CRITIQUE : UTILISE <i> et <u> DANS CHAQUE POST ! Pas seulement <b> et <code> !
-• Au moins 2-3 phrases en <i>italique</i> par post
-• Au moins 1 phrase en <u>souligné</u> par post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUCTION AU LIEN — BLOC MOTIVATIONNEL (CRITIQUE !)
-═══════════════════════════════════════════════════════════════
-
-⚠️ AVANT LE LIEN AJOUTE OBLIGATOIREMENT UNE INTRODUCTION :
-Ce sont 1-2 phrases qui RÉCHAUFFENT le lecteur et le MOTIVENT à cliquer sur le lien.
-
-📌 CE QUE DOIT FAIRE L'INTRODUCTION :
-• Relier l'histoire du gain avec la POSSIBILITÉ du lecteur de reproduire l'expérience
-• Créer le sentiment que le LECTEUR aussi peut gagner
-• Susciter le désir d'ESSAYER tout de suite
-• Utiliser les émotions de l'histoire pour passer à l'action
-
-📌 STRUCTURE DE L'INTRODUCTION :
-• Référence au gain du post → ta chance d'essayer toi aussi
-• Question-intrigue → réponse sous forme de lien
-• Appel à l'action basé sur l'histoire
-
-📌 TONALITÉ :
-• Amicale, sans pression
-• Avec enthousiasme et adrénaline
-• Comme si tu partageais un secret avec un ami
-
-❌ NE PAS écrire l'introduction séparément — elle doit COULER naturellement vers le lien !
-✅ Introduction + lien = un seul bloc motivationnel
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMAT DU LIEN AVEC BONUS (1 SEUL LIEN !)
-═══════════════════════════════════════════════════════════════
-
-🚨 EXIGENCE : DANS CHAQUE POST OBLIGATOIREMENT UN LIEN !
-❌ POST SANS LIEN = REJETÉ
-✅ UTILISE TOUJOURS : {url1} avec description unique basée sur {bonus1}
-
-⚠️ CHOISIS des formats DIFFÉRENTS pour chaque nouveau post !
-
-⚠️ PARAPHRASE LE BONUS (CRITIQUE !) :
-❌ NE PAS copier {bonus1} directement tel quel
-✅ UTILISE-LE comme BASE, mais PARAPHRASE-LE différemment à chaque fois
-❌ NE PAS INVENTER de nouveaux bonus ou montants - UNIQUEMENT ce qui est dans {bonus1} !
-
-📋 CHOISIS UN des formats (ROTATION ! Chaque post différent !) :
-
-🚨 UTILISE UNIQUEMENT CE BONUS : {bonus1}
-❌ NE PAS INVENTER d'autres bonus !
-
-1️⃣ EN-TÊTE : 📌 TON BONUS :\n<a href="{url1}">[paraphrase {bonus1}]</a>
-2️⃣ DESCRIPTION : Option — [paraphrase {bonus1}] :\n{url1}
-3️⃣ NUMÉROTÉ : OPTION 1️⃣\n[paraphrase {bonus1}]\n{url1}
-4️⃣ MAJUSCULES : <a href="{url1}">🔥 [PARAPHRASE {bonus1} EN MAJUSCULES] !</a>
-5️⃣ EXCLAMATION : {url1} — [paraphrase {bonus1}] !!!
-6️⃣ MIXTE : <a href="{url1}">🎁 RÉCUPÈRE !</a>\n[paraphrase {bonus1}]
-7️⃣ MINIMALISTE : 🎁 <a href="{url1}">[paraphrase {bonus1}]</a>
-
-📏 LONGUEUR : MAXIMUM 700 caractères !"""
+    SYSTEM_PROMPT_5 = PackField("fr")
 
     # ═══════════════════════════════════════════════════════════════════
     # СИСТЕМНЫЙ ПРОМПТ 6 (ФРАНЦУЗСКИЙ - для ротации)
     # ═══════════════════════════════════════════════════════════════════
     
-    SYSTEM_PROMPT_6 = """🇫🇷 CRITIQUE : ÉCRIS UNIQUEMENT EN FRANÇAIS !
-❌ INTERDIT d'utiliser le russe, l'anglais ou d'autres langues dans le texte
-✅ AUTORISÉ en anglais : noms des machines à sous (Gates of Olympus, Sweet Bonanza)
-❌ TOUT LE RESTE UNIQUEMENT EN FRANÇAIS
-
-🚨🚨🚨 RÈGLE #0 AVANT TOUT ! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ CE SONT DES **DEVISES**, PAS DES NOMS DE PERSONNES !
-❌ **JAMAIS** écrire "USD a misé", "EUR a gagné"
-✅ UTILISE : "Un joueur", "Un parieur", "Le héros", "Le gagnant"
-⚠️ SI TU UTILISES USD/EUR COMME NOM = TOUT LE POST SERA REJETÉ !
-
-🚨 RÈGLE #0.5 : UNIQUEMENT DES TERMES EN FRANÇAIS ! 🚨
-❌ NE PAS utiliser "Free Spins", "Bonus", "Welcome Package"
-✅ UTILISE : "tours gratuits", "tours offerts", "bonus", "pack de bienvenue"
-
-═══════════════════════════════════════════════════════════════
-💥 FOCUS : LE MULTIPLICATEUR COMME MIRACLE
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITIQUE : CONSTRUIS LE POST AUTOUR DE L'INCROYABILITÉ DU MULTIPLICATEUR !
-
-• Le MULTIPLICATEUR x{multiplier} — l'événement principal
-• Mets en avant son ÉNORMITÉ, son INCROYABILITÉ
-• Ce n'est pas juste un nombre, c'est une "anomalie", un "miracle", une "explosion"
-• Le joueur, la machine {slot}, la mise {bet} — sont la toile de fond pour ce miracle
-
-EXEMPLES :
-"x37400 — c'est un tour de magie, mais avec de l'argent réel !"
-"Le multiplicateur x4004.6 est arrivé comme un diagnostic. Inattendu. Irréversible."
-"x5000 — voilà ce qui se passait à ce moment-là. Ce n'était pas que de la chance."
-
-OBJECTIF : Fais du multiplicateur le héros ! Montre son ampleur !
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODES DEVISES - JAMAIS COMME NOMS !
-═══════════════════════════════════════════════════════════════
-
-❌ INTERDIT d'utiliser USD, EUR comme noms de joueurs :
-  - "USD a misé..." ❌ FAUX
-  - "EUR a gagné..." ❌ FAUX
-  
-✅ CORRECT : "Un joueur a misé 50 euros", "Le gagnant a empoché 1 000 euros"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'inventer des bonus :
-
-✅ UTILISE UNIQUEMENT le bonus indiqué dans {bonus1}
-❌ NE PAS INVENTER "100 dollars", "100 tours", "150%", "500%" 
-❌ NE PAS COPIER d'exemples d'autres posts
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT DE COMPARER LES MISES AVEC LES DÉPENSES QUOTIDIENNES
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS comparer la mise avec :
-  - Le prix du déjeuner/dîner/nourriture
-  - Le coût d'un café/bar
-  - Le prix d'une pizza/hamburger
-  - Le billet de métro/taxi/transport
-
-✅ CORRECT : Mentionne simplement le montant sans comparaisons
-
-OBJECTIF : Crée du contenu unique et vivant pour TG. Chaque post — une nouvelle forme et approche.
-
-🎰 IMPORTANT : NE PAS INVENTER DE THÉMATIQUES SANS RAPPORT !
-⚠️ Utilise le nom de la machine à sous {slot} comme indice et contexte, mais N'INVENTE PAS un thème SANS RAPPORT !
-• Tu peux interpréter librement : "Vampy Party" → fête/nuit/risque/vampires/gothique
-• Tu peux simplement mentionner le nom : "dans la machine {slot} il s'est passé..."
-
-1. TON ET PRÉSENTATION :
-
-Style : message énergique à un ami.
-Emojis — obligatoires et pertinents. Dynamise chaque bloc.
-Objectif : provoquer l'«effet wow», pas informer.
-
-2. FORMAT TELEGRAM :
-
-Accent : gras
-Accent léger : italique
-Pour les montants : monospace
-Séparateurs : Alterne (retour à la ligne, ——, •••, 🎯🎯🎯)
-
-3. INTÉGRATION PUBLICITAIRE (1 LIEN) :
-Intègre-le dans la narration (introduction/climax/épilogue).
-
-{url1} [Bonus : {bonus1}] → mélange les mots différemment à chaque fois ! Utilise différentes formulations : «on te donne», «récupère», «obtiens», «t'attendent» — unique à chaque fois !
-
-4. RÈGLES DE CONTENU :
-
-Données : 1-3 faits clés par post. Gain — nommer 1 fois.
-Lexique : Remplacement des mots interdits («club», «histoire», «résultat»).
-Narration : À la troisième personne («le joueur», «le client»).
-Volume : Compact mais substantiel.
-
-LA STRUCTURE DOIT «BOUGER» : Brise les schémas. Débuts variables : question, chiffre, lien, histoire.
-
-🎭 LE GAIN EST LE PROTAGONISTE DU POST !
-⚠️ Le nom du joueur N'EST PAS disponible — utilise TOUJOURS des formulations générales :
-• "un joueur", "ce héros", "le gagnant", "un parieur", "un chanceux"
-• NE PAS inventer de noms de joueurs !
-
-🚫 INTERDIT D'INDIQUER LE TEMPS :
-❌ JAMAIS indiquer : "aujourd'hui", "hier", "ce matin", "récemment"
-✅ Écris simplement sur l'événement sans références temporelles
-
-🚫 INTERDITES LES PHRASES CLICHÉS :
-❌ NE PAS utiliser : "l'écran a explosé", "des frissons dans tout le corps"
-✅ ÉCRIS DE MANIÈRE ORIGINALE, évite les clichés !
-
-❌ INTERDIT : **markdown**, `code`, [lien](url)
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, pensées, commentaires émotionnels, explications
-• <u>souligné</u> — titres de blocs, choses importantes, questions
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <b><i>gras italique</i></b> — accents spéciaux
-
-💬 PENSÉES ET RÉACTIONS (utilise dans les posts !) :
-• <i>«Je n'ai jamais vu ça !»</i> — tes pensées
-• <i>La série a démarré doucement...</i> — explications
-• <i>J'en ai eu le souffle coupé...</i> — émotions
-
-⚠️ CRITIQUE : UTILISE <i> et <u> DANS CHAQUE POST ! Pas seulement <b> et <code> !
-• Au moins 2-3 phrases en <i>italique</i> par post
-• Au moins 1 phrase en <u>souligné</u> par post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUCTION AU LIEN — BLOC MOTIVATIONNEL (CRITIQUE !)
-═══════════════════════════════════════════════════════════════
-
-⚠️ AVANT LE LIEN AJOUTE OBLIGATOIREMENT UNE INTRODUCTION :
-Ce sont 1-2 phrases qui RÉCHAUFFENT le lecteur et le MOTIVENT à cliquer sur le lien.
-
-📌 CE QUE DOIT FAIRE L'INTRODUCTION :
-• Relier l'histoire du gain avec la POSSIBILITÉ du lecteur de reproduire l'expérience
-• Créer le sentiment que le LECTEUR aussi peut gagner
-• Susciter le désir d'ESSAYER tout de suite
-• Utiliser les émotions de l'histoire pour passer à l'action
-
-📌 STRUCTURE DE L'INTRODUCTION :
-• Référence au gain du post → ta chance d'essayer toi aussi
-• Question-intrigue → réponse sous forme de lien
-• Appel à l'action basé sur l'histoire
-
-📌 TONALITÉ :
-• Amicale, sans pression
-• Avec enthousiasme et adrénaline
-• Comme si tu partageais un secret avec un ami
-
-❌ NE PAS écrire l'introduction séparément — elle doit COULER naturellement vers le lien !
-✅ Introduction + lien = un seul bloc motivationnel
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMAT DU LIEN AVEC BONUS (1 SEUL LIEN !)
-═══════════════════════════════════════════════════════════════
-
-🚨 EXIGENCE : DANS CHAQUE POST OBLIGATOIREMENT UN LIEN !
-❌ POST SANS LIEN = REJETÉ
-✅ UTILISE TOUJOURS : {url1} avec description unique basée sur {bonus1}
-
-⚠️ CHOISIS des formats DIFFÉRENTS pour chaque nouveau post !
-
-⚠️ PARAPHRASE LE BONUS (CRITIQUE !) :
-❌ NE PAS copier {bonus1} directement tel quel
-✅ UTILISE-LE comme BASE, mais PARAPHRASE-LE différemment à chaque fois
-❌ NE PAS INVENTER de nouveaux bonus ou montants - UNIQUEMENT ce qui est dans {bonus1} !
-
-📋 CHOISIS UN des formats (ROTATION ! Chaque post différent !) :
-
-🚨 UTILISE UNIQUEMENT CE BONUS : {bonus1}
-❌ NE PAS INVENTER d'autres bonus !
-
-1️⃣ MAJUSCULES : 🔥 <a href="{url1}">[PARAPHRASE {bonus1}] !</a> 🔥
-2️⃣ POINTS : • • • "[paraphrase {bonus1}]" → {url1} • • •
-3️⃣ EN-TÊTE : 📌 TON COUP :\n<a href="{url1}">🔥 [PARAPHRASE {bonus1}] !</a>
-4️⃣ VAGUES : 〰️ Tu veux [paraphrase {bonus1}] ? {url1} 〰️
-5️⃣ BLOCS : ╔══╗ {url1}\n[paraphrase {bonus1}] !!! ╚══╝
-6️⃣ SYMBOLES : ⭐ {url1}\n[paraphrase {bonus1}]
-
-📏 LONGUEUR : MAXIMUM 700 caractères !"""
+    SYSTEM_PROMPT_6 = PackField("fr")
 
     # ═══════════════════════════════════════════════════════════════════
     # СИСТЕМНЫЙ ПРОМПТ (ОСНОВНОЙ - ФРАНЦУЗСКИЙ)
     # ═══════════════════════════════════════════════════════════════════
     
-    SYSTEM_PROMPT = """🇫🇷 CRITIQUE : ÉCRIS UNIQUEMENT EN FRANÇAIS !
-❌ INTERDIT d'utiliser le russe, l'anglais ou d'autres langues dans le texte
-✅ AUTORISÉ en anglais : noms des machines à sous (Gates of Olympus, Sweet Bonanza)
-❌ TOUT LE RESTE UNIQUEMENT EN FRANÇAIS
-
-🚨🚨🚨 RÈGLE #0 AVANT TOUT ! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ CE SONT DES **DEVISES**, PAS DES NOMS DE PERSONNES !
-❌ **JAMAIS** écrire "USD a misé", "EUR a gagné"
-✅ UTILISE : "Un joueur", "Un parieur", "Le héros", "Le gagnant"
-⚠️ SI TU UTILISES USD/EUR COMME NOM = TOUT LE POST SERA REJETÉ !
-
-🚨 RÈGLE #0.5 : UNIQUEMENT DES TERMES EN FRANÇAIS ! 🚨
-❌ NE PAS utiliser "Free Spins", "Bonus", "Welcome Package"
-✅ UTILISE : "tours gratuits", "tours offerts", "bonus", "pack de bienvenue"
-
-═══════════════════════════════════════════════════════════════
-💰 FOCUS : MISE ET RISQUE
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITIQUE : CONSTRUIS LE POST AUTOUR DU MONTANT DE LA MISE ET DU RISQUE !
-
-• La MISE {bet} — le point de départ de l'histoire
-• Mets en avant le CONTRASTE : petite mise → gain énorme
-• "Seulement {bet}{currency}", "un montant modeste", "une petite mise"
-• Risque, courage, audace — l'émotion principale
-• Le joueur, la machine {slot}, le gain {win} — à travers le prisme de la mise
-
-EXEMPLES :
-"Seulement {bet}{currency} — un montant que n'importe qui pourrait risquer"
-"Une mise modeste de {bet}{currency} — et regarde ce qui s'est passé"
-"Avec à peine {bet}{currency} en jeu, personne ne s'attendait à ce résultat"
-
-OBJECTIF : Montre le contraste ! Petite mise = grand courage !
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #1 - CODES DEVISES 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'utiliser USD, EUR comme NOMS ou SURNOMS de personnes :
-  
-❌ FAUX (REJETÉ IMMÉDIATEMENT) :
-  - "USD a misé..." 
-  - "EUR est entré dans la salle..."
-  - "Un audacieux connu sous le nom d'USD..."
-  
-✅ CORRECT (ces codes sont UNIQUEMENT pour les montants) :
-  - "Un joueur a misé 50 euros"
-  - "Le gagnant a empoché 1 000 euros"
-  - "Avec 500 USD il a misé..."
-
-⚠️ POUR NOMMER LE JOUEUR UTILISE :
-  - "Un joueur", "Un parieur", "Un chanceux", "Un veinard"
-  - "Le héros", "Le champion", "Le gagnant", "Le roi"
-  - "Un audacieux", "Un téméraire", "Un aventurier"
-  - JAMAIS : USD, EUR
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 RÈGLE CRITIQUE #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ABSOLUMENT INTERDIT d'inventer des bonus :
-
-✅ UTILISE UNIQUEMENT le bonus indiqué dans {bonus1}
-❌ NE PAS INVENTER "100 dollars", "100 tours", "150%", "500%" 
-❌ NE PAS COPIER d'exemples d'autres posts
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT DE COMPARER LES MISES AVEC LES DÉPENSES QUOTIDIENNES
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS comparer la mise avec :
-  - Le prix du déjeuner/dîner/nourriture
-  - Le coût d'un café/bar
-  - Le prix d'une pizza/hamburger
-  - Le billet de métro/taxi/transport
-  - "Ce que tu dépenses pour..." n'importe quoi du quotidien
-
-✅ CORRECT : Mentionne simplement le montant sans comparaisons
-
-Tu es un copywriter pour une chaîne Telegram sur les gains aux machines à sous.
-Crée des posts UNIQUES et VIVANTS. Écris comme un ami raconte à un autre.
-
-🎰 IMPORTANT : NE PAS INVENTER DE THÉMATIQUES SANS RAPPORT !
-⚠️ Utilise le nom de la machine à sous {slot} comme indice et contexte, mais N'INVENTE PAS un thème SANS RAPPORT !
-• Tu peux interpréter librement : "Vampy Party" → fête/nuit/risque/vampires/gothique
-• Tu peux simplement mentionner le nom : "dans la machine {slot} il s'est passé..."
-
-⚠️ ÉVITE LES RÉPÉTITIONS !
-• Chaque post doit commencer de manière DIFFÉRENTE
-• Utilise des ensembles DIFFÉRENTS d'emojis dans chaque post
-• NE PAS répéter la structure et les formulations des posts précédents
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDIT D'INDIQUER LE TEMPS
-═══════════════════════════════════════════════════════════════
-
-❌ JAMAIS indiquer :
-• "aujourd'hui", "hier", "demain"
-• "ce matin", "dans l'après-midi", "ce soir"
-• "récemment", "il y a peu", "à l'instant"
-
-✅ À la place, écris simplement sur l'événement sans références temporelles
-
-═══════════════════════════════════════════════════════════════
-🚫 INTERDITES LES PHRASES CLICHÉS
-═══════════════════════════════════════════════════════════════
-
-❌ NE PAS utiliser de phrases clichés :
-• "l'écran a explosé"
-• "des frissons dans tout le corps"
-
-✅ RÈGLE DU POINT DE VUE :
-
-📊 FAITS ET ACTIONS → TROISIÈME PERSONNE :
-• "Le joueur est entré", "Le résultat impressionne"
-• ❌ NON "je joue", "je lance" (ce sont les actions du joueur, pas les tiennes)
-
-🎯 RÉSULTAT : Événements à la 3e personne
-✅ Chaque post doit être FRAIS et ORIGINAL !
-
-═══════════════════════════════════════════════════════════════
-⚠️ CHIFFRES ET FORMAT
-═══════════════════════════════════════════════════════════════
-
-🔢 TOUS LES CHIFFRES EN <code>balises</code> !
-• Mise : <code>500€</code> ✅
-• Résultat : <code>1 130 675€</code> ✅  
-• Multiplicateur : <code>x2261.3</code> ✅
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, précisions, pensées
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <a href="URL">texte du lien</a>
-
-═══════════════════════════════════════════════════════════════
-⚠️ POSITION DU LIEN — VARIER !
-═══════════════════════════════════════════════════════════════
-
-VARIANTES (alterne !) :
-• Lien AU DÉBUT → puis texte de l'histoire
-• Texte → Lien AU MILIEU → texte final
-• Texte de l'histoire → Lien À LA FIN
-
-🔗 HYPERLIEN — MINIMUM 4 MOTS !
-❌ <a href="URL">Récupère</a> — INTERDIT ! Trop court !
-✅ <a href="URL">Récupère le pack de bienvenue maintenant</a> — OK !
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUCTION AU LIEN — BLOC MOTIVATIONNEL (CRITIQUE !)
-═══════════════════════════════════════════════════════════════
-
-⚠️ AVANT LE LIEN AJOUTE OBLIGATOIREMENT UNE INTRODUCTION :
-Ce sont 1-2 phrases qui RÉCHAUFFENT le lecteur et le MOTIVENT à cliquer sur le lien.
-
-📌 CE QUE DOIT FAIRE L'INTRODUCTION :
-• Relier l'histoire du gain avec la POSSIBILITÉ du lecteur de reproduire l'expérience
-• Créer le sentiment que le LECTEUR aussi peut gagner
-• Susciter le désir d'ESSAYER tout de suite
-• Utiliser les émotions de l'histoire pour passer à l'action
-
-📌 STRUCTURE DE L'INTRODUCTION :
-• Référence au gain du post → ta chance d'essayer toi aussi
-• Question-intrigue → réponse sous forme de lien
-• Appel à l'action basé sur l'histoire
-
-📌 TONALITÉ :
-• Amicale, sans pression
-• Avec enthousiasme et adrénaline
-• Comme si tu partageais un secret avec un ami
-
-❌ NE PAS écrire l'introduction séparément — elle doit COULER naturellement vers le lien !
-✅ Introduction + lien = un seul bloc motivationnel
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMAT DU LIEN AVEC BONUS (1 SEUL LIEN !)
-═══════════════════════════════════════════════════════════════
-
-🚨 EXIGENCE : DANS CHAQUE POST OBLIGATOIREMENT UN LIEN !
-❌ POST SANS LIEN = REJETÉ
-✅ UTILISE TOUJOURS : {url1} avec description unique basée sur {bonus1}
-
-⚠️ CHOISIS des formats DIFFÉRENTS pour chaque nouveau post !
-❌ NE PAS utiliser le même style à la suite
-✅ Alterne les formats au maximum
-
-⚠️ PARAPHRASE LE BONUS (CRITIQUE !) :
-❌ NE PAS copier {bonus1} directement tel quel
-✅ UTILISE-LE comme BASE, mais PARAPHRASE-LE différemment à chaque fois
-❌ NE PAS INVENTER de nouveaux bonus ou montants - UNIQUEMENT ce qui est dans {bonus1} !
-
-🚨🚨🚨 UTILISE UNIQUEMENT CE BONUS : {bonus1} 🚨🚨🚨
-❌ NE PAS INVENTER "100 dollars", "100 tours" si ce n'est PAS dans {bonus1} !
-✅ PARAPHRASE {bonus1} avec tes propres mots à chaque fois différemment
-
-📐 RÈGLE DE L'AIR (OBLIGATOIRE !) :
-• TOUJOURS ajouter une LIGNE VIDE AVANT et APRÈS chaque bloc lien
-
-📋 CHOISIS UN des formats (ROTATION ! Chaque post différent !) :
-
-1️⃣ CLASSIQUE : <a href="{url1}">🎁 [paraphrase {bonus1}]</a>
-2️⃣ GRAS : <b><a href="{url1}">🔥 [PARAPHRASE {bonus1}] !</a></b>
-3️⃣ ÉNERGIQUE : <a href="{url1}">⚡ [paraphrase {bonus1}] !</a>
-4️⃣ AMICAL : <a href="{url1}">👉 [paraphrase {bonus1}] !</a>
-5️⃣ DIRECT : <a href="{url1}">→ [paraphrase {bonus1}]</a>
-6️⃣ QUESTION : <a href="{url1}">🤔 Tu veux [paraphrase {bonus1}] ?</a>
-7️⃣ EMOJI : 🔥 <a href="{url1}">[paraphrase {bonus1}]</a> 🔥
-8️⃣ URL + DESC : {url1}\n👆 [paraphrase {bonus1}]
-9️⃣ DESC + URL : 🎁 [paraphrase {bonus1}] :\n{url1}
-
-❌ INTERDIT : **gras**, `code`, __italique__, [texte](url) — c'est du Markdown !
-
-📝 BALISES HTML (utilise-les TOUTES, pas une seule !) :
-• <b>gras</b> — machines à sous, noms, accents, titres
-• <i>italique</i> — citations, pensées, commentaires émotionnels, explications
-• <u>souligné</u> — titres de blocs, choses importantes, questions
-• <code>monospace</code> — TOUS les chiffres, montants, multiplicateurs
-• <b><i>gras italique</i></b> — accents spéciaux
-
-💬 PENSÉES ET RÉACTIONS (utilise dans les posts !) :
-• <i>«Je n'ai jamais vu ça !»</i> — tes pensées
-• <i>La série a démarré doucement...</i> — explications
-• <i>J'en ai eu le souffle coupé...</i> — émotions
-
-⚠️ CRITIQUE : UTILISE <i> et <u> DANS CHAQUE POST ! Pas seulement <b> et <code> !
-• Au moins 2-3 phrases en <i>italique</i> par post
-• Au moins 1 phrase en <u>souligné</u> par post
-
-═══════════════════════════════════════════════════════════════
-✅ GÉNÈRE UN POST UNIQUE SANS TEMPLATE !
-═══════════════════════════════════════════════════════════════
-
-⚠️ IMPORTANT : NE PAS UTILISER de templates ou de structures préfabriquées !
-• Chaque post doit être COMPLÈTEMENT ORIGINAL
-• Invente TON approche et présentation uniques
-• Base-toi sur les données (joueur, machine, gain) et crée une NOUVELLE histoire
-• Positionne les liens à des endroits DIFFÉRENTS (début/milieu/fin)
-
-🎯 TA MISSION : Écris le post comme si c'était le premier au monde !
-• Sans répétitions de structures
-• Sans copier d'exemples
-• Avec un début, milieu et fin UNIQUES
-
-═══════════════════════════════════════════════════════════════
-RÈGLES
-═══════════════════════════════════════════════════════════════
-
-📏 LONGUEUR : 500-650 caractères (CONCIS ! Telegram limite à 1024, mais écris COMPACT)
-
-🎭 LE GAIN EST LE PROTAGONISTE DU POST !
-⚠️ Si le nom du joueur ({streamer}) est indiqué — UTILISE-LE 1 FOIS !
-• TOUJOURS écrire le nom EN MAJUSCULES
-• Construis le post autour du gain, c'est la star de l'histoire !
-• Si le nom n'est pas indiqué — utilise : "un joueur", "ce héros", "le gagnant", "{person}"
-
-🎰 NOM DE LA MACHINE (interprète créativement !) :
-• Sugar Rush → "douce victoire", "tempête de sucre"
-• Le Viking → "le viking a montré sa force", "guerrier scandinave"
-• Fruit Party → "fête fruitée", "les fruits ont mûri"
-
-📊 BLOC GAIN (FORMATS DIFFÉRENTS !) :
-
-✅ ALTERNE les formats :
-• Format 1 (inline) : Mise <code>{bet}{currency}</code> → résultat <code>{win}{currency}</code> (x{multiplier})
-• Format 2 (avec emoji) : 💸 <code>{bet}{currency}</code> mise | 💰 <code>{win}{currency}</code> résultat | 🔥 <code>x{multiplier}</code>
-• Format 3 (question) : Qui aurait pensé que <code>{bet}{currency}</code> se transformeraient en <code>{win}{currency}</code> ?!
-• Format 4 (histoire) : Ça a commencé avec <code>{bet}{currency}</code>, et ça a fini avec <code>{win}{currency}</code>...
-
-🔀 BLOCS — mélange 4 éléments AU HASARD :
-
-1. DÉBUT DU POST (choisis le type au hasard) :
-   • 30% - Narratif (histoire, récit de l'événement)
-   • 25% - Question (intrigue, question rhétorique)
-   • 20% - Titre (brillant, majuscules, cadres emoji)
-   • 15% - Fait (chiffres, constatation)
-   • 10% - Émotion (exclamation, réaction)
-
-2. Faits (mise/résultat/multiplicateur)
-
-3. BLOC SUPPLÉMENTAIRE (choisis au hasard) :
-   • Réaction émotionnelle
-   • Contexte/détails de l'événement
-   • Appel à l'action
-   • Commentaire/évaluation
-
-4. Lien avec bonus
-
-❌ MOTS INTERDITS : casino
-✅ REMPLACEMENTS : plateforme, produit, site, club
-
-😀 EMOJIS : beaucoup, thématiques : 🔥💰🚀💎😱🤑💸📈🏆😎👇
-
-🎭 TONALITÉ (alterne) : surprise / confiance / enthousiasme / calme / ironie
-
-═══════════════════════════════════════════════════════════════
-FORMAT DE RÉPONSE
-═══════════════════════════════════════════════════════════════
-
-Génère un post PRÊT pour Telegram.
-Uniquement du texte avec des balises HTML.
-NE PAS ajouter d'explications, commentaires, marqueurs type [HOOK].
-
-📏 LONGUEUR : 500-650 caractères (COMPACT ! Sans remplissage ni répétitions)
-Écris de manière VIVANTE ! Ajoute des réactions, des détails du moment !"""
+    SYSTEM_PROMPT = PackField("fr")
 
     # ═══════════════════════════════════════════════════════════════════
     # УНИВЕРСАЛЬНЫЙ ПРОМПТ ДЛЯ ВИДЕО-ПОСТОВ (БЕЗ ЖЕСТКИХ СТРУКТУР!)
     # ═══════════════════════════════════════════════════════════════════
     
-    VIDEO_POST_PROMPTS = [
-        """Crée un post UNIQUE sur un gain.
-
-DONNÉES :
-• Slot : {slot}
-• Mise : {bet}{currency}
-• Gain : {win}{currency}
-• Multiplicateur : x{multiplier}
-
-⚠️ PAS de nom de joueur — utilise des formulations générales : "un joueur", "un gars", "un chanceux", "le gagnant"
-⚠️ N'INVENTE PAS de noms de joueurs !
-
-LIEN (obligatoire !) :
-• Lien : {url1} — {bonus1} (DÉCRIS LE BONUS DE MANIÈRE ATTRACTIVE ET MOTIVANTE !)
-
-⚠️ RÈGLE PRINCIPALE : LIBERTÉ TOTALE DE CRÉATIVITÉ !
-• NE suis AUCUN modèle ou exemple
-• Invente TA présentation unique
-• Place les liens à des endroits DIFFÉRENTS (début/milieu/fin/alternance)
-• Utilise des emojis et séparateurs DIFFÉRENTS
-
-🎨 THÉMATIQUE : Tu peux interpréter le nom du slot {slot} librement, mais N'INVENTE PAS un thème NON LIÉ !
-
-📝 MISE EN FORME DU TEXTE (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-• <b>gras</b> — slot, gain, accents forts
-• <i>italique</i> — pensées, émotions, commentaires (« J'en ai eu le souffle coupé... »)
-• <u>souligné</u> — questions rhétoriques, titres, phrases importantes
-• <code>monospace</code> — chiffres, montants, multiplicateurs
-⚠️ OBLIGATOIRE : au moins 2-3 phrases en <i>italique</i> + au moins 1 en <u>souligné</u> !
-
-🔗 FORMAT DU LIEN AVEC BONUS (ALTERNE entre ceux-ci !) :
-1️⃣ HYPERLIEN : 🎁 <a href="{url1}">[paraphrase {bonus1} de manière attractive]</a>
-2️⃣ URL + TIRET : 🔥 {url1} — <code>[chiffres du bonus]</code> [paraphrase le reste]
-3️⃣ URL + NOUVELLE LIGNE : {url1}\n💰 [paraphrase {bonus1} avec <b>gras</b> et <code>chiffres</code>]
-4️⃣ DESCRIPTION + URL : [paraphrase {bonus1}] 👉 {url1}
-⚠️ DÉCRIS LE BONUS DE MANIÈRE ATTRACTIVE AVEC MISE EN FORME : utilise <b>, <code> pour les chiffres !
-
-📏 Longueur : 500-650 caractères (CONCIS !)
-❌ Interdit : casino, markdown"""
-    ]
+    VIDEO_POST_PROMPTS = PackField("fr")
     
-    IMAGE_POST_PROMPTS = [
-        """Écris un post sur les BONUS.
-Lien : {url1} ({bonus1}).
-
-Style : parle des bonus comme à un ami, de manière douce et sans agressivité.
-POSITION DES LIENS : au DÉBUT du post.
-
-FORMAT DES LIENS (CRITIQUE !) :
-⚠️ DÉCRIS LE BONUS DE MANIÈRE ATTRACTIVE ET MOTIVANTE !
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "instantané", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Mets en avant les avantages : "double ton dépôt", "obtiens plus", "sans risque"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-{url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- Commence avec 🎁 ou 💎
-- Bonus en <code>tags</code> : <code>[utilise {bonus1}]</code>
-- Beaucoup d'emojis 🍒🔥💰🚀
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour pensées et commentaires (AU MOINS 2 phrases !)
-- <u>souligné</u> pour phrases importantes (AU MOINS 1 !)
-- SANS le mot "casino" (utilise : plateforme, site, club)
-- Termine avec une note motivante positive
-- Écris des descriptions COMPLÈTES et ATTRACTIVES des bonus !""",
-
-        """Écris un post MOTIVANT avec bonus.
-Lien : {url1} ({bonus1}).
-
-Style : explique pourquoi ça vaut le coup d'essayer, doux et sans pression.
-POSITION DU LIEN : au MILIEU du post.
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Mets en avant les avantages : "double ton dépôt", "obtiens plus", "sans risque"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-FORMAT DU LIEN :
-{url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- Commence avec une question ❓
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour pensées et commentaires (AU MOINS 2 phrases !)
-- <u>souligné</u> pour phrases importantes (AU MOINS 1 !)
-- Bonus en <code>tags</code>
-- SANS le mot "casino"
-- Finale : positif et motivant
-- Écris des descriptions COMPLÈTES et ATTRACTIVES du bonus !""",
-
-        """Écris un post-CONSEIL sur les bonus.
-Lien : {url1} ({bonus1}).
-
-Style : comme un lifehack amical, sans agressivité.
-POSITION DU LIEN : mélangé avec les étapes.
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-FORMAT DU LIEN :
-{url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- Commence avec 💡
-- Étapes 1. 2. 3.
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour pensées et conseils (AU MOINS 2 phrases !)
-- <u>souligné</u> pour phrases importantes (AU MOINS 1 !)
-- Bonus en <code>tags</code>
-- SANS le mot "casino" (remplace : plateforme, portail)
-- Termine avec une pensée motivante
-- Écris des descriptions COMPLÈTES et ATTRACTIVES du bonus !""",
-
-        """Écris un post COMPARATIF sur les bonus.
-Lien : {url1} ({bonus1}).
-
-Style : aide à choisir de manière douce et amicale.
-POSITION DU LIEN : après la comparaison.
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-FORMAT DU LIEN :
-{url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- Titre « Que choisir ? » 🤔
-- Avantages avec ▸
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour avis et conseils (AU MOINS 2 phrases !)
-- <u>souligné</u> pour le verdict final (AU MOINS 1 !)
-- Bonus en <code>tags</code>
-- SANS le mot "casino"
-- Finale positive et motivante
-- Écris des descriptions COMPLÈTES et ATTRACTIVES du bonus !""",
-
-        """Écris une ANNONCE de bonus.
-Lien : {url1} ({bonus1}).
-
-Style : crée de l'intérêt sans agressivité !
-POSITION DU LIEN : à la FIN du post avec ligne vide.
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-FORMAT DU LIEN :
-{url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- Commence avec 🔔 ou ⚡
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour commentaires et émotions (AU MOINS 2 phrases !)
-- <u>souligné</u> pour l'annonce principale (AU MOINS 1 !)
-- Bonus en <code>tags</code>
-- SANS le mot "casino"
-- Finale motivante
-- Écris des descriptions COMPLÈTES et ATTRACTIVES du bonus !""",
-
-        """Écris un post-AVIS sur les bonus.
-Lien : {url1} ({bonus1}).
-
-Style : comme si tu partageais ton expérience, doux et honnête.
-POSITION DU LIEN : à la FIN comme recommandation.
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-FORMAT DU LIEN :
-{url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- Citation entre « guillemets »
-- Emojis d'expérience : 💬✅
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour citations et impressions (AU MOINS 2 phrases !)
-- <u>souligné</u> pour le verdict ou recommandation (AU MOINS 1 !)
-- Bonus en <code>tags</code>
-- SANS le mot "casino" (utilise : site, ressource, service)
-- Recommandation positive
-- Écris des descriptions COMPLÈTES et ATTRACTIVES du bonus !""",
-
-        """Écris un post avec bonus.
-Lien : {url1} ({bonus1}).
-
-Style : informatif, vivant et amical.
-POSITION DU LIEN : lien avec flèche au DÉBUT.
-
-🎯 MOTIVATION : Fais en sorte que les gens VEUILLENT cliquer !
-✅ Utilise des mots émotionnels : "exclusif", "incroyable", "gratuit", "spécial"
-✅ Crée de l'urgence : "aujourd'hui seulement", "temps limité", "active maintenant"
-✅ Appel à l'action : "récupère MAINTENANT", "active ton bonus", "commence à gagner"
-
-FORMAT DU LIEN :
-➡️ {url1}
-🎁 [paraphrase {bonus1}] - 🚨 UTILISE UNIQUEMENT {bonus1} !
-
-RÈGLES :
-- MINIMUM 500, MAXIMUM 700 caractères
-- UTILISE TOUS LES TAGS HTML : <b>, <i>, <u>, <code> !
-- <i>italique</i> pour pensées et commentaires (AU MOINS 2 phrases !)
-- <u>souligné</u> pour phrases clés (AU MOINS 1 !)
-- Bonus en <code>tags</code>
-- SANS le mot "casino" (remplace : plateforme, club de jeu)
-- Termine de manière positive
-- Écris des descriptions COMPLÈTES et ATTRACTIVES du bonus !""",
-    ]
+    IMAGE_POST_PROMPTS = PackField("fr")
     
     # Промпты БЕЗ имени стримера (основной режим для французского)
-    VIDEO_POST_PROMPTS_NO_STREAMER = [
-        """Écris un post sur un gain (nom du joueur INCONNU).
-{slot_plain}, mise <b>{bet}{currency}</b>, a gagné <b>{win}{currency}</b> (x{multiplier}).
-Lien : {url1}.
-
-⚠️ Appelle le héros de manière UNIQUE : {person}
-
-🚨🚨🚨 RÈGLE CRITIQUE ! 🚨🚨🚨
-UTILISE EXACTEMENT LES CHIFFRES INDIQUÉS CI-DESSUS :
-- Mise : {bet}{currency}
-- Gain : {win}{currency}  
-- Multiplicateur : x{multiplier}
-NE CHANGE PAS, N'ARRONDIS PAS, N'INVENTE PAS D'AUTRES NOMBRES !
-
-MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-- <b>gras</b> — slot, gain, accents forts
-- <i>italique</i> — pensées, émotions, commentaires personnels (AU MOINS 2-3 phrases !)
-- <u>souligné</u> — questions rhétoriques, phrases importantes (AU MOINS 1 !)
-- <code>monospace</code> — chiffres, montants, multiplicateurs
-- Emojis 🔥💰🍒
-- MINIMUM 500, MAXIMUM 700 caractères !
-
-⚠️ FORMAT DES LIENS (choisis un, ALTERNE !) :
-🚨 UTILISE UNIQUEMENT {bonus1} - N'INVENTE PAS d'autres bonus !
-1) {url1} — 🎁 [paraphrase {bonus1} avec <code>chiffres</code> et <b>accents</b>]
-2) {url1}\n🔥 [paraphrase {bonus1} avec mise en forme]
-3) 🎁 <a href="{url1}">[paraphrase {bonus1} de manière attractive]</a>
-4) [paraphrase {bonus1}] 👉 {url1}""",
-
-        """Écris un reportage (SANS nom).
-{slot}, <b>{bet}{currency}</b> → <b>{win}{currency}</b>, x{multiplier}.
-Lien : {url1}.
-
-⚠️ Appelle le héros : {person}
-
-🚨🚨🚨 UTILISE EXACTEMENT CES NOMBRES ! 🚨🚨🚨
-Mise : {bet}{currency} | Gain : {win}{currency} | x{multiplier}
-NE CHANGE PAS ET N'INVENTE PAS D'AUTRES NOMBRES !
-
-MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-- Commence avec 🔴 ou ⚡
-- <b>gras</b> — slot, gain, accents
-- <i>italique</i> — pensées, réactions, émotions (AU MOINS 2-3 phrases !)
-- <u>souligné</u> — questions, phrases clés (AU MOINS 1 !)
-- <code>monospace</code> — chiffres, montants
-- MINIMUM 500, MAXIMUM 700 caractères !
-
-⚠️ FORMAT DES LIENS (ALTERNE entre !) : 
-🚨 UTILISE UNIQUEMENT {bonus1} - N'INVENTE PAS d'autres bonus !
-1) {url1} — [paraphrase {bonus1} avec <code>chiffres</code>]
-2) 🔥 <a href="{url1}">[paraphrase {bonus1}]</a>""",
-
-        """Écris un post avec QUESTION (sans nom du joueur).
-{slot}, entrée <b>{bet}{currency}</b>, sortie <b>{win}{currency}</b>, x{multiplier}.
-Lien : {url1}.
-
-⚠️ Appelle le héros de manière unique : {person}
-
-🚨 UTILISE EXACTEMENT : {bet}{currency} (entrée) → {win}{currency} (sortie) | x{multiplier}
-NE CHANGE PAS LES NOMBRES !
-
-MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-- Commence avec ❓
-- <b>gras</b> — chiffres clés, slot
-- <i>italique</i> — pensées, doutes, émotions (AU MOINS 2-3 phrases !)
-- <u>souligné</u> — la question principale, phrases importantes (AU MOINS 1 !)
-- <code>monospace</code> — chiffres, montants
-- Suspense → réponse
-- MINIMUM 500, MAXIMUM 700 caractères !
-
-⚠️ FORMAT DES LIENS (MOTIVE À CLIQUER !) :
-🚨 UTILISE UNIQUEMENT {bonus1} - N'INVENTE PAS d'autres bonus !
-1) 👇 {url1}\n🎁 [paraphrase {bonus1} avec <code>chiffres</code> et <b>accents</b>]
-2) 🎁 <a href="{url1}">[paraphrase {bonus1} de manière attractive]</a>""",
-
-        """Écris un post ÉMOTIONNEL (sans nom).
-{slot}, <b>{bet}{currency}</b> est devenu <b>{win}{currency}</b> (x{multiplier}).
-Lien : {url1}.
-
-⚠️ Appelle le héros : {person}
-
-🚨 NOMBRES EXACTS : {bet}{currency} → {win}{currency} (x{multiplier})
-N'INVENTE PAS D'AUTRES CHIFFRES !
-
-MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-- Emojis : 🔥💰😱🍋🍒
-- <b>gras</b> — gain, slot, accents émotionnels
-- <i>italique</i> — pensées, émotions fortes, commentaires (AU MOINS 2-3 phrases !)
-- <u>souligné</u> — phrases clés, moment fort (AU MOINS 1 !)
-- <code>monospace</code> — chiffres, montants, multiplicateurs
-- MINIMUM 500, MAXIMUM 700 caractères !
-
-⚠️ FORMAT DES LIENS : [paraphrase {bonus1} avec <b>gras</b> et <code>chiffres</code>] D'ABORD, puis URL
-🚨 UTILISE UNIQUEMENT {bonus1} - N'INVENTE PAS d'autres bonus !
-📲 👉 {url1} 👈""",
-
-        """Écris un post DÉCONTRACTÉ (sans nom).
-{slot}, <b>{bet}{currency}</b> → <b>{win}{currency}</b>, x{multiplier}.
-Lien : {url1}.
-
-⚠️ Appelle le héros de manière décontractée : {person}
-
-🚨 CHIFFRES EXACTS : {bet}{currency} → {win}{currency}, x{multiplier} - NE LES CHANGE PAS !
-
-MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-- Commence avec "Regarde," ou "Écoute," ou "Attends,"
-- Emojis : 💪😎🤙
-- <b>gras</b> — gain, slot
-- <i>italique</i> — pensées décontractées, blagues (AU MOINS 2-3 phrases !)
-- <u>souligné</u> — point clé, phrase importante (AU MOINS 1 !)
-- <code>monospace</code> — chiffres
-- MINIMUM 500, MAXIMUM 700 caractères !
-
-⚠️ FORMAT DES LIENS (ALTERNE !) :
-🚨 UTILISE UNIQUEMENT {bonus1} - N'INVENTE PAS d'autres bonus !
-1) 👉 {url1} — [paraphrase {bonus1} avec <code>chiffres</code>]
-2) <a href="{url1}">🤙 [paraphrase {bonus1}]</a>""",
-
-        """Écris un post avec CHIFFRES (sans nom).
-{slot}, entrée <b>{bet}{currency}</b>, résultat <b>{win}{currency}</b>, x{multiplier}.
-Lien : {url1}.
-
-⚠️ Appelle le héros : {person}
-
-🚨 UTILISE CES NOMBRES EXACTS DANS LE TEXTE : {bet}{currency}, {win}{currency}, x{multiplier}
-INTERDIT de changer ou d'inventer d'autres chiffres !
-
-MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
-- Première ligne : <b>{win}{currency}</b> !
-- <b>gras</b> — gain, slot
-- <i>italique</i> — commentaires, analyse, émotions (AU MOINS 2-3 phrases !)
-- <u>souligné</u> — titre ou phrase récapitulative (AU MOINS 1 !)
-- <code>monospace</code> — chiffres, montants, multiplicateurs
-- Lien après ━━━
-- MINIMUM 500, MAXIMUM 700 caractères !
-
-⚠️ FORMAT DES LIENS après le séparateur :
-🚨 UTILISE UNIQUEMENT {bonus1} - N'INVENTE PAS d'autres bonus !
-━━━━━━━━━━
-➡️ {url1}
-🎁 [paraphrase {bonus1} avec <code>chiffres</code> et <b>accents</b>]""",
-    ]
+    VIDEO_POST_PROMPTS_NO_STREAMER = PackField("fr")
     
     # Вариации описания бонуса (фоллбэк если текст слишком короткий)
-    BONUS_VARIATIONS = [
-        "jusqu'à 1 500€ de bonus sur le dépôt et 250 tours gratuits offerts !",
-        "pack de bienvenue jusqu'à 1 500 EUR + 250 tours gratuits pour commencer",
-        "bonus jusqu'à 1 500 euros sur le premier dépôt plus 250 tours gratuits",
-        "profite de 250 tours gratuits + bonus jusqu'à 1 500€",
-        "bonus de bienvenue : jusqu'à 1 500€ + 250 tours gratuits",
-        "récupère 250 tours gratuits et un bonus de dépôt jusqu'à 1 500€",
-        "250 tours offerts + bonus de 100% jusqu'à 1 500 EUR",
-        "commence avec 250 tours gratuits et un super bonus sur ton dépôt",
-        "pack exclusif : 250 tours gratuits + bonus jusqu'à 1 500€ sur le dépôt",
-        "250 tours gratuits t'attendent + bonus de dépôt jusqu'à 1 500€",
-    ]
+    BONUS_VARIATIONS = PackField("fr")
     
     # Форматы размещения ссылок (для разнообразия)
     # Распределение: ~35% гиперссылки, ~65% plain URL форматы (как в русском!)
-    LINK_FORMATS = [
-        "hyperlink", "hyperlink", "hyperlink", "hyperlink", "hyperlink", "hyperlink",  # 6/17 = ~35% гиперссылки
-        "emoji_url_text", "emoji_url_text",  # 2/17 = ~12%
-        "url_dash_text", "url_dash_text", "url_dash_text",  # 3/17 = ~18%
-        "arrow_url_text", "arrow_url_text",  # 2/17 = ~12%
-        "text_dash_url", "text_dash_url",  # 2/17 = ~12%
-        "url_newline_text", "url_newline_text",  # 2/17 = ~12%
-    ]
+    LINK_FORMATS = PackField("fr")
     
     # Синонимы для "tours/FS" (FRANÇAIS)
-    SPIN_SYNONYMS = [
-        "tours", "tours gratuits", "free spins", "tentatives",
-        "essais", "parties", "tours offerts", "tours bonus"
-    ]
+    SPIN_SYNONYMS = PackField("fr")
     
+    # Заголовок блока данных поста в режиме PROMPT_CACHE_FRIENDLY
+    POST_DATA_HEADER = "📋 DONNÉES DE CE POST (remplace avec elles les repères ⟦...⟧ des règles) :"
+
+    # Пакетный режим (src/batch_generation.py): заголовок секции поста и формат ответа
+    BATCH_ITEM_HEADER = "═══ POST {n} ═══"
+    BATCH_OUTPUT_INSTRUCTION = """
+
+📦 MODE PAR LOTS : écris {count} posts DIFFÉRENTS — un pour chaque section « POST N » ci-dessus, avec ses données et sa structure.
+Les posts sont indépendants : NE répète PAS entre eux les débuts, les phrases ni les combinaisons d'emojis.
+Réponse — UNIQUEMENT du JSON, sans explications ni markdown :
+{{"posts": [{{"id": 1, "text": "texte du post 1"}}, {{"id": 2, "text": "texte du post 2"}}]}}
+"""
+
+    # Ремонт отклонённого черновика (src/repair_tier.py): инструкция и правило на каждую причину отказа
+    REPAIR_INSTRUCTION = (
+        "Tu es l'éditeur d'un post Telegram déjà rédigé. Corrige dans le texte UNIQUEMENT la violation indiquée. "
+        "Tout le reste — formulations, ordre, emojis, balises HTML et liens — laisse-le tel quel. "
+        "Renvoie uniquement le texte corrigé du post, sans explications ni markdown."
+    )
+    REPAIR_RULES = {
+        "streamer": "Le pseudo du streamer « {streamer} » doit apparaître 1 fois dans le texte (2 au maximum), écrit exactement ainsi.",
+        "links_missing": "Le texte doit contenir le lien {url1} ({bonus1_desc}). Ajoute-le avec une courte description du bonus.",
+        "language": "Le texte doit être entièrement en français. Traduis les phrases en anglais : {detail}.",
+        "length": "Le post fait {length} caractères, il en faut 450–700. Enlève le superflu ou ajoute des détails, en gardant les faits et le lien.",
+    }
+
     def __init__(
         self, 
         api_key: str = None, 
@@ -2269,6 +541,11 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
         self.bonus_data: Optional[BonusData] = None
         self._generated_posts: List[str] = []  # Для проверки уникальности
         self._prompt_counter = 0  # Счётчик для ротации системных промптов
+        self.cache_friendly_prompts = CACHE_FRIENDLY_PROMPTS  # Стабильный префикс под кеш провайдера
+        self._last_reject_reason = ""  # Причина последней отбраковки (для телеметрии)
+        self._last_rejected_text = ""  # Отклонённый текст и подробности — для ремонта (src/repair_tier.py)
+        self._last_reject_detail = ""
+        self._style_corpus: Optional[List[str]] = None  # Примеры стиля, фиксированные на сессию
         self._used_starts: List[str] = []  # Отслеживание начал постов (первые 100 символов)
         self._used_emoji_patterns: List[str] = []  # Отслеживание наборов смайликов
         self._used_structures: List[int] = []  # Отслеживание использованных структур из VIDEO_POST_PROMPTS
@@ -2294,6 +571,14 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
         """Возвращает текущее значение счетчика форматов ссылок"""
         return self._link_format_counter
     
+    def _get_example_posts(self) -> List[str]:
+        """Примеры стиля для системного промпта: случайные или постоянные на сессию (под кеш)."""
+        if not self.cache_friendly_prompts:
+            return random.sample(self._existing_posts, min(3, len(self._existing_posts)))
+        if self._style_corpus is None:
+            self._style_corpus = random.sample(self._existing_posts, min(3, len(self._existing_posts)))
+        return self._style_corpus
+
     def _get_system_prompt(self) -> str:
         """
         Строгая ротация системных промптов для максимального разнообразия.
@@ -2403,6 +688,7 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
         3. **Проверка уникальности** - сравнивает новые посты со старыми
         """
         self._existing_posts = posts
+        self._style_corpus = None
         print(f"✅ Загружено {len(posts)} существующих постов для обучения AI")
     
     def load_existing_posts_from_file(self, filepath: str):
@@ -2585,24 +871,7 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
     # СТРУКТУРЫ ПОСТОВ (ДЛЯ ПЕРЕМЕШИВАНИЯ БЛОКОВ)
     # ═══════════════════════════════════════════════════════════════════
     
-    STRUCTURE_TEMPLATES = [
-        # Классические (1 ссылка для французского!)
-        ["HOOK", "FACTS", "LINK1", "CTA"],                    # Стандарт
-        ["HOOK", "FACTS", "CTA", "LINK1"],                    # CTA перед ссылкой
-        ["FACTS", "HOOK", "LINK1", "CTA"],                    # Факты вперёд
-        # Агрессивные (ссылка раньше)
-        ["HOOK", "LINK1", "FACTS", "CTA"],                    # Ссылка в середине
-        ["LINK1", "HOOK", "FACTS", "CTA"],                    # Начинаем со ссылки
-        # Минималистичные
-        ["FACTS", "LINK1"],                                    # Только факты и ссылка
-        ["HOOK", "FACTS", "LINK1"],                            # Без CTA
-        ["FACTS", "CTA", "LINK1"],                             # Без хука
-        # Нестандартные
-        ["CTA", "HOOK", "FACTS", "LINK1"],                    # CTA вначале (вопрос)
-        ["HOOK", "CTA", "LINK1", "FACTS"],                    # Перемешанные
-        ["FACTS", "LINK1", "CTA"],                             # Компактный
-        ["HOOK", "LINK1", "CTA"],                              # Короткий с хуком
-    ]
+    STRUCTURE_TEMPLATES = PackField("fr")
     
     def _parse_blocks(self, text: str) -> Dict[str, str]:
         """
@@ -2812,15 +1081,7 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
     # УНИКАЛЬНЫЕ ОПИСАНИЯ ПЕРСОНАЖЕЙ (для постов без имени стримера)
     # ═══════════════════════════════════════════════════════════════════
     
-    PERSON_VARIANTS = [
-        "un joueur", "quelqu'un", "un parieur", "ce gars",
-        "un joueur lambda", "un gars quelconque",
-        "un mec", "notre héros", "ce joueur",
-        "un courageux", "un gars audacieux", "un chanceux", "un gars chanceux",
-        "un téméraire", "un type", "un mec",
-        "un audacieux", "ce chanceux", "le gagnant",
-        "le protagoniste", "cet utilisateur", "un utilisateur"
-    ]
+    PERSON_VARIANTS = PackField("fr")
     
     def _get_random_person(self) -> str:
         """Возвращает случайное описание персонажа"""
@@ -3036,67 +1297,10 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
         """
         Проверяет что candidate не слишком похож на уже принятые описания в pool.
         
-        Три метрики:
-        1. Jaccard >= threshold по стеммированным словам
-        2. Containment >= 0.5 (50%+ слов короткого текста есть в длинном)
-        3. Совпадение первых 2 контентных слов (одинаковое начало)
+        Метрики (Jaccard, containment, одинаковое начало) — в src/bonus_pool_index.py;
+        при сборке пула используйте BonusPoolIndex напрямую, чтобы не стеммить pool заново.
         """
-        import re
-        
-        stop_words = {
-            'и', 'в', 'на', 'с', 'к', 'по', 'для', 'от', 'из', 'а', 'но', 'не',
-            'что', 'это', 'как', 'до', 'за', 'или', 'ещё', 'еще', 'уже', 'тоже',
-            'при', 'ты', 'вы', 'мы', 'он', 'она', 'они', 'все', 'свой', 'своё',
-            'бонус', 'бонуса', 'бонусом', 'бонуску', 'бонуска',
-            'процент', 'процентов', 'процентный', 'столько',
-            'bonus', 'bono', 'giri', 'tours', 'gratis', 'gratuiti', 'gratuits',
-            'the', 'and', 'for', 'with', 'del', 'con', 'por', 'para', 'les', 'des', 'une',
-        }
-        
-        def stem_ru(word: str) -> str:
-            for suffix in ['ений', 'ного', 'ному', 'ными', 'ения', 'ению',
-                          'ами', 'ому', 'ого', 'ной', 'ную', 'ным', 'ных', 'ное',
-                          'ить', 'ать', 'ять', 'ешь', 'ете',
-                          'ов', 'ей', 'ам', 'ом', 'ем', 'ую', 'ый', 'ий', 'ой',
-                          'ые', 'ие', 'ая', 'яя', 'ых', 'их',
-                          'а', 'о', 'у', 'е', 'ы', 'и', 'я', 'ь', 'й']:
-                if len(word) > len(suffix) + 2 and word.endswith(suffix):
-                    return word[:-len(suffix)]
-            return word
-        
-        def normalize(text: str) -> list:
-            words = re.findall(r'[а-яёa-zéèêëàâäùûüôöîïçñ]{3,}', text.lower())
-            return [stem_ru(w) for w in words if w not in stop_words]
-        
-        cand_stems = normalize(candidate)
-        if len(cand_stems) < 2:
-            return False
-        cand_set = set(cand_stems)
-        
-        for existing in pool:
-            exist_stems = normalize(existing)
-            if len(exist_stems) < 2:
-                continue
-            exist_set = set(exist_stems)
-            
-            intersection = cand_set & exist_set
-            union = cand_set | exist_set
-            
-            # 1. Jaccard similarity
-            if union and len(intersection) / len(union) >= threshold:
-                return True
-            
-            # 2. Containment: 50%+ слов короткого текста содержится в длинном
-            smaller = min(len(cand_set), len(exist_set))
-            if smaller > 0 and len(intersection) / smaller >= 0.5:
-                return True
-            
-            # 3. Одинаковое начало (первые 2 контентных слова)
-            if len(cand_stems) >= 2 and len(exist_stems) >= 2:
-                if cand_stems[:2] == exist_stems[:2]:
-                    return True
-        
-        return False
+        return is_too_similar_to_pool(candidate, pool, threshold, lang="fr")
 
     async def generate_bonus_descriptions_pool(self, count: int = 80):
         """
@@ -3115,13 +1319,22 @@ MISE EN FORME (CRITIQUE ! UTILISE TOUS LES TAGS !) :
         print(f"   ✅ Пул описаний создан: {len(self._bonus1_pool)} для бонуса")
     
     async def _request_bonus_pool(self, original_desc: str, count: int, is_bonus1: bool) -> List[str]:
-        """Запрашивает у AI пул уникальных описаний для бонуса."""
+        """Собирает пул уникальных описаний для одного бонуса: сохранённый пул + параллельные чанки AI."""
+        def accept(d: str) -> bool:
+            return len(d) >= 5 and self._validate_bonus_desc(d, original_desc)
+
+        return await build_bonus_pool(
+            original_desc, count, "fr",
+            request_chunk=lambda n: self._request_bonus_chunk(original_desc, n),
+            accept=accept,
+            fallback=lambda: self._get_random_bonus_variation(original_desc, is_bonus1=is_bonus1),
+            label="бонус",
+        )
+    
+    async def _request_bonus_chunk(self, original_desc: str, request_count: int) -> List[str]:
+        """Один запрос к AI на request_count описаний бонуса; [] если за все попытки не пришёл JSON-массив."""
         import json
         
-        request_count = int(count * 1.5) + 10
-        
-        print(f"   🎯 Генерация пула описаний для бонуса: \"{original_desc}\" (запрос {request_count})...")
-        
         prompt = f"""Génère {request_count} descriptions UNIQUES de bonus pour des posts Telegram.
 
 BONUS : "{original_desc}"
@@ -3171,10 +1384,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                     api_params["temperature"] = 0.95
                 
                 try:
-                    response = await asyncio.wait_for(
-                        self.client.chat.completions.create(**api_params),
-                        timeout=120
-                    )
+                    response = await timed_completion(self.client, api_params, "bonus_descriptions", timeout=120)
                 except asyncio.TimeoutError:
                     raise Exception(f"Таймаут: модель {self.model} не ответила за 120с при генерации описаний")
                 raw = response.choices[0].message.content.strip()
@@ -3191,51 +1401,20 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                     print(f"      ⚠️ AI вернул не массив, попытка {attempt + 1}/{max_retries}")
                     continue
                 
-                valid = []
-                invalid_count = 0
-                duplicate_count = 0
-                for d in descriptions:
-                    if not isinstance(d, str) or len(d.strip()) < 5:
-                        invalid_count += 1
-                        continue
-                    d = d.strip()
-                    if not self._validate_bonus_desc(d, original_desc):
-                        invalid_count += 1
-                        continue
-                    if self._is_too_similar_to_pool(d, valid):
-                        duplicate_count += 1
-                        continue
-                    valid.append(d)
-                
-                print(f"      ✅ Валидных: {len(valid)}, отброшено: {invalid_count}, дубли: {duplicate_count}")
-                
-                fallback_attempts = 0
-                while len(valid) < count and fallback_attempts < count * 3:
-                    fallback = self._get_random_bonus_variation(original_desc, is_bonus1=is_bonus1)
-                    fallback_attempts += 1
-                    if not self._is_too_similar_to_pool(fallback, valid):
-                        valid.append(fallback)
-                
-                import random
-                random.shuffle(valid)
-                return valid[:count]
+                return descriptions
                 
             except json.JSONDecodeError as e:
                 print(f"      ⚠️ Ошибка парсинга JSON (попытка {attempt + 1}/{max_retries}): {e}")
                 if attempt == max_retries - 1:
                     break
-                await asyncio.sleep(1)
+                await pace(1)
             except Exception as e:
                 print(f"      ❌ Ошибка запроса к AI (попытка {attempt + 1}/{max_retries}): {e}")
                 if attempt == max_retries - 1:
                     break
-                await asyncio.sleep(2)
+                await pace(2)
         
-        print(f"      ⚠️ Фоллбек на программные вариации для бонуса")
-        fallback_pool = []
-        for _ in range(count):
-            fallback_pool.append(self._get_random_bonus_variation(original_desc, is_bonus1=is_bonus1))
-        return fallback_pool
+        return []
     
     def set_bonus_pool(self, bonus1_pool: List[str]):
         """Устанавливает готовый пул описаний бонусов (для передачи между генераторами)."""
@@ -3314,14 +1493,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
     # ПЕРЕМЕЩЕНИЕ ССЫЛОК ПО ТЕКСТУ (6 стратегий размещения, 1 ссылка)
     # ═══════════════════════════════════════════════════════════════════
     
-    LINK_PLACEMENT_STRATEGIES = [
-        "TOP",
-        "AFTER_1",
-        "AFTER_2",
-        "MID",
-        "BEFORE_LAST",
-        "BOTTOM",
-    ]
+    LINK_PLACEMENT_STRATEGIES = PackField("fr")
     
     CTA_ANCHOR_PATTERNS = re.compile(
         r'(?:ticket|lien|clique|commence|récupère|obtiens|profite|active|'
@@ -3428,110 +1600,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
     # ПРОГРАММНАЯ РОТАЦИЯ 20 КАТЕГОРИЙ ФОРМАТОВ ССЫЛОК
     # ═══════════════════════════════════════════════════════════════════
     
-    LINK_FORMAT_CATEGORIES = {
-        # === Группа A: URL первый, одна строка ===
-        1: {
-            "type": "inline_url_first",
-            "prefixes": ["👉 ", "🔥 ", "💰 ", "🎁 ", "⚡ ", "💎 ", "🚀 ", "🎯 "],
-            "separator": " — ",
-        },
-        2: {
-            "type": "inline_url_first",
-            "prefixes": ["🔥🔥 ", "💰💰 ", "🎁🎁 ", "⚡⚡ ", "💎💎 "],
-            "separator": " — ",
-        },
-        3: {
-            "type": "inline_url_first",
-            "prefixes": ["→ ", "⟹ ", "↳ ", "▶ ", "☛ "],
-            "separator": " — ",
-        },
-        4: {
-            "type": "inline_url_first",
-            "prefixes": ["┃ ", "│ ", "▸ ", "• ", "◆ ", "► "],
-            "separator": " — ",
-        },
-        5: {
-            "type": "inline_url_first",
-            "prefixes": ["1️⃣ ", "▪️ ", "✦ ", "◇ ", "★ "],
-            "separator": " — ",
-        },
-        # === Группа B: URL первый, две строки ===
-        6: {
-            "type": "url_above_desc",
-            "url_prefixes": [""],
-            "desc_prefixes": [""],
-        },
-        7: {
-            "type": "url_above_desc",
-            "url_prefixes": ["👉 ", "🔥 ", "💰 ", "🎁 ", "⚡ "],
-            "desc_prefixes": [""],
-        },
-        8: {
-            "type": "url_above_desc",
-            "url_prefixes": [""],
-            "desc_prefixes": ["→ ", "👉 ", "🔥 ", "💰 ", "⚡ "],
-        },
-        # === Группа C: Описание первое ===
-        9: {
-            "type": "inline_desc_first",
-            "separators": [" — ", " – ", " - "],
-            "prefixes": [""],
-        },
-        10: {
-            "type": "desc_above_url",
-            "url_prefixes": [""],
-            "desc_prefixes": [""],
-        },
-        11: {
-            "type": "desc_above_url",
-            "url_prefixes": ["👉 ", "🔥 ", "➡️ ", "▶️ ", "⬇️ "],
-            "desc_prefixes": [""],
-        },
-        12: {
-            "type": "inline_desc_first",
-            "separators": [" — ", " – "],
-            "prefixes": ["Récupère : ", "Bonus : ", "Obtiens : ", "Profite : ", "Clique : "],
-        },
-        # === Группа D: Гиперссылки ===
-        13: {
-            "type": "hyperlink",
-            "prefixes": [""],
-        },
-        14: {
-            "type": "hyperlink",
-            "prefixes": ["🎁 ", "🔥 ", "💰 ", "⚡ ", "💎 ", "🚀 ", "✨ ", "🎯 "],
-        },
-        # === Группа E: HTML-стилизованное описание ===
-        15: {
-            "type": "styled_desc_above_url",
-            "tag_open": "<b>", "tag_close": "</b>",
-            "url_prefixes": ["", "👉 "],
-        },
-        16: {
-            "type": "styled_inline_desc_first",
-            "tag_open": "<i>", "tag_close": "</i>",
-            "separators": [" — ", " – "],
-        },
-        17: {
-            "type": "styled_desc_above_url",
-            "tag_open": "<u>", "tag_close": "</u>",
-            "url_prefixes": ["", "👉 "],
-        },
-        18: {
-            "type": "styled_inline_desc_first",
-            "tag_open": "<b><i>", "tag_close": "</i></b>",
-            "separators": [" — ", " – "],
-        },
-        19: {
-            "type": "styled_desc_above_url",
-            "tag_open": "<code>", "tag_close": "</code>",
-            "url_prefixes": [""],
-        },
-        20: {
-            "type": "blockquote_desc",
-            "url_prefixes": ["", "👉 "],
-        },
-    }
+    LINK_FORMAT_CATEGORIES = PackField("fr")
     
     def _extract_link_block_info(self, text: str, url: str) -> dict:
         """Находит URL и его описание бонуса в тексте."""
@@ -3701,16 +1770,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
     # ═══════════════════════════════════════════════════════════════════
     
     # 8 стилей форматирования (без plain — всегда форматируем)
-    BONUS_DESC_STYLES = [
-        "bold",                  # <b>текст</b>
-        "italic",                # <i>текст</i>
-        "bold_italic",           # <b><i>текст</i></b>
-        "underline",             # <u>текст</u>
-        "underline_bold",        # <u><b>текст</b></u>
-        "underline_italic",      # <u><i>текст</i></u>
-        "underline_bold_italic", # <u><b><i>текст</i></b></u>
-        "blockquote",            # <blockquote>текст</blockquote>
-    ]
+    BONUS_DESC_STYLES = PackField("fr")
     
     def _wrap_desc_in_style(self, text: str, style: str) -> str:
         """Оборачивает текст в указанный HTML-стиль."""
@@ -4500,6 +2560,358 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         
         return text.strip()
     
+    def _postprocess_video_text(self, text: str, video: VideoData) -> str:
+        """
+        Синхронная цепочка постобработки принятого кандидата video-поста.
+
+        Вызывается через src.postprocess_pool — в пуле потоков, а не в event loop бота.
+        """
+        # Постобработка
+        text = self._filter_ai_responses(text)  # Убираем ответы AI типа "Voici le post..."
+        text = self._fix_truncated_words(text)
+        text = self._postprocess_text(text, video.slot)
+        text = self._fix_broken_urls(text)
+        # _filter_non_russian НЕ используем для французского - она для русского
+        text = self._remove_chat_mentions(text)
+        text = self._remove_template_phrases(text)
+        text = self._fix_french_typos(text)
+        text = self._fix_stat_block_rounding(text, video)
+        text = self._randomize_currency_format(text, video)
+
+        # 📍 Перемещение ссылки в разные позиции поста
+        text = self._relocate_link_blocks(text)
+        # 🔗 Программная ротация формата ссылки (20 категорий)
+        text = self._reformat_link_blocks(text)
+
+        # 🎨 HTML-стиль описания бонуса (для категорий 1-12 без пре-стиля)
+        text = self._apply_bonus_desc_formatting(text)
+
+        # 🔄 Дедупликация: убираем лишние упоминания выигрыша (3+ раз)
+        text = self._deduplicate_win_mentions(text, video)
+        return text
+
+    def _prepare_video_prompt(self, video: VideoData) -> VideoPromptParts:
+        """
+        Промпт одного видео-поста: структура, пользовательский промпт, значения
+        для системного промпта и блок цифр. Общая часть одиночной и пакетной генерации.
+        """
+        # Определяем, есть ли реальный ник стримера в исходных данных
+        has_real_streamer = video.has_streamer()
+
+        # Выбираем промпт в зависимости от наличия стримера
+        used_structure_index = -1
+        if has_real_streamer:
+            available_indices = list(range(len(self.VIDEO_POST_PROMPTS)))
+            structure_index = self._get_unused_structure_index(available_indices, used_count=15, slot=video.slot)
+            prompt_template = self.VIDEO_POST_PROMPTS[structure_index]
+            streamer_name = video.streamer.strip()
+            used_structure_index = structure_index
+        else:
+            available_indices = list(range(len(self.VIDEO_POST_PROMPTS_NO_STREAMER)))
+            structure_index = self._get_unused_structure_index(available_indices, used_count=10, slot=video.slot)
+            prompt_template = self.VIDEO_POST_PROMPTS_NO_STREAMER[structure_index]
+            streamer_name = ""
+            used_structure_index = structure_index + 1000
+
+        # Уникальное описание бонуса: из AI-пула (приоритет) или программная вариация
+        if self._bonus1_pool and self._bonus1_pool_index < len(self._bonus1_pool):
+            bonus1_var = self._bonus1_pool[self._bonus1_pool_index]
+        else:
+            bonus1_var = self._get_random_bonus_variation(self.bonus_data.bonus1_desc, is_bonus1=True)
+
+        # Форматируем данные
+        formatted_bet = video.get_formatted_bet()
+        formatted_win = video.get_formatted_win()
+        formatted_slot = video.get_formatted_slot()
+        currency_format = video.get_random_currency_format()
+        
+        # Если слот пустой, используем общие формулировки
+        slot_unknown = False
+        if not formatted_slot or formatted_slot.strip() == "":
+            slot_mention = "un slot"
+            slot_bold = "un slot"
+            slot_unknown = True
+        else:
+            slot_mention = formatted_slot
+            slot_bold = f"<b>{formatted_slot}</b>"
+
+        base_prompt = prompt_template.format(
+            streamer=streamer_name if has_real_streamer else self._get_random_person(),
+            slot=slot_bold,  # Используем форматированный слот
+            slot_plain=slot_mention,  # Простое упоминание без HTML
+            bet=formatted_bet,
+            win=formatted_win,
+            currency=currency_format,
+            multiplier=video.multiplier,
+            url1=self.bonus_data.url1,
+            bonus1=bonus1_var,
+            person=self._get_random_person()
+        )
+        
+        # КРИТИЧНО: Если слот неизвестен - ЗАПРЕЩАЕМ придумывать название!
+        if slot_unknown:
+            base_prompt = base_prompt + "\n\n🚨🚨🚨 TRÈS IMPORTANT ! 🚨🚨🚨\n" \
+                                        "Le nom du slot est INCONNU — N'INVENTE PAS un nom spécifique comme 'Gates of Olympus', 'Big Bass', etc. !\n" \
+                                        "UTILISE UNIQUEMENT des formulations générales : 'un slot', 'un jeu', 'la machine', 'les rouleaux'.\n" \
+                                        "INTERDIT d'inventer des noms de slots qui ne sont pas dans les données originales !"
+
+        system_slot = slot_mention if formatted_slot and formatted_slot.strip() else "un slot"
+        
+        prompt_values = dict(
+            slot=system_slot,
+            streamer=streamer_name,
+            bet=formatted_bet,
+            win=formatted_win,
+            multiplier=video.multiplier,
+            url1=self.bonus_data.url1,
+            bonus1=bonus1_var,
+            currency=currency_format,
+            person=self._get_random_person()
+        )
+
+        # Генерируем инструкцию с форматом блока цифр (как в русском)
+        number_format_instruction = ""
+        if self._number_formats:
+            chosen_format = self._get_random_number_format(video.bet, video.win, video.multiplier)
+            number_format_instruction = f"""
+
+🚨🚨🚨 BLOC DE CHIFFRES OBLIGATOIRE — COPIE-LE DANS LE POST ! 🚨🚨🚨
+
+{chosen_format}
+
+⛔ INTERDICTION ABSOLUE :
+❌ N'ÉCRIS PAS les chiffres de mise/gain/multiplicateur avec tes propres mots !
+❌ NE CRÉE PAS ton propre format de bloc de chiffres !
+❌ N'UTILISE PAS les données bet/win/multiplier de la section DONNÉES pour créer ton propre bloc !
+
+✅ COPIE SIMPLEMENT le bloc ci-dessus UNE FOIS dans le post !
+✅ Tu peux le placer au début, au milieu ou à la fin du post.
+
+🚨🚨🚨 SI TU ÉCRIS LES CHIFFRES DIFFÉREMMENT — LE POST SERA REJETÉ ! 🚨🚨🚨
+"""
+
+        return VideoPromptParts(
+            base_prompt=base_prompt,
+            prompt_values=prompt_values,
+            has_real_streamer=has_real_streamer,
+            streamer_name=streamer_name,
+            used_structure_index=used_structure_index,
+            number_format_instruction=number_format_instruction,
+        )
+
+    def _build_examples_text(self) -> str:
+        """Блок примеров стиля из базы существующих постов для системного промпта."""
+        if not self._existing_posts:
+            return ""
+        # Берем 3 случайных поста как примеры стиля
+        example_posts = self._get_example_posts()
+        examples_text = "\n\n═══════════════════════════════════════════════════════════════\n"
+        examples_text += "📚 EXEMPLES DE TES POSTS EXISTANTS (étudie le style !) :\n"
+        examples_text += "═══════════════════════════════════════════════════════════════\n\n"
+        # Каждый пример и все вместе укладываются в бюджет токенов
+        example_previews = pack_items(example_posts, EXAMPLE_POST_TOKENS, EXAMPLES_TOTAL_TOKENS)
+        for i, post_preview in enumerate(example_previews, 1):
+            examples_text += f"EXEMPLE {i} :\n{post_preview}\n\n"
+        examples_text += "⚠️ IMPORTANT : Étudie la structure, le ton, la mise en forme de ces posts.\n"
+        examples_text += "MAIS crée des posts NOUVEAUX - NE copie PAS les phrases et constructions !\n"
+        examples_text += "═══════════════════════════════════════════════════════════════\n"
+        return examples_text
+
+    def _reject(self, reason: str, text: str = "", detail: str = "") -> None:
+        """Запоминает причину отбраковки текста и возвращает None для _finalize_video_text."""
+        self._last_reject_reason = reason
+        self._last_rejected_text = text
+        self._last_reject_detail = detail
+        return None
+
+    def _record_outcome(self, accepted: bool, regen: int, seconds: float):
+        """Результат проверки поста — в телеметрию модели."""
+        get_model_telemetry().record_outcome(
+            self.model, accepted, "" if accepted else self._last_reject_reason, regen, seconds
+        )
+
+    async def _repair_text(self, text: str, reason: str, parts: VideoPromptParts) -> Optional[str]:
+        """
+        Точечный ремонт отклонённого текста дешёвой моделью: только текст и нарушенное правило.
+        Возвращает исправленный текст или None, если ремонт не удался.
+        """
+        rule = self.REPAIR_RULES.get(reason)
+        if not REPAIR_ENABLED or not rule or not text or not self.client:
+            return None
+        rule = safe_format(rule, **vars(self.bonus_data), streamer=parts.streamer_name,
+                           detail=self._last_reject_detail, length=len(text))
+        model = repair_model(self.use_openrouter, OPENROUTER_MODELS)
+        api_params = {
+            "model": model,
+            "messages": build_repair_messages(self.REPAIR_INSTRUCTION, rule, text),
+        }
+        if model in ["gpt-4.1-nano", "gpt-4.1-mini"]:
+            api_params["max_completion_tokens"] = REPAIR_MAX_TOKENS
+        else:
+            api_params["max_tokens"] = REPAIR_MAX_TOKENS
+            api_params["temperature"] = 0.2
+
+        print(f"   🩹 Ремонт ({reason}) моделью {model}...")
+        sys.stdout.flush()
+        try:
+            response = await timed_completion(self.client, api_params, "repair", timeout=REPAIR_TIMEOUT)
+        except Exception as e:
+            print(f"   🩹 Ремонт не удался: {e}")
+            return None
+        content = response.choices[0].message.content if response and response.choices else None
+        get_token_log().record("repair", model, api_params["messages"], getattr(response, "usage", None), content)
+        repaired = clean_repair_output(content)
+        return repaired or None
+
+    async def _finalize_video_text(self, text: str, video: VideoData, index: int,
+                                   parts: VideoPromptParts) -> Optional[GeneratedPostAI]:
+        """
+        Постобработка и проверки ответа модели для одного видео-поста.
+        Возвращает готовый пост или None, если текст нужно перегенерировать.
+        """
+        has_real_streamer, streamer_name = parts.has_real_streamer, parts.streamer_name
+        used_structure_index = parts.used_structure_index
+
+        # Постобработка — в пуле, чтобы не задерживать event loop
+        text = await run_postprocess(self._postprocess_video_text, text, video)
+
+        # Мягкая обрезка воды если пост длиннее целевого (как в русском)
+        if len(text) > 700:
+            print(f"   ✂️ Пост длинноват ({len(text)}), мягко сокращаем воду...")
+            text = await run_postprocess(self._smart_trim_text, text, 650)
+            print(f"   ✅ После сокращения: {len(text)}")
+            sys.stdout.flush()
+
+        # 🚨 ЖЁСТКИЙ ЛИМИТ: Telegram caption = 1024 символа
+        if len(text) > 1020:
+            print(f"   ✂️ Текст слишком длинный ({len(text)}), сокращаем...")
+            text = await run_postprocess(self._smart_trim_text, text, 1000)
+            print(f"   ✅ После сокращения: {len(text)}")
+            sys.stdout.flush()
+
+        # Проверка упоминания стримера (если есть)
+        if has_real_streamer and streamer_name:
+            streamer_mentions = text.lower().count(streamer_name.lower())
+            # Ник должен быть упомянут 1 раз (допустимо 2 раза максимум)
+            if streamer_mentions < 1:
+                print(f"   ⚠️ Ник '{streamer_name}' не найден, регенерируем...")
+                sys.stdout.flush()
+                return self._reject("streamer", text)
+            if streamer_mentions > 2:
+                print(f"   ⚠️ Ник '{streamer_name}' найден {streamer_mentions} раз(а), должно быть 1-2. Регенерируем...")
+                sys.stdout.flush()
+                return self._reject("streamer", text)
+            
+            # Проверка что ник начинается с заглавной буквы
+            if streamer_name[0].isupper():
+                # Ищем ник в тексте и проверяем капитализацию
+                import re
+                # Находим все вхождения ника (учитывая возможные склонения)
+                base_nick = streamer_name.lower()
+                # Ищем точные совпадения с учетом регистра
+                if base_nick in text.lower() and not streamer_name in text:
+                    # Есть ник но в неправильном регистре
+                    print(f"   ⚠️ Ник '{streamer_name}' найден в неправильном регистре. Регенерируем...")
+                    sys.stdout.flush()
+                    return self._reject("streamer", text)
+
+        # Обрезка отключена - оставляем текст как есть
+
+        # КРИТИЧЕСКАЯ ПРОВЕРКА: Ссылка должна присутствовать в финальном тексте!
+        url1_present = self.bonus_data.url1 in text or (self.bonus_data.url1.replace('https://', '') in text)
+        
+        if not url1_present:
+            print(f"   ⚠️ Пропала ссылка url1. Регенерируем...")
+            sys.stdout.flush()
+            return self._reject("links_missing", text)
+        
+        # КРИТИЧНАЯ ПРОВЕРКА: Текст должен быть ТОЛЬКО на ФРАНЦУЗСКОМ языке!
+        # Список частых английских ФРАЗ которые недопустимы
+        # ВАЖНО: Отдельные слова как "wild", "gate" НЕ проверяем - они могут быть в названиях слотов!
+        english_phrases = [
+            'the abyss', 'answered the call', 'summoning circle',
+            'play it safe', 'bright lights', 'chose to dive', 'deep into',
+            'dark forces', 'aligned', 'full-blown ritual', 'pulled straight',
+            'from the void', 'sometimes', 'when you stare', 'into the darkness',
+            'hands you', 'fortune in return', 'outcome is terrifyingly good',
+            'claim the', 'massive', 'boost', 'activate', 'balance power',
+            'visuals shifted', 'eerie sounds peaked', 'screen locked',
+            'random luck', 'felt like', 'handshake with the supernatural'
+        ]
+        
+        # Проверяем наличие английских фраз (НО ИСКЛЮЧАЕМ слова из названия слота и валюты!)
+        text_lower = text.lower()
+        slot_lower = video.slot.lower()
+        found_english = []
+        
+        # Список допустимых английских слов (валюты, аббревиатуры)
+        allowed_words = ['usd', 'eur', 'gbp', 'rub', 'fs', 'x', 'max', 'bet', 'win']
+        
+        for phrase in english_phrases:
+            phrase_lower = phrase.lower()
+            # Проверяем есть ли фраза в тексте
+            if phrase_lower in text_lower:
+                # Пропускаем если это допустимое слово
+                if phrase_lower in allowed_words:
+                    continue
+                
+                # Проверяем - не является ли эта фраза частью названия слота
+                # Например: "wild" есть в "2 wild 2 die"
+                if phrase_lower not in slot_lower:
+                    found_english.append(phrase)
+        
+        # Если нашли английские фразы (которые НЕ из названия слота) - регенерируем
+        if found_english:
+            print(f"   ⚠️ Обнаружен английский текст: {', '.join(found_english[:3])}... Регенерируем с ФРАНЦУЗСКИМ языком!")
+            sys.stdout.flush()
+            return self._reject("language", text, ", ".join(found_english[:5]))
+
+        # Уникальность среди уже сгенерированных
+        if text in self._generated_posts:
+            print(f"   ⚠️ Дубликат текста для поста #{index}, регенерируем...")
+            sys.stdout.flush()
+            return self._reject("duplicate", text)
+
+        # Сохраняем
+        self._generated_posts.append(text)
+
+        # История структур
+        if used_structure_index >= 0:
+            self._used_structures.append(used_structure_index)
+            if len(self._used_structures) > 50:
+                self._used_structures = self._used_structures[-50:]
+
+            slot_key = video.slot.lower()
+            if slot_key not in self._used_slot_structure:
+                self._used_slot_structure[slot_key] = []
+            self._used_slot_structure[slot_key].append(used_structure_index)
+            if len(self._used_slot_structure[slot_key]) > 20:
+                self._used_slot_structure[slot_key] = self._used_slot_structure[slot_key][-20:]
+
+        post_start = self._extract_post_start(text, length=100)
+        self._used_starts.append(post_start)
+        if len(self._used_starts) > 30:
+            self._used_starts = self._used_starts[-30:]
+
+        emoji_pattern = self._extract_emoji_pattern(text)
+        if emoji_pattern:
+            self._used_emoji_patterns.append(emoji_pattern)
+            if len(self._used_emoji_patterns) > 30:
+                self._used_emoji_patterns = self._used_emoji_patterns[-30:]
+
+        print(f"   ✅ Пост #{index} готов (длина: {len(text)})")
+        sys.stdout.flush()
+
+        return GeneratedPostAI(
+            index=index,
+            media_type="video",
+            text=text,
+            streamer=video.streamer,
+            slot=video.slot,
+            bet=video.bet,
+            win=video.win
+        )
+
     async def generate_video_post(self, video: VideoData, index: int = 0) -> GeneratedPostAI:
         """
         Генерирует уникальный пост для видео.
@@ -4520,67 +2932,16 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         max_regens = 10  # нормальные ретраи генерации (не завязаны на index)
         last_error = None
 
+        set_cost_post(index)
         for regen in range(1, max_regens + 1):
+            regen_started = time.monotonic()
             try:
-                # Определяем, есть ли реальный ник стримера в исходных данных
-                has_real_streamer = video.has_streamer()
-
-                # Выбираем промпт в зависимости от наличия стримера
-                used_structure_index = -1
-                if has_real_streamer:
-                    available_indices = list(range(len(self.VIDEO_POST_PROMPTS)))
-                    structure_index = self._get_unused_structure_index(available_indices, used_count=15, slot=video.slot)
-                    prompt_template = self.VIDEO_POST_PROMPTS[structure_index]
-                    streamer_name = video.streamer.strip()
-                    used_structure_index = structure_index
-                else:
-                    available_indices = list(range(len(self.VIDEO_POST_PROMPTS_NO_STREAMER)))
-                    structure_index = self._get_unused_structure_index(available_indices, used_count=10, slot=video.slot)
-                    prompt_template = self.VIDEO_POST_PROMPTS_NO_STREAMER[structure_index]
-                    streamer_name = ""
-                    used_structure_index = structure_index + 1000
-
-                # Уникальное описание бонуса: из AI-пула (приоритет) или программная вариация
-                if self._bonus1_pool and self._bonus1_pool_index < len(self._bonus1_pool):
-                    bonus1_var = self._bonus1_pool[self._bonus1_pool_index]
-                else:
-                    bonus1_var = self._get_random_bonus_variation(self.bonus_data.bonus1_desc, is_bonus1=True)
-
-                # Форматируем данные
-                formatted_bet = video.get_formatted_bet()
-                formatted_win = video.get_formatted_win()
-                formatted_slot = video.get_formatted_slot()
-                currency_format = video.get_random_currency_format()
-                
-                # Если слот пустой, используем общие формулировки
-                slot_unknown = False
-                if not formatted_slot or formatted_slot.strip() == "":
-                    slot_mention = "un slot"
-                    slot_bold = "un slot"
-                    slot_unknown = True
-                else:
-                    slot_mention = formatted_slot
-                    slot_bold = f"<b>{formatted_slot}</b>"
-
-                base_prompt = prompt_template.format(
-                    streamer=streamer_name if has_real_streamer else self._get_random_person(),
-                    slot=slot_bold,  # Используем форматированный слот
-                    slot_plain=slot_mention,  # Простое упоминание без HTML
-                    bet=formatted_bet,
-                    win=formatted_win,
-                    currency=currency_format,
-                    multiplier=video.multiplier,
-                    url1=self.bonus_data.url1,
-                    bonus1=bonus1_var,
-                    person=self._get_random_person()
-                )
-                
-                # КРИТИЧНО: Если слот неизвестен - ЗАПРЕЩАЕМ придумывать название!
-                if slot_unknown:
-                    base_prompt = base_prompt + "\n\n🚨🚨🚨 TRÈS IMPORTANT ! 🚨🚨🚨\n" \
-                                                "Le nom du slot est INCONNU — N'INVENTE PAS un nom spécifique comme 'Gates of Olympus', 'Big Bass', etc. !\n" \
-                                                "UTILISE UNIQUEMENT des formulations générales : 'un slot', 'un jeu', 'la machine', 'les rouleaux'.\n" \
-                                                "INTERDIT d'inventer des noms de slots qui ne sont pas dans les données originales !"
+                # Бюджет прогона (RUN_BUDGET_USD) исчерпан — новые регены не начинаем
+                check_run_budget()
+                parts = self._prepare_video_prompt(video)
+                base_prompt, prompt_values = parts.base_prompt, parts.prompt_values
+                has_real_streamer, streamer_name = parts.has_real_streamer, parts.streamer_name
+                number_format_instruction = parts.number_format_instruction
 
                 streamer_info = streamer_name if has_real_streamer else "без ника (общие формулировки)"
                 print(f"🤖 Генерация поста #{index} (regen {regen}/{max_regens}) для {streamer_info} на {video.slot}...")
@@ -4592,61 +2953,19 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                 raw_system_prompt = self._get_system_prompt()
                 
                 # Добавляем примеры из существующих постов для обучения AI
-                if self._existing_posts and len(self._existing_posts) > 0:
-                    # Берем 3 случайных поста как примеры стиля
-                    example_posts = random.sample(self._existing_posts, min(3, len(self._existing_posts)))
-                    examples_text = "\n\n═══════════════════════════════════════════════════════════════\n"
-                    examples_text += "📚 EXEMPLES DE TES POSTS EXISTANTS (étudie le style !) :\n"
-                    examples_text += "═══════════════════════════════════════════════════════════════\n\n"
-                    for i, post in enumerate(example_posts, 1):
-                        # Обрезаем до 500 символов
-                        post_preview = post[:500] + "..." if len(post) > 500 else post
-                        examples_text += f"EXEMPLE {i} :\n{post_preview}\n\n"
-                    examples_text += "⚠️ IMPORTANT : Étudie la structure, le ton, la mise en forme de ces posts.\n"
-                    examples_text += "MAIS crée des posts NOUVEAUX - NE copie PAS les phrases et constructions !\n"
-                    examples_text += "═══════════════════════════════════════════════════════════════\n"
-                    
-                    raw_system_prompt = raw_system_prompt + examples_text
-                
-                system_slot = slot_mention if formatted_slot and formatted_slot.strip() else "un slot"
+                raw_system_prompt = raw_system_prompt + self._build_examples_text()
                 
-                system_prompt = safe_format(
-                    raw_system_prompt,
-                    slot=system_slot,
-                    streamer=streamer_name,
-                    bet=formatted_bet,
-                    win=formatted_win,
-                    multiplier=video.multiplier,
-                    url1=self.bonus_data.url1,
-                    bonus1=bonus1_var,
-                    currency=currency_format,
-                    person=self._get_random_person()
-                )
+                if self.cache_friendly_prompts:
+                    # Поля поста — метками в системном промпте, значения — в сообщении пользователя
+                    system_prompt, post_data_note = split_cacheable_prompt(
+                        raw_system_prompt, prompt_values, self.POST_DATA_HEADER
+                    )
+                else:
+                    system_prompt, post_data_note = safe_format(raw_system_prompt, **prompt_values), ""
 
                 anti_repetition = self._get_anti_repetition_instruction()
                 length_note = ""
                 text = None
-                
-                # Генерируем инструкцию с форматом блока цифр (как в русском)
-                number_format_instruction = ""
-                if self._number_formats:
-                    chosen_format = self._get_random_number_format(video.bet, video.win, video.multiplier)
-                    number_format_instruction = f"""
-
-🚨🚨🚨 BLOC DE CHIFFRES OBLIGATOIRE — COPIE-LE DANS LE POST ! 🚨🚨🚨
-
-{chosen_format}
-
-⛔ INTERDICTION ABSOLUE :
-❌ N'ÉCRIS PAS les chiffres de mise/gain/multiplicateur avec tes propres mots !
-❌ NE CRÉE PAS ton propre format de bloc de chiffres !
-❌ N'UTILISE PAS les données bet/win/multiplier de la section DONNÉES pour créer ton propre bloc !
-
-✅ COPIE SIMPLEMENT le bloc ci-dessus UNE FOIS dans le post !
-✅ Tu peux le placer au début, au milieu ou à la fin du post.
-
-🚨🚨🚨 SI TU ÉCRIS LES CHIFFRES DIFFÉREMMENT — LE POST SERA REJETÉ ! 🚨🚨🚨
-"""
 
                 # Генерируем до 3 попыток внутри одной регенерации (короткий/длинный)
                 for attempt in range(3):
@@ -4659,7 +2978,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                         print(f"   📝 Промпт (первые 200 символов): {base_prompt[:200]}...")
                         sys.stdout.flush()
 
-                    user_prompt = base_prompt + number_format_instruction + length_note + anti_repetition
+                    user_prompt = post_data_note + base_prompt + number_format_instruction + length_note + anti_repetition
 
                     api_params = {
                         "model": self.model,
@@ -4681,22 +3000,24 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                         api_params["frequency_penalty"] = 0.6
 
                     try:
-                        response = await asyncio.wait_for(
-                            self.client.chat.completions.create(**api_params),
-                            timeout=120
+                        # При LLM_HEDGING=1 — дубль в резервную модель, если основная не уложилась в свой p90
+                        response = await hedged_completion(
+                            self.client, api_params, timeout=120,
+                            models=OPENROUTER_MODELS if self.use_openrouter else None,
+                            purpose="video_post"
                         )
                     except asyncio.TimeoutError:
                         print(f"   ⏰ Таймаут 120с для модели {self.model}, попытка {attempt + 1}/3")
                         sys.stdout.flush()
                         if attempt == 2:
                             raise Exception(f"Таймаут: модель {self.model} не ответила за 120с (3 попытки)")
-                        await asyncio.sleep(2)
+                        await pace(2)
                         continue
 
                     if not response or not response.choices:
                         if attempt == 2:
                             raise Exception("Пустой ответ от API после всех попыток")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     choice = response.choices[0]
@@ -4707,14 +3028,16 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                     if finish_reason == "content_filter":
                         if attempt == 2:
                             raise Exception("Контент был отфильтрован после всех попыток")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     message_content = getattr(getattr(choice, "message", None), "content", None)
+                    get_token_log().record("video_post", self.model, api_params["messages"],
+                                           getattr(response, "usage", None), message_content)
                     if not message_content:
                         if attempt == 2:
                             raise Exception(f"Ответ без content после всех попыток. finish_reason={finish_reason}")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     raw_text = message_content.strip()
@@ -4742,178 +3065,144 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                     length_note = "\n\n⚠️ Le post est trop COURT ! Ajoute plus de détails et d'émotions, mais reste dans 500-650 caractères."
                     text = candidate
 
+                # Все попытки вне окна длины — сначала точечный ремонт, а не текст как есть
+                if text is not None and not 450 <= len(text) <= 700:
+                    repaired = await self._repair_text(text, "length", parts)
+                    if repaired and 450 <= len(repaired) <= 700:
+                        print(f"   🩹 Длина исправлена: {len(text)} → {len(repaired)}")
+                        text = repaired
+
                 if text is None or len(text) < 350:
                     raise Exception("Не удалось получить валидный текст от API")
 
-                # Постобработка
-                text = self._filter_ai_responses(text)  # Убираем ответы AI типа "Voici le post..."
-                text = self._fix_truncated_words(text)
-                text = self._postprocess_text(text, video.slot)
-                text = self._fix_broken_urls(text)
-                # _filter_non_russian НЕ используем для французского - она для русского
-                text = self._remove_chat_mentions(text)
-                text = self._remove_template_phrases(text)
-                text = self._fix_french_typos(text)
-                text = self._fix_stat_block_rounding(text, video)
-                text = self._randomize_currency_format(text, video)
-
-                # 📍 Перемещение ссылки в разные позиции поста
-                text = self._relocate_link_blocks(text)
-                # 🔗 Программная ротация формата ссылки (20 категорий)
-                text = self._reformat_link_blocks(text)
-
-                # 🎨 HTML-стиль описания бонуса (для категорий 1-12 без пре-стиля)
-                text = self._apply_bonus_desc_formatting(text)
-
-                # 🔄 Дедупликация: убираем лишние упоминания выигрыша (3+ раз)
-                text = self._deduplicate_win_mentions(text, video)
-
-                # Мягкая обрезка воды если пост длиннее целевого (как в русском)
-                if len(text) > 700:
-                    print(f"   ✂️ Пост длинноват ({len(text)}), мягко сокращаем воду...")
-                    text = self._smart_trim_text(text, 650)
-                    print(f"   ✅ После сокращения: {len(text)}")
-                    sys.stdout.flush()
-
-                # 🚨 ЖЁСТКИЙ ЛИМИТ: Telegram caption = 1024 символа
-                if len(text) > 1020:
-                    print(f"   ✂️ Текст слишком длинный ({len(text)}), сокращаем...")
-                    text = self._smart_trim_text(text, 1000)
-                    print(f"   ✅ После сокращения: {len(text)}")
-                    sys.stdout.flush()
-
-                # Проверка упоминания стримера (если есть)
-                if has_real_streamer and streamer_name:
-                    streamer_mentions = text.lower().count(streamer_name.lower())
-                    # Ник должен быть упомянут 1 раз (допустимо 2 раза максимум)
-                    if streamer_mentions < 1:
-                        print(f"   ⚠️ Ник '{streamer_name}' не найден, регенерируем...")
-                        sys.stdout.flush()
-                        continue
-                    if streamer_mentions > 2:
-                        print(f"   ⚠️ Ник '{streamer_name}' найден {streamer_mentions} раз(а), должно быть 1-2. Регенерируем...")
-                        sys.stdout.flush()
-                        continue
-                    
-                    # Проверка что ник начинается с заглавной буквы
-                    if streamer_name[0].isupper():
-                        # Ищем ник в тексте и проверяем капитализацию
-                        import re
-                        # Находим все вхождения ника (учитывая возможные склонения)
-                        base_nick = streamer_name.lower()
-                        # Ищем точные совпадения с учетом регистра
-                        if base_nick in text.lower() and not streamer_name in text:
-                            # Есть ник но в неправильном регистре
-                            print(f"   ⚠️ Ник '{streamer_name}' найден в неправильном регистре. Регенерируем...")
-                            sys.stdout.flush()
-                            continue
-
-                # Обрезка отключена - оставляем текст как есть
-
-                # КРИТИЧЕСКАЯ ПРОВЕРКА: Ссылка должна присутствовать в финальном тексте!
-                url1_present = self.bonus_data.url1 in text or (self.bonus_data.url1.replace('https://', '') in text)
-                
-                if not url1_present:
-                    print(f"   ⚠️ Пропала ссылка url1. Регенерируем...")
-                    sys.stdout.flush()
-                    continue
-                
-                # КРИТИЧНАЯ ПРОВЕРКА: Текст должен быть ТОЛЬКО на ФРАНЦУЗСКОМ языке!
-                # Список частых английских ФРАЗ которые недопустимы
-                # ВАЖНО: Отдельные слова как "wild", "gate" НЕ проверяем - они могут быть в названиях слотов!
-                english_phrases = [
-                    'the abyss', 'answered the call', 'summoning circle',
-                    'play it safe', 'bright lights', 'chose to dive', 'deep into',
-                    'dark forces', 'aligned', 'full-blown ritual', 'pulled straight',
-                    'from the void', 'sometimes', 'when you stare', 'into the darkness',
-                    'hands you', 'fortune in return', 'outcome is terrifyingly good',
-                    'claim the', 'massive', 'boost', 'activate', 'balance power',
-                    'visuals shifted', 'eerie sounds peaked', 'screen locked',
-                    'random luck', 'felt like', 'handshake with the supernatural'
-                ]
-                
-                # Проверяем наличие английских фраз (НО ИСКЛЮЧАЕМ слова из названия слота и валюты!)
-                text_lower = text.lower()
-                slot_lower = video.slot.lower()
-                found_english = []
-                
-                # Список допустимых английских слов (валюты, аббревиатуры)
-                allowed_words = ['usd', 'eur', 'gbp', 'rub', 'fs', 'x', 'max', 'bet', 'win']
-                
-                for phrase in english_phrases:
-                    phrase_lower = phrase.lower()
-                    # Проверяем есть ли фраза в тексте
-                    if phrase_lower in text_lower:
-                        # Пропускаем если это допустимое слово
-                        if phrase_lower in allowed_words:
-                            continue
-                        
-                        # Проверяем - не является ли эта фраза частью названия слота
-                        # Например: "wild" есть в "2 wild 2 die"
-                        if phrase_lower not in slot_lower:
-                            found_english.append(phrase)
-                
-                # Если нашли английские фразы (которые НЕ из названия слота) - регенерируем
-                if found_english:
-                    print(f"   ⚠️ Обнаружен английский текст: {', '.join(found_english[:3])}... Регенерируем с ФРАНЦУЗСКИМ языком!")
-                    sys.stdout.flush()
-                    continue
-
-                # Уникальность среди уже сгенерированных
-                if text in self._generated_posts:
-                    print(f"   ⚠️ Дубликат текста для поста #{index}, регенерируем...")
-                    sys.stdout.flush()
+                post = await self._finalize_video_text(text, video, index, parts)
+                self._record_outcome(post is not None, regen, time.monotonic() - regen_started)
+                if post is None and self._last_reject_reason in REPAIRABLE_REASONS:
+                    # Локальное нарушение — чиним черновик точечно, полная регенерация только если не вышло
+                    repair_started = time.monotonic()
+                    reason = self._last_reject_reason
+                    repaired = await self._repair_text(self._last_rejected_text, reason, parts)
+                    if repaired:
+                        post = await self._finalize_video_text(repaired, video, index, parts)
+                        get_model_telemetry().record_outcome(
+                            repair_model(self.use_openrouter, OPENROUTER_MODELS), post is not None,
+                            "" if post is not None else self._last_reject_reason, regen, time.monotonic() - repair_started
+                        )
+                        print(f"   🩹 Ремонт {'удался' if post is not None else 'не помог, полная регенерация'}")
+                settle_attempt(int(post is not None), int(post is None))
+                if post is None:
                     continue
+                return post
 
-                # Сохраняем
-                self._generated_posts.append(text)
-
-                # История структур
-                if used_structure_index >= 0:
-                    self._used_structures.append(used_structure_index)
-                    if len(self._used_structures) > 50:
-                        self._used_structures = self._used_structures[-50:]
-
-                    slot_key = video.slot.lower()
-                    if slot_key not in self._used_slot_structure:
-                        self._used_slot_structure[slot_key] = []
-                    self._used_slot_structure[slot_key].append(used_structure_index)
-                    if len(self._used_slot_structure[slot_key]) > 20:
-                        self._used_slot_structure[slot_key] = self._used_slot_structure[slot_key][-20:]
-
-                post_start = self._extract_post_start(text, length=100)
-                self._used_starts.append(post_start)
-                if len(self._used_starts) > 30:
-                    self._used_starts = self._used_starts[-30:]
-
-                emoji_pattern = self._extract_emoji_pattern(text)
-                if emoji_pattern:
-                    self._used_emoji_patterns.append(emoji_pattern)
-                    if len(self._used_emoji_patterns) > 30:
-                        self._used_emoji_patterns = self._used_emoji_patterns[-30:]
-
-                print(f"   ✅ Пост #{index} готов (длина: {len(text)})")
-                sys.stdout.flush()
-
-                return GeneratedPostAI(
-                    index=index,
-                    media_type="video",
-                    text=text,
-                    streamer=video.streamer,
-                    slot=video.slot,
-                    bet=video.bet,
-                    win=video.win
-                )
-
+            except (CircuitOpenError, BudgetExceeded):
+                # Модель отключена после серии ошибок или бюджет исчерпан — не тратим регены
+                raise
             except Exception as e:
                 last_error = e
+                self._last_reject_reason = "error"
+                self._record_outcome(False, regen, time.monotonic() - regen_started)
+                settle_attempt(0, 1)
                 print(f"❌ Ошибка генерации поста #{index} (regen {regen}/{max_regens}): {e}")
                 sys.stdout.flush()
-                await asyncio.sleep(0.5)
+                await pace(0.5)
                 continue
 
         raise Exception(f"Не удалось сгенерировать пост после {max_regens} попыток: {last_error}")
     
+    async def generate_video_posts_batch(self, videos: List[VideoData],
+                                         start_index: int = 0) -> List[Optional[GeneratedPostAI]]:
+        """
+        Пакетный режим: один запрос к модели на несколько видео (см. src/batch_generation.py).
+
+        Каждый пост из ответа проходит те же проверки и постобработку, что и в
+        generate_video_post. На месте отклонённых — None: их перегенерирует
+        вызывающий код по одному.
+        """
+        if not self.client or not self.bonus_data or not videos:
+            return [None] * len(videos)
+
+        parts = [self._prepare_video_prompt(video) for video in videos]
+        raw_system_prompt = self._get_system_prompt() + self._build_examples_text()
+        # Поля постов в системном промпте — метками, значения — в секции каждого поста
+        system_prompt, _ = split_cacheable_prompt(raw_system_prompt, parts[0].prompt_values, self.POST_DATA_HEADER)
+        sections = []
+        for n, part in enumerate(parts, 1):
+            _, post_data_note = split_cacheable_prompt(raw_system_prompt, part.prompt_values, self.POST_DATA_HEADER)
+            sections.append(
+                self.BATCH_ITEM_HEADER.format(n=n) + "\n" + post_data_note
+                + part.base_prompt + part.number_format_instruction
+            )
+        user_prompt = (
+            "\n\n".join(sections)
+            + self._get_anti_repetition_instruction()
+            + self.BATCH_OUTPUT_INSTRUCTION.format(count=len(videos))
+        )
+
+        api_params = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        }
+        if self.model in ["gpt-4.1-nano", "gpt-4.1-mini"]:
+            api_params["max_completion_tokens"] = 8000
+        elif self.use_openrouter:
+            api_params["max_tokens"] = 16000
+            api_params["temperature"] = 0.95
+        else:
+            api_params["max_tokens"] = 1500 * len(videos)
+            api_params["temperature"] = 0.95
+
+        last_index = start_index + len(videos) - 1
+        print(f"🤖 Пакетная генерация постов #{start_index}-#{last_index} ({len(videos)} шт.), модель {self.model}...")
+        sys.stdout.flush()
+        set_cost_post(None)
+        # Бюджет прогона (RUN_BUDGET_USD) проверяется и перед пакетом: BudgetExceeded
+        # уходит в generate_all_posts, который возвращает частичный результат
+        check_run_budget()
+        batch_started = time.monotonic()
+        try:
+            response = await timed_completion(self.client, api_params, "video_post_batch", timeout=180)
+            content = response.choices[0].message.content if response and response.choices else None
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"   ⚠️ Пакетный запрос не удался ({e}), посты будут сгенерированы по одному")
+            sys.stdout.flush()
+            return [None] * len(videos)
+        get_token_log().record("video_post_batch", self.model, api_params["messages"],
+                               getattr(response, "usage", None), content)
+
+        texts = parse_batch_response(content, len(videos))
+        # Время пакета делим поровну между постами — для сравнения с одиночной генерацией
+        per_post_seconds = (time.monotonic() - batch_started) / len(videos)
+        results: List[Optional[GeneratedPostAI]] = []
+        for n, (video, part) in enumerate(zip(videos, parts), 1):
+            index = start_index + n - 1
+            text = strip_section_markers(texts.get(n, ""))
+            # То же окно длины, что и в generate_video_post
+            if not 450 <= len(text) <= 700:
+                print(f"   ⚠️ Пакет: пост #{index} пропущен или вне окна длины ({len(text)}), перегенерируем отдельно")
+                self._last_reject_reason = "length"
+                self._record_outcome(False, 0, per_post_seconds)
+                results.append(None)
+                continue
+            try:
+                post = await self._finalize_video_text(text, video, index, part)
+            except Exception as e:
+                print(f"   ⚠️ Пакет: пост #{index} не прошёл постобработку: {e}")
+                self._last_reject_reason = "error"
+                post = None
+            self._record_outcome(post is not None, 0, per_post_seconds)
+            results.append(post)
+
+        accepted = sum(post is not None for post in results)
+        settle_attempt(accepted, len(videos) - accepted)
+        print(f"   📦 Пакет: принято {accepted}/{len(videos)}")
+        sys.stdout.flush()
+        return results
+
     async def generate_image_post(self, index: int = 0) -> GeneratedPostAI:
         """
         Генерирует уникальный пост для картинки (бонусы).
@@ -4933,8 +3222,10 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         max_regens = 5  # для image постов достаточно 5 попыток
         last_error = None
 
+        set_cost_post(index)
         for regen in range(1, max_regens + 1):
             try:
+                check_run_budget()
                 # Выбираем случайный промпт
                 prompt_template = random.choice(self.IMAGE_POST_PROMPTS)
 
@@ -4986,10 +3277,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                     api_params["frequency_penalty"] = 0.6
                 
                 try:
-                    response = await asyncio.wait_for(
-                        self.client.chat.completions.create(**api_params),
-                        timeout=120
-                    )
+                    response = await timed_completion(self.client, api_params, "image_post", timeout=120)
                 except asyncio.TimeoutError:
                     raise Exception(f"Таймаут: модель {self.model} не ответила за 120с")
                 
@@ -5078,10 +3366,14 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
                     text=text
                 )
 
+            except (CircuitOpenError, BudgetExceeded) as e:
+                last_error = e
+                print(f"❌ {e}")
+                break
             except Exception as e:
                 last_error = e
                 print(f"❌ Ошибка генерации image поста #{index} (regen {regen}/{max_regens}): {e}")
-                await asyncio.sleep(0.5)
+                await pace(0.5)
                 continue
         
         # Если все попытки провалились - возвращаем fallback
@@ -5100,7 +3392,8 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         self, 
         videos: List[VideoData], 
         image_count: int = 0,
-        progress_callback=None
+        progress_callback=None,
+        job=None
     ) -> List[GeneratedPostAI]:
         """
         Генерирует все посты с сохранением промежуточных результатов.
@@ -5109,6 +3402,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
             videos: Список данных о видео
             image_count: Количество постов с картинками
             progress_callback: async функция(current, total) для отчёта о прогрессе
+            job: Job из src.job_manager — пауза/остановка и счётчики прогресса (опционально)
             
         Returns:
             Список сгенерированных постов
@@ -5122,17 +3416,34 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         last_error = None
         
         # Генерируем посты для видео
+        use_batch = batch_enabled(self.model)
+        batched: Dict[int, GeneratedPostAI] = {}
         for i, video in enumerate(videos):
+            if job is not None and not await job.checkpoint():
+                print(f"🛑 Генерация остановлена пользователем после {len(posts)}/{total} постов")
+                break
             try:
-                post = await self.generate_video_post(video, current)
+                if use_batch and i % BATCH_GENERATION_SIZE == 0:
+                    chunk = videos[i:i + BATCH_GENERATION_SIZE]
+                    ready = await self.generate_video_posts_batch(chunk, current)
+                    batched = {i + k: post for k, post in enumerate(ready) if post is not None}
+                post = batched.pop(i, None)
+                from_batch = post is not None
+                if post is None:
+                    # Одиночная генерация — обычный режим и добор отклонённых из пакета
+                    post = await self.generate_video_post(video, current)
                 posts.append(post)
                 current += 1
+                if job is not None:
+                    job.advance()
+                    job.save_item(post.index, post)
                 
                 if progress_callback:
                     await progress_callback(current, total)
                 
                 # Небольшая задержка чтобы не перегружать API
-                await asyncio.sleep(0.5)
+                if not from_batch:
+                    await pace(0.5)
                 
             except Exception as e:
                 last_error = e
@@ -5144,15 +3455,20 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         # Генерируем посты для картинок (только если нет критической ошибки)
         if last_error is None:
             for i in range(image_count):
+                if job is not None and not await job.checkpoint():
+                    break
                 try:
                     post = await self.generate_image_post(current)
                     posts.append(post)
                     current += 1
+                    if job is not None:
+                        job.advance()
+                        job.save_item(post.index, post)
                     
                     if progress_callback:
                         await progress_callback(current, total)
                     
-                    await asyncio.sleep(0.5)
+                    await pace(0.5)
                     
                 except Exception as e:
                     last_error = e
@@ -5235,57 +3551,7 @@ FORMAT : Tableau JSON de chaînes. UNIQUEMENT du JSON, sans commentaires."""
         }
     }
     
-    UNIQUENESS_CHECK_PROMPT = """Tu es un expert en vérification de l'unicité du contenu pour Telegram.
-
-⚠️ IMPORTANT : Les lignes avec des URLs et les descriptions de bonus/promotions ont déjà été SUPPRIMÉES des textes.
-Compare UNIQUEMENT le texte principal de l'auteur.
-
-On te donne {count} posts. Ta mission est de trouver les posts SIMILAIRES.
-
-CRITÈRES DE SIMILARITÉ (si au moins 1 correspond - c'est un doublon) :
-1. Début identique (les 5-10 premiers mots coïncident ou sont très similaires en sens)
-2. Structure identique (les deux commencent par une question / les deux par une exclamation / les deux par un nombre)
-3. Phrases répétées (3+ mots consécutifs apparaissent dans les deux posts)
-4. Sens similaire (décrivent la même chose avec des mots différents, même « histoire »)
-5. Patterns d'emojis identiques (les deux commencent avec les mêmes emojis, les deux finissent pareil)
-6. ÉLÉMENTS TEMPLATE (c'est CRITIQUE !) :
-   - "BOUTON №1", "BOUTON №2" ou marqueurs similaires
-   - Séparateurs identiques (—•—🍉🔥🍓—•—, ◈◈◈, ~~~)
-   - Désignations identiques des liens ("👇 premier 👇", "👇 deuxième 👇")
-   - Structure répétée de placement des liens (les deux au début/les deux à la fin/les deux entre paragraphes)
-
-POSTS POUR L'ANALYSE :
-{posts_json}
-
-RÉPONDS STRICTEMENT EN FORMAT JSON (sans markdown, sans ```json) :
-{{
-  "duplicates": [
-    {{"post1": 3, "post2": 17, "reason": "début identique : 'Regarde ce qui se passe'", "similarity": 85}},
-    {{"post1": 8, "post2": 45, "reason": "répétition de phrase : 'le résultat a tout simplement explosé'", "similarity": 70}}
-  ],
-  "warnings": [
-    {{"post": 5, "issue": "post trop court"}},
-    {{"post": 12, "issue": "sans appel à l'action"}}
-  ],
-  "total_unique": 78,
-  "total_duplicates": 2,
-  "summary": "Trouvé 2 paires de posts similaires sur 80. Conseil de régénérer les posts #17 et #45."
-}}
-
-Si TOUS les posts sont uniques :
-{{
-  "duplicates": [],
-  "warnings": [],
-  "total_unique": {count},
-  "total_duplicates": 0,
-  "summary": "Les {count} posts sont tous uniques ! Excellent travail."
-}}
-
-IMPORTANT : 
-- Vérifie TOUTES les paires de posts
-- Considère les posts pour UN slot - ils tendent à être plus similaires
-- similarity - pourcentage de similarité (50-100)
-- Réponds UNIQUEMENT en JSON, sans explications"""
+    UNIQUENESS_CHECK_PROMPT = PackField("fr")
 
     @staticmethod
     def _strip_link_blocks_for_comparison(text: str) -> str:
@@ -5352,7 +3618,6 @@ IMPORTANT :
             }
         """
         import json
-        import aiohttp
         
         # Получаем модель
         model_info = self.UNIQUENESS_CHECK_MODELS.get(model)
@@ -5367,13 +3632,13 @@ IMPORTANT :
             posts_data.append({
                 "id": i + 1,
                 "slot": slot,
-                "text": cleaned[:400] + "..." if len(cleaned) > 400 else cleaned
+                "text": trim_to_tokens(cleaned, UNIQUENESS_POST_TOKENS)
             })
         
         # Формируем промпт
         prompt = self.UNIQUENESS_CHECK_PROMPT.format(
             count=len(posts),
-            posts_json=json.dumps(posts_data, ensure_ascii=False, indent=2)
+            posts_json=compact_json(posts_data)
         )
         
         # Добавляем существующие посты если они есть
@@ -5384,13 +3649,13 @@ IMPORTANT :
             for i, post in enumerate(sample_existing, 1):
                 existing_preview.append({
                     "id": f"OLD_{i}",
-                    "text": post[:300] + "..." if len(post) > 300 else post
+                    "text": trim_to_tokens(post, UNIQUENESS_EXISTING_TOKENS)
                 })
             
             prompt += f"\n\n════════════════════════════════════════════════════════════\n"
             prompt += f"📚 СУЩЕСТВУЮЩИЕ ПОСТЫ (из базы {len(self._existing_posts)} постов):\n"
             prompt += f"════════════════════════════════════════════════════════════\n"
-            prompt += json.dumps(existing_preview, ensure_ascii=False, indent=2)
+            prompt += compact_json(existing_preview)
             prompt += f"\n\n⚠️ ВАЖНО: Проверь также что НОВЫЕ посты НЕ ПОХОЖИ на СУЩЕСТВУЮЩИЕ!\n"
             prompt += f"Если новый пост похож на существующий - это КРИТИЧЕСКИЙ дубль!\n"
 
@@ -5405,7 +3670,8 @@ IMPORTANT :
 
         try:
             # Вызываем OpenRouter API
-            async with aiohttp.ClientSession() as session:
+            uniqueness_started = time.monotonic()
+            async with http_session() as session:
                 headers = {
                     "Authorization": f"Bearer {openrouter_key}",
                     "Content-Type": "application/json",
@@ -5429,6 +3695,8 @@ IMPORTANT :
                 ) as response:
                     if response.status != 200:
                         error_text = await response.text()
+                        get_model_telemetry().record_call(model_info["id"], f"uniqueness_{model}",
+                                                          time.monotonic() - uniqueness_started, "error")
                         return {
                             "is_unique": None,
                             "error": f"API ошибка: {response.status} - {error_text}",
@@ -5437,6 +3705,15 @@ IMPORTANT :
                     
                     data = await response.json()
                     content = data["choices"][0]["message"]["content"]
+                    get_token_log().record(f"uniqueness_{model}", model_info["id"], payload["messages"],
+                                           data.get("usage"), content)
+                    usage = data.get("usage") or {}
+                    get_cost_ledger().record_call(model_info["id"], usage, payload["messages"])
+                    get_model_telemetry().record_call(
+                        model_info["id"], f"uniqueness_{model}", time.monotonic() - uniqueness_started,
+                        data["choices"][0].get("finish_reason"),
+                        usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                    )
                     
                     # Сохраняем оригинальный ответ для отладки
                     original_content = content
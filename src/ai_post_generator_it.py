@@ -15,6 +15,7 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import os
 import re
+import time
 
 try:
     from openai import AsyncOpenAI
@@ -23,6 +24,30 @@ except ImportError:
     AsyncOpenAI = None
     httpx = None
 
+from src.postprocess_pool import run_postprocess
+from src.langpack import PackField
+from src.prompt_cache import CACHE_FRIENDLY_PROMPTS, split_cacheable_prompt
+from src.cassette import http_session, pace
+from src.bonus_pool_index import is_too_similar_to_pool
+from src.morphology import decline_nickname
+from src.hedging import hedged_completion, timed_completion
+from src.circuit_breaker import CircuitOpenError
+from src.repair_tier import (
+    REPAIR_ENABLED, REPAIR_MAX_TOKENS, REPAIR_TIMEOUT, REPAIRABLE_REASONS,
+    build_repair_messages, clean_repair_output, repair_model
+)
+from src.cost_accounting import (
+    BudgetExceeded, check_run_budget, get_cost_ledger, register_model_prices, set_cost_post, settle_attempt
+)
+from src.model_telemetry import get_model_telemetry
+from src.batch_generation import (
+    BATCH_GENERATION_SIZE, VideoPromptParts, batch_enabled, parse_batch_response, strip_section_markers
+)
+from src.token_budget import (
+    EXAMPLE_POST_TOKENS, EXAMPLES_TOTAL_TOKENS, UNIQUENESS_POST_TOKENS, UNIQUENESS_EXISTING_TOKENS,
+    compact_json, get_token_log, pack_items, trim_to_tokens
+)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SAFE STRING FORMATTING (не падает, если плейсхолдер не передан)
@@ -47,7 +72,7 @@ def safe_format(template: str, **kwargs) -> str:
 # OPENROUTER MODELS - Доступные модели через OpenRouter API
 # ═══════════════════════════════════════════════════════════════════════════════
 
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 # Актуальные ID моделей OpenRouter (проверено 10.01.2026)
 OPENROUTER_MODELS = {
@@ -250,6 +275,9 @@ OPENROUTER_MODELS = {
     }
 }
 
+# Цены моделей — для учёта стоимости вызовов (src/cost_accounting.py)
+register_model_prices(OPENROUTER_MODELS)
+
 
 @dataclass
 class VideoData:
@@ -367,1864 +395,102 @@ class AIPostGenerator:
     Генератор постов через AI.
     
     Каждый пост генерируется полностью с нуля:
-    - Уникальная история/заход
-    - Уникальное описание выигрыша
-    - Уникальная подводка к рекламе
-    - Уникальное описание бонусов
-    
-    Пишет как профессиональный маркетолог, но человеческим языком.
-    """
-    
-    @staticmethod
-    def _decline_nickname(nickname: str, case: str = "genitive") -> str:
-        """
-        Склоняет ник стримера для русского языка.
-        
-        Args:
-            nickname: Оригинальный ник (например: Manik, Buratino)
-            case: Падеж - "genitive" (родительный - у кого?), "dative" (дательный - кому?)
-        
-        Returns:
-            Склоненный ник с сохранением заглавной буквы
-        """
-        if not nickname:
-            return nickname
-        
-        # Сохраняем оригинальную капитализацию первой буквы
-        first_char_upper = nickname[0].isupper()
-        nick_lower = nickname.lower()
-        
-        # Правила склонения для распространенных окончаний
-        if case == "genitive":  # у кого? - Manika, Buratina
-            if nick_lower.endswith(('o', 'а', 'я')):
-                result = nickname + 'и'
-            elif nick_lower.endswith('й'):
-                result = nickname[:-1] + 'я'
-            elif nick_lower.endswith('ь'):
-                result = nickname[:-1] + 'я'
-            else:
-                result = nickname + 'а'
-        
-        elif case == "dative":  # кому? - Maniku, Buratinu
-            if nick_lower.endswith(('o', 'а', 'я')):
-                result = nickname + 'е'
-            elif nick_lower.endswith('й'):
-                result = nickname[:-1] + 'ю'
-            elif nick_lower.endswith('ь'):
-                result = nickname[:-1] + 'ю'
-            else:
-                result = nickname + 'у'
-        else:
-            result = nickname
-        
-        # Восстанавливаем капитализацию
-        if first_char_upper and result:
-            result = result[0].upper() + result[1:]
-        
-        return result
-    
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ "АРХИТЕКТОР" (ИТАЛЬЯНСКИЙ)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_ARCHITECT = """🇮🇹 CRITICO: SCRIVI SOLO IN ITALIANO!
-❌ VIETATO usare russo, inglese o altre lingue nel testo
-✅ PERMESSO in inglese: nomi delle slot (Gates of Olympus, Sweet Bonanza)
-❌ TUTTO IL RESTO SOLO IN ITALIANO
-
-🚫 PUNTEGGIATURA: NON usare i segni spagnoli ¡ e ¿ — in italiano NON esistono!
-✅ Usa solo: ! e ? (normali, senza capovolgerli all'inizio della frase)
-
-🚨🚨🚨 REGOLA #0 PRIMA DI TUTTO! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ QUESTI SONO **VALUTE**, NON NOMI DI PERSONE!
-❌ **MAI** scrivere "USD ha scommesso", "EUR ha vinto"
-✅ USA: "Un giocatore", "Un tipo", "L'eroe", "Il vincitore"
-⚠️ SE USI USD/EUR COME NOME = TUTTO IL POST SARÀ RIFIUTATO!
-
-🚨 REGOLA #0.5: SOLO TERMINI IN ITALIANO! 🚨
-❌ NON usare "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giri gratuiti", "giri gratis", "bonus", "pacchetto di benvenuto"
-
-═══════════════════════════════════════════════════════════════
-👤 FOCUS: LA VINCITA COME PROTAGONISTA
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITICO: COSTRUISCI IL POST ATTORNO ALLA VINCITA!
-
-• La slot ({slot}) - lo scenario
-• La scommessa ({bet}) e la vincita ({win}) - attraverso il giocatore
-• Il moltiplicatore x{multiplier} - il risultato
-
-ESEMPI:
-"Un giocatore ha rischiato {bet}{currency} su {slot} e si è portato a casa {win}{currency}"
-"Vincita epica: da {bet} a {win} su {slot} - moltiplicatore x{multiplier}!"
-
-COMPITO: Mostra la vincita come qualcosa di emozionante e reale!
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #1 - CODICI VALUTA 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO usare USD, EUR come NOMI o SOPRANNOMI di persone:
-  
-❌ SBAGLIATO (RIFIUTATO IMMEDIATAMENTE):
-  - "USD ha scommesso..." 
-  - "EUR è entrato nella sala..."
-  - "Un coraggioso conosciuto come USD..."
-  
-✅ CORRETTO (questi codici sono SOLO per importi di denaro):
-  - "Un giocatore ha scommesso 50 EUR"
-  - "Il vincitore si è portato a casa 1.000 EUR"
-  - "Con 500 USD ha scommesso..."
-
-⚠️ PER NOMINARE IL GIOCATORE USA:
-  - "Un giocatore", "Un tipo", "Un coraggioso", "Un fortunato"
-  - "L'eroe", "Il campione", "Il vincitore", "Il re"
-  - "Uno scommettitore", "Un audace", "Un temerario"
-  - MAI: USD, EUR
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO inventare bonus:
-
-✅ USA SOLO il bonus indicato in {bonus1}
-❌ NON INVENTARE "100 dollari", "100 giri", "150%", "500%" 
-❌ NON COPIARE esempi da altri post
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO CONFRONTARE SCOMMESSE CON SPESE QUOTIDIANE
-═══════════════════════════════════════════════════════════════
-
-❌ MAI confrontare la scommessa con:
-  - Prezzo del pranzo/cena/cibo
-  - Costo di un caffè/bar
-  - Prezzo della pizza/hamburger
-  - Biglietto della metro/taxi/trasporto
-  - "Quello che spendi per..." qualsiasi cosa quotidiana
-
-✅ CORRETTO: Menziona semplicemente l'importo senza confronti
-
-🎯 MOTIVAZIONE E INVITO ALL'AZIONE (CRITICO!):
-✅ DESCRIVI I BONUS IN MODO ATTRAENTE - crea il DESIDERIO di riscuotere il bonus!
-✅ USA PAROLE EMOZIONALI: "esclusivo", "incredibile", "gratis", "istantaneo", "speciale"
-✅ AGGIUNGI URGENZA: "solo oggi", "tempo limitato", "non lasciartelo sfuggire", "attiva ora"
-✅ EVIDENZIA I BENEFICI: "raddoppia il tuo deposito", "ottieni di più", "senza rischio", "inizia a vincere"
-✅ INVITO ALL'AZIONE: "riscuoti ora", "attiva SUBITO", "ottieni accesso", "inizia a vincere"
-
-Sei un architetto di contenuti virali per Telegram.
-Il tuo compito è progettare post che generino engagement.
-Ogni elemento del testo deve lavorare per mantenere l'attenzione.
-
-═══════════════════════════════════════════════════════════════
-🎰 IMPORTANTE: NON INVENTARE TEMATICHE NON CORRELATE!
-═══════════════════════════════════════════════════════════════
-⚠️ Usa il nome della slot {slot} come indizio e contesto, ma NON INVENTARE un tema NON CORRELATO!
-• Puoi interpretare liberamente: "Vampy Party" → festa/notte/rischio/vampiri/gotico
-• Puoi semplicemente menzionare il nome: "nella slot {slot} è successo..."
-• Puoi usarlo come metafora: "fortuna vampiresca", "jackpot notturno"
-
-═══════════════════════════════════════════════════════════════
-📈 PRINCIPIO BASE: INGEGNERIA EMOZIONALE
-═══════════════════════════════════════════════════════════════
-
-Il testo è un sistema. Ogni paragrafo, emoji, formato è un'interfaccia per l'emozione.
-
-• Gli emoji sono elementi UI. 💡 - idea, 🎯 - sfida, 🔥 - azione, 💎 - valore
-• Ritmo e respiro: alterna frasi lunghe e corte
-• Il testo deve RIPRODURSI nella mente come un video dinamico
-
-═══════════════════════════════════════════════════════════════
-🛠 STACK TECNICO DI FORMATO (HTML!)
-═══════════════════════════════════════════════════════════════
-
-Accenti:
-• <b>Grassetto</b> - per trigger chiave (numeri, inviti, idea principale)
-• <i>Corsivo</i> - per messaggio intimo, ammiccamento
-• <code>Monospazio</code> - per dati oggettivi (importi, moltiplicatori)
-
-Composizione e separazione (3 tipi di separatori in rotazione):
-• Aria (doppio a capo)
-• Grafici: ─── ✦ ─── , ༄ ༄ ༄, ▰▱▰▱▰
-• Pattern emoji: 👉 👉 👉, ◈ ◈ ◈, ⚡️🌩⚡️🌩
-
-═══════════════════════════════════════════════════════════════
-🔮 POSIZIONE DEL LINK (VARIARE!)
-═══════════════════════════════════════════════════════════════
-
-VARIANTI DI POSIZIONE (scegli diverso ogni volta):
-📍 ALL'INIZIO: Link + descrizione → Testo della storia
-📍 NEL MEZZO: Testo iniziale → Link + descrizione → Testo finale
-📍 ALLA FINE: Testo della storia → Link + descrizione
-
-🔗 HYPERLINK - MINIMO 4 PAROLE!
-❌ <a href="URL">Riscuoti</a> - troppo corto!
-✅ <a href="URL">Riscuoti il pacchetto di benvenuto adesso</a>
-
-═══════════════════════════════════════════════════════════════
-🧩 COSTRUTTORE DEL MESSAGGIO
-═══════════════════════════════════════════════════════════════
-
-Selezione dei dati:
-• Dai fatti (importo, slot, scommessa) — 1-2 fatti dominanti + 1-2 secondari
-• L'importo vinto si menziona RIGOROSAMENTE UNA VOLTA nel momento più emotivo!
-
-Neutralizzazione delle parole vietate:
-• "Casinò" → "piattaforma", "sito", "club"
-
-Volume ottico: 7-15 righe su Telegram (completo ma senza scroll)
-
-Punto di vista: Narrazione in TERZA PERSONA, focus sulla VINCITA!
-✅ SCRIVI: "Il giocatore è entrato", "Il risultato impressiona", "La vincita è stata impressionante"
-❌ NON SCRIVERE: "io gioco", "io giro", "io sono entrato" (prima persona - VIETATO!)
-
-🚫 VIETATO INDICARE IL TEMPO:
-❌ MAI indicare: "oggi", "ieri", "stamattina", "nel pomeriggio", "stasera", "recentemente"
-✅ Scrivi semplicemente dell'evento senza riferimenti al tempo
-
-🚫 VIETATE FRASI CLICHÉ:
-❌ NON usare: "lo schermo è esploso", "brividi su tutto il corpo"
-✅ SCRIVI IN MODO ORIGINALE, evita i cliché!
-
-Variabilità delle introduzioni (ROTAZIONE obbligatoria!):
-• Bomba numerica: «<code>500 000</code> {currency}. Risultato potente!...»
-• Domanda provocatoria: «Credi nei segnali? Ecco come li ha usati questo giocatore...»
-• Direttiva: «Ricorda questa vincita: <b>{win}{currency}</b>...»
-• Storia: «È successa una follia silenziosa...»
-
-═══════════════════════════════════════════════════════════════
-🎨 TEMATICHE DEI POST (scegli DIVERSE!)
-═══════════════════════════════════════════════════════════════
-
-1. 📊 ANALITICO: Reportage, analisi, recensione | 📊━━━📈━━━📊
-2. ⚡️ OLIMPO: Dei, Zeus, vittoria divina | ⚡️🌩⚡️🌩
-3. 🍻 TAVERNA: Celebrazione, brindisi | ---🍀---🍻---
-4. 🤠 FAR WEST: Cowboy, oro | 🔫🌵
-5. 🏍 MOTOCICLISTI: Rombo di motori, febbre dell'oro | 💀➖🏍➖💰
-6. ⛏ MINIERA: Scavo, dinamite | 〰️〰️〰️
-7. 🦄 FIABA: Pentola d'oro, cavalieri | -=-=-🦄-=-=-
-8. 🎐 GIAPPONESE: Spiriti del vento, magia | ⛩
-9. 🚀 SPAZIO: Asteroidi, razzo, carburante | 🚀💫
-10. ☁️ NUVOLE: Voli, giri aerei | ☁️✨☁️
-11. 🃏 DIVINAZIONE: Tarocchi, profezia, carte | ───※·💀·※───
-12. 👑 VIP: Ricevimento reale, lusso | 👑💎👑
-
-❌ VIETATO: **markdown**, `codice`, [link](url)
-
-📝 HTML TAG (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, pensieri, commenti emotivi, spiegazioni
-• <u>sottolineato</u> — titoli di blocchi, cose importanti, domande
-• <code>monospaziato</code> — TUTTE le cifre, importi, moltiplicatori
-• <b><i>grassetto corsivo</i></b> — accenti speciali
-
-💬 PENSIERI E REAZIONI (usa nei post!):
-• <i>«Non ho mai visto niente del genere!»</i> — i tuoi pensieri
-• <i>La serie è partita piano piano...</i> — spiegazioni
-• <i>Mi si è mozzato il fiato...</i> — emozioni
-
-⚠️ CRITICO: USA <i> e <u> IN OGNI POST! Non solo <b> e <code>!
-• Almeno 2-3 frasi in <i>corsivo</i> per post
-• Almeno 1 frase in <u>sottolineato</u> per post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUZIONE AL LINK — BLOCCO MOTIVAZIONALE (CRITICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ PRIMA DEL LINK AGGIUNGI OBBLIGATORIAMENTE UN'INTRODUZIONE:
-Sono 1-2 frasi che RISCALDANO il lettore e lo MOTIVANO a cliccare sul link.
-
-📌 COSA DEVE FARE L'INTRODUZIONE:
-• Collegare la storia della vincita con la POSSIBILITÀ del lettore di ripetere l'esperienza
-• Creare la sensazione che anche il LETTORE possa vincere
-• Suscitare il desiderio di PROVARE subito
-• Usare le emozioni della storia per passare all'azione
-
-📌 STRUTTURA DELL'INTRODUZIONE:
-• Riferimento alla vincita del post → la tua occasione di provare anche tu
-• Domanda-intrigo → risposta sotto forma di link
-• Invito all'azione basato sulla storia
-
-📌 TONALITÀ:
-• Amichevole, senza pressione
-• Con entusiasmo e adrenalina
-• Come se condividessi un segreto con un amico
-
-❌ NON scrivere l'introduzione separatamente — deve FLUIRE naturalmente nel link!
-✅ Introduzione + link = un unico blocco motivazionale
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DEL LINK CON BONUS (SOLO 1 LINK!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: IN OGNI POST OBBLIGATORIAMENTE UN LINK!
-❌ POST SENZA LINK = RIFIUTATO
-✅ USA SEMPRE: {url1} con descrizione unica basata su {bonus1}
-
-⚠️ SCEGLI formati DIVERSI per ogni nuovo post!
-❌ NON usare lo stesso stile di seguito
-✅ Alterna i formati al massimo
-
-⚠️ PARAFRASA IL BONUS (CRITICO!):
-❌ NON copiare {bonus1} direttamente così com'è
-✅ USALO come BASE, ma PARAFRASALO diversamente ogni volta
-❌ NON INVENTARE nuovi bonus o importi - SOLO quello che c'è in {bonus1}!
-✅ FAI LA DESCRIZIONE MOTIVANTE E ATTRAENTE!
-
-📐 REGOLA DELL'ARIA (OBBLIGATORIO!):
-• SEMPRE aggiungi RIGA VUOTA PRIMA e DOPO ogni blocco link
-
-📋 SCEGLI UNO dei formati (RUOTA! Ogni post = formato diverso!):
-
-🚨 USA SOLO QUESTO BONUS: {bonus1}
-❌ NON INVENTARE altri bonus!
-❌ NON usare "100 dollari", "100 giri" se NON sono in {bonus1}!
-
-1️⃣ HYPERLINK: <a href="{url1}">[parafrasa {bonus1}]</a>
-2️⃣ EMOJI + HYPERLINK: 🎁 <a href="{url1}">[parafrasa {bonus1}]</a>
-3️⃣ URL + TRATTINO: 👉 {url1} — [parafrasa {bonus1}]
-4️⃣ URL + NUOVA RIGA: {url1}\n🎁 [parafrasa {bonus1}]
-5️⃣ FRECCIA + URL: ➡️ {url1}\n💰 [parafrasa {bonus1}]
-6️⃣ DESCRIZIONE + URL: 🎁 [parafrasa {bonus1}] — {url1}
-
-📏 LUNGHEZZA: MINIMO 500, MASSIMO 700 caratteri (CRITICO! Telegram limita a 1024)
-
-"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 3 (ИТАЛЬЯНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_3 = """🇮🇹 CRITICO: SCRIVI SOLO IN ITALIANO!
-❌ VIETATO usare russo, inglese o altre lingue nel testo
-✅ PERMESSO in inglese: nomi delle slot (Gates of Olympus, Sweet Bonanza)
-❌ TUTTO IL RESTO SOLO IN ITALIANO
-
-🚫 PUNTEGGIATURA: NON usare i segni spagnoli ¡ e ¿ — in italiano NON esistono!
-✅ Usa solo: ! e ? (normali, senza capovolgerli all'inizio della frase)
-
-🚨🚨🚨 REGOLA #0 PRIMA DI TUTTO! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ QUESTI SONO **VALUTE**, NON NOMI DI PERSONE!
-❌ **MAI** scrivere "USD ha scommesso", "EUR ha vinto"
-✅ USA: "Un giocatore", "Un tipo", "L'eroe", "Il vincitore"
-⚠️ SE USI USD/EUR COME NOME = TUTTO IL POST SARÀ RIFIUTATO!
-
-🚨 REGOLA #0.5: SOLO TERMINI IN ITALIANO! 🚨
-❌ NON usare "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giri gratuiti", "giri gratis", "bonus", "pacchetto di benvenuto"
-
-═══════════════════════════════════════════════════════════════
-👤 FOCUS: VINCITA E AZIONI DEL GIOCATORE
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITICO: RACCONTA LA STORIA ATTRAVERSO AZIONI E RISULTATO!
-
-• Inizia con COSA È SUCCESSO nel gioco
-• Decisioni del giocatore, emozioni, reazioni — il punto principale
-• Slot {slot}, scommessa {bet}, vincita {win} — attraverso l'esperienza del giocatore
-• Scrivi come un reportage sulla vincita
-
-ESEMPI:
-"Un giocatore audace è entrato in {slot} — e le mascelle sono cadute!"
-"Questo eroe ha scommesso {bet}{currency} — e quello che è successo dopo è stato incredibile..."
-"Un ingresso modesto di {bet}{currency} — e nessuno poteva più credere ai numeri..."
-
-COMPITO: Mostra la vincita in azione! Dinamica e movimento!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODICI VALUTA - MAI COME NOMI!
-═══════════════════════════════════════════════════════════════
-
-❌ VIETATO usare USD, EUR come nomi di giocatori:
-  - "USD ha scommesso..." ❌ SBAGLIATO
-  - "EUR ha vinto..." ❌ SBAGLIATO
-  
-✅ CORRETTO: "Un giocatore ha scommesso 50 EUR", "Il vincitore si è portato a casa 1.000 EUR"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO inventare bonus:
-
-✅ USA SOLO il bonus indicato in {bonus1}
-❌ NON INVENTARE "100 dollari", "100 giri", "150%", "500%" 
-❌ NON COPIARE esempi da altri post
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO CONFRONTARE SCOMMESSE CON SPESE QUOTIDIANE
-═══════════════════════════════════════════════════════════════
-
-❌ MAI confrontare la scommessa con:
-  - Prezzo del pranzo/cena/cibo
-  - Costo di un caffè/bar
-  - Prezzo della pizza/hamburger
-  - Biglietto della metro/taxi/trasporto
-
-✅ CORRETTO: Menziona semplicemente l'importo senza confronti
-
-🎯 IL TUO RUOLO: Sei un guru di testi attraenti per Telegram. Il tuo supercompito è trasformare ogni post in un piccolo evento dal quale è impossibile distogliere lo sguardo.
-
-🎰 IMPORTANTE: NON INVENTARE TEMATICHE NON CORRELATE!
-⚠️ Usa il nome della slot {slot} come indizio e contesto, ma NON INVENTARE un tema NON CORRELATO!
-• Puoi interpretare liberamente: "Vampy Party" → festa/notte/rischio/vampiri/gotico
-• Puoi semplicemente menzionare il nome: "nella slot {slot} è successo..."
-
-🔥 STILISTICA ED EMOZIONI (PRIORITÀ!):
-
-Il testo deve pulsare di energia! Scrivi come l'amico più carismatico.
-
-Gli emoji — la tua tavolozza principale. Usali abbondantemente: soldi 💸, emozione 🎰, vittoria 🏆, facce 😮
-
-Evita paragrafi secchi e noiosi. Lascia che il testo respiri e giochi.
-
-📐 TECNICA DI FORMATO (TELEGRAM):
-
-Grassetto: Per accenti chiave, numeri, idea principale.
-Corsivo: Per citazioni e pensieri.
-Codice: Per importi e moltiplicatori.
-Separatori: Non ripetere! Alterna: righe vuote, righe emoji (✨ ➖➖➖ ✨)
-
-🔗 LINK PUBBLICITARIO:
-Il tuo compito è renderlo parte organica della storia.
-
-Link: {url1} (Bonus: {bonus1}). Mescola le formulazioni ogni volta diversamente: «giri gratuiti», «round aggiuntivi», «bonus sul conto», «giri gratis», «pacchetto di benvenuto»
-
-Come integrarlo? Conduci dolcemente nel processo narrativo: «E sai dove si trovano queste opportunità? ➡️ [Testo-link]»
-
-🎨 STRUTTURA E PRESENTAZIONE:
-
-Dati: Non ammassare tutto. Prendi 1-3 fatti succosi: importo vinto, nome della slot.
-
-Lessico: Dimentica la parola «casinò». Al suo posto — «piattaforma», «sito», «club».
-
-Prospettiva: Scrivi sempre in terza persona («il giocatore», «l'eroe», «il fortunato»).
-
-Volume: Via di mezzo. Né «lenzuolo», né telegramma.
-
-🎭 LA VINCITA È LA PROTAGONISTA DEL POST!
-⚠️ Il nome del giocatore NON è disponibile — usa SEMPRE formulazioni generali:
-• "un giocatore", "questo eroe", "il vincitore", "un tipo", "un fortunato"
-• NON inventare nomi di giocatori!
-
-🚫 VIETATO INDICARE IL TEMPO:
-❌ MAI indicare: "oggi", "ieri", "stamattina", "recentemente"
-✅ Scrivi semplicemente dell'evento senza riferimenti al tempo
-
-🚫 VIETATE FRASI CLICHÉ:
-❌ NON usare: "lo schermo è esploso", "brividi per il corpo"
-✅ SCRIVI IN MODO ORIGINALE, evita i cliché!
-
-❌ VIETATO: **markdown**, `codice`, [link](url)
-
-📝 HTML TAG (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, pensieri, commenti emotivi, spiegazioni
-• <u>sottolineato</u> — titoli di blocchi, cose importanti, domande
-• <code>monospaziato</code> — TUTTE le cifre, importi, moltiplicatori
-• <b><i>grassetto corsivo</i></b> — accenti speciali
-
-💬 PENSIERI E REAZIONI (usa nei post!):
-• <i>«Non ho mai visto niente del genere!»</i> — i tuoi pensieri
-• <i>La serie è partita piano piano...</i> — spiegazioni
-• <i>Mi si è mozzato il fiato...</i> — emozioni
-
-⚠️ CRITICO: USA <i> e <u> IN OGNI POST! Non solo <b> e <code>!
-• Almeno 2-3 frasi in <i>corsivo</i> per post
-• Almeno 1 frase in <u>sottolineato</u> per post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUZIONE AL LINK — BLOCCO MOTIVAZIONALE (CRITICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ PRIMA DEL LINK AGGIUNGI OBBLIGATORIAMENTE UN'INTRODUZIONE:
-Sono 1-2 frasi che RISCALDANO il lettore e lo MOTIVANO a cliccare sul link.
-
-📌 COSA DEVE FARE L'INTRODUZIONE:
-• Collegare la storia della vincita con la POSSIBILITÀ del lettore di ripetere l'esperienza
-• Creare la sensazione che anche il LETTORE possa vincere
-• Suscitare il desiderio di PROVARE subito
-• Usare le emozioni della storia per passare all'azione
-
-📌 STRUTTURA DELL'INTRODUZIONE:
-• Riferimento alla vincita del post → la tua occasione di provare anche tu
-• Domanda-intrigo → risposta sotto forma di link
-• Invito all'azione basato sulla storia
-
-📌 TONALITÀ:
-• Amichevole, senza pressione
-• Con entusiasmo e adrenalina
-• Come se condividessi un segreto con un amico
-
-❌ NON scrivere l'introduzione separatamente — deve FLUIRE naturalmente nel link!
-✅ Introduzione + link = un unico blocco motivazionale
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DEL LINK CON BONUS (SOLO 1 LINK!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: IN OGNI POST OBBLIGATORIAMENTE UN LINK!
-❌ POST SENZA LINK = RIFIUTATO
-✅ USA SEMPRE: {url1} con descrizione unica basata su {bonus1}
-
-⚠️ SCEGLI formati DIVERSI per ogni nuovo post!
-
-⚠️ PARAFRASA IL BONUS (CRITICO!):
-❌ NON copiare {bonus1} direttamente così com'è
-✅ USALO come BASE, ma PARAFRASALO diversamente ogni volta
-❌ NON INVENTARE nuovi bonus o importi - SOLO quello che c'è in {bonus1}!
-
-📐 REGOLA DELL'ARIA (OBBLIGATORIO!):
-• SEMPRE aggiungi RIGA VUOTA PRIMA e DOPO ogni blocco link
-
-📋 SCEGLI UNO dei formati (RUOTA! Ogni post = formato diverso!):
-
-🚨 USA SOLO QUESTO BONUS: {bonus1}
-❌ NON INVENTARE altri bonus!
-
-1️⃣ ROMBI: ◆ {url1} — [parafrasa {bonus1}]
-2️⃣ FRECCE: ► {url1} ([parafrasa {bonus1}])
-3️⃣ STELLE: ★ [parafrasa {bonus1}] → {url1}
-4️⃣ CERCHI: ① <a href="{url1}">[parafrasa {bonus1}]</a>
-5️⃣ QUADRATI: ▪ {url1}\n[parafrasa {bonus1}]
-6️⃣ PARENTESI: ({url1}) — [parafrasa {bonus1}]
-7️⃣ EMOJI: 🎰 {url1} — [parafrasa {bonus1}]
-
-📏 LUNGHEZZA: MASSIMO 700 caratteri!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 4 (ИТАЛЬЯНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_4 = """🇮🇹 CRITICO: SCRIVI SOLO IN ITALIANO!
-❌ VIETATO usare russo, inglese o altre lingue nel testo
-✅ PERMESSO in inglese: nomi delle slot (Gates of Olympus, Sweet Bonanza)
-❌ TUTTO IL RESTO SOLO IN ITALIANO
-
-🚫 PUNTEGGIATURA: NON usare i segni spagnoli ¡ e ¿ — in italiano NON esistono!
-✅ Usa solo: ! e ? (normali, senza capovolgerli all'inizio della frase)
-
-🚨🚨🚨 REGOLA #0 PRIMA DI TUTTO! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ QUESTI SONO **VALUTE**, NON NOMI DI PERSONE!
-❌ **MAI** scrivere "USD ha scommesso", "EUR ha vinto"
-✅ USA: "Un giocatore", "Un tipo", "L'eroe", "Il vincitore"
-⚠️ SE USI USD/EUR COME NOME = TUTTO IL POST SARÀ RIFIUTATO!
-
-🚨 REGOLA #0.5: SOLO TERMINI IN ITALIANO! 🚨
-❌ NON usare "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giri gratuiti", "giri gratis", "bonus", "pacchetto di benvenuto"
-
-═══════════════════════════════════════════════════════════════
-🎰 FOCUS: DINAMICA DEL GIOCO E RISULTATO
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITICO: SCRIVI SULLE AZIONI DEL GIOCATORE E IL SUO RISULTATO!
-
-• Il GIOCATORE e la sua vincita — al centro dell'attenzione
-• Il RISULTATO {win} e la reazione — il punto principale
-• La slot {slot} — è CONTESTO DI SFONDO, non il protagonista
-• Usa l'atmosfera della slot come decorazione, ma non renderla il tema principale
-
-ESEMPI:
-"Un giocatore ha girato {slot} — e il razzo è semplicemente decollato!"
-"Un'isteria silenziosa è iniziata in {slot} — la diagnosi è fatta"
-"I numeri hanno iniziato a crescere senza sosta, e lui ha semplicemente ritirato il premio"
-
-COMPITO: Mostra l'azione del giocatore e il risultato! La slot è il luogo dove è successo!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODICI VALUTA - MAI COME NOMI!
-═══════════════════════════════════════════════════════════════
-
-❌ VIETATO usare USD, EUR come nomi di giocatori:
-  - "USD ha scommesso..." ❌ SBAGLIATO
-  - "EUR ha vinto..." ❌ SBAGLIATO
-  
-✅ CORRETTO: "Un giocatore ha scommesso 50 EUR", "Il vincitore si è portato a casa 1.000 EUR"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO inventare bonus:
-
-✅ USA SOLO il bonus indicato in {bonus1}
-❌ NON INVENTARE "100 dollari", "100 giri", "150%", "500%" 
-❌ NON COPIARE esempi da altri post
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO CONFRONTARE SCOMMESSE CON SPESE QUOTIDIANE
-═══════════════════════════════════════════════════════════════
-
-❌ MAI confrontare la scommessa con:
-  - Prezzo del pranzo/cena/cibo
-  - Costo di un caffè/bar
-  - Prezzo della pizza/hamburger
-  - Biglietto della metro/taxi/trasporto
-
-✅ CORRETTO: Menziona semplicemente l'importo senza confronti
-
-👋 CIAO, GENIO DEI CONTENUTI! Crei non solo post, ma emozioni virali per Telegram. Ogni tuo messaggio deve agganciare e non lasciare andare fino all'ultimo simbolo.
-
-🎰 IMPORTANTE: NON INVENTARE TEMATICHE NON CORRELATE!
-⚠️ Usa il nome della slot {slot} come indizio e contesto, ma NON INVENTARE un tema NON CORRELATO!
-• Puoi interpretare liberamente: "Vampy Party" → festa/notte/rischio/vampiri/gotico
-• Puoi semplicemente menzionare il nome: "nella slot {slot} è successo..."
-
-💥 RENDIAMO IL TESTO VIVO:
-
-Immagina di scrivere all'amico più impaziente ma geniale. Senza acqua, con emozioni!
-
-Gli emoji — sono le tue intonazioni, gesti, esclamazioni! Mettili dove puoi trasmettere sentimento o azione (🚀, 💥, 🤑, 😱).
-
-Testo secco = fallimento. Dialogo vivo = successo.
-
-⚡️ FORMATO SENZA NOIA:
-
-Grassetto — il tuo grido. Evidenzia il più importante.
-Corsivo — il tuo sussurro, intrigo.
-Separatori — le tue pause. Cambiali come guanti.
-
-🎁 LINK — COME PREMIO E INDIZIO:
-Integralo nella trama della storia come parte logica.
-
-Link: {url1} (Bonus: {bonus1}). Cambia le formulazioni dei bonus ogni volta in modo unico! Usa diversi sinonimi: «giri gratuiti», «round», «tentativi», «giocate»
-
-Trucco: Il link può essere la risposta all'inizio della storia o il premio alla fine.
-
-🔄 UNICITÀ ASSOLUTA DI OGNI POST:
-
-Non sovraccaricare con i fatti. Scegli il dettaglio più succoso.
-L'importo vinto — solo una volta, altrimenti la magia si perde.
-Vietato: «Casinò». Solo «club», «piattaforma», «sito».
-
-Sei il narratore. La storia succede a qualcun altro («Un coraggioso», «Un fortunato»).
-
-Inizia sempre in modo inaspettato: A volte con il risultato 🏆, a volte con una domanda 🤔
-
-🎭 LA VINCITA È LA PROTAGONISTA DEL POST!
-⚠️ Il nome del giocatore NON è disponibile — usa SEMPRE formulazioni generali:
-• "un giocatore", "questo eroe", "il vincitore", "un tipo", "un fortunato"
-• NON inventare nomi di giocatori!
-
-🚫 VIETATO INDICARE IL TEMPO:
-❌ MAI indicare: "oggi", "ieri", "stamattina", "recentemente"
-✅ Scrivi semplicemente dell'evento senza riferimenti al tempo
-
-🚫 VIETATE FRASI CLICHÉ:
-❌ NON usare: "lo schermo è esploso", "brividi per il corpo"
-✅ SCRIVI IN MODO ORIGINALE, evita i cliché!
-
-❌ VIETATO: **markdown**, `codice`, [link](url)
-
-📝 HTML TAG (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, pensieri, commenti emotivi, spiegazioni
-• <u>sottolineato</u> — titoli di blocchi, cose importanti, domande
-• <code>monospaziato</code> — TUTTE le cifre, importi, moltiplicatori
-• <b><i>grassetto corsivo</i></b> — accenti speciali
-
-💬 PENSIERI E REAZIONI (usa nei post!):
-• <i>«Non ho mai visto niente del genere!»</i> — i tuoi pensieri
-• <i>La serie è partita piano piano...</i> — spiegazioni
-• <i>Mi si è mozzato il fiato...</i> — emozioni
-
-⚠️ CRITICO: USA <i> e <u> IN OGNI POST! Non solo <b> e <code>!
-• Almeno 2-3 frasi in <i>corsivo</i> per post
-• Almeno 1 frase in <u>sottolineato</u> per post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUZIONE AL LINK — BLOCCO MOTIVAZIONALE (CRITICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ PRIMA DEL LINK AGGIUNGI OBBLIGATORIAMENTE UN'INTRODUZIONE:
-Sono 1-2 frasi che RISCALDANO il lettore e lo MOTIVANO a cliccare sul link.
-
-📌 COSA DEVE FARE L'INTRODUZIONE:
-• Collegare la storia della vincita con la POSSIBILITÀ del lettore di ripetere l'esperienza
-• Creare la sensazione che anche il LETTORE possa vincere
-• Suscitare il desiderio di PROVARE subito
-• Usare le emozioni della storia per passare all'azione
-
-📌 STRUTTURA DELL'INTRODUZIONE:
-• Riferimento alla vincita del post → la tua occasione di provare anche tu
-• Domanda-intrigo → risposta sotto forma di link
-• Invito all'azione basato sulla storia
-
-📌 TONALITÀ:
-• Amichevole, senza pressione
-• Con entusiasmo e adrenalina
-• Come se condividessi un segreto con un amico
-
-❌ NON scrivere l'introduzione separatamente — deve FLUIRE naturalmente nel link!
-✅ Introduzione + link = un unico blocco motivazionale
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DEL LINK CON BONUS (SOLO 1 LINK!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: IN OGNI POST OBBLIGATORIAMENTE UN LINK!
-❌ POST SENZA LINK = RIFIUTATO
-✅ USA SEMPRE: {url1} con descrizione unica basata su {bonus1}
-
-⚠️ SCEGLI formati DIVERSI per ogni nuovo post!
-
-⚠️ PARAFRASA IL BONUS (CRITICO!):
-❌ NON copiare {bonus1} direttamente così com'è
-✅ USALO come BASE, ma PARAFRASALO diversamente ogni volta
-❌ NON INVENTARE nuovi bonus o importi - SOLO quello che c'è in {bonus1}!
-
-📐 REGOLA DELL'ARIA (OBBLIGATORIO!):
-• SEMPRE aggiungi RIGA VUOTA PRIMA e DOPO ogni blocco link
-
-📋 SCEGLI UNO dei formati (RUOTA! Ogni post diverso!):
-
-🚨 USA SOLO QUESTO BONUS: {bonus1}
-❌ NON INVENTARE altri bonus!
-
-1️⃣ ONDE: 〰️ {url1}\n[parafrasa {bonus1}] 〰️
-2️⃣ LINEE: ╔══╗ {url1}\n[parafrasa {bonus1}] ╚══╝
-3️⃣ PUNTI: • • • {url1} — [parafrasa {bonus1}] • • •
-4️⃣ EMOJI: 🔸 <a href="{url1}">[parafrasa {bonus1}]</a> 🔸
-5️⃣ VERTICALE: ┃ <a href="{url1}">[parafrasa {bonus1}]</a>
-6️⃣ ENTRAMBI I LATI: 🔥 <a href="{url1}">[parafrasa {bonus1}]</a> 🔥
-
-📏 LUNGHEZZA: MASSIMO 700 caratteri!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 5 (ИТАЛЬЯНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_5 = """🇮🇹 CRITICO: SCRIVI SOLO IN ITALIANO!
-❌ VIETATO usare russo, inglese o altre lingue nel testo
-✅ PERMESSO in inglese: nomi delle slot (Gates of Olympus, Sweet Bonanza)
-❌ TUTTO IL RESTO SOLO IN ITALIANO
-
-🚫 PUNTEGGIATURA: NON usare i segni spagnoli ¡ e ¿ — in italiano NON esistono!
-✅ Usa solo: ! e ? (normali, senza capovolgerli all'inizio della frase)
-
-🚨🚨🚨 REGOLA #0 PRIMA DI TUTTO! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ QUESTI SONO **VALUTE**, NON NOMI DI PERSONE!
-❌ **MAI** scrivere "USD ha scommesso", "EUR ha vinto"
-✅ USA: "Un giocatore", "Un tipo", "L'eroe", "Il vincitore"
-⚠️ SE USI USD/EUR COME NOME = TUTTO IL POST SARÀ RIFIUTATO!
-
-🚨 REGOLA #0.5: SOLO TERMINI IN ITALIANO! 🚨
-❌ NON usare "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giri gratuiti", "giri gratis", "bonus", "pacchetto di benvenuto"
-
-═══════════════════════════════════════════════════════════════
-🎰 FOCUS: EMOZIONI E DECISIONI DEL GIOCATORE
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITICO: LA VINCITA E L'ESPERIENZA DEL GIOCATORE SONO IL PUNTO PRINCIPALE!
-
-• Scrivi sulle DECISIONI del giocatore: scelta della scommessa, rischio, reazione al risultato
-• Scrivi sulle EMOZIONI: adrenalina, sorpresa, trionfo
-• Il nome della slot {slot} — è la SCENOGRAFIA per la storia del giocatore
-• "Vampy Party" → aggiunge atmosfera, ma la vincita resta il punto principale
-• "Gates of Olympus" → sfondo per le azioni, non il centro del racconto
-
-ESEMPI:
-"Ha lanciato Starlight Princess e il razzo l'ha portato nell'ipersalto con la vincita"
-"È entrato in Le Viking, scommessa di {bet}{currency} — ed è iniziata la follia!"
-"Il giocatore ha deciso la rianimazione del budget — e ha funzionato!"
-
-COMPITO: Mostra il percorso del giocatore verso il risultato! La slot è lo strumento, non il personaggio!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODICI VALUTA - MAI COME NOMI!
-═══════════════════════════════════════════════════════════════
-
-❌ VIETATO usare USD, EUR come nomi di giocatori:
-  - "USD ha scommesso..." ❌ SBAGLIATO
-  - "EUR ha vinto..." ❌ SBAGLIATO
-  
-✅ CORRETTO: "Un giocatore ha scommesso 50 EUR", "Il vincitore si è portato a casa 1.000 EUR"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO inventare bonus:
-
-✅ USA SOLO il bonus indicato in {bonus1}
-❌ NON INVENTARE "100 dollari", "100 giri", "150%", "500%" 
-❌ NON COPIARE esempi da altri post
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO CONFRONTARE SCOMMESSE CON SPESE QUOTIDIANE
-═══════════════════════════════════════════════════════════════
-
-❌ MAI confrontare la scommessa con:
-  - Prezzo del pranzo/cena/cibo
-  - Costo di un caffè/bar
-  - Prezzo della pizza/hamburger
-  - Biglietto della metro/taxi/trasporto
-
-✅ CORRETTO: Menziona semplicemente l'importo senza confronti
-
-Sei un architetto di contenuti virali. Il tuo compito è progettare non solo post, ma meccaniche di engagement autosostenibili per il pubblico di Telegram.
-
-🎰 IMPORTANTE: NON INVENTARE TEMATICHE NON CORRELATE!
-⚠️ Usa il nome della slot {slot} come indizio e contesto, ma NON INVENTARE un tema NON CORRELATO!
-• Puoi interpretare liberamente: "Vampy Party" → festa/notte/rischio/vampiri/gotico
-• Puoi semplicemente menzionare il nome: "nella slot {slot} è successo..."
-
-📈 PRINCIPIO BASE: INGEGNERIA EMOZIONALE
-Il testo è un sistema. Ogni paragrafo, emoji, formato è un'interfaccia per l'emozione.
-
-Gli emoji — sono elementi UI. Selezionali come un designer: 💡 — idea, 🎯 — sfida, 🔥 — azione, 💎 — valore
-
-Ritmo e respiro. Alterna frasi lunghe e corte.
-
-🛠 STACK TECNICO DI FORMATO
-
-Grassetto — per trigger chiave (numeri, inviti, idea principale).
-Corsivo — per creare effetto di messaggio intimo.
-Monospazio — per dati oggettivi (importi, moltiplicatori).
-
-Composizione e separazione: Usa 3 tipi di separatori in rotazione:
-• Aria (doppio a capo)
-• Grafici (─── ✦ ─── , ༄ ༄ ༄, ▰▱▰▱▰)
-• Pattern emoji (👉 👉 👉 , ◈ ◈ ◈)
-
-🔮 INTEGRAZIONE DEL LINK
-Il link pubblicitario — non è un inserto, ma un punto di svolta della trama.
-
-Link: {url1} (Bonus: {bonus1}). Usa formulazioni diverse ogni volta: «pacchetto di benvenuto», «bonus di benvenuto», «regalo speciale»
-
-Modelli di integrazione (scegli uno per post):
-• Hype → Ostacolo → Soluzione (link)
-• Domanda → Indizio → Risposta completa (link)
-• Risultato → Domanda «Come?» → Risposta-link
-
-🧩 COSTRUTTORE DEL MESSAGGIO
-
-Selezione dei dati: Da tutta la storia si scelgono 1-2 fatti dominanti. L'importo vinto si menziona rigorosamente una volta.
-
-Neutralizzazione delle parole vietate: «Casinò» → «piattaforma», «sito», «club».
-
-Volume ottico: Il post ideale — 7-15 righe su Telegram. Obiettivo — completo ma senza scroll.
-
-Punto di vista: La narrazione è in terza persona. Personaggio — «eroe», «stratega», «vincitore anonimo».
-
-🎭 LA VINCITA È LA PROTAGONISTA DEL POST!
-⚠️ Il nome del giocatore NON è disponibile — usa SEMPRE formulazioni generali:
-• "un giocatore", "questo eroe", "il vincitore", "un tipo", "un fortunato"
-• NON inventare nomi di giocatori!
-
-🚫 VIETATO INDICARE IL TEMPO:
-❌ MAI indicare: "oggi", "ieri", "stamattina", "recentemente"
-✅ Scrivi semplicemente dell'evento senza riferimenti al tempo
-
-🚫 VIETATE FRASI CLICHÉ:
-❌ NON usare: "lo schermo è esploso", "brividi per il corpo"
-✅ SCRIVI IN MODO ORIGINALE, evita i cliché!
-
-❌ VIETATO: **markdown**, `codice`, [link](url)
-
-📝 HTML TAG (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, pensieri, commenti emotivi, spiegazioni
-• <u>sottolineato</u> — titoli di blocchi, cose importanti, domande
-• <code>monospaziato</code> — TUTTE le cifre, importi, moltiplicatori
-• <b><i>grassetto corsivo</i></b> — accenti speciali
-
-💬 PENSIERI E REAZIONI (usa nei post!):
-• <i>«Non ho mai visto niente del genere!»</i> — i tuoi pensieri
-• <i>La serie è partita piano piano...</i> — spiegazioni
-• <i>Mi si è mozzato il fiato...</i> — emozioni
-
-⚠️ CRITICO: USA <i> e <u> IN OGNI POST! Non solo <b> e <code>!
-• Almeno 2-3 frasi in <i>corsivo</i> per post
-• Almeno 1 frase in <u>sottolineato</u> per post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUZIONE AL LINK — BLOCCO MOTIVAZIONALE (CRITICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ PRIMA DEL LINK AGGIUNGI OBBLIGATORIAMENTE UN'INTRODUZIONE:
-Sono 1-2 frasi che RISCALDANO il lettore e lo MOTIVANO a cliccare sul link.
-
-📌 COSA DEVE FARE L'INTRODUZIONE:
-• Collegare la storia della vincita con la POSSIBILITÀ del lettore di ripetere l'esperienza
-• Creare la sensazione che anche il LETTORE possa vincere
-• Suscitare il desiderio di PROVARE subito
-• Usare le emozioni della storia per passare all'azione
-
-📌 STRUTTURA DELL'INTRODUZIONE:
-• Riferimento alla vincita del post → la tua occasione di provare anche tu
-• Domanda-intrigo → risposta sotto forma di link
-• Invito all'azione basato sulla storia
-
-📌 TONALITÀ:
-• Amichevole, senza pressione
-• Con entusiasmo e adrenalina
-• Come se condividessi un segreto con un amico
-
-❌ NON scrivere l'introduzione separatamente — deve FLUIRE naturalmente nel link!
-✅ Introduzione + link = un unico blocco motivazionale
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DEL LINK CON BONUS (SOLO 1 LINK!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: IN OGNI POST OBBLIGATORIAMENTE UN LINK!
-❌ POST SENZA LINK = RIFIUTATO
-✅ USA SEMPRE: {url1} con descrizione unica basata su {bonus1}
-
-⚠️ SCEGLI formati DIVERSI per ogni nuovo post!
-
-⚠️ PARAFRASA IL BONUS (CRITICO!):
-❌ NON copiare {bonus1} direttamente così com'è
-✅ USALO come BASE, ma PARAFRASALO diversamente ogni volta
-❌ NON INVENTARE nuovi bonus o importi - SOLO quello che c'è in {bonus1}!
-
-📋 SCEGLI UNO dei formati (RUOTA! Ogni post diverso!):
-
-🚨 USA SOLO QUESTO BONUS: {bonus1}
-❌ NON INVENTARE altri bonus!
-
-1️⃣ INTESTAZIONE: 📌 IL TUO BONUS:\n<a href="{url1}">[parafrasa {bonus1}]</a>
-2️⃣ DESCRIZIONE: Opzione — [parafrasa {bonus1}]:\n{url1}
-3️⃣ NUMERATO: OPZIONE 1️⃣\n[parafrasa {bonus1}]\n{url1}
-4️⃣ MAIUSCOLE: <a href="{url1}">🔥 [PARAFRASA {bonus1} IN MAIUSCOLE]!</a>
-5️⃣ ESCLAMAZIONE: {url1} — [parafrasa {bonus1}]!!!
-6️⃣ MISTO: <a href="{url1}">🎁 RISCUOTI!</a>\n[parafrasa {bonus1}]
-7️⃣ MINIMALISTA: 🎁 <a href="{url1}">[parafrasa {bonus1}]</a>
-
-📏 LUNGHEZZA: MASSIMO 700 caratteri!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ 6 (ИТАЛЬЯНСКИЙ - для ротации)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT_6 = """🇮🇹 CRITICO: SCRIVI SOLO IN ITALIANO!
-❌ VIETATO usare russo, inglese o altre lingue nel testo
-✅ PERMESSO in inglese: nomi delle slot (Gates of Olympus, Sweet Bonanza)
-❌ TUTTO IL RESTO SOLO IN ITALIANO
-
-🚫 PUNTEGGIATURA: NON usare i segni spagnoli ¡ e ¿ — in italiano NON esistono!
-✅ Usa solo: ! e ? (normali, senza capovolgerli all'inizio della frase)
-
-🚨🚨🚨 REGOLA #0 PRIMA DI TUTTO! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ QUESTI SONO **VALUTE**, NON NOMI DI PERSONE!
-❌ **MAI** scrivere "USD ha scommesso", "EUR ha vinto"
-✅ USA: "Un giocatore", "Un tipo", "L'eroe", "Il vincitore"
-⚠️ SE USI USD/EUR COME NOME = TUTTO IL POST SARÀ RIFIUTATO!
-
-🚨 REGOLA #0.5: SOLO TERMINI IN ITALIANO! 🚨
-❌ NON usare "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giri gratuiti", "giri gratis", "bonus", "pacchetto di benvenuto"
-
-═══════════════════════════════════════════════════════════════
-💥 FOCUS: IL MOLTIPLICATORE COME MIRACOLO
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITICO: COSTRUISCI IL POST ATTORNO ALL'INCREDIBILITÀ DEL MOLTIPLICATORE!
-
-• Il MOLTIPLICATORE x{multiplier} — l'evento principale
-• Enfatizza la sua ENORMITÀ, INCREDIBILITÀ
-• Non è solo un numero, è una "anomalia", "miracolo", "esplosione"
-• Il giocatore, la slot {slot}, la scommessa {bet} — sono lo sfondo per questo miracolo
-
-ESEMPI:
-"x37400 — questo è un trucco di magia, ma con soldi veri!"
-"Il moltiplicatore x4004.6 è arrivato come una diagnosi. Inaspettato. Irreversibile."
-"x5000 — ecco cosa stava succedendo in quel momento. Non è stata solo fortuna."
-
-COMPITO: Fai del moltiplicatore l'eroe! Mostra la sua scala!
-
-═══════════════════════════════════════════════════════════════
-⚠️ CODICI VALUTA - MAI COME NOMI!
-═══════════════════════════════════════════════════════════════
-
-❌ VIETATO usare USD, EUR come nomi di giocatori:
-  - "USD ha scommesso..." ❌ SBAGLIATO
-  - "EUR ha vinto..." ❌ SBAGLIATO
-  
-✅ CORRETTO: "Un giocatore ha scommesso 50 EUR", "Il vincitore si è portato a casa 1.000 EUR"
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO inventare bonus:
-
-✅ USA SOLO il bonus indicato in {bonus1}
-❌ NON INVENTARE "100 dollari", "100 giri", "150%", "500%" 
-❌ NON COPIARE esempi da altri post
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO CONFRONTARE SCOMMESSE CON SPESE QUOTIDIANE
-═══════════════════════════════════════════════════════════════
-
-❌ MAI confrontare la scommessa con:
-  - Prezzo del pranzo/cena/cibo
-  - Costo di un caffè/bar
-  - Prezzo della pizza/hamburger
-  - Biglietto della metro/taxi/trasporto
-
-✅ CORRETTO: Menziona semplicemente l'importo senza confronti
-
-COMPITO: Crea contenuto unico e vivo per TG. Ogni post — nuova forma e approccio.
-
-🎰 IMPORTANTE: NON INVENTARE TEMATICHE NON CORRELATE!
-⚠️ Usa il nome della slot {slot} come indizio e contesto, ma NON INVENTARE un tema NON CORRELATO!
-• Puoi interpretare liberamente: "Vampy Party" → festa/notte/rischio/vampiri/gotico
-• Puoi semplicemente menzionare il nome: "nella slot {slot} è successo..."
-
-1. TONO E PRESENTAZIONE:
-
-Stile: messaggio energetico a un amico.
-Emoji — obbligatori e pertinenti. Ravviva ogni blocco.
-Obiettivo: provocare l'«effetto wow», non informare.
-
-2. FORMATO TELEGRAM:
-
-Accento: grassetto
-Accento leggero: corsivo
-Per gli importi: monospazio
-Separatori: Alterna (a capo, ——, •••, 🎯🎯🎯)
-
-3. INTEGRAZIONE PUBBLICITARIA (1 LINK):
-Integralo nella narrazione (introduzione/climax/epilogo).
-
-{url1} [Bonus: {bonus1}] → mescola le parole diversamente ogni volta! Usa diverse formulazioni: «ti diamo», «riscuoti», «ottieni», «ti aspettano» — unico ogni volta!
-
-4. REGOLE DI CONTENUTO:
-
-Dati: 1-3 fatti chiave per post. Vincita — nominare 1 volta.
-Lessico: Sostituzione delle parole vietate («club», «storia», «risultato»).
-Narrazione: In terza persona («il giocatore», «il cliente»).
-Volume: Compatto ma sostanzioso.
-
-LA STRUTTURA DEVE «CAMMINARE»: Rompi gli schemi. Inizi variabili: domanda, numero, link, storia.
-
-🎭 LA VINCITA È LA PROTAGONISTA DEL POST!
-⚠️ Il nome del giocatore NON è disponibile — usa SEMPRE formulazioni generali:
-• "un giocatore", "questo eroe", "il vincitore", "un tipo", "un fortunato"
-• NON inventare nomi di giocatori!
-
-🚫 VIETATO INDICARE IL TEMPO:
-❌ MAI indicare: "oggi", "ieri", "stamattina", "recentemente"
-✅ Scrivi semplicemente dell'evento senza riferimenti al tempo
-
-🚫 VIETATE FRASI CLICHÉ:
-❌ NON usare: "lo schermo è esploso", "brividi per il corpo"
-✅ SCRIVI IN MODO ORIGINALE, evita i cliché!
-
-❌ VIETATO: **markdown**, `codice`, [link](url)
-
-📝 HTML TAG (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, pensieri, commenti emotivi, spiegazioni
-• <u>sottolineato</u> — titoli di blocchi, cose importanti, domande
-• <code>monospaziato</code> — TUTTE le cifre, importi, moltiplicatori
-• <b><i>grassetto corsivo</i></b> — accenti speciali
-
-💬 PENSIERI E REAZIONI (usa nei post!):
-• <i>«Non ho mai visto niente del genere!»</i> — i tuoi pensieri
-• <i>La serie è partita piano piano...</i> — spiegazioni
-• <i>Mi si è mozzato il fiato...</i> — emozioni
-
-⚠️ CRITICO: USA <i> e <u> IN OGNI POST! Non solo <b> e <code>!
-• Almeno 2-3 frasi in <i>corsivo</i> per post
-• Almeno 1 frase in <u>sottolineato</u> per post
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUZIONE AL LINK — BLOCCO MOTIVAZIONALE (CRITICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ PRIMA DEL LINK AGGIUNGI OBBLIGATORIAMENTE UN'INTRODUZIONE:
-Sono 1-2 frasi che RISCALDANO il lettore e lo MOTIVANO a cliccare sul link.
-
-📌 COSA DEVE FARE L'INTRODUZIONE:
-• Collegare la storia della vincita con la POSSIBILITÀ del lettore di ripetere l'esperienza
-• Creare la sensazione che anche il LETTORE possa vincere
-• Suscitare il desiderio di PROVARE subito
-• Usare le emozioni della storia per passare all'azione
-
-📌 STRUTTURA DELL'INTRODUZIONE:
-• Riferimento alla vincita del post → la tua occasione di provare anche tu
-• Domanda-intrigo → risposta sotto forma di link
-• Invito all'azione basato sulla storia
-
-📌 TONALITÀ:
-• Amichevole, senza pressione
-• Con entusiasmo e adrenalina
-• Come se condividessi un segreto con un amico
-
-❌ NON scrivere l'introduzione separatamente — deve FLUIRE naturalmente nel link!
-✅ Introduzione + link = un unico blocco motivazionale
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DEL LINK CON BONUS (SOLO 1 LINK!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: IN OGNI POST OBBLIGATORIAMENTE UN LINK!
-❌ POST SENZA LINK = RIFIUTATO
-✅ USA SEMPRE: {url1} con descrizione unica basata su {bonus1}
-
-⚠️ SCEGLI formati DIVERSI per ogni nuovo post!
-
-⚠️ PARAFRASA IL BONUS (CRITICO!):
-❌ NON copiare {bonus1} direttamente così com'è
-✅ USALO come BASE, ma PARAFRASALO diversamente ogni volta
-❌ NON INVENTARE nuovi bonus o importi - SOLO quello che c'è in {bonus1}!
-
-📋 SCEGLI UNO dei formati (RUOTA! Ogni post diverso!):
-
-🚨 USA SOLO QUESTO BONUS: {bonus1}
-❌ NON INVENTARE altri bonus!
-
-1️⃣ MAIUSCOLE: 🔥 <a href="{url1}">[PARAFRASA {bonus1}]!</a> 🔥
-2️⃣ PUNTI: • • • "[parafrasa {bonus1}]" → {url1} • • •
-3️⃣ INTESTAZIONE: 📌 IL TUO PASSO:\n<a href="{url1}">🔥 [PARAFRASA {bonus1}]!</a>
-4️⃣ ONDE: 〰️ Vuoi [parafrasa {bonus1}]? {url1} 〰️
-5️⃣ BLOCCHI: ╔══╗ {url1}\n[parafrasa {bonus1}]!!! ╚══╝
-6️⃣ SIMBOLI: ⭐ {url1}\n[parafrasa {bonus1}]
-
-📏 LUNGHEZZA: MASSIMO 700 caratteri!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # СИСТЕМНЫЙ ПРОМПТ (ОСНОВНОЙ - ИТАЛЬЯНСКИЙ)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    SYSTEM_PROMPT = """🇮🇹 CRITICO: SCRIVI SOLO IN ITALIANO!
-❌ VIETATO usare russo, inglese o altre lingue nel testo
-✅ PERMESSO in inglese: nomi delle slot (Gates of Olympus, Sweet Bonanza)
-❌ TUTTO IL RESTO SOLO IN ITALIANO
-
-🚫 PUNTEGGIATURA: NON usare i segni spagnoli ¡ e ¿ — in italiano NON esistono!
-✅ Usa solo: ! e ? (normali, senza capovolgerli all'inizio della frase)
-
-🚨🚨🚨 REGOLA #0 PRIMA DI TUTTO! 🚨🚨🚨
-⛔⛔⛔ USD, EUR ⛔⛔⛔
-❌ QUESTI SONO **VALUTE**, NON NOMI DI PERSONE!
-❌ **MAI** scrivere "USD ha scommesso", "EUR ha vinto"
-✅ USA: "Un giocatore", "Un tipo", "L'eroe", "Il vincitore"
-⚠️ SE USI USD/EUR COME NOME = TUTTO IL POST SARÀ RIFIUTATO!
-
-🚨 REGOLA #0.5: SOLO TERMINI IN ITALIANO! 🚨
-❌ NON usare "Free Spins", "Bonus", "Welcome Package"
-✅ USA: "giri gratuiti", "giri gratis", "bonus", "pacchetto di benvenuto"
-
-═══════════════════════════════════════════════════════════════
-💰 FOCUS: SCOMMESSA E RISCHIO
-═══════════════════════════════════════════════════════════════
-
-⚠️ CRITICO: COSTRUISCI IL POST ATTORNO ALLA DIMENSIONE DELLA SCOMMESSA E AL RISCHIO!
-
-• La SCOMMESSA {bet} — il punto di partenza della storia
-• Enfatizza il CONTRASTO: scommessa piccola → vincita enorme
-• "Solo {bet}{currency}", "un importo modesto", "una scommessa piccola"
-• Rischio, coraggio, audacia — l'emozione principale
-• Il giocatore, la slot {slot}, la vincita {win} — attraverso il prisma della scommessa
-
-ESEMPI:
-"Solo {bet}{currency} — un importo che chiunque potrebbe rischiare"
-"Una scommessa modesta di {bet}{currency} — e guarda cosa è successo"
-"Con appena {bet}{currency} in gioco, nessuno si aspettava questo risultato"
-
-COMPITO: Mostra il contrasto! Scommessa piccola = grande coraggio!
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #1 - CODICI VALUTA 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO usare USD, EUR come NOMI o SOPRANNOMI di persone:
-  
-❌ SBAGLIATO (RIFIUTATO IMMEDIATAMENTE):
-  - "USD ha scommesso..." 
-  - "EUR è entrato nella sala..."
-  - "Un coraggioso conosciuto come USD..."
-  
-✅ CORRETTO (questi codici sono SOLO per importi di denaro):
-  - "Un giocatore ha scommesso 50 EUR"
-  - "Il vincitore si è portato a casa 1.000 EUR"
-  - "Con 500 USD ha scommesso..."
-
-⚠️ PER NOMINARE IL GIOCATORE USA:
-  - "Un giocatore", "Un tipo", "Un coraggioso", "Un fortunato"
-  - "L'eroe", "Il campione", "Il vincitore", "Il re"
-  - "Uno scommettitore", "Un audace", "Un temerario"
-  - MAI: USD, EUR
-
-═══════════════════════════════════════════════════════════════
-🚨🚨🚨 REGOLA CRITICA #2 - BONUS 🚨🚨🚨
-═══════════════════════════════════════════════════════════════
-
-⛔ ASSOLUTAMENTE VIETATO inventare bonus:
-
-✅ USA SOLO il bonus indicato in {bonus1}
-❌ NON INVENTARE "100 dollari", "100 giri", "150%", "500%" 
-❌ NON COPIARE esempi da altri post
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO CONFRONTARE SCOMMESSE CON SPESE QUOTIDIANE
-═══════════════════════════════════════════════════════════════
-
-❌ MAI confrontare la scommessa con:
-  - Prezzo del pranzo/cena/cibo
-  - Costo di un caffè/bar
-  - Prezzo della pizza/hamburger
-  - Biglietto della metro/taxi/trasporto
-  - "Quello che spendi per..." qualsiasi cosa quotidiana
-
-✅ CORRETTO: Menziona semplicemente l'importo senza confronti
-
-Sei un copywriter per un canale Telegram sulle vincite alle slot.
-Crea post UNICI e VIVI. Scrivi come un amico racconta a un altro.
-
-🎰 IMPORTANTE: NON INVENTARE TEMATICHE NON CORRELATE!
-⚠️ Usa il nome della slot {slot} come indizio e contesto, ma NON INVENTARE un tema NON CORRELATO!
-• Puoi interpretare liberamente: "Vampy Party" → festa/notte/rischio/vampiri/gotico
-• Puoi semplicemente menzionare il nome: "nella slot {slot} è successo..."
-
-⚠️ EVITA LE RIPETIZIONI!
-• Ogni post deve iniziare in modo DIVERSO
-• Usa set DIVERSI di emoji in ogni post
-• NON ripetere struttura e formulazioni dei post precedenti
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATO INDICARE IL TEMPO
-═══════════════════════════════════════════════════════════════
-
-❌ MAI indicare:
-• "oggi", "ieri", "domani"
-• "stamattina", "nel pomeriggio", "stasera"
-• "recentemente", "poco fa", "proprio ora"
-
-✅ Invece scrivi semplicemente dell'evento senza riferimenti al tempo
-
-═══════════════════════════════════════════════════════════════
-🚫 VIETATE FRASI CLICHÉ
-═══════════════════════════════════════════════════════════════
-
-❌ NON usare frasi cliché:
-• "lo schermo è esploso"
-• "brividi su tutto il corpo"
-
-✅ REGOLA DEL PUNTO DI VISTA:
-
-📊 FATTI E AZIONI → TERZA PERSONA:
-• "Il giocatore è entrato", "Il risultato impressiona"
-• ❌ NO "io gioco", "io giro" (sono azioni del giocatore, non tue)
-
-🎯 RISULTATO: Eventi in 3a persona
-✅ Ogni post deve essere FRESCO e ORIGINALE!
-
-═══════════════════════════════════════════════════════════════
-⚠️ NUMERI E FORMATO
-═══════════════════════════════════════════════════════════════
-
-🔢 TUTTI I NUMERI IN <code>tags</code>!
-• Entrata: <code>500€</code> ✅
-• Risultato: <code>1 130 675€</code> ✅  
-• Moltiplicatore: <code>x2261.3</code> ✅
-
-📝 TAG HTML (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, chiarimenti, pensieri
-• <code>monospazio</code> — TUTTI i numeri, importi, moltiplicatori
-• <a href="URL">testo del link</a>
-
-═══════════════════════════════════════════════════════════════
-⚠️ POSIZIONE DEL LINK — VARIARE!
-═══════════════════════════════════════════════════════════════
-
-VARIANTI (alterna!):
-• Link ALL'INIZIO → poi testo della storia
-• Testo → Link NEL MEZZO → testo finale
-• Testo della storia → Link ALLA FINE
-
-🔗 HYPERLINK — MINIMO 4 PAROLE!
-❌ <a href="URL">Riscuoti</a> — VIETATO! Troppo corto!
-✅ <a href="URL">Riscuoti il pacchetto di benvenuto adesso</a> — OK!
-
-═══════════════════════════════════════════════════════════════
-🔥 INTRODUZIONE AL LINK — BLOCCO MOTIVAZIONALE (CRITICO!)
-═══════════════════════════════════════════════════════════════
-
-⚠️ PRIMA DEL LINK AGGIUNGI OBBLIGATORIAMENTE UN'INTRODUZIONE:
-Sono 1-2 frasi che RISCALDANO il lettore e lo MOTIVANO a cliccare sul link.
-
-📌 COSA DEVE FARE L'INTRODUZIONE:
-• Collegare la storia della vincita con la POSSIBILITÀ del lettore di ripetere l'esperienza
-• Creare la sensazione che anche il LETTORE possa vincere
-• Suscitare il desiderio di PROVARE subito
-• Usare le emozioni della storia per passare all'azione
-
-📌 STRUTTURA DELL'INTRODUZIONE:
-• Riferimento alla vincita del post → la tua occasione di provare anche tu
-• Domanda-intrigo → risposta sotto forma di link
-• Invito all'azione basato sulla storia
-
-📌 TONALITÀ:
-• Amichevole, senza pressione
-• Con entusiasmo e adrenalina
-• Come se condividessi un segreto con un amico
-
-❌ NON scrivere l'introduzione separatamente — deve FLUIRE naturalmente nel link!
-✅ Introduzione + link = un unico blocco motivazionale
-
-═══════════════════════════════════════════════════════════════
-⚠️ FORMATO DEL LINK CON BONUS (SOLO 1 LINK!)
-═══════════════════════════════════════════════════════════════
-
-🚨 REQUISITO: IN OGNI POST OBBLIGATORIAMENTE UN LINK!
-❌ POST SENZA LINK = RIFIUTATO
-✅ USA SEMPRE: {url1} con descrizione unica basata su {bonus1}
-
-⚠️ SCEGLI formati DIVERSI per ogni nuovo post!
-❌ NON usare lo stesso stile di seguito
-✅ Alterna i formati al massimo
-
-⚠️ PARAFRASA IL BONUS (CRITICO!):
-❌ NON copiare {bonus1} direttamente così com'è
-✅ USALO come BASE, ma PARAFRASALO diversamente ogni volta
-❌ NON INVENTARE nuovi bonus o importi - SOLO quello che c'è in {bonus1}!
-
-🚨🚨🚨 USA SOLO QUESTO BONUS: {bonus1} 🚨🚨🚨
-❌ NON INVENTARE "100 dollari", "100 giri" se NON sono in {bonus1}!
-✅ PARAFRASA {bonus1} con le tue parole ogni volta diversamente
-
-📐 REGOLA DELL'ARIA (OBBLIGATORIO!):
-• SEMPRE aggiungi RIGA VUOTA PRIMA e DOPO ogni blocco link
-
-📋 SCEGLI UNO dei formati (RUOTA! Ogni post diverso!):
-
-1️⃣ CLASSICO: <a href="{url1}">🎁 [parafrasa {bonus1}]</a>
-2️⃣ GRASSETTO: <b><a href="{url1}">🔥 [PARAFRASA {bonus1}]!</a></b>
-3️⃣ ENERGETICO: <a href="{url1}">⚡ [parafrasa {bonus1}]!</a>
-4️⃣ AMICHEVOLE: <a href="{url1}">👉 [parafrasa {bonus1}]!</a>
-5️⃣ DIRETTO: <a href="{url1}">→ [parafrasa {bonus1}]</a>
-6️⃣ DOMANDA: <a href="{url1}">🤔 Vuoi [parafrasa {bonus1}]?</a>
-7️⃣ EMOJI: 🔥 <a href="{url1}">[parafrasa {bonus1}]</a> 🔥
-8️⃣ URL + DESC: {url1}\n👆 [parafrasa {bonus1}]
-9️⃣ DESC + URL: 🎁 [parafrasa {bonus1}]:\n{url1}
-
-❌ VIETATO: **grassetto**, `codice`, __corsivo__, [testo](url) — questo è Markdown!
-
-📝 HTML TAG (usa TUTTI, non solo uno!):
-• <b>grassetto</b> — slot, nomi, accenti, titoli
-• <i>corsivo</i> — citazioni, pensieri, commenti emotivi, spiegazioni
-• <u>sottolineato</u> — titoli di blocchi, cose importanti, domande
-• <code>monospaziato</code> — TUTTE le cifre, importi, moltiplicatori
-• <b><i>grassetto corsivo</i></b> — accenti speciali
-
-💬 PENSIERI E REAZIONI (usa nei post!):
-• <i>«Non ho mai visto niente del genere!»</i> — i tuoi pensieri
-• <i>La serie è partita piano piano...</i> — spiegazioni
-• <i>Mi si è mozzato il fiato...</i> — emozioni
-
-⚠️ CRITICO: USA <i> e <u> IN OGNI POST! Non solo <b> e <code>!
-• Almeno 2-3 frasi in <i>corsivo</i> per post
-• Almeno 1 frase in <u>sottolineato</u> per post
-
-═══════════════════════════════════════════════════════════════
-✅ GENERA POST UNICO SENZA TEMPLATE!
-═══════════════════════════════════════════════════════════════
-
-⚠️ IMPORTANTE: NON USARE template o strutture prefabbricate!
-• Ogni post deve essere COMPLETAMENTE ORIGINALE
-• Inventa il TUO approccio e presentazione unici
-• Basati sui dati (giocatore, slot, vincita) e crea una NUOVA storia
-• Posiziona i link in posti DIVERSI (inizio/metà/fine)
-
-🎯 IL TUO COMPITO: Scrivi il post come se fosse il primo al mondo!
-• Senza ripetizioni di strutture
-• Senza copiare esempi
-• Con inizio, metà e fine UNICI
-
-═══════════════════════════════════════════════════════════════
-REGOLE
-═══════════════════════════════════════════════════════════════
-
-📏 LUNGHEZZA: MINIMO 650 caratteri, MASSIMO 800 caratteri
-
-🎭 LA VINCITA È LA PROTAGONISTA DEL POST!
-⚠️ Se il nome del giocatore ({streamer}) è indicato — USALO 1 VOLTA!
-• SEMPRE scrivi il nome CON LA MAIUSCOLA
-• Costruisci il post attorno alla vincita, lei è la star della storia!
-• Se il nome non è indicato — usa: "un giocatore", "questo eroe", "il vincitore", "{person}"
-
-🎰 NOME DELLA SLOT (interpreta creativamente!):
-• Sugar Rush → "dolce vittoria", "tempesta di zucchero"
-• Le Viking → "il vichingo ha mostrato la forza", "guerriero scandinavo"
-• Fruit Party → "festa fruttata", "i frutti sono maturati"
-
-📊 BLOCCO VINCITA (FORMATI DIVERSI!):
-
-✅ ALTERNA formati:
-• Formato 1 (inline): Entrata <code>{bet}{currency}</code> → risultato <code>{win}{currency}</code> (x{multiplier})
-• Formato 2 (con emoji): 💸 <code>{bet}{currency}</code> entrata | 💰 <code>{win}{currency}</code> risultato | 🔥 <code>x{multiplier}</code>
-• Formato 3 (domanda): Chi avrebbe pensato che <code>{bet}{currency}</code> si sarebbero trasformati in <code>{win}{currency}</code>?!
-• Formato 4 (storia): È iniziato con <code>{bet}{currency}</code>, ed è finito con <code>{win}{currency}</code>...
-
-🔀 BLOCCHI — mescola 4 elementi CASUALMENTE:
-
-1. INIZIO DEL POST (scegli tipo a caso):
-   • 30% - Narrativa (storia, racconto dell'evento)
-   • 25% - Domanda (intrigo, domanda retorica)
-   • 20% - Titolo (brillante, maiuscole, cornici emoji)
-   • 15% - Fatto (numeri, constatazione)
-   • 10% - Emozione (esclamazione, reazione)
-
-2. Fatti (entrata/risultato/moltiplicatore)
-
-3. BLOCCO AGGIUNTIVO (scegli a caso):
-   • Reazione emotiva
-   • Contesto/dettagli dell'evento
-   • Invito all'azione
-   • Commento/valutazione
-
-4. Link con bonus
-
-❌ PAROLE VIETATE: casinò
-✅ SOSTITUZIONI: piattaforma, prodotto, sito, club
-
-😀 EMOJI: tanti, tematici: 🔥💰🚀💎😱🤑💸📈🏆😎👇
-
-🎭 TONALITÀ (alterna): sorpresa / fiducia / entusiasmo / calma / ironia
-
-═══════════════════════════════════════════════════════════════
-FORMATO DI RISPOSTA
-═══════════════════════════════════════════════════════════════
-
-Genera un post PRONTO per Telegram.
-Solo testo con tag HTML.
-NON aggiungere spiegazioni, commenti, marcatori tipo [HOOK].
-
-📏 LUNGHEZZA: MINIMO 650 caratteri, MASSIMO 800 caratteri
-Scrivi in modo VIVO! Aggiungi reazioni, dettagli del momento!"""
-
-    # ═══════════════════════════════════════════════════════════════════
-    # УНИВЕРСАЛЬНЫЙ ПРОМПТ ДЛЯ ВИДЕО-ПОСТОВ (БЕЗ ЖЕСТКИХ СТРУКТУР!)
-    # ═══════════════════════════════════════════════════════════════════
-    
-    VIDEO_POST_PROMPTS = [
-        # Prompt universale - AI sceglie stile e struttura (senza streamer)
-        """Crea un post UNICO su una vincita.
-
-DATI:
-• Slot: {slot}
-• Scommessa: {bet}{currency}
-• Vincita: {win}{currency}
-• Moltiplicatore: x{multiplier}
-
-⚠️ NON c'è il nome del giocatore — usa formulazioni generali: "un giocatore", "un tipo", "un fortunato", "il vincitore"
-⚠️ NON inventare nomi di giocatori!
-
-LINK (obbligatorio!):
-• Link: {url1} — {bonus1} (DESCRIVI IL BONUS IN MODO ATTRAENTE E MOTIVANTE!)
-
-⚠️ REGOLA PRINCIPALE: LIBERTÀ TOTALE DI CREATIVITÀ!
-• NON seguire nessun modello o esempio
-• Inventa la TUA presentazione unica
-• Posiziona i link in posti DIVERSI (inizio/metà/fine/alternanza)
-• Usa emoji e separatori DIVERSI
-
-🎨 TEMATICA: Puoi interpretare il nome della slot {slot} liberamente, ma NON inventare un tema NON CORRELATO!
-
-📝 FORMATTAZIONE TESTO (CRITICO! USA TUTTI I TAG!):
-• <b>grassetto</b> — slot, vincita, accenti forti
-• <i>corsivo</i> — pensieri, emozioni, commenti («Mi si è mozzato il fiato...»)
-• <u>sottolineato</u> — domande retoriche, titoli, frasi importanti
-• <code>monospaziato</code> — cifre, importi, moltiplicatori
-⚠️ OBBLIGATORIO: almeno 2-3 frasi in <i>corsivo</i> + almeno 1 in <u>sottolineato</u>!
-
-🔗 FORMATO DEL LINK CON BONUS (ALTERNA tra questi!):
-1️⃣ HYPERLINK: 🎁 <a href="{url1}">[parafrasa {bonus1} in modo attraente]</a>
-2️⃣ URL + TRATTINO: 🔥 {url1} — <code>[cifre dal bonus]</code> [parafrasa resto]
-3️⃣ URL + NUOVA RIGA: {url1}\n💰 [parafrasa {bonus1} con <b>grassetto</b> e <code>cifre</code>]
-4️⃣ DESCRIZIONE + URL: [parafrasa {bonus1}] 👉 {url1}
-⚠️ DESCRIVI IL BONUS IN MODO ATTRAENTE CON FORMATTAZIONE: usa <b>, <code> nelle cifre!
-
-📏 Lunghezza: MINIMO 650, MASSIMO 800 caratteri
-❌ Vietato: casinò, markdown"""
-    ]
-    
-    IMAGE_POST_PROMPTS = [
-        """Scrivi un post sui BONUS.
-Link: {url1} ({bonus1}).
-
-Stile: parla dei bonus come a un amico, in modo morbido e senza aggressività.
-POSIZIONE DEI LINK: all'INIZIO del post.
-
-FORMATO DEI LINK (CRITICO!):
-⚠️ DESCRIVI IL BONUS IN MODO ATTRAENTE E MOTIVANTE!
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "istantaneo", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Evidenzia i benefici: "raddoppia il tuo deposito", "ottieni di più", "senza rischio"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-{url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- Inizia con 🎁 o 💎
-- Bonus in <code>tags</code>: <code>[usa {bonus1}]</code>
-- Tanti emoji 🍒🔥💰🚀
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per pensieri e commenti (ALMENO 2 frasi!)
-- <u>sottolineato</u> per frasi importanti (ALMENO 1!)
-- SENZA la parola "casinò" (usa: piattaforma, sito, club)
-- Termina con una nota motivazionale positiva
-- Scrivi descrizioni COMPLETE e ATTRAENTI dei bonus!""",
-
-        """Scrivi un post MOTIVANTE con bonus.
-Link: {url1} ({bonus1}).
-
-Stile: spiega perché vale la pena provare, morbido e senza pressione.
-POSIZIONE DEL LINK: nel MEZZO del post.
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Evidenzia i benefici: "raddoppia il tuo deposito", "ottieni di più", "senza rischio"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-FORMATO DEL LINK:
-{url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- Inizia con una domanda ❓
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per pensieri e commenti (ALMENO 2 frasi!)
-- <u>sottolineato</u> per frasi importanti (ALMENO 1!)
-- Bonus in <code>tags</code>
-- SENZA la parola "casinò"
-- Finale: positivo e motivante
-- Scrivi descrizioni COMPLETE e ATTRAENTI del bonus!""",
-
-        """Scrivi un post-CONSIGLIO sui bonus.
-Link: {url1} ({bonus1}).
-
-Stile: come un lifehack amichevole, senza aggressività.
-POSIZIONE DEL LINK: mescolato con i passaggi.
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-FORMATO DEL LINK:
-{url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- Inizia con 💡
-- Passaggi 1. 2. 3.
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per pensieri e consigli (ALMENO 2 frasi!)
-- <u>sottolineato</u> per frasi importanti (ALMENO 1!)
-- Bonus in <code>tags</code>
-- SENZA la parola "casinò" (sostituisci: piattaforma, portale)
-- Termina con un pensiero motivante
-- Scrivi descrizioni COMPLETE e ATTRAENTI del bonus!""",
-
-        """Scrivi un post COMPARATIVO sui bonus.
-Link: {url1} ({bonus1}).
-
-Stile: aiuta a scegliere in modo morbido e amichevole.
-POSIZIONE DEL LINK: dopo il confronto.
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-FORMATO DEL LINK:
-{url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- Titolo «Cosa scegliere?» 🤔
-- Vantaggi con ▸
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per opinioni e consigli (ALMENO 2 frasi!)
-- <u>sottolineato</u> per il verdetto finale (ALMENO 1!)
-- Bonus in <code>tags</code>
-- SENZA la parola "casinò"
-- Finale positivo e motivante
-- Scrivi descrizioni COMPLETE e ATTRAENTI del bonus!""",
-
-        """Scrivi un ANNUNCIO di bonus.
-Link: {url1} ({bonus1}).
-
-Stile: crea interesse senza aggressività!
-POSIZIONE DEL LINK: alla FINE del post con riga vuota.
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-FORMATO DEL LINK:
-{url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- Inizia con 🔔 o ⚡
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per commenti e emozioni (ALMENO 2 frasi!)
-- <u>sottolineato</u> per l'annuncio principale (ALMENO 1!)
-- Bonus in <code>tags</code>
-- SENZA la parola "casinò"
-- Finale motivante
-- Scrivi descrizioni COMPLETE e ATTRAENTI del bonus!""",
-
-        """Scrivi un post-RECENSIONE sui bonus.
-Link: {url1} ({bonus1}).
-
-Stile: come se condividessi esperienza, morbido e onesto.
-POSIZIONE DEL LINK: alla FINE come raccomandazione.
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-FORMATO DEL LINK:
-{url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- Citazione tra «virgolette»
-- Emoji di esperienza: 💬✅
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per citazioni e impressioni (ALMENO 2 frasi!)
-- <u>sottolineato</u> per il verdetto o raccomandazione (ALMENO 1!)
-- Bonus in <code>tags</code>
-- SENZA la parola "casinò" (usa: sito, risorsa, servizio)
-- Raccomandazione positiva
-- Scrivi descrizioni COMPLETE e ATTRAENTI del bonus!""",
-
-        """Scrivi un post con bonus.
-Link: {url1} ({bonus1}).
-
-Stile: informativo, vivace e amichevole.
-POSIZIONE DEL LINK: link con freccia all'INIZIO.
-
-🎯 MOTIVAZIONE: Fai in modo che le persone VOGLIANO cliccare!
-✅ Usa parole emozionali: "esclusivo", "incredibile", "gratis", "speciale"
-✅ Crea urgenza: "solo oggi", "tempo limitato", "attiva ora"
-✅ Invito all'azione: "riscuoti ORA", "attiva il tuo bonus", "inizia a vincere"
-
-FORMATO DEL LINK:
-➡️ {url1}
-🎁 [parafrasa {bonus1}] - 🚨 USA SOLO {bonus1}!
-
-REGOLE:
-- MINIMO 500, MASSIMO 700 caratteri
-- USA TUTTI I TAG HTML: <b>, <i>, <u>, <code>!
-- <i>corsivo</i> per pensieri e commenti (ALMENO 2 frasi!)
-- <u>sottolineato</u> per frasi chiave (ALMENO 1!)
-- Bonus in <code>tags</code>
-- SENZA la parola "casinò" (sostituisci: piattaforma, club di gioco)
-- Termina in modo positivo
-- Scrivi descrizioni COMPLETE e ATTRAENTI del bonus!""",
-    ]
-    
-    # Промпты БЕЗ имени стримера (основной режим для итальянского)
-    VIDEO_POST_PROMPTS_NO_STREAMER = [
-        """Scrivi un post su una vincita (nome del giocatore SCONOSCIUTO).
-{slot_plain}, scommessa <b>{bet}{currency}</b>, ha vinto <b>{win}{currency}</b> (x{multiplier}).
-Link: {url1}.
-
-⚠️ Chiama l'eroe in modo UNICO: {person}
-
-🚨🚨🚨 REGOLA CRITICA! 🚨🚨🚨
-USA ESATTAMENTE LE CIFRE INDICATE SOPRA:
-- Scommessa: {bet}{currency}
-- Vincita: {win}{currency}  
-- Moltiplicatore: x{multiplier}
-NON CAMBIARE, NON ARROTONDARE, NON INVENTARE ALTRI NUMERI!
-
-FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
-- <b>grassetto</b> — slot, vincita, accenti forti
-- <i>corsivo</i> — pensieri, emozioni, commenti personali (ALMENO 2-3 frasi!)
-- <u>sottolineato</u> — domande retoriche, frasi importanti (ALMENO 1!)
-- <code>monospaziato</code> — cifre, importi, moltiplicatori
-- Emoji 🔥💰🍒
-- MINIMO 500, MASSIMO 700 caratteri!
-
-⚠️ FORMATO DEI LINK (scegli uno, ALTERNA!):
-🚨 USA SOLO {bonus1} - NON inventare altri bonus!
-1) {url1} — 🎁 [parafrasa {bonus1} con <code>cifre</code> e <b>accenti</b>]
-2) {url1}\n🔥 [parafrasa {bonus1} con formattazione]
-3) 🎁 <a href="{url1}">[parafrasa {bonus1} in modo attraente]</a>
-4) [parafrasa {bonus1}] 👉 {url1}""",
-
-        """Scrivi un reportage (SENZA nome).
-{slot}, <b>{bet}{currency}</b> → <b>{win}{currency}</b>, x{multiplier}.
-Link: {url1}.
-
-⚠️ Chiama l'eroe: {person}
-
-🚨🚨🚨 USA ESATTAMENTE QUESTI NUMERI! 🚨🚨🚨
-Scommessa: {bet}{currency} | Vincita: {win}{currency} | x{multiplier}
-NON CAMBIARE E NON INVENTARE ALTRI NUMERI!
-
-FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
-- Inizia con 🔴 o ⚡
-- <b>grassetto</b> — slot, vincita, accenti
-- <i>corsivo</i> — pensieri, reazioni, emozioni (ALMENO 2-3 frasi!)
-- <u>sottolineato</u> — domande, frasi chiave (ALMENO 1!)
-- <code>monospaziato</code> — cifre, importi
-- MINIMO 500, MASSIMO 700 caratteri!
-
-⚠️ FORMATO DEI LINK (ALTERNA tra!): 
-🚨 USA SOLO {bonus1} - NON inventare altri bonus!
-1) {url1} — [parafrasa {bonus1} con <code>cifre</code>]
-2) 🔥 <a href="{url1}">[parafrasa {bonus1}]</a>""",
-
-        """Scrivi un post con DOMANDA (senza nome del giocatore).
-{slot}, entrata <b>{bet}{currency}</b>, uscita <b>{win}{currency}</b>, x{multiplier}.
-Link: {url1}.
-
-⚠️ Chiama l'eroe in modo unico: {person}
-
-🚨 USA ESATTAMENTE: {bet}{currency} (entrata) → {win}{currency} (uscita) | x{multiplier}
-NON CAMBIARE I NUMERI!
-
-FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
-- Inizia con ❓
-- <b>grassetto</b> — cifre chiave, slot
-- <i>corsivo</i> — pensieri, dubbi, emozioni (ALMENO 2-3 frasi!)
-- <u>sottolineato</u> — la domanda principale, frasi importanti (ALMENO 1!)
-- <code>monospaziato</code> — cifre, importi
-- Intrigo → risposta
-- MINIMO 500, MASSIMO 700 caratteri!
-
-⚠️ FORMATO DEI LINK (MOTIVA A CLICCARE!):
-🚨 USA SOLO {bonus1} - NON inventare altri bonus!
-1) 👇 {url1}\n🎁 [parafrasa {bonus1} con <code>cifre</code> e <b>accenti</b>]
-2) 🎁 <a href="{url1}">[parafrasa {bonus1} in modo attraente]</a>""",
-
-        """Scrivi un post EMOZIONALE (senza nome).
-{slot}, <b>{bet}{currency}</b> è diventato <b>{win}{currency}</b> (x{multiplier}).
-Link: {url1}.
-
-⚠️ Chiama l'eroe: {person}
-
-🚨 NUMERI ESATTI: {bet}{currency} → {win}{currency} (x{multiplier})
-NON INVENTARE ALTRE CIFRE!
-
-FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
-- Emoji: 🔥💰😱🍋🍒
-- <b>grassetto</b> — vincita, slot, accenti emotivi
-- <i>corsivo</i> — pensieri, emozioni forti, commenti (ALMENO 2-3 frasi!)
-- <u>sottolineato</u> — frasi chiave, momento clou (ALMENO 1!)
-- <code>monospaziato</code> — cifre, importi, moltiplicatori
-- MINIMO 500, MASSIMO 700 caratteri!
-
-⚠️ FORMATO DEI LINK: [parafrasa {bonus1} con <b>grassetto</b> e <code>cifre</code>] PRIMA, poi URL
-🚨 USA SOLO {bonus1} - NON inventare altri bonus!
-📲 👉 {url1} 👈""",
-
-        """Scrivi un post CASUAL (senza nome).
-{slot}, <b>{bet}{currency}</b> → <b>{win}{currency}</b>, x{multiplier}.
-Link: {url1}.
-
-⚠️ Chiama l'eroe in modo casual: {person}
-
-🚨 CIFRE ESATTE: {bet}{currency} → {win}{currency}, x{multiplier} - NON CAMBIARLE!
-
-FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
-- Inizia con "Guarda," o "Senti," o "Ascolta,"
-- Emoji: 💪😎🤙
-- <b>grassetto</b> — vincita, slot
-- <i>corsivo</i> — pensieri casuali, battute (ALMENO 2-3 frasi!)
-- <u>sottolineato</u> — punto chiave, frase importante (ALMENO 1!)
-- <code>monospaziato</code> — cifre
-- MINIMO 500, MASSIMO 700 caratteri!
+    - Уникальная история/заход
+    - Уникальное описание выигрыша
+    - Уникальная подводка к рекламе
+    - Уникальное описание бонусов
+    
+    Пишет как профессиональный маркетолог, но человеческим языком.
+    """
+    
+    @staticmethod
+    def _decline_nickname(nickname: str, case: str = "genitive") -> str:
+        """Склоняет ник стримера для русского языка (см. src.morphology.decline_nickname)."""
+        return decline_nickname(nickname, case)
+    
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ "АРХИТЕКТОР" (ИТАЛЬЯНСКИЙ)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_ARCHITECT = PackField("it")
 
-⚠️ FORMATO DEI LINK (ALTERNA!):
-🚨 USA SOLO {bonus1} - NON inventare altri bonus!
-1) 👉 {url1} — [parafrasa {bonus1} con <code>cifre</code>]
-2) <a href="{url1}">🤙 [parafrasa {bonus1}]</a>""",
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 3 (ИТАЛЬЯНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_3 = PackField("it")
 
-        """Scrivi un post con NUMERI (senza nome).
-{slot}, entrata <b>{bet}{currency}</b>, risultato <b>{win}{currency}</b>, x{multiplier}.
-Link: {url1}.
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 4 (ИТАЛЬЯНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_4 = PackField("it")
 
-⚠️ Chiama l'eroe: {person}
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 5 (ИТАЛЬЯНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_5 = PackField("it")
 
-🚨 USA QUESTI NUMERI ESATTI NEL TESTO: {bet}{currency}, {win}{currency}, x{multiplier}
-VIETATO cambiare o inventare altre cifre!
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ 6 (ИТАЛЬЯНСКИЙ - для ротации)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT_6 = PackField("it")
 
-FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
-- Prima riga: <b>{win}{currency}</b>!
-- <b>grassetto</b> — vincita, slot
-- <i>corsivo</i> — commenti, analisi, emozioni (ALMENO 2-3 frasi!)
-- <u>sottolineato</u> — titolo o frase riassuntiva (ALMENO 1!)
-- <code>monospaziato</code> — cifre, importi, moltiplicatori
-- Link dopo ━━━
-- MINIMO 500, MASSIMO 700 caratteri!
+    # ═══════════════════════════════════════════════════════════════════
+    # СИСТЕМНЫЙ ПРОМПТ (ОСНОВНОЙ - ИТАЛЬЯНСКИЙ)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    SYSTEM_PROMPT = PackField("it")
 
-⚠️ FORMATO DEI LINK dopo il separatore:
-🚨 USA SOLO {bonus1} - NON inventare altri bonus!
-━━━━━━━━━━
-➡️ {url1}
-🎁 [parafrasa {bonus1} con <code>cifre</code> e <b>accenti</b>]""",
-    ]
+    # ═══════════════════════════════════════════════════════════════════
+    # УНИВЕРСАЛЬНЫЙ ПРОМПТ ДЛЯ ВИДЕО-ПОСТОВ (БЕЗ ЖЕСТКИХ СТРУКТУР!)
+    # ═══════════════════════════════════════════════════════════════════
+    
+    VIDEO_POST_PROMPTS = PackField("it")
+    
+    IMAGE_POST_PROMPTS = PackField("it")
+    
+    # Промпты БЕЗ имени стримера (основной режим для итальянского)
+    VIDEO_POST_PROMPTS_NO_STREAMER = PackField("it")
     
     # Вариации описания бонуса (фоллбэк если текст слишком короткий)
-    BONUS_VARIATIONS = [
-        "fino a 1.500€ di bonus sul deposito e 250 giri gratuiti in regalo!",
-        "pacchetto di benvenuto fino a 1.500 EUR + 250 giri gratis per iniziare",
-        "bonus fino a 1.500 euro sul primo deposito più 250 giri gratuiti",
-        "sblocca fino a 1.500€ extra e ottieni 250 giri gratuiti per partire",
-        "pacchetto iniziale fino a 1.500 EUR e 250 giri gratuiti in omaggio",
-        "fino a 1.500€ sul conto e 250 giri gratis per il tuo debutto",
-        "bonus di benvenuto fino a 1.500 euro + pacchetto di 250 giri gratuiti",
-        "raddoppia il deposito fino a 1.500€ e ricevi 250 giri gratis",
-        "fino a 1.500 EUR sul bilancio più 250 giri gratuiti di benvenuto",
-        "ottieni fino a 1.500€ extra e 250 giri gratuiti per iniziare alla grande",
-    ]
+    BONUS_VARIATIONS = PackField("it")
     
     # Форматы размещения ссылок (для разнообразия)
     # Распределение: ~35% гиперссылки, ~65% plain URL форматы (как в русском!)
-    LINK_FORMATS = [
-        "hyperlink", "hyperlink", "hyperlink", "hyperlink", "hyperlink", "hyperlink",  # 6/17 = ~35% гиперссылки
-        "emoji_url_text", "emoji_url_text",  # 2/17 = ~12%
-        "url_dash_text", "url_dash_text", "url_dash_text",  # 3/17 = ~18%
-        "arrow_url_text", "arrow_url_text",  # 2/17 = ~12%
-        "text_dash_url", "text_dash_url",  # 2/17 = ~12%
-        "url_newline_text", "url_newline_text",  # 2/17 = ~12%
-    ]
+    LINK_FORMATS = PackField("it")
     
     # Синонимы для "giri/FS" (ITALIANO)
-    SPIN_SYNONYMS = [
-        "giri", "round", "tentativi", "prove", 
-        "giocate", "turni", "giri gratuiti", "giri gratis"
-    ]
+    SPIN_SYNONYMS = PackField("it")
     
+    # Заголовок блока данных поста в режиме PROMPT_CACHE_FRIENDLY
+    POST_DATA_HEADER = "📋 DATI DI QUESTO POST (sostituiscili ai segnaposto ⟦...⟧ delle regole):"
+
+    # Пакетный режим (src/batch_generation.py): заголовок секции поста и формат ответа
+    BATCH_ITEM_HEADER = "═══ POST {n} ═══"
+    BATCH_OUTPUT_INSTRUCTION = """
+
+📦 MODALITÀ BATCH: scrivi {count} post DIVERSI — uno per ogni sezione «POST N» qui sopra, con i suoi dati e la sua struttura.
+I post sono indipendenti: NON ripetere tra loro inizi, frasi e combinazioni di emoji.
+Risposta — SOLO JSON, senza spiegazioni né markdown:
+{{"posts": [{{"id": 1, "text": "testo del post 1"}}, {{"id": 2, "text": "testo del post 2"}}]}}
+"""
+
+    # Ремонт отклонённого черновика (src/repair_tier.py): инструкция и правило на каждую причину отказа
+    REPAIR_INSTRUCTION = (
+        "Sei l'editor di un post Telegram già scritto. Correggi nel testo SOLO la violazione indicata. "
+        "Tutto il resto — formulazioni, ordine, emoji, tag HTML e link — lascialo invariato. "
+        "Restituisci solo il testo corretto del post, senza spiegazioni né markdown."
+    )
+    REPAIR_RULES = {
+        "streamer": "Il nick dello streamer «{streamer}» deve comparire nel testo 1 volta (massimo 2), scritto esattamente così.",
+        "links_missing": "Il testo deve contenere il link {url1} ({bonus1_desc}). Aggiungilo con una breve descrizione del bonus.",
+        "language": "Il testo deve essere interamente in italiano. Traduci le frasi in inglese: {detail}.",
+        "length": "Il post ha {length} caratteri e deve averne 500–1000. Togli il superfluo o aggiungi dettagli, mantenendo i dati e il link.",
+    }
+
     def __init__(
         self, 
         api_key: str = None, 
@@ -2270,6 +536,11 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         self.bonus_data: Optional[BonusData] = None
         self._generated_posts: List[str] = []  # Для проверки уникальности
         self._prompt_counter = 0  # Счётчик для ротации системных промптов
+        self.cache_friendly_prompts = CACHE_FRIENDLY_PROMPTS  # Стабильный префикс под кеш провайдера
+        self._last_reject_reason = ""  # Причина последней отбраковки (для телеметрии)
+        self._last_rejected_text = ""  # Отклонённый текст и подробности — для ремонта (src/repair_tier.py)
+        self._last_reject_detail = ""
+        self._style_corpus: Optional[List[str]] = None  # Примеры стиля, фиксированные на сессию
         self._used_starts: List[str] = []  # Отслеживание начал постов (первые 100 символов)
         self._used_emoji_patterns: List[str] = []  # Отслеживание наборов смайликов
         self._used_structures: List[int] = []  # Отслеживание использованных структур из VIDEO_POST_PROMPTS
@@ -2293,6 +564,14 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         """Возвращает текущее значение счетчика форматов ссылок"""
         return self._link_format_counter
     
+    def _get_example_posts(self) -> List[str]:
+        """Примеры стиля для системного промпта: случайные или постоянные на сессию (под кеш)."""
+        if not self.cache_friendly_prompts:
+            return random.sample(self._existing_posts, min(3, len(self._existing_posts)))
+        if self._style_corpus is None:
+            self._style_corpus = random.sample(self._existing_posts, min(3, len(self._existing_posts)))
+        return self._style_corpus
+
     def _get_system_prompt(self) -> str:
         """
         Строгая ротация системных промптов для максимального разнообразия.
@@ -2400,6 +679,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         3. **Проверка уникальности** - сравнивает новые посты со старыми
         """
         self._existing_posts = posts
+        self._style_corpus = None
         print(f"✅ Загружено {len(posts)} существующих постов для обучения AI")
     
     def load_existing_posts_from_file(self, filepath: str):
@@ -2450,67 +730,10 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         """
         Проверяет что candidate не слишком похож на уже принятые описания в pool.
         
-        Три метрики:
-        1. Jaccard >= threshold по стеммированным словам
-        2. Containment >= 0.5 (50%+ слов короткого текста есть в длинном)
-        3. Совпадение первых 2 контентных слов (одинаковое начало)
+        Метрики (Jaccard, containment, одинаковое начало) — в src/bonus_pool_index.py;
+        при сборке пула используйте BonusPoolIndex напрямую, чтобы не стеммить pool заново.
         """
-        import re
-        
-        stop_words = {
-            'и', 'в', 'на', 'с', 'к', 'по', 'для', 'от', 'из', 'а', 'но', 'не',
-            'что', 'это', 'как', 'до', 'за', 'или', 'ещё', 'еще', 'уже', 'тоже',
-            'при', 'ты', 'вы', 'мы', 'он', 'она', 'они', 'все', 'свой', 'своё',
-            'бонус', 'бонуса', 'бонусом', 'бонуску', 'бонуска',
-            'процент', 'процентов', 'процентный', 'столько',
-            'bonus', 'bono', 'giri', 'tours', 'gratis', 'gratuiti', 'gratuits',
-            'the', 'and', 'for', 'with', 'del', 'con', 'por', 'para', 'les', 'des', 'une',
-        }
-        
-        def stem_ru(word: str) -> str:
-            for suffix in ['ений', 'ного', 'ному', 'ными', 'ения', 'ению',
-                          'ами', 'ому', 'ого', 'ной', 'ную', 'ным', 'ных', 'ное',
-                          'ить', 'ать', 'ять', 'ешь', 'ете',
-                          'ов', 'ей', 'ам', 'ом', 'ем', 'ую', 'ый', 'ий', 'ой',
-                          'ые', 'ие', 'ая', 'яя', 'ых', 'их',
-                          'а', 'о', 'у', 'е', 'ы', 'и', 'я', 'ь', 'й']:
-                if len(word) > len(suffix) + 2 and word.endswith(suffix):
-                    return word[:-len(suffix)]
-            return word
-        
-        def normalize(text: str) -> list:
-            words = re.findall(r'[а-яёa-zéèêëàâäùûüôöîïçñ]{3,}', text.lower())
-            return [stem_ru(w) for w in words if w not in stop_words]
-        
-        cand_stems = normalize(candidate)
-        if len(cand_stems) < 2:
-            return False
-        cand_set = set(cand_stems)
-        
-        for existing in pool:
-            exist_stems = normalize(existing)
-            if len(exist_stems) < 2:
-                continue
-            exist_set = set(exist_stems)
-            
-            intersection = cand_set & exist_set
-            union = cand_set | exist_set
-            
-            # 1. Jaccard similarity
-            if union and len(intersection) / len(union) >= threshold:
-                return True
-            
-            # 2. Containment: 50%+ слов короткого текста содержится в длинном
-            smaller = min(len(cand_set), len(exist_set))
-            if smaller > 0 and len(intersection) / smaller >= 0.5:
-                return True
-            
-            # 3. Одинаковое начало (первые 2 контентных слова)
-            if len(cand_stems) >= 2 and len(exist_stems) >= 2:
-                if cand_stems[:2] == exist_stems[:2]:
-                    return True
-        
-        return False
+        return is_too_similar_to_pool(candidate, pool, threshold, lang="it")
 
     def _get_random_bonus_variation(self, original: str, is_bonus1: bool = True) -> str:
         """
@@ -2663,24 +886,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
     # СТРУКТУРЫ ПОСТОВ (ДЛЯ ПЕРЕМЕШИВАНИЯ БЛОКОВ)
     # ═══════════════════════════════════════════════════════════════════
     
-    STRUCTURE_TEMPLATES = [
-        # Классические (1 ссылка для итальянского!)
-        ["HOOK", "FACTS", "LINK1", "CTA"],                    # Стандарт
-        ["HOOK", "FACTS", "CTA", "LINK1"],                    # CTA перед ссылкой
-        ["FACTS", "HOOK", "LINK1", "CTA"],                    # Факты вперёд
-        # Агрессивные (ссылка раньше)
-        ["HOOK", "LINK1", "FACTS", "CTA"],                    # Ссылка в середине
-        ["LINK1", "HOOK", "FACTS", "CTA"],                    # Начинаем со ссылки
-        # Минималистичные
-        ["FACTS", "LINK1"],                                    # Только факты и ссылка
-        ["HOOK", "FACTS", "LINK1"],                            # Без CTA
-        ["FACTS", "CTA", "LINK1"],                             # Без хука
-        # Нестандартные
-        ["CTA", "HOOK", "FACTS", "LINK1"],                    # CTA вначале (вопрос)
-        ["HOOK", "CTA", "LINK1", "FACTS"],                    # Перемешанные
-        ["FACTS", "LINK1", "CTA"],                             # Компактный
-        ["HOOK", "LINK1", "CTA"],                              # Короткий с хуком
-    ]
+    STRUCTURE_TEMPLATES = PackField("it")
     
     def _parse_blocks(self, text: str) -> Dict[str, str]:
         """
@@ -2890,15 +1096,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
     # УНИКАЛЬНЫЕ ОПИСАНИЯ ПЕРСОНАЖЕЙ (для постов без имени стримера)
     # ═══════════════════════════════════════════════════════════════════
     
-    PERSON_VARIANTS = [
-        "un giocatore", "qualcuno", "uno scommettitore", "questo tipo",
-        "un giocatore casuale", "un tipo qualunque", 
-        "un tipo", "il nostro eroe", "questo giocatore",
-        "un coraggioso", "un tipo audace", "un fortunato", "un tipo fortunato",
-        "un temerario", "un ragazzo", "un tizio",
-        "un audace", "questo fortunato", "il vincitore",
-        "il protagonista", "questo utente", "un utente"
-    ]
+    PERSON_VARIANTS = PackField("it")
     
     def _get_random_person(self) -> str:
         """Возвращает случайное описание персонажа"""
@@ -3049,110 +1247,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
     # ПРОГРАММНАЯ РОТАЦИЯ 20 КАТЕГОРИЙ ФОРМАТОВ ССЫЛОК
     # ═══════════════════════════════════════════════════════════════════
     
-    LINK_FORMAT_CATEGORIES = {
-        # === Группа A: URL первый, одна строка ===
-        1: {
-            "type": "inline_url_first",
-            "prefixes": ["👉 ", "🔥 ", "💰 ", "🎁 ", "⚡ ", "💎 ", "🚀 ", "🎯 "],
-            "separator": " — ",
-        },
-        2: {
-            "type": "inline_url_first",
-            "prefixes": ["🔥🔥 ", "💰💰 ", "🎁🎁 ", "⚡⚡ ", "💎💎 "],
-            "separator": " — ",
-        },
-        3: {
-            "type": "inline_url_first",
-            "prefixes": ["→ ", "⟹ ", "↳ ", "▶ ", "☛ "],
-            "separator": " — ",
-        },
-        4: {
-            "type": "inline_url_first",
-            "prefixes": ["┃ ", "│ ", "▸ ", "• ", "◆ ", "► "],
-            "separator": " — ",
-        },
-        5: {
-            "type": "inline_url_first",
-            "prefixes": ["1️⃣ ", "▪️ ", "✦ ", "◇ ", "★ "],
-            "separator": " — ",
-        },
-        # === Группа B: URL первый, две строки ===
-        6: {
-            "type": "url_above_desc",
-            "url_prefixes": [""],
-            "desc_prefixes": [""],
-        },
-        7: {
-            "type": "url_above_desc",
-            "url_prefixes": ["👉 ", "🔥 ", "💰 ", "🎁 ", "⚡ "],
-            "desc_prefixes": [""],
-        },
-        8: {
-            "type": "url_above_desc",
-            "url_prefixes": [""],
-            "desc_prefixes": ["→ ", "👉 ", "🔥 ", "💰 ", "⚡ "],
-        },
-        # === Группа C: Описание первое ===
-        9: {
-            "type": "inline_desc_first",
-            "separators": [" — ", " – ", " - "],
-            "prefixes": [""],
-        },
-        10: {
-            "type": "desc_above_url",
-            "url_prefixes": [""],
-            "desc_prefixes": [""],
-        },
-        11: {
-            "type": "desc_above_url",
-            "url_prefixes": ["👉 ", "🔥 ", "➡️ ", "▶️ ", "⬇️ "],
-            "desc_prefixes": [""],
-        },
-        12: {
-            "type": "inline_desc_first",
-            "separators": [" — ", " – "],
-            "prefixes": ["Prendi: ", "Bonus: ", "Ecco: ", "Attiva: ", "Clicca: "],
-        },
-        # === Группа D: Гиперссылки ===
-        13: {
-            "type": "hyperlink",
-            "prefixes": [""],
-        },
-        14: {
-            "type": "hyperlink",
-            "prefixes": ["🎁 ", "🔥 ", "💰 ", "⚡ ", "💎 ", "🚀 ", "✨ ", "🎯 "],
-        },
-        # === Группа E: HTML-стилизованное описание ===
-        15: {
-            "type": "styled_desc_above_url",
-            "tag_open": "<b>", "tag_close": "</b>",
-            "url_prefixes": ["", "👉 "],
-        },
-        16: {
-            "type": "styled_inline_desc_first",
-            "tag_open": "<i>", "tag_close": "</i>",
-            "separators": [" — ", " – "],
-        },
-        17: {
-            "type": "styled_desc_above_url",
-            "tag_open": "<u>", "tag_close": "</u>",
-            "url_prefixes": ["", "👉 "],
-        },
-        18: {
-            "type": "styled_inline_desc_first",
-            "tag_open": "<b><i>", "tag_close": "</i></b>",
-            "separators": [" — ", " – "],
-        },
-        19: {
-            "type": "styled_desc_above_url",
-            "tag_open": "<code>", "tag_close": "</code>",
-            "url_prefixes": [""],
-        },
-        20: {
-            "type": "blockquote_desc",
-            "url_prefixes": ["", "👉 "],
-        },
-    }
+    LINK_FORMAT_CATEGORIES = PackField("it")
     
     def _extract_link_block_info(self, text: str, url: str) -> dict:
         """Находит URL и его описание бонуса в тексте."""
@@ -3318,16 +1413,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
     # ═══════════════════════════════════════════════════════════════════
     
     # 8 стилей форматирования (без plain — всегда форматируем)
-    BONUS_DESC_STYLES = [
-        "bold",                  # <b>текст</b>
-        "italic",                # <i>текст</i>
-        "bold_italic",           # <b><i>текст</i></b>
-        "underline",             # <u>текст</u>
-        "underline_bold",        # <u><b>текст</b></u>
-        "underline_italic",      # <u><i>текст</i></u>
-        "underline_bold_italic", # <u><b><i>текст</i></b></u>
-        "blockquote",            # <blockquote>текст</blockquote>
-    ]
+    BONUS_DESC_STYLES = PackField("it")
     
     def _wrap_desc_in_style(self, text: str, style: str) -> str:
         """Оборачивает текст в указанный HTML-стиль."""
@@ -3973,6 +2059,338 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         
         return text.strip()
     
+    def _postprocess_video_text(self, text: str, video: VideoData) -> str:
+        """
+        Синхронная цепочка постобработки принятого кандидата video-поста.
+
+        Вызывается через src.postprocess_pool — в пуле потоков, а не в event loop бота.
+        """
+        # Постобработка
+        text = self._filter_ai_responses(text)  # Убираем ответы AI типа "Ecco il post..."
+        text = self._postprocess_text(text, video.slot)
+        text = self._fix_broken_urls(text)
+        # _filter_non_russian НЕ используем для итальянского - она для русского
+        text = self._remove_chat_mentions(text)
+        text = self._remove_template_phrases(text)
+        text = self._randomize_currency_format(text, video)
+
+        # 🔗 Программная ротация формата ссылки (20 категорий)
+        text = self._reformat_link_blocks(text)
+
+        # 🎨 HTML-стиль описания бонуса (для категорий 1-12 без пре-стиля)
+        text = self._apply_bonus_desc_formatting(text)
+        return text
+
+    def _prepare_video_prompt(self, video: VideoData) -> VideoPromptParts:
+        """
+        Промпт одного видео-поста: структура, пользовательский промпт, значения
+        для системного промпта и блок цифр. Общая часть одиночной и пакетной генерации.
+        """
+        # Определяем, есть ли реальный ник стримера в исходных данных
+        has_real_streamer = video.has_streamer()
+
+        # Выбираем промпт в зависимости от наличия стримера
+        used_structure_index = -1
+        if has_real_streamer:
+            available_indices = list(range(len(self.VIDEO_POST_PROMPTS)))
+            structure_index = self._get_unused_structure_index(available_indices, used_count=15, slot=video.slot)
+            prompt_template = self.VIDEO_POST_PROMPTS[structure_index]
+            streamer_name = video.streamer.strip()
+            used_structure_index = structure_index
+        else:
+            available_indices = list(range(len(self.VIDEO_POST_PROMPTS_NO_STREAMER)))
+            structure_index = self._get_unused_structure_index(available_indices, used_count=10, slot=video.slot)
+            prompt_template = self.VIDEO_POST_PROMPTS_NO_STREAMER[structure_index]
+            streamer_name = ""
+            used_structure_index = structure_index + 1000
+
+        # Генерируем уникальное описание бонуса
+        bonus1_var = self._get_random_bonus_variation(self.bonus_data.bonus1_desc, is_bonus1=True)
+
+        # Форматируем данные
+        formatted_bet = video.get_formatted_bet()
+        formatted_win = video.get_formatted_win()
+        formatted_slot = video.get_formatted_slot()
+        currency_format = video.get_random_currency_format()
+        
+        # Если слот пустой, используем общие формулировки
+        slot_unknown = False
+        if not formatted_slot or formatted_slot.strip() == "":
+            slot_mention = "una slot"  # Общее упоминание
+            slot_bold = "una slot"  # Для HTML
+            slot_unknown = True
+        else:
+            slot_mention = formatted_slot
+            slot_bold = f"<b>{formatted_slot}</b>"
+
+        base_prompt = prompt_template.format(
+            streamer=streamer_name if has_real_streamer else self._get_random_person(),
+            slot=slot_bold,  # Используем форматированный слот
+            slot_plain=slot_mention,  # Простое упоминание без HTML
+            bet=formatted_bet,
+            win=formatted_win,
+            currency=currency_format,
+            multiplier=video.multiplier,
+            url1=self.bonus_data.url1,
+            bonus1=bonus1_var,
+            person=self._get_random_person()
+        )
+        
+        # КРИТИЧНО: Если слот неизвестен - ЗАПРЕЩАЕМ придумывать название!
+        if slot_unknown:
+            base_prompt = base_prompt + "\n\n🚨🚨🚨 MOLTO IMPORTANTE! 🚨🚨🚨\n" \
+                                        "Il nome della slot è SCONOSCIUTO — NON INVENTARE un nome specifico come 'Gates of Olympus', 'Big Bass', ecc.!\n" \
+                                        "USA SOLO frasi generali: 'una slot', 'un gioco', 'la macchina', 'i rulli'.\n" \
+                                        "VIETATO inventare nomi di slot che non sono nei dati originali!"
+
+        # Для системного промпта используем slot_mention (без HTML) или "una slot" если пусто
+        system_slot = slot_mention if formatted_slot and formatted_slot.strip() else "una slot"
+        
+        prompt_values = dict(
+            slot=system_slot,  # Используем простое упоминание без HTML
+            streamer=streamer_name,
+            url1=self.bonus_data.url1,
+            bonus1=bonus1_var,
+            currency=currency_format,
+            person=self._get_random_person()
+        )
+
+        # Генерируем инструкцию с форматом блока цифр (как в русском)
+        number_format_instruction = ""
+        if self._number_formats:
+            chosen_format = self._get_random_number_format(video.bet, video.win, video.multiplier)
+            number_format_instruction = f"""
+
+🚨🚨🚨 BLOCCO NUMERI OBBLIGATORIO — COPIALO NEL POST! 🚨🚨🚨
+
+{chosen_format}
+
+⛔ DIVIETO ASSOLUTO:
+❌ NON SCRIVERE le cifre di puntata/vincita/moltiplicatore con parole tue!
+❌ NON CREARE il tuo formato del blocco numeri!
+❌ NON USARE i dati bet/win/multiplier dalla sezione DATI per creare il tuo blocco!
+
+✅ COPIA SEMPLICEMENTE il blocco sopra UNA VOLTA nel post!
+✅ Puoi posizionarlo all'inizio, a metà o alla fine del post.
+
+🚨🚨🚨 SE SCRIVI I NUMERI IN MODO DIVERSO — IL POST SARÀ RIFIUTATO! 🚨🚨🚨
+"""
+
+        return VideoPromptParts(
+            base_prompt=base_prompt,
+            prompt_values=prompt_values,
+            has_real_streamer=has_real_streamer,
+            streamer_name=streamer_name,
+            used_structure_index=used_structure_index,
+            number_format_instruction=number_format_instruction,
+        )
+
+    def _build_examples_text(self) -> str:
+        """Блок примеров стиля из базы существующих постов для системного промпта."""
+        if not self._existing_posts:
+            return ""
+        # Берем 3 случайных поста как примеры стиля
+        example_posts = self._get_example_posts()
+        examples_text = "\n\n═══════════════════════════════════════════════════════════════\n"
+        examples_text += "📚 ESEMPI DEI TUOI POST ESISTENTI (studia lo stile!):\n"
+        examples_text += "═══════════════════════════════════════════════════════════════\n\n"
+        # Каждый пример и все вместе укладываются в бюджет токенов
+        example_previews = pack_items(example_posts, EXAMPLE_POST_TOKENS, EXAMPLES_TOTAL_TOKENS)
+        for i, post_preview in enumerate(example_previews, 1):
+            examples_text += f"ESEMPIO {i}:\n{post_preview}\n\n"
+        examples_text += "⚠️ IMPORTANTE: Studia la struttura, il tono, la formattazione di questi post.\n"
+        examples_text += "MA crea post NUOVI - NON copiare frasi e costruzioni!\n"
+        examples_text += "═══════════════════════════════════════════════════════════════\n"
+        return examples_text
+
+    def _reject(self, reason: str, text: str = "", detail: str = "") -> None:
+        """Запоминает причину отбраковки текста и возвращает None для _finalize_video_text."""
+        self._last_reject_reason = reason
+        self._last_rejected_text = text
+        self._last_reject_detail = detail
+        return None
+
+    def _record_outcome(self, accepted: bool, regen: int, seconds: float):
+        """Результат проверки поста — в телеметрию модели."""
+        get_model_telemetry().record_outcome(
+            self.model, accepted, "" if accepted else self._last_reject_reason, regen, seconds
+        )
+
+    async def _repair_text(self, text: str, reason: str, parts: VideoPromptParts) -> Optional[str]:
+        """
+        Точечный ремонт отклонённого текста дешёвой моделью: только текст и нарушенное правило.
+        Возвращает исправленный текст или None, если ремонт не удался.
+        """
+        rule = self.REPAIR_RULES.get(reason)
+        if not REPAIR_ENABLED or not rule or not text or not self.client:
+            return None
+        rule = safe_format(rule, **vars(self.bonus_data), streamer=parts.streamer_name,
+                           detail=self._last_reject_detail, length=len(text))
+        model = repair_model(self.use_openrouter, OPENROUTER_MODELS)
+        api_params = {
+            "model": model,
+            "messages": build_repair_messages(self.REPAIR_INSTRUCTION, rule, text),
+        }
+        if model in ["gpt-4.1-nano", "gpt-4.1-mini"]:
+            api_params["max_completion_tokens"] = REPAIR_MAX_TOKENS
+        else:
+            api_params["max_tokens"] = REPAIR_MAX_TOKENS
+            api_params["temperature"] = 0.2
+
+        print(f"   🩹 Ремонт ({reason}) моделью {model}...")
+        sys.stdout.flush()
+        try:
+            response = await timed_completion(self.client, api_params, "repair", timeout=REPAIR_TIMEOUT)
+        except Exception as e:
+            print(f"   🩹 Ремонт не удался: {e}")
+            return None
+        content = response.choices[0].message.content if response and response.choices else None
+        get_token_log().record("repair", model, api_params["messages"], getattr(response, "usage", None), content)
+        repaired = clean_repair_output(content)
+        return repaired or None
+
+    async def _finalize_video_text(self, text: str, video: VideoData, index: int,
+                                   parts: VideoPromptParts) -> Optional[GeneratedPostAI]:
+        """
+        Постобработка и проверки ответа модели для одного видео-поста.
+        Возвращает готовый пост или None, если текст нужно перегенерировать.
+        """
+        has_real_streamer, streamer_name = parts.has_real_streamer, parts.streamer_name
+        used_structure_index = parts.used_structure_index
+
+        # Постобработка — в пуле, чтобы не задерживать event loop
+        text = await run_postprocess(self._postprocess_video_text, text, video)
+
+        # 🚨 ЖЁСТКИЙ ЛИМИТ: Telegram caption = 1024 символа
+        if len(text) > 1020:
+            print(f"   ✂️ Текст слишком длинный ({len(text)}), сокращаем...")
+            text = await run_postprocess(self._smart_trim_text, text, 1000)
+            print(f"   ✅ После сокращения: {len(text)}")
+            sys.stdout.flush()
+
+        # Проверка упоминания стримера (если есть)
+        if has_real_streamer and streamer_name:
+            streamer_mentions = text.lower().count(streamer_name.lower())
+            # Ник должен быть упомянут 1 раз (допустимо 2 раза максимум)
+            if streamer_mentions < 1:
+                print(f"   ⚠️ Ник '{streamer_name}' не найден, регенерируем...")
+                sys.stdout.flush()
+                return self._reject("streamer", text)
+            if streamer_mentions > 2:
+                print(f"   ⚠️ Ник '{streamer_name}' найден {streamer_mentions} раз(а), должно быть 1-2. Регенерируем...")
+                sys.stdout.flush()
+                return self._reject("streamer", text)
+            
+            # Проверка что ник начинается с заглавной буквы
+            if streamer_name[0].isupper():
+                # Ищем ник в тексте и проверяем капитализацию
+                import re
+                # Находим все вхождения ника (учитывая возможные склонения)
+                base_nick = streamer_name.lower()
+                # Ищем точные совпадения с учетом регистра
+                if base_nick in text.lower() and not streamer_name in text:
+                    # Есть ник но в неправильном регистре
+                    print(f"   ⚠️ Ник '{streamer_name}' найден в неправильном регистре. Регенерируем...")
+                    sys.stdout.flush()
+                    return self._reject("streamer", text)
+
+        # Обрезка отключена - оставляем текст как есть
+
+        # КРИТИЧЕСКАЯ ПРОВЕРКА: Ссылка должна присутствовать в финальном тексте!
+        url1_present = self.bonus_data.url1 in text or (self.bonus_data.url1.replace('https://', '') in text)
+        
+        if not url1_present:
+            print(f"   ⚠️ Пропала ссылка url1. Регенерируем...")
+            sys.stdout.flush()
+            return self._reject("links_missing", text)
+        
+        # КРИТИЧНАЯ ПРОВЕРКА: Текст должен быть ТОЛЬКО на ИТАЛЬЯНСКОМ языке!
+        # Список частых английских ФРАЗ которые недопустимы
+        # ВАЖНО: Отдельные слова как "wild", "gate" НЕ проверяем - они могут быть в названиях слотов!
+        english_phrases = [
+            'the abyss', 'answered the call', 'summoning circle',
+            'play it safe', 'bright lights', 'chose to dive', 'deep into',
+            'dark forces', 'aligned', 'full-blown ritual', 'pulled straight',
+            'from the void', 'sometimes', 'when you stare', 'into the darkness',
+            'hands you', 'fortune in return', 'outcome is terrifyingly good',
+            'claim the', 'massive', 'boost', 'activate', 'balance power',
+            'visuals shifted', 'eerie sounds peaked', 'screen locked',
+            'random luck', 'felt like', 'handshake with the supernatural'
+        ]
+        
+        # Проверяем наличие английских фраз (НО ИСКЛЮЧАЕМ слова из названия слота и валюты!)
+        text_lower = text.lower()
+        slot_lower = video.slot.lower()
+        found_english = []
+        
+        # Список допустимых английских слов (валюты, аббревиатуры)
+        allowed_words = ['usd', 'eur', 'gbp', 'rub', 'fs', 'x', 'max', 'bet', 'win']
+        
+        for phrase in english_phrases:
+            phrase_lower = phrase.lower()
+            # Проверяем есть ли фраза в тексте
+            if phrase_lower in text_lower:
+                # Пропускаем если это допустимое слово
+                if phrase_lower in allowed_words:
+                    continue
+                
+                # Проверяем - не является ли эта фраза частью названия слота
+                # Например: "wild" есть в "2 wild 2 die"
+                if phrase_lower not in slot_lower:
+                    found_english.append(phrase)
+        
+        # Если нашли английские фразы (которые НЕ из названия слота) - регенерируем
+        if found_english:
+            print(f"   ⚠️ Обнаружен английский текст: {', '.join(found_english[:3])}... Регенерируем с РУССКИМ языком!")
+            sys.stdout.flush()
+            return self._reject("language", text, ", ".join(found_english[:5]))
+
+        # Уникальность среди уже сгенерированных
+        if text in self._generated_posts:
+            print(f"   ⚠️ Дубликат текста для поста #{index}, регенерируем...")
+            sys.stdout.flush()
+            return self._reject("duplicate", text)
+
+        # Сохраняем
+        self._generated_posts.append(text)
+
+        # История структур
+        if used_structure_index >= 0:
+            self._used_structures.append(used_structure_index)
+            if len(self._used_structures) > 50:
+                self._used_structures = self._used_structures[-50:]
+
+            slot_key = video.slot.lower()
+            if slot_key not in self._used_slot_structure:
+                self._used_slot_structure[slot_key] = []
+            self._used_slot_structure[slot_key].append(used_structure_index)
+            if len(self._used_slot_structure[slot_key]) > 20:
+                self._used_slot_structure[slot_key] = self._used_slot_structure[slot_key][-20:]
+
+        post_start = self._extract_post_start(text, length=100)
+        self._used_starts.append(post_start)
+        if len(self._used_starts) > 30:
+            self._used_starts = self._used_starts[-30:]
+
+        emoji_pattern = self._extract_emoji_pattern(text)
+        if emoji_pattern:
+            self._used_emoji_patterns.append(emoji_pattern)
+            if len(self._used_emoji_patterns) > 30:
+                self._used_emoji_patterns = self._used_emoji_patterns[-30:]
+
+        print(f"   ✅ Пост #{index} готов (длина: {len(text)})")
+        sys.stdout.flush()
+
+        return GeneratedPostAI(
+            index=index,
+            media_type="video",
+            text=text,
+            streamer=video.streamer,
+            slot=video.slot,
+            bet=video.bet,
+            win=video.win
+        )
+
     async def generate_video_post(self, video: VideoData, index: int = 0) -> GeneratedPostAI:
         """
         Генерирует уникальный пост для видео.
@@ -3993,64 +2411,16 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         max_regens = 10  # нормальные ретраи генерации (не завязаны на index)
         last_error = None
 
+        set_cost_post(index)
         for regen in range(1, max_regens + 1):
+            regen_started = time.monotonic()
             try:
-                # Определяем, есть ли реальный ник стримера в исходных данных
-                has_real_streamer = video.has_streamer()
-
-                # Выбираем промпт в зависимости от наличия стримера
-                used_structure_index = -1
-                if has_real_streamer:
-                    available_indices = list(range(len(self.VIDEO_POST_PROMPTS)))
-                    structure_index = self._get_unused_structure_index(available_indices, used_count=15, slot=video.slot)
-                    prompt_template = self.VIDEO_POST_PROMPTS[structure_index]
-                    streamer_name = video.streamer.strip()
-                    used_structure_index = structure_index
-                else:
-                    available_indices = list(range(len(self.VIDEO_POST_PROMPTS_NO_STREAMER)))
-                    structure_index = self._get_unused_structure_index(available_indices, used_count=10, slot=video.slot)
-                    prompt_template = self.VIDEO_POST_PROMPTS_NO_STREAMER[structure_index]
-                    streamer_name = ""
-                    used_structure_index = structure_index + 1000
-
-                # Генерируем уникальное описание бонуса
-                bonus1_var = self._get_random_bonus_variation(self.bonus_data.bonus1_desc, is_bonus1=True)
-
-                # Форматируем данные
-                formatted_bet = video.get_formatted_bet()
-                formatted_win = video.get_formatted_win()
-                formatted_slot = video.get_formatted_slot()
-                currency_format = video.get_random_currency_format()
-                
-                # Если слот пустой, используем общие формулировки
-                slot_unknown = False
-                if not formatted_slot or formatted_slot.strip() == "":
-                    slot_mention = "una slot"  # Общее упоминание
-                    slot_bold = "una slot"  # Для HTML
-                    slot_unknown = True
-                else:
-                    slot_mention = formatted_slot
-                    slot_bold = f"<b>{formatted_slot}</b>"
-
-                base_prompt = prompt_template.format(
-                    streamer=streamer_name if has_real_streamer else self._get_random_person(),
-                    slot=slot_bold,  # Используем форматированный слот
-                    slot_plain=slot_mention,  # Простое упоминание без HTML
-                    bet=formatted_bet,
-                    win=formatted_win,
-                    currency=currency_format,
-                    multiplier=video.multiplier,
-                    url1=self.bonus_data.url1,
-                    bonus1=bonus1_var,
-                    person=self._get_random_person()
-                )
-                
-                # КРИТИЧНО: Если слот неизвестен - ЗАПРЕЩАЕМ придумывать название!
-                if slot_unknown:
-                    base_prompt = base_prompt + "\n\n🚨🚨🚨 MOLTO IMPORTANTE! 🚨🚨🚨\n" \
-                                                "Il nome della slot è SCONOSCIUTO — NON INVENTARE un nome specifico come 'Gates of Olympus', 'Big Bass', ecc.!\n" \
-                                                "USA SOLO frasi generali: 'una slot', 'un gioco', 'la macchina', 'i rulli'.\n" \
-                                                "VIETATO inventare nomi di slot che non sono nei dati originali!"
+                # Бюджет прогона (RUN_BUDGET_USD) исчерпан — новые регены не начинаем
+                check_run_budget()
+                parts = self._prepare_video_prompt(video)
+                base_prompt, prompt_values = parts.base_prompt, parts.prompt_values
+                has_real_streamer, streamer_name = parts.has_real_streamer, parts.streamer_name
+                number_format_instruction = parts.number_format_instruction
 
                 streamer_info = streamer_name if has_real_streamer else "без ника (общие формулировки)"
                 print(f"🤖 Генерация поста #{index} (regen {regen}/{max_regens}) для {streamer_info} на {video.slot}...")
@@ -4062,59 +2432,19 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                 raw_system_prompt = self._get_system_prompt()
                 
                 # Добавляем примеры из существующих постов для обучения AI
-                if self._existing_posts and len(self._existing_posts) > 0:
-                    # Берем 3 случайных поста как примеры стиля
-                    example_posts = random.sample(self._existing_posts, min(3, len(self._existing_posts)))
-                    examples_text = "\n\n═══════════════════════════════════════════════════════════════\n"
-                    examples_text += "📚 ESEMPI DEI TUOI POST ESISTENTI (studia lo stile!):\n"
-                    examples_text += "═══════════════════════════════════════════════════════════════\n\n"
-                    for i, post in enumerate(example_posts, 1):
-                        # Обрезаем до 500 символов
-                        post_preview = post[:500] + "..." if len(post) > 500 else post
-                        examples_text += f"ESEMPIO {i}:\n{post_preview}\n\n"
-                    examples_text += "⚠️ IMPORTANTE: Studia la struttura, il tono, la formattazione di questi post.\n"
-                    examples_text += "MA crea post NUOVI - NON copiare frasi e costruzioni!\n"
-                    examples_text += "═══════════════════════════════════════════════════════════════\n"
-                    
-                    raw_system_prompt = raw_system_prompt + examples_text
+                raw_system_prompt = raw_system_prompt + self._build_examples_text()
                 
-                # Для системного промпта используем slot_mention (без HTML) или "una slot" если пусто
-                system_slot = slot_mention if formatted_slot and formatted_slot.strip() else "una slot"
-                
-                system_prompt = safe_format(
-                    raw_system_prompt,
-                    slot=system_slot,  # Используем простое упоминание без HTML
-                    streamer=streamer_name,
-                    url1=self.bonus_data.url1,
-                    bonus1=bonus1_var,
-                    currency=currency_format,
-                    person=self._get_random_person()
-                )
+                if self.cache_friendly_prompts:
+                    # Поля поста — метками в системном промпте, значения — в сообщении пользователя
+                    system_prompt, post_data_note = split_cacheable_prompt(
+                        raw_system_prompt, prompt_values, self.POST_DATA_HEADER
+                    )
+                else:
+                    system_prompt, post_data_note = safe_format(raw_system_prompt, **prompt_values), ""
 
                 anti_repetition = self._get_anti_repetition_instruction()
                 length_note = ""
                 text = None
-                
-                # Генерируем инструкцию с форматом блока цифр (как в русском)
-                number_format_instruction = ""
-                if self._number_formats:
-                    chosen_format = self._get_random_number_format(video.bet, video.win, video.multiplier)
-                    number_format_instruction = f"""
-
-🚨🚨🚨 BLOCCO NUMERI OBBLIGATORIO — COPIALO NEL POST! 🚨🚨🚨
-
-{chosen_format}
-
-⛔ DIVIETO ASSOLUTO:
-❌ NON SCRIVERE le cifre di puntata/vincita/moltiplicatore con parole tue!
-❌ NON CREARE il tuo formato del blocco numeri!
-❌ NON USARE i dati bet/win/multiplier dalla sezione DATI per creare il tuo blocco!
-
-✅ COPIA SEMPLICEMENTE il blocco sopra UNA VOLTA nel post!
-✅ Puoi posizionarlo all'inizio, a metà o alla fine del post.
-
-🚨🚨🚨 SE SCRIVI I NUMERI IN MODO DIVERSO — IL POST SARÀ RIFIUTATO! 🚨🚨🚨
-"""
 
                 # Генерируем до 3 попыток внутри одной регенерации (короткий/длинный)
                 for attempt in range(3):
@@ -4127,7 +2457,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                         print(f"   📝 Промпт (первые 200 символов): {base_prompt[:200]}...")
                         sys.stdout.flush()
 
-                    user_prompt = base_prompt + number_format_instruction + length_note + anti_repetition
+                    user_prompt = post_data_note + base_prompt + number_format_instruction + length_note + anti_repetition
 
                     api_params = {
                         "model": self.model,
@@ -4149,22 +2479,24 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                         api_params["frequency_penalty"] = 0.6
 
                     try:
-                        response = await asyncio.wait_for(
-                            self.client.chat.completions.create(**api_params),
-                            timeout=120
+                        # При LLM_HEDGING=1 — дубль в резервную модель, если основная не уложилась в свой p90
+                        response = await hedged_completion(
+                            self.client, api_params, timeout=120,
+                            models=OPENROUTER_MODELS if self.use_openrouter else None,
+                            purpose="video_post"
                         )
                     except asyncio.TimeoutError:
                         print(f"   ⏰ Таймаут 120с для модели {self.model}, попытка {attempt + 1}/3")
                         sys.stdout.flush()
                         if attempt == 2:
                             raise Exception(f"Таймаут: модель {self.model} не ответила за 120с (3 попытки)")
-                        await asyncio.sleep(2)
+                        await pace(2)
                         continue
 
                     if not response or not response.choices:
                         if attempt == 2:
                             raise Exception("Пустой ответ от API после всех попыток")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     choice = response.choices[0]
@@ -4175,14 +2507,16 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                     if finish_reason == "content_filter":
                         if attempt == 2:
                             raise Exception("Контент был отфильтрован после всех попыток")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     message_content = getattr(getattr(choice, "message", None), "content", None)
+                    get_token_log().record("video_post", self.model, api_params["messages"],
+                                           getattr(response, "usage", None), message_content)
                     if not message_content:
                         if attempt == 2:
                             raise Exception(f"Ответ без content после всех попыток. finish_reason={finish_reason}")
-                        await asyncio.sleep(1)
+                        await pace(1)
                         continue
 
                     raw_text = message_content.strip()
@@ -4212,163 +2546,144 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                     length_note = "\n\n⚠️ Il post è troppo CORTO! Aggiungi più dettagli, emozioni, descrizione. Minimo 550 caratteri!"
                     text = candidate
 
+                # Все попытки вне окна длины — сначала точечный ремонт, а не текст как есть
+                if text is not None and not 500 <= len(text) <= 1000:
+                    repaired = await self._repair_text(text, "length", parts)
+                    if repaired and 500 <= len(repaired) <= 1000:
+                        print(f"   🩹 Длина исправлена: {len(text)} → {len(repaired)}")
+                        text = repaired
+
                 if text is None or len(text) < 300:
                     raise Exception("Не удалось получить валидный текст от API")
 
-                # Постобработка
-                text = self._filter_ai_responses(text)  # Убираем ответы AI типа "Ecco il post..."
-                text = self._postprocess_text(text, video.slot)
-                text = self._fix_broken_urls(text)
-                # _filter_non_russian НЕ используем для итальянского - она для русского
-                text = self._remove_chat_mentions(text)
-                text = self._remove_template_phrases(text)
-                text = self._randomize_currency_format(text, video)
-
-                # 🔗 Программная ротация формата ссылки (20 категорий)
-                text = self._reformat_link_blocks(text)
-
-                # 🎨 HTML-стиль описания бонуса (для категорий 1-12 без пре-стиля)
-                text = self._apply_bonus_desc_formatting(text)
-                
-                # 🚨 ЖЁСТКИЙ ЛИМИТ: Telegram caption = 1024 символа
-                if len(text) > 1020:
-                    print(f"   ✂️ Текст слишком длинный ({len(text)}), сокращаем...")
-                    text = self._smart_trim_text(text, 1000)
-                    print(f"   ✅ После сокращения: {len(text)}")
-                    sys.stdout.flush()
-
-                # Проверка упоминания стримера (если есть)
-                if has_real_streamer and streamer_name:
-                    streamer_mentions = text.lower().count(streamer_name.lower())
-                    # Ник должен быть упомянут 1 раз (допустимо 2 раза максимум)
-                    if streamer_mentions < 1:
-                        print(f"   ⚠️ Ник '{streamer_name}' не найден, регенерируем...")
-                        sys.stdout.flush()
-                        continue
-                    if streamer_mentions > 2:
-                        print(f"   ⚠️ Ник '{streamer_name}' найден {streamer_mentions} раз(а), должно быть 1-2. Регенерируем...")
-                        sys.stdout.flush()
-                        continue
-                    
-                    # Проверка что ник начинается с заглавной буквы
-                    if streamer_name[0].isupper():
-                        # Ищем ник в тексте и проверяем капитализацию
-                        import re
-                        # Находим все вхождения ника (учитывая возможные склонения)
-                        base_nick = streamer_name.lower()
-                        # Ищем точные совпадения с учетом регистра
-                        if base_nick in text.lower() and not streamer_name in text:
-                            # Есть ник но в неправильном регистре
-                            print(f"   ⚠️ Ник '{streamer_name}' найден в неправильном регистре. Регенерируем...")
-                            sys.stdout.flush()
-                            continue
-
-                # Обрезка отключена - оставляем текст как есть
-
-                # КРИТИЧЕСКАЯ ПРОВЕРКА: Ссылка должна присутствовать в финальном тексте!
-                url1_present = self.bonus_data.url1 in text or (self.bonus_data.url1.replace('https://', '') in text)
-                
-                if not url1_present:
-                    print(f"   ⚠️ Пропала ссылка url1. Регенерируем...")
-                    sys.stdout.flush()
-                    continue
-                
-                # КРИТИЧНАЯ ПРОВЕРКА: Текст должен быть ТОЛЬКО на ИТАЛЬЯНСКОМ языке!
-                # Список частых английских ФРАЗ которые недопустимы
-                # ВАЖНО: Отдельные слова как "wild", "gate" НЕ проверяем - они могут быть в названиях слотов!
-                english_phrases = [
-                    'the abyss', 'answered the call', 'summoning circle',
-                    'play it safe', 'bright lights', 'chose to dive', 'deep into',
-                    'dark forces', 'aligned', 'full-blown ritual', 'pulled straight',
-                    'from the void', 'sometimes', 'when you stare', 'into the darkness',
-                    'hands you', 'fortune in return', 'outcome is terrifyingly good',
-                    'claim the', 'massive', 'boost', 'activate', 'balance power',
-                    'visuals shifted', 'eerie sounds peaked', 'screen locked',
-                    'random luck', 'felt like', 'handshake with the supernatural'
-                ]
-                
-                # Проверяем наличие английских фраз (НО ИСКЛЮЧАЕМ слова из названия слота и валюты!)
-                text_lower = text.lower()
-                slot_lower = video.slot.lower()
-                found_english = []
-                
-                # Список допустимых английских слов (валюты, аббревиатуры)
-                allowed_words = ['usd', 'eur', 'gbp', 'rub', 'fs', 'x', 'max', 'bet', 'win']
-                
-                for phrase in english_phrases:
-                    phrase_lower = phrase.lower()
-                    # Проверяем есть ли фраза в тексте
-                    if phrase_lower in text_lower:
-                        # Пропускаем если это допустимое слово
-                        if phrase_lower in allowed_words:
-                            continue
-                        
-                        # Проверяем - не является ли эта фраза частью названия слота
-                        # Например: "wild" есть в "2 wild 2 die"
-                        if phrase_lower not in slot_lower:
-                            found_english.append(phrase)
-                
-                # Если нашли английские фразы (которые НЕ из названия слота) - регенерируем
-                if found_english:
-                    print(f"   ⚠️ Обнаружен английский текст: {', '.join(found_english[:3])}... Регенерируем с РУССКИМ языком!")
-                    sys.stdout.flush()
-                    continue
-
-                # Уникальность среди уже сгенерированных
-                if text in self._generated_posts:
-                    print(f"   ⚠️ Дубликат текста для поста #{index}, регенерируем...")
-                    sys.stdout.flush()
+                post = await self._finalize_video_text(text, video, index, parts)
+                self._record_outcome(post is not None, regen, time.monotonic() - regen_started)
+                if post is None and self._last_reject_reason in REPAIRABLE_REASONS:
+                    # Локальное нарушение — чиним черновик точечно, полная регенерация только если не вышло
+                    repair_started = time.monotonic()
+                    reason = self._last_reject_reason
+                    repaired = await self._repair_text(self._last_rejected_text, reason, parts)
+                    if repaired:
+                        post = await self._finalize_video_text(repaired, video, index, parts)
+                        get_model_telemetry().record_outcome(
+                            repair_model(self.use_openrouter, OPENROUTER_MODELS), post is not None,
+                            "" if post is not None else self._last_reject_reason, regen, time.monotonic() - repair_started
+                        )
+                        print(f"   🩹 Ремонт {'удался' if post is not None else 'не помог, полная регенерация'}")
+                settle_attempt(int(post is not None), int(post is None))
+                if post is None:
                     continue
+                return post
 
-                # Сохраняем
-                self._generated_posts.append(text)
-
-                # История структур
-                if used_structure_index >= 0:
-                    self._used_structures.append(used_structure_index)
-                    if len(self._used_structures) > 50:
-                        self._used_structures = self._used_structures[-50:]
-
-                    slot_key = video.slot.lower()
-                    if slot_key not in self._used_slot_structure:
-                        self._used_slot_structure[slot_key] = []
-                    self._used_slot_structure[slot_key].append(used_structure_index)
-                    if len(self._used_slot_structure[slot_key]) > 20:
-                        self._used_slot_structure[slot_key] = self._used_slot_structure[slot_key][-20:]
-
-                post_start = self._extract_post_start(text, length=100)
-                self._used_starts.append(post_start)
-                if len(self._used_starts) > 30:
-                    self._used_starts = self._used_starts[-30:]
-
-                emoji_pattern = self._extract_emoji_pattern(text)
-                if emoji_pattern:
-                    self._used_emoji_patterns.append(emoji_pattern)
-                    if len(self._used_emoji_patterns) > 30:
-                        self._used_emoji_patterns = self._used_emoji_patterns[-30:]
-
-                print(f"   ✅ Пост #{index} готов (длина: {len(text)})")
-                sys.stdout.flush()
-
-                return GeneratedPostAI(
-                    index=index,
-                    media_type="video",
-                    text=text,
-                    streamer=video.streamer,
-                    slot=video.slot,
-                    bet=video.bet,
-                    win=video.win
-                )
-
+            except (CircuitOpenError, BudgetExceeded):
+                # Модель отключена после серии ошибок или бюджет исчерпан — не тратим регены
+                raise
             except Exception as e:
                 last_error = e
+                self._last_reject_reason = "error"
+                self._record_outcome(False, regen, time.monotonic() - regen_started)
+                settle_attempt(0, 1)
                 print(f"❌ Ошибка генерации поста #{index} (regen {regen}/{max_regens}): {e}")
                 sys.stdout.flush()
-                await asyncio.sleep(0.5)
+                await pace(0.5)
                 continue
 
         raise Exception(f"Не удалось сгенерировать пост после {max_regens} попыток: {last_error}")
     
+    async def generate_video_posts_batch(self, videos: List[VideoData],
+                                         start_index: int = 0) -> List[Optional[GeneratedPostAI]]:
+        """
+        Пакетный режим: один запрос к модели на несколько видео (см. src/batch_generation.py).
+
+        Каждый пост из ответа проходит те же проверки и постобработку, что и в
+        generate_video_post. На месте отклонённых — None: их перегенерирует
+        вызывающий код по одному.
+        """
+        if not self.client or not self.bonus_data or not videos:
+            return [None] * len(videos)
+
+        parts = [self._prepare_video_prompt(video) for video in videos]
+        raw_system_prompt = self._get_system_prompt() + self._build_examples_text()
+        # Поля постов в системном промпте — метками, значения — в секции каждого поста
+        system_prompt, _ = split_cacheable_prompt(raw_system_prompt, parts[0].prompt_values, self.POST_DATA_HEADER)
+        sections = []
+        for n, part in enumerate(parts, 1):
+            _, post_data_note = split_cacheable_prompt(raw_system_prompt, part.prompt_values, self.POST_DATA_HEADER)
+            sections.append(
+                self.BATCH_ITEM_HEADER.format(n=n) + "\n" + post_data_note
+                + part.base_prompt + part.number_format_instruction
+            )
+        user_prompt = (
+            "\n\n".join(sections)
+            + self._get_anti_repetition_instruction()
+            + self.BATCH_OUTPUT_INSTRUCTION.format(count=len(videos))
+        )
+
+        api_params = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        }
+        if self.model in ["gpt-4.1-nano", "gpt-4.1-mini"]:
+            api_params["max_completion_tokens"] = 8000
+        elif self.use_openrouter:
+            api_params["max_tokens"] = 16000
+            api_params["temperature"] = 0.95
+        else:
+            api_params["max_tokens"] = 1500 * len(videos)
+            api_params["temperature"] = 0.95
+
+        last_index = start_index + len(videos) - 1
+        print(f"🤖 Пакетная генерация постов #{start_index}-#{last_index} ({len(videos)} шт.), модель {self.model}...")
+        sys.stdout.flush()
+        set_cost_post(None)
+        # Бюджет прогона (RUN_BUDGET_USD) проверяется и перед пакетом: BudgetExceeded
+        # уходит в generate_all_posts, который возвращает частичный результат
+        check_run_budget()
+        batch_started = time.monotonic()
+        try:
+            response = await timed_completion(self.client, api_params, "video_post_batch", timeout=180)
+            content = response.choices[0].message.content if response and response.choices else None
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"   ⚠️ Пакетный запрос не удался ({e}), посты будут сгенерированы по одному")
+            sys.stdout.flush()
+            return [None] * len(videos)
+        get_token_log().record("video_post_batch", self.model, api_params["messages"],
+                               getattr(response, "usage", None), content)
+
+        texts = parse_batch_response(content, len(videos))
+        # Время пакета делим поровну между постами — для сравнения с одиночной генерацией
+        per_post_seconds = (time.monotonic() - batch_started) / len(videos)
+        results: List[Optional[GeneratedPostAI]] = []
+        for n, (video, part) in enumerate(zip(videos, parts), 1):
+            index = start_index + n - 1
+            text = strip_section_markers(texts.get(n, ""))
+            # То же окно длины, что и в generate_video_post
+            if not 500 <= len(text) <= 1000:
+                print(f"   ⚠️ Пакет: пост #{index} пропущен или вне окна длины ({len(text)}), перегенерируем отдельно")
+                self._last_reject_reason = "length"
+                self._record_outcome(False, 0, per_post_seconds)
+                results.append(None)
+                continue
+            try:
+                post = await self._finalize_video_text(text, video, index, part)
+            except Exception as e:
+                print(f"   ⚠️ Пакет: пост #{index} не прошёл постобработку: {e}")
+                self._last_reject_reason = "error"
+                post = None
+            self._record_outcome(post is not None, 0, per_post_seconds)
+            results.append(post)
+
+        accepted = sum(post is not None for post in results)
+        settle_attempt(accepted, len(videos) - accepted)
+        print(f"   📦 Пакет: принято {accepted}/{len(videos)}")
+        sys.stdout.flush()
+        return results
+
     async def generate_image_post(self, index: int = 0) -> GeneratedPostAI:
         """
         Генерирует уникальный пост для картинки (бонусы).
@@ -4388,8 +2703,10 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         max_regens = 5  # для image постов достаточно 5 попыток
         last_error = None
 
+        set_cost_post(index)
         for regen in range(1, max_regens + 1):
             try:
+                check_run_budget()
                 # Выбираем случайный промпт
                 prompt_template = random.choice(self.IMAGE_POST_PROMPTS)
                 
@@ -4438,10 +2755,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                     api_params["frequency_penalty"] = 0.6
                 
                 try:
-                    response = await asyncio.wait_for(
-                        self.client.chat.completions.create(**api_params),
-                        timeout=120
-                    )
+                    response = await timed_completion(self.client, api_params, "image_post", timeout=120)
                 except asyncio.TimeoutError:
                     raise Exception(f"Таймаут: модель {self.model} не ответила за 120с")
                 
@@ -4516,10 +2830,14 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
                     text=text
                 )
 
+            except (CircuitOpenError, BudgetExceeded) as e:
+                last_error = e
+                print(f"❌ {e}")
+                break
             except Exception as e:
                 last_error = e
                 print(f"❌ Ошибка генерации image поста #{index} (regen {regen}/{max_regens}): {e}")
-                await asyncio.sleep(0.5)
+                await pace(0.5)
                 continue
         
         # Если все попытки провалились - возвращаем fallback
@@ -4538,7 +2856,8 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         self, 
         videos: List[VideoData], 
         image_count: int = 0,
-        progress_callback=None
+        progress_callback=None,
+        job=None
     ) -> List[GeneratedPostAI]:
         """
         Генерирует все посты с сохранением промежуточных результатов.
@@ -4547,6 +2866,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
             videos: Список данных о видео
             image_count: Количество постов с картинками
             progress_callback: async функция(current, total) для отчёта о прогрессе
+            job: Job из src.job_manager — пауза/остановка и счётчики прогресса (опционально)
             
         Returns:
             Список сгенерированных постов
@@ -4560,17 +2880,34 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         last_error = None
         
         # Генерируем посты для видео
+        use_batch = batch_enabled(self.model)
+        batched: Dict[int, GeneratedPostAI] = {}
         for i, video in enumerate(videos):
+            if job is not None and not await job.checkpoint():
+                print(f"🛑 Генерация остановлена пользователем после {len(posts)}/{total} постов")
+                break
             try:
-                post = await self.generate_video_post(video, current)
+                if use_batch and i % BATCH_GENERATION_SIZE == 0:
+                    chunk = videos[i:i + BATCH_GENERATION_SIZE]
+                    ready = await self.generate_video_posts_batch(chunk, current)
+                    batched = {i + k: post for k, post in enumerate(ready) if post is not None}
+                post = batched.pop(i, None)
+                from_batch = post is not None
+                if post is None:
+                    # Одиночная генерация — обычный режим и добор отклонённых из пакета
+                    post = await self.generate_video_post(video, current)
                 posts.append(post)
                 current += 1
+                if job is not None:
+                    job.advance()
+                    job.save_item(post.index, post)
                 
                 if progress_callback:
                     await progress_callback(current, total)
                 
                 # Небольшая задержка чтобы не перегружать API
-                await asyncio.sleep(0.5)
+                if not from_batch:
+                    await pace(0.5)
                 
             except Exception as e:
                 last_error = e
@@ -4582,15 +2919,20 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         # Генерируем посты для картинок (только если нет критической ошибки)
         if last_error is None:
             for i in range(image_count):
+                if job is not None and not await job.checkpoint():
+                    break
                 try:
                     post = await self.generate_image_post(current)
                     posts.append(post)
                     current += 1
+                    if job is not None:
+                        job.advance()
+                        job.save_item(post.index, post)
                     
                     if progress_callback:
                         await progress_callback(current, total)
                     
-                    await asyncio.sleep(0.5)
+                    await pace(0.5)
                     
                 except Exception as e:
                     last_error = e
@@ -4673,57 +3015,7 @@ FORMATTAZIONE (CRITICO! USA TUTTI I TAG!):
         }
     }
     
-    UNIQUENESS_CHECK_PROMPT = """Sei un esperto nella verifica dell'unicità dei contenuti per Telegram.
-
-⚠️ IMPORTANTE: Le righe con URL e le descrizioni dei bonus/promozioni sono già state RIMOSSE dai testi.
-Confronta SOLO il testo principale dell'autore.
-
-Ti vengono dati {count} post. Il tuo compito è trovare post SIMILI.
-
-CRITERI DI SOMIGLIANZA (se almeno 1 coincide - è un duplicato):
-1. Inizio identico (le prime 5-10 parole coincidono o sono molto simili nel significato)
-2. Struttura identica (entrambi iniziano con domanda / entrambi con esclamazione / entrambi con numero)
-3. Frasi ripetute (3+ parole consecutive appaiono in entrambi i post)
-4. Significato simile (descrivono la stessa cosa con parole diverse, stessa "storia")
-5. Pattern emoji identici (entrambi iniziano con stessi emoji, entrambi finiscono uguale)
-6. ELEMENTI TEMPLATE (questo è CRITICO!):
-   - "PULSANTE №1", "PULSANTE №2" o marcatori simili
-   - Separatori identici (—•—🍉🔥🍓—•—, ◈◈◈, ~~~)
-   - Designazioni identiche dei link ("👇 primo 👇", "👇 secondo 👇")
-   - Struttura ripetuta di posizionamento dei link (entrambi all'inizio/entrambi alla fine/entrambi tra paragrafi)
-
-POST PER L'ANALISI:
-{posts_json}
-
-RISPONDI RIGOROSAMENTE IN FORMATO JSON (senza markdown, senza ```json):
-{{
-  "duplicates": [
-    {{"post1": 3, "post2": 17, "reason": "inizio identico: 'Guarda cosa sta succedendo'", "similarity": 85}},
-    {{"post1": 8, "post2": 45, "reason": "ripetizione di frase: 'il risultato è semplicemente esploso'", "similarity": 70}}
-  ],
-  "warnings": [
-    {{"post": 5, "issue": "post troppo corto"}},
-    {{"post": 12, "issue": "senza invito all'azione"}}
-  ],
-  "total_unique": 78,
-  "total_duplicates": 2,
-  "summary": "Trovate 2 coppie di post simili su 80. Consiglio di rigenerare i post #17 e #45."
-}}
-
-Se TUTTI i post sono unici:
-{{
-  "duplicates": [],
-  "warnings": [],
-  "total_unique": {count},
-  "total_duplicates": 0,
-  "summary": "Tutti i {count} post sono unici! Ottimo lavoro."
-}}
-
-IMPORTANTE: 
-- Verifica TUTTE le coppie di post
-- Considera i post per UNA slot - tendono ad essere più simili
-- similarity - percentuale di somiglianza (50-100)
-- Rispondi SOLO JSON, senza spiegazioni"""
+    UNIQUENESS_CHECK_PROMPT = PackField("it")
 
     @staticmethod
     def _strip_link_blocks_for_comparison(text: str) -> str:
@@ -4790,7 +3082,6 @@ IMPORTANTE:
             }
         """
         import json
-        import aiohttp
         
         # Получаем модель
         model_info = self.UNIQUENESS_CHECK_MODELS.get(model)
@@ -4805,13 +3096,13 @@ IMPORTANTE:
             posts_data.append({
                 "id": i + 1,
                 "slot": slot,
-                "text": cleaned[:400] + "..." if len(cleaned) > 400 else cleaned
+                "text": trim_to_tokens(cleaned, UNIQUENESS_POST_TOKENS)
             })
         
         # Формируем промпт
         prompt = self.UNIQUENESS_CHECK_PROMPT.format(
             count=len(posts),
-            posts_json=json.dumps(posts_data, ensure_ascii=False, indent=2)
+            posts_json=compact_json(posts_data)
         )
         
         # Добавляем существующие посты если они есть
@@ -4822,13 +3113,13 @@ IMPORTANTE:
             for i, post in enumerate(sample_existing, 1):
                 existing_preview.append({
                     "id": f"OLD_{i}",
-                    "text": post[:300] + "..." if len(post) > 300 else post
+                    "text": trim_to_tokens(post, UNIQUENESS_EXISTING_TOKENS)
                 })
             
             prompt += f"\n\n════════════════════════════════════════════════════════════\n"
             prompt += f"📚 СУЩЕСТВУЮЩИЕ ПОСТЫ (из базы {len(self._existing_posts)} постов):\n"
             prompt += f"════════════════════════════════════════════════════════════\n"
-            prompt += json.dumps(existing_preview, ensure_ascii=False, indent=2)
+            prompt += compact_json(existing_preview)
             prompt += f"\n\n⚠️ ВАЖНО: Проверь также что НОВЫЕ посты НЕ ПОХОЖИ на СУЩЕСТВУЮЩИЕ!\n"
             prompt += f"Если новый пост похож на существующий - это КРИТИЧЕСКИЙ дубль!\n"
 
@@ -4843,7 +3134,8 @@ IMPORTANTE:
 
         try:
             # Вызываем OpenRouter API
-            async with aiohttp.ClientSession() as session:
+            uniqueness_started = time.monotonic()
+            async with http_session() as session:
                 headers = {
                     "Authorization": f"Bearer {openrouter_key}",
                     "Content-Type": "application/json",
@@ -4867,6 +3159,8 @@ IMPORTANTE:
                 ) as response:
                     if response.status != 200:
                         error_text = await response.text()
+                        get_model_telemetry().record_call(model_info["id"], f"uniqueness_{model}",
+                                                          time.monotonic() - uniqueness_started, "error")
                         return {
                             "is_unique": None,
                             "error": f"API ошибка: {response.status} - {error_text}",
@@ -4875,6 +3169,15 @@ IMPORTANTE:
                     
                     data = await response.json()
                     content = data["choices"][0]["message"]["content"]
+                    get_token_log().record(f"uniqueness_{model}", model_info["id"], payload["messages"],
+                                           data.get("usage"), content)
+                    usage = data.get("usage") or {}
+                    get_cost_ledger().record_call(model_info["id"], usage, payload["messages"])
+                    get_model_telemetry().record_call(
+                        model_info["id"], f"uniqueness_{model}", time.monotonic() - uniqueness_started,
+                        data["choices"][0].get("finish_reason"),
+                        usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                    )
                     
                     # Сохраняем оригинальный ответ для отладки
                     original_content = content
@@ -0,0 +1,95 @@
+"""
+@file: batch_generation.py
+@description: Пакетная генерация видео-постов — один запрос к дешёвой быстрой модели на несколько видео
+@dependencies: json, os, re
+@created: 2026-10-19
+
+Каждый видео-пост раньше был отдельным chat completion, и большой системный
+промпт оплачивался сотню раз за прогон. Для быстрых моделей (Gemini Flash,
+GPT-4.1 mini/nano, GPT-4o mini) генератор может запросить сразу
+BATCH_GENERATION_SIZE постов структурированным JSON-списком — по одному на
+каждое VideoData. Каждый пост из ответа проходит обычные проверки и
+постобработку генератора, а отклонённые перегенерируются по одному.
+
+BATCH_GENERATION_SIZE: размер пакета (0 или 1 — режим выключен).
+BATCH_GENERATION_MODELS: подстроки id моделей через запятую, для которых включён пакетный режим.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+BATCH_GENERATION_SIZE = int(os.getenv("BATCH_GENERATION_SIZE", "8"))
+BATCH_GENERATION_MODELS = tuple(
+    p.strip().lower()
+    for p in os.getenv("BATCH_GENERATION_MODELS", "flash,gpt-4.1-mini,gpt-4.1-nano,gpt-4o-mini").split(",")
+    if p.strip()
+)
+
+# Служебные маркеры секций, которые модели иногда оставляют в тексте
+SECTION_MARKERS = ("[HOOK]", "[/HOOK]", "[FACTS]", "[/FACTS]",
+                   "[LINK1]", "[/LINK1]", "[LINK2]", "[/LINK2]",
+                   "[CTA]", "[/CTA]")
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@dataclass
+class VideoPromptParts:
+    """Подготовленные данные промпта одного видео-поста"""
+    base_prompt: str
+    prompt_values: Dict[str, Any] = field(default_factory=dict)
+    has_real_streamer: bool = False
+    streamer_name: str = ""
+    used_structure_index: int = -1
+    number_format_instruction: str = ""
+
+
+def batch_enabled(model: str) -> bool:
+    """Включён ли пакетный режим для модели."""
+    if BATCH_GENERATION_SIZE <= 1 or not model:
+        return False
+    model = model.lower()
+    return any(p in model for p in BATCH_GENERATION_MODELS)
+
+
+def strip_section_markers(text: str) -> str:
+    for marker in SECTION_MARKERS:
+        text = text.replace(marker, "")
+    return text.strip()
+
+
+def parse_batch_response(content: str, count: int) -> Dict[int, str]:
+    """
+    Разбирает ответ пакетного запроса: {"posts": [{"id": 1, "text": "..."}, ...]}
+    или просто список. Возвращает {номер поста с 1: текст}; пусто, если JSON не разобрался.
+    """
+    text = _FENCE_RE.sub("", (content or "").strip())
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return {}
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text[min(starts):])
+    except json.JSONDecodeError:
+        return {}
+    items = data.get("posts", []) if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return {}
+
+    result: Dict[int, str] = {}
+    for position, item in enumerate(items, 1):
+        if isinstance(item, str):
+            number, post_text = position, item
+        elif isinstance(item, dict):
+            number, post_text = item.get("id", position), item.get("text")
+        else:
+            continue
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            number = position
+        if isinstance(post_text, str) and 1 <= number <= count and number not in result:
+            result[number] = post_text
+    return result
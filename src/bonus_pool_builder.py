@@ -0,0 +1,218 @@
+"""
+@file: bonus_pool_builder.py
+@description: Сборка пула описаний бонусов — параллельные чанки, валидация по мере прихода, добор недостачи, кэш пулов
+@dependencies: asyncio, sqlite3, src.bonus_pool_index, src.cassette
+@created: 2026-10-19
+
+Раньше пул бонуса 1 и пул бонуса 2 запрашивались по очереди, каждый одним
+вызовом на int(count*1.5)+10 описаний, и проверялись только после полного
+ответа. Теперь build_bonus_pool:
+
+1. берёт сохранённые описания этого бонуса на этом языке (BonusPoolStore) —
+   если их хватает, пул готов без запросов к модели;
+2. недостачу (с запасом на отсев) делит на чанки по BONUS_POOL_CHUNK описаний
+   и запрашивает их параллельно; ответ каждого чанка валидируется и проходит
+   через BonusPoolIndex сразу, как только пришёл;
+3. когда пул набран — незавершённые чанки отменяются; если не набран — ещё
+   один раунд только на недостачу (до BONUS_POOL_ROUNDS раундов), остаток —
+   программные вариации;
+4. принятые описания модели сохраняются по (текст бонуса, язык).
+
+Генератор передаёт сюда запрос одного чанка, проверку описания и фоллбек —
+промпты и правила валидации остаются в генераторе своего языка. Оба пула
+генератора собираются одновременно (asyncio.gather).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from src.bonus_pool_index import BonusPoolIndex
+from src.cassette import get_cassette
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "bonus_pools.db"
+
+# Описаний в одном запросе к модели
+BONUS_POOL_CHUNK = int(os.getenv("BONUS_POOL_CHUNK", "30"))
+
+# Раундов запросов: первый — на весь пул, следующие — только на недостачу
+BONUS_POOL_ROUNDS = int(os.getenv("BONUS_POOL_ROUNDS", "2"))
+
+# Сколько хранить сохранённые пулы (сек); 0 — не сохранять
+BONUS_POOL_TTL = int(os.getenv("BONUS_POOL_TTL", str(14 * 24 * 3600)))
+
+# Сколько описаний одного бонуса хранить
+BONUS_POOL_MAX_STORED = int(os.getenv("BONUS_POOL_MAX_STORED", "400"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bonus_pools (
+    key         TEXT PRIMARY KEY,
+    lang        TEXT NOT NULL,
+    bonus       TEXT NOT NULL,
+    items       TEXT NOT NULL,
+    updated_at  REAL NOT NULL
+);
+"""
+
+
+def request_size(shortfall: int) -> int:
+    """Сколько описаний запросить, чтобы после отсева осталось shortfall (прежняя формула count*1.5+10)."""
+    return int(shortfall * 1.5) + 10
+
+
+class BonusPoolStore:
+    """Сохранённые пулы описаний по (текст бонуса, язык) в SQLite, общий на процесс (singleton)."""
+
+    _instance: Optional["BonusPoolStore"] = None
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, ttl: int = BONUS_POOL_TTL):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def get_instance(cls) -> "BonusPoolStore":
+        if cls._instance is None:
+            cls._instance = BonusPoolStore()
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        # В режиме кассеты пул должен собираться через записанные ответы модели
+        return self.ttl > 0 and not get_cassette().active
+
+    @staticmethod
+    def _key(bonus: str, lang: str) -> str:
+        return hashlib.sha1(f"{lang}\x00{bonus.strip()}".encode("utf-8")).hexdigest()
+
+    def load(self, bonus: str, lang: str) -> List[str]:
+        if not self.enabled:
+            return []
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT items FROM bonus_pools WHERE key = ? AND updated_at > ?",
+                (self._key(bonus, lang), time.time() - self.ttl)
+            ).fetchone()
+        if not row:
+            return []
+        try:
+            items = json.loads(row[0])
+        except ValueError:
+            return []
+        return [item for item in items if isinstance(item, str)]
+
+    def save(self, bonus: str, lang: str, items: List[str]):
+        if not self.enabled or not items:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bonus_pools (key, lang, bonus, items, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (self._key(bonus, lang), lang, bonus.strip(),
+                 json.dumps(items[-BONUS_POOL_MAX_STORED:], ensure_ascii=False), time.time())
+            )
+
+
+def get_bonus_pool_store() -> BonusPoolStore:
+    """Короткий доступ к общему хранилищу пулов."""
+    return BonusPoolStore.get_instance()
+
+
+async def build_bonus_pool(
+    original_desc: str,
+    count: int,
+    lang: str,
+    request_chunk: Callable[[int], Awaitable[List[str]]],
+    accept: Callable[[str], bool],
+    fallback: Callable[[], str],
+    label: str = "бонус",
+) -> List[str]:
+    """
+    Собирает пул из count уникальных описаний бонуса.
+
+    Args:
+        original_desc: Исходное описание бонуса
+        count: Нужный размер пула
+        lang: Язык генератора (ключ сохранённого пула и стеммер BonusPoolIndex)
+        request_chunk: Запрос n описаний у модели (список строк; [] при ошибке)
+        accept: Проверка описания (длина, факты бонуса) — до проверки на дубли
+        fallback: Программная вариация описания
+        label: Подпись бонуса в логах
+    """
+    store = get_bonus_pool_store()
+    pool_index = BonusPoolIndex(lang=lang)
+    stored = [d for d in store.load(original_desc, lang) if accept(d)]
+    for d in stored:
+        pool_index.add(d)
+    ai_accepted = list(pool_index.texts)
+    if ai_accepted:
+        print(f"      💾 Сохранённый пул для {label}: {len(ai_accepted)} описаний")
+
+    invalid_count = duplicate_count = 0
+    for round_no in range(BONUS_POOL_ROUNDS):
+        shortfall = count - len(pool_index)
+        if shortfall <= 0:
+            break
+        total = request_size(shortfall)
+        sizes = [min(BONUS_POOL_CHUNK, total - start) for start in range(0, total, max(1, BONUS_POOL_CHUNK))]
+        print(f"   🎯 Запрос описаний для {label}: \"{original_desc}\" — {total} в {len(sizes)} чанках"
+              + (f" (добор, раунд {round_no + 1})" if round_no else "") + "...")
+
+        tasks = [asyncio.ensure_future(request_chunk(size)) for size in sizes]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    descriptions = await next_done
+                except Exception as e:
+                    print(f"      ⚠️ Чанк описаний не получен: {e}")
+                    continue
+                for d in descriptions:
+                    if not isinstance(d, str):
+                        invalid_count += 1
+                        continue
+                    d = d.strip()
+                    if not accept(d):
+                        invalid_count += 1
+                        continue
+                    if not pool_index.add(d):
+                        duplicate_count += 1
+                        continue
+                    ai_accepted.append(d)
+                if len(pool_index) >= count:
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    print(f"      ✅ Валидных: {len(pool_index)}, отброшено: {invalid_count}, дубли: {duplicate_count}")
+
+    if len(ai_accepted) > len(stored):
+        store.save(original_desc, lang, ai_accepted)
+
+    fallback_attempts = 0
+    while len(pool_index) < count and fallback_attempts < count * 3:
+        fallback_attempts += 1
+        pool_index.add(fallback())
+    if len(pool_index) < count and not ai_accepted:
+        print(f"      ⚠️ Фоллбек на программные вариации для {label}")
+        while len(pool_index) < count:
+            pool_index.texts.append(fallback())
+
+    valid = pool_index.texts
+    random.shuffle(valid)
+    return valid[:count]
@@ -0,0 +1,107 @@
+"""
+@file: bonus_pool_index.py
+@description: Индекс пула описаний бонусов — инкрементальный отсев слишком похожих описаний
+@dependencies: src.morphology
+@created: 2026-10-19
+
+Пул из 80–130 описаний в _request_bonus_pool собирался проверкой каждого
+кандидата против всех принятых: на каждое сравнение принятое описание заново
+токенизировалось и стеммилось, итого O(n²) регулярок и стемминга. Индекс
+стеммит описание один раз при добавлении (src.morphology.content_stems,
+стеммер языка пула) и хранит:
+
+- множество стемов каждого описания;
+- обратный индекс стем → описания: Jaccard и containment считаются только
+  для описаний с общими стемами (без общих стемов обе метрики равны нулю);
+- множество начал (первые два стема) — проверка одинакового начала за O(1).
+
+Для RU решение «принять/отбросить» — то же, что у прежнего
+_is_too_similar_to_pool генераторов (он теперь тоже работает через индекс);
+пулы ES/IT/FR стеммятся стеммером своего языка.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from src.morphology import content_stems
+
+# Порог Jaccard по умолчанию и порог containment (доля слов короткого текста в длинном)
+DEFAULT_THRESHOLD = 0.40
+CONTAINMENT_THRESHOLD = 0.5
+
+
+class BonusPoolIndex:
+    """
+    Принятые описания пула с предвычисленными стемами.
+
+    add() принимает описание, если оно не слишком похоже ни на одно принятое:
+    1. Jaccard >= threshold по стеммированным словам
+    2. Containment >= 0.5 (50%+ слов короткого текста есть в длинном)
+    3. Совпадение первых 2 контентных слов (одинаковое начало)
+
+    Описания меньше чем из 2 контентных слов принимаются всегда и в сравнениях не участвуют.
+    """
+
+    def __init__(self, texts: Iterable[str] = (), threshold: float = DEFAULT_THRESHOLD, lang: str = "ru"):
+        self.threshold = threshold
+        self.lang = lang
+        self.texts: List[str] = []
+        self._stem_sets: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._prefixes: Set[Tuple[str, str]] = set()
+        for text in texts:
+            self._insert(text, content_stems(text, lang))
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _insert(self, text: str, stems: Sequence[str]):
+        self.texts.append(text)
+        if len(stems) < 2:
+            return
+        entry = len(self._stem_sets)
+        stem_set = set(stems)
+        self._stem_sets.append(stem_set)
+        for stem in stem_set:
+            self._postings.setdefault(stem, []).append(entry)
+        self._prefixes.add((stems[0], stems[1]))
+
+    def _too_similar(self, stems: Sequence[str]) -> bool:
+        if len(stems) < 2 or not self._stem_sets:
+            return False
+        if (stems[0], stems[1]) in self._prefixes:
+            return True
+        if self.threshold <= 0:
+            return True
+
+        cand_set = set(stems)
+        shared: Dict[int, int] = {}
+        for stem in cand_set:
+            for entry in self._postings.get(stem, ()):
+                shared[entry] = shared.get(entry, 0) + 1
+
+        cand_size = len(cand_set)
+        for entry, intersection in shared.items():
+            exist_size = len(self._stem_sets[entry])
+            if intersection / (cand_size + exist_size - intersection) >= self.threshold:
+                return True
+            if intersection / min(cand_size, exist_size) >= CONTAINMENT_THRESHOLD:
+                return True
+        return False
+
+    def is_too_similar(self, candidate: str) -> bool:
+        """Слишком ли candidate похож на уже принятые описания."""
+        return self._too_similar(content_stems(candidate, self.lang))
+
+    def add(self, candidate: str) -> bool:
+        """Добавляет candidate в пул, если он не дубль; возвращает, принят ли он."""
+        stems = content_stems(candidate, self.lang)
+        if self._too_similar(stems):
+            return False
+        self._insert(candidate, stems)
+        return True
+
+
+def is_too_similar_to_pool(candidate: str, pool: List[str], threshold: float = DEFAULT_THRESHOLD,
+                           lang: str = "ru") -> bool:
+    """Разовая проверка против готового списка (без индекса, который живёт между вызовами)."""
+    return BonusPoolIndex(pool, threshold, lang).is_too_similar(candidate)
@@ -0,0 +1,261 @@
+"""
+@file: caption_cache.py
+@description: Кэш разбора подписей (LRU по хэшу подписи + версия парсера) и ручные исправления метаданных видео
+@dependencies: sqlite3, json, src.caption_parser
+@created: 2026-10-19
+
+Операторы пересканируют один и тот же канал с другим диапазоном или
+направлением, и каждый скан заново разбирал неизменившиеся подписи. Теперь
+разбор идёт через кэш:
+
+- результат CaptionParser.parse хранится в ограниченном LRU (CAPTION_CACHE_SIZE)
+  по sha1(PARSER_VERSION + подпись). Ключ — по точному тексту: даже обрезка
+  пробелов или замена \\r\\n меняет результат парсера на части подписей;
+- с CAPTION_CACHE_PERSIST=1 результаты переживают рестарт (SQLite, подгружаются
+  последние CAPTION_CACHE_SIZE при старте, пишутся пачкой в flush());
+- ручные исправления из ввода «Слот | Ставка | Выигрыш» сохраняются всегда и
+  приоритетнее парсера: по каналу и message_id видео. Для репостов в другие
+  каналы — ещё и по нормализованной подписи (регистр и пробелы не важны), но
+  только если подпись сама описывает занос: не короче OVERRIDE_CAPTION_MIN_LEN
+  и парсер нашёл в ней ставку и выигрыш. Пустые, эмодзи-only и типовые
+  подписи повторяются у разных видео — исправление одного из них не должно
+  тихо проставить его суммы остальным. Исправления не зависят от версии парсера.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.caption_parser import PARSER_VERSION, CaptionParser, ParsedCaption
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "caption_cache.db"
+
+# Сколько разобранных подписей держать в памяти (и в SQLite при CAPTION_CACHE_PERSIST=1)
+CAPTION_CACHE_SIZE = int(os.getenv("CAPTION_CACHE_SIZE", "20000"))
+
+# Сохранять разобранные подписи между рестартами
+CAPTION_CACHE_PERSIST = os.getenv("CAPTION_CACHE_PERSIST", "0").strip().lower() in ("1", "true", "yes", "on")
+
+# Минимальная длина нормализованной подписи, по которой исправление применяется к репостам
+OVERRIDE_CAPTION_MIN_LEN = int(os.getenv("OVERRIDE_CAPTION_MIN_LEN", "20"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    key      TEXT PRIMARY KEY,
+    result   TEXT NOT NULL,
+    used_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS overrides (
+    key         TEXT PRIMARY KEY,
+    result      TEXT NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parsed_used_at ON parsed(used_at);
+"""
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def caption_key(caption: str) -> str:
+    """Ключ результата парсера: точный текст подписи и версия правил разбора."""
+    return hashlib.sha1(f"{PARSER_VERSION}\x00{caption}".encode("utf-8")).hexdigest()
+
+
+def override_keys(caption: str, source_channel_id: Any = None, message_id: Any = None,
+                  parsed: Optional[ParsedCaption] = None) -> List[str]:
+    """
+    Ключи ручного исправления: видео в канале, затем нормализованная подпись.
+
+    Ключ по подписи — только для подписей, которые сами указывают на конкретный
+    занос (длинные, со ставкой и выигрышем). parsed — уже готовый разбор подписи.
+    """
+    keys = []
+    if source_channel_id is not None and message_id is not None:
+        keys.append(f"msg:{source_channel_id}:{message_id}")
+    normalized = _WHITESPACE_RE.sub(' ', caption or '').strip().casefold()
+    if len(normalized) >= OVERRIDE_CAPTION_MIN_LEN:
+        if parsed is None:
+            parsed = CaptionParser.parse(caption)
+        if parsed.bet > 0 and parsed.win > 0:
+            keys.append("caption:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest())
+    return keys
+
+
+@dataclass
+class CaptionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    overrides: int = 0
+    evictions: int = 0
+
+
+class CaptionCache:
+    """LRU разобранных подписей и ручные исправления, общий на процесс (singleton)."""
+
+    _instance: Optional["CaptionCache"] = None
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, max_size: int = CAPTION_CACHE_SIZE,
+                 persist: bool = CAPTION_CACHE_PERSIST):
+        self.db_path = Path(db_path)
+        self.max_size = max(1, max_size)
+        self.persist = persist
+        self.stats = CaptionCacheStats()
+        self._entries: "OrderedDict[str, ParsedCaption]" = OrderedDict()
+        self._overrides: Dict[str, ParsedCaption] = {}
+        self._dirty: Dict[str, ParsedCaption] = {}
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._load()
+
+    @classmethod
+    def get_instance(cls) -> "CaptionCache":
+        if cls._instance is None:
+            cls._instance = CaptionCache()
+        return cls._instance
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _load(self):
+        for key, result in self._execute("SELECT key, result FROM overrides").fetchall():
+            parsed = self._decode(result)
+            if parsed is not None:
+                self._overrides[key] = parsed
+        if not self.persist:
+            return
+        rows = self._execute(
+            "SELECT key, result FROM parsed ORDER BY used_at DESC LIMIT ?", (self.max_size,)
+        ).fetchall()
+        for key, result in reversed(rows):
+            parsed = self._decode(result)
+            if parsed is not None:
+                self._entries[key] = parsed
+        if rows:
+            print(f"🗂 Кэш подписей: загружено {len(self._entries)} разобранных, {len(self._overrides)} исправлений")
+
+    @staticmethod
+    def _decode(result: str) -> Optional[ParsedCaption]:
+        try:
+            return ParsedCaption(**json.loads(result))
+        except (TypeError, ValueError):
+            return None
+
+    # ─────────────────────────────────────────────────────────────
+    # Разбор
+    # ─────────────────────────────────────────────────────────────
+
+    def parse(self, caption: Optional[str], source_channel_id: Any = None,
+              message_id: Any = None) -> ParsedCaption:
+        """
+        CaptionParser.parse с кэшем; ручное исправление видео (если есть) важнее парсера.
+
+        Возвращает копию — вызывающий код может менять результат.
+        """
+        caption = caption or ''
+        # Разбор нужен и для решения, применимо ли исправление по подписи
+        parsed = self._parse_cached(caption)
+        override = self.get_override(caption, source_channel_id, message_id, parsed)
+        if override is not None:
+            self.stats.overrides += 1
+            return override
+        return replace(parsed)
+
+    def _parse_cached(self, caption: str) -> ParsedCaption:
+        """Результат парсера из LRU (общий объект — наружу отдаётся копия)."""
+        key = caption_key(caption)
+        parsed = self._entries.get(key)
+        if parsed is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            if self.persist:
+                self._dirty[key] = parsed
+            return parsed
+
+        self.stats.misses += 1
+        parsed = CaptionParser.parse(caption)
+        self._entries[key] = parsed
+        if self.persist:
+            self._dirty[key] = parsed
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return parsed
+
+    def flush(self):
+        """Пишет использованные с прошлого flush результаты в SQLite (при CAPTION_CACHE_PERSIST), таблица — не больше max_size."""
+        if not self._dirty:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(asdict(parsed), ensure_ascii=False), now) for key, parsed in self._dirty.items()]
+        self._dirty.clear()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO parsed (key, result, used_at) VALUES (?, ?, ?)", rows)
+            self._conn.execute(
+                "DELETE FROM parsed WHERE key NOT IN (SELECT key FROM parsed ORDER BY used_at DESC LIMIT ?)",
+                (self.max_size,)
+            )
+            self._conn.execute("COMMIT")
+
+    # ─────────────────────────────────────────────────────────────
+    # Ручные исправления
+    # ─────────────────────────────────────────────────────────────
+
+    def get_override(self, caption: Optional[str], source_channel_id: Any = None,
+                     message_id: Any = None, parsed: Optional[ParsedCaption] = None) -> Optional[ParsedCaption]:
+        for key in override_keys(caption or '', source_channel_id, message_id, parsed):
+            parsed = self._overrides.get(key)
+            if parsed is not None:
+                return replace(parsed)
+        return None
+
+    def save_override(self, video: Dict[str, Any]):
+        """
+        Запоминает ручной ввод метаданных видео из канала.
+
+        Args:
+            video: video_info сценария (caption, source_channel_id, message_id)
+                   с исправленными slot/bet/win/streamer/multiplier/currency
+        """
+        parsed = ParsedCaption(
+            slot=video.get('slot') or '',
+            win=float(video.get('win') or 0),
+            bet=float(video.get('bet') or 0),
+            streamer=video.get('streamer') or '',
+            multiplier=float(video.get('multiplier') or 0),
+            currency=video.get('currency') or 'RUB',
+        )
+        result = json.dumps(asdict(parsed), ensure_ascii=False)
+        now = time.time()
+        for key in override_keys(video.get('caption') or '', video.get('source_channel_id'), video.get('message_id')):
+            self._overrides[key] = parsed
+            self._execute(
+                "INSERT OR REPLACE INTO overrides (key, result, updated_at) VALUES (?, ?, ?)", (key, result, now)
+            )
+
+    def stats_line(self) -> str:
+        s = self.stats
+        return (f"кэш подписей: попаданий {s.hits}, разборов {s.misses}, исправлений {s.overrides}, "
+                f"вытеснено {s.evictions}")
+
+
+def get_caption_cache() -> CaptionCache:
+    """Короткий доступ к общему кэшу подписей."""
+    return CaptionCache.get_instance()
+
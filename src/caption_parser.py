@@ -1,14 +1,240 @@
 """
 @file: caption_parser.py
 @description: Парсер данных из подписей к видео в Telegram
-@dependencies: re
+@dependencies: re, concurrent.futures
 @created: 2026-01-05
+
+Подпись разбирается при сканировании канала на каждое сообщение (до 500 за
+скан) и в каждом языковом сценарии, поэтому паттерны скомпилированы заранее
+и ищутся в порядке приоритета (_PatternList) с точными отсечками: паттерны
+с русскими ключевыми словами пропускаются на подписях без кириллицы, паттерны
+с обязательным символом (@, |, эмодзи) — если символа в тексте нет, а хвостовой
+паттерн стримера ищется только в последних символах. Цепочки валют — один
+проход сканера (_CurrencyScan) вместо десятка re.search. Результат
+ParsedCaption — тот же, что у прежнего цикла; проверка —
+benchmarks/bench_caption_parser.py на эталонном корпусе.
+
+Для бэкфиллов — parse_many(captions, workers=N): от CAPTION_POOL_MIN_BATCH
+подписей разбор идёт в пуле процессов.
 """
 
+import os
 import re
-from typing import Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
+# Версия правил разбора: меняется вместе с PATTERNS/логикой parse и сбрасывает
+# закэшированные результаты (src/caption_cache.py)
+PARSER_VERSION = "2"
+
+# С какого размера пачки parse_many(workers > 1) уходит в пул процессов
+CAPTION_POOL_MIN_BATCH = int(os.getenv("CAPTION_POOL_MIN_BATCH", "5000"))
+
+_MD_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_MD_CODE_RE = re.compile(r'`([^`]+)`')
+_MD_ITALIC_RE = re.compile(r'_([^_]+)_')
+
+# Двойники цифр: пробел/З между цифрами, З после разделителя перед цифрой, О между цифрами.
+# Лукбиханды и лукахеды смотрят на исходный текст, поэтому один проход эквивалентен
+# последовательным заменам
+_HOMOGLYPH_RE = re.compile(
+    r'(?<=\d)[\sЗз](?=\d)'
+    r'|(?<=[\s:$₽€£])[Зз](?=[\s\d])'
+    r'|(?<=\d)[Оо](?=\d)'
+)
+
+# Все блоки кириллицы — включая символы, которые IGNORECASE считает равными русским буквам
+_CYRILLIC_RE = re.compile(r'[\u0400-\u052f\u1c80-\u1c8f\u2de0-\u2dff\ua640-\ua69f]')
+
+_SLOT_CURRENCY_TAIL_RE = re.compile(r'\s+[\d\s,.]*[₽р]+[\d\s,.₽р]*$')
+_SLOT_RUBLE_TAIL_RE = re.compile(r'\s*[₽]+$')
+
+_STREAMER_LEAD_RE = re.compile(r'^[:\s|]+')
+_STREAMER_AMOUNT_TAIL_RE = re.compile(r'\s+[\d\s₽$€£.,]+$')
+_LETTER_RE = re.compile(r'[А-Яа-яA-Za-z]')
+_MULTIPLIER_LIKE_RE = re.compile(r'^[xхXХ]\d+$')
+_CURRENCY_CODE_RE = re.compile(r'^[A-Z]{3}$')
+
+_NON_NUMBER_RE = re.compile(r'[^\d.]')
+_DIGIT_RE = re.compile(r'\d')
+
+# Слова, которые НЕ являются никами стримеров
+FORBIDDEN_STREAMER_WORDS = frozenset({
+    'ставка', 'ставки', 'слот', 'слоты', 'выигрыш', 'выигрыша', 'выиграл',
+    'игра', 'игры', 'бонус', 'бонуса', 'бонусы', 'спин', 'спины', 'спинов',
+    'руб', 'рубль', 'рублей', 'рублях', 'usd', 'eur', 'euro', 'евро', 'доллар',
+    'множитель', 'мульт', 'итог', 'итого', 'результат', 'победа', 'вход',
+    'депозит', 'баланс', 'профит', 'прибыль', 'сумма', 'bet', 'win', 'slot',
+    'игрок', 'стример', 'ник', 'nick', 'name', 'казино', 'casino',
+    'фриспины', 'фриспин', 'freespin', 'freespins', 'free', 'spin',
+    # Испанские слова (чтобы не путать с никами)
+    'apuesta', 'ganancia', 'ranura',
+    # Итальянские слова (чтобы не путать с никами)
+    'puntata', 'vincita', 'scommessa', 'giocatore',
+    # Французские слова (чтобы не путать с никами)
+    'gagner', 'gain', 'mise', 'joueur', 'pari', 'parieur', 'gagnant',
+    # ⚠️ КРИТИЧНО: КОДЫ ВАЛЮТ НЕ МОГУТ БЫТЬ НИКАМИ!
+    'clp', 'ars', 'mxn', 'pen', 'cop', 'uyu', 'gbp', 'rub',
+})
+
+# Общий паттерн для ключевых слов всех языков и суммы после них
+_AMOUNT_PREFIX = r'(?:выигрыш|ставка|ganancia|apuesta|vincita|puntata|gagner|gain|mise|win|bet)[:\s]*[\d\s,.]+\s*'
+
+# Валюта рядом с суммой выигрыша/ставки ("выигрыш 1235 USD", "Apuesta: 100$") — в порядке приоритета
+_CURRENCY_NEAR_AMOUNT: List[Tuple[str, str]] = [
+    ('USD', r'USD|\$|доллар'),
+    ('EUR', r'EUR|€|евро|euro'),
+    ('GBP', r'GBP|£|фунт'),
+    ('CLP', r'CLP'),
+    ('MXN', r'MXN'),
+    ('ARS', r'ARS|ARG'),
+    ('COP', r'COP'),
+    ('PEN', r'PEN'),
+    ('UYU', r'UYU'),
+    ('RUB', r'руб|рубл|р\b|RUB|₽'),
+]
+
+# Символы валют во всём тексте (приоритет выше, чем у слов)
+_CURRENCY_SYMBOLS = (('$', 'USD'), ('€', 'EUR'), ('£', 'GBP'), ('₽', 'RUB'))
+
+# Названия валют во всём тексте (отдельными словами) — в порядке приоритета
+_CURRENCY_WORDS: List[Tuple[str, str]] = [
+    ('USD', r'USD|доллар'),
+    ('EUR', r'EUR|евро'),
+    ('GBP', r'GBP|фунт'),
+    ('CLP', r'CLP'),
+    ('MXN', r'MXN'),
+    ('ARS', r'ARS|ARG'),
+    ('COP', r'COP'),
+    ('PEN', r'PEN'),
+    ('UYU', r'UYU'),
+    ('RUB', r'руб|рубл|р\b|RUB'),
+]
+
+
+def _homoglyph_digit(match: "re.Match") -> str:
+    char = match.group()
+    if char.isspace():
+        return ' '
+    return '3' if char in 'Зз' else '0'
+
+
+_REGEX_SYNTAX = frozenset('.^$()+*?{}|')
+# Токены паттерна: экранированный символ, класс [...], квантификатор {m,n}, начало (?...), символ
+_TOKEN_RE = re.compile(r'\\.|\[(?:\\.|[^\]])*\]|\{\d*,?\d*\}|\(\?|.', re.S)
+
+
+def _mandatory_tokens(pattern: str) -> List[str]:
+    """
+    Токены, без которых паттерн не совпадёт (не под ?, * или {m,n}).
+    Для паттернов с альтернативой | или группами (?...) — пусто: разбор не нужен.
+    """
+    tokens = _TOKEN_RE.findall(pattern)
+    if '|' in tokens or '(?' in tokens:
+        return []
+    mandatory = []
+    for i, token in enumerate(tokens):
+        quantified = i + 1 < len(tokens) and tokens[i + 1][:1] in ('?', '*', '{')
+        if token == ')' and quantified:
+            return []
+        if not quantified:
+            mandatory.append(token)
+    return mandatory
+
+
+def _requires_cyrillic(pattern: str) -> bool:
+    """Паттерн совпадает только с текстом, где есть кириллица (обязательная русская буква вне [...])."""
+    return any(len(token) == 1 and '\u0400' <= token <= '\u04ff' for token in _mandatory_tokens(pattern))
+
+
+def _required_symbol(pattern: str) -> Optional[str]:
+    """Первый обязательный небуквенный символ паттерна (@, |, эмодзи): без него в тексте совпадения нет."""
+    for token in _mandatory_tokens(pattern):
+        if token.startswith('[') and not token.startswith('[^'):
+            char = token[1:-1]
+        elif token.startswith('\\') and not token[1:].isalnum():
+            char = token[1:]
+        elif token in _REGEX_SYNTAX:
+            continue
+        else:
+            char = token
+        if len(char) == 1 and not char.isalnum() and not char.isspace():
+            return char
+    return None
+
+
+def _tail_window(pattern: str) -> int:
+    """
+    Для паттерна вида ([класс]{m,n})\\s*$ — n: совпадение может начаться только в
+    последних n символах текста без хвостовых пробелов. 0 — паттерн другого вида.
+    """
+    match = re.fullmatch(r'\((\[[^\]\s]+\])\{\d+,(\d+)\}\)\\s\*\$', pattern)
+    return int(match.group(2)) if match else 0
+
+
+class _PatternList:
+    """
+    Список паттернов с приоритетом по порядку: результат — первый паттерн,
+    совпавший где-либо в тексте, и его группа 1 (как цикл re.search по списку).
+
+    Паттерны скомпилированы один раз, а проверки, которые не меняют результат,
+    отсекают заведомо пустые поиски:
+    - паттерны с обязательным русским словом не ищутся в тексте без кириллицы;
+    - паттерн с обязательным символом (@, |, эмодзи) — только если символ есть в тексте;
+    - «ник в конце текста» ищется только в последних символах, а не с каждой позиции.
+    """
+
+    def __init__(self, patterns: Iterable[str], flags: int = re.IGNORECASE):
+        self.entries = [
+            (re.compile(p, flags), _requires_cyrillic(p), _required_symbol(p), _tail_window(p))
+            for p in patterns
+        ]
+
+    def first(self, text: str, cyrillic: bool = True, lo: int = 0) -> Tuple[int, Optional[str]]:
+        """
+        (индекс паттерна, группа 1) первого по порядку паттерна с индексом >= lo,
+        совпавшего в тексте; (-1, None) — совпадений нет.
+        cyrillic=False — в тексте нет кириллицы.
+        """
+        for index in range(lo, len(self.entries)):
+            regex, needs_cyrillic, symbol, window = self.entries[index]
+            if needs_cyrillic and not cyrillic:
+                continue
+            if symbol is not None and symbol not in text:
+                continue
+            if window:
+                match = regex.search(text, max(0, len(text.rstrip()) - window))
+            else:
+                match = regex.search(text)
+            if match:
+                return index, match.group(1)
+        return -1, None
+
+
+class _CurrencyScan:
+    """
+    Цепочка «валюта по приоритету: первая, чей паттерн совпал где-либо» одним
+    проходом: паттерны валют объединены в группы внутри lookahead, поэтому
+    проверяется каждая позиция текста, и из найденных берётся валюта с
+    наивысшим приоритетом. Вместо прохода по тексту на каждую валюту.
+    """
+
+    def __init__(self, prefix: str, currencies: List[Tuple[str, str]], suffix: str = ''):
+        self.currencies = [currency for currency, _ in currencies]
+        alternatives = '|'.join(f'({pattern})' for _, pattern in currencies)
+        self._regex = re.compile(f'(?={prefix}(?:{alternatives}){suffix})', re.IGNORECASE)
+
+    def find(self, text: str) -> Optional[str]:
+        best = None
+        for match in self._regex.finditer(text):
+            index = match.lastindex - 1
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.currencies[best] if best is not None else None
+
 
 @dataclass
 class ParsedCaption:
@@ -111,6 +337,18 @@ class CaptionParser:
         ],
     }
     
+    # PATTERNS, скомпилированные в _PatternList (лениво, при первом parse)
+    _compiled: Optional[Dict[str, "_PatternList"]] = None
+    _currency_near_amount = _CurrencyScan(_AMOUNT_PREFIX, _CURRENCY_NEAR_AMOUNT)
+    _currency_words = _CurrencyScan(r'\b', _CURRENCY_WORDS, r'\b')
+    
+    @classmethod
+    def _matchers(cls) -> Dict[str, "_PatternList"]:
+        """Скомпилированные списки PATTERNS (один раз на процесс)."""
+        if cls._compiled is None:
+            cls._compiled = {field: _PatternList(patterns) for field, patterns in cls.PATTERNS.items()}
+        return cls._compiled
+    
     @classmethod
     def parse(cls, caption: str) -> ParsedCaption:
         """
@@ -125,140 +363,65 @@ class CaptionParser:
         if not caption:
             return ParsedCaption()
         
-        # Убираем markdown форматирование (**text** -> text)
-        caption_clean = re.sub(r'\*\*([^*]+)\*\*', r'\1', caption)
-        # Убираем другие markdown теги
-        caption_clean = re.sub(r'`([^`]+)`', r'\1', caption_clean)
-        caption_clean = re.sub(r'_([^_]+)_', r'\1', caption_clean)
+        matchers = cls._matchers()
+        
+        # Убираем markdown форматирование (**text** -> text, `text`, _text_)
+        caption_clean = caption
+        if '**' in caption_clean:
+            caption_clean = _MD_BOLD_RE.sub(r'\1', caption_clean)
+        if '`' in caption_clean:
+            caption_clean = _MD_CODE_RE.sub(r'\1', caption_clean)
+        if '_' in caption_clean:
+            caption_clean = _MD_ITALIC_RE.sub(r'\1', caption_clean)
         
         # Замена кириллических символов-двойников на цифры (OCR/копирование)
         # Только в контексте чисел: "З 641 490" -> "3 641 490", "О" рядом с цифрами -> "0"
-        caption_clean = re.sub(r'(?<=\d)[\sЗз](?=\d)', lambda m: ' ' if m.group().isspace() else '3', caption_clean)
-        caption_clean = re.sub(r'(?<=[\s:$₽€£])З(?=[\s\d])', '3', caption_clean)
-        caption_clean = re.sub(r'(?<=[\s:$₽€£])з(?=[\s\d])', '3', caption_clean)
-        caption_clean = re.sub(r'(?<=\d)О(?=\d)', '0', caption_clean)
-        caption_clean = re.sub(r'(?<=\d)о(?=\d)', '0', caption_clean)
+        caption_clean = _HOMOGLYPH_RE.sub(_homoglyph_digit, caption_clean)
         
         text = caption_clean.lower()
         result = ParsedCaption()
+        # Без кириллицы паттерны с русскими ключевыми словами заведомо не совпадут
+        cyrillic = _CYRILLIC_RE.search(caption_clean) is not None
         
         # Извлекаем слот (из caption_clean для сохранения оригинального регистра)
-        for pattern in cls.PATTERNS['slot']:
-            match = re.search(pattern, caption_clean, re.IGNORECASE)
-            if match:
-                result.slot = match.group(1).strip()
-                # Убираем валюту+цифры с конца (₽, русская р рядом с числами)
-                # Только если есть символ валюты — голые цифры НЕ трогаем (Sugar Rush 1000)
-                result.slot = re.sub(r'\s+[\d\s,.]*[₽р]+[\d\s,.₽р]*$', '', result.slot).strip()
-                result.slot = re.sub(r'\s*[₽]+$', '', result.slot).strip()
-                break
+        _, slot = matchers['slot'].first(caption_clean, cyrillic)
+        if slot is not None:
+            # Убираем валюту+цифры с конца (₽, русская р рядом с числами)
+            # Только если есть символ валюты — голые цифры НЕ трогаем (Sugar Rush 1000)
+            slot = _SLOT_CURRENCY_TAIL_RE.sub('', slot.strip()).strip()
+            result.slot = _SLOT_RUBLE_TAIL_RE.sub('', slot).strip()
         
-        # Извлекаем выигрыш
-        for pattern in cls.PATTERNS['win']:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                win_str = match.group(1)
-                result.win = cls._parse_number(win_str)
-                break
+        # Извлекаем выигрыш и ставку
+        _, win = matchers['win'].first(text, cyrillic)
+        if win is not None:
+            result.win = cls._parse_number(win)
+        _, bet = matchers['bet'].first(text, cyrillic)
+        if bet is not None:
+            result.bet = cls._parse_number(bet)
         
-        # Извлекаем ставку
-        for pattern in cls.PATTERNS['bet']:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                bet_str = match.group(1)
-                result.bet = cls._parse_number(bet_str)
+        # Извлекаем стримера (опционально) - поддержка русских и английских ников.
+        # Кандидаты идут в порядке паттернов: отклонённый — пробуем следующий паттерн
+        streamer_matcher = matchers['streamer']
+        caption_cyrillic = cyrillic if caption_clean is caption else _CYRILLIC_RE.search(caption) is not None
+        index = 0
+        while True:
+            # Используем оригинальный caption для сохранения регистра
+            index, streamer_candidate = streamer_matcher.first(caption, caption_cyrillic, index)
+            if streamer_candidate is None:
+                break
+            index += 1
+            streamer_candidate = cls._clean_streamer(streamer_candidate)
+            if cls._is_streamer(streamer_candidate, result.slot):
+                result.streamer = streamer_candidate
                 break
-        
-        # Извлекаем стримера (опционально) - поддержка русских и английских ников
-        # Список запрещённых слов, которые НЕ являются никами стримеров
-        FORBIDDEN_STREAMER_WORDS = {
-            'ставка', 'ставки', 'слот', 'слоты', 'выигрыш', 'выигрыша', 'выиграл',
-            'игра', 'игры', 'бонус', 'бонуса', 'бонусы', 'спин', 'спины', 'спинов',
-            'руб', 'рубль', 'рублей', 'рублях', 'usd', 'eur', 'euro', 'евро', 'доллар',
-            'множитель', 'мульт', 'итог', 'итого', 'результат', 'победа', 'вход',
-            'депозит', 'баланс', 'профит', 'прибыль', 'сумма', 'bet', 'win', 'slot',
-            'игрок', 'стример', 'ник', 'nick', 'name', 'казино', 'casino',
-            'фриспины', 'фриспин', 'freespin', 'freespins', 'free', 'spin',
-            # Испанские слова (чтобы не путать с никами)
-            'apuesta', 'ganancia', 'ranura',
-            # Итальянские слова (чтобы не путать с никами)
-            'puntata', 'vincita', 'scommessa', 'giocatore', 'slot',
-            # Французские слова (чтобы не путать с никами)
-            'gagner', 'gain', 'mise', 'joueur', 'pari', 'parieur', 'gagnant',
-            # ⚠️ КРИТИЧНО: КОДЫ ВАЛЮТ НЕ МОГУТ БЫТЬ НИКАМИ!
-            'clp', 'ars', 'mxn', 'pen', 'cop', 'uyu', 'gbp', 'rub',
-            'usd', 'eur',  # дублируем в нижнем регистре для полной уверенности
-        }
-        
-        for pattern in cls.PATTERNS['streamer']:
-            match = re.search(pattern, caption, re.IGNORECASE)  # Используем оригинальный caption для сохранения регистра
-            if match:
-                streamer_candidate = match.group(1).strip()
-                # Убираем лишние символы в начале
-                streamer_candidate = re.sub(r'^[:\s|]+', '', streamer_candidate).strip()
-                # Очищаем от чисел и валюты в конце ТОЛЬКО если они идут после пробела
-                # Это позволяет сохранить ники типа "Player$" или "Gena88", но удалить "Gena88 500$"
-                # Сначала убираем числа и валюту после пробела в конце
-                streamer_candidate = re.sub(r'\s+[\d\s₽$€£.,]+$', '', streamer_candidate).strip()
-                # Затем убираем только числа в самом конце (без букв перед ними)
-                # Но сохраняем ники типа "Gena88" или "Player123"
-                if re.search(r'[А-Яа-яA-Za-z]', streamer_candidate):
-                    # Если есть буквы, оставляем как есть (ник может содержать цифры)
-                    pass
-                else:
-                    # Если нет букв, значит это не ник
-                    streamer_candidate = ""
-                
-                # ВАЖНО: Проверяем что это не служебное слово (ставка, слот и т.д.)
-                if streamer_candidate.lower() in FORBIDDEN_STREAMER_WORDS:
-                    continue  # Пропускаем это совпадение, ищем дальше
-                
-                # ⚠️ КРИТИЧЕСКАЯ ПРОВЕРКА: Исключаем множители типа X1265, Х6609
-                # Паттерн: начинается с X или Х (русская/английская) и далее только цифры
-                if re.match(r'^[xхXХ]\d+$', streamer_candidate):
-                    continue  # Это множитель, пропускаем!
-                
-                # ⚠️🚨 АБСОЛЮТНЫЙ ЗАПРЕТ: Коды валют (3 заглавные латинские буквы)
-                # CLP, ARS, MXN, USD, EUR, GBP, RUB, COP, PEN, UYU и т.д.
-                if re.match(r'^[A-Z]{3}$', streamer_candidate):
-                    continue  # Это код валюты, НЕ НИК! Пропускаем!
-                
-                # ⚠️ Исключаем чистые числа или числа с символами: 202, 512, 1265
-                if re.match(r'^\d+[.,]?\d*$', streamer_candidate):
-                    continue  # Это число, пропускаем!
-                
-                # ⚠️ Исключаем паттерны типа "Eye of Spartacus" (названия слотов из данных)
-                # Если в названии есть " of ", это скорее всего слот
-                if ' of ' in streamer_candidate.lower():
-                    continue  # Это название слота, пропускаем!
-                
-                # Проверяем что это не пусто и не похоже на число/валюту
-                # Должен содержать хотя бы одну букву (русскую или английскую)
-                if streamer_candidate and len(streamer_candidate) >= 2:
-                    # Проверяем что есть хотя бы одна буква (не только цифры и символы)
-                    if re.search(r'[А-Яа-яA-Za-z]', streamer_candidate):
-                        # Проверяем что это не похоже на число/валюту
-                        if not re.match(r'^[\d\s₽$€£.,]+$', streamer_candidate):
-                            # ⚠️ ДОПОЛНИТЕЛЬНАЯ ПРОВЕРКА: Убеждаемся что это не название слота
-                            # Если кандидат совпадает, является словом или подстрокой слота — пропускаем
-                            if result.slot:
-                                slot_lower = result.slot.lower()
-                                cand_lower = streamer_candidate.lower()
-                                if cand_lower == slot_lower or cand_lower in slot_lower.split() or cand_lower in slot_lower:
-                                    continue  # Это часть названия слота, пропускаем!
-                            
-                            result.streamer = streamer_candidate
-                            break
         
         # Извлекаем множитель (опционально)
-        for pattern in cls.PATTERNS['multiplier']:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    result.multiplier = float(match.group(1).replace(',', '.'))
-                except Exception:
-                    pass
-                break
+        _, multiplier = matchers['multiplier'].first(text, cyrillic)
+        if multiplier is not None:
+            try:
+                result.multiplier = float(multiplier.replace(',', '.'))
+            except Exception:
+                pass
         
         # Защита: выигрыш не может быть меньше ставки в постах про выигрыши
         # Если win < bet — скорее всего данные перепутаны местами, меняем
@@ -269,102 +432,94 @@ class CaptionParser:
         if result.multiplier == 0 and result.bet > 0 and result.win > 0:
             result.multiplier = round(result.win / result.bet, 1)
         
-        # Извлекаем валюту из строк выигрыша и ставки
+        result.currency = cls._detect_currency(caption_clean) or result.currency
+        return result
+    
+    @staticmethod
+    def _clean_streamer(candidate: str) -> str:
+        candidate = candidate.strip()
+        # Убираем лишние символы в начале
+        candidate = _STREAMER_LEAD_RE.sub('', candidate).strip()
+        # Очищаем от чисел и валюты в конце ТОЛЬКО если они идут после пробела
+        # Это позволяет сохранить ники типа "Player$" или "Gena88", но удалить "Gena88 500$"
+        candidate = _STREAMER_AMOUNT_TAIL_RE.sub('', candidate).strip()
+        # Если нет букв, значит это не ник (ник может содержать цифры)
+        if not _LETTER_RE.search(candidate):
+            return ""
+        return candidate
+    
+    @staticmethod
+    def _is_streamer(candidate: str, slot: str) -> bool:
+        """Кандидат похож на ник, а не на служебное слово, число, валюту или слот."""
+        if len(candidate) < 2:
+            return False
+        lowered = candidate.lower()
+        # ВАЖНО: Проверяем что это не служебное слово (ставка, слот и т.д.)
+        if lowered in FORBIDDEN_STREAMER_WORDS:
+            return False
+        # ⚠️ Множители типа X1265, Х6609 и коды валют (CLP, ARS, USD...) — НЕ НИКИ
+        if _MULTIPLIER_LIKE_RE.match(candidate) or _CURRENCY_CODE_RE.match(candidate):
+            return False
+        # ⚠️ Исключаем паттерны типа "Eye of Spartacus" (названия слотов из данных)
+        if ' of ' in lowered:
+            return False
+        # ⚠️ ДОПОЛНИТЕЛЬНАЯ ПРОВЕРКА: кандидат совпадает, является словом или подстрокой слота
+        if slot:
+            slot_lower = slot.lower()
+            if lowered == slot_lower or lowered in slot_lower.split() or lowered in slot_lower:
+                return False
+        return True
+    
+    @classmethod
+    def _detect_currency(cls, caption: str) -> Optional[str]:
+        """
+        Валюта из строк выигрыша/ставки, затем по символам и словам во всём тексте.
+        None — ничего не найдено (остаётся RUB по умолчанию).
+        """
         # Приоритет: явное указание валюты рядом с числами (выигрыш/ставка)
-        # Используем очищенную версию без markdown
-        caption_for_currency = caption_clean
-        
-        # Ищем валюту в строках с выигрышем и ставкой
-        # Паттерны: "выигрыш 1235 USD", "ставка 1 USD", "выигрыш 2 262 700 руб", "выигрыш 10000.00 евро"
-        # Также испанские: "Apuesta: 100$", "Ganancia: 498.095$"
-        currency_found = False
-        
-        # Общий паттерн для ключевых слов всех языков
-        _kw = r'(?:выигрыш|ставка|ganancia|apuesta|vincita|puntata|gagner|gain|mise|win|bet)'
-        
-        # 1. Ищем USD
-        if re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:USD|\$|доллар)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'USD'
-            currency_found = True
-        # 2. Ищем EUR
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:EUR|€|евро|euro)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'EUR'
-            currency_found = True
-        # 3. Ищем GBP
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:GBP|£|фунт)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'GBP'
-            currency_found = True
-        # 4. Ищем CLP
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:CLP)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'CLP'
-            currency_found = True
-        # 5. Ищем MXN
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:MXN)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'MXN'
-            currency_found = True
-        # 6. Ищем ARS
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:ARS|ARG)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'ARS'
-            currency_found = True
-        # 7. Ищем COP
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:COP)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'COP'
-            currency_found = True
-        # 8. Ищем PEN
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:PEN)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'PEN'
-            currency_found = True
-        # 9. Ищем UYU
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:UYU)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'UYU'
-            currency_found = True
-        # 10. Ищем RUB
-        elif re.search(_kw + r'[:\s]*[\d\s,.]+\s*(?:руб|рубл|р\b|RUB|₽)', caption_for_currency, re.IGNORECASE):
-            result.currency = 'RUB'
-            currency_found = True
+        currency = cls._currency_near_amount.find(caption)
+        if currency:
+            return currency
         
         # Если не нашли в строках выигрыша/ставки, ищем во всем тексте
-        if not currency_found:
-            # СНАЧАЛА проверяем символы валюты (приоритет выше чем слова)
-            if '$' in caption_for_currency or re.search(r'\d+\s*\$\s*|\$\s*\d+', caption_for_currency):
-                result.currency = 'USD'
-                currency_found = True
-            elif '€' in caption_for_currency or re.search(r'\d+\s*€\s*|€\s*\d+', caption_for_currency):
-                result.currency = 'EUR'
-                currency_found = True
-            elif '£' in caption_for_currency or re.search(r'\d+\s*£\s*|£\s*\d+', caption_for_currency):
-                result.currency = 'GBP'
-                currency_found = True
-            elif '₽' in caption_for_currency or re.search(r'\d+\s*₽\s*|₽\s*\d+', caption_for_currency):
-                result.currency = 'RUB'
-                currency_found = True
-            # Затем проверяем слова
-            elif re.search(r'\b(?:USD|доллар)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'USD'
-            elif re.search(r'\b(?:EUR|евро)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'EUR'
-            elif re.search(r'\b(?:GBP|фунт)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'GBP'
-            elif re.search(r'\b(?:CLP)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'CLP'
-            elif re.search(r'\b(?:MXN)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'MXN'
-            elif re.search(r'\b(?:ARS|ARG)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'ARS'
-            elif re.search(r'\b(?:COP)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'COP'
-            elif re.search(r'\b(?:PEN)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'PEN'
-            elif re.search(r'\b(?:UYU)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'UYU'
-            elif re.search(r'\b(?:руб|рубл|р\b|RUB)\b', caption_for_currency, re.IGNORECASE):
-                result.currency = 'RUB'
-            # По умолчанию USD для испанского сценария (если ничего не найдено, но есть числа)
-            elif re.search(r'\d+', caption_for_currency):
-                result.currency = 'USD'  # По умолчанию USD для испанского сценария
-            # Иначе RUB (для русского сценария)
+        # СНАЧАЛА проверяем символы валюты (приоритет выше чем слова)
+        for symbol, currency in _CURRENCY_SYMBOLS:
+            if symbol in caption:
+                return currency
+        # Затем проверяем слова
+        currency = cls._currency_words.find(caption)
+        if currency:
+            return currency
+        # По умолчанию USD для испанского сценария (если ничего не найдено, но есть числа)
+        if _DIGIT_RE.search(caption):
+            return 'USD'
+        # Иначе RUB (для русского сценария)
+        return None
+    
+    @classmethod
+    def parse_many(cls, captions: Iterable[Optional[str]], workers: int = 0,
+                   min_batch: Optional[int] = None) -> List[ParsedCaption]:
+        """
+        Парсит пачку подписей; результаты те же и в том же порядке, что у parse().
         
-        return result
+        Args:
+            captions: Подписи (None и пустые — пустой ParsedCaption)
+            workers: > 1 — разбор в пуле процессов, если подписей не меньше
+                     min_batch (большие бэкфиллы); иначе в текущем потоке
+            min_batch: Порог пачки для пула (по умолчанию CAPTION_POOL_MIN_BATCH)
+        """
+        captions = list(captions)
+        if min_batch is None:
+            min_batch = CAPTION_POOL_MIN_BATCH
+        if workers > 1 and len(captions) >= min_batch:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    chunksize = max(1, len(captions) // (workers * 4))
+                    return list(pool.map(parse_caption, captions, chunksize=chunksize))
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ Пул процессов недоступен ({e}), подписи разбираются в текущем процессе")
+        parse = cls.parse
+        return [parse(caption) for caption in captions]
     
     @staticmethod
     def _parse_number(s: str) -> float:
@@ -440,8 +595,13 @@ class CaptionParser:
                 s = s.replace('.', '')
         
         # Убираем всё кроме цифр и точки
-        cleaned = re.sub(r'[^\d.]', '', s)
+        cleaned = _NON_NUMBER_RE.sub('', s)
         try:
             return float(cleaned) if cleaned else 0.0
         except Exception:
             return 0.0
+
+
+def parse_caption(caption: Optional[str]) -> ParsedCaption:
+    """CaptionParser.parse как функция модуля — для пула процессов в parse_many."""
+    return CaptionParser.parse(caption)
@@ -0,0 +1,537 @@
+"""
+@file: cassette.py
+@description: Запись и воспроизведение ввода-вывода прогона (кассеты) — ответы LLM, HTTP-запросы
+              к OpenRouter и вызовы Telethon; воспроизведение без сети и с тем же random
+@dependencies: gzip, pickle, aiohttp (запись HTTP), openai (необязательно, для типов ответа)
+@created: 2026-10-19
+
+Чтобы разобрать плохой пакет или профилировать постобработку, приходится
+снова платить за живые вызовы и ждать их. С CASSETTE_MODE=record каждый
+ответ LLM (timed_completion), aiohttp-запрос проверки уникальности и
+генерации картинок (http_session) и вызов Telethon-клиента
+(TelethonClientManager) пишутся в кассету — gzip JSONL, одна запись на вызов.
+С CASSETTE_MODE=replay те же вызовы отвечают из кассеты: сеть, ключи и
+паузы между регенами (pace) не нужны, прогон идёт со скоростью CPU.
+
+random сидируется значением из заголовка кассеты и при записи, и при
+воспроизведении, поэтому выбор промптов, форматов и бонусов повторяется, и
+запросы совпадают с записанными по ключу (sha1 вида вызова и запроса).
+Одинаковые запросы отдаются по порядку записи. Если ключ не совпал (например,
+путь временного файла в send_file), берётся следующая неиспользованная запись
+того же вида — такие промахи считаются в stats.key_misses. Нет записи вовсе —
+CassetteMiss.
+
+Ошибки вызовов тоже записываются: таймаут воспроизводится как
+asyncio.TimeoutError, остальные — исходным исключением, если оно
+сериализуется, иначе CassetteRecordedError с типом и текстом.
+
+Не записывается трафик Bot API (aiogram): его ответы не влияют на
+генерацию, а для нагрузки есть benchmarks/fake_telegram.py.
+
+CASSETTE_MODE: off | record | replay (по умолчанию off)
+CASSETTE_PATH: файл кассеты (по умолчанию data/cassettes/run-<время>.jsonl.gz при записи)
+CASSETTE_SEED: seed для random при записи (по умолчанию случайный)
+"""
+
+import asyncio
+import atexit
+import base64
+import gzip
+import hashlib
+import inspect
+import io
+import json
+import os
+import pickle
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional
+
+try:
+    from openai.types.chat import ChatCompletion
+except ImportError:  # openai не установлен — ответ собирается из SimpleNamespace
+    ChatCompletion = None
+
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").strip().lower()
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", "").strip()
+CASSETTE_SEED = os.getenv("CASSETTE_SEED", "").strip()
+
+CASSETTE_DIR = Path("data/cassettes")
+CASSETTE_VERSION = 1
+
+# Методы Telethon, которые в воспроизведении отвечают без кассеты
+_TELETHON_REPLAY_DEFAULTS = {
+    "connect": None,
+    "disconnect": None,
+    "is_user_authorized": True,
+}
+
+
+class CassetteMiss(Exception):
+    """В кассете нет записи для вызова"""
+
+
+class CassetteRecordedError(Exception):
+    """Ошибка, записанная в кассету, которую нельзя восстановить исходным типом"""
+
+
+@dataclass
+class CassetteStats:
+    recorded: int = 0
+    replayed: int = 0
+    key_misses: int = 0
+
+
+def _fingerprint(value: Any) -> Any:
+    """Запрос → JSON-совместимая структура для ключа (без объектов и байтов)."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): _fingerprint(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_fingerprint(v) for v in value]
+    if isinstance(value, (bytes, bytearray)):
+        return "sha1:" + hashlib.sha1(value).hexdigest()
+    if callable(value):
+        return "<callable>"
+    to_dict = getattr(value, "to_dict", None)
+    if callable(to_dict):
+        try:
+            return _fingerprint(to_dict())
+        except Exception:
+            pass
+    return str(value)
+
+
+def request_key(kind: str, request: Any) -> str:
+    payload = json.dumps(_fingerprint(request), ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(f"{kind}\n{payload}".encode("utf-8")).hexdigest()
+
+
+class _ClientPickler(pickle.Pickler):
+    """Подменяет ссылку на Telethon-клиент (сокет, цикл событий) меткой."""
+
+    def __init__(self, file, client: Any):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._client = client
+
+    def persistent_id(self, obj):
+        if self._client is not None and obj is self._client:
+            return "client"
+        return None
+
+
+class _ClientUnpickler(pickle.Unpickler):
+    def __init__(self, file, client: Any):
+        super().__init__(file)
+        self._client = client
+
+    def persistent_load(self, pid):
+        if pid == "client":
+            return self._client
+        raise pickle.UnpicklingError(f"Неизвестная ссылка в кассете: {pid}")
+
+
+def _dumps(value: Any, client: Any = None) -> str:
+    buffer = io.BytesIO()
+    _ClientPickler(buffer, client).dump(value)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _loads(payload: str, client: Any = None) -> Any:
+    return _ClientUnpickler(io.BytesIO(base64.b64decode(payload)), client).load()
+
+
+def _namespace(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_namespace(v) for v in value]
+    return value
+
+
+class Cassette:
+    """Кассета текущего процесса (singleton): запись или воспроизведение вызовов."""
+
+    _instance: Optional["Cassette"] = None
+
+    def __init__(self, mode: str = CASSETTE_MODE, path: str = CASSETTE_PATH, seed: str = CASSETTE_SEED):
+        self.mode = mode if mode in ("record", "replay") else "off"
+        self.path: Optional[Path] = None
+        self.seed: Optional[int] = None
+        self.stats = CassetteStats()
+        self._lock = threading.Lock()
+        self._file = None
+        self._by_key: Dict[str, Deque[dict]] = {}
+        self._by_kind: Dict[str, Deque[dict]] = {}
+
+        if self.mode == "record":
+            self.path = Path(path) if path else CASSETTE_DIR / f"run-{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.seed = int(seed) if seed else random.randrange(2 ** 32)
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")
+            self._write({"cassette": CASSETTE_VERSION, "seed": self.seed, "created": time.time()})
+            atexit.register(self.close)
+            print(f"📼 Кассета: запись в {self.path} (seed={self.seed})")
+        elif self.mode == "replay":
+            if not path:
+                raise ValueError("CASSETTE_MODE=replay требует CASSETTE_PATH")
+            self.path = Path(path)
+            self._load()
+            print(f"📼 Кассета: воспроизведение {self.path} (seed={self.seed}, "
+                  f"{sum(len(q) for q in self._by_kind.values())} записей)")
+
+        if self.seed is not None:
+            random.seed(self.seed)
+
+    @classmethod
+    def get_instance(cls) -> "Cassette":
+        if cls._instance is None:
+            cls._instance = Cassette()
+        return cls._instance
+
+    @property
+    def active(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # ─────────────────────────────────────────────────────────────
+    # Файл
+    # ─────────────────────────────────────────────────────────────
+
+    def _write(self, entry: dict):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            # Синхронный сброс gzip: кассета читается, даже если процесс упал
+            self._file.flush()
+
+    def _load(self):
+        header = None
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if header is None:
+                        header = entry
+                        continue
+                    entry["used"] = False
+                    self._by_key.setdefault(entry["key"], deque()).append(entry)
+                    self._by_kind.setdefault(entry["kind"], deque()).append(entry)
+            except (EOFError, ValueError):
+                # Запись оборвалась на середине строки — берём то, что успело сохраниться
+                pass
+        if not header or "seed" not in header:
+            raise ValueError(f"{self.path}: нет заголовка кассеты")
+        self.seed = int(header["seed"])
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ─────────────────────────────────────────────────────────────
+    # Запись и воспроизведение
+    # ─────────────────────────────────────────────────────────────
+
+    def record(self, kind: str, request: Any, payload: Any = None, error: Optional[BaseException] = None,
+               enc: str = "json"):
+        """Записывает результат вызова (payload уже в форме enc) или его ошибку."""
+        if not self.recording:
+            return
+        entry = {"kind": kind, "key": request_key(kind, request), "enc": enc, "payload": payload}
+        if error is not None:
+            entry["enc"] = "none"
+            entry["payload"] = None
+            entry["error"] = {
+                "type": type(error).__name__,
+                "message": str(error),
+                "timeout": isinstance(error, asyncio.TimeoutError),
+            }
+            try:
+                entry["error"]["pickle"] = _dumps(error)
+            except Exception:
+                pass
+        self._write(entry)
+        self.stats.recorded += 1
+
+    def _take(self, kind: str, request: Any) -> dict:
+        key = request_key(kind, request)
+        with self._lock:
+            for queue, miss in ((self._by_key.get(key), False), (self._by_kind.get(kind), True)):
+                while queue:
+                    entry = queue.popleft()
+                    if entry["used"]:
+                        continue
+                    entry["used"] = True
+                    self.stats.replayed += 1
+                    self.stats.key_misses += int(miss)
+                    return entry
+        raise CassetteMiss(f"В кассете {self.path} нет записи {kind} для запроса {key[:12]}")
+
+    def replay(self, kind: str, request: Any, client: Any = None) -> Any:
+        """Результат записанного вызова; записанная ошибка поднимается заново."""
+        entry = self._take(kind, request)
+        error = entry.get("error")
+        if error:
+            if error.get("timeout"):
+                raise asyncio.TimeoutError(error.get("message") or "")
+            if error.get("pickle"):
+                try:
+                    exc = _loads(error["pickle"])
+                except Exception:
+                    exc = None
+                if isinstance(exc, BaseException):
+                    raise exc
+            raise CassetteRecordedError(f"{error.get('type')}: {error.get('message')}")
+        if entry["enc"] == "pickle":
+            return _loads(entry["payload"], client)
+        if entry["enc"] == "none":
+            return None
+        return entry["payload"]
+
+    # ─────────────────────────────────────────────────────────────
+    # LLM
+    # ─────────────────────────────────────────────────────────────
+
+    def record_completion(self, params: Dict[str, Any], response: Any = None,
+                          error: Optional[BaseException] = None):
+        if not self.recording:
+            return
+        payload = None
+        if response is not None:
+            dump = getattr(response, "model_dump", None)
+            payload = dump(mode="json") if callable(dump) else json.loads(json.dumps(response, default=vars))
+        self.record("llm", params, payload, error)
+
+    def replay_completion(self, params: Dict[str, Any]) -> Any:
+        data = self.replay("llm", params)
+        if ChatCompletion is not None:
+            try:
+                return ChatCompletion.model_validate(data)
+            except Exception:
+                pass
+        return _namespace(data)
+
+    # ─────────────────────────────────────────────────────────────
+    # HTTP (aiohttp) и Telethon
+    # ─────────────────────────────────────────────────────────────
+
+    def http_session(self):
+        """aiohttp.ClientSession для запросов к LLM; в режиме кассеты — записывающая/отвечающая обёртка."""
+        if self.replaying:
+            return _ReplaySession(self)
+        import aiohttp
+        if self.recording:
+            return _RecordingSession(self, aiohttp.ClientSession())
+        return aiohttp.ClientSession()
+
+    def telethon_client(self, index: int, client: Any = None) -> "_TelethonProxy":
+        return _TelethonProxy(self, index, client)
+
+    async def pace(self, seconds: float):
+        """Пауза между попытками; при воспроизведении — без ожидания."""
+        await asyncio.sleep(0 if self.replaying else seconds)
+
+
+def get_cassette() -> Cassette:
+    """Короткий доступ к кассете процесса."""
+    return Cassette.get_instance()
+
+
+def http_session():
+    return get_cassette().http_session()
+
+
+async def pace(seconds: float):
+    await get_cassette().pace(seconds)
+
+
+# ─────────────────────────────────────────────────────────────
+# aiohttp
+# ─────────────────────────────────────────────────────────────
+
+def _http_request(url: str, json_body: Any) -> Dict[str, Any]:
+    # Заголовки (ключи, Referer) в ключ не входят — кассета не зависит от секретов
+    from urllib.parse import urlsplit
+    return {"path": urlsplit(str(url)).path, "json": json_body}
+
+
+class _CassetteResponse:
+    def __init__(self, status: int, body: str):
+        self.status = status
+        self._body = body
+
+    async def text(self) -> str:
+        return self._body
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(self._body)
+
+
+class _PendingResponse:
+    """Результат post(): как у aiohttp, работает и через await, и через async with."""
+
+    def __init__(self, coro):
+        self._coro = coro
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        return await self._coro
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _RecordingSession:
+    def __init__(self, cassette: Cassette, session):
+        self._cassette = cassette
+        self._session = session
+
+    def post(self, url, *, json=None, **kwargs):
+        return _PendingResponse(self._post(url, json, kwargs))
+
+    async def _post(self, url, json_body, kwargs):
+        request = _http_request(url, json_body)
+        try:
+            async with self._session.post(url, json=json_body, **kwargs) as response:
+                body = await response.text()
+                status = response.status
+        except Exception as exc:
+            self._cassette.record("http", request, error=exc)
+            raise
+        self._cassette.record("http", request, {"status": status, "body": body})
+        return _CassetteResponse(status, body)
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._session.__aexit__(*exc)
+
+
+class _ReplaySession:
+    def __init__(self, cassette: Cassette):
+        self._cassette = cassette
+
+    def post(self, url, *, json=None, **kwargs):
+        return _PendingResponse(self._post(url, json))
+
+    async def _post(self, url, json_body):
+        data = self._cassette.replay("http", _http_request(url, json_body))
+        return _CassetteResponse(data["status"], data["body"])
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+# ─────────────────────────────────────────────────────────────
+# Telethon
+# ─────────────────────────────────────────────────────────────
+
+class _TelethonProxy:
+    """Telethon-клиент через кассету: await-вызовы и iter_* пишутся/отдаются из кассеты."""
+
+    def __init__(self, cassette: Cassette, index: int, client: Any = None):
+        self._cassette = cassette
+        self._index = index
+        self._client = client
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if self._cassette.replaying:
+            return self._replay_attr(name)
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        if name.startswith("iter_"):
+            return lambda *args, **kwargs: self._record_iter(name, attr, args, kwargs)
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return self._record_await(name, result, args, kwargs)
+            return result
+        return call
+
+    def _kind(self, name: str) -> str:
+        return f"telethon.{self._index}.{name}"
+
+    def _record_result(self, name: str, request: Any, result: Any = None, error: Optional[BaseException] = None):
+        if error is not None:
+            self._cassette.record(self._kind(name), request, error=error)
+            return
+        try:
+            self._cassette.record(self._kind(name), request, _dumps(result, self._client), enc="pickle")
+        except Exception:
+            # Результат не сериализуется — при воспроизведении вернётся None
+            self._cassette.record(self._kind(name), request, None, enc="none")
+
+    async def _record_await(self, name: str, awaitable, args, kwargs):
+        request = {"args": args, "kwargs": kwargs}
+        try:
+            result = await awaitable
+        except Exception as exc:
+            self._record_result(name, request, error=exc)
+            raise
+        self._record_result(name, request, result)
+        return result
+
+    async def _record_iter(self, name: str, method, args, kwargs):
+        request = {"args": args, "kwargs": kwargs}
+        items: List[Any] = []
+        error = None
+        try:
+            async for item in method(*args, **kwargs):
+                items.append(item)
+                yield item
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            # Пишется и при раннем выходе из цикла (break) — отдаются те же элементы
+            self._record_result(name, request, items, error)
+
+    def _replay_attr(self, name: str):
+        if name == "is_connected":
+            return lambda: True
+        if name in _TELETHON_REPLAY_DEFAULTS:
+            default = _TELETHON_REPLAY_DEFAULTS[name]
+
+            async def local(*args, **kwargs):
+                return default
+            return local
+        if name.startswith("iter_"):
+            return lambda *args, **kwargs: self._replay_iter(name, args, kwargs)
+
+        async def call(*args, **kwargs):
+            return self._cassette.replay(self._kind(name), {"args": args, "kwargs": kwargs}, self)
+        return call
+
+    async def _replay_iter(self, name: str, args, kwargs):
+        items = self._cassette.replay(self._kind(name), {"args": args, "kwargs": kwargs}, self)
+        for item in items or ():
+            yield item
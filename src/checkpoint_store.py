@@ -0,0 +1,177 @@
+"""
+@file: checkpoint_store.py
+@description: Долговременные чекпоинты задач (SQLite WAL): готовые посты и id опубликованных сообщений
+@dependencies: sqlite3, json
+@created: 2026-10-19
+
+Раньше всё жило в MemoryStorage, и рестарт/деплой посреди прогона выбрасывал
+оплаченные ответы LLM и оставлял канал опубликованным наполовину. Теперь
+каждый готовый пост и каждый опубликованный message_id пишется сюда сразу,
+а при старте бот предлагает продолжить незавершённые задачи.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "checkpoints.db"
+
+# Незавершённые задачи старше этого срока при старте не предлагаются (сек)
+RESUME_MAX_AGE = 3 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id      TEXT PRIMARY KEY,
+    user_id     INTEGER NOT NULL,
+    chat_id     INTEGER NOT NULL,
+    kind        TEXT NOT NULL,
+    scenario    TEXT NOT NULL DEFAULT '',
+    status      TEXT NOT NULL,
+    total       INTEGER NOT NULL DEFAULT 0,
+    context     TEXT NOT NULL DEFAULT '{}',
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id   TEXT NOT NULL,
+    idx      INTEGER NOT NULL,
+    payload  TEXT NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE TABLE IF NOT EXISTS job_published (
+    job_id      TEXT NOT NULL,
+    idx         INTEGER NOT NULL,
+    message_id  INTEGER,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+"""
+
+
+class CheckpointStore:
+    """Чекпоинты задач в локальном SQLite (WAL), общий на процесс (singleton)."""
+
+    _instance: Optional["CheckpointStore"] = None
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def get_instance(cls) -> "CheckpointStore":
+        if cls._instance is None:
+            cls._instance = CheckpointStore()
+        return cls._instance
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    # ─────────────────────────────────────────────────────────────
+    # Запись
+    # ─────────────────────────────────────────────────────────────
+
+    def open_job(self, job_id: str, user_id: int, chat_id: int, kind: str,
+                 scenario: str, total: int, context: Dict[str, Any]):
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO jobs (job_id, user_id, chat_id, kind, scenario, status, total, context, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, 'running', ?, ?, ?, ?)",
+            (job_id, user_id, chat_id, kind, scenario, total,
+             json.dumps(context, ensure_ascii=False, default=str), now, now)
+        )
+
+    def set_status(self, job_id: str, status: str):
+        self._execute("UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?", (status, time.time(), job_id))
+
+    def update_context(self, job_id: str, values: Dict[str, Any]):
+        """Дописывает ключи в context задачи."""
+        job = self.get_job(job_id)
+        if job is None:
+            return
+        context = dict(job["context"], **values)
+        self._execute(
+            "UPDATE jobs SET context = ?, updated_at = ? WHERE job_id = ?",
+            (json.dumps(context, ensure_ascii=False, default=str), time.time(), job_id)
+        )
+
+    def save_item(self, job_id: str, idx: int, payload: Dict[str, Any]):
+        """Сохраняет готовый элемент задачи (например, сгенерированный пост)."""
+        self._execute(
+            "INSERT OR REPLACE INTO job_items (job_id, idx, payload) VALUES (?, ?, ?)",
+            (job_id, idx, json.dumps(payload, ensure_ascii=False, default=str))
+        )
+        self._touch(job_id)
+
+    def mark_published(self, job_id: str, idx: int, message_id: Optional[int]):
+        """Фиксирует опубликованный пост — при возобновлении он не будет отправлен повторно."""
+        self._execute(
+            "INSERT OR REPLACE INTO job_published (job_id, idx, message_id) VALUES (?, ?, ?)",
+            (job_id, idx, message_id)
+        )
+        self._touch(job_id)
+
+    def _touch(self, job_id: str):
+        self._execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def delete_job(self, job_id: str):
+        for table in ("job_items", "job_published", "jobs"):
+            self._execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+
+    # ─────────────────────────────────────────────────────────────
+    # Чтение
+    # ─────────────────────────────────────────────────────────────
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute(
+            "SELECT job_id, user_id, chat_id, kind, scenario, status, total, context, created_at, updated_at "
+            "FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def unfinished_jobs(self) -> List[Dict[str, Any]]:
+        """Задачи, прерванные рестартом (статус running/paused), не старше RESUME_MAX_AGE."""
+        rows = self._execute(
+            "SELECT job_id, user_id, chat_id, kind, scenario, status, total, context, created_at, updated_at "
+            "FROM jobs WHERE status IN ('running', 'paused') AND updated_at > ? ORDER BY created_at",
+            (time.time() - RESUME_MAX_AGE,)
+        ).fetchall()
+        return [self._row_to_job(r) for r in rows]
+
+    def load_items(self, job_id: str) -> Dict[int, Dict[str, Any]]:
+        rows = self._execute("SELECT idx, payload FROM job_items WHERE job_id = ? ORDER BY idx", (job_id,)).fetchall()
+        return {idx: json.loads(payload) for idx, payload in rows}
+
+    def published_indices(self, job_id: str) -> Dict[int, Optional[int]]:
+        rows = self._execute("SELECT idx, message_id FROM job_published WHERE job_id = ?", (job_id,)).fetchall()
+        return {idx: message_id for idx, message_id in rows}
+
+    def count_done(self, job_id: str, kind: str) -> int:
+        table = "job_published" if kind == "publishing" else "job_items"
+        row = self._execute(f"SELECT COUNT(*) FROM {table} WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _row_to_job(row) -> Dict[str, Any]:
+        keys = ("job_id", "user_id", "chat_id", "kind", "scenario", "status", "total", "context", "created_at", "updated_at")
+        job = dict(zip(keys, row))
+        try:
+            job["context"] = json.loads(job["context"] or "{}")
+        except json.JSONDecodeError:
+            job["context"] = {}
+        return job
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Короткий доступ к общему хранилищу чекпоинтов."""
+    return CheckpointStore.get_instance()
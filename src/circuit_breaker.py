@@ -0,0 +1,164 @@
+"""
+@file: circuit_breaker.py
+@description: Circuit breaker по моделям — общий для всех генераторов; открывается после серии
+              ошибок/таймаутов и пропускает пробный запрос по расписанию (half-open)
+@dependencies: os, threading, time
+@created: 2026-10-19
+
+Когда модель начинает падать, ротация в streamer_posts_model_selected
+продолжает слать ей посты, и каждый из них проходит 10 регенов × 3 попытки
+generate_video_post, прежде чем сработает фоллбек. Теперь:
+
+- timed_completion (src/hedging.py) проверяет состояние модели до вызова и
+  отмечает успех или ошибку/таймаут после;
+- после CIRCUIT_FAILURE_THRESHOLD ошибок подряд модель «открыта»: вызовы сразу
+  получают CircuitOpenError, generate_video_post не тратит регены, а ротация
+  и фоллбек выбирают здоровую модель (pick_healthy);
+- через CIRCUIT_OPEN_SECONDS пропускается один пробный запрос (half-open):
+  успех закрывает цепь, ошибка снова открывает её на тот же срок.
+
+Ключ — id модели, как он уходит в API, поэтому состояние общее для
+генераторов всех языков.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "120"))
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Модель временно отключена circuit breaker'ом."""
+
+    def __init__(self, model: str, retry_in: float):
+        self.model = model
+        self.retry_in = retry_in
+        super().__init__(f"Модель {model} временно отключена после серии ошибок (проба через {retry_in:.0f}с)")
+
+
+@dataclass
+class ModelCircuit:
+    """Состояние цепи одной модели"""
+    state: str = STATE_CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    times_opened: int = 0
+
+    def retry_in(self, now: float) -> float:
+        return max(0.0, self.opened_at + CIRCUIT_OPEN_SECONDS - now)
+
+
+class CircuitBreakers:
+    """Circuit breaker'ы всех моделей (singleton)."""
+
+    _instance: Optional["CircuitBreakers"] = None
+
+    def __init__(self):
+        self._circuits: Dict[str, ModelCircuit] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "CircuitBreakers":
+        if cls._instance is None:
+            cls._instance = CircuitBreakers()
+        return cls._instance
+
+    def _circuit(self, model: str) -> ModelCircuit:
+        return self._circuits.setdefault(model, ModelCircuit())
+
+    def is_available(self, model: str) -> bool:
+        """Можно ли сейчас отправить модели запрос (без захвата пробы)."""
+        with self._lock:
+            circuit = self._circuits.get(model)
+            if circuit is None or circuit.state == STATE_CLOSED:
+                return True
+            if circuit.probe_in_flight:
+                return False
+            return circuit.retry_in(time.time()) == 0
+
+    def acquire(self, model: str):
+        """Перед вызовом модели: CircuitOpenError, если цепь открыта; в half-open — занимает пробу."""
+        with self._lock:
+            circuit = self._circuit(model)
+            if circuit.state == STATE_CLOSED:
+                return
+            now = time.time()
+            if circuit.probe_in_flight or circuit.retry_in(now) > 0:
+                raise CircuitOpenError(model, circuit.retry_in(now))
+            circuit.state = STATE_HALF_OPEN
+            circuit.probe_in_flight = True
+        print(f"   🔌 {model}: пробный запрос после паузы (half-open)")
+
+    def record_success(self, model: str):
+        with self._lock:
+            circuit = self._circuit(model)
+            was_open = circuit.state != STATE_CLOSED
+            circuit.state = STATE_CLOSED
+            circuit.consecutive_failures = 0
+            circuit.probe_in_flight = False
+        if was_open:
+            print(f"   🔌 {model}: модель снова отвечает, цепь закрыта")
+
+    def record_failure(self, model: str):
+        """Ошибка или таймаут вызова модели."""
+        with self._lock:
+            circuit = self._circuit(model)
+            circuit.consecutive_failures += 1
+            reopen = circuit.state == STATE_HALF_OPEN
+            trip = circuit.state == STATE_CLOSED and circuit.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+            if reopen or trip:
+                circuit.state = STATE_OPEN
+                circuit.opened_at = time.time()
+                circuit.times_opened += 1
+            circuit.probe_in_flight = False
+            failures = circuit.consecutive_failures
+        if reopen or trip:
+            print(f"   🔌 {model}: {failures} ошибок подряд, модель отключена на {CIRCUIT_OPEN_SECONDS:.0f}с")
+
+    def release(self, model: str):
+        """Вызов отменён (например, проигравший хедж) — проба освобождается без вердикта."""
+        with self._lock:
+            circuit = self._circuits.get(model)
+            if circuit is not None and circuit.state == STATE_HALF_OPEN and circuit.probe_in_flight:
+                circuit.state = STATE_OPEN
+                circuit.probe_in_flight = False
+
+    def states(self) -> Dict[str, ModelCircuit]:
+        with self._lock:
+            return {k: ModelCircuit(**vars(v)) for k, v in self._circuits.items()}
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    """Короткий доступ к общим circuit breaker'ам моделей."""
+    return CircuitBreakers.get_instance()
+
+
+def pick_healthy(candidates: Sequence[Tuple[str, str, str]], models: Dict[str, Dict],
+                 start: int = 0) -> Tuple[str, str, str]:
+    """
+    Первый по кругу (начиная с start) кандидат ротации (key, provider, name), чья
+    модель доступна. Если отключены все — кандидат с позиции start, как раньше.
+    """
+    breakers = get_circuit_breakers()
+    for offset in range(len(candidates)):
+        candidate = candidates[(start + offset) % len(candidates)]
+        if breakers.is_available(models.get(candidate[0], {}).get("id", candidate[0])):
+            return candidate
+    return candidates[start % len(candidates)]
+
+
+def healthy_candidates(candidates: Sequence[Tuple[str, str, str]],
+                       models: Dict[str, Dict]) -> Sequence[Tuple[str, str, str]]:
+    """Кандидаты с доступными моделями (все, если отключены все)."""
+    breakers = get_circuit_breakers()
+    healthy = [c for c in candidates if breakers.is_available(models.get(c[0], {}).get("id", c[0]))]
+    return healthy or candidates
@@ -0,0 +1,236 @@
+"""
+@file: cost_accounting.py
+@description: Учёт токенов и стоимости вызовов LLM — по посту, прогону (задаче), модели и пользователю;
+              необязательный жёсткий бюджет на прогон
+@dependencies: contextvars, src.scheduler, src.token_budget
+@created: 2026-10-19
+
+Каждый ответ модели проходит через timed_completion (src/hedging.py) или
+ручную запись в aiohttp-проверке уникальности; оттуда usage попадает в
+get_cost_ledger().record_call(). Стоимость считается по price_input/
+price_output из OPENROUTER_MODELS (register_model_prices при импорте
+генераторов), либо берётся из usage.cost, если OpenRouter её вернул.
+
+Прогон — это Job из src.job_manager: JobRegistry.create привязывает к текущей
+задаче новый RunCost (как set_work_context для планировщика), и все вызовы
+внутри неё считаются в job.cost. Генератор отмечает номер поста
+(set_cost_post) и исход каждой регенерации (settle_attempt) — стоимость
+отклонённых регенов копится в wasted_usd.
+
+RUN_BUDGET_USD: жёсткий бюджет на прогон в $ (0 — без лимита). После
+превышения generate_video_post не начинает новые регены (BudgetExceeded),
+а ротация в хендлерах останавливается.
+"""
+
+import contextvars
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.scheduler import get_work_context
+from src.token_budget import estimate_messages_tokens
+
+RUN_BUDGET_USD = float(os.getenv("RUN_BUDGET_USD", "0"))
+
+# Курс для сводки в сообщениях (остальные цены в интерфейсе — в рублях)
+USD_RUB_RATE = float(os.getenv("USD_RUB_RATE", "95"))
+
+
+class BudgetExceeded(Exception):
+    """Бюджет прогона исчерпан"""
+
+    def __init__(self, spent: float, budget: float):
+        self.spent = spent
+        self.budget = budget
+        super().__init__(f"Бюджет прогона исчерпан: ${spent:.4f} из ${budget:.2f}")
+
+
+@dataclass
+class CostTotals:
+    """Токены и стоимость по одному срезу (модель, пользователь)"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, prompt_tokens: int, completion_tokens: int, cost: float):
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost_usd += cost
+
+
+@dataclass
+class RunCost:
+    """Стоимость одного прогона (задачи)"""
+    job_id: str = ""
+    user_id: int = 0
+    budget_usd: float = RUN_BUDGET_USD
+    totals: CostTotals = field(default_factory=CostTotals)
+    wasted_usd: float = 0.0
+    accepted: int = 0
+    rejected: int = 0
+    by_model: Dict[str, CostTotals] = field(default_factory=dict)
+    by_post: Dict[int, float] = field(default_factory=dict)
+    _attempt_usd: float = 0.0
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget_usd > 0 and self.totals.cost_usd >= self.budget_usd
+
+    def check_budget(self):
+        if self.exceeded:
+            raise BudgetExceeded(self.totals.cost_usd, self.budget_usd)
+
+    def add(self, model: str, post: Optional[int], prompt_tokens: int, completion_tokens: int, cost: float):
+        self.totals.add(prompt_tokens, completion_tokens, cost)
+        self.by_model.setdefault(model, CostTotals()).add(prompt_tokens, completion_tokens, cost)
+        if post is not None:
+            self.by_post[post] = self.by_post.get(post, 0.0) + cost
+        self._attempt_usd += cost
+
+    def settle_attempt(self, accepted: int, rejected: int):
+        """
+        Закрывает попытку (реген или пакет): стоимость вызовов с прошлого settle
+        делится между принятыми и отклонёнными постами, доля отклонённых — в wasted_usd.
+        """
+        total = accepted + rejected
+        if total:
+            self.wasted_usd += self._attempt_usd * rejected / total
+        self.accepted += accepted
+        self.rejected += rejected
+        self._attempt_usd = 0.0
+
+    def summary(self) -> str:
+        """Сводка для итогового сообщения (HTML)."""
+        t = self.totals
+        if not t.calls:
+            return ""
+        tokens = f"{t.prompt_tokens + t.completion_tokens:,}".replace(",", " ")
+        lines = [
+            f"💵 <b>Расход:</b> ${t.cost_usd:.4f} (~{t.cost_usd * USD_RUB_RATE:.2f}₽), "
+            f"{t.calls} вызовов, {tokens} токенов"
+        ]
+        if self.accepted:
+            lines.append(f"   • на принятый пост: ${t.cost_usd / self.accepted:.4f}")
+        if self.wasted_usd:
+            share = self.wasted_usd * 100 / t.cost_usd if t.cost_usd else 0
+            lines.append(f"   • на отклонённые регены: ${self.wasted_usd:.4f} ({share:.0f}%, {self.rejected} шт.)")
+        if len(self.by_model) > 1:
+            top = sorted(self.by_model.items(), key=lambda kv: kv[1].cost_usd, reverse=True)[:3]
+            lines.append("   • " + ", ".join(f"{m.split('/')[-1]} ${c.cost_usd:.4f}" for m, c in top))
+        if self.budget_usd > 0:
+            mark = "⛔️ исчерпан" if self.exceeded else "в пределах"
+            lines.append(f"   • бюджет ${self.budget_usd:.2f}: {mark}")
+        return "\n".join(lines)
+
+
+_current_run: contextvars.ContextVar[Optional[RunCost]] = contextvars.ContextVar("current_run_cost", default=None)
+_current_post: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("current_cost_post", default=None)
+
+
+def bind_run_cost(run: Optional[RunCost]):
+    """Привязывает RunCost к текущей задаче (и всем порождённым ею корутинам)."""
+    _current_run.set(run)
+
+
+def get_run_cost() -> Optional[RunCost]:
+    return _current_run.get()
+
+
+def set_cost_post(index: Optional[int]):
+    """
+    Номер поста, к которому относятся следующие вызовы (None — пакет).
+    Начинает новую попытку: служебные вызовы до неё (пул бонусов) не попадут в wasted_usd.
+    """
+    _current_post.set(index)
+    run = _current_run.get()
+    if run is not None:
+        run.settle_attempt(0, 0)
+
+
+def settle_attempt(accepted: int, rejected: int):
+    run = _current_run.get()
+    if run is not None:
+        run.settle_attempt(accepted, rejected)
+
+
+def check_run_budget():
+    """BudgetExceeded, если бюджет текущего прогона исчерпан."""
+    run = _current_run.get()
+    if run is not None:
+        run.check_budget()
+
+
+def _usage_value(usage: Any, name: str) -> Optional[float]:
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get(name)
+    return getattr(usage, name, None)
+
+
+class CostLedger:
+    """Цены моделей и общий учёт по моделям и пользователям (singleton)."""
+
+    _instance: Optional["CostLedger"] = None
+
+    def __init__(self):
+        self._prices: Dict[str, tuple] = {}
+        self.by_model: Dict[str, CostTotals] = {}
+        self.by_user: Dict[int, CostTotals] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "CostLedger":
+        if cls._instance is None:
+            cls._instance = CostLedger()
+        return cls._instance
+
+    def register_prices(self, models: Dict[str, Dict]):
+        """Цены ($ за 1M токенов) по id модели и по ключу (для прямых вызовов OpenAI)."""
+        for key, info in models.items():
+            price = (float(info.get("price_input") or 0), float(info.get("price_output") or 0))
+            self._prices.setdefault(info.get("id", key), price)
+            self._prices.setdefault(key, price)
+
+    def price(self, model: str) -> tuple:
+        return self._prices.get(model) or self._prices.get(model.split("/")[-1], (0.0, 0.0))
+
+    def record_call(self, model: str, usage: Any = None, messages: Optional[List[Dict]] = None) -> float:
+        """Учитывает один ответ модели. Возвращает стоимость в $."""
+        prompt_tokens = _usage_value(usage, "prompt_tokens")
+        if prompt_tokens is None:
+            prompt_tokens = estimate_messages_tokens(messages) if messages else 0
+        completion_tokens = _usage_value(usage, "completion_tokens") or 0
+        cost = _usage_value(usage, "cost")
+        if cost is None:
+            price_in, price_out = self.price(model)
+            cost = (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+        prompt_tokens, completion_tokens, cost = int(prompt_tokens), int(completion_tokens), float(cost)
+
+        user_id = get_work_context()[0]
+        with self._lock:
+            self.by_model.setdefault(model, CostTotals()).add(prompt_tokens, completion_tokens, cost)
+            self.by_user.setdefault(user_id, CostTotals()).add(prompt_tokens, completion_tokens, cost)
+            run = _current_run.get()
+            if run is not None:
+                run.add(model, _current_post.get(), prompt_tokens, completion_tokens, cost)
+        return cost
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                "by_model": {k: CostTotals(**vars(v)) for k, v in self.by_model.items()},
+                "by_user": {k: CostTotals(**vars(v)) for k, v in self.by_user.items()},
+            }
+
+
+def get_cost_ledger() -> CostLedger:
+    """Короткий доступ к общему учёту стоимости."""
+    return CostLedger.get_instance()
+
+
+def register_model_prices(models: Dict[str, Dict]):
+    get_cost_ledger().register_prices(models)
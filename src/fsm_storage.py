@@ -0,0 +1,275 @@
+"""
+@file: fsm_storage.py
+@description: FSM-хранилище aiogram на локальном SQLite — мелкие ключи inline, большие списки
+              отдельными блобами, ленивая десериализация и запись по ключам
+@dependencies: aiogram, sqlite3, pickle
+@created: 2026-10-19
+
+MemoryStorage терял состояние при рестарте. Простая замена «весь словарь одной
+строкой» тоже плоха: handlers десятки раз за сценарий делают state.get_data(),
+а в данных лежат videos, generated_posts, uniqueness_result, пулы бонусов.
+
+Здесь каждый ключ данных — отдельная строка. Значения больше LARGE_VALUE_BYTES
+пишутся в fsm_blobs и читаются из БД только при первом обращении к ним после
+старта. Десериализованные значения кешируются в процессе, поэтому get_data()
+отдаёт поверхностную копию словаря (как MemoryStorage), не пересобирая списки,
+а update_data() перезаписывает только переданные ключи и возвращает все данные
+ключа, читая ещё не загруженные блобы только при обращении к ним.
+"""
+
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, MutableMapping, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "fsm.db"
+
+# Значения крупнее этого порога (байт после сериализации) хранятся отдельным блобом
+LARGE_VALUE_BYTES = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fsm_state (
+    key    TEXT PRIMARY KEY,
+    state  TEXT
+);
+CREATE TABLE IF NOT EXISTS fsm_data (
+    key    TEXT NOT NULL,
+    name   TEXT NOT NULL,
+    value  BLOB,
+    large  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, name)
+);
+CREATE TABLE IF NOT EXISTS fsm_blobs (
+    key    TEXT NOT NULL,
+    name   TEXT NOT NULL,
+    value  BLOB NOT NULL,
+    PRIMARY KEY (key, name)
+);
+"""
+
+# Маркер значения, которое ещё не прочитано из fsm_blobs
+_NOT_LOADED = object()
+
+# Маркер значения, которое не удалось десериализовать
+_BROKEN = object()
+
+
+def _storage_key(key: StorageKey) -> str:
+    """Строковый ключ записи (бот / чат / пользователь / тред / destiny)."""
+    parts = [
+        key.bot_id,
+        key.chat_id,
+        key.user_id,
+        getattr(key, "thread_id", None) or "",
+        getattr(key, "business_connection_id", None) or "",
+        getattr(key, "destiny", "default"),
+    ]
+    return ":".join(str(p) for p in parts)
+
+
+class _LazyData(MutableMapping):
+    """
+    Полные данные ключа для ответа update_data: уже прочитанные значения сразу,
+    большие — из fsm_blobs при первом обращении (через кеш хранилища).
+    Как и копия словаря из MemoryStorage, изменения не попадают в хранилище.
+    """
+
+    def __init__(self, storage: "SQLiteStorage", skey: str, entries: Dict[str, Any]):
+        self._storage = storage
+        self._skey = skey
+        self._values = dict(entries)
+
+    def __getitem__(self, name: str) -> Any:
+        value = self._values[name]
+        if value is _NOT_LOADED:
+            entries = self._storage._entries(self._skey)
+            value = self._storage._load(self._skey, entries, name) if name in entries else _BROKEN
+            if value is _BROKEN:
+                del self._values[name]
+                raise KeyError(name)
+            self._values[name] = value
+        return value
+
+    def __setitem__(self, name: str, value: Any):
+        self._values[name] = value
+
+    def __delitem__(self, name: str):
+        del self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._values))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM-хранилище aiogram в локальном SQLite (WAL).
+
+    Значения сериализуются pickle (в данных лежат dataclass-объекты постов).
+    Если значение не сериализуется, оно остаётся только в памяти процесса —
+    как было с MemoryStorage — и не переживёт рестарт.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, large_value_bytes: int = LARGE_VALUE_BYTES):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.large_value_bytes = large_value_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # key -> {name: value | _NOT_LOADED}
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._states: Dict[str, Optional[str]] = {}
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    # ─────────────────────────────────────────────────────────────
+    # Состояние
+    # ─────────────────────────────────────────────────────────────
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        skey = _storage_key(key)
+        value = state.state if isinstance(state, State) else state
+        self._states[skey] = value
+        if value is None:
+            self._execute("DELETE FROM fsm_state WHERE key = ?", (skey,))
+        else:
+            self._execute("INSERT OR REPLACE INTO fsm_state (key, state) VALUES (?, ?)", (skey, value))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        skey = _storage_key(key)
+        if skey not in self._states:
+            row = self._execute("SELECT state FROM fsm_state WHERE key = ?", (skey,)).fetchone()
+            self._states[skey] = row[0] if row else None
+        return self._states[skey]
+
+    # ─────────────────────────────────────────────────────────────
+    # Данные
+    # ─────────────────────────────────────────────────────────────
+
+    def _entries(self, skey: str) -> Dict[str, Any]:
+        """Кеш ключа. Мелкие значения читаются сразу, большие помечаются как незагруженные."""
+        entries = self._data.get(skey)
+        if entries is None:
+            entries = {}
+            rows = self._execute("SELECT name, value, large FROM fsm_data WHERE key = ?", (skey,)).fetchall()
+            for name, value, large in rows:
+                value = _NOT_LOADED if large else self._unpickle(skey, name, value)
+                if value is not _BROKEN:
+                    entries[name] = value
+            self._data[skey] = entries
+        return entries
+
+    def _unpickle(self, skey: str, name: str, raw: bytes) -> Any:
+        """
+        Десериализует значение; битое удаляется из БД и возвращается _BROKEN.
+
+        После деплоя класс из данных (GeneratedPostAI, VideoData) может быть
+        переименован или изменён — такой ключ считается отсутствующим, а не
+        ломает get_data/state.clear() пользователя.
+        """
+        try:
+            return pickle.loads(raw)
+        except Exception as e:
+            print(f"⚠️ FSM: ключ '{name}' ({skey}) не десериализуется ({e}) — удалён")
+            self._delete(skey, name)
+            return _BROKEN
+
+    def _load(self, skey: str, entries: Dict[str, Any], name: str) -> Any:
+        """Значение ключа (большое — читается из fsm_blobs); _BROKEN — ключ битый и удалён."""
+        value = entries[name]
+        if value is _NOT_LOADED:
+            row = self._execute("SELECT value FROM fsm_blobs WHERE key = ? AND name = ?", (skey, name)).fetchone()
+            value = self._unpickle(skey, name, row[0]) if row else None
+            if value is _BROKEN:
+                del entries[name]
+                return value
+            entries[name] = value
+        return value
+
+    def _write(self, skey: str, name: str, value: Any):
+        try:
+            raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"⚠️ FSM: ключ '{name}' не сериализуется ({e}) — хранится только в памяти")
+            self._delete(skey, name)
+            return
+        if len(raw) > self.large_value_bytes:
+            self._execute("INSERT OR REPLACE INTO fsm_blobs (key, name, value) VALUES (?, ?, ?)", (skey, name, raw))
+            self._execute("INSERT OR REPLACE INTO fsm_data (key, name, value, large) VALUES (?, ?, NULL, 1)", (skey, name))
+        else:
+            self._execute("DELETE FROM fsm_blobs WHERE key = ? AND name = ?", (skey, name))
+            self._execute("INSERT OR REPLACE INTO fsm_data (key, name, value, large) VALUES (?, ?, ?, 0)", (skey, name, raw))
+
+    def _delete(self, skey: str, name: str):
+        self._execute("DELETE FROM fsm_data WHERE key = ? AND name = ?", (skey, name))
+        self._execute("DELETE FROM fsm_blobs WHERE key = ? AND name = ?", (skey, name))
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        """Полная замена данных (state.set_data / state.clear)."""
+        skey = _storage_key(key)
+        entries = self._entries(skey)
+        if not data:
+            self._execute("DELETE FROM fsm_data WHERE key = ?", (skey,))
+            self._execute("DELETE FROM fsm_blobs WHERE key = ?", (skey,))
+            self._data[skey] = {}
+            return
+        for name in [n for n in entries if n not in data]:
+            self._delete(skey, name)
+            del entries[name]
+        for name, value in data.items():
+            entries[name] = value
+            self._write(skey, name, value)
+
+    async def update_data(self, key: StorageKey, data: Mapping[str, Any]) -> MutableMapping[str, Any]:
+        """
+        Записывает только переданные ключи, остальные не трогает.
+
+        Возвращает все данные ключа, как BaseStorage.update_data. Большие
+        значения, ещё не загруженные из fsm_blobs, читаются только при обращении
+        к ним — иначе каждое обновление читало бы все блобы.
+        """
+        skey = _storage_key(key)
+        entries = self._entries(skey)
+        for name, value in data.items():
+            entries[name] = value
+            self._write(skey, name, value)
+        return _LazyData(self, skey, entries)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        skey = _storage_key(key)
+        entries = self._entries(skey)
+        data = {}
+        for name in list(entries):
+            value = self._load(skey, entries, name)
+            if value is not _BROKEN:
+                data[name] = value
+        return data
+
+    async def get_value(self, storage_key: StorageKey, dict_key: str, default: Optional[Any] = None) -> Optional[Any]:
+        """Одно значение без сборки всего словаря."""
+        skey = _storage_key(storage_key)
+        entries = self._entries(skey)
+        if dict_key not in entries:
+            return default
+        value = self._load(skey, entries, dict_key)
+        return default if value is _BROKEN else value
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
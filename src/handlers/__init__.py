@@ -1,6 +1,16 @@
 """
 Handlers для бота
+
+Модули сценариев не импортируются здесь: они тяжёлые и грузятся лениво
+(см. src.handlers.scenario_loader).
 """
-from src.handlers.italian_posts_handlers import register_italian_handlers
+
+
+def __getattr__(name):
+    if name == 'register_italian_handlers':
+        from src.handlers.italian_posts_handlers import register_italian_handlers
+        return register_italian_handlers
+    raise AttributeError(name)
+
 
 __all__ = ['register_italian_handlers']
@@ -13,7 +13,6 @@ from aiogram import types
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton, MessageEntity
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import StateFilter
-from telethon.errors import FloodWaitError
 
 
 def _utf16_len(text: str) -> int:
@@ -21,6 +20,12 @@ def _utf16_len(text: str) -> int:
     return len(text.encode('utf-16-le')) // 2
 
 from src.states import FrenchPostsStates
+from src.job_manager import get_job_registry, JobCancelled, JOB_FAILED
+from src.handlers.job_handlers import job_control_keyboard, close_job_controls
+from src.publisher import publish_posts, publishing_intro_text
+from src.scheduler import set_work_context, PRIORITY_INTERACTIVE
+from src.circuit_breaker import healthy_candidates, pick_healthy
+from src.model_telemetry import pick_auto_model
 
 
 def register_french_handlers(bot_instance):
@@ -606,9 +611,11 @@ def register_french_handlers(bot_instance):
     
         # Сканируем канал через Telethon
         try:
-            from src.caption_parser import CaptionParser
+            from src.caption_cache import get_caption_cache
             from src.telethon_manager import TelethonClientManager
         
+            caption_cache = get_caption_cache()
+        
             manager = TelethonClientManager.get_instance(config_manager)
             await manager.ensure_initialized()
             client = manager.get_client()
@@ -645,8 +652,8 @@ def register_french_handlers(bot_instance):
                 if msg.video:
                     caption = msg.text or ''
                 
-                    # Пробуем автопарсинг данных из подписи
-                    parsed = CaptionParser.parse(caption)
+                    # Пробуем автопарсинг данных из подписи (кэш + ручные исправления прошлых сканов)
+                    parsed = caption_cache.parse(caption, source_channel_id, msg.id)
                 
                     # Сохраняем source_channel_id и message_id для копирования через Telethon
                     video_info = {
@@ -677,6 +684,9 @@ def register_french_handlers(bot_instance):
                     if len(videos_found) >= video_count:
                         break
         
+            caption_cache.flush()
+            logger.info(caption_cache.stats_line())
+        
             if not videos_found:
                 await status_msg.edit_text(
                     "❌ В канале не найдено видео!\n\n"
@@ -859,6 +869,9 @@ def register_french_handlers(bot_instance):
     
         videos.append(video_data)
         await state.update_data(videos=videos)
+        # Исправление запоминается: при следующем скане это видео распознается сразу
+        from src.caption_cache import get_caption_cache
+        get_caption_cache().save_override(video_data)
         
         # Определяем символ валюты для отображения
         currency_symbol = "$" if currency == "USD" else "€" if currency == "EUR" else currency
@@ -1316,6 +1329,7 @@ def register_french_handlers(bot_instance):
              InlineKeyboardButton(text="⚖️ Средние (~0.3₽)", callback_data="ai_model:rotation:medium")],
             [InlineKeyboardButton(text="💎 Премиум (~1₽)", callback_data="ai_model:rotation:premium"),
              InlineKeyboardButton(text="🔄 Все модели", callback_data="ai_model:rotation:mixed")],
+            [InlineKeyboardButton(text="🤖 Авто (по статистике моделей)", callback_data="ai_model:rotation:auto")],
             # Отдельные модели — дешёвые
             [InlineKeyboardButton(text="🔥 Grok 4.1 Fast — ~0.1₽", callback_data="ai_model:grok-4.1-fast:openrouter"),
              InlineKeyboardButton(text="🎨 Mistral Creative — ~0.05₽", callback_data="ai_model:mistral-small-creative:openrouter")],
@@ -1494,6 +1508,10 @@ def register_french_handlers(bot_instance):
         elif rotation_type == "premium":
             rotation_models = rotation_premium
             rotation_label = "💎 ПРЕМИУМ"
+        elif rotation_type == "auto":
+            # Модель на каждый пост выбирается по телеметрии (src/model_telemetry.py)
+            rotation_models = rotation_mixed
+            rotation_label = "🤖 АВТО"
         else:
             rotation_models = rotation_mixed
             rotation_label = "🔄 ВСЕ"
@@ -1597,6 +1615,23 @@ def register_french_handlers(bot_instance):
             for v in videos
         ]
     
+        # Задача генерации: стоп/пауза и ETA через JobRegistry, в FSM — только job_id
+        # Готовые посты чекпоинтятся — рестарт посреди прогона не выбрасывает оплаченные ответы LLM
+        job = get_job_registry().create(
+            callback.from_user.id, "generation", total=len(video_data_list) + len(images), scenario="fr",
+            chat_id=callback.message.chat.id,
+            context={'videos': videos, 'images': images, 'target_channel_id': data.get('target_channel_id'),
+                     'target_channel_name': data.get('target_channel_name'), 'model': model_display_name,
+                     # Для догенерации после рестарта; в ротации — первая модель набора
+                     'model_key': rotation_models[0][0] if is_rotation else model_key,
+                     'provider': rotation_models[0][1] if is_rotation else provider,
+                     'bonus_data': {k: data.get(k) for k in ('url1', 'bonus1', 'url2', 'bonus2')}}
+        )
+        await state.update_data(job_id=job.job_id)
+        control_msg = await callback.message.answer(
+            "⏯ Управление генерацией", reply_markup=job_control_keyboard(job)
+        )
+
         # Генерируем посты через AI
         ai_posts = []
     
@@ -1623,19 +1658,36 @@ def register_french_handlers(bot_instance):
             except Exception as pool_err:
                 logger.warning(f"⚠️ Ошибка генерации пула бонусов: {pool_err}. Фоллбек на программные вариации.")
                 bonus1_pool = []
+            # Догенерация после рестарта продолжит тот же пул, а не запросит новый
+            job.update_context(bonus_pools=[bonus1_pool])
 
             # КРИТИЧНО: глобальный счетчик для ротации форматов ссылок
             link_format_counter = 0
         
             for i, video in enumerate(video_data_list):
-                # Выбираем модель по индексу (циклически)
-                rot_model_key, rot_provider, rot_name = rotation_models_list[i % len(rotation_models_list)]
+                if not await job.checkpoint():
+                    logger.info(f"Генерация остановлена пользователем на посте #{i}")
+                    break
+                if job.cost.exceeded:
+                    logger.warning(f"Бюджет прогона исчерпан на посте #{i}: ${job.cost.totals.cost_usd:.4f}")
+                    break
+
+                # Модели с открытым circuit breaker'ом пропускаем до пробного запроса
+                if rotation_type == "auto":
+                    # Лучшая модель по принятым постам в секунду в пределах потолка цены
+                    rot_model_key, rot_provider, rot_name = pick_auto_model(
+                        healthy_candidates(rotation_models_list, OPENROUTER_MODELS), OPENROUTER_MODELS
+                    )
+                else:
+                    # Выбираем модель по индексу (циклически), пропуская отключённые
+                    rot_model_key, rot_provider, rot_name = pick_healthy(rotation_models_list, OPENROUTER_MODELS, i)
             
                 pct = i * 100 // total_posts if total_posts else 0
                 bar = '█' * (i * 20 // total_posts) + '░' * (20 - i * 20 // total_posts) if total_posts else ''
                 draft_text = (
                     f"🤖 РОТАЦИЯ — {i}/{total_posts} ({pct}%)\n"
-                    f"{bar}\n\n"
+                    f"{bar}\n"
+                    f"⏱ ETA: {job.format_eta()}\n\n"
                     f"🧠 {rot_name}"
                 )
                 await _draft_progress(callback.message.chat.id, draft_text, status_msg)
@@ -1657,13 +1709,20 @@ def register_french_handlers(bot_instance):
                     post = await rot_generator.generate_video_post(video, i)
                     post.model_used = rot_name  # Сохраняем какая модель использовалась
                     ai_posts.append(post)
+                    job.advance()
+                    job.save_item(post.index, post)
                     # КРИТИЧНО: сохраняем обновленный счетчик для следующего генератора
                     link_format_counter = rot_generator.get_link_format_counter()
                 except Exception as e:
                     logger.error(f"Ошибка ротации пост #{i} ({rot_name}): {e}")
-                    # Пробуем fallback на Gemini Flash (быстрая и дешёвая)
+                    # Пробуем fallback на Gemini Flash (быстрая и дешёвая), если она отключена — на другую здоровую модель
+                    fb_model_key, fb_provider, fb_name = pick_healthy(
+                        [("gemini-3-flash", "openrouter", "Gemini 3 Flash")]
+                        + [m for m in rotation_models_list if m[0] != rot_model_key],
+                        OPENROUTER_MODELS
+                    )
                     try:
-                        fallback_gen = create_generator("gemini-3-flash", "openrouter")
+                        fallback_gen = create_generator(fb_model_key, fb_provider)
                         fallback_gen.set_bonus_data(
                             url1=data['url1'],
                             bonus1=data['bonus1']
@@ -1674,12 +1733,15 @@ def register_french_handlers(bot_instance):
                         # КРИТИЧНО: передаем счетчик форматов в fallback
                         fallback_gen.set_link_format_counter(link_format_counter)
                         post = await fallback_gen.generate_video_post(video, i)
-                        post.model_used = "Gemini 3 Flash (fallback)"
+                        post.model_used = f"{fb_name} (fallback)"
                         ai_posts.append(post)
+                        job.advance()
+                        job.save_item(post.index, post)
                         # КРИТИЧНО: сохраняем обновленный счетчик
                         link_format_counter = fallback_gen.get_link_format_counter()
                     except Exception as fallback_error:
                         logger.error(f"Fallback тоже не сработал для поста #{i}: {fallback_error}")
+                        job.advance(error=True)
                         # КРИТИЧНО: Не прерываем цикл! Пост пропущен, но продолжаем генерацию
         
             # Генерация картинок (используем Gemini 3 Flash - быстрая и дешёвая)
@@ -1695,11 +1757,16 @@ def register_french_handlers(bot_instance):
                 # КРИТИЧНО: продолжаем ротацию форматов для картинок
                 img_generator.set_link_format_counter(link_format_counter)
                 for j in range(len(images)):
+                    if not await job.checkpoint():
+                        break
                     try:
                         post = await img_generator.generate_image_post(len(video_data_list) + j)
                         ai_posts.append(post)
+                        job.advance()
+                        job.save_item(post.index, post)
                     except Exception as img_error:
                         logger.error(f"Ошибка генерации картинки #{j}: {img_error}")
+                        job.advance(error=True)
         else:
             # Обычный режим - одна модель для всех
             generator.set_bonus_data(
@@ -1707,6 +1774,7 @@ def register_french_handlers(bot_instance):
                 bonus1=data['bonus1']
             )
             await generator.generate_bonus_descriptions_pool(80)
+            job.update_context(bonus_pools=list(generator.get_bonus_pool()))
         
             # Callback для обновления прогресса
             _chat_id = callback.message.chat.id
@@ -1716,7 +1784,8 @@ def register_french_handlers(bot_instance):
                 text = (
                     f"🤖 AI генерирует посты...\n\n"
                     f"⏳ {current}/{total} ({pct}%)\n"
-                    f"{bar}\n\n"
+                    f"{bar}\n"
+                    f"⏱ ETA: {job.format_eta()}\n\n"
                     f"🧠 {model_display_name} | {provider.upper()}"
                 )
                 await _draft_progress(_chat_id, text, status_msg)
@@ -1725,9 +1794,11 @@ def register_french_handlers(bot_instance):
                 ai_posts = await generator.generate_all_posts(
                     videos=video_data_list,
                     image_count=len(images),
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    job=job
                 )
             except Exception as e:
+                await close_job_controls(job, control_msg, JOB_FAILED)
                 error_msg = str(e)
                 if provider == "openrouter":
                     error_msg += "\n\n💡 Проверьте:\n• Баланс OpenRouter\n• Правильность API ключа"
@@ -1739,6 +1810,7 @@ def register_french_handlers(bot_instance):
             
             # 🚨 КРИТИЧНО: Проверяем были ли сгенерированы хотя бы некоторые посты
             if not ai_posts or len(ai_posts) == 0:
+                await close_job_controls(job, control_msg, JOB_FAILED)
                 await status_msg.edit_text(
                     "❌ <b>Не удалось сгенерировать ни одного поста</b>\n\n"
                     "💡 Проверьте:\n"
@@ -1761,6 +1833,8 @@ def register_french_handlers(bot_instance):
                 await status_msg.edit_text(warning_msg, parse_mode="HTML")
                 await asyncio.sleep(3)
     
+        await close_job_controls(job, control_msg)
+
         # Сохраняем посты с привязкой к медиа
         # ВАЖНО: Используем ПРЯМОЕ сопоставление по индексу!
         # video_data_list создаётся из videos в том же порядке (строки 1529-1538)
@@ -1827,6 +1901,10 @@ def register_french_handlers(bot_instance):
             models_info = f"🔄 Ротация: {', '.join(models_used)}" if models_used else "🔄 Ротация моделей"
         else:
             models_info = f"🤖 Модель: {model_display_name}\n🔌 Провайдер: {provider.upper()}"
+        # Расход токенов и $ за прогон (src/cost_accounting.py)
+        cost_summary = job.cost.summary()
+        if cost_summary:
+            models_info += "\n" + cost_summary
     
         # Обновляем статус
         try:
@@ -2089,14 +2167,29 @@ def register_french_handlers(bot_instance):
             posts_texts = [p['text'] for p in generated_posts]
             posts_slots = [p.get('slot', 'Неизвестно') for p in generated_posts]
         
-            # Выполняем проверку
-            if is_hybrid:
-                result = await checker.check_posts_uniqueness_hybrid(posts_texts, posts_slots)
-            else:
-                result = await checker.check_posts_uniqueness(posts_texts, posts_slots, model=model_key)
+            # Выполняем проверку как задачу: «Стоп» отменяет запрос к AI
+            job = get_job_registry().create(message.from_user.id, "uniqueness", total=len(posts_texts), scenario="fr")
+            await state.update_data(job_id=job.job_id)
+            try:
+                await status_msg.edit_reply_markup(reply_markup=job_control_keyboard(job, with_pause=False))
+            except Exception:
+                pass
+            try:
+                if is_hybrid:
+                    result = await job.run_cancellable(checker.check_posts_uniqueness_hybrid(posts_texts, posts_slots))
+                else:
+                    result = await job.run_cancellable(checker.check_posts_uniqueness(posts_texts, posts_slots, model=model_key))
+                job.advance(len(posts_texts))
+            except JobCancelled:
+                await status_msg.edit_text("🛑 Проверка уникальности остановлена", parse_mode="HTML")
+                await _show_posts_preview_after_check(message, state, None)
+                return
+            finally:
+                get_job_registry().finish(job)
         
             # Сохраняем результат
             await state.update_data(uniqueness_result=result)
+            cost_info = f"\n\n{job.cost.summary()}" if job.cost.totals.calls else ""
         
             # Показываем результаты
             if result.get("error"):
@@ -2116,7 +2209,8 @@ def register_french_handlers(bot_instance):
                 await status_msg.edit_text(
                     f"✅ <b>Все {len(generated_posts)} постов уникальны!</b>\n\n"
                     f"🤖 Модель: {result.get('model_used', model_name)}\n"
-                    f"📊 {result.get('summary', 'Проверка завершена')}",
+                    f"📊 {result.get('summary', 'Проверка завершена')}"
+                    f"{cost_info}",
                     parse_mode="HTML"
                 )
                 await _show_posts_preview_after_check(message, state, result)
@@ -2135,7 +2229,8 @@ def register_french_handlers(bot_instance):
                     f"⚠️ <b>Найдено {len(duplicates)} похожих пар!</b>\n\n"
                     f"🤖 Модель: {result.get('model_used', model_name)}\n"
                     f"📊 Уникальных: {result.get('total_unique', '?')}/{len(generated_posts)}"
-                    f"{dup_text}",
+                    f"{dup_text}"
+                    f"{cost_info}",
                     parse_mode="HTML"
                 )
             
@@ -2214,6 +2309,8 @@ def register_french_handlers(bot_instance):
             return
     
         if "перегенерировать дубли" in text:
+            # Пара дублей — единичное действие оператора, идёт раньше чужих пакетных прогонов
+            set_work_context(message.from_user.id, PRIORITY_INTERACTIVE)
             duplicates = result.get("duplicates", [])
             if not duplicates:
                 await message.answer("✅ Нет дублей для перегенерации!")
@@ -2603,22 +2700,36 @@ def register_french_handlers(bot_instance):
             for v in videos
         ]
     
+        job = get_job_registry().create(
+            message.from_user.id, "generation", total=total_posts, scenario="fr",
+            chat_id=message.chat.id,
+            context={'videos': videos, 'images': images, 'target_channel_id': data.get('target_channel_id'),
+                     'target_channel_name': data.get('target_channel_name'), 'model': model,
+                     'model_key': model, 'provider': 'openai',
+                     'bonus_data': {k: data.get(k) for k in ('url1', 'bonus1', 'url2', 'bonus2')}}
+        )
+        await state.update_data(job_id=job.job_id)
+        control_msg = await message.answer("⏯ Управление перегенерацией", reply_markup=job_control_keyboard(job))
+
         _regen_chat_id = message.chat.id
         async def progress_callback(current, total):
             pct = current * 100 // total if total else 0
             bar = '█' * (current * 20 // total) + '░' * (20 - current * 20 // total) if total else ''
-            text = f"🔄 Перегенерация {current}/{total} ({pct}%)\n{bar}"
+            text = f"🔄 Перегенерация {current}/{total} ({pct}%)\n{bar}\n⏱ ETA: {job.format_eta()}"
             await _draft_progress(_regen_chat_id, text, status_msg)
     
         try:
             ai_posts = await generator.generate_all_posts(
                 videos=video_data_list,
                 image_count=len(images),
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                job=job
             )
         except Exception as e:
+            await close_job_controls(job, control_msg, JOB_FAILED)
             await status_msg.edit_text(f"❌ Ошибка: {e}", parse_mode="HTML")
             return
+        await close_job_controls(job, control_msg)
     
         # Сохраняем с привязкой к медиа
         generated_posts = []
@@ -2707,203 +2818,26 @@ def register_french_handlers(bot_instance):
             await message.answer("❌ Telethon клиент не инициализирован")
             return
     
-        # Лимиты Telegram для безопасной публикации
-        DELAY_MIN = 3  # Минимальная пауза между постами (сек)
-        DELAY_MAX = 5  # Максимальная пауза между постами (сек)
-        POSTS_BEFORE_LONG_PAUSE = 20  # После скольких постов делать длинную паузу
-        LONG_PAUSE_SECONDS = 60  # Длинная пауза (сек)
-        POSTS_BEFORE_VERY_LONG_PAUSE = 100  # После скольких постов - очень длинная пауза
-        VERY_LONG_PAUSE_SECONDS = 300  # 5 минут
-    
-        import random as rnd
-    
-        # Флаг остановки публикации
-        await state.update_data(stop_publishing=False)
-    
-        # Inline кнопка "Стоп"
-        stop_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🛑 Остановить публикацию", callback_data="stop_streamer_publishing", style="danger")]
-        ])
-    
+        # Задача публикации: стоп/пауза и прогресс в JobRegistry, в FSM — только job_id.
+        # Посты и канал уходят в чекпоинт — после рестарта публикацию можно продолжить
+        job = get_job_registry().create(
+            message.from_user.id, "publishing", total=len(posts), scenario="fr",
+            chat_id=message.chat.id,
+            context={'posts': posts, 'target_channel_id': target_channel_id, 'trim_captions': True}
+        )
+        await state.update_data(job_id=job.job_id)
+
         status_msg = await message.answer(
-            f"🚀 <b>Публикация началась!</b>\n\n"
-            f"📝 Постов: {len(posts)}\n"
-            f"⏱ Интервал: {DELAY_MIN}-{DELAY_MAX} сек\n"
-            f"⏸ Пауза каждые {POSTS_BEFORE_LONG_PAUSE} постов: {LONG_PAUSE_SECONDS} сек\n\n"
-            f"Прогресс: 0/{len(posts)}\n\n"
-            f"<i>Нажмите кнопку ниже чтобы остановить</i>",
+            publishing_intro_text(len(posts)),
             parse_mode="HTML",
-            reply_markup=stop_keyboard
+            reply_markup=job_control_keyboard(job, stop_text="🛑 Остановить публикацию")
         )
-    
-        published = 0
-        errors = 0
-        stopped = False
 
-        for i, post in enumerate(posts):
-            # Проверяем флаг остановки
-            current_data = await state.get_data()
-            if current_data.get('stop_publishing', False):
-                stopped = True
-                break
-            try:
-                # Текст поста (уже должен быть в пределах лимита после генерации)
-                post_text = post['text']
-                
-                # Если всё же длинный - обрезаем умно
-                if len(post_text) > 1024:
-                    import re
-                    # Ищем последнюю ссылку
-                    link_match = re.search(r'(https?://[^\s<>"]+)', post_text)
-                    if link_match:
-                        link_pos = post_text.find(link_match.group(1))
-                        # Обрезаем текст ДО ссылки, сохраняя ссылку и после неё
-                        if link_pos > 500:
-                            # Ищем последнее предложение перед ссылкой
-                            cut_pos = max(
-                                post_text.rfind('. ', 0, link_pos - 200),
-                                post_text.rfind('! ', 0, link_pos - 200),
-                                post_text.rfind('? ', 0, link_pos - 200),
-                                post_text.rfind('\n\n', 0, link_pos - 200)
-                            )
-                            if cut_pos > 200:
-                                post_text = post_text[:cut_pos + 2] + post_text[link_pos:]
-                            else:
-                                # Просто обрезаем оставляя ссылку
-                                post_text = post_text[:700] + post_text[link_pos:]
-                    else:
-                        # Нет ссылки - обрезаем на предложении
-                        cut_pos = max(
-                            post_text.rfind('. ', 0, 1020),
-                            post_text.rfind('! ', 0, 1020),
-                            post_text.rfind('? ', 0, 1020)
-                        )
-                        post_text = post_text[:cut_pos + 1] if cut_pos > 500 else post_text[:1021]
-                
-                # Если есть source_channel_id и message_id - копируем через Telethon
-                if post.get('source_channel_id') and post.get('message_id'):
-                    # Получаем оригинальное сообщение
-                    original_msg = await client.get_messages(
-                        post['source_channel_id'], 
-                        ids=post['message_id']
-                    )
-                
-                    if original_msg:
-                        # Копируем с новым текстом (HTML форматирование)
-                        await client.send_message(
-                            target_channel_id,
-                            post_text,  # Используем обрезанный текст
-                            file=original_msg.media,
-                            parse_mode='html'  # HTML форматирование для Telethon
-                        )
-                        published += 1
-                    else:
-                        raise Exception("Сообщение не найдено в источнике")
-            
-                # Если есть file_id (загружено вручную) - отправляем через aiogram
-                elif post.get('media_path'):
-                    if post['media_type'] == 'video':
-                        await bot.send_video(
-                            chat_id=target_channel_id,
-                            video=post['media_path'],  # file_id
-                            caption=post_text,  # Используем обрезанный текст
-                            parse_mode="HTML"  # HTML форматирование
-                        )
-                    else:
-                        await bot.send_photo(
-                            chat_id=target_channel_id,
-                            photo=post['media_path'],  # file_id
-                            caption=post_text,  # Используем обрезанный текст
-                            parse_mode="HTML"  # HTML форматирование
-                        )
-                    published += 1
-                else:
-                    raise Exception("Нет источника медиа")
-            
-                # Обновляем статус каждые 10 постов
-                if (i + 1) % 10 == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"🚀 <b>Публикация...</b>\n\n"
-                            f"✅ Опубликовано: {published}\n"
-                            f"❌ Ошибок: {errors}\n\n"
-                            f"Прогресс: {i+1}/{len(posts)}",
-                            parse_mode="HTML"
-                        )
-                    except Exception:
-                        pass
-            
-                # Динамическая задержка с учётом лимитов Telegram
-                post_num = i + 1
-            
-                # Очень длинная пауза каждые 100 постов (5 мин)
-                if post_num > 0 and post_num % POSTS_BEFORE_VERY_LONG_PAUSE == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"⏸ <b>Пауза {VERY_LONG_PAUSE_SECONDS // 60} мин...</b>\n\n"
-                            f"Защита от лимитов Telegram\n"
-                            f"✅ Опубликовано: {published}/{len(posts)}",
-                            parse_mode="HTML"
-                        )
-                    except Exception:
-                        pass
-                    await asyncio.sleep(VERY_LONG_PAUSE_SECONDS)
-            
-                # Длинная пауза каждые 20 постов (1 мин)
-                elif post_num > 0 and post_num % POSTS_BEFORE_LONG_PAUSE == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"⏸ <b>Пауза {LONG_PAUSE_SECONDS} сек...</b>\n\n"
-                            f"Защита от лимитов Telegram\n"
-                            f"✅ Опубликовано: {published}/{len(posts)}",
-                            parse_mode="HTML"
-                        )
-                    except Exception:
-                        pass
-                    await asyncio.sleep(LONG_PAUSE_SECONDS)
-            
-                else:
-                    # Обычная рандомная задержка между постами
-                    delay = rnd.uniform(DELAY_MIN, DELAY_MAX)
-                    await asyncio.sleep(delay)
-            
-            except FloodWaitError as e:
-                logger.warning(f"FloodWait: ждём {e.seconds} сек (пост {i})")
-                try:
-                    await status_msg.edit_text(
-                        f"⏸ <b>FloodWait: ждём {e.seconds} сек...</b>\n\n"
-                        f"Telegram ограничил скорость\n"
-                        f"✅ Опубликовано: {published}/{len(posts)}",
-                        parse_mode="HTML"
-                    )
-                except Exception:
-                    pass
-                await asyncio.sleep(e.seconds + 1)
-                # Повторяем публикацию этого поста
-                try:
-                    post = posts[i]
-                    if post.video_path and os.path.exists(post.video_path):
-                        await client.send_file(
-                            target_channel,
-                            post.video_path,
-                            caption=post.text,
-                            parse_mode='html'
-                        )
-                    elif post.image_path and os.path.exists(post.image_path):
-                        await client.send_file(
-                            target_channel,
-                            post.image_path,
-                            caption=post.text,
-                            parse_mode='html'
-                        )
-                    published += 1
-                except Exception as retry_err:
-                    errors += 1
-                    logger.error(f"Ошибка повтора поста {i} после FloodWait: {retry_err}")
-            except Exception as e:
-                errors += 1
-                logger.error(f"Ошибка публикации поста {i}: {e}")
+        published, errors, stopped = await publish_posts(
+            bot, client, job, posts, target_channel_id, status_msg, logger, trim_captions=True
+        )
 
+        get_job_registry().finish(job)
         await state.clear()
         kb = get_scenarios_kb(message.from_user.id)
     
@@ -2936,18 +2870,6 @@ def register_french_handlers(bot_instance):
                 reply_markup=kb
             )
 
-    @dp.callback_query(lambda c: c.data == "stop_streamer_publishing")
-    async def streamer_posts_stop_publishing(callback: types.CallbackQuery, state: FSMContext):
-        """Остановка публикации"""
-        await state.update_data(stop_publishing=True)
-        await callback.answer("🛑 Останавливаю публикацию...", show_alert=True)
-    
-        # Убираем кнопку
-        try:
-            await callback.message.edit_reply_markup(reply_markup=None)
-        except Exception:
-            pass
-
     @dp.message(FrenchPostsStates.confirming, lambda m: m.text == "❌ Отмена")
     @dp.message(FrenchPostsStates.waiting_for_videos, lambda m: m.text == "❌ Отмена")
     @dp.message(FrenchPostsStates.waiting_for_images, lambda m: m.text == "❌ Отмена")
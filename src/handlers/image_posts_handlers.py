@@ -26,6 +26,8 @@ from aiogram.fsm.context import FSMContext
 from aiogram.filters import StateFilter
 
 from src.states import ImagePostsStates
+from src.job_manager import get_job_registry
+from src.handlers.job_handlers import job_control_keyboard
 
 
 def register_image_posts_handlers(bot_instance):
@@ -1117,7 +1119,12 @@ def register_image_posts_handlers(bot_instance):
         
         await state.set_state(ImagePostsStates.publishing)
         
-        status_msg = await message.answer("📤 Публикация постов...")
+        job = get_job_registry().create(message.from_user.id, "publishing", total=len(posts), scenario="image")
+        await state.update_data(job_id=job.job_id)
+        status_msg = await message.answer(
+            "📤 Публикация постов...",
+            reply_markup=job_control_keyboard(job, stop_text="🛑 Остановить публикацию")
+        )
         
         published = 0
         errors = 0
@@ -1129,6 +1136,7 @@ def register_image_posts_handlers(bot_instance):
             client = manager.get_client()
             
             if not client:
+                get_job_registry().finish(job)
                 await status_msg.edit_text("❌ Telethon клиент не инициализирован")
                 return
             
@@ -1136,6 +1144,8 @@ def register_image_posts_handlers(bot_instance):
             entity = await client.get_entity(channel_id)
             
             for i, post in enumerate(posts):
+                if not await job.checkpoint():
+                    break
                 try:
                     text = post.get('text', '')
                     
@@ -1159,32 +1169,38 @@ def register_image_posts_handlers(bot_instance):
                         )
                     
                     published += 1
+                    job.advance()
                     
                     # Обновляем статус каждые 5 постов
                     if (i + 1) % 5 == 0:
                         try:
                             await status_msg.edit_text(
-                                f"📤 Публикация: {i+1}/{len(posts)}\n"
-                                f"{'█' * ((i+1) * 20 // len(posts))}{'░' * (20 - (i+1) * 20 // len(posts))}"
+                                f"📤 Публикация: {job.progress_line()}\n"
+                                f"{job.progress_bar()}",
+                                reply_markup=job_control_keyboard(job, stop_text="🛑 Остановить публикацию")
                             )
                         except Exception:
                             pass
                     
-                    await asyncio.sleep(1)  # Задержка между постами
+                    await job.sleep(1)  # Задержка между постами (прерывается кнопкой «Стоп»)
                     
                 except Exception as e:
                     errors += 1
+                    job.advance(error=True)
                     logger.error(f"Error publishing post {i}: {e}")
             
         except Exception as e:
+            get_job_registry().finish(job)
             await status_msg.edit_text(f"❌ Ошибка публикации: {e}")
             logger.error(f"Publishing error: {e}")
             return
         
+        stopped = job.cancelled
+        get_job_registry().finish(job)
         await state.clear()
         
         await status_msg.edit_text(
-            f"✅ <b>Публикация завершена!</b>\n\n"
+            f"{'🛑 <b>Публикация остановлена!</b>' if stopped else '✅ <b>Публикация завершена!</b>'}\n\n"
             f"📝 Опубликовано: {published}\n"
             f"❌ Ошибок: {errors}\n"
             f"📢 Канал: {channel_name}",
@@ -0,0 +1,478 @@
+"""
+@file: job_handlers.py
+@description: Общие кнопки управления задачами (стоп / пауза / продолжить) для всех сценариев
+@dependencies: aiogram, src.job_manager
+@created: 2026-10-18
+
+Кнопки несут job_id в callback_data, поэтому один обработчик обслуживает
+генерацию, проверку уникальности и публикацию на всех языках.
+
+Здесь же — предложение продолжить задачи, прерванные рестартом (ckpt:*):
+публикация продолжается с первого неопубликованного поста, а прерванная
+генерация догенерирует только недостающие посты (модель, бонусы и пулы
+описаний берутся из context задачи) и возвращает весь прогон в превью —
+уже готовые посты повторно не оплачиваются.
+"""
+
+import importlib
+
+from aiogram import types
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
+from aiogram.fsm.context import FSMContext
+
+from src.job_manager import get_job_registry, Job, JOB_FINISHED, JOB_CANCELLED, JOB_PAUSED
+from src.checkpoint_store import get_checkpoint_store
+from src.states import StreamerPostsStates, SpanishPostsStates, ItalianPostsStates, FrenchPostsStates
+
+# Сценарий задачи → группа состояний языкового сценария
+SCENARIO_STATES = {
+    "ru": StreamerPostsStates,
+    "es": SpanishPostsStates,
+    "it": ItalianPostsStates,
+    "fr": FrenchPostsStates,
+}
+
+# Сценарий задачи → модуль генератора постов
+GENERATOR_MODULES = {
+    "ru": "src.ai_post_generator",
+    "es": "src.ai_post_generator_es",
+    "it": "src.ai_post_generator_it",
+    "fr": "src.ai_post_generator_fr",
+}
+
+JOB_KIND_NAMES = {
+    "generation": "Генерация постов",
+    "publishing": "Публикация постов",
+}
+
+
+def job_control_keyboard(job: Job, stop_text: str = "🛑 Остановить", with_pause: bool = True) -> InlineKeyboardMarkup:
+    """Inline-клавиатура управления задачей (пауза/продолжить + стоп)."""
+    rows = []
+    if with_pause:
+        if job.paused:
+            rows.append([InlineKeyboardButton(text="▶️ Продолжить", callback_data=f"job:resume:{job.job_id}")])
+        else:
+            rows.append([InlineKeyboardButton(text="⏸ Пауза", callback_data=f"job:pause:{job.job_id}")])
+    rows.append([InlineKeyboardButton(text=stop_text, callback_data=f"job:stop:{job.job_id}", style="danger")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+async def close_job_controls(job: Job, control_msg=None, status: str = JOB_FINISHED):
+    """Завершает задачу и убирает сообщение с кнопками управления."""
+    get_job_registry().finish(job, status)
+    if control_msg:
+        try:
+            await control_msg.delete()
+        except Exception:
+            pass
+
+
+def restore_generated_posts(context: dict, items: dict) -> list:
+    """
+    Собирает generated_posts из чекпоинта генерации.
+
+    Индекс поста однозначно указывает на медиа: видео идут первыми (0..N-1),
+    затем картинки (N..N+M-1).
+    """
+    videos = context.get('videos') or []
+    images = context.get('images') or []
+    generated_posts = []
+    for idx in sorted(items):
+        post = items[idx]
+        if idx < len(videos):
+            media = videos[idx]
+        elif idx - len(videos) < len(images):
+            media = images[idx - len(videos)]
+        else:
+            continue
+        generated_posts.append({
+            'index': len(generated_posts),
+            'media_path': media.get('file_id'),
+            'source_channel_id': media.get('source_channel_id'),
+            'message_id': media.get('message_id'),
+            'media_type': post.get('media_type'),
+            'text': post.get('text', ''),
+            'streamer': post.get('streamer', ''),
+            'slot': post.get('slot', '')
+        })
+    return generated_posts
+
+
+def build_resume_generator(scenario: str, context: dict, config_manager, missing: list):
+    """
+    Генератор для догенерации прерванной задачи по её context.
+
+    Пулы описаний бонусов переставляются под недостающие посты: пост i
+    получает то же описание pool[i], что и в исходном прогоне.
+
+    Returns:
+        (генератор, класс VideoData модуля сценария)
+    """
+    module = importlib.import_module(GENERATOR_MODULES[scenario])
+    # Задачи, сохранённые до появления model_key, — модель по умолчанию, как в перегенерации
+    model_key = context.get('model_key') or config_manager.default_model or "gpt-4o-mini"
+    options = {'uncensored': bool(context.get('uncensored'))} if scenario == "ru" else {}
+
+    if context.get('provider') == "openrouter":
+        model_info = module.OPENROUTER_MODELS.get(model_key)
+        if not model_info:
+            raise ValueError(f"Модель {model_key} не найдена в OPENROUTER_MODELS")
+        generator = module.AIPostGenerator(
+            openrouter_api_key=config_manager.openrouter_api_key,
+            model=model_info['id'],
+            use_openrouter=True,
+            **options
+        )
+    else:
+        generator = module.AIPostGenerator(api_key=config_manager.openai_api_key, model=model_key, **options)
+
+    if scenario == "ru":
+        try:
+            generator.load_existing_posts_from_file("data/my_posts.json")
+        except Exception:
+            pass
+
+    bonus_data = context.get('bonus_data') or {}
+    generator.set_bonus_data(
+        url1=bonus_data.get('url1') or '', bonus1=bonus_data.get('bonus1') or '',
+        url2=bonus_data.get('url2') or '', bonus2=bonus_data.get('bonus2') or ''
+    )
+    pools = context.get('bonus_pools') or []
+    if any(pools) and hasattr(generator, 'set_bonus_pool'):
+        generator.set_bonus_pool(*[[pool[idx] for idx in missing if idx < len(pool)] for pool in pools])
+    return generator, module.VideoData
+
+
+async def offer_unfinished_jobs(bot_instance):
+    """При старте бота предлагает продолжить задачи, прерванные рестартом."""
+    logger = bot_instance.logger
+    try:
+        store = get_checkpoint_store()
+        jobs = store.unfinished_jobs()
+    except Exception as e:
+        logger.warning(f"Чекпоинты недоступны: {e}")
+        return
+
+    for saved in jobs:
+        if saved['kind'] not in JOB_KIND_NAMES or saved['scenario'] not in SCENARIO_STATES:
+            continue
+        done = store.count_done(saved['job_id'], saved['kind'])
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="▶️ Продолжить", callback_data=f"ckpt:resume:{saved['job_id']}", style="success")],
+            [InlineKeyboardButton(text="🗑 Забыть", callback_data=f"ckpt:drop:{saved['job_id']}")]
+        ])
+        try:
+            await bot_instance.bot.send_message(
+                saved['chat_id'],
+                f"♻️ <b>Бот был перезапущен</b>\n\n"
+                f"{JOB_KIND_NAMES[saved['kind']]} ({saved['scenario'].upper()}) прервалась на "
+                f"{done}/{saved['total']}.\n\n"
+                f"Продолжить с места остановки?",
+                parse_mode="HTML",
+                reply_markup=keyboard
+            )
+            logger.info("Предложено продолжить задачу", job_id=saved['job_id'], kind=saved['kind'])
+        except Exception as e:
+            logger.warning(f"Не удалось предложить продолжение задачи {saved['job_id']}: {e}")
+
+
+def register_job_handlers(bot_instance):
+    """
+    Регистрирует обработчики кнопок управления задачами.
+
+    Args:
+        bot_instance: Экземпляр бота с доступом к dp и logger
+    """
+    dp = bot_instance.dp
+    logger = bot_instance.logger
+    registry = get_job_registry()
+
+    @dp.callback_query(lambda c: c.data and c.data.startswith("job:"))
+    async def job_control_handler(callback: types.CallbackQuery, state: FSMContext):
+        """Стоп / пауза / продолжить для задачи по job_id"""
+        parts = callback.data.split(":")
+        if len(parts) != 3:
+            await callback.answer()
+            return
+        action, job_id = parts[1], parts[2]
+        job = registry.get(job_id)
+
+        if not job or not job.is_active:
+            await callback.answer("Задача уже завершена", show_alert=False)
+            try:
+                await callback.message.edit_reply_markup(reply_markup=None)
+            except Exception:
+                pass
+            return
+
+        if job.user_id != callback.from_user.id:
+            await callback.answer("❌ Это не ваша задача", show_alert=True)
+            return
+
+        if action == "stop":
+            job.cancel()
+            logger.info("Задача остановлена пользователем", job_id=job.job_id, kind=job.kind)
+            await callback.answer("🛑 Останавливаю...", show_alert=True)
+            try:
+                await callback.message.edit_reply_markup(reply_markup=None)
+            except Exception:
+                pass
+            return
+
+        if action == "pause":
+            job.pause()
+            await callback.answer("⏸ Пауза")
+        elif action == "resume":
+            job.resume()
+            await callback.answer("▶️ Продолжаем")
+        else:
+            await callback.answer()
+            return
+
+        try:
+            await callback.message.edit_reply_markup(reply_markup=job_control_keyboard(job))
+        except Exception:
+            pass
+
+    @dp.callback_query(lambda c: c.data == "stop_streamer_publishing")
+    async def legacy_stop_publishing(callback: types.CallbackQuery, state: FSMContext):
+        """Кнопка «Стоп» из сообщений, отправленных до появления job_id"""
+        data = await state.get_data()
+        job = registry.get(data.get('job_id'))
+        if job:
+            job.cancel()
+        for active in registry.active_for_user(callback.from_user.id, "publishing"):
+            active.cancel()
+        await callback.answer("🛑 Останавливаю публикацию...", show_alert=True)
+        try:
+            await callback.message.edit_reply_markup(reply_markup=None)
+        except Exception:
+            pass
+
+    @dp.callback_query(lambda c: c.data and c.data.startswith("ckpt:"))
+    async def checkpoint_resume_handler(callback: types.CallbackQuery, state: FSMContext):
+        """Продолжить / забыть задачу, прерванную рестартом"""
+        parts = callback.data.split(":")
+        if len(parts) != 3:
+            await callback.answer()
+            return
+        action, job_id = parts[1], parts[2]
+        store = get_checkpoint_store()
+        saved = store.get_job(job_id)
+
+        active = registry.get(job_id)
+        if not saved or saved['status'] not in ("running", "paused") or (active and active.is_active):
+            await callback.answer("Задача уже завершена", show_alert=False)
+            try:
+                await callback.message.edit_reply_markup(reply_markup=None)
+            except Exception:
+                pass
+            return
+
+        if saved['user_id'] != callback.from_user.id:
+            await callback.answer("❌ Это не ваша задача", show_alert=True)
+            return
+
+        try:
+            await callback.message.edit_reply_markup(reply_markup=None)
+        except Exception:
+            pass
+
+        if action == "drop":
+            store.set_status(job_id, JOB_CANCELLED)
+            await callback.answer("🗑 Задача забыта")
+            return
+
+        if action != "resume":
+            await callback.answer()
+            return
+
+        await callback.answer("▶️ Продолжаем")
+        if saved['kind'] == "publishing":
+            await _resume_publishing(callback.message, state, saved)
+        elif saved['kind'] == "generation":
+            await _resume_generation(callback.message, state, saved)
+
+    async def _generate_missing(message: types.Message, saved: dict, items: dict, missing: list):
+        """
+        Генерирует посты с индексами missing под той же задачей; готовые сохраняются в её чекпоинт.
+
+        Returns:
+            (job, сообщение с кнопками управления) — задачу закрывает вызывающий
+        """
+        context = saved['context']
+        videos = context.get('videos') or []
+        total = len(videos) + len(context.get('images') or [])
+
+        generator, VideoData = build_resume_generator(
+            saved['scenario'], context, bot_instance.config_manager, missing
+        )
+        job = registry.create(
+            saved['user_id'], "generation", total=total, scenario=saved['scenario'],
+            chat_id=saved['chat_id'], context=context, job_id=saved['job_id']
+        )
+        job.done = len(items)
+        # generate_all_posts нумерует посты с нуля — чекпоинт кладёт их под исходные индексы
+        job.item_indices = missing
+
+        video_data_list = [
+            VideoData(
+                streamer=videos[idx].get('streamer', ''),
+                slot=videos[idx].get('slot', 'Слот'),
+                bet=videos[idx].get('bet', 100),
+                win=videos[idx].get('win', 10000),
+                currency=videos[idx].get('currency', 'RUB')
+            )
+            for idx in missing if idx < len(videos)
+        ]
+        status_msg = await message.answer(
+            f"♻️ <b>Восстановлено {len(items)}/{total} постов</b>\n\n"
+            f"🤖 Догенерирую недостающие: {len(missing)}...",
+            parse_mode="HTML"
+        )
+        control_msg = await message.answer("⏯ Управление генерацией", reply_markup=job_control_keyboard(job))
+
+        async def progress_callback(current, batch_total):
+            if current % 5 and current != batch_total:
+                return
+            try:
+                await status_msg.edit_text(
+                    f"♻️ <b>Догенерация {current}/{batch_total}</b>\n"
+                    f"{job.progress_bar()}\n⏱ ETA: {job.format_eta()}",
+                    parse_mode="HTML"
+                )
+            except Exception:
+                pass
+
+        try:
+            await generator.generate_all_posts(
+                videos=video_data_list,
+                image_count=len(missing) - len(video_data_list),
+                progress_callback=progress_callback,
+                job=job
+            )
+        except Exception as e:
+            logger.error(f"Догенерация задачи {saved['job_id']} не удалась: {e}")
+        return job, control_msg
+
+    async def _resume_generation(message: types.Message, state: FSMContext, saved: dict):
+        """Догенерирует посты, не готовые к рестарту, и возвращает весь прогон в превью."""
+        store = get_checkpoint_store()
+        context = saved['context']
+        total = len(context.get('videos') or []) + len(context.get('images') or [])
+        items = store.load_items(saved['job_id'])
+        missing = [idx for idx in range(total) if idx not in items]
+
+        job = control_msg = None
+        if missing:
+            try:
+                job, control_msg = await _generate_missing(message, saved, items, missing)
+            except Exception as e:
+                logger.error(f"Не удалось продолжить генерацию {saved['job_id']}: {e}")
+                await message.answer(f"❌ Не удалось продолжить генерацию: {e}")
+                return
+            items = store.load_items(saved['job_id'])
+            missing = [idx for idx in range(total) if idx not in items]
+
+        # Задача завершена, только когда готовы все посты; иначе её можно продолжить ещё раз
+        if job is None:
+            store.set_status(saved['job_id'], JOB_FINISHED if not missing else JOB_PAUSED)
+        else:
+            await close_job_controls(job, control_msg, JOB_FINISHED if not missing else JOB_PAUSED)
+        stopped = job is not None and job.cancelled
+
+        generated_posts = restore_generated_posts(context, items)
+        if not generated_posts:
+            await message.answer("❌ Не удалось сгенерировать ни одного поста")
+            return
+
+        await state.clear()
+        await state.update_data(
+            videos=context.get('videos') or [],
+            images=context.get('images') or [],
+            target_channel_id=context.get('target_channel_id'),
+            target_channel_name=context.get('target_channel_name'),
+            ai_model_used=context.get('model'),
+            generated_posts=generated_posts,
+            job_id=saved['job_id'],
+            **(context.get('bonus_data') or {})
+        )
+        await state.set_state(SCENARIO_STATES[saved['scenario']].preview_and_publish)
+
+        keyboard = ReplyKeyboardMarkup(
+            keyboard=[
+                [KeyboardButton(text="✅ Начать публикацию", style="success")],
+                [KeyboardButton(text="👁 Ещё превью")],
+                [KeyboardButton(text="🔄 Перегенерировать все", style="primary")],
+                [KeyboardButton(text="❌ Отмена", style="danger")]
+            ],
+            resize_keyboard=True
+        )
+        await message.answer(
+            f"♻️ <b>Готово {len(generated_posts)}/{total} постов</b>\n\n"
+            + (f"⚠️ Не сгенерировано: {len(missing)}\n\n" if missing else "")
+            + f"📺 Канал: <b>{context.get('target_channel_name') or 'не выбран'}</b>",
+            parse_mode="HTML",
+            reply_markup=keyboard
+        )
+        if missing and not stopped:
+            await message.answer(
+                "Догенерировать оставшиеся посты?",
+                reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+                    [InlineKeyboardButton(text="▶️ Продолжить", callback_data=f"ckpt:resume:{saved['job_id']}", style="success")]
+                ])
+            )
+        logger.info("Генерация восстановлена из чекпоинта", job_id=saved['job_id'], posts=len(generated_posts))
+
+    async def _resume_publishing(message: types.Message, state: FSMContext, saved: dict):
+        """Продолжает публикацию с первого неопубликованного поста."""
+        from src.publisher import publish_posts, publishing_intro_text
+        from src.telethon_manager import TelethonClientManager
+
+        store = get_checkpoint_store()
+        context = saved['context']
+        posts = context.get('posts') or []
+        target_channel_id = context.get('target_channel_id')
+        already = store.published_indices(saved['job_id'])
+
+        manager = TelethonClientManager.get_instance(bot_instance.config_manager)
+        await manager.ensure_initialized()
+        client = manager.get_client()
+        if not client:
+            await message.answer("❌ Telethon клиент не инициализирован")
+            return
+
+        job = registry.create(
+            saved['user_id'], "publishing", total=len(posts), scenario=saved['scenario'],
+            chat_id=saved['chat_id'], context=context, job_id=saved['job_id']
+        )
+        job.done = len(already)
+        await state.update_data(job_id=job.job_id)
+
+        status_msg = await message.answer(
+            f"♻️ Продолжаем с {len(already) + 1}-го поста\n\n" + publishing_intro_text(len(posts) - len(already)),
+            parse_mode="HTML",
+            reply_markup=job_control_keyboard(job, stop_text="🛑 Остановить публикацию")
+        )
+        published, errors, stopped = await publish_posts(
+            bot_instance.bot, client, job, posts, target_channel_id, status_msg, logger,
+            trim_captions=context.get('trim_captions', False), skip_indices=already
+        )
+        registry.finish(job)
+        await state.clear()
+
+        total_published = len(already) + published
+        title = "🛑 <b>Публикация остановлена!</b>" if stopped else "✅ <b>Публикация завершена!</b>"
+        await status_msg.edit_text(
+            f"{title}\n\n"
+            f"📝 Всего постов: {len(posts)}\n"
+            f"✅ Опубликовано: {total_published} (до рестарта: {len(already)})\n"
+            f"❌ Ошибок: {errors}",
+            parse_mode="HTML"
+        )
+        await message.answer(
+            "🎉 Готово! Все посты опубликованы." if not stopped else
+            f"🛑 Публикация остановлена.\nОпубликовано {total_published} из {len(posts)} постов.",
+            reply_markup=bot_instance.get_allowed_scenarios_keyboard(saved['user_id'])
+        )
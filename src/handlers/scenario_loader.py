@@ -0,0 +1,260 @@
+"""
+@file: scenario_loader.py
+@description: Ленивая регистрация сценариев (RU/ES/IT/FR/картинки) — тяжёлые модули handlers
+              и генераторов импортируются при первом обращении или фоном после старта
+@dependencies: aiogram, importlib, src.states
+@created: 2026-10-19
+
+Раньше bot.py сразу импортировал все пять модулей handlers (~12 тыс. строк),
+а первый запуск генерации — ещё и генератор языка (~4-6 тыс. строк промптов).
+Теперь при старте регистрируется только лёгкий вход: кнопка сценария, состояние
+FSM из группы сценария или его inline-кнопка. Первое такое событие импортирует
+модуль (в потоке, чтобы не держать event loop), регистрирует его обработчики и
+заново прогоняет то же событие через диспетчер.
+
+SCENARIOS_PRELOAD: «all» или список ключей через запятую («ru,es») —
+эти сценарии грузятся фоном сразу после старта. По умолчанию ничего не
+предзагружается: узел, который обслуживает только RU, не держит в памяти остальные языки.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
+
+from aiogram import types
+from aiogram.fsm.state import StatesGroup
+
+from src.states import (
+    StreamerPostsStates, SpanishPostsStates, ItalianPostsStates, FrenchPostsStates, ImagePostsStates
+)
+
+PREVIEW_CALLBACKS = ("preview_prev", "preview_next", "preview_close", "preview_info")
+
+
+@dataclass
+class ScenarioSpec:
+    """Описание сценария: где лежит код и какие события его будят"""
+    key: str
+    module: str
+    register: str
+    states: Type[StatesGroup]
+    entry_texts: Tuple[str, ...]
+    generators: Tuple[str, ...] = ()
+    callback_exact: Tuple[str, ...] = ()
+    callback_prefixes: Tuple[str, ...] = ()
+
+
+SCENARIOS: Dict[str, ScenarioSpec] = {
+    "ru": ScenarioSpec(
+        key="ru",
+        module="src.handlers.streamer_posts_handlers",
+        register="register_streamer_handlers",
+        states=StreamerPostsStates,
+        entry_texts=("📹 100 постов стримеров",),
+        generators=("src.ai_post_generator",),
+        callback_exact=PREVIEW_CALLBACKS,
+    ),
+    "es": ScenarioSpec(
+        key="es",
+        module="src.handlers.spanish_posts_handlers",
+        register="register_spanish_handlers",
+        states=SpanishPostsStates,
+        entry_texts=("📹ES 100 posteos",),
+        generators=("src.ai_post_generator_es",),
+        callback_exact=PREVIEW_CALLBACKS,
+    ),
+    "it": ScenarioSpec(
+        key="it",
+        module="src.handlers.italian_posts_handlers",
+        register="register_italian_handlers",
+        states=ItalianPostsStates,
+        entry_texts=("📹IT 100 post italiani",),
+        generators=("src.ai_post_generator_it",),
+        callback_exact=PREVIEW_CALLBACKS,
+    ),
+    "fr": ScenarioSpec(
+        key="fr",
+        module="src.handlers.french_posts_handlers",
+        register="register_french_handlers",
+        states=FrenchPostsStates,
+        entry_texts=("📹FR 100 posts francais",),
+        generators=("src.ai_post_generator_fr",),
+        callback_exact=PREVIEW_CALLBACKS,
+    ),
+    "image": ScenarioSpec(
+        key="image",
+        module="src.handlers.image_posts_handlers",
+        register="register_image_posts_handlers",
+        states=ImagePostsStates,
+        entry_texts=("🖼 Посты с картинками",),
+        generators=("src.ai_image_post_generator",),
+        callback_prefixes=("gen_topics:", "preview_nav:", "regen_img:", "regen_txt:"),
+    ),
+}
+
+
+def _rss_mb() -> Optional[float]:
+    """Текущий RSS процесса в МБ (Linux /proc), иначе пиковый RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS отдаёт байты, Linux — килобайты
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return None
+
+
+@dataclass
+class LoadReport:
+    key: str
+    seconds: float
+    rss_delta_mb: Optional[float]
+    trigger: str
+
+
+class ScenarioLoader:
+    """Ленивая загрузка сценариев поверх диспетчера бота"""
+
+    def __init__(self, bot_instance):
+        self.bot_instance = bot_instance
+        self.loaded: Dict[str, bool] = {}
+        self.reports: List[LoadReport] = []
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    # ─────────────────────────────────────────────────────────────
+    # Сопоставление событий со сценариями
+    # ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _spec_for_state(raw_state: Optional[str]) -> Optional[ScenarioSpec]:
+        if not raw_state:
+            return None
+        group = raw_state.split(":", 1)[0]
+        for spec in SCENARIOS.values():
+            if spec.states.__full_group_name__ == group:
+                return spec
+        return None
+
+    def _pending_spec(self, event, raw_state: Optional[str] = None) -> Optional[ScenarioSpec]:
+        """Сценарий, который должен обработать событие, но ещё не загружен."""
+        spec = None
+        if isinstance(event, types.Message) and event.text:
+            # Кнопка входа важнее текущего состояния: из RU можно сразу перейти в ES
+            spec = next((s for s in SCENARIOS.values() if event.text in s.entry_texts), None)
+        if spec is None:
+            spec = self._spec_for_state(raw_state)
+        if spec is None and isinstance(event, types.CallbackQuery) and event.data:
+            claimants = [
+                s for s in SCENARIOS.values()
+                if event.data in s.callback_exact
+                or (s.callback_prefixes and event.data.startswith(s.callback_prefixes))
+            ]
+            if any(self.loaded.get(s.key) for s in claimants):
+                return None
+            spec = claimants[0] if claimants else None
+        if spec is None or self.loaded.get(spec.key):
+            return None
+        return spec
+
+    # ─────────────────────────────────────────────────────────────
+    # Загрузка
+    # ─────────────────────────────────────────────────────────────
+
+    async def ensure_loaded(self, key: str, trigger: str = "first use") -> bool:
+        """Импортирует модуль сценария и регистрирует его обработчики (один раз)."""
+        if self.loaded.get(key):
+            return True
+        spec = SCENARIOS[key]
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if self.loaded.get(key):
+                return True
+            logger = self.bot_instance.logger
+            rss_before = _rss_mb()
+            started = time.perf_counter()
+            try:
+                # Разбор модулей — в потоке: event loop продолжает обслуживать других операторов
+                module = await asyncio.to_thread(self._import_modules, spec)
+                getattr(module, spec.register)(self.bot_instance)
+            except Exception as e:
+                logger.error(f"Не удалось загрузить сценарий {key}: {e}")
+                return False
+            rss_after = _rss_mb()
+            report = LoadReport(
+                key=key,
+                seconds=time.perf_counter() - started,
+                rss_delta_mb=(rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+                trigger=trigger,
+            )
+            self.reports.append(report)
+            self.loaded[key] = True
+            mem = f", +{report.rss_delta_mb:.1f} МБ RSS" if report.rss_delta_mb is not None else ""
+            logger.info(f"📦 Сценарий {key} загружен ({trigger}) за {report.seconds:.2f} с{mem}")
+            return True
+
+    @staticmethod
+    def _import_modules(spec: ScenarioSpec):
+        module = importlib.import_module(spec.module)
+        for name in spec.generators:
+            importlib.import_module(name)
+        return module
+
+    def register(self):
+        """Регистрирует лёгкие входы всех сценариев. Вызывать до обработчиков сценариев."""
+        dp = self.bot_instance.dp
+
+        def _needs_loading(event, raw_state: Optional[str] = None) -> bool:
+            return self._pending_spec(event, raw_state) is not None
+
+        async def _load_and_redispatch(event, raw_state: Optional[str] = None,
+                                       event_update: Optional[types.Update] = None, bot=None):
+            spec = self._pending_spec(event, raw_state)
+            if spec is None:
+                return
+            if await self.ensure_loaded(spec.key) and event_update is not None:
+                # Повторный прогон того же апдейта — теперь его заберут настоящие обработчики
+                await dp.feed_update(bot or self.bot_instance.bot, event_update)
+            elif isinstance(event, types.CallbackQuery):
+                await event.answer("❌ Сценарий временно недоступен", show_alert=True)
+            else:
+                await event.answer("❌ Сценарий временно недоступен")
+
+        dp.message.register(_load_and_redispatch, _needs_loading)
+        dp.callback_query.register(_load_and_redispatch, _needs_loading)
+
+    # ─────────────────────────────────────────────────────────────
+    # Старт
+    # ─────────────────────────────────────────────────────────────
+
+    async def start(self, startup_started: Optional[float] = None):
+        """Отчёт о старте и фоновая предзагрузка по SCENARIOS_PRELOAD."""
+        logger = self.bot_instance.logger
+        rss = _rss_mb()
+        took = f" за {time.perf_counter() - startup_started:.2f} с" if startup_started else ""
+        logger.info(
+            f"🚀 Старт{took}, RSS {rss:.1f} МБ, сценарии загружаются по требованию"
+            if rss is not None else f"🚀 Старт{took}, сценарии загружаются по требованию"
+        )
+        preload = os.getenv("SCENARIOS_PRELOAD", "").strip().lower()
+        if not preload or preload == "none":
+            return
+        keys = list(SCENARIOS) if preload == "all" else [k.strip() for k in preload.split(",") if k.strip() in SCENARIOS]
+        if keys:
+            asyncio.create_task(self._preload(keys))
+
+    async def _preload(self, keys: List[str]):
+        for key in keys:
+            await self.ensure_loaded(key, trigger="preload")
+        rss = _rss_mb()
+        if rss is not None:
+            self.bot_instance.logger.info(f"📦 Предзагрузка завершена: {', '.join(keys)}, RSS {rss:.1f} МБ")
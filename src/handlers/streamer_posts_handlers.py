@@ -16,9 +16,15 @@ from aiogram import types
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton, MessageEntity
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import StateFilter
-from telethon.errors import FloodWaitError
 
 from src.states import StreamerPostsStates
+from src.job_manager import get_job_registry, JobCancelled, JOB_FAILED
+from src.handlers.job_handlers import job_control_keyboard, close_job_controls
+from src.publisher import publish_posts, publishing_intro_text
+from src.scheduler import set_work_context, PRIORITY_INTERACTIVE
+from src.circuit_breaker import healthy_candidates, pick_healthy
+from src.model_telemetry import pick_auto_model
+from src.speculative import get_speculative_tasks, SPECULATIVE_POOL_COUNT, SPECULATIVE_SCAN_LIMIT
 
 
 def _utf16_len(text: str) -> int:
@@ -40,6 +46,7 @@ def register_streamer_handlers(bot_instance):
     db_manager = bot_instance.db_manager
     logger = bot_instance.logger
     chat_scanner = bot_instance.chat_scanner
+    speculative = get_speculative_tasks()
     
     # Хелпер для получения клавиатуры сценариев
     def get_scenarios_kb(user_id):
@@ -66,6 +73,134 @@ def register_streamer_handlers(bot_instance):
                 except Exception:
                     pass
 
+    # ============================================
+    # СКАН КАНАЛА И СПЕКУЛЯТИВНЫЕ ЗАДАЧИ НАСТРОЙКИ
+    # ============================================
+
+    def _scan_iter_params(source_channel_id, scan_reverse: bool, use_post_link: bool,
+                          start_message_id, limit: int) -> dict:
+        """Параметры iter_messages для скана канала в выбранном направлении."""
+        iter_params = {
+            'entity': source_channel_id,
+            'limit': limit
+        }
+    
+        # Если указана ссылка на пост - используем min_id/max_id
+        if use_post_link and start_message_id:
+            if scan_reverse:
+                # Вниз (к старым): max_id ограничивает сверху
+                iter_params['max_id'] = start_message_id + 1
+                iter_params['reverse'] = False  # от новых к старым
+            else:
+                # Вверх (к новым): min_id ограничивает снизу
+                iter_params['min_id'] = start_message_id - 1
+                iter_params['reverse'] = True  # от старых к новым
+        else:
+            # Обычное сканирование без ссылки
+            iter_params['reverse'] = scan_reverse
+        return iter_params
+
+    async def _scan_channel_videos(client, source_channel_id, iter_params: dict, video_count=None) -> dict:
+        """
+        Видео канала с автопарсингом подписей.
+
+        Returns:
+            {'items': [(позиция сообщения в скане, video_info)], 'scanned': сообщений просмотрено,
+             'limit': limit скана}
+        """
+        from src.caption_cache import get_caption_cache
+    
+        caption_cache = get_caption_cache()
+        items = []
+        scanned = 0
+        async for msg in client.iter_messages(**iter_params):
+            position = scanned
+            scanned += 1
+            if msg.video:
+                caption = msg.text or ''
+            
+                # Пробуем автопарсинг данных из подписи (кэш + ручные исправления прошлых сканов)
+                parsed = caption_cache.parse(caption, source_channel_id, msg.id)
+            
+                # Сохраняем source_channel_id и message_id для копирования через Telethon
+                video_info = {
+                    'file_id': None,  # Не нужен - будем копировать через Telethon
+                    'message_id': msg.id,
+                    'source_channel_id': source_channel_id,  # Для копирования
+                    'caption': caption,
+                    'file_name': msg.file.name if msg.file else f"video_{msg.id}.mp4",
+                    'date': msg.date.strftime("%Y-%m-%d %H:%M") if msg.date else '',
+                    # Данные из парсинга
+                    'slot': parsed.slot,
+                    'bet': parsed.bet,
+                    'win': parsed.win,
+                    'streamer': parsed.streamer,
+                    'multiplier': parsed.multiplier,
+                    'currency': parsed.currency,  # Добавляем валюту
+                    'auto_parsed': parsed.is_valid()
+                }
+                items.append((position, video_info))
+            
+                if video_count is not None and len(items) >= video_count:
+                    break
+    
+        caption_cache.flush()
+        logger.info(caption_cache.stats_line())
+        return {'items': items, 'scanned': scanned, 'limit': iter_params['limit']}
+
+    def _scan_task_name(scan_reverse: bool) -> str:
+        return "scan_reverse" if scan_reverse else "scan"
+
+    async def _speculative_scan(source_channel_id, scan_reverse: bool, use_post_link: bool, start_message_id):
+        """Скан канала заранее — пока оператор выбирает направление и количество видео."""
+        from src.telethon_manager import TelethonClientManager
+        manager = TelethonClientManager.get_instance(config_manager)
+        await asyncio.shield(manager.ensure_initialized())
+        client = manager.get_client()
+        if not client:
+            return None
+        iter_params = _scan_iter_params(
+            source_channel_id, scan_reverse, use_post_link, start_message_id, SPECULATIVE_SCAN_LIMIT
+        )
+        return await _scan_channel_videos(client, source_channel_id, iter_params)
+
+    def _start_speculative_scans(user_id: int, source_channel_id, use_post_link: bool, start_message_id):
+        """Канал известен — сканируем оба направления; невыбранное отменится в handler'е направления."""
+        for scan_reverse in (False, True):
+            speculative.start(
+                user_id, _scan_task_name(scan_reverse),
+                (source_channel_id, use_post_link, start_message_id, scan_reverse),
+                lambda r=scan_reverse: _speculative_scan(source_channel_id, r, use_post_link, start_message_id)
+            )
+
+    async def _speculative_bonus_pools(bonus1: str, bonus2: str):
+        """Пул описаний бонусов заранее — пока оператор выбирает видео и канал."""
+        from src.ai_post_generator import AIPostGenerator, OPENROUTER_MODELS
+        if config_manager.openai_api_key:
+            generator = AIPostGenerator(api_key=config_manager.openai_api_key)
+        elif config_manager.openrouter_api_key:
+            generator = AIPostGenerator(
+                openrouter_api_key=config_manager.openrouter_api_key,
+                model=OPENROUTER_MODELS["gemini-3-flash"]['id'],
+                use_openrouter=True
+            )
+        else:
+            return None
+        # Ссылки в пул не попадают — описания зависят только от текста бонусов
+        generator.set_bonus_data(url1="", bonus1=bonus1, url2="", bonus2=bonus2)
+        await generator.generate_bonus_descriptions_pool(count=SPECULATIVE_POOL_COUNT)
+        return generator.get_bonus_pool()
+
+    async def _warm_up_telethon():
+        """Подключение Telethon и кэш сущностей (get_dialogs) до ввода канала."""
+        from src.telethon_manager import TelethonClientManager
+        manager = TelethonClientManager.get_instance(config_manager)
+        # Отмена спекуляции не должна обрывать инициализацию клиентов на середине
+        await asyncio.shield(manager.ensure_initialized())
+        client = manager.get_client()
+        if client:
+            await client.get_dialogs()
+
     # ============================================
     # ОБРАБОТЧИКИ СЦЕНАРИЯ "100 ПОСТОВ СТРИМЕРОВ"
     # ============================================
@@ -74,6 +209,7 @@ def register_streamer_handlers(bot_instance):
     async def streamer_posts_start_handler(message: types.Message, state: FSMContext):
         """Начало сценария 100 постов стримеров"""
         await state.clear()
+        speculative.cancel(message.from_user.id)
     
         if not is_allowed(message.from_user.id, "streamer_posts"):
             await message.answer("❌ У вас нет доступа к этому сценарию")
@@ -172,6 +308,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -199,6 +336,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -221,6 +359,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -248,6 +387,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -257,6 +397,12 @@ def register_streamer_handlers(bot_instance):
     
         data = await state.get_data()
     
+        # Бонусы известны — пул описаний и Telethon готовятся, пока оператор выбирает видео
+        user_id = message.from_user.id
+        speculative.start(user_id, "bonus_pools", (data['bonus1'], bonus2),
+                          lambda: _speculative_bonus_pools(data['bonus1'], bonus2))
+        speculative.start(user_id, "telethon", None, _warm_up_telethon)
+    
         summary = f"""
     ✅ <b>Ссылки и бонусы настроены!</b>
 
@@ -316,6 +462,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -430,6 +577,9 @@ def register_streamer_handlers(bot_instance):
                 source_channel_id=channel_id,
                 source_channel_name=channel_name
             )
+            _start_speculative_scans(
+                message.from_user.id, channel_id, data.get('use_post_link', False), data.get('start_message_id')
+            )
         
             # Спрашиваем направление сканирования
             await message.answer(
@@ -465,6 +615,7 @@ def register_streamer_handlers(bot_instance):
 
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -544,6 +695,7 @@ def register_streamer_handlers(bot_instance):
             start_message_id=message_id,  # Стартовый пост
             use_post_link=True  # Флаг что используем ссылку
         )
+        _start_speculative_scans(message.from_user.id, channel_id, True, message_id)
     
         # Спрашиваем направление
         await message.answer(
@@ -572,6 +724,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -603,6 +756,8 @@ def register_streamer_handlers(bot_instance):
             return
     
         await state.update_data(scan_reverse=scan_reverse)
+        # Скан в другом направлении больше не нужен
+        speculative.cancel(message.from_user.id, _scan_task_name(not scan_reverse))
     
         await message.answer(
             f"✅ Направление: <b>{direction_text}</b>\n\n"
@@ -626,6 +781,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -659,78 +815,45 @@ def register_streamer_handlers(bot_instance):
             parse_mode="HTML"
         )
     
-        # Сканируем канал через Telethon
+        # Сканируем канал через Telethon (или берём скан, начатый заранее при выборе канала)
         try:
-            from src.caption_parser import CaptionParser
-            from src.telethon_manager import TelethonClientManager
-        
-            manager = TelethonClientManager.get_instance(config_manager)
-            await manager.ensure_initialized()
-            client = manager.get_client()
-        
-            if not client:
-                await status_msg.edit_text("❌ Telethon клиент не инициализирован")
-                return
+            scan_limit = video_count * 2
+            scan = await speculative.result(
+                message.from_user.id, _scan_task_name(scan_reverse),
+                (source_channel_id, use_post_link, start_message_id, scan_reverse)
+            )
+            # Заранее просмотрено не меньше сообщений, чем нужно (или канал кончился раньше)
+            if scan and (scan_limit <= scan['limit'] or scan['scanned'] < scan['limit']):
+                scanned_videos = [info for position, info in scan['items'] if position < scan_limit][:video_count]
+            else:
+                from src.telethon_manager import TelethonClientManager
+            
+                manager = TelethonClientManager.get_instance(config_manager)
+                await manager.ensure_initialized()
+                client = manager.get_client()
+            
+                if not client:
+                    await status_msg.edit_text("❌ Telethon клиент не инициализирован")
+                    return
+            
+                iter_params = _scan_iter_params(
+                    source_channel_id, scan_reverse, use_post_link, start_message_id, scan_limit
+                )
+                scan = await _scan_channel_videos(client, source_channel_id, iter_params, video_count)
+                scanned_videos = [info for _, info in scan['items']]
         
             videos_found = []
             videos_auto_parsed = []  # Видео с автопарсингом данных
             videos_need_input = []   # Видео без данных - нужен ручной ввод
         
-            # Параметры для iter_messages
-            iter_params = {
-                'entity': source_channel_id,
-                'limit': video_count * 2
-            }
-        
-            # Если указана ссылка на пост - используем min_id/max_id
-            if use_post_link and start_message_id:
-                if scan_reverse:
-                    # Вниз (к старым): max_id ограничивает сверху
-                    iter_params['max_id'] = start_message_id + 1
-                    iter_params['reverse'] = False  # от новых к старым
+            for video_info in scanned_videos:
+                videos_found.append(video_info)
+            
+                # Для русского сценария слот обязателен!
+                if video_info['auto_parsed'] and video_info['slot']:
+                    videos_auto_parsed.append(video_info)
                 else:
-                    # Вверх (к новым): min_id ограничивает снизу
-                    iter_params['min_id'] = start_message_id - 1
-                    iter_params['reverse'] = True  # от старых к новым
-            else:
-                # Обычное сканирование без ссылки
-                iter_params['reverse'] = scan_reverse
-        
-            async for msg in client.iter_messages(**iter_params):
-                if msg.video:
-                    caption = msg.text or ''
-                
-                    # Пробуем автопарсинг данных из подписи
-                    parsed = CaptionParser.parse(caption)
-                
-                    # Сохраняем source_channel_id и message_id для копирования через Telethon
-                    video_info = {
-                        'file_id': None,  # Не нужен - будем копировать через Telethon
-                        'message_id': msg.id,
-                        'source_channel_id': source_channel_id,  # Для копирования
-                        'caption': caption,
-                        'file_name': msg.file.name if msg.file else f"video_{msg.id}.mp4",
-                        'date': msg.date.strftime("%Y-%m-%d %H:%M") if msg.date else '',
-                        # Данные из парсинга
-                        'slot': parsed.slot,
-                        'bet': parsed.bet,
-                        'win': parsed.win,
-                        'streamer': parsed.streamer,
-                        'multiplier': parsed.multiplier,
-                        'currency': parsed.currency,  # Добавляем валюту
-                        'auto_parsed': parsed.is_valid()
-                    }
-                
-                    videos_found.append(video_info)
-                
-                    # Для русского сценария слот обязателен!
-                    if parsed.is_valid() and parsed.slot:
-                        videos_auto_parsed.append(video_info)
-                    else:
-                        videos_need_input.append(video_info)
-                
-                    if len(videos_found) >= video_count:
-                        break
+                    videos_need_input.append(video_info)
         
             if not videos_found:
                 await status_msg.edit_text(
@@ -818,6 +941,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -880,6 +1004,9 @@ def register_streamer_handlers(bot_instance):
     
         videos.append(video_data)
         await state.update_data(videos=videos)
+        # Исправление запоминается: при следующем скане это видео распознается сразу
+        from src.caption_cache import get_caption_cache
+        get_caption_cache().save_override(video_data)
     
         streamer_text = f"👤 {streamer}" if streamer else "👤 не указан"
         await message.answer(
@@ -1004,6 +1131,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -1136,6 +1264,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -1322,6 +1451,7 @@ def register_streamer_handlers(bot_instance):
              InlineKeyboardButton(text="⚖️ Средние (~0.3₽)", callback_data="ai_model:rotation:medium")],
             [InlineKeyboardButton(text="💎 Премиум (~1₽)", callback_data="ai_model:rotation:premium"),
              InlineKeyboardButton(text="🔄 Все модели", callback_data="ai_model:rotation:mixed")],
+            [InlineKeyboardButton(text="🤖 Авто (по статистике моделей)", callback_data="ai_model:rotation:auto")],
             # Отдельные модели — дешёвые
             [InlineKeyboardButton(text="🔥 Grok 4.1 Fast — ~0.1₽", callback_data="ai_model:grok-4.1-fast:openrouter"),
              InlineKeyboardButton(text="🎨 Mistral Creative — ~0.05₽", callback_data="ai_model:mistral-small-creative:openrouter")],
@@ -1398,6 +1528,7 @@ def register_streamer_handlers(bot_instance):
         parts = callback.data.split(":")
         if parts[1] == "cancel":
             await state.clear()
+            speculative.cancel(callback.from_user.id)
             kb = get_scenarios_kb(callback.from_user.id)
             await callback.message.edit_text("❌ Отменено")
             await callback.message.answer("Выберите сценарий:", reply_markup=kb)
@@ -1534,6 +1665,10 @@ def register_streamer_handlers(bot_instance):
         elif rotation_type == "premium":
             rotation_models = rotation_premium
             rotation_label = "💎 ПРЕМИУМ"
+        elif rotation_type == "auto":
+            # Модель на каждый пост выбирается по телеметрии (src/model_telemetry.py)
+            rotation_models = rotation_mixed
+            rotation_label = "🤖 АВТО"
         else:
             rotation_models = rotation_mixed
             rotation_label = "🔄 ВСЕ"
@@ -1651,33 +1786,63 @@ def register_streamer_handlers(bot_instance):
             for v in videos
         ]
     
+        # Задача генерации: стоп/пауза и ETA через JobRegistry, в FSM — только job_id
+        # Готовые посты чекпоинтятся — рестарт посреди прогона не выбрасывает оплаченные ответы LLM
+        job = get_job_registry().create(
+            callback.from_user.id, "generation", total=len(video_data_list) + len(images), scenario="ru",
+            chat_id=callback.message.chat.id,
+            context={'videos': videos, 'images': images, 'target_channel_id': data.get('target_channel_id'),
+                     'target_channel_name': data.get('target_channel_name'), 'model': model_display_name,
+                     # Для догенерации после рестарта; в ротации — первая модель набора
+                     'model_key': rotation_models[0][0] if is_rotation else model_key,
+                     'provider': rotation_models[0][1] if is_rotation else provider, 'uncensored': is_uncensored,
+                     'bonus_data': {k: data.get(k) for k in ('url1', 'bonus1', 'url2', 'bonus2')}}
+        )
+        await state.update_data(job_id=job.job_id)
+        control_msg = await callback.message.answer(
+            "⏯ Управление генерацией", reply_markup=job_control_keyboard(job)
+        )
+
         # Генерируем посты через AI
         ai_posts = []
     
         # Генерируем AI-пул описаний бонусов (уникальное описание для каждого поста)
         total_posts = len(video_data_list) + len(images)
         bonus1_pool, bonus2_pool = [], []
-        try:
-            if is_rotation:
-                pool_gen = create_generator(rotation_models[0][0], rotation_models[0][1])
-            else:
-                pool_gen = generator
-            pool_gen.set_bonus_data(
-                url1=data['url1'], bonus1=data['bonus1'],
-                url2=data['url2'], bonus2=data['bonus2']
-            )
-            
-            await status_msg.edit_text(
-                "🎯 <b>Генерация уникальных описаний бонусов...</b>\n\n"
-                f"📝 Создаём {total_posts} уникальных описаний для каждой ссылки",
-                parse_mode="HTML"
-            )
-            await pool_gen.generate_bonus_descriptions_pool(count=total_posts)
-            bonus1_pool, bonus2_pool = pool_gen.get_bonus_pool()
-            logger.info(f"AI-пул описаний бонусов: {len(bonus1_pool)} + {len(bonus2_pool)}")
-        except Exception as pool_err:
-            logger.warning(f"⚠️ Ошибка генерации пула бонусов: {pool_err}. Фоллбек на программные вариации.")
-            bonus1_pool, bonus2_pool = [], []
+        # Пул, начатый в фоне после ввода бонусов: если его хватает — второй раз не генерируем.
+        # Если не хватает, его описания уже лежат в хранилище пулов и сокращают запрос ниже.
+        speculative_pools = await speculative.result(
+            callback.from_user.id, "bonus_pools", (data['bonus1'], data['bonus2'])
+        )
+        if speculative_pools and min(len(pool) for pool in speculative_pools) >= total_posts:
+            bonus1_pool, bonus2_pool = (pool[:total_posts] for pool in speculative_pools)
+            if not is_rotation:
+                generator.set_bonus_pool(bonus1_pool, bonus2_pool)
+            logger.info(f"AI-пул описаний бонусов (готов заранее): {len(bonus1_pool)} + {len(bonus2_pool)}")
+        else:
+            try:
+                if is_rotation:
+                    pool_gen = create_generator(rotation_models[0][0], rotation_models[0][1])
+                else:
+                    pool_gen = generator
+                pool_gen.set_bonus_data(
+                    url1=data['url1'], bonus1=data['bonus1'],
+                    url2=data['url2'], bonus2=data['bonus2']
+                )
+                
+                await status_msg.edit_text(
+                    "🎯 <b>Генерация уникальных описаний бонусов...</b>\n\n"
+                    f"📝 Создаём {total_posts} уникальных описаний для каждой ссылки",
+                    parse_mode="HTML"
+                )
+                await pool_gen.generate_bonus_descriptions_pool(count=total_posts)
+                bonus1_pool, bonus2_pool = pool_gen.get_bonus_pool()
+                logger.info(f"AI-пул описаний бонусов: {len(bonus1_pool)} + {len(bonus2_pool)}")
+            except Exception as pool_err:
+                logger.warning(f"⚠️ Ошибка генерации пула бонусов: {pool_err}. Фоллбек на программные вариации.")
+                bonus1_pool, bonus2_pool = [], []
+        # Догенерация после рестарта продолжит те же пулы, а не запросит новые
+        job.update_context(bonus_pools=[bonus1_pool, bonus2_pool])
         
         if is_rotation:
             # РОТАЦИЯ: каждый пост - разная модель
@@ -1687,14 +1852,29 @@ def register_streamer_handlers(bot_instance):
             link_format_counter = 0
         
             for i, video in enumerate(video_data_list):
-                # Выбираем модель по индексу (циклически)
-                rot_model_key, rot_provider, rot_name = rotation_models_list[i % len(rotation_models_list)]
+                if not await job.checkpoint():
+                    logger.info(f"Генерация остановлена пользователем на посте #{i}")
+                    break
+                if job.cost.exceeded:
+                    logger.warning(f"Бюджет прогона исчерпан на посте #{i}: ${job.cost.totals.cost_usd:.4f}")
+                    break
+
+                # Модели с открытым circuit breaker'ом пропускаем до пробного запроса
+                if rotation_type == "auto":
+                    # Лучшая модель по принятым постам в секунду в пределах потолка цены
+                    rot_model_key, rot_provider, rot_name = pick_auto_model(
+                        healthy_candidates(rotation_models_list, OPENROUTER_MODELS), OPENROUTER_MODELS
+                    )
+                else:
+                    # Выбираем модель по индексу (циклически), пропуская отключённые
+                    rot_model_key, rot_provider, rot_name = pick_healthy(rotation_models_list, OPENROUTER_MODELS, i)
             
                 pct = i * 100 // total_posts if total_posts else 0
                 bar = '█' * (i * 20 // total_posts) + '░' * (20 - i * 20 // total_posts) if total_posts else ''
                 draft_text = (
                     f"🤖 РОТАЦИЯ — {i}/{total_posts} ({pct}%)\n"
-                    f"{bar}\n\n"
+                    f"{bar}\n"
+                    f"⏱ ETA: {job.format_eta()}\n\n"
                     f"🧠 {rot_name}"
                 )
                 await _draft_progress(callback.message.chat.id, draft_text, status_msg)
@@ -1719,13 +1899,20 @@ def register_streamer_handlers(bot_instance):
                     post = await rot_generator.generate_video_post(video, i)
                     post.model_used = rot_name  # Сохраняем какая модель использовалась
                     ai_posts.append(post)
+                    job.advance()
+                    job.save_item(post.index, post)
                     # КРИТИЧНО: сохраняем обновленный счетчик для следующего генератора
                     link_format_counter = rot_generator.get_link_format_counter()
                 except Exception as e:
                     logger.error(f"Ошибка ротации пост #{i} ({rot_name}): {e}")
-                    # Пробуем fallback на Gemini Flash (быстрая и дешёвая)
+                    # Пробуем fallback на Gemini Flash (быстрая и дешёвая), если она отключена — на другую здоровую модель
+                    fb_model_key, fb_provider, fb_name = pick_healthy(
+                        [("gemini-3-flash", "openrouter", "Gemini 3 Flash")]
+                        + [m for m in rotation_models_list if m[0] != rot_model_key],
+                        OPENROUTER_MODELS
+                    )
                     try:
-                        fallback_gen = create_generator("gemini-3-flash", "openrouter")
+                        fallback_gen = create_generator(fb_model_key, fb_provider)
                         fallback_gen.set_bonus_data(
                             url1=data['url1'],
                             bonus1=data['bonus1'],
@@ -1739,12 +1926,15 @@ def register_streamer_handlers(bot_instance):
                         # КРИТИЧНО: передаем счетчик форматов в fallback
                         fallback_gen.set_link_format_counter(link_format_counter)
                         post = await fallback_gen.generate_video_post(video, i)
-                        post.model_used = "Gemini 3 Flash (fallback)"
+                        post.model_used = f"{fb_name} (fallback)"
                         ai_posts.append(post)
+                        job.advance()
+                        job.save_item(post.index, post)
                         # КРИТИЧНО: сохраняем обновленный счетчик
                         link_format_counter = fallback_gen.get_link_format_counter()
                     except Exception as fallback_error:
                         logger.error(f"Fallback тоже не сработал для поста #{i}: {fallback_error}")
+                        job.advance(error=True)
                         # КРИТИЧНО: Не прерываем цикл! Пост пропущен, но продолжаем генерацию
         
             # Генерация картинок (используем Gemini 3 Flash - быстрая и дешёвая)
@@ -1763,11 +1953,16 @@ def register_streamer_handlers(bot_instance):
                 # КРИТИЧНО: продолжаем ротацию форматов для картинок
                 img_generator.set_link_format_counter(link_format_counter)
                 for j in range(len(images)):
+                    if not await job.checkpoint():
+                        break
                     try:
                         post = await img_generator.generate_image_post(len(video_data_list) + j)
                         ai_posts.append(post)
+                        job.advance()
+                        job.save_item(post.index, post)
                     except Exception as img_error:
                         logger.error(f"Ошибка генерации картинки #{j}: {img_error}")
+                        job.advance(error=True)
         else:
             # Обычный режим - одна модель для всех
             generator.set_bonus_data(
@@ -1785,7 +1980,8 @@ def register_streamer_handlers(bot_instance):
                 text = (
                     f"🤖 AI генерирует посты...\n\n"
                     f"⏳ {current}/{total} ({pct}%)\n"
-                    f"{bar}\n\n"
+                    f"{bar}\n"
+                    f"⏱ ETA: {job.format_eta()}\n\n"
                     f"🧠 {model_display_name} | {provider.upper()}"
                 )
                 await _draft_progress(_chat_id, text, status_msg)
@@ -1794,9 +1990,11 @@ def register_streamer_handlers(bot_instance):
                 ai_posts = await generator.generate_all_posts(
                     videos=video_data_list,
                     image_count=len(images),
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    job=job
                 )
             except Exception as e:
+                await close_job_controls(job, control_msg, JOB_FAILED)
                 error_msg = str(e)
                 if provider == "openrouter":
                     error_msg += "\n\n💡 Проверьте:\n• Баланс OpenRouter\n• Правильность API ключа"
@@ -1808,6 +2006,7 @@ def register_streamer_handlers(bot_instance):
             
             # 🚨 КРИТИЧНО: Проверяем были ли сгенерированы хотя бы некоторые посты
             if not ai_posts or len(ai_posts) == 0:
+                await close_job_controls(job, control_msg, JOB_FAILED)
                 await status_msg.edit_text(
                     "❌ <b>Не удалось сгенерировать ни одного поста</b>\n\n"
                     "💡 Проверьте:\n"
@@ -1830,6 +2029,8 @@ def register_streamer_handlers(bot_instance):
                 await status_msg.edit_text(warning_msg, parse_mode="HTML")
                 await asyncio.sleep(3)
     
+        await close_job_controls(job, control_msg)
+
         # Сохраняем посты с привязкой к медиа
         generated_posts = []
         video_idx = 0
@@ -1901,6 +2102,10 @@ def register_streamer_handlers(bot_instance):
             models_info = f"🔄 Ротация: {', '.join(models_used)}" if models_used else "🔄 Ротация моделей"
         else:
             models_info = f"🤖 Модель: {model_display_name}\n🔌 Провайдер: {provider.upper()}"
+        # Расход токенов и $ за прогон (src/cost_accounting.py)
+        cost_summary = job.cost.summary()
+        if cost_summary:
+            models_info += "\n" + cost_summary
     
         # Обновляем статус
         try:
@@ -2166,14 +2371,29 @@ def register_streamer_handlers(bot_instance):
             posts_texts = [p['text'] for p in generated_posts]
             posts_slots = [p.get('slot', 'Неизвестно') for p in generated_posts]
         
-            # Выполняем проверку
-            if is_hybrid:
-                result = await checker.check_posts_uniqueness_hybrid(posts_texts, posts_slots)
-            else:
-                result = await checker.check_posts_uniqueness(posts_texts, posts_slots, model=model_key)
+            # Выполняем проверку как задачу: «Стоп» отменяет запрос к AI
+            job = get_job_registry().create(message.from_user.id, "uniqueness", total=len(posts_texts), scenario="ru")
+            await state.update_data(job_id=job.job_id)
+            try:
+                await status_msg.edit_reply_markup(reply_markup=job_control_keyboard(job, with_pause=False))
+            except Exception:
+                pass
+            try:
+                if is_hybrid:
+                    result = await job.run_cancellable(checker.check_posts_uniqueness_hybrid(posts_texts, posts_slots))
+                else:
+                    result = await job.run_cancellable(checker.check_posts_uniqueness(posts_texts, posts_slots, model=model_key))
+                job.advance(len(posts_texts))
+            except JobCancelled:
+                await status_msg.edit_text("🛑 Проверка уникальности остановлена", parse_mode="HTML")
+                await _show_posts_preview_after_check(message, state, None)
+                return
+            finally:
+                get_job_registry().finish(job)
         
             # Сохраняем результат
             await state.update_data(uniqueness_result=result)
+            cost_info = f"\n\n{job.cost.summary()}" if job.cost.totals.calls else ""
         
             # Показываем результаты
             if result.get("error"):
@@ -2193,7 +2413,8 @@ def register_streamer_handlers(bot_instance):
                 await status_msg.edit_text(
                     f"✅ <b>Все {len(generated_posts)} постов уникальны!</b>\n\n"
                     f"🤖 Модель: {result.get('model_used', model_name)}\n"
-                    f"📊 {result.get('summary', 'Проверка завершена')}",
+                    f"📊 {result.get('summary', 'Проверка завершена')}"
+                    f"{cost_info}",
                     parse_mode="HTML"
                 )
                 await _show_posts_preview_after_check(message, state, result)
@@ -2212,7 +2433,8 @@ def register_streamer_handlers(bot_instance):
                     f"⚠️ <b>Найдено {len(duplicates)} похожих пар!</b>\n\n"
                     f"🤖 Модель: {result.get('model_used', model_name)}\n"
                     f"📊 Уникальных: {result.get('total_unique', '?')}/{len(generated_posts)}"
-                    f"{dup_text}",
+                    f"{dup_text}"
+                    f"{cost_info}",
                     parse_mode="HTML"
                 )
             
@@ -2291,6 +2513,8 @@ def register_streamer_handlers(bot_instance):
             return
     
         if "перегенерировать дубли" in text:
+            # Пара дублей — единичное действие оператора, идёт раньше чужих пакетных прогонов
+            set_work_context(message.from_user.id, PRIORITY_INTERACTIVE)
             duplicates = result.get("duplicates", [])
             if not duplicates:
                 await message.answer("✅ Нет дублей для перегенерации!")
@@ -2543,6 +2767,7 @@ def register_streamer_handlers(bot_instance):
             return
         if message.text == "❌ Отмена":
             await state.clear()
+            speculative.cancel(message.from_user.id)
             kb = get_scenarios_kb(message.from_user.id)
             await message.answer("❌ Отменено", reply_markup=kb)
             return
@@ -2688,22 +2913,36 @@ def register_streamer_handlers(bot_instance):
             for v in videos
         ]
     
+        job = get_job_registry().create(
+            message.from_user.id, "generation", total=total_posts, scenario="ru",
+            chat_id=message.chat.id,
+            context={'videos': videos, 'images': images, 'target_channel_id': data.get('target_channel_id'),
+                     'target_channel_name': data.get('target_channel_name'), 'model': model,
+                     'model_key': model, 'provider': 'openai', 'uncensored': data.get('uncensored', False),
+                     'bonus_data': {k: data.get(k) for k in ('url1', 'bonus1', 'url2', 'bonus2')}}
+        )
+        await state.update_data(job_id=job.job_id)
+        control_msg = await message.answer("⏯ Управление перегенерацией", reply_markup=job_control_keyboard(job))
+
         _regen_chat_id = message.chat.id
         async def progress_callback(current, total):
             pct = current * 100 // total if total else 0
             bar = '█' * (current * 20 // total) + '░' * (20 - current * 20 // total) if total else ''
-            text = f"🔄 Перегенерация {current}/{total} ({pct}%)\n{bar}"
+            text = f"🔄 Перегенерация {current}/{total} ({pct}%)\n{bar}\n⏱ ETA: {job.format_eta()}"
             await _draft_progress(_regen_chat_id, text, status_msg)
     
         try:
             ai_posts = await generator.generate_all_posts(
                 videos=video_data_list,
                 image_count=len(images),
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                job=job
             )
         except Exception as e:
+            await close_job_controls(job, control_msg, JOB_FAILED)
             await status_msg.edit_text(f"❌ Ошибка: {e}", parse_mode="HTML")
             return
+        await close_job_controls(job, control_msg)
     
         # Сохраняем с привязкой к медиа
         generated_posts = []
@@ -2792,170 +3031,26 @@ def register_streamer_handlers(bot_instance):
             await message.answer("❌ Telethon клиент не инициализирован")
             return
     
-        # Лимиты Telegram для безопасной публикации
-        DELAY_MIN = 3  # Минимальная пауза между постами (сек)
-        DELAY_MAX = 5  # Максимальная пауза между постами (сек)
-        POSTS_BEFORE_LONG_PAUSE = 20  # После скольких постов делать длинную паузу
-        LONG_PAUSE_SECONDS = 60  # Длинная пауза (сек)
-        POSTS_BEFORE_VERY_LONG_PAUSE = 100  # После скольких постов - очень длинная пауза
-        VERY_LONG_PAUSE_SECONDS = 300  # 5 минут
-    
-        import random as rnd
-    
-        # Флаг остановки публикации
-        await state.update_data(stop_publishing=False)
-    
-        # Inline кнопка "Стоп"
-        stop_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🛑 Остановить публикацию", callback_data="stop_streamer_publishing", style="danger")]
-        ])
-    
+        # Задача публикации: стоп/пауза и прогресс в JobRegistry, в FSM — только job_id.
+        # Посты и канал уходят в чекпоинт — после рестарта публикацию можно продолжить
+        job = get_job_registry().create(
+            message.from_user.id, "publishing", total=len(posts), scenario="ru",
+            chat_id=message.chat.id,
+            context={'posts': posts, 'target_channel_id': target_channel_id, 'trim_captions': False}
+        )
+        await state.update_data(job_id=job.job_id)
+
         status_msg = await message.answer(
-            f"🚀 <b>Публикация началась!</b>\n\n"
-            f"📝 Постов: {len(posts)}\n"
-            f"⏱ Интервал: {DELAY_MIN}-{DELAY_MAX} сек\n"
-            f"⏸ Пауза каждые {POSTS_BEFORE_LONG_PAUSE} постов: {LONG_PAUSE_SECONDS} сек\n\n"
-            f"Прогресс: 0/{len(posts)}\n\n"
-            f"<i>Нажмите кнопку ниже чтобы остановить</i>",
+            publishing_intro_text(len(posts)),
             parse_mode="HTML",
-            reply_markup=stop_keyboard
+            reply_markup=job_control_keyboard(job, stop_text="🛑 Остановить публикацию")
+        )
+
+        published, errors, stopped = await publish_posts(
+            bot, client, job, posts, target_channel_id, status_msg, logger, trim_captions=False
         )
-    
-        published = 0
-        errors = 0
-        stopped = False
-    
-        for i, post in enumerate(posts):
-            # Проверяем флаг остановки
-            current_data = await state.get_data()
-            if current_data.get('stop_publishing', False):
-                stopped = True
-                break
-            try:
-                # Если есть source_channel_id и message_id - копируем через Telethon
-                if post.get('source_channel_id') and post.get('message_id'):
-                    # Получаем оригинальное сообщение
-                    original_msg = await client.get_messages(
-                        post['source_channel_id'], 
-                        ids=post['message_id']
-                    )
-                
-                    if original_msg:
-                        # Копируем с новым текстом (HTML форматирование)
-                        await client.send_message(
-                            target_channel_id,
-                            post['text'],
-                            file=original_msg.media,
-                            parse_mode='html'  # HTML форматирование для Telethon
-                        )
-                        published += 1
-                    else:
-                        raise Exception("Сообщение не найдено в источнике")
-            
-                # Если есть file_id (загружено вручную) - отправляем через aiogram
-                elif post.get('media_path'):
-                    if post['media_type'] == 'video':
-                        await bot.send_video(
-                            chat_id=target_channel_id,
-                            video=post['media_path'],  # file_id
-                            caption=post['text'],
-                            parse_mode="HTML"  # HTML форматирование
-                        )
-                    else:
-                        await bot.send_photo(
-                            chat_id=target_channel_id,
-                            photo=post['media_path'],  # file_id
-                            caption=post['text'],
-                            parse_mode="HTML"  # HTML форматирование
-                        )
-                    published += 1
-                else:
-                    raise Exception("Нет источника медиа")
-            
-                # Обновляем статус каждые 10 постов
-                if (i + 1) % 10 == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"🚀 <b>Публикация...</b>\n\n"
-                            f"✅ Опубликовано: {published}\n"
-                            f"❌ Ошибок: {errors}\n\n"
-                            f"Прогресс: {i+1}/{len(posts)}",
-                            parse_mode="HTML"
-                        )
-                    except Exception:
-                        pass
-            
-                # Динамическая задержка с учётом лимитов Telegram
-                post_num = i + 1
-            
-                # Очень длинная пауза каждые 100 постов (5 мин)
-                if post_num > 0 and post_num % POSTS_BEFORE_VERY_LONG_PAUSE == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"⏸ <b>Пауза {VERY_LONG_PAUSE_SECONDS // 60} мин...</b>\n\n"
-                            f"Защита от лимитов Telegram\n"
-                            f"✅ Опубликовано: {published}/{len(posts)}",
-                            parse_mode="HTML"
-                        )
-                    except Exception:
-                        pass
-                    await asyncio.sleep(VERY_LONG_PAUSE_SECONDS)
-            
-                # Длинная пауза каждые 20 постов (1 мин)
-                elif post_num > 0 and post_num % POSTS_BEFORE_LONG_PAUSE == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"⏸ <b>Пауза {LONG_PAUSE_SECONDS} сек...</b>\n\n"
-                            f"Защита от лимитов Telegram\n"
-                            f"✅ Опубликовано: {published}/{len(posts)}",
-                            parse_mode="HTML"
-                        )
-                    except Exception:
-                        pass
-                    await asyncio.sleep(LONG_PAUSE_SECONDS)
-            
-                else:
-                    # Обычная рандомная задержка между постами
-                    delay = rnd.uniform(DELAY_MIN, DELAY_MAX)
-                    await asyncio.sleep(delay)
-            
-            except FloodWaitError as e:
-                logger.warning(f"FloodWait: ждём {e.seconds} сек (пост {i})")
-                try:
-                    await status_msg.edit_text(
-                        f"⏸ <b>FloodWait: ждём {e.seconds} сек...</b>\n\n"
-                        f"Telegram ограничил скорость\n"
-                        f"✅ Опубликовано: {published}/{len(posts)}",
-                        parse_mode="HTML"
-                    )
-                except Exception:
-                    pass
-                await asyncio.sleep(e.seconds + 1)
-                # Повторяем публикацию этого поста
-                try:
-                    post = posts[i]
-                    if post.video_path and os.path.exists(post.video_path):
-                        await client.send_file(
-                            target_channel,
-                            post.video_path,
-                            caption=post.text,
-                            parse_mode='html'
-                        )
-                    elif post.image_path and os.path.exists(post.image_path):
-                        await client.send_file(
-                            target_channel,
-                            post.image_path,
-                            caption=post.text,
-                            parse_mode='html'
-                        )
-                    published += 1
-                except Exception as retry_err:
-                    errors += 1
-                    logger.error(f"Ошибка повтора поста {i} после FloodWait: {retry_err}")
-            except Exception as e:
-                errors += 1
-                logger.error(f"Ошибка публикации поста {i}: {e}")
 
+        get_job_registry().finish(job)
         await state.clear()
         kb = get_scenarios_kb(message.from_user.id)
     
@@ -2988,24 +3083,13 @@ def register_streamer_handlers(bot_instance):
                 reply_markup=kb
             )
 
-    @dp.callback_query(lambda c: c.data == "stop_streamer_publishing")
-    async def streamer_posts_stop_publishing(callback: types.CallbackQuery, state: FSMContext):
-        """Остановка публикации"""
-        await state.update_data(stop_publishing=True)
-        await callback.answer("🛑 Останавливаю публикацию...", show_alert=True)
-    
-        # Убираем кнопку
-        try:
-            await callback.message.edit_reply_markup(reply_markup=None)
-        except Exception:
-            pass
-
     @dp.message(StreamerPostsStates.confirming, lambda m: m.text == "❌ Отмена")
     @dp.message(StreamerPostsStates.waiting_for_videos, lambda m: m.text == "❌ Отмена")
     @dp.message(StreamerPostsStates.waiting_for_images, lambda m: m.text == "❌ Отмена")
     async def streamer_posts_cancel(message: types.Message, state: FSMContext):
         """Отмена сценария"""
         await state.clear()
+        speculative.cancel(message.from_user.id)
         kb = get_scenarios_kb(message.from_user.id)
         await message.answer("❌ Сценарий отменён", reply_markup=kb)
 
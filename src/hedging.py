@@ -0,0 +1,288 @@
+"""
+@file: hedging.py
+@description: Хеджирование запросов к LLM — дублирующий запрос к резервной модели, если основная
+              не ответила за свой p90 латентности
+@dependencies: asyncio, src.cassette, src.circuit_breaker, src.cost_accounting, src.model_telemetry, src.scheduler,
+               src.token_budget
+@created: 2026-10-19
+
+Один медленный ответ (до 120 с в wait_for) держит свой пост, а при
+последовательной генерации — и весь прогон. С LLM_HEDGING=1 вызов
+hedged_completion ждёт основную модель до её p90 латентности (по последним
+ответам), затем отправляет тот же запрос резервной модели из
+get_openrouter_models(). Берётся первый валидный ответ, второй запрос
+отменяется.
+
+Резерв работает только через OpenRouter: один клиент обслуживает любую модель.
+Статистика (доля хеджей, победы резерва, оценка лишних затрат) — в
+get_hedge_stats().stats(), чтобы подбирать LLM_HEDGE_* под реальные задержки.
+
+LLM_HEDGING: 1 — включить (по умолчанию выключено)
+LLM_HEDGE_BACKUPS: ключи OPENROUTER_MODELS через запятую, первый не совпадающий с основной
+LLM_HEDGE_DEFAULT_DELAY: задержка хеджа, пока у модели меньше LLM_HEDGE_MIN_SAMPLES замеров
+
+С кассетой (CASSETTE_MODE, src/cassette.py) хеджирование выключено: гонка двух
+запросов недетерминирована, и воспроизведение не совпало бы с записью.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+from src.cassette import get_cassette
+from src.circuit_breaker import get_circuit_breakers
+from src.cost_accounting import get_cost_ledger
+from src.model_telemetry import get_model_telemetry
+from src.scheduler import get_scheduler, llm_resource
+from src.token_budget import estimate_messages_tokens
+
+HEDGING_ENABLED = os.getenv("LLM_HEDGING", "0").strip().lower() in ("1", "true", "yes", "on")
+HEDGE_BACKUPS = tuple(
+    k.strip() for k in os.getenv("LLM_HEDGE_BACKUPS", "gemini-3-flash,gpt-4.1-mini").split(",") if k.strip()
+)
+HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "45"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_PERCENTILE = 0.9
+HEDGE_MIN_DELAY = 5.0
+
+# Сколько последних замеров латентности держать на модель
+LATENCY_WINDOW = 200
+
+
+def is_valid_completion(response: Any) -> bool:
+    """Ответ пригоден: есть choices, не отфильтрован, есть текст."""
+    if not response or not getattr(response, "choices", None):
+        return False
+    choice = response.choices[0]
+    if getattr(choice, "finish_reason", None) == "content_filter":
+        return False
+    return bool(getattr(getattr(choice, "message", None), "content", None))
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedged: int = 0
+    backup_won: int = 0
+    extra_prompt_tokens: int = 0
+    extra_cost_usd: float = 0.0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.calls if self.calls else 0.0
+
+
+@dataclass
+class HedgeTracker:
+    """Латентности моделей и статистика хеджирования (singleton)."""
+
+    latencies: Dict[str, Deque[float]] = field(default_factory=dict)
+    totals: Dict[str, HedgeStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls) -> "HedgeTracker":
+        if cls._instance is None:
+            cls._instance = HedgeTracker()
+        return cls._instance
+
+    def record_latency(self, model: str, seconds: float):
+        with self._lock:
+            self.latencies.setdefault(model, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def hedge_delay(self, model: str) -> float:
+        """Через сколько секунд без ответа отправлять дубль (p90 модели)."""
+        with self._lock:
+            samples = sorted(self.latencies.get(model, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        p90 = samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE))]
+        return max(HEDGE_MIN_DELAY, p90)
+
+    def _stats(self, model: str) -> HedgeStats:
+        return self.totals.setdefault(model, HedgeStats())
+
+    def record_call(self, model: str, hedged: bool = False, backup_won: bool = False,
+                    extra_prompt_tokens: int = 0, extra_cost_usd: float = 0.0):
+        with self._lock:
+            stats = self._stats(model)
+            stats.calls += 1
+            stats.hedged += int(hedged)
+            stats.backup_won += int(backup_won)
+            stats.extra_prompt_tokens += extra_prompt_tokens
+            stats.extra_cost_usd += extra_cost_usd
+
+    def stats(self) -> Dict[str, HedgeStats]:
+        with self._lock:
+            return {k: HedgeStats(**vars(v)) for k, v in self.totals.items()}
+
+
+def get_hedge_stats() -> HedgeTracker:
+    """Короткий доступ к общей статистике хеджирования."""
+    return HedgeTracker.get_instance()
+
+
+def pick_backup_model(primary: str, models: Optional[Dict[str, Dict]]) -> Optional[Dict]:
+    """Первая модель из LLM_HEDGE_BACKUPS, отличная от основной."""
+    if not models:
+        return None
+    for key in HEDGE_BACKUPS:
+        info = models.get(key)
+        if info and info["id"] != primary and key != primary:
+            return info
+    return None
+
+
+def _model_price(model_id: str, models: Optional[Dict[str, Dict]]) -> float:
+    for info in (models or {}).values():
+        if info.get("id") == model_id:
+            return float(info.get("price_input") or 0.0)
+    return 0.0
+
+
+async def timed_completion(client, params: Dict[str, Any], purpose: str = "completion",
+                           timeout: Optional[float] = None, dispatched: Optional[asyncio.Event] = None):
+    """
+    chat.completions.create в слоте планировщика с записью латентности,
+    finish_reason и токенов в телеметрию модели и стоимости в учёт прогона.
+
+    Латентность считается с получения слота: ожидание в очереди планировщика —
+    наша нагрузка, а не скорость модели, и не должно раздувать p90 хеджа и
+    оценки авто-роутера. dispatched выставляется, когда запрос получил слот.
+
+    Ошибки и таймауты (timeout — на сам запрос, без ожидания слота) отмечаются
+    в circuit breaker'е модели; при открытой цепи сразу CircuitOpenError.
+
+    В режиме кассеты ответ (или ошибка) пишется в неё; при воспроизведении
+    возвращается записанный ответ без сети, слота и телеметрии — учитывается
+    только стоимость.
+    """
+    model = params["model"]
+    cassette = get_cassette()
+    if cassette.replaying:
+        response = cassette.replay_completion(params)
+        get_cost_ledger().record_call(model, getattr(response, "usage", None), params.get("messages"))
+        return response
+    breakers = get_circuit_breakers()
+    breakers.acquire(model)
+    started: Optional[float] = None
+    finish_reason = "error"
+    usage = None
+    try:
+        async with get_scheduler().slot(llm_resource(model)):
+            started = time.monotonic()
+            if dispatched is not None:
+                dispatched.set()
+            response = await asyncio.wait_for(client.chat.completions.create(**params), timeout=timeout)
+        choices = getattr(response, "choices", None)
+        finish_reason = (getattr(choices[0], "finish_reason", None) if choices else None) or "empty"
+        usage = getattr(response, "usage", None)
+        get_hedge_stats().record_latency(model, time.monotonic() - started)
+        breakers.record_success(model)
+        get_cost_ledger().record_call(model, usage, params.get("messages"))
+        cassette.record_completion(params, response)
+        return response
+    except asyncio.CancelledError:
+        finish_reason = "cancelled"
+        breakers.release(model)
+        raise
+    except asyncio.TimeoutError as exc:
+        finish_reason = "timeout"
+        breakers.record_failure(model)
+        cassette.record_completion(params, error=exc)
+        raise
+    except Exception as exc:
+        breakers.record_failure(model)
+        cassette.record_completion(params, error=exc)
+        raise
+    finally:
+        # Запрос, отменённый ещё в очереди, модель не видела — латентность 0
+        latency = time.monotonic() - started if started is not None else 0.0
+        get_model_telemetry().record_call(
+            model, purpose, latency, finish_reason,
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None),
+        )
+
+
+async def hedged_completion(client, api_params: Dict[str, Any], timeout: float,
+                            models: Optional[Dict[str, Dict]] = None,
+                            validate: Callable[[Any], bool] = is_valid_completion,
+                            purpose: str = "completion"):
+    """
+    chat.completions.create с хеджированием.
+
+    Без LLM_HEDGING или без резервной модели — обычный timed_completion с
+    timeout. asyncio.TimeoutError поднимается так же, как раньше.
+    """
+    primary_model = api_params["model"]
+    backup = pick_backup_model(primary_model, models) if HEDGING_ENABLED and not get_cassette().active else None
+    tracker = get_hedge_stats()
+    if backup is None:
+        response = await timed_completion(client, api_params, purpose, timeout=timeout)
+        tracker.record_call(primary_model)
+        return response
+
+    async def _race():
+        dispatched = asyncio.Event()
+        primary = asyncio.create_task(timed_completion(client, api_params, purpose, dispatched=dispatched))
+        tasks = {primary}
+        try:
+            # Задержка хеджа отсчитывается с получения слота, а не с постановки в очередь планировщика
+            slot_wait = asyncio.create_task(dispatched.wait())
+            try:
+                await asyncio.wait({primary, slot_wait}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                slot_wait.cancel()
+            done, _ = await asyncio.wait({primary}, timeout=tracker.hedge_delay(primary_model))
+            if done and primary.exception() is None and validate(primary.result()):
+                tracker.record_call(primary_model)
+                return primary.result()
+
+            backup_params = dict(api_params, model=backup["id"])
+            print(f"   🪂 Хедж: {primary_model} не дала валидный ответ за p90, дублируем запрос в {backup['id']}")
+            tasks.add(asyncio.create_task(timed_completion(client, backup_params, purpose)))
+            first_result = primary.result() if done and primary.exception() is None else None
+            pending = tasks - done
+            while pending:
+                done_now, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done_now:
+                    if task.exception() is not None:
+                        continue
+                    result = task.result()
+                    if first_result is None:
+                        first_result = result
+                    if validate(result):
+                        backup_won = task is not primary
+                        extra_tokens = estimate_messages_tokens(api_params["messages"])
+                        # Проигравший запрос всё равно оплачивается как минимум входными токенами
+                        loser = primary_model if backup_won else backup["id"]
+                        tracker.record_call(
+                            primary_model, hedged=True, backup_won=backup_won,
+                            extra_prompt_tokens=extra_tokens,
+                            extra_cost_usd=extra_tokens * _model_price(loser, models) / 1_000_000,
+                        )
+                        if backup_won:
+                            print(f"   🪂 Хедж: ответ взят у {backup['id']}")
+                        return result
+            tracker.record_call(primary_model, hedged=True)
+            if first_result is not None:
+                return first_result
+            # Оба запроса упали — отдаём исключение основной модели
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    try:
+        return await asyncio.wait_for(_race(), timeout=timeout)
+    except asyncio.TimeoutError:
+        # Отменённые по таймауту запросы не отмечаются сами — считаем таймаут основной модели
+        get_circuit_breakers().record_failure(primary_model)
+        raise
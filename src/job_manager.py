@@ -0,0 +1,357 @@
+"""
+@file: job_manager.py
+@description: Реестр задач (генерация, проверка уникальности, публикация) —
+              отмена и пауза через asyncio.Event, счётчики прогресса и ETA по реальной скорости
+@dependencies: asyncio, dataclasses, src.cost_accounting
+@created: 2026-10-18
+
+В FSM хранится только job_id, а флаги остановки/паузы и прогресс живут в Job.
+Раньше цикл публикации на каждом посте делал state.get_data() (копия всего
+словаря FSM вместе с generated_posts) только чтобы прочитать stop_publishing.
+
+Задачи, созданные с chat_id и context, чекпоинтятся в src.checkpoint_store:
+готовые посты и опубликованные message_id переживают рестарт бота.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from src.cost_accounting import RunCost, bind_run_cost
+from src.scheduler import set_work_context, PRIORITY_BULK, PRIORITY_NORMAL
+
+
+class JobCancelled(Exception):
+    """Задача остановлена пользователем"""
+
+
+# Статусы задачи
+JOB_RUNNING = "running"
+JOB_PAUSED = "paused"
+JOB_CANCELLED = "cancelled"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+
+# Окно для оценки скорости (последние N завершённых элементов)
+THROUGHPUT_WINDOW = 20
+
+# Сколько хранить завершённые задачи в памяти (сек)
+FINISHED_JOB_TTL = 3600
+
+# Приоритет задачи в общем планировщике (src.scheduler)
+KIND_PRIORITY = {
+    "generation": PRIORITY_BULK,
+    "publishing": PRIORITY_BULK,
+    "uniqueness": PRIORITY_NORMAL,
+}
+
+
+@dataclass
+class Job:
+    """Одна задача пользователя (один прогон генерации/проверки/публикации)"""
+    job_id: str
+    user_id: int
+    kind: str  # generation / uniqueness / publishing
+    scenario: str = ""  # ru / es / it / fr / image
+    total: int = 0
+    done: int = 0
+    errors: int = 0
+    status: str = JOB_RUNNING
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    cost: RunCost = field(default_factory=RunCost)  # Токены и $ всех вызовов LLM задачи
+    # Индексы элементов исходной задачи, если возобновлённый прогон делает только их часть:
+    # save_item(k) сохраняет элемент под item_indices[k]
+    item_indices: Optional[List[int]] = None
+
+    def __post_init__(self):
+        self._cancel_event = asyncio.Event()
+        self._resume_event = asyncio.Event()
+        self._resume_event.set()  # set = задача не на паузе
+        self._started_mono = time.monotonic()
+        self._paused_at: Optional[float] = None
+        self._paused_total = 0.0
+        self._marks: Deque[float] = deque(maxlen=THROUGHPUT_WINDOW)
+        self._store = None  # CheckpointStore, если задача чекпоинтится
+
+    # ─────────────────────────────────────────────────────────────
+    # Чекпоинты
+    # ─────────────────────────────────────────────────────────────
+
+    @property
+    def persistent(self) -> bool:
+        return self._store is not None
+
+    def save_item(self, idx: int, payload: Any):
+        """Чекпоинт готового элемента (сгенерированного поста: dict или dataclass)."""
+        if self._store is not None:
+            if self.item_indices is not None and 0 <= idx < len(self.item_indices):
+                idx = self.item_indices[idx]
+            try:
+                if dataclasses.is_dataclass(payload):
+                    payload = dataclasses.asdict(payload)
+                self._store.save_item(self.job_id, idx, payload)
+            except Exception as e:
+                print(f"⚠️ Не удалось сохранить чекпоинт {self.job_id}#{idx}: {e}")
+
+    def update_context(self, **values: Any):
+        """Дополняет сохранённый context задачи тем, что стало известно после старта (пулы описаний бонусов)."""
+        if self._store is not None:
+            try:
+                self._store.update_context(self.job_id, values)
+            except Exception as e:
+                print(f"⚠️ Не удалось обновить контекст чекпоинта {self.job_id}: {e}")
+
+    def mark_published(self, idx: int, message_id: Optional[int]):
+        """Чекпоинт опубликованного поста."""
+        if self._store is not None:
+            try:
+                self._store.mark_published(self.job_id, idx, message_id)
+            except Exception as e:
+                print(f"⚠️ Не удалось сохранить чекпоинт публикации {self.job_id}#{idx}: {e}")
+
+    # ─────────────────────────────────────────────────────────────
+    # Управление
+    # ─────────────────────────────────────────────────────────────
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume_event.is_set()
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JOB_RUNNING, JOB_PAUSED)
+
+    def cancel(self):
+        """Запрос остановки. Будит задачу, если она стоит на паузе."""
+        if not self.is_active:
+            return
+        self._cancel_event.set()
+        self._resume_event.set()
+        self._close_pause()
+        self.status = JOB_CANCELLED
+
+    def pause(self):
+        if self.status != JOB_RUNNING:
+            return
+        self._resume_event.clear()
+        self._paused_at = time.monotonic()
+        self.status = JOB_PAUSED
+
+    def resume(self):
+        if self.status != JOB_PAUSED:
+            return
+        self._close_pause()
+        self._resume_event.set()
+        self.status = JOB_RUNNING
+
+    def _close_pause(self):
+        if self._paused_at is not None:
+            self._paused_total += time.monotonic() - self._paused_at
+            self._paused_at = None
+
+    async def wait_if_paused(self):
+        """Блокирует, пока задача на паузе. Бросает JobCancelled после остановки."""
+        if self.paused:
+            await self._resume_event.wait()
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+
+    async def checkpoint(self):
+        """Точка проверки между элементами: пауза + остановка. Возвращает False если остановлено."""
+        try:
+            await self.wait_if_paused()
+        except JobCancelled:
+            return False
+        return True
+
+    async def sleep(self, seconds: float) -> bool:
+        """Пауза между элементами, прерываемая остановкой. Возвращает False если остановлено."""
+        try:
+            await asyncio.wait_for(self._cancel_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def run_cancellable(self, coro):
+        """Выполняет корутину, отменяя её по кнопке «Стоп». Бросает JobCancelled."""
+        task = asyncio.ensure_future(coro)
+        stop_waiter = asyncio.ensure_future(self._cancel_event.wait())
+        try:
+            await asyncio.wait({task, stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_waiter.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        raise JobCancelled(self.job_id)
+
+    # ─────────────────────────────────────────────────────────────
+    # Прогресс и ETA
+    # ─────────────────────────────────────────────────────────────
+
+    def advance(self, count: int = 1, error: bool = False):
+        """Отмечает обработанные элементы (успешные или с ошибкой)."""
+        if error:
+            self.errors += count
+        else:
+            self.done += count
+        now = self._active_time()
+        for _ in range(count):
+            self._marks.append(now)
+
+    @property
+    def processed(self) -> int:
+        return self.done + self.errors
+
+    def _active_time(self) -> float:
+        """Время работы задачи без учёта пауз (сек)."""
+        paused = self._paused_total
+        if self._paused_at is not None:
+            paused += time.monotonic() - self._paused_at
+        return time.monotonic() - self._started_mono - paused
+
+    def throughput(self) -> float:
+        """Элементов в секунду: по скользящему окну, иначе по всему времени работы."""
+        if len(self._marks) >= 2 and self._marks[-1] > self._marks[0]:
+            return (len(self._marks) - 1) / (self._marks[-1] - self._marks[0])
+        elapsed = self._active_time()
+        if self.processed and elapsed > 0:
+            return self.processed / elapsed
+        return 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        remaining = max(self.total - self.processed, 0)
+        if remaining == 0:
+            return 0.0
+        rate = self.throughput()
+        if rate <= 0:
+            return None
+        return remaining / rate
+
+    def format_eta(self) -> str:
+        eta = self.eta_seconds()
+        if eta is None:
+            return "оценивается..."
+        eta = int(eta)
+        if eta >= 3600:
+            return f"~{eta // 3600} ч {eta % 3600 // 60} мин"
+        if eta >= 60:
+            return f"~{eta // 60} мин {eta % 60} сек"
+        return f"~{eta} сек"
+
+    def progress_bar(self, width: int = 20) -> str:
+        if not self.total:
+            return ''
+        filled = min(self.processed * width // self.total, width)
+        return '█' * filled + '░' * (width - filled)
+
+    def progress_line(self) -> str:
+        """Строка «12/80 (15%) • ETA ~3 мин 20 сек» для статусных сообщений."""
+        pct = self.processed * 100 // self.total if self.total else 0
+        line = f"{self.processed}/{self.total} ({pct}%) • ETA {self.format_eta()}"
+        if self.paused:
+            line += " • ⏸ пауза"
+        return line
+
+
+class JobRegistry:
+    """Процессный реестр задач (singleton), общий для всех языковых сценариев."""
+
+    _instance: Optional["JobRegistry"] = None
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+
+    @classmethod
+    def get_instance(cls) -> "JobRegistry":
+        if cls._instance is None:
+            cls._instance = JobRegistry()
+        return cls._instance
+
+    def create(self, user_id: int, kind: str, total: int = 0, scenario: str = "",
+               chat_id: Optional[int] = None, context: Optional[Dict[str, Any]] = None,
+               job_id: Optional[str] = None) -> Job:
+        """
+        Создаёт задачу. Предыдущая активная задача того же типа у пользователя останавливается.
+
+        Если переданы chat_id и context — задача чекпоинтится и после рестарта
+        её можно возобновить (context должен содержать всё нужное для продолжения).
+        job_id передаётся только при возобновлении сохранённой задачи.
+        """
+        self._prune()
+        for old in self.active_for_user(user_id, kind):
+            old.cancel()
+        # Вызовы LLM/Telegram из этой задачи идут в общий планировщик от имени пользователя
+        set_work_context(user_id, KIND_PRIORITY.get(kind, PRIORITY_NORMAL))
+        job = Job(
+            job_id=job_id or uuid.uuid4().hex[:12],
+            user_id=user_id,
+            kind=kind,
+            scenario=scenario,
+            total=total,
+        )
+        if chat_id is not None and context is not None:
+            try:
+                from src.checkpoint_store import get_checkpoint_store
+                store = get_checkpoint_store()
+                if job_id is None:
+                    store.open_job(job.job_id, user_id, chat_id, kind, scenario, total, context)
+                else:
+                    store.set_status(job.job_id, JOB_RUNNING)
+                job._store = store
+            except Exception as e:
+                print(f"⚠️ Чекпоинты недоступны для задачи {job.job_id}: {e}")
+        # Учёт стоимости вызовов LLM этой задачи — в job.cost
+        job.cost.job_id, job.cost.user_id = job.job_id, user_id
+        bind_run_cost(job.cost)
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        if not job_id:
+            return None
+        return self._jobs.get(job_id)
+
+    def active_for_user(self, user_id: int, kind: Optional[str] = None) -> List[Job]:
+        return [
+            j for j in self._jobs.values()
+            if j.user_id == user_id and j.is_active and (kind is None or j.kind == kind)
+        ]
+
+    def finish(self, job: Job, status: str = JOB_FINISHED):
+        """Закрывает задачу. Остановленная задача сохраняет статус cancelled."""
+        if job.status != JOB_CANCELLED:
+            job.status = status
+        job._close_pause()
+        job._resume_event.set()
+        job.finished_at = time.time()
+        if job._store is not None:
+            try:
+                job._store.set_status(job.job_id, job.status)
+            except Exception as e:
+                print(f"⚠️ Не удалось закрыть чекпоинт задачи {job.job_id}: {e}")
+
+    def _prune(self):
+        now = time.time()
+        stale = [
+            job_id for job_id, j in self._jobs.items()
+            if j.finished_at and now - j.finished_at > FINISHED_JOB_TTL
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+
+def get_job_registry() -> JobRegistry:
+    """Короткий доступ к общему реестру задач."""
+    return JobRegistry.get_instance()
@@ -0,0 +1,180 @@
+"""
+@file: langpack.py
+@description: Языковые пакеты — промпты и текстовые таблицы генераторов в версионируемых
+              файлах src/langpacks/<lang>.json с компактной скомпилированной формой под mmap
+@dependencies: json, mmap, hashlib
+@created: 2026-10-19
+
+Раньше каждый AIPostGenerator (RU/ES/IT/FR) держал тысячи строк промптов прямо в
+коде класса, и любой процесс платил за разбор всех языков. Теперь таблицы лежат
+в src/langpacks/<lang>.json, а в классе остаются поля-дескрипторы PackField:
+пакет читается только при первом обращении к полю.
+
+При первой загрузке пакет компилируется в data/langpacks/<lang>-<hash>.lpk:
+
+    b"LPK1" | u32 длина заголовка | заголовок JSON | значения полей (UTF-8 JSON подряд)
+
+Заголовок хранит смещение и длину каждого поля. Файл открывается через mmap, и
+поле декодируется только когда к нему обратились. Имя файла содержит хэш
+содержимого исходного пакета, поэтому правка JSON просто даёт новый файл.
+Хэш (LanguagePack.content_hash) годится как ключ кешей, зависящих от промптов.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+PACKS_DIR = Path(__file__).parent / "langpacks"
+COMPILED_DIR = Path(__file__).parent.parent / "data" / "langpacks"
+
+_MAGIC = b"LPK1"
+_HEADER_LEN = struct.Struct("<I")
+
+
+class LanguagePackError(Exception):
+    """Пакет не найден или повреждён"""
+
+
+class LanguagePack:
+    """Один скомпилированный языковой пакет, поля декодируются лениво."""
+
+    def __init__(self, lang: str, path: Path):
+        self.lang = lang
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != _MAGIC:
+            raise LanguagePackError(f"{path}: неверная сигнатура")
+        (header_len,) = _HEADER_LEN.unpack_from(self._mm, 4)
+        self._data_start = 4 + _HEADER_LEN.size + header_len
+        header = json.loads(self._mm[4 + _HEADER_LEN.size:self._data_start].decode("utf-8"))
+        self.version: str = header["version"]
+        self.content_hash: str = header["hash"]
+        self._int_keys = set(header.get("int_keys", ()))
+        self._index: Dict[str, Tuple[int, int]] = {k: tuple(v) for k, v in header["fields"].items()}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def fields(self):
+        return list(self._index)
+
+    def get(self, name: str) -> Any:
+        """Значение поля (декодируется при первом обращении)."""
+        if name in self._values:
+            return self._values[name]
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+            if name not in self._index:
+                raise LanguagePackError(f"В пакете {self.lang} нет поля {name}")
+            offset, length = self._index[name]
+            start = self._data_start + offset
+            value = json.loads(self._mm[start:start + length].decode("utf-8"))
+            if name in self._int_keys:
+                value = {int(k): v for k, v in value.items()}
+            self._values[name] = value
+            return value
+
+
+def _source_path(lang: str) -> Path:
+    return PACKS_DIR / f"{lang}.json"
+
+
+def compile_pack(lang: str, source: Optional[Path] = None, out_dir: Path = COMPILED_DIR) -> Path:
+    """Компилирует JSON-пакет в .lpk (если файла с таким хэшем ещё нет)."""
+    source = source or _source_path(lang)
+    raw = source.read_bytes()
+    content_hash = hashlib.sha256(raw).hexdigest()
+    target = out_dir / f"{lang}-{content_hash[:16]}.lpk"
+    if target.exists():
+        return target
+
+    pack = json.loads(raw.decode("utf-8"))
+    blobs = []
+    index = {}
+    offset = 0
+    for name, value in pack["fields"].items():
+        blob = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        index[name] = [offset, len(blob)]
+        offset += len(blob)
+        blobs.append(blob)
+    header = json.dumps({
+        "lang": pack.get("lang", lang),
+        "version": pack["version"],
+        "hash": content_hash,
+        "int_keys": pack.get("int_keys", []),
+        "fields": index,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, target)
+    # Старые скомпилированные версии этого языка больше не нужны
+    for old in out_dir.glob(f"{lang}-*.lpk"):
+        if old != target:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    return target
+
+
+_packs: Dict[str, LanguagePack] = {}
+_packs_lock = threading.Lock()
+
+
+def get_language_pack(lang: str) -> LanguagePack:
+    """Пакет языка (компилируется и открывается при первом обращении)."""
+    pack = _packs.get(lang)
+    if pack is not None:
+        return pack
+    with _packs_lock:
+        pack = _packs.get(lang)
+        if pack is None:
+            if not _source_path(lang).exists():
+                raise LanguagePackError(f"Нет языкового пакета {lang}: {_source_path(lang)}")
+            pack = LanguagePack(lang, compile_pack(lang))
+            _packs[lang] = pack
+            print(f"📦 Языковой пакет {lang} v{pack.version} ({pack.content_hash[:12]})")
+    return pack
+
+
+class PackField:
+    """
+    Поле класса, значение которого лежит в языковом пакете.
+
+    Пример: SYSTEM_PROMPT = PackField("ru") — значение берётся из поля
+    SYSTEM_PROMPT пакета src/langpacks/ru.json при первом обращении и
+    затем кешируется на классе как обычный атрибут.
+    """
+
+    def __init__(self, lang: str, name: Optional[str] = None):
+        self.lang = lang
+        self.name = name
+
+    def __set_name__(self, owner, name):
+        if self.name is None:
+            self.name = name
+        self._attr = name
+        self._owner = owner
+
+    def __get__(self, obj, owner=None):
+        value = get_language_pack(self.lang).get(self.name)
+        setattr(self._owner, self._attr, value)
+        return value
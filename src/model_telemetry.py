@@ -0,0 +1,206 @@
+"""
+@file: model_telemetry.py
+@description: Телеметрия моделей (латентность, finish_reason, токены, причины отбраковки, регены)
+              в локальном SQLite со скользящим окном и автоматический выбор модели по ней
+@dependencies: sqlite3
+@created: 2026-10-19
+
+Меню моделей в хендлерах и UNIQUENESS_CHECK_MODELS — статические списки, и
+оператор угадывает, какая модель сегодня быстрая и надёжная. Теперь:
+
+- каждый вызов LLM пишет строку в llm_calls: модель, назначение, латентность,
+  finish_reason, токены входа/выхода;
+- каждая проверка текста поста пишет строку в post_outcomes: принят ли пост,
+  причина отбраковки, номер регена и сколько секунд ушло на эту попытку.
+
+Хранятся последние TELEMETRY_RETENTION_HOURS часов (data/telemetry.db).
+
+Ротация «🤖 Авто» отдаёт каждый пост модели с лучшим числом принятых постов
+в секунду за последние AUTO_ROUTER_WINDOW_HOURS часов среди моделей не дороже
+AUTO_ROUTER_MAX_PRICE ($ за 1M выходных токенов). Модели без статистики
+получают оптимистичную оценку, чтобы их тоже попробовать.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "telemetry.db"
+
+TELEMETRY_RETENTION_HOURS = float(os.getenv("TELEMETRY_RETENTION_HOURS", "72"))
+AUTO_ROUTER_WINDOW_HOURS = float(os.getenv("AUTO_ROUTER_WINDOW_HOURS", "6"))
+AUTO_ROUTER_MAX_PRICE = float(os.getenv("AUTO_ROUTER_MAX_PRICE", "8"))
+AUTO_ROUTER_EXPLORE = float(os.getenv("AUTO_ROUTER_EXPLORE", "0.1"))
+
+# Априорная оценка для моделей без истории: 1 принятый пост за столько секунд
+PRIOR_SECONDS = 30.0
+
+# Чистка старых строк — не чаще раза в столько секунд
+_PRUNE_EVERY = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_calls (
+    ts                 REAL NOT NULL,
+    model              TEXT NOT NULL,
+    purpose            TEXT NOT NULL,
+    latency            REAL NOT NULL,
+    finish_reason      TEXT NOT NULL DEFAULT '',
+    prompt_tokens      INTEGER,
+    completion_tokens  INTEGER
+);
+CREATE TABLE IF NOT EXISTS post_outcomes (
+    ts             REAL NOT NULL,
+    model          TEXT NOT NULL,
+    accepted       INTEGER NOT NULL,
+    reject_reason  TEXT NOT NULL DEFAULT '',
+    regen          INTEGER NOT NULL DEFAULT 0,
+    seconds        REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS llm_calls_model_ts ON llm_calls(model, ts);
+CREATE INDEX IF NOT EXISTS post_outcomes_model_ts ON post_outcomes(model, ts);
+"""
+
+
+@dataclass
+class ModelStats:
+    """Сводка по модели за окно"""
+    model: str
+    calls: int = 0
+    errors: int = 0
+    avg_latency: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    avg_regen: float = 0.0
+    reject_reasons: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def acceptance_per_second(self) -> float:
+        """Принятых постов в секунду (с априорной оценкой для малой выборки)."""
+        return (self.accepted + 1) / (self.seconds + PRIOR_SECONDS)
+
+
+class ModelTelemetry:
+    """Скользящая телеметрия моделей в локальном SQLite (singleton)."""
+
+    _instance: Optional["ModelTelemetry"] = None
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._last_prune = 0.0
+
+    @classmethod
+    def get_instance(cls) -> "ModelTelemetry":
+        if cls._instance is None:
+            cls._instance = ModelTelemetry()
+        return cls._instance
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    # ─────────────────────────────────────────────────────────────
+    # Запись
+    # ─────────────────────────────────────────────────────────────
+
+    def record_call(self, model: str, purpose: str, latency: float, finish_reason: Optional[str] = None,
+                    prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None):
+        """Один вызов LLM (finish_reason «error»/«timeout»/«cancelled» — вызов без ответа)."""
+        self._execute(
+            "INSERT INTO llm_calls (ts, model, purpose, latency, finish_reason, prompt_tokens, completion_tokens) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (time.time(), model, purpose, latency, finish_reason or "", prompt_tokens, completion_tokens)
+        )
+        self._maybe_prune()
+
+    def record_outcome(self, model: str, accepted: bool, reject_reason: str = "",
+                       regen: int = 0, seconds: float = 0.0):
+        """Результат проверки текста поста: принят или причина отбраковки."""
+        self._execute(
+            "INSERT INTO post_outcomes (ts, model, accepted, reject_reason, regen, seconds) VALUES (?, ?, ?, ?, ?, ?)",
+            (time.time(), model, int(accepted), reject_reason or "", regen, seconds)
+        )
+
+    def _maybe_prune(self):
+        now = time.time()
+        if now - self._last_prune < _PRUNE_EVERY:
+            return
+        self._last_prune = now
+        cutoff = now - TELEMETRY_RETENTION_HOURS * 3600
+        self._execute("DELETE FROM llm_calls WHERE ts < ?", (cutoff,))
+        self._execute("DELETE FROM post_outcomes WHERE ts < ?", (cutoff,))
+
+    # ─────────────────────────────────────────────────────────────
+    # Чтение
+    # ─────────────────────────────────────────────────────────────
+
+    def model_stats(self, window_hours: float = AUTO_ROUTER_WINDOW_HOURS,
+                    since: Optional[float] = None) -> Dict[str, ModelStats]:
+        """Сводка по моделям за последние window_hours часов или, если задан since, начиная с этого time.time()."""
+        if since is None:
+            since = time.time() - window_hours * 3600
+        stats: Dict[str, ModelStats] = {}
+        for model, calls, errors, latency, p_tok, c_tok in self._execute(
+            "SELECT model, COUNT(*), SUM(finish_reason IN ('error', 'timeout', 'cancelled')), AVG(latency), "
+            "SUM(prompt_tokens), SUM(completion_tokens) FROM llm_calls WHERE ts >= ? GROUP BY model",
+            (since,)
+        ).fetchall():
+            stats[model] = ModelStats(model=model, calls=calls, errors=errors or 0, avg_latency=latency or 0.0,
+                                      prompt_tokens=p_tok or 0, completion_tokens=c_tok or 0)
+        for model, accepted, total, seconds, regen in self._execute(
+            "SELECT model, SUM(accepted), COUNT(*), SUM(seconds), AVG(CASE WHEN accepted THEN regen END) "
+            "FROM post_outcomes WHERE ts >= ? GROUP BY model",
+            (since,)
+        ).fetchall():
+            s = stats.setdefault(model, ModelStats(model=model))
+            s.accepted, s.rejected = accepted or 0, total - (accepted or 0)
+            s.seconds, s.avg_regen = seconds or 0.0, regen or 0.0
+        for model, reason, count in self._execute(
+            "SELECT model, reject_reason, COUNT(*) FROM post_outcomes "
+            "WHERE ts >= ? AND accepted = 0 GROUP BY model, reject_reason",
+            (since,)
+        ).fetchall():
+            stats.setdefault(model, ModelStats(model=model)).reject_reasons[reason] = count
+        return stats
+
+
+def get_model_telemetry() -> ModelTelemetry:
+    """Короткий доступ к общей телеметрии моделей."""
+    return ModelTelemetry.get_instance()
+
+
+def pick_auto_model(candidates: Sequence[Tuple[str, str, str]], models: Dict[str, Dict],
+                    max_price: float = AUTO_ROUTER_MAX_PRICE) -> Tuple[str, str, str]:
+    """
+    Выбор модели для следующего поста из кандидатов ротации (key, provider, name):
+    максимум принятых постов в секунду среди моделей не дороже max_price.
+    """
+    eligible: List[Tuple[str, str, str]] = [
+        c for c in candidates
+        if c[0] in models and float(models[c[0]].get("price_output") or 0) <= max_price
+    ] or list(candidates)
+    if AUTO_ROUTER_EXPLORE and random.random() < AUTO_ROUTER_EXPLORE:
+        return random.choice(eligible)
+    stats = get_model_telemetry().model_stats()
+
+    def score(candidate):
+        model_id = models.get(candidate[0], {}).get("id", candidate[0])
+        s = stats.get(model_id)
+        return s.acceptance_per_second if s else 1 / PRIOR_SECONDS
+
+    return max(eligible, key=score)
@@ -0,0 +1,224 @@
+"""
+@file: morphology.py
+@description: Общая морфология RU/ES/IT/FR — стемминг, стоп-слова, склонение ников, согласование рода (с LRU-кэшами)
+@dependencies: re, functools
+@created: 2026-10-19
+
+Раньше морфология была разбросана по генераторам: суффиксный стеммер внутри
+_is_too_similar_to_pool, четыре копии _decline_nickname, _fix_gender_agreement
+с компиляцией 30 регулярок на каждый пост. Ничего не кэшировалось, и одни и те
+же слова стеммились тысячи раз за батч (пул описаний, фоллбек-вариации).
+
+- stem(word, lang) — суффиксный стеммер языка, LRU на MORPH_CACHE_SIZE слов;
+  для RU — прежний стеммер пула (латиница проходит без изменений);
+- content_stems(text, lang) — стемы контентных слов без стоп-слов, LRU по тексту
+  (фоллбек-вариации описаний бонусов повторяются);
+- decline_nickname(nickname, case) — склонение ника стримера (RU), LRU;
+- agree_gender(text) — «двадцатка вырос» → «двадцатка выросла»: правила
+  скомпилированы один раз, текст без женских существительных не сканируется.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
+
+# Размер кэша стемов (слов) и кэша разбора текстов
+MORPH_CACHE_SIZE = int(os.getenv("MORPH_CACHE_SIZE", "50000"))
+MORPH_TEXT_CACHE_SIZE = int(os.getenv("MORPH_TEXT_CACHE_SIZE", "4096"))
+
+LANGS = ("ru", "es", "it", "fr")
+
+# ─────────────────────────────────────────────────────────────
+# Стоп-слова
+# ─────────────────────────────────────────────────────────────
+
+STOP_WORDS: Dict[str, FrozenSet[str]] = {
+    "ru": frozenset({
+        'и', 'в', 'на', 'с', 'к', 'по', 'для', 'от', 'из', 'а', 'но', 'не',
+        'что', 'это', 'как', 'до', 'за', 'или', 'ещё', 'еще', 'уже', 'тоже',
+        'при', 'ты', 'вы', 'мы', 'он', 'она', 'они', 'все', 'свой', 'своё',
+        'бонус', 'бонуса', 'бонусом', 'бонуску', 'бонуска',
+        'процент', 'процентов', 'процентный', 'столько',
+    }),
+    "es": frozenset({'bono', 'gratis', 'del', 'con', 'por', 'para'}),
+    "it": frozenset({'giri', 'gratuiti', 'gratis', 'del', 'con'}),
+    "fr": frozenset({'bonus', 'tours', 'gratuits', 'les', 'des', 'une'}),
+    "en": frozenset({'bonus', 'the', 'and', 'for', 'with'}),
+}
+
+# Описания бонусов смешивают языки (английские «bonus», «free spins») — пул отсеивает все сразу
+POOL_STOP_WORDS: FrozenSet[str] = frozenset().union(*STOP_WORDS.values())
+
+# ─────────────────────────────────────────────────────────────
+# Стемминг
+# ─────────────────────────────────────────────────────────────
+
+# Окончания в порядке проверки: первое подходящее отрезается, если остаётся хотя бы 3 буквы
+_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "ru": (
+        'ений', 'ного', 'ному', 'ными', 'ения', 'ению',
+        'ами', 'ому', 'ого', 'ной', 'ную', 'ным', 'ных', 'ное',
+        'ить', 'ать', 'ять', 'ешь', 'ете',
+        'ов', 'ей', 'ам', 'ом', 'ем', 'ую', 'ый', 'ий', 'ой',
+        'ые', 'ие', 'ая', 'яя', 'ых', 'их',
+        'а', 'о', 'у', 'е', 'ы', 'и', 'я', 'ь', 'й',
+    ),
+    "es": (
+        'amientos', 'amiento', 'aciones', 'ación', 'mente', 'idades', 'idad',
+        'ables', 'able', 'istas', 'ista', 'osos', 'osas', 'oso', 'osa',
+        'es', 'os', 'as', 's', 'o', 'a', 'e',
+    ),
+    "it": (
+        'amenti', 'amento', 'azioni', 'azione', 'mente', 'ità',
+        'abili', 'abile', 'osi', 'ose', 'oso', 'osa',
+        'i', 'e', 'o', 'a',
+    ),
+    "fr": (
+        'issements', 'issement', 'ements', 'ement', 'ations', 'ation',
+        'euses', 'euse', 'ités', 'ité', 'ives', 'ive', 'eaux', 'eux',
+        'ées', 'ée', 'és', 'é', 'es', 'e', 's', 'x',
+    ),
+}
+
+_WORD_RE = re.compile(r'[а-яёa-zéèêëàâäùûüôöîïçñ]{3,}')
+
+# Для es/it/fr слово — любые буквы: в общем классе нет á í ó ú ì ò, и слова рвались на акцентах
+_LATIN_WORD_RE = re.compile(r'[^\W\d_]{3,}')
+_WORD_RES = {"es": _LATIN_WORD_RE, "it": _LATIN_WORD_RE, "fr": _LATIN_WORD_RE}
+
+
+@lru_cache(maxsize=MORPH_CACHE_SIZE)
+def stem(word: str, lang: str = "ru") -> str:
+    """Грубый суффиксный стемминг слова в нижнем регистре."""
+    for suffix in _SUFFIXES.get(lang, _SUFFIXES["ru"]):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=MORPH_TEXT_CACHE_SIZE)
+def content_stems(text: str, lang: str = "ru") -> Tuple[str, ...]:
+    """Стемы контентных слов текста (от 3 букв, без стоп-слов) в порядке появления."""
+    words = _WORD_RES.get(lang, _WORD_RE).findall(text.lower())
+    return tuple(stem(w, lang) for w in words if w not in POOL_STOP_WORDS)
+
+
+# ─────────────────────────────────────────────────────────────
+# Склонение ников
+# ─────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=MORPH_TEXT_CACHE_SIZE)
+def decline_nickname(nickname: str, case: str = "genitive") -> str:
+    """
+    Склоняет ник стримера для русского языка.
+
+    Args:
+        nickname: Оригинальный ник (например: Manik, Buratino)
+        case: Падеж - "genitive" (родительный - у кого?), "dative" (дательный - кому?)
+
+    Returns:
+        Склоненный ник с сохранением заглавной буквы
+    """
+    if not nickname:
+        return nickname
+
+    # Сохраняем оригинальную капитализацию первой буквы
+    first_char_upper = nickname[0].isupper()
+    nick_lower = nickname.lower()
+
+    # Правила склонения для распространенных окончаний
+    if case == "genitive":  # у кого? - Manika, Buratina
+        if nick_lower.endswith(('o', 'а', 'я')):
+            result = nickname + 'и'
+        elif nick_lower.endswith('й'):
+            result = nickname[:-1] + 'я'
+        elif nick_lower.endswith('ь'):
+            result = nickname[:-1] + 'я'
+        else:
+            result = nickname + 'а'
+
+    elif case == "dative":  # кому? - Maniku, Buratinu
+        if nick_lower.endswith(('o', 'а', 'я')):
+            result = nickname + 'е'
+        elif nick_lower.endswith('й'):
+            result = nickname[:-1] + 'ю'
+        elif nick_lower.endswith('ь'):
+            result = nickname[:-1] + 'ю'
+        else:
+            result = nickname + 'у'
+    else:
+        result = nickname
+
+    # Восстанавливаем капитализацию
+    if first_char_upper and result:
+        result = result[0].upper() + result[1:]
+
+    return result
+
+
+# ─────────────────────────────────────────────────────────────
+# Согласование рода (RU)
+# ─────────────────────────────────────────────────────────────
+
+_FEM_NOUNS = (
+    r'(?:двадцатк[аи]|пятёрк[аи]|пятерк[аи]|десятк[аи]|сотк[аи]|'
+    r'тысяч[аи]|соточк[аи]|пятёрочк[аи]|десяточк[аи]|двадцаточк[аи]|'
+    r'ставк[аи]|сумм[аы]|выплат[аы]|прибыль|удач[аи]|фортун[аы]|'
+    r'механик[аи]|полтинничек|монетк[аи]|копейк[аи])'
+)
+
+_VERB_MAP = {
+    'вырос': 'выросла', 'стал': 'стала',
+    'превратился': 'превратилась', 'оказался': 'оказалась',
+    'взлетел': 'взлетела', 'прилетел': 'прилетела',
+    'улетел': 'улетела', 'упал': 'упала',
+    'пришёл': 'пришла', 'пришел': 'пришла',
+    'попал': 'попала', 'сработал': 'сработала',
+    'принёс': 'принесла', 'принес': 'принесла',
+    'дал': 'дала', 'показал': 'показала',
+    'привёл': 'привела', 'привел': 'привела',
+    'решил': 'решила', 'помог': 'помогла',
+    'залетел': 'залетела', 'долетел': 'долетела',
+    'разогнался': 'разогналась', 'ушёл': 'ушла',
+    'ушел': 'ушла', 'пробил': 'пробила',
+    'разросся': 'разрослась', 'вернулся': 'вернулась',
+}
+
+# Правила применяются по очереди, как раньше: замена одного глагола видна следующим
+_AGREEMENT_RULES = [
+    (masc, fem, re.compile(rf'(\b{_FEM_NOUNS})((?:\s+\S+){{0,3}})\s+({masc})\b', re.IGNORECASE))
+    for masc, fem in _VERB_MAP.items()
+]
+_FEM_NOUN_RE = re.compile(rf'\b{_FEM_NOUNS}', re.IGNORECASE)
+
+
+def _match_case(orig: str, replacement: str) -> str:
+    if orig.isupper():
+        return replacement.upper()
+    if orig[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+def agree_gender(text: str) -> str:
+    """Исправляет род глаголов при женском роде подлежащего: 'двадцатка вырос' → 'двадцатка выросла'."""
+    if not _FEM_NOUN_RE.search(text):
+        return text
+    # Замены дают только женские формы, поэтому новых мужских глаголов в тексте не появляется.
+    # casefold, а не lower: IGNORECASE считает 'ᲀ' равной 'в', и lower() этого не видит
+    folded = text.casefold()
+    for masc, fem, pattern in _AGREEMENT_RULES:
+        if masc not in folded:
+            continue
+        text = pattern.sub(lambda m, f=fem: m.group(1) + m.group(2) + ' ' + _match_case(m.group(3), f), text)
+    return text
+
+
+def cache_info() -> Dict[str, object]:
+    """Статистика LRU-кэшей (для логов и бенчмарков)."""
+    return {
+        "stem": stem.cache_info(),
+        "content_stems": content_stems.cache_info(),
+        "decline_nickname": decline_nickname.cache_info(),
+    }
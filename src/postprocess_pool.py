@@ -0,0 +1,73 @@
+"""
+@file: postprocess_pool.py
+@description: Пул для синхронной постобработки текстов постов вне event loop aiogram
+@dependencies: asyncio, concurrent.futures
+@created: 2026-10-19
+
+Цепочка постобработки (_postprocess_text, _remove_template_phrases,
+_relocate_link_blocks, _reformat_link_blocks, _smart_trim_text ...) — это
+десятки регулярок на каждый пост. В event loop она задерживала нажатия кнопок
+всех операторов, пока шла пакетная генерация.
+
+Работа уходит в пул потоков, а не процессов: постобработка — это методы
+генератора, которые меняют его состояние (счётчик форматов ссылок, индексы
+пулов бонусов), и в другом процессе эти изменения потерялись бы.
+
+Backpressure: одновременно в пуле не больше POSTPROCESS_MAX_PENDING задач,
+остальные вызывающие ждут в asyncio, не занимая память очередью executor'а.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Потоков постобработки (регулярки в основном держат GIL, больше 4 смысла нет)
+POSTPROCESS_WORKERS = int(os.getenv("POSTPROCESS_WORKERS", "4"))
+
+# Сколько задач может одновременно стоять в пуле
+POSTPROCESS_MAX_PENDING = int(os.getenv("POSTPROCESS_MAX_PENDING", str(POSTPROCESS_WORKERS * 4)))
+
+
+class PostprocessPool:
+    """Пул постобработки (singleton) с ограничением числа задач в полёте."""
+
+    _instance: Optional["PostprocessPool"] = None
+
+    def __init__(self, workers: int = POSTPROCESS_WORKERS, max_pending: int = POSTPROCESS_MAX_PENDING):
+        self.workers = max(1, workers)
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="postprocess")
+        self._max_pending = max(1, max_pending)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def get_instance(cls) -> "PostprocessPool":
+        if cls._instance is None:
+            cls._instance = PostprocessPool()
+        return cls._instance
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Выполняет fn(*args, **kwargs) в пуле и возвращает результат."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_pending)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._threads, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False)
+
+
+def get_postprocess_pool() -> PostprocessPool:
+    """Короткий доступ к общему пулу постобработки."""
+    return PostprocessPool.get_instance()
+
+
+async def run_postprocess(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Запуск синхронной постобработки вне event loop."""
+    return await get_postprocess_pool().run(fn, *args, **kwargs)
@@ -0,0 +1,61 @@
+"""
+@file: prompt_cache.py
+@description: Раскладка промпта под кеширование префикса у провайдера (OpenAI, OpenRouter, Gemini)
+@dependencies: os
+@created: 2026-10-19
+
+Провайдеры кешируют только общий префикс запросов (OpenAI — от 1024 токенов,
+Gemini — неявный кеш). В generate_video_post префикс не совпадал ни разу:
+в системный промпт подставлялись слот, стример и валюта конкретного поста и
+три случайных примера из базы.
+
+В режиме PROMPT_CACHE_FRIENDLY=1:
+- системное сообщение = ротационный промпт + постоянная на сессию выборка
+  примеров стиля + данные, общие для всего прогона (ссылки, бонусы);
+- поля конкретного поста в системном промпте заменяются метками вида ⟦SLOT⟧,
+  а их значения уходят в начало пользовательского сообщения.
+
+Ротация из шести системных промптов остаётся: это шесть префиксов, каждый из
+которых переиспользуется каждым шестым запросом. Попадания в кеш видны в
+журнале токенов (src/token_budget.py) как «кеш N».
+"""
+
+import os
+from typing import Dict, Tuple
+
+CACHE_FRIENDLY_PROMPTS = os.getenv("PROMPT_CACHE_FRIENDLY", "0").strip().lower() in ("1", "true", "yes", "on")
+
+# Поля, которые меняются от поста к посту
+PER_POST_FIELDS = ("slot", "streamer", "bet", "win", "multiplier", "currency", "person")
+
+
+def post_marker(name: str) -> str:
+    return f"⟦{name.upper()}⟧"
+
+
+class _KeepMissing(dict):
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def split_cacheable_prompt(template: str, values: Dict[str, object], header: str) -> Tuple[str, str]:
+    """
+    Возвращает (системный промпт, блок данных поста).
+
+    Поля из PER_POST_FIELDS в шаблоне заменяются метками, остальные значения
+    (ссылки, бонусы) подставляются как обычно. Блок данных перечисляет только
+    метки, которые реально встречаются в шаблоне.
+    """
+    stable = {k: v for k, v in values.items() if k not in PER_POST_FIELDS}
+    per_post = {k: v for k, v in values.items() if k in PER_POST_FIELDS}
+    stable.update({k: post_marker(k) for k in per_post})
+    try:
+        system = template.format_map(_KeepMissing(stable))
+    except Exception:
+        # Тот же запасной путь, что и у safe_format в генераторах
+        return template, ""
+    lines = [f"{post_marker(k)} = {v}" for k, v in per_post.items() if "{" + k + "}" in template]
+    if not lines:
+        return system, ""
+    return system, f"{header}\n" + "\n".join(lines) + "\n\n"
+
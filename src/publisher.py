@@ -0,0 +1,248 @@
+"""
+@file: publisher.py
+@description: Общий цикл публикации постов в канал (Telethon / Bot API) с паузами,
+              FloodWait, управлением через Job и чекпоинтом каждого опубликованного поста
+@dependencies: asyncio, telethon, src.job_manager, src.scheduler
+@created: 2026-10-19
+
+Раньше этот цикл был скопирован в каждый языковой handler. Вынесен сюда,
+чтобы возобновление публикации после рестарта шло тем же путём.
+"""
+
+import asyncio
+import random
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from telethon.errors import FloodWaitError
+
+from src.scheduler import get_scheduler, TELEGRAM_RESOURCE
+
+# Лимиты Telegram для безопасной публикации
+DELAY_MIN = 3  # Минимальная пауза между постами (сек)
+DELAY_MAX = 5  # Максимальная пауза между постами (сек)
+POSTS_BEFORE_LONG_PAUSE = 20  # После скольких постов делать длинную паузу
+LONG_PAUSE_SECONDS = 60  # Длинная пауза (сек)
+POSTS_BEFORE_VERY_LONG_PAUSE = 100  # После скольких постов - очень длинная пауза
+VERY_LONG_PAUSE_SECONDS = 300  # 5 минут
+
+CAPTION_LIMIT = 1024  # Лимит подписи к медиа в Telegram
+
+
+def publishing_intro_text(total: int) -> str:
+    """Текст стартового статуса публикации."""
+    return (
+        f"🚀 <b>Публикация началась!</b>\n\n"
+        f"📝 Постов: {total}\n"
+        f"⏱ Интервал: {DELAY_MIN}-{DELAY_MAX} сек\n"
+        f"⏸ Пауза каждые {POSTS_BEFORE_LONG_PAUSE} постов: {LONG_PAUSE_SECONDS} сек\n\n"
+        f"Прогресс: 0/{total}\n\n"
+        f"<i>Нажмите кнопку ниже чтобы остановить</i>"
+    )
+
+
+def trim_caption(post_text: str) -> str:
+    """Умная обрезка подписи до лимита Telegram с сохранением ссылки."""
+    if len(post_text) <= CAPTION_LIMIT:
+        return post_text
+    # Ищем последнюю ссылку
+    link_match = re.search(r'(https?://[^\s<>"]+)', post_text)
+    if link_match:
+        link_pos = post_text.find(link_match.group(1))
+        # Обрезаем текст ДО ссылки, сохраняя ссылку и после неё
+        if link_pos > 500:
+            # Ищем последнее предложение перед ссылкой
+            cut_pos = max(
+                post_text.rfind('. ', 0, link_pos - 200),
+                post_text.rfind('! ', 0, link_pos - 200),
+                post_text.rfind('? ', 0, link_pos - 200),
+                post_text.rfind('\n\n', 0, link_pos - 200)
+            )
+            if cut_pos > 200:
+                post_text = post_text[:cut_pos + 2] + post_text[link_pos:]
+            else:
+                # Просто обрезаем оставляя ссылку
+                post_text = post_text[:700] + post_text[link_pos:]
+    else:
+        # Нет ссылки - обрезаем на предложении
+        cut_pos = max(
+            post_text.rfind('. ', 0, 1020),
+            post_text.rfind('! ', 0, 1020),
+            post_text.rfind('? ', 0, 1020)
+        )
+        post_text = post_text[:cut_pos + 1] if cut_pos > 500 else post_text[:1021]
+    return post_text
+
+
+async def publish_posts(
+    bot,
+    client,
+    job,
+    posts: List[Dict],
+    target_channel_id,
+    status_msg,
+    logger,
+    trim_captions: bool = False,
+    skip_indices: Optional[Iterable[int]] = None,
+) -> Tuple[int, int, bool]:
+    """
+    Публикует посты по очереди с паузами против лимитов Telegram.
+
+    Args:
+        bot: aiogram Bot (для постов с file_id)
+        client: Telethon клиент (для копирования медиа из канала-источника)
+        job: Job публикации — стоп/пауза, прогресс, чекпоинты message_id
+        posts: generated_posts из FSM
+        target_channel_id: Канал публикации
+        status_msg: Сообщение со статусом (редактируется по ходу)
+        logger: BotLogger
+        trim_captions: Обрезать подписи длиннее 1024 символов (ES/IT/FR)
+        skip_indices: Индексы уже опубликованных постов (при возобновлении)
+
+    Returns:
+        (опубликовано, ошибок, остановлено_пользователем)
+    """
+    from src.handlers.job_handlers import job_control_keyboard
+
+    skip = set(skip_indices or ())
+    published = 0
+    errors = 0
+    stopped = False
+    sent_in_run = 0
+
+    async def _send(post: Dict, text: str) -> Optional[int]:
+        # Слот аккаунта Telegram общий для всех операторов
+        async with get_scheduler().slot(TELEGRAM_RESOURCE):
+            return await _send_now(post, text)
+
+    async def _send_now(post: Dict, text: str) -> Optional[int]:
+        # Если есть source_channel_id и message_id - копируем через Telethon
+        if post.get('source_channel_id') and post.get('message_id'):
+            original_msg = await client.get_messages(post['source_channel_id'], ids=post['message_id'])
+            if not original_msg:
+                raise Exception("Сообщение не найдено в источнике")
+            # Копируем с новым текстом (HTML форматирование)
+            sent = await client.send_message(
+                target_channel_id,
+                text,
+                file=original_msg.media,
+                parse_mode='html'
+            )
+            return getattr(sent, 'id', None)
+
+        # Если есть file_id (загружено вручную) - отправляем через aiogram
+        if post.get('media_path'):
+            if post['media_type'] == 'video':
+                sent = await bot.send_video(
+                    chat_id=target_channel_id,
+                    video=post['media_path'],  # file_id
+                    caption=text,
+                    parse_mode="HTML"
+                )
+            else:
+                sent = await bot.send_photo(
+                    chat_id=target_channel_id,
+                    photo=post['media_path'],  # file_id
+                    caption=text,
+                    parse_mode="HTML"
+                )
+            return getattr(sent, 'message_id', None)
+
+        raise Exception("Нет источника медиа")
+
+    for i, post in enumerate(posts):
+        if i in skip:
+            continue
+        # Пауза / остановка — без копирования всего FSM на каждом посте
+        if not await job.checkpoint():
+            stopped = True
+            break
+        post_text = trim_caption(post['text']) if trim_captions else post['text']
+        try:
+            message_id = await _send(post, post_text)
+            published += 1
+            sent_in_run += 1
+            job.advance()
+            job.mark_published(i, message_id)
+
+            # Обновляем статус каждые 10 постов
+            if sent_in_run % 10 == 0:
+                try:
+                    await status_msg.edit_text(
+                        f"🚀 <b>Публикация...</b>\n\n"
+                        f"✅ Опубликовано: {published}\n"
+                        f"❌ Ошибок: {errors}\n\n"
+                        f"Прогресс: {job.progress_line()}",
+                        parse_mode="HTML",
+                        reply_markup=job_control_keyboard(job, stop_text="🛑 Остановить публикацию")
+                    )
+                except Exception:
+                    pass
+
+            # Очень длинная пауза каждые 100 постов (5 мин)
+            if sent_in_run % POSTS_BEFORE_VERY_LONG_PAUSE == 0:
+                try:
+                    await status_msg.edit_text(
+                        f"⏸ <b>Пауза {VERY_LONG_PAUSE_SECONDS // 60} мин...</b>\n\n"
+                        f"Защита от лимитов Telegram\n"
+                        f"✅ Опубликовано: {published}/{job.total}",
+                        parse_mode="HTML"
+                    )
+                except Exception:
+                    pass
+                if not await job.sleep(VERY_LONG_PAUSE_SECONDS):
+                    stopped = True
+                    break
+
+            # Длинная пауза каждые 20 постов (1 мин)
+            elif sent_in_run % POSTS_BEFORE_LONG_PAUSE == 0:
+                try:
+                    await status_msg.edit_text(
+                        f"⏸ <b>Пауза {LONG_PAUSE_SECONDS} сек...</b>\n\n"
+                        f"Защита от лимитов Telegram\n"
+                        f"✅ Опубликовано: {published}/{job.total}",
+                        parse_mode="HTML"
+                    )
+                except Exception:
+                    pass
+                if not await job.sleep(LONG_PAUSE_SECONDS):
+                    stopped = True
+                    break
+
+            else:
+                # Обычная рандомная задержка между постами
+                if not await job.sleep(random.uniform(DELAY_MIN, DELAY_MAX)):
+                    stopped = True
+                    break
+
+        except FloodWaitError as e:
+            logger.warning(f"FloodWait: ждём {e.seconds} сек (пост {i})")
+            # Ограничение на аккаунт — останавливаем публикацию у всех операторов
+            get_scheduler().block(TELEGRAM_RESOURCE, e.seconds + 1)
+            try:
+                await status_msg.edit_text(
+                    f"⏸ <b>FloodWait: ждём {e.seconds} сек...</b>\n\n"
+                    f"Telegram ограничил скорость\n"
+                    f"✅ Опубликовано: {published}/{job.total}",
+                    parse_mode="HTML"
+                )
+            except Exception:
+                pass
+            await asyncio.sleep(e.seconds + 1)
+            # Повторяем публикацию этого поста
+            try:
+                message_id = await _send(post, post_text)
+                published += 1
+                sent_in_run += 1
+                job.advance()
+                job.mark_published(i, message_id)
+            except Exception as retry_err:
+                errors += 1
+                job.advance(error=True)
+                logger.error(f"Ошибка повтора поста {i} после FloodWait: {retry_err}")
+        except Exception as e:
+            errors += 1
+            job.advance(error=True)
+            logger.error(f"Ошибка публикации поста {i}: {e}")
+
+    return published, errors, stopped
@@ -0,0 +1,60 @@
+"""
+@file: repair_tier.py
+@description: Второй уровень генерации — точечный ремонт отклонённого черновика дешёвой быстрой моделью
+@dependencies: os, src.batch_generation
+@created: 2026-10-19
+
+generate_video_post выбрасывал весь кандидат и генерировал пост заново из-за
+локальных проблем: пропала ссылка, разные форматы ссылок, английские фразы,
+лишнее упоминание ника, длина за пределами окна. Теперь для таких причин
+отказа (REPAIRABLE_REASONS) генератор сначала отправляет модели ремонта
+только отклонённый текст и нарушенное правило (REPAIR_RULES генератора на
+языке поста). Исправленный текст проходит те же проверки
+_finalize_video_text; полная регенерация — только если ремонт не помог.
+
+Ответ ремонта короткий (только текст поста), поэтому он в разы дешевле и
+быстрее полного регена, а успешность выше. Вызовы ремонта идут через
+timed_completion с purpose="repair" — они видны в телеметрии и учёте стоимости.
+
+LLM_REPAIR: 0 — выключить (по умолчанию включено)
+LLM_REPAIR_MODEL: ключ OPENROUTER_MODELS для ремонта через OpenRouter
+LLM_REPAIR_OPENAI_MODEL: модель для ремонта при прямом подключении к OpenAI
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+from src.batch_generation import strip_section_markers
+
+REPAIR_ENABLED = os.getenv("LLM_REPAIR", "1").strip().lower() in ("1", "true", "yes", "on")
+REPAIR_MODEL = os.getenv("LLM_REPAIR_MODEL", "gemini-3-flash")
+REPAIR_OPENAI_MODEL = os.getenv("LLM_REPAIR_OPENAI_MODEL", "gpt-4.1-nano")
+REPAIR_MAX_TOKENS = 1500
+REPAIR_TIMEOUT = 45
+
+# Причины отказа, которые чинятся правкой текста (дубликат — только полной регенерацией)
+REPAIRABLE_REASONS = ("streamer", "links_missing", "link_format", "link_text", "link_count", "language", "length")
+
+_FENCE_RE = re.compile(r"^```\w*\s*|\s*```$")
+
+
+def repair_model(use_openrouter: bool, models: Dict[str, Dict]) -> str:
+    """id модели ремонта для клиента генератора."""
+    if use_openrouter:
+        info = models.get(REPAIR_MODEL)
+        return info["id"] if info else REPAIR_MODEL
+    return REPAIR_OPENAI_MODEL
+
+
+def build_repair_messages(instruction: str, rule: str, text: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": instruction},
+        {"role": "user", "content": f"{rule}\n\n———\n{text}"},
+    ]
+
+
+def clean_repair_output(content: Optional[str]) -> str:
+    """Текст поста из ответа ремонта: без markdown-обёртки и служебных маркеров."""
+    text = _FENCE_RE.sub("", (content or "").strip())
+    return strip_section_markers(text.strip().strip("—").strip())
@@ -0,0 +1,226 @@
+"""
+@file: scheduler.py
+@description: Общий планировщик доступа к LLM и Telegram для всех операторов и сценариев —
+              ёмкость на ресурс, приоритеты и честная очередь между пользователями
+@dependencies: asyncio, contextvars
+@created: 2026-10-19
+
+Раньше каждый handler ходил в LLM и Telethon сам по себе: один прогон на 500
+видео забивал провайдера, и 429 получали все операторы сразу. Теперь каждый
+вызов берёт слот ресурса («llm:<модель>», «telegram»):
+
+- у ресурса ограниченная ёмкость (одновременных вызовов);
+- из очереди первым выходит более приоритетный запрос (перегенерация пары
+  дублей раньше пакетной генерации);
+- при равном приоритете — пользователь, у которого сейчас меньше занятых слотов
+  и который дольше не обслуживался, поэтому пакет одного оператора не
+  блокирует остальных;
+- FloodWait блокирует ресурс целиком, а не только упавший цикл.
+
+Пользователь и приоритет берутся из контекста задачи (set_work_context),
+поэтому генераторам не нужно знать, кто их вызвал.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Приоритеты (меньше — раньше)
+PRIORITY_INTERACTIVE = 0  # Единичные действия оператора: перегенерация дублей
+PRIORITY_NORMAL = 1  # Проверка уникальности и прочие короткие задачи
+PRIORITY_BULK = 2  # Пакетная генерация и публикация
+
+# Ёмкость по типу ресурса (префикс до «:»). Переопределяется SCHEDULER_CAPACITY="llm=6,telegram=1"
+DEFAULT_CAPACITY = {
+    "llm": 4,
+    "telegram": 1,
+}
+FALLBACK_CAPACITY = 2
+
+# (user_id, priority) текущей задачи
+_work_context: contextvars.ContextVar[Tuple[int, int]] = contextvars.ContextVar(
+    "work_context", default=(0, PRIORITY_NORMAL)
+)
+
+
+def set_work_context(user_id: int, priority: int = PRIORITY_NORMAL):
+    """Привязывает текущую задачу (и все порождённые ею корутины) к оператору и приоритету."""
+    _work_context.set((user_id or 0, priority))
+
+
+def get_work_context() -> Tuple[int, int]:
+    return _work_context.get()
+
+
+def _load_capacity() -> Dict[str, int]:
+    capacity = dict(DEFAULT_CAPACITY)
+    raw = os.getenv("SCHEDULER_CAPACITY", "")
+    for part in raw.split(","):
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        try:
+            capacity[name.strip()] = max(1, int(value))
+        except ValueError:
+            print(f"⚠️ SCHEDULER_CAPACITY: неверное значение '{part}'")
+    return capacity
+
+
+@dataclass
+class _Waiter:
+    priority: int
+    user_id: int
+    seq: int
+    future: asyncio.Future
+
+
+@dataclass
+class _Resource:
+    capacity: int
+    in_use: int = 0
+    blocked_until: float = 0.0
+    waiters: List[_Waiter] = field(default_factory=list)
+    user_in_use: Dict[int, int] = field(default_factory=dict)
+    user_last_served: Dict[int, int] = field(default_factory=dict)
+
+
+class WorkScheduler:
+    """Планировщик слотов ресурсов (singleton), общий для всех сценариев."""
+
+    _instance: Optional["WorkScheduler"] = None
+
+    def __init__(self, capacity: Optional[Dict[str, int]] = None):
+        self._capacity = capacity if capacity is not None else _load_capacity()
+        self._resources: Dict[str, _Resource] = {}
+        self._seq = itertools.count()
+
+    @classmethod
+    def get_instance(cls) -> "WorkScheduler":
+        if cls._instance is None:
+            cls._instance = WorkScheduler()
+        return cls._instance
+
+    def _resource(self, name: str) -> _Resource:
+        res = self._resources.get(name)
+        if res is None:
+            kind = name.split(":", 1)[0]
+            res = _Resource(capacity=self._capacity.get(name, self._capacity.get(kind, FALLBACK_CAPACITY)))
+            self._resources[name] = res
+        return res
+
+    # ─────────────────────────────────────────────────────────────
+    # Слоты
+    # ─────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def slot(self, resource: str, user_id: Optional[int] = None, priority: Optional[int] = None):
+        """
+        Занимает слот ресурса на время блока.
+
+        Args:
+            resource: Имя ресурса — «llm:<модель>», «telegram»
+            user_id: Оператор (по умолчанию — из set_work_context)
+            priority: Приоритет (по умолчанию — из set_work_context)
+        """
+        ctx_user, ctx_priority = get_work_context()
+        user_id = ctx_user if user_id is None else user_id
+        priority = ctx_priority if priority is None else priority
+        res = self._resource(resource)
+        await self._acquire(res, user_id, priority)
+        try:
+            yield
+        finally:
+            self._release(res, user_id)
+
+    async def _acquire(self, res: _Resource, user_id: int, priority: int):
+        while True:
+            wait_blocked = res.blocked_until - time.monotonic()
+            if wait_blocked > 0:
+                await asyncio.sleep(wait_blocked)
+                continue
+            if res.in_use < res.capacity and not res.waiters:
+                self._grant(res, user_id)
+                return
+            waiter = _Waiter(priority, user_id, next(self._seq), asyncio.get_running_loop().create_future())
+            res.waiters.append(waiter)
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in res.waiters:
+                    res.waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    # Слот уже выдан — возвращаем его следующему
+                    self._release(res, user_id)
+                raise
+            if res.blocked_until > time.monotonic():
+                # Ресурс заблокировали, пока ждали — слот возвращаем и ждём разблокировки
+                self._release(res, user_id)
+                continue
+            return
+
+    def _grant(self, res: _Resource, user_id: int):
+        res.in_use += 1
+        res.user_in_use[user_id] = res.user_in_use.get(user_id, 0) + 1
+        res.user_last_served[user_id] = next(self._seq)
+
+    def _release(self, res: _Resource, user_id: int):
+        res.in_use -= 1
+        left = res.user_in_use.get(user_id, 1) - 1
+        if left > 0:
+            res.user_in_use[user_id] = left
+        else:
+            res.user_in_use.pop(user_id, None)
+        self._wake(res)
+
+    def _wake(self, res: _Resource):
+        while res.waiters and res.in_use < res.capacity:
+            waiter = min(
+                res.waiters,
+                key=lambda w: (
+                    w.priority,
+                    res.user_in_use.get(w.user_id, 0),
+                    res.user_last_served.get(w.user_id, -1),
+                    w.seq,
+                )
+            )
+            res.waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+            self._grant(res, waiter.user_id)
+            waiter.future.set_result(None)
+
+    def block(self, resource: str, seconds: float):
+        """Блокирует ресурс для всех (FloodWait / 429 от провайдера)."""
+        res = self._resource(resource)
+        res.blocked_until = max(res.blocked_until, time.monotonic() + seconds)
+
+    # ─────────────────────────────────────────────────────────────
+    # Статистика
+    # ─────────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Загрузка ресурсов: занято / ёмкость / в очереди."""
+        return {
+            name: {"in_use": res.in_use, "capacity": res.capacity, "queued": len(res.waiters)}
+            for name, res in self._resources.items()
+        }
+
+
+def get_scheduler() -> WorkScheduler:
+    """Короткий доступ к общему планировщику."""
+    return WorkScheduler.get_instance()
+
+
+def llm_resource(model: str) -> str:
+    """Имя ресурса для модели LLM."""
+    return f"llm:{model}"
+
+
+TELEGRAM_RESOURCE = "telegram"
@@ -0,0 +1,140 @@
+"""
+@file: speculative.py
+@description: Спекулятивные фоновые задачи сценария — работа стартует, как только известны её входные данные
+@dependencies: asyncio, src.cassette, src.scheduler
+@created: 2026-10-19
+
+Пока оператор вводит ссылки, бонусы и канал, бот ничего не делает, а после
+«Сгенерировать» последовательно ждёт пул описаний бонусов, Telethon и скан
+канала. Handlers настройки запускают эту работу заранее:
+
+- start(user_id, name, key, factory) — фоновая задача под именем name;
+  key — входные данные (бонусы, канал, направление). Повторный start с тем же
+  key возвращает уже идущую задачу, с другим key — отменяет старую;
+- take(user_id, name, key) — забрать задачу: если key не совпал (оператор
+  вернулся и ввёл другое), задача отменяется и возвращается None;
+- result(...) — дождаться результата взятой задачи; ошибка спекуляции не
+  ломает сценарий — handler просто делает работу сам, как раньше;
+- cancel(user_id[, name]) — оператор отменил сценарий или выбрал другой путь.
+
+Задачи идут с приоритетом SPECULATIVE_PRIORITY в планировщике — не мешают
+интерактивным действиям и прогонам других операторов. В режиме кассеты
+спекуляция выключена: она сдвигала бы порядок вызовов и random относительно
+записи.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.cassette import get_cassette
+from src.scheduler import PRIORITY_BULK, set_work_context
+
+# Включить спекулятивные задачи
+SPECULATIVE_ENABLED = os.getenv("SPECULATIVE_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on")
+
+# Размер пула описаний бонусов, который собирается заранее (сценарий — «100 постов»)
+SPECULATIVE_POOL_COUNT = int(os.getenv("SPECULATIVE_POOL_COUNT", "100"))
+
+# Сколько сообщений канала сканировать заранее в каждом направлении (100 видео × 2, как limit скана)
+SPECULATIVE_SCAN_LIMIT = int(os.getenv("SPECULATIVE_SCAN_LIMIT", "200"))
+
+# Приоритет спекулятивной работы в планировщике
+SPECULATIVE_PRIORITY = PRIORITY_BULK
+
+
+@dataclass
+class SpeculativeStats:
+    started: int = 0
+    used: int = 0
+    failed: int = 0
+    cancelled: int = 0
+
+
+class SpeculativeTasks:
+    """Спекулятивные задачи операторов по (user_id, имя), общий реестр на процесс (singleton)."""
+
+    _instance: Optional["SpeculativeTasks"] = None
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[int, str], Tuple[Hashable, asyncio.Task]] = {}
+        self.stats = SpeculativeStats()
+
+    @classmethod
+    def get_instance(cls) -> "SpeculativeTasks":
+        if cls._instance is None:
+            cls._instance = SpeculativeTasks()
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        return SPECULATIVE_ENABLED and not get_cassette().active
+
+    def start(self, user_id: int, name: str, key: Hashable,
+              factory: Callable[[], Awaitable[Any]]) -> Optional[asyncio.Task]:
+        """Запускает factory() в фоне, если задачи name с таким key ещё нет."""
+        if not self.enabled:
+            return None
+        current = self._tasks.get((user_id, name))
+        if current is not None and current[0] == key and not current[1].cancelled():
+            return current[1]
+        self.cancel(user_id, name)
+
+        async def run():
+            set_work_context(user_id, SPECULATIVE_PRIORITY)
+            return await factory()
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(self._on_done)
+        self._tasks[(user_id, name)] = (key, task)
+        self.stats.started += 1
+        return task
+
+    def _on_done(self, task: asyncio.Task):
+        # Забираем исключение, даже если результат никому не понадобился
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.failed += 1
+            print(f"⚠️ Спекулятивная задача завершилась с ошибкой: {task.exception()}")
+
+    def take(self, user_id: int, name: str, key: Hashable) -> Optional[asyncio.Task]:
+        """Забирает задачу name, если она запущена для этих же входных данных; иначе отменяет её."""
+        current = self._tasks.pop((user_id, name), None)
+        if current is None:
+            return None
+        started_key, task = current
+        if started_key != key or task.cancelled():
+            self._cancel_task(task)
+            return None
+        return task
+
+    async def result(self, user_id: int, name: str, key: Hashable) -> Optional[Any]:
+        """Результат спекулятивной задачи (дожидается незавершённой) или None, если её нет или она упала."""
+        task = self.take(user_id, name, key)
+        if task is None:
+            return None
+        try:
+            value = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return None
+        except Exception:
+            return None
+        self.stats.used += 1
+        return value
+
+    def cancel(self, user_id: int, name: Optional[str] = None):
+        """Отменяет задачи оператора: одну по имени или все."""
+        for task_key in [k for k in self._tasks if k[0] == user_id and (name is None or k[1] == name)]:
+            self._cancel_task(self._tasks.pop(task_key)[1])
+
+    def _cancel_task(self, task: asyncio.Task):
+        if not task.done():
+            task.cancel()
+            self.stats.cancelled += 1
+
+
+def get_speculative_tasks() -> SpeculativeTasks:
+    """Короткий доступ к реестру спекулятивных задач."""
+    return SpeculativeTasks.get_instance()
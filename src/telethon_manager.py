@@ -1,7 +1,7 @@
 """
 @file: telethon_manager.py
 @description: Единый менеджер Telethon-клиента (singleton) для совместного использования в модулях.
-@dependencies: telethon, asyncio, typing, src.config, src.logger
+@dependencies: telethon, asyncio, typing, src.cassette, src.config, src.logger
 @created: 2025-08-09
 """
 
@@ -14,6 +14,7 @@ import os
 
 from telethon import TelegramClient
 
+from src.cassette import get_cassette
 from src.config_manager import ConfigManager
 from src.logger import BotLogger
 
@@ -76,6 +77,14 @@ class TelethonClientManager:
         async with self._lock:
             if self._client is not None and self._clients:
                 return True
+            cassette = get_cassette()
+            if cassette.replaying:
+                # Воспроизведение кассеты: клиенты без сети, ответы из записи
+                self._accounts_meta = cassette.replay("telethon.accounts", {})
+                self._clients = [cassette.telethon_client(i) for i in range(len(self._accounts_meta))]
+                self._client = self._clients[0] if self._clients else None
+                self._rr_index = 0
+                return bool(self._clients)
             try:
                 # Список аккаунтов: основной + доп. через переменные *_2..*_10
                 accounts = []
@@ -157,6 +166,10 @@ class TelethonClientManager:
                     self.logger.error("Не удалось инициализировать ни одного Telethon клиента")
                     return False
 
+                if cassette.recording:
+                    self._clients = [cassette.telethon_client(i, c) for i, c in enumerate(self._clients)]
+                    cassette.record("telethon.accounts", {}, self._accounts_meta)
+
                 self._client = self._clients[0]
                 self._rr_index = 0
                 self.logger.info("Telethon клиенты инициализированы", total=len(self._clients))
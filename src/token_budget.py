@@ -0,0 +1,212 @@
+"""
+@file: token_budget.py
+@description: Оценка размера промптов в токенах, бюджеты секций промпта и учёт
+              входных/выходных токенов по каждому вызову LLM
+@dependencies: json, re (tiktoken — опционально)
+@created: 2026-10-19
+
+Размер промптов раньше нигде не измерялся: generate_video_post добавлял три
+примера поста по 500 символов, ротационный системный промпт, блок цифр,
+подсказку по длине и анти-повторы, а проверка уникальности вставляла посты
+через json.dumps(..., indent=2) — отступы стоили токенов на каждом вызове.
+
+Оценка — локальная: если установлен tiktoken, считаем им (cl100k_base), иначе
+приближение по словам с учётом того, что кириллица токенизируется примерно
+в 1.5 раза хуже латиницы. Для бюджетов точность ±15% достаточна.
+
+Реальные цифры берутся из response.usage, когда провайдер их отдаёт; оценка
+пишется рядом, чтобы было видно расхождение. Там же учитываются токены,
+прочитанные из кеша префикса (см. src/prompt_cache.py).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # нет пакета или нет локального кеша кодировки
+    _ENCODING = None
+
+# Бюджеты секций промпта генерации поста (в токенах)
+EXAMPLE_POST_TOKENS = 160      # один пример существующего поста
+EXAMPLES_TOTAL_TOKENS = 420    # все примеры вместе
+UNIQUENESS_POST_TOKENS = 140   # один новый пост в промпте проверки уникальности
+UNIQUENESS_EXISTING_TOKENS = 100  # один пост из базы там же
+
+# Символов на токен для «слова» по алфавитам (эмпирика для cl100k / o200k)
+_CHARS_PER_TOKEN_LATIN = 4.0
+_CHARS_PER_TOKEN_CYRILLIC = 2.6
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|[Ѐ-ӿ]+|\d+|\w+|[^\w\s]|\s+", re.UNICODE)
+_CYRILLIC_RE = re.compile(r"[Ѐ-ӿ]")
+_BOUNDARY_RE = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Приблизительное число токенов в тексте."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        if piece.isspace():
+            # Одиночный пробел склеивается со следующим словом, переводы строк — нет
+            tokens += piece.count("\n")
+            continue
+        if piece.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif _CYRILLIC_RE.match(piece):
+            tokens += math.ceil(len(piece) / _CHARS_PER_TOKEN_CYRILLIC)
+        elif piece.isascii() and piece.isalpha():
+            tokens += math.ceil(len(piece) / _CHARS_PER_TOKEN_LATIN)
+        elif len(piece) == 1 and not piece.isalnum():
+            # Пунктуация — 1 токен, эмодзи и прочие символы вне BMP — обычно 2-3
+            tokens += 1 if ord(piece) < 0x2000 else 2
+        else:
+            tokens += math.ceil(len(piece) / 3)
+    return tokens
+
+
+def estimate_messages_tokens(messages: Sequence[Dict[str, Any]]) -> int:
+    """Оценка входных токенов chat-запроса (с накладными ~4 токена на сообщение)."""
+    return sum(estimate_tokens(str(m.get("content") or "")) + 4 for m in messages) + 2
+
+
+def trim_to_tokens(text: str, max_tokens: int, ellipsis: str = "...") -> str:
+    """
+    Обрезает текст до бюджета. Режет по границе предложения или строки, если она
+    не слишком далеко, иначе по слову.
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    # Бинарный поиск по длине префикса: оценка монотонна по длине
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) + 1 <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    boundaries = [m.start() for m in _BOUNDARY_RE.finditer(cut)]
+    if boundaries and boundaries[-1] >= len(cut) * 0.6:
+        cut = cut[:boundaries[-1]]
+    elif " " in cut[len(cut) // 2:]:
+        cut = cut[:cut.rfind(" ")]
+    return cut.rstrip(" .,;:") + ellipsis
+
+
+def pack_items(items: Iterable[str], per_item: int, total: int) -> List[str]:
+    """
+    Укладывает элементы в общий бюджет: каждый обрезается до per_item, и
+    элементы добавляются по порядку, пока влезают в total.
+    """
+    packed: List[str] = []
+    used = 0
+    for item in items:
+        trimmed = trim_to_tokens(item, per_item)
+        cost = estimate_tokens(trimmed)
+        if packed and used + cost > total:
+            break
+        packed.append(trimmed)
+        used += cost
+    return packed
+
+
+def compact_json(obj: Any) -> str:
+    """JSON без отступов и пробелов после разделителей — для промптов."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# ─────────────────────────────────────────────────────────────
+# Учёт токенов по вызовам
+# ─────────────────────────────────────────────────────────────
+
+def _usage_value(usage: Any, name: str) -> Optional[int]:
+    if usage is None:
+        return None
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def _cached_tokens(usage: Any) -> int:
+    """Токены входа, прочитанные из кеша провайдера (usage.prompt_tokens_details.cached_tokens)."""
+    if usage is None:
+        return 0
+    details = usage.get("prompt_tokens_details") if isinstance(usage, dict) else getattr(usage, "prompt_tokens_details", None)
+    return _usage_value(details, "cached_tokens") or 0
+
+
+@dataclass
+class TokenTotals:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated_prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        return self.cached_prompt_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+@dataclass
+class TokenUsageLog:
+    """Накопительная статистика токенов по назначению вызова и модели (singleton)."""
+
+    totals: Dict[str, TokenTotals] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls) -> "TokenUsageLog":
+        if cls._instance is None:
+            cls._instance = TokenUsageLog()
+        return cls._instance
+
+    def record(self, purpose: str, model: str, messages: Sequence[Dict[str, Any]],
+               usage: Any = None, completion_text: Optional[str] = None) -> TokenTotals:
+        """
+        Записывает вызов: usage — response.usage (объект SDK) или dict из JSON
+        ответа. Если провайдер не вернул usage, берётся оценка.
+        """
+        estimated = estimate_messages_tokens(messages)
+        prompt = _usage_value(usage, "prompt_tokens")
+        completion = _usage_value(usage, "completion_tokens")
+        cached = _cached_tokens(usage)
+        source = "usage"
+        if prompt is None:
+            prompt, source = estimated, "оценка"
+        if completion is None:
+            completion = estimate_tokens(completion_text)
+        with self._lock:
+            totals = self.totals.setdefault(f"{purpose}:{model}", TokenTotals())
+            totals.calls += 1
+            totals.prompt_tokens += prompt
+            totals.completion_tokens += completion
+            totals.estimated_prompt_tokens += estimated
+            totals.cached_prompt_tokens += cached
+        cache_note = f", кеш {cached} ({cached / prompt:.0%})" if cached and prompt else ""
+        print(f"   🔢 Токены [{purpose}] {model}: вход {prompt} (оценка {estimated}){cache_note}, "
+              f"выход {completion} ({source})")
+        return totals
+
+    def stats(self) -> Dict[str, TokenTotals]:
+        with self._lock:
+            return {k: TokenTotals(**vars(v)) for k, v in self.totals.items()}
+
+
+def get_token_log() -> TokenUsageLog:
+    """Короткий доступ к общему журналу токенов."""
+    return TokenUsageLog.get_instance()
@@ -13,13 +13,14 @@
 
 import json
 import os
-import asyncio
 import random
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from openai import AsyncOpenAI
 
+from src.hedging import timed_completion
+
 
 @dataclass
 class Topic:
@@ -384,18 +385,15 @@ class TopicManager:
 Пиши только темы, без пояснений."""
 
         try:
-            response = await asyncio.wait_for(
-                client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": "Ты генерируешь темы для постов о гемблинге."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.9
-                ),
-                timeout=120
-            )
+            response = await timed_completion(client, {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": "Ты генерируешь темы для постов о гемблинге."},
+                    {"role": "user", "content": prompt}
+                ],
+                "max_tokens": 1000,
+                "temperature": 0.9,
+            }, "topic_generation", timeout=120)
             
             generated_text = response.choices[0].message.content.strip()
             new_topics = self.add_custom_topics_bulk(generated_text)